@@ -46,6 +46,16 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 TELEGRAM_ONLY_TRADES = os.getenv("TELEGRAM_ONLY_TRADES", "true").lower() == "true"
 TELEGRAM_ALLOW_NON_TRADE_ALERTS = os.getenv("TELEGRAM_ALLOW_NON_TRADE_ALERTS", "false").lower() == "true"
 TELEGRAM_TRADE_VALIDITY_SEC = int(os.getenv("TELEGRAM_TRADE_VALIDITY_SEC", "180"))
+TELEGRAM_API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org").rstrip("/")
+TELEGRAM_TIMEOUT_SEC = float(os.getenv("TELEGRAM_TIMEOUT_SEC", "5"))
+# Notification outbox (core.notification_outbox): alerts are queued and sent by a background thread.
+TELEGRAM_OUTBOX_ENABLE = os.getenv("TELEGRAM_OUTBOX_ENABLE", "true").lower() == "true"
+TELEGRAM_OUTBOX_QUEUE_MAX = int(os.getenv("TELEGRAM_OUTBOX_QUEUE_MAX", "1000"))
+TELEGRAM_OUTBOX_COALESCE_SEC = float(os.getenv("TELEGRAM_OUTBOX_COALESCE_SEC", "1.0"))
+TELEGRAM_OUTBOX_DIGEST_MAX = int(os.getenv("TELEGRAM_OUTBOX_DIGEST_MAX", "20"))
+TELEGRAM_OUTBOX_MAX_ATTEMPTS = int(os.getenv("TELEGRAM_OUTBOX_MAX_ATTEMPTS", "5"))
+TELEGRAM_OUTBOX_BACKOFF_SEC = float(os.getenv("TELEGRAM_OUTBOX_BACKOFF_SEC", "2.0"))
+TELEGRAM_OUTBOX_BACKOFF_MAX_SEC = float(os.getenv("TELEGRAM_OUTBOX_BACKOFF_MAX_SEC", "120"))
 
 # -------------------------------
 # Capital & Risk Configuration
@@ -61,7 +71,24 @@ MAX_UNDERLYING_EXPOSURE_PCT = float(os.getenv("MAX_UNDERLYING_EXPOSURE_PCT", "0.
 MAX_POSITIONS_PER_UNDERLYING = int(os.getenv("MAX_POSITIONS_PER_UNDERLYING", "3"))
 MAX_EXPIRY_CONCENTRATION_PCT = float(os.getenv("MAX_EXPIRY_CONCENTRATION_PCT", "0.65"))
 MAX_NET_DELTA = float(os.getenv("MAX_NET_DELTA", "200"))
-MAX_NET_VEGA = float(os.getenv("MAX_NET_VEGA", "120"))
+# Net vega limit in rupees per 1 vol point (Black-Scholes vega / 100 x units).
+# 75000 keeps the old 120 proxy-unit limit for ATM NIFTY at 7 DTE and 15% IV.
+# The retired MAX_NET_VEGA key was in proxy units: when it is still exported and
+# MAX_NET_VEGA_RUPEES is not, it is converted at NET_VEGA_LEGACY_TO_RUPEES and
+# RiskEngine warns at startup (MAX_NET_VEGA_LEGACY_OVERRIDE holds the old value).
+NET_VEGA_LEGACY_TO_RUPEES = 625.0
+
+
+def _net_vega_limit_rupees(env=os.environ):
+    legacy = float(env["MAX_NET_VEGA"]) if env.get("MAX_NET_VEGA") else None
+    if env.get("MAX_NET_VEGA_RUPEES"):
+        return float(env["MAX_NET_VEGA_RUPEES"]), legacy
+    if legacy is not None:
+        return legacy * NET_VEGA_LEGACY_TO_RUPEES, legacy
+    return 75000.0, None
+
+
+MAX_NET_VEGA_RUPEES, MAX_NET_VEGA_LEGACY_OVERRIDE = _net_vega_limit_rupees()
 EVENT_NET_DELTA_MULT = float(os.getenv("EVENT_NET_DELTA_MULT", "0.5"))
 EVENT_NET_VEGA_MULT = float(os.getenv("EVENT_NET_VEGA_MULT", "0.5"))
 # Backward-compatible aliases (deprecated)
@@ -257,6 +284,14 @@ INDEX_REQUIRE_DEPTH_LIVE = os.getenv("INDEX_REQUIRE_DEPTH_LIVE", "false").lower(
 ALLOW_SYNTHETIC_CHAIN = os.getenv("ALLOW_SYNTHETIC_CHAIN", "false").lower() == "true"
 SYNTHETIC_CHAIN_MODE = os.getenv("SYNTHETIC_CHAIN_MODE", "analysis_only")
 
+# -------------------------------
+# Chain / chain-health snapshot files
+# -------------------------------
+# data/option_chain_latest.json and logs/option_chain_health.json are written
+# by a background publisher at most once per debounce interval.
+SNAPSHOT_PUBLISH_ENABLE = os.getenv("SNAPSHOT_PUBLISH_ENABLE", "true").lower() == "true"
+SNAPSHOT_PUBLISH_DEBOUNCE_SEC = float(os.getenv("SNAPSHOT_PUBLISH_DEBOUNCE_SEC", "1.0"))
+
 # -------------------------------
 # Market / fallback indices
 # -------------------------------
@@ -350,9 +385,16 @@ RL_SHARPE_ALERT = 0.0
 RL_DD_ALERT = -5.0
 EWMA_SPAN = 10
 FILL_RATIO_ALERT = 0.8
-DEPTH_SNAPSHOT_LIMIT = 10000
+DEPTH_HISTORY_PARTITION = os.getenv("DEPTH_HISTORY_PARTITION", "DAY").upper()
+DEPTH_HISTORY_RETENTION_DAYS = float(os.getenv("DEPTH_HISTORY_RETENTION_DAYS", "10"))
+DEPTH_HISTORY_BATCH_SIZE = int(os.getenv("DEPTH_HISTORY_BATCH_SIZE", "200"))
+DEPTH_HISTORY_FLUSH_INTERVAL_SEC = float(os.getenv("DEPTH_HISTORY_FLUSH_INTERVAL_SEC", "1.0"))
+DEPTH_HISTORY_PRUNE_INTERVAL_SEC = float(os.getenv("DEPTH_HISTORY_PRUNE_INTERVAL_SEC", "900"))
+DEPTH_HISTORY_ASYNC = os.getenv("DEPTH_HISTORY_ASYNC", "true").lower() == "true"
+DEPTH_HISTORY_QUEUE_MAX = int(os.getenv("DEPTH_HISTORY_QUEUE_MAX", "50000"))
 IMBALANCE_ALERT = 0.6
 IMBALANCE_ALERT_ENABLE = False
+IMBALANCE_ALERT_COOLDOWN_SEC = float(os.getenv("IMBALANCE_ALERT_COOLDOWN_SEC", "300"))
 TRAILING_STOP_ATR_MULT = 0.8
 MAX_HOLD_MINUTES = 60
 MIN_VOLUME_FILTER = 500
@@ -772,11 +814,23 @@ DESK_DATA_DIR = os.getenv("DESK_DATA_DIR", f"{DESKS_ROOT}/{DESK_ID}")
 DESK_LOG_DIR = os.getenv("DESK_LOG_DIR", f"{LOGS_ROOT}/desks/{DESK_ID}")
 DB_PATH = os.getenv("DB_PATH", f"{DB_ROOT}/{DESK_ID}.sqlite")
 TRADE_DB_PATH = os.getenv("TRADE_DB_PATH", DB_PATH)
+# Pooled SQLite connections (core.db_pool): per-thread WAL connections with these pragmas.
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL").upper()
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16000"))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_STATEMENT_CACHE = int(os.getenv("DB_STATEMENT_CACHE", "256"))
+DB_POOL_MAX_PER_THREAD = int(os.getenv("DB_POOL_MAX_PER_THREAD", "8"))
 DECISION_LOG_PATH = os.getenv("DECISION_LOG_PATH", f"{DESK_LOG_DIR}/decision_events.jsonl")
 DECISION_ERROR_LOG_PATH = os.getenv("DECISION_ERROR_LOG_PATH", f"{DESK_LOG_DIR}/decision_event_errors.jsonl")
 DECISION_SQLITE_PATH = os.getenv("DECISION_SQLITE_PATH", f"{DESK_LOG_DIR}/decision_events.sqlite")
 DECISION_LOG_ENABLED = os.getenv("DECISION_LOG_ENABLED", "false").lower() == "true"
 DECISION_DB_PATH = os.getenv("DECISION_DB_PATH", TRADE_DB_PATH)
+# Decision log writer: SQLite/audit rows are group-committed per batch or interval.
+DECISION_LOG_BATCH_SIZE = int(os.getenv("DECISION_LOG_BATCH_SIZE", "32"))
+DECISION_LOG_FLUSH_INTERVAL_SEC = float(os.getenv("DECISION_LOG_FLUSH_INTERVAL_SEC", "0.5"))
+DECISION_LOG_LOCK_NAME = os.getenv("DECISION_LOG_LOCK_NAME", "decision_log.lock")
+TELEGRAM_OUTBOX_DB_PATH = os.getenv("TELEGRAM_OUTBOX_DB_PATH", f"{DESK_LOG_DIR}/telegram_outbox.sqlite")
 AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", f"{DESK_LOG_DIR}/audit_log.jsonl")
 INCIDENTS_LOG_PATH = os.getenv("INCIDENTS_LOG_PATH", f"{DESK_LOG_DIR}/incidents.jsonl")
 FEATURE_FLAGS_OVERRIDE_PATH = os.getenv("FEATURE_FLAGS_OVERRIDE_PATH", f"{DESK_LOG_DIR}/feature_flags_override.json")
@@ -827,9 +881,17 @@ TRADE_LOG_PATH = os.getenv("TRADE_LOG_PATH", f"{LOGS_ROOT}/trade_log.jsonl")
 RISK_HALT_FILE = os.getenv("RISK_HALT_FILE", f"{LOGS_ROOT}/risk_halt.json")
 LOG_LOCK_FILE = os.getenv("LOG_LOCK_FILE", f"{LOGS_ROOT}/trade_log.lock")
 APPEND_ONLY_LOG = True
+# With APPEND_ONLY_LOG off, fold trade_updates.json back into the trade log every N updates (0 = never).
+TRADE_LOG_COMPACT_UPDATES = int(os.getenv("TRADE_LOG_COMPACT_UPDATES", "200"))
 
 # Data QC / SLA thresholds
 QC_MAX_NULL_RATE = 0.1
+# Streaming QC (scripts/data_qc.py): rows per chunk, per-token gap threshold,
+# gaps longer than a session break are not counted, resumable checkpoint.
+QC_CHUNK_ROWS = int(os.getenv("QC_CHUNK_ROWS", "50000"))
+QC_GAP_SEC = float(os.getenv("QC_GAP_SEC", "30"))
+QC_SESSION_BREAK_SEC = float(os.getenv("QC_SESSION_BREAK_SEC", str(3 * 3600)))
+DATA_QC_CHECKPOINT_PATH = os.getenv("DATA_QC_CHECKPOINT_PATH", f"{LOGS_ROOT}/data_qc_checkpoint.json")
 SLA_MAX_TICK_LAG_SEC = 120
 SLA_MAX_DEPTH_LAG_SEC = 120
 SLA_MIN_TICKS_PER_HOUR = 1000
@@ -898,6 +960,14 @@ BACKTEST_SLIPPAGE_BPS = float(os.getenv("BACKTEST_SLIPPAGE_BPS", "5"))
 BACKTEST_SPREAD_BPS = float(os.getenv("BACKTEST_SPREAD_BPS", "5"))
 BACKTEST_FEE_PER_TRADE = float(os.getenv("BACKTEST_FEE_PER_TRADE", "0.0"))
 BACKTEST_USE_SYNTH_CHAIN = os.getenv("BACKTEST_USE_SYNTH_CHAIN", "true").lower() == "true"
+# Walk-forward windows run on a process pool when > 1 (0 = one per CPU).
+WALK_FORWARD_WORKERS = int(os.getenv("WALK_FORWARD_WORKERS", "1"))
+WALK_FORWARD_START_METHOD = os.getenv("WALK_FORWARD_START_METHOD", "spawn")
+# Replay decisions: "tick", "bar" (per completed minute bar) or an interval such as "500ms" / "5s".
+REPLAY_DECISION_INTERVAL = os.getenv("REPLAY_DECISION_INTERVAL", "tick")
+# Replay farm: (date, symbol) shards per process pool (0 = one per CPU); option delta for hypothetical PnL.
+REPLAY_FARM_WORKERS = int(os.getenv("REPLAY_FARM_WORKERS", "0"))
+REPLAY_FARM_DELTA = float(os.getenv("REPLAY_FARM_DELTA", "0.5"))
 
 # -------------------------------
 # Live monitoring interval (seconds)
@@ -945,17 +1015,38 @@ STARTUP_WARMUP_SYMBOLS = [
     for s in os.getenv("STARTUP_WARMUP_SYMBOLS", "NIFTY,BANKNIFTY,SENSEX").split(",")
     if s.strip()
 ]
+# Build the ML predictor/TradeBuilder on a background thread at Orchestrator init
+# instead of on the first decision (they are never built before the first fetch).
+STARTUP_WARM_ML = os.getenv("STARTUP_WARM_ML", "true").lower() == "true"
+# Budgets enforced by tests/test_startup_budget.py (fresh interpreter to first fetch call).
+# The wall-clock budget is about 2.5x the unloaded time; the module count is the
+# load-independent check (about 1700 today; an eager ML import adds hundreds).
+STARTUP_FIRST_FETCH_BUDGET_SEC = float(os.getenv("STARTUP_FIRST_FETCH_BUDGET_SEC", "4.0"))
+STARTUP_FIRST_FETCH_MAX_MODULES = int(os.getenv("STARTUP_FIRST_FETCH_MAX_MODULES", "2000"))
 INDICATORS_NEVER_COMPUTED_AGE_SEC = float(os.getenv("INDICATORS_NEVER_COMPUTED_AGE_SEC", "1000000000"))
 VWAP_WINDOW = int(os.getenv("VWAP_WINDOW", "20"))
 VWAP_SLOPE_WINDOW = int(os.getenv("VWAP_SLOPE_WINDOW", "10"))
 ATR_PERIOD = int(os.getenv("ATR_PERIOD", "14"))
 ADX_PERIOD = int(os.getenv("ADX_PERIOD", "14"))
 VOL_WINDOW = int(os.getenv("VOL_WINDOW", "30"))
-KITE_RATE_LIMIT_SLEEP = float(os.getenv("KITE_RATE_LIMIT_SLEEP", "0.35"))
+# Per-endpoint token buckets (Kite Connect published limits, requests/sec).
+KITE_QUOTE_RATE_PER_SEC = float(os.getenv("KITE_QUOTE_RATE_PER_SEC", "1"))
+KITE_HISTORICAL_RATE_PER_SEC = float(os.getenv("KITE_HISTORICAL_RATE_PER_SEC", "3"))
+KITE_ORDER_RATE_PER_SEC = float(os.getenv("KITE_ORDER_RATE_PER_SEC", "10"))
+KITE_API_RATE_PER_SEC = float(os.getenv("KITE_API_RATE_PER_SEC", "10"))
+KITE_QUOTE_BATCH_MAX = int(os.getenv("KITE_QUOTE_BATCH_MAX", "500"))
+# Symbols processed in parallel by fetch_live_market_data (1 = sequential).
+MARKET_DATA_WORKERS = int(os.getenv("MARKET_DATA_WORKERS", "4"))
 KITE_TRADES_SYNC = os.getenv("KITE_TRADES_SYNC", "true").lower() == "true"
 KITE_INSTRUMENTS_TTL = int(os.getenv("KITE_INSTRUMENTS_TTL", "3600"))
 KITE_USE_DEPTH = os.getenv("KITE_USE_DEPTH", "true").lower() == "true"
 KITE_STORE_TICKS = os.getenv("KITE_STORE_TICKS", "true").lower() == "true"
+TICK_WRITER_ASYNC = os.getenv("TICK_WRITER_ASYNC", "true").lower() == "true"
+TICK_WRITER_QUEUE_MAX = int(os.getenv("TICK_WRITER_QUEUE_MAX", "50000"))
+TICK_WRITER_BATCH_SIZE = int(os.getenv("TICK_WRITER_BATCH_SIZE", "500"))
+TICK_WRITER_FLUSH_INTERVAL_SEC = float(os.getenv("TICK_WRITER_FLUSH_INTERVAL_SEC", "0.25"))
+TICK_WRITER_OVERFLOW = os.getenv("TICK_WRITER_OVERFLOW", "DROP_OLDEST").upper()
+TICK_WRITER_BLOCK_TIMEOUT_SEC = float(os.getenv("TICK_WRITER_BLOCK_TIMEOUT_SEC", "0.05"))
 DEPTH_WS_LOCK_NAME = os.getenv("DEPTH_WS_LOCK_NAME", "depth_ws.lock")
 DEPTH_WS_LOCK_MAX_AGE_SEC = float(os.getenv("DEPTH_WS_LOCK_MAX_AGE_SEC", "3600"))
 DEPTH_WS_SINGLETON = os.getenv("DEPTH_WS_SINGLETON", "true").lower() == "true"
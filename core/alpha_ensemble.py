@@ -4,8 +4,6 @@ import math
 from pathlib import Path
 from typing import Dict, Optional
 
-import joblib
-
 from config import config as cfg
 
 
@@ -60,6 +58,8 @@ class AlphaEnsemble:
             try:
                 path = Path(self.model_path)
                 if path.exists():
+                    import joblib
+
                     self.meta_model = joblib.load(path)
             except Exception:
                 self.meta_model = None
@@ -1,8 +1,10 @@
 import json
 import hashlib
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from config import config as cfg
 from core.paths import logs_dir
@@ -12,16 +14,22 @@ from core.time_utils import now_utc_epoch, now_ist
 AUDIT_LOG = Path(getattr(cfg, "AUDIT_LOG_PATH", str(logs_dir() / "audit_log.jsonl")))
 GENESIS = "GENESIS"
 
+# Chain head of the last append: (path, inode, size) -> event_hash. Reused
+# while the file is unchanged since our own write, so appends skip the tail read.
+_HEAD_LOCK = threading.Lock()
+_HEAD: Dict[str, Tuple[int, int, str]] = {}
+
 
 def _canonical_json(data: Dict[str, Any]) -> str:
     return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
 
 
-def _read_last_hash() -> str:
-    if not AUDIT_LOG.exists():
+def _read_last_hash(path: Optional[Path] = None) -> str:
+    path = Path(path) if path is not None else AUDIT_LOG
+    if not path.exists():
         return GENESIS
     try:
-        with AUDIT_LOG.open("rb") as f:
+        with path.open("rb") as f:
             f.seek(0, 2)
             size = f.tell()
             if size == 0:
@@ -50,17 +58,49 @@ def _compute_hash(event: Dict[str, Any]) -> str:
     return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
 
+def _chain_head(path: Path) -> str:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return GENESIS
+    cached = _HEAD.get(str(path))
+    if cached is not None and cached[0] == st.st_ino and cached[1] == st.st_size:
+        return cached[2]
+    return _read_last_hash(path)
+
+
+def append_events(events: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    Chain and append several events with one file open and one head lookup.
+    """
+    events = list(events)
+    if not events:
+        return []
+    path = AUDIT_LOG
+    path.parent.mkdir(parents=True, exist_ok=True)
+    hashes: List[str] = []
+    with _HEAD_LOCK:
+        prev = _chain_head(path)
+        lines = []
+        for event in events:
+            event.setdefault("ts_epoch", now_utc_epoch())
+            event.setdefault("ts_ist", now_ist().isoformat())
+            event.setdefault("desk_id", getattr(cfg, "DESK_ID", "DEFAULT"))
+            event["prev_hash"] = prev
+            event["event_hash"] = _compute_hash(event)
+            prev = event["event_hash"]
+            hashes.append(prev)
+            lines.append(_canonical_json(event) + "\n")
+        with path.open("a") as f:
+            f.write("".join(lines))
+            f.flush()
+            st = os.fstat(f.fileno())
+        _HEAD[str(path)] = (st.st_ino, st.st_size, prev)
+    return hashes
+
+
 def append_event(event: Dict[str, Any]) -> str:
-    AUDIT_LOG.parent.mkdir(parents=True, exist_ok=True)
-    event.setdefault("ts_epoch", now_utc_epoch())
-    event.setdefault("ts_ist", now_ist().isoformat())
-    event.setdefault("desk_id", getattr(cfg, "DESK_ID", "DEFAULT"))
-    prev = _read_last_hash()
-    event["prev_hash"] = prev
-    event["event_hash"] = _compute_hash(event)
-    with AUDIT_LOG.open("a") as f:
-        f.write(_canonical_json(event) + "\n")
-    return event["event_hash"]
+    return append_events([event])[0]
 
 
 def verify_chain(path: Path = AUDIT_LOG) -> Tuple[bool, str, int]:
@@ -17,6 +17,7 @@ from core import ml_governance
 from core.strategy_decay import compute_decay
 from core.retrain_manager import RetrainManager
 from core.trade_log_paths import ensure_trade_log_exists, ensure_trade_log_file, resolve_trade_log_path
+from core.trade_log_store import iter_trades
 
 
 class AutoRetrain:
@@ -332,11 +333,8 @@ class AutoRetrain:
             return None
         rows = []
         try:
-            text = p.read_text().strip()
-            if text.startswith("["):
-                data = json.loads(text)
-            else:
-                data = [json.loads(line) for line in text.splitlines() if line.strip()]
+            # Merged view (legacy JSON arrays too): outcomes may still be in the updates journal.
+            data = list(iter_trades(p))
         except Exception:
             return None
 
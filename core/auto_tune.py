@@ -1,9 +1,11 @@
 import json
 import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
 from config import config as cfg
+from core.trade_log_store import iter_trades
 
 AUTO_TUNE_PATH = Path("logs/auto_tune.json")
 _LAST_TUNE_TS = 0
@@ -12,26 +14,16 @@ _LAST_TUNE_TS = 0
 def _read_recent_trades(path: Path, limit: int):
     if not path.exists():
         return []
-    rows = []
+    # Merged view: outcomes may still be in the updates journal.
+    rows = deque(maxlen=max(0, int(limit)))
     try:
-        lines = path.read_text().splitlines()
+        for obj in iter_trades(path):
+            # require labeled outcomes
+            if obj.get("actual") is not None:
+                rows.append(obj)
     except Exception:
         return []
-    # iterate from end for most recent
-    for line in reversed(lines):
-        if not line.strip():
-            continue
-        try:
-            obj = json.loads(line)
-        except Exception:
-            continue
-        # require labeled outcomes
-        if obj.get("actual") is None:
-            continue
-        rows.append(obj)
-        if len(rows) >= limit:
-            break
-    return list(reversed(rows))
+    return list(rows)
 
 
 def _compute_pnl(trade):
@@ -1,20 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
 import pandas as pd
-from dataclasses import replace
-from strategies.trade_builder import TradeBuilder
+
+from strategies.trade_builder import TradeBuilder, diagnostics_suppressed
 from core.risk_engine import RiskEngine
 from core.execution_guard import ExecutionGuard
 from core.execution_engine import ExecutionEngine
 from core.feature_builder import add_indicators
-from core.option_chain import fetch_option_chain
-from core.filters import get_bias
-from datetime import datetime
+from core.market_calendar import next_expiry_after
+from core.option_chain import synthetic_option_chain
+from core.snapshot_publisher import suppressed as snapshot_publishing_suppressed
+from core.time_utils import IST_TZ
 from config import config as cfg
 
+TIMESTAMP_COLUMNS = ("datetime", "timestamp", "date", "ts")
+
+# Indicator columns passed through to TradeBuilder on every bar.
+FEATURE_COLUMNS = ("vwap_slope", "rsi_mom", "rsi_14", "vol_z", "adx_14", "ema_20", "ema_50", "return_1")
+
+ChainProvider = Callable[[str, float, Optional[float]], list]
+
+
+@dataclass
+class SymbolBars:
+    """
+    One symbol's bars after indicators, as NumPy columns. `fwd_high` /
+    `fwd_low` hold the max high / min low of the `horizon` bars starting at
+    each position, so a target/stop touch is a single lookup.
+    """
+
+    symbol: str
+    frame: pd.DataFrame
+    times: Optional[pd.Series]
+    epoch: Optional[np.ndarray]
+    day: Optional[np.ndarray]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    vwap: np.ndarray
+    atr: np.ndarray
+    features: Dict[str, np.ndarray]
+    fwd_high: np.ndarray
+    fwd_low: np.ndarray
+    expiries: Dict[int, object] = field(default_factory=dict)
+
+    @property
+    def n(self) -> int:
+        return len(self.close)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, symbol: str, horizon: int) -> "SymbolBars":
+        data = add_indicators(df).dropna().reset_index(drop=True)
+        times = epoch = day = None
+        ts_col = next((c for c in TIMESTAMP_COLUMNS if c in data.columns), None)
+        if ts_col is not None:
+            ts = pd.to_datetime(data[ts_col], errors="coerce")
+            if len(ts) and not ts.isna().any():
+                # Naive bar times are taken as exchange-local wall time.
+                if ts.dt.tz is not None:
+                    utc = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+                    times = ts.dt.tz_convert(IST_TZ).dt.tz_localize(None)
+                else:
+                    utc = times = ts
+                epoch = utc.to_numpy().astype("datetime64[ns]").astype("int64") / 1e9
+                day = times.to_numpy().astype("datetime64[D]").astype("int64")
+        high = data["high"].to_numpy(dtype=float)
+        low = data["low"].to_numpy(dtype=float)
+        close = data["close"].to_numpy(dtype=float)
+        atr = data["atr_14"].to_numpy(dtype=float) if "atr_14" in data.columns else np.maximum(1.0, close * 0.002)
+        return cls(
+            symbol=symbol,
+            frame=data,
+            times=times,
+            epoch=epoch,
+            day=day,
+            open=data["open"].to_numpy(dtype=float),
+            high=high,
+            low=low,
+            close=close,
+            volume=data["volume"].to_numpy(),
+            vwap=data["vwap"].to_numpy(dtype=float) if "vwap" in data.columns else close,
+            atr=atr,
+            features={c: data[c].to_numpy(dtype=float) for c in FEATURE_COLUMNS if c in data.columns},
+            fwd_high=forward_extreme(high, horizon, np.max),
+            fwd_low=forward_extreme(low, horizon, np.min),
+        )
+
+    def first_touch(self, start: int, stop: int, level: float, above: bool) -> Optional[int]:
+        """
+        First position in [start, stop) whose high reaches `level` (or whose
+        low does, when `above` is False).
+        """
+        seg = self.high[start:stop] >= level if above else self.low[start:stop] <= level
+        if not seg.size:
+            return None
+        k = int(seg.argmax())
+        return start + k if seg[k] else None
+
+    def bar_time(self, i: int):
+        if self.times is None:
+            return None
+        return self.times.iat[i].to_pydatetime()
+
+    def day_key(self, i: int) -> Optional[int]:
+        if self.day is None:
+            return None
+        return int(self.day[i])
+
+
+def forward_extreme(values: np.ndarray, horizon: int, reduce) -> np.ndarray:
+    """
+    `reduce` over values[i:i+horizon] for every i, truncated at the end.
+    """
+    horizon = max(int(horizon), 1)
+    if not len(values):
+        return values.astype(float)
+    pad = -np.inf if reduce is np.max else np.inf
+    padded = np.concatenate([values.astype(float), np.full(horizon - 1, pad)])
+    return reduce(np.lib.stride_tricks.sliding_window_view(padded, horizon), axis=1)
+
+
+def _bias(ltp: float, vwap: float) -> str:
+    # Same rule as core.filters.get_bias.
+    if abs(ltp - vwap) < 15:
+        return "NEUTRAL"
+    return "BULLISH" if ltp > vwap else "BEARISH"
+
+
 class BacktestEngine:
-    def __init__(self, historical_data: pd.DataFrame, starting_capital=100000, train_stats=None):
+    """
+    Event-driven bar backtest.
+
+    - Indicators are computed once per symbol and held as NumPy columns.
+    - Bars from every symbol (a `symbol` column, else the `symbol` argument)
+      are merged into one time-ordered event stream sharing a single
+      portfolio.
+    - Each event builds one TradeBuilder snapshot; option chains come from
+      `chain_provider` (recorded chains) or are synthesised in memory.
+    - Entry triggers and target/stop touches are resolved with forward
+      scans over the arrays instead of nested iterrows.
+    """
+
+    def __init__(
+        self,
+        historical_data: pd.DataFrame,
+        starting_capital=100000,
+        train_stats=None,
+        symbol: str = "NIFTY",
+        chain_provider: Optional[ChainProvider] = None,
+    ):
         self.data = historical_data
         self.capital = starting_capital
         self.train_stats = train_stats or {}
+        self.symbol = symbol
+        self.chain_provider = chain_provider
         self.portfolio = {
             "capital": starting_capital,
             "trades": [],
@@ -31,132 +177,192 @@ class BacktestEngine:
         self.slippage_bps = getattr(cfg, "BACKTEST_SLIPPAGE_BPS", 5)
         self.fee_per_trade = getattr(cfg, "BACKTEST_FEE_PER_TRADE", 0.0)
         self.spread_bps = getattr(cfg, "BACKTEST_SPREAD_BPS", 5)
+        self.use_synth_chain = getattr(cfg, "BACKTEST_USE_SYNTH_CHAIN", True)
+        self.bars: Dict[str, SymbolBars] = {}
+        self.stats: Dict[str, float] = {}
+
+    def prepare(self) -> Dict[str, SymbolBars]:
+        data = self.data
+        if "symbol" in data.columns:
+            groups = [(str(sym), grp.drop(columns=["symbol"])) for sym, grp in data.groupby("symbol", sort=True)]
+        else:
+            groups = [(self.symbol, data)]
+        self.bars = {sym: SymbolBars.build(grp, sym, self.horizon) for sym, grp in groups}
+        return self.bars
+
+    def _events(self) -> List[tuple]:
+        """
+        (symbol, bar) pairs in time order, symbols in name order within a
+        timestamp. Bars without `horizon` future bars are not traded.
+        """
+        syms, idxs, keys = [], [], []
+        for k, (sym, bars) in enumerate(self.bars.items()):
+            n_events = max(bars.n - self.horizon, 0)
+            if not n_events:
+                continue
+            idx = np.arange(n_events)
+            syms.append(np.full(n_events, k))
+            idxs.append(idx)
+            keys.append(bars.epoch[:n_events] if bars.epoch is not None else idx.astype(float))
+        if not idxs:
+            return []
+        sym_arr = np.concatenate(syms)
+        idx_arr = np.concatenate(idxs)
+        order = np.lexsort((sym_arr, np.concatenate(keys)))
+        names = list(self.bars)
+        return [(names[s], i) for s, i in zip(sym_arr[order].tolist(), idx_arr[order].tolist())]
+
+    def _chain(self, symbol: str, ltp: float, ts_epoch: Optional[float], bars: SymbolBars, i: int) -> list:
+        if self.chain_provider is not None:
+            return self.chain_provider(symbol, ltp, ts_epoch) or []
+        if not self.use_synth_chain:
+            return []
+        expiry = None
+        day = bars.day_key(i)
+        if day is not None:
+            expiry = bars.expiries.get(day)
+            if expiry is None:
+                bar_date = (datetime(1970, 1, 1) + timedelta(days=day)).date()
+                expiry = next_expiry_after(
+                    bar_date - timedelta(days=1),
+                    expiry_type=getattr(cfg, "TERM_STRUCTURE_EXPIRY", "WEEKLY"),
+                    symbol=symbol,
+                ) or bar_date
+                bars.expiries[day] = expiry
+        return synthetic_option_chain(symbol, ltp, expiry=expiry, timestamp=ts_epoch)
+
+    def _market_data(self, bars: SymbolBars, i: int) -> dict:
+        ltp = float(bars.close[i])
+        vwap = float(bars.vwap[i])
+        ts_epoch = float(bars.epoch[i]) if bars.epoch is not None else None
+        market_data = {
+            "symbol": bars.symbol,
+            "ltp": ltp,
+            "vwap": vwap,
+            "atr": float(bars.atr[i]),
+            "orb_high": float(bars.high[i]),
+            "orb_low": float(bars.low[i]),
+            "volume": bars.volume[i].item(),
+            "bias": _bias(ltp, vwap),
+            "option_chain": self._chain(bars.symbol, ltp, ts_epoch, bars, i),
+            "timestamp": ts_epoch if ts_epoch is not None else datetime.now().timestamp(),
+            # The bar close is the index quote; never consult the live cache.
+            "index_quote_cache": {"last_price": ltp},
+            "ltp_change": float(bars.close[i] - bars.close[i - 1]) if i else 0.0,
+            "indicators_ok": True,
+        }
+        for name, col in bars.features.items():
+            market_data[name] = float(col[i])
+        return market_data
+
+    def _apply_cost(self, price, side):
+        bps = self.slippage_bps + self.spread_bps
+        if side == "BUY":
+            return price * (1 + bps / 10000.0)
+        return price * (1 - bps / 10000.0)
 
     def run(self):
         results = []
-        data = add_indicators(self.data).dropna().reset_index(drop=True)
+        bars_by_symbol = self.prepare()
         horizon = self.horizon
+        entry_span = min(self.entry_window, horizon)
+        evaluated = 0
+        current_day = None
 
-        for idx, row in data.iterrows():
-            if idx + horizon >= len(data):
-                break
-
-            ltp = row["close"]
-            vwap = row.get("vwap", ltp)
-            atr = row.get("atr_14", max(1.0, ltp * 0.002))
-            option_chain = fetch_option_chain("NIFTY", ltp, force_synthetic=getattr(cfg, "BACKTEST_USE_SYNTH_CHAIN", True))
-
-            market_data = {
-                "symbol": "NIFTY",
-                "ltp": ltp,
-                "vwap": vwap,
-                "atr": atr,
-                "orb_high": row["high"],
-                "orb_low": row["low"],
-                "volume": row["volume"],
-                "bias": get_bias(ltp, vwap),
-                "option_chain": option_chain,
-                "timestamp": datetime.now().timestamp()
-            }
-            trade = self.trade_builder.build(market_data)
-            if not trade:
-                continue
+        with snapshot_publishing_suppressed(), diagnostics_suppressed():
+            for symbol, idx in self._events():
+                bars = bars_by_symbol[symbol]
+                evaluated += 1
+                day = bars.day_key(idx)
+                if day is not None and day != current_day:
+                    if current_day is not None:
+                        self.portfolio["trades_today"] = 0
+                    current_day = day
 
-            # Risk Engine check
-            allowed, reason = self.risk_engine.allow_trade(self.portfolio)
-            if not allowed:
-                continue
+                trade = self.trade_builder.build(self._market_data(bars, idx))
+                if not trade:
+                    continue
 
-            # Execution Guard check
-            approved, reason = self.execution_guard.validate(trade, self.portfolio, trade.regime)
-            if not approved:
-                continue
+                # Risk Engine check
+                allowed, reason = self.risk_engine.allow_trade(self.portfolio)
+                if not allowed:
+                    continue
 
-            # Risk sizing (vol target from train window)
-            lot_size = getattr(cfg, "LOT_SIZE", {}).get(trade.symbol, 1)
-            current_vol = (atr / ltp) if ltp else None
-            sized_qty = self.risk_engine.size_trade(
-                trade,
-                self.portfolio["capital"],
-                lot_size,
-                current_vol=current_vol,
-                vol_target=self.vol_target,
-            )
-            trade = replace(trade, qty=sized_qty, capital_at_risk=round((trade.entry_price - trade.stop_loss) * sized_qty * lot_size, 2))
-
-            # Simulate execution using future bars
-            future = data.iloc[idx + 1: idx + 1 + horizon]
-            # Entry trigger: only enter if price crosses entry condition
-            entry_idx = None
-            if trade.entry_condition == "BUY_ABOVE":
-                for j, r in future.head(self.entry_window).iterrows():
-                    if r["high"] >= trade.entry_price:
-                        entry_idx = j
-                        break
-            elif trade.entry_condition == "SELL_BELOW":
-                for j, r in future.head(self.entry_window).iterrows():
-                    if r["low"] <= trade.entry_price:
-                        entry_idx = j
-                        break
-            else:
-                entry_idx = future.index[0] if not future.empty else None
-
-            if entry_idx is None:
-                continue
+                # Execution Guard check
+                approved, reason = self.execution_guard.validate(trade, self.portfolio, trade.regime)
+                if not approved:
+                    continue
 
-            eval_start = data.index.get_loc(entry_idx) + 1
-            eval_slice = data.iloc[eval_start: eval_start + horizon]
-            if eval_slice.empty:
-                continue
+                # Risk sizing (vol target from train window)
+                ltp = float(bars.close[idx])
+                atr = float(bars.atr[idx])
+                lot_size = getattr(cfg, "LOT_SIZE", {}).get(trade.symbol, 1)
+                current_vol = (atr / ltp) if ltp else None
+                sized_qty = self.risk_engine.size_trade(
+                    trade,
+                    self.portfolio["capital"],
+                    lot_size,
+                    current_vol=current_vol,
+                    vol_target=self.vol_target,
+                )
+                trade = replace(trade, qty=sized_qty, capital_at_risk=round((trade.entry_price - trade.stop_loss) * sized_qty * lot_size, 2))
 
-            hit_target = (eval_slice["high"] >= trade.target).any()
-            hit_stop = (eval_slice["low"] <= trade.stop_loss).any()
+                # Entry trigger: only enter if price crosses entry condition
+                if trade.entry_condition == "BUY_ABOVE":
+                    entry_idx = bars.first_touch(idx + 1, idx + 1 + entry_span, trade.entry_price, above=True)
+                elif trade.entry_condition == "SELL_BELOW":
+                    entry_idx = bars.first_touch(idx + 1, idx + 1 + entry_span, trade.entry_price, above=False)
+                else:
+                    entry_idx = idx + 1
+                if entry_idx is None:
+                    continue
 
-            # Apply costs/slippage to fills
-            def _apply_cost(price, side):
-                bps = self.slippage_bps + self.spread_bps
-                if side == "BUY":
-                    return price * (1 + bps / 10000.0)
-                return price * (1 - bps / 10000.0)
+                eval_start = entry_idx + 1
+                if eval_start >= bars.n:
+                    continue
+                hit_target = bool(bars.fwd_high[eval_start] >= trade.target)
+                hit_stop = bool(bars.fwd_low[eval_start] <= trade.stop_loss)
 
-            entry_fill = _apply_cost(trade.entry_price, "BUY")
-            if hit_target and not hit_stop:
-                exit_fill = _apply_cost(trade.target, "SELL")
-                pl = (exit_fill - entry_fill) * trade.qty * lot_size
-                outcome = "TARGET"
-            elif hit_stop and not hit_target:
-                exit_fill = _apply_cost(trade.stop_loss, "SELL")
+                # Apply costs/slippage to fills
+                entry_fill = self._apply_cost(trade.entry_price, "BUY")
+                if hit_target and not hit_stop:
+                    exit_fill = self._apply_cost(trade.target, "SELL")
+                    outcome = "TARGET"
+                elif hit_stop and not hit_target:
+                    exit_fill = self._apply_cost(trade.stop_loss, "SELL")
+                    outcome = "STOP"
+                else:
+                    last = min(eval_start + horizon, bars.n) - 1
+                    exit_fill = self._apply_cost(float(bars.close[last]), "SELL")
+                    outcome = "TIMEOUT"
                 pl = (exit_fill - entry_fill) * trade.qty * lot_size
-                outcome = "STOP"
-            else:
-                exit_fill = _apply_cost(eval_slice["close"].iloc[-1], "SELL")
-                pl = (exit_fill - entry_fill) * trade.qty * lot_size
-                outcome = "TIMEOUT"
-
-            # Fees (entry + exit)
-            pl -= self.fee_per_trade * 2
-
-            self.portfolio["capital"] += pl
-            self.portfolio["trades"].append(trade)
-            self.portfolio["trades_today"] += 1
-
-            results.append({
-                "timestamp": trade.timestamp,
-                "symbol": trade.symbol,
-                "side": trade.side,
-                "entry": trade.entry_price,
-                "entry_condition": getattr(trade, "entry_condition", None),
-                "entry_ref_price": getattr(trade, "entry_ref_price", None),
-                "target": trade.target,
-                "stop_loss": trade.stop_loss,
-                "qty": trade.qty,
-                "pl": pl,
-                "outcome": outcome,
-                "capital": self.portfolio["capital"],
-                "strategy": getattr(trade, "strategy", None),
-                "regime": getattr(trade, "regime", None),
-                "day_type": getattr(trade, "day_type", None),
-                "rr": round(abs(trade.target - trade.entry_price) / max(abs(trade.entry_price - trade.stop_loss), 1e-6), 3),
-            })
 
+                # Fees (entry + exit)
+                pl -= self.fee_per_trade * 2
+
+                self.portfolio["capital"] += pl
+                self.portfolio["trades"].append(trade)
+                self.portfolio["trades_today"] += 1
+
+                bar_time = bars.bar_time(idx)
+                results.append({
+                    "timestamp": bar_time if bar_time is not None else trade.timestamp,
+                    "symbol": trade.symbol,
+                    "side": trade.side,
+                    "entry": trade.entry_price,
+                    "entry_condition": getattr(trade, "entry_condition", None),
+                    "entry_ref_price": getattr(trade, "entry_ref_price", None),
+                    "target": trade.target,
+                    "stop_loss": trade.stop_loss,
+                    "qty": trade.qty,
+                    "pl": pl,
+                    "outcome": outcome,
+                    "capital": self.portfolio["capital"],
+                    "strategy": getattr(trade, "strategy", None),
+                    "regime": getattr(trade, "regime", None),
+                    "day_type": getattr(trade, "day_type", None),
+                    "rr": round(abs(trade.target - trade.entry_price) / max(abs(trade.entry_price - trade.stop_loss), 1e-6), 3),
+                })
+
+        self.stats = {"bars": int(sum(b.n for b in bars_by_symbol.values())), "events": evaluated, "trades": len(results)}
         return pd.DataFrame(results)
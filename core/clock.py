@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import Any, Optional
+
+
+class WallClock:
+    """
+    Real time: `time()` is the epoch and `sleep()` blocks. Modeled delays
+    (`elapse`) are not waited out, so live and paper behave as before.
+    """
+
+    simulated = False
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(max(float(seconds or 0.0), 0.0))
+
+    def elapse(self, seconds: float) -> None:
+        return None
+
+    def observe(self, ts: Any) -> None:
+        return None
+
+
+class SimClock:
+    """
+    Virtual time for backtests, replays and fill simulation.
+
+    - `sleep()` and `elapse()` advance the clock instantly, never by less
+      than `min_step_sec`, so a polling loop with poll_sec=0 still reaches
+      its timeout.
+    - `observe(ts)` moves the clock forward to a quote timestamp, so the
+      clock follows the snapshot stream; it never moves backwards.
+    - Nothing reads wall time, so identical inputs give identical results.
+    """
+
+    simulated = True
+
+    def __init__(self, start: float = 0.0, min_step_sec: float = 0.001) -> None:
+        self._now = float(start)
+        self.min_step_sec = max(float(min_step_sec), 1e-9)
+        self._lock = Lock()
+
+    def time(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self._now += max(float(seconds or 0.0), self.min_step_sec)
+
+    def elapse(self, seconds: float) -> None:
+        if seconds and seconds > 0:
+            with self._lock:
+                self._now += float(seconds)
+
+    def observe(self, ts: Any) -> None:
+        try:
+            ts = float(ts)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            if ts > self._now:
+                self._now = ts
+
+    def advance_to(self, epoch: float) -> None:
+        """
+        Set the clock to `epoch` (e.g. the bar or tick being replayed).
+        Moving backwards is allowed here so one clock can be reused across
+        replayed sessions.
+        """
+        with self._lock:
+            self._now = float(epoch)
+
+
+WALL_CLOCK = WallClock()
+
+
+def resolve_clock(clock: Optional[Any]) -> Any:
+    return clock if clock is not None else WALL_CLOCK
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType, ModuleType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from config import config as cfg
+from core.paths import logs_dir
+from core.log_writer import get_jsonl_writer
+
+_RELOAD_LOG_PATH = logs_dir() / "config_reload.jsonl"
+_RELOAD_LOGGER = get_jsonl_writer(_RELOAD_LOG_PATH)
+
+_MISSING = object()
+
+
+def _public_values(namespace: Mapping[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in namespace.items() if k.isupper() and not k.startswith("_")}
+
+
+def _frozen_copy(value: Any) -> Any:
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value
+
+
+class ConfigSnapshot:
+    """
+    Immutable, versioned view of the public config keys.
+
+    Read keys as attributes (`snap.KILL_SWITCH`) or with `snap.get(key, default)`.
+    `changed` holds the keys that differ from the previous version.
+    """
+
+    __slots__ = ("version", "values", "changed", "created_epoch")
+
+    def __init__(self, version: int, values: Dict[str, Any], changed: FrozenSet[str]) -> None:
+        object.__setattr__(self, "version", int(version))
+        object.__setattr__(self, "values", MappingProxyType(values))
+        object.__setattr__(self, "changed", frozenset(changed))
+        object.__setattr__(self, "created_epoch", time.time())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self.values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.values
+
+
+def overlay(overrides: Mapping[str, Any], base: Optional[ConfigSnapshot] = None) -> ConfigSnapshot:
+    """
+    Snapshot of `base` (default: the config module's current values) with
+    `overrides` on top. Nothing is set on the module, so code that reads
+    the module directly, in any thread, never sees the overrides.
+    """
+    if base is None:
+        values = {k: _frozen_copy(v) for k, v in _public_values(vars(cfg)).items()}
+        version = 0
+    else:
+        values = dict(base.values)
+        version = base.version
+    values.update({k: _frozen_copy(v) for k, v in overrides.items()})
+    return ConfigSnapshot(version, values, frozenset(overrides))
+
+
+class ConfigService:
+    """
+    Hot-reload for config/config.py and .env without importlib.reload.
+
+    refresh() stats the watched files. When one changed, .env entries whose
+    value changed are applied to os.environ, config.py is executed into a
+    fresh namespace, and only the keys whose computed value changed are set
+    on the config module. Runtime overrides of other keys (the access token,
+    DB_PATH, test monkeypatches) are kept. The published snapshot is rebuilt
+    from the module only when a value differs, so readers see one consistent
+    version for a whole cycle.
+    """
+
+    def __init__(self, module: Optional[ModuleType] = None, env_path: Optional[str | Path] = None) -> None:
+        self._module = module or cfg
+        self._env_path = Path(env_path) if env_path else None
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._stamps: Optional[Tuple[Any, ...]] = None
+        self._file_values: Optional[Dict[str, Any]] = None
+        self._env_values: Dict[str, Optional[str]] = {}
+        self._reloads = 0
+        self._errors = 0
+        self._last_reload_ms: Optional[float] = None
+
+    def config_path(self) -> Path:
+        return Path(self._module.__file__)
+
+    def env_path(self) -> Path:
+        if self._env_path is None:
+            # Same lookup as config.py's load_dotenv(): walk up from the repo package.
+            found = ""
+            try:
+                from dotenv import find_dotenv  # type: ignore
+
+                found = find_dotenv()
+            except Exception:
+                pass
+            self._env_path = Path(found) if found else Path.cwd() / ".env"
+        return self._env_path
+
+    def watched_paths(self) -> List[Path]:
+        return [self.config_path(), self.env_path()]
+
+    def _stat(self) -> Tuple[Any, ...]:
+        out = []
+        for path in self.watched_paths():
+            try:
+                st = os.stat(path)
+                out.append((str(path), st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append((str(path), None, None))
+        return tuple(out)
+
+    def _read_env(self) -> Dict[str, Optional[str]]:
+        path = self.env_path()
+        if not path.exists():
+            return {}
+        try:
+            from dotenv import dotenv_values  # type: ignore
+
+            return dict(dotenv_values(path))
+        except Exception:
+            return {}
+
+    def _exec_config(self) -> Dict[str, Any]:
+        path = self.config_path()
+        source = path.read_text()
+        namespace: Dict[str, Any] = {"__name__": self._module.__name__, "__file__": str(path)}
+        exec(compile(source, str(path), "exec"), namespace)
+        return _public_values(namespace)
+
+    def _apply_env(self) -> List[str]:
+        new_env = self._read_env()
+        changed = []
+        for key in set(self._env_values) | set(new_env):
+            old = self._env_values.get(key, _MISSING)
+            new = new_env.get(key, _MISSING)
+            if old == new:
+                continue
+            changed.append(key)
+            if new is _MISSING or new is None:
+                if old is not _MISSING and os.environ.get(key) == old:
+                    os.environ.pop(key, None)
+            else:
+                os.environ[key] = new
+        self._env_values = new_env
+        return sorted(changed)
+
+    def _reload_files(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        env_keys = self._apply_env()
+        new_values = self._exec_config()
+        old_values = self._file_values or {}
+        file_keys = sorted(k for k, v in new_values.items() if k not in old_values or old_values[k] != v)
+        for key in file_keys:
+            setattr(self._module, key, new_values[key])
+        self._file_values = new_values
+        self._reloads += 1
+        self._last_reload_ms = (time.perf_counter() - started) * 1000.0
+        return {"env_keys": env_keys, "config_keys": file_keys}
+
+    def refresh(self) -> ConfigSnapshot:
+        """
+        Reload if a watched file changed and return the current snapshot.
+        """
+        with self._lock:
+            stamps = self._stat()
+            reload_info: Optional[Dict[str, Any]] = None
+            if self._file_values is None:
+                # Baseline: what the files produce now, without touching the module.
+                try:
+                    self._env_values = self._read_env()
+                    self._file_values = self._exec_config()
+                except Exception as exc:
+                    self._file_values = _public_values(vars(self._module))
+                    self._log_error(exc)
+            elif stamps != self._stamps:
+                try:
+                    reload_info = self._reload_files()
+                except Exception as exc:
+                    self._log_error(exc)
+            self._stamps = stamps
+            return self._publish(reload_info)
+
+    def current(self) -> ConfigSnapshot:
+        """
+        The last published snapshot (published on first use).
+        """
+        snap = self._snapshot
+        if snap is None:
+            return self.refresh()
+        return snap
+
+    def _publish(self, reload_info: Optional[Dict[str, Any]]) -> ConfigSnapshot:
+        values = _public_values(vars(self._module))
+        prev = self._snapshot
+        if prev is not None and values == prev.values:
+            return prev
+        if prev is None:
+            changed: FrozenSet[str] = frozenset()
+            version = 1
+        else:
+            old = prev.values
+            changed = frozenset(k for k in set(values) | set(old) if values.get(k, _MISSING) != old.get(k, _MISSING))
+            version = prev.version + 1
+        snap = ConfigSnapshot(version, {k: _frozen_copy(v) for k, v in values.items()}, changed)
+        self._snapshot = snap
+        if prev is not None:
+            payload = {
+                "ts_epoch": snap.created_epoch,
+                "event": "CONFIG_SNAPSHOT",
+                "version": version,
+                "changed_keys": sorted(changed),
+            }
+            if reload_info is not None:
+                payload.update(reload_info)
+                payload["reload_ms"] = self._last_reload_ms
+            try:
+                _RELOAD_LOGGER.write(payload)
+            except Exception:
+                pass
+        return snap
+
+    def _log_error(self, exc: Exception) -> None:
+        self._errors += 1
+        try:
+            _RELOAD_LOGGER.write(
+                {
+                    "ts_epoch": time.time(),
+                    "event": "CONFIG_RELOAD_ERROR",
+                    "error": f"{type(exc).__name__}:{exc}",
+                }
+            )
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._snapshot
+        return {
+            "version": snap.version if snap else None,
+            "reloads": self._reloads,
+            "errors": self._errors,
+            "last_reload_ms": self._last_reload_ms,
+            "watched": [str(p) for p in self.watched_paths()],
+        }
+
+
+config_service = ConfigService()
@@ -0,0 +1,405 @@
+"""
+Streaming data-quality checks for the tick table and the depth_hist_*
+partitions listed in the depth_history catalog.
+
+Rows are walked in (timestamp_epoch, rowid) order through the table's epoch
+index, a chunk at a time, and folded into a small per instrument_token
+state, so memory depends on the number of tokens rather than the number of
+rows. Blob columns such as the partitions' levels are only tested for NULL,
+never fetched.
+
+The walk position and the accumulated state are kept in a JSON checkpoint,
+one entry per table, so each depth partition resumes on its own and a
+closed partition costs two index seeks per run.
+The next run resumes after the cursor and also picks up "late" rows: rows
+stored since the last run whose timestamp is older than the cursor. They
+are found with a rowid range scan and counted as out-of-order.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import config as cfg
+from core import db_indexes
+from core.depth_history import LEGACY_TABLE, catalog_partitions
+
+CHECKPOINT_VERSION = 1
+
+# Tables walked by timestamp_epoch with per-token stats; stream_tables() adds
+# the depth partitions.
+STREAM_TABLES = ("ticks",)
+
+
+def _iso(epoch: Optional[float]) -> Optional[str]:
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(float(epoch), tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _token_key(text: str) -> Any:
+    # Checkpoint keys are strings; restore the instrument_token values.
+    if text == "None":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def depth_partitions(conn: sqlite3.Connection) -> List[str]:
+    return [name for name, _, _ in catalog_partitions(conn)]
+
+
+def stream_tables(conn: sqlite3.Connection) -> List[str]:
+    """
+    STREAM_TABLES plus every catalogued depth partition, oldest first. A
+    legacy depth_snapshots table is still walked until it has been migrated.
+    """
+    tables = list(STREAM_TABLES) + depth_partitions(conn)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (LEGACY_TABLE,)).fetchone():
+        tables.append(LEGACY_TABLE)
+    return tables
+
+
+def _ensure_walk_indexes(conn: sqlite3.Connection, table: str) -> None:
+    specs = db_indexes.specs_for((table,))
+    if not specs and table in depth_partitions(conn):
+        specs = db_indexes.partition_specs(table)
+    for spec in specs:
+        conn.execute(spec.ddl())
+
+
+class TokenStats:
+    """
+    Running QC state for one instrument_token.
+    """
+
+    __slots__ = ("rows", "first_epoch", "last_epoch", "last_rowid", "gaps", "max_gap_sec", "duplicates", "out_of_order")
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.first_epoch: Optional[float] = None
+        self.last_epoch: Optional[float] = None
+        self.last_rowid: Optional[int] = None
+        self.gaps = 0
+        self.max_gap_sec = 0.0
+        self.duplicates = 0
+        self.out_of_order = 0
+
+    def add(self, rowid: int, epoch: float, gap_sec: float, session_break_sec: float) -> None:
+        self.rows += 1
+        if self.first_epoch is None:
+            self.first_epoch = epoch
+        if self.last_epoch is not None:
+            delta = epoch - self.last_epoch
+            if delta == 0:
+                self.duplicates += 1
+            elif gap_sec < delta < session_break_sec:
+                self.gaps += 1
+                self.max_gap_sec = max(self.max_gap_sec, delta)
+            # In timestamp order, a lower rowid than the previous row means
+            # one of the two was stored after a later-stamped row.
+            if self.last_rowid is not None and rowid < self.last_rowid:
+                self.out_of_order += 1
+        self.last_epoch = epoch
+        self.last_rowid = rowid
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TokenStats":
+        out = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(out, name, data[name])
+        return out
+
+
+class StreamingQC:
+    """
+    Chunked, checkpointed QC over timestamp_epoch-ordered tables.
+
+    `checkpoint` is the dict previously returned by `checkpoint_state()` (or
+    loaded with `load_checkpoint`); pass None for a full pass.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        checkpoint: Optional[Dict[str, Any]] = None,
+        chunk_rows: Optional[int] = None,
+        gap_sec: Optional[float] = None,
+        session_break_sec: Optional[float] = None,
+        max_skew_sec: Optional[float] = None,
+        now_epoch: Optional[float] = None,
+    ) -> None:
+        self.conn = conn
+        self.chunk_rows = max(1, int(chunk_rows or getattr(cfg, "QC_CHUNK_ROWS", 50000)))
+        self.gap_sec = float(gap_sec if gap_sec is not None else getattr(cfg, "QC_GAP_SEC", 30.0))
+        self.session_break_sec = float(
+            session_break_sec if session_break_sec is not None else getattr(cfg, "QC_SESSION_BREAK_SEC", 3 * 3600)
+        )
+        self.max_skew_sec = float(max_skew_sec if max_skew_sec is not None else getattr(cfg, "MAX_CLOCK_SKEW_SEC", 5.0))
+        self.now_epoch = float(now_epoch if now_epoch is not None else time.time())
+        cp = checkpoint if isinstance(checkpoint, dict) and checkpoint.get("version") == CHECKPOINT_VERSION else {}
+        self._tables: Dict[str, Dict[str, Any]] = dict(cp.get("tables") or {})
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        return {"version": CHECKPOINT_VERSION, "tables": self._tables}
+
+    def _select(self, table: str, cols: List[str]) -> str:
+        flags = ", ".join(f"({c} IS NULL)" for c in cols)
+        skew = "0"
+        if "timestamp" in cols:
+            # Text timestamp vs timestamp_epoch; only ISO-looking text is compared.
+            skew = (
+                "CASE WHEN timestamp LIKE '____-__-__%' THEN "
+                "ABS((julianday(timestamp) - 2440587.5) * 86400.0 - timestamp_epoch) ELSE 0 END"
+            )
+        return f"SELECT rowid, instrument_token, timestamp_epoch, {skew}, {flags} FROM {table}"
+
+    def run_table(self, table: str) -> Dict[str, Any]:
+        conn = self.conn
+        try:
+            cols = _columns(conn, table)
+        except sqlite3.Error:
+            cols = []
+        if not cols:
+            return {"table": table, "rows": 0, "error": "missing"}
+        if "timestamp_epoch" not in cols or "instrument_token" not in cols:
+            return aggregate_table(conn, table)
+        _ensure_walk_indexes(conn, table)
+
+        state = self._tables.get(table) or {}
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+        if state.get("columns") != cols or int(state.get("max_rowid") or 0) > max_rowid:
+            # Schema changed or the table was rebuilt: start over.
+            state = {}
+        tokens = {_token_key(tok): TokenStats.from_dict(data) for tok, data in (state.get("tokens") or {}).items()}
+        nulls = {c: int((state.get("nulls") or {}).get(c, 0)) for c in cols}
+        totals = {
+            "rows": int(state.get("rows") or 0),
+            "clock_skew": int(state.get("clock_skew") or 0),
+            "max_skew_sec": float(state.get("max_skew_sec") or 0.0),
+            "late_rows": int(state.get("late_rows") or 0),
+        }
+        cursor = state.get("cursor")
+        prev_max_rowid = int(state.get("max_rowid") or 0)
+        select = self._select(table, cols)
+        scanned = 0
+
+        def fold(rows, late: bool) -> None:
+            for row in rows:
+                rowid, token, epoch, skew = row[0], row[1], row[2], row[3] or 0.0
+                stats = tokens.get(token)
+                if stats is None:
+                    stats = tokens[token] = TokenStats()
+                if late:
+                    stats.rows += 1
+                    stats.out_of_order += 1
+                    totals["late_rows"] += 1
+                else:
+                    stats.add(rowid, epoch, self.gap_sec, self.session_break_sec)
+                if skew > self.max_skew_sec:
+                    totals["clock_skew"] += 1
+                    totals["max_skew_sec"] = max(totals["max_skew_sec"], skew)
+                for col, flag in zip(cols, row[4:]):
+                    if flag:
+                        nulls[col] += 1
+                totals["rows"] += 1
+
+        # Rows stored since the last run but stamped before its cursor. The
+        # unary + keeps SQLite on the rowid range instead of the epoch index.
+        if cursor is not None:
+            last = prev_max_rowid
+            while True:
+                chunk = conn.execute(
+                    f"{select} WHERE rowid > ? AND +timestamp_epoch < ? ORDER BY rowid LIMIT ?",
+                    (last, cursor[0], self.chunk_rows),
+                ).fetchall()
+                if not chunk:
+                    break
+                fold(chunk, late=True)
+                scanned += len(chunk)
+                last = chunk[-1][0]
+
+        key = tuple(cursor) if cursor is not None else None
+        while True:
+            if key is None:
+                chunk = conn.execute(
+                    f"{select} WHERE timestamp_epoch IS NOT NULL ORDER BY timestamp_epoch, rowid LIMIT ?",
+                    (self.chunk_rows,),
+                ).fetchall()
+            else:
+                chunk = conn.execute(
+                    f"{select} WHERE (timestamp_epoch, rowid) > (?, ?) ORDER BY timestamp_epoch, rowid LIMIT ?",
+                    (key[0], key[1], self.chunk_rows),
+                ).fetchall()
+            if not chunk:
+                break
+            fold(chunk, late=False)
+            scanned += len(chunk)
+            key = (chunk[-1][2], chunk[-1][0])
+
+        # Indexed lookups: rows with no epoch never enter the walk.
+        null_epoch = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE timestamp_epoch IS NULL").fetchone()[0]
+        future = conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE timestamp_epoch > ?", (self.now_epoch + self.max_skew_sec,)
+        ).fetchone()[0]
+        min_epoch = conn.execute(
+            f"SELECT timestamp_epoch FROM {table} WHERE timestamp_epoch IS NOT NULL ORDER BY timestamp_epoch LIMIT 1"
+        ).fetchone()
+        max_epoch = conn.execute(f"SELECT MAX(timestamp_epoch) FROM {table}").fetchone()
+
+        self._tables[table] = {
+            "columns": cols,
+            "cursor": list(key) if key is not None else None,
+            "max_rowid": max_rowid,
+            "tokens": {str(tok): stats.to_dict() for tok, stats in tokens.items()},
+            "nulls": nulls,
+            **totals,
+        }
+
+        rows = totals["rows"] + int(null_epoch)
+        res: Dict[str, Any] = {
+            "table": table,
+            "rows": rows,
+            "scanned_rows": scanned,
+            "null_ts": int(null_epoch),
+            "min_ts": _iso(min_epoch[0] if min_epoch else None),
+            "max_ts": _iso(max_epoch[0] if max_epoch else None),
+        }
+        if rows:
+            if table in ("ticks", "trades"):
+                null_rate = null_epoch / rows
+            else:
+                col_nulls = dict(nulls)
+                col_nulls["timestamp_epoch"] = int(null_epoch)
+                null_rate = max(col_nulls.values()) / rows
+        else:
+            null_rate = 0.0
+        res["max_null_rate"] = float(null_rate)
+        res["null_rate_ok"] = null_rate <= getattr(cfg, "QC_MAX_NULL_RATE", 0.1)
+        res["null_counts"] = {c: n for c, n in nulls.items() if n}
+        res["gaps"] = sum(s.gaps for s in tokens.values())
+        res["max_gap_sec"] = max((s.max_gap_sec for s in tokens.values()), default=0.0)
+        res["duplicates"] = sum(s.duplicates for s in tokens.values())
+        res["out_of_order"] = sum(s.out_of_order for s in tokens.values())
+        res["late_rows"] = totals["late_rows"]
+        res["clock_skew_rows"] = totals["clock_skew"]
+        res["max_clock_skew_sec"] = totals["max_skew_sec"]
+        res["future_rows"] = int(future)
+        res["tokens"] = {str(tok): stats.to_dict() for tok, stats in tokens.items()}
+        return res
+
+    def run(self, tables: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        QC `tables`, by default stream_tables(). On a default run, checkpoint
+        entries for partitions that retention has since dropped are discarded.
+        """
+        if tables is None:
+            tables = stream_tables(self.conn)
+            for name in set(self._tables) - set(tables):
+                del self._tables[name]
+        return [self.run_table(table) for table in tables]
+
+
+def aggregate_table(conn: sqlite3.Connection, table: str, ts_col: str = "timestamp") -> Dict[str, Any]:
+    """
+    One-pass SQL aggregates (row count, per-column NULLs, timestamp range)
+    for tables without an epoch index. Nothing is loaded into Python.
+    """
+    try:
+        cols = _columns(conn, table)
+    except sqlite3.Error:
+        cols = []
+    if not cols:
+        return {"table": table, "rows": 0, "error": "missing"}
+    parts = ["COUNT(*)"] + [f"SUM({c} IS NULL)" for c in cols]
+    if ts_col in cols:
+        parts += [f"MIN({ts_col})", f"MAX({ts_col})"]
+    row = conn.execute(f"SELECT {', '.join(parts)} FROM {table}").fetchone()
+    rows = int(row[0] or 0)
+    if not rows:
+        return {"table": table, "rows": 0}
+    nulls = {c: int(n or 0) for c, n in zip(cols, row[1 : 1 + len(cols)])}
+    res: Dict[str, Any] = {"table": table, "rows": rows}
+    if ts_col in cols:
+        res["null_ts"] = nulls[ts_col]
+        res["min_ts"] = row[-2]
+        res["max_ts"] = row[-1]
+    if table in ("ticks", "trades"):
+        null_rate = nulls.get(ts_col, 0) / rows if ts_col in cols else 0.0
+    else:
+        null_rate = max(nulls.values()) / rows
+    res["max_null_rate"] = float(null_rate)
+    res["null_rate_ok"] = null_rate <= getattr(cfg, "QC_MAX_NULL_RATE", 0.1)
+    return res
+
+
+def load_checkpoint(path: Path, db_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Checkpoint for `db_path`, or None when missing, unreadable or written
+    for another database.
+    """
+    try:
+        data = json.loads(Path(path).read_text())
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("db") != str(db_path):
+        return None
+    return data
+
+
+def save_checkpoint(path: Path, db_path: str, state: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(json.dumps({**state, "db": str(db_path)}))
+    tmp.replace(path)
+
+
+def depth_summary(conn: sqlite3.Connection) -> Tuple[int, Optional[str], Optional[str]]:
+    """
+    table_summary() across all depth partitions; the range is read from the
+    epoch index of the first and last non-empty partition.
+    """
+    count = 0
+    first: Optional[float] = None
+    last: Optional[float] = None
+    for name in depth_partitions(conn):
+        count += int(conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0] or 0)
+        lo = conn.execute(
+            f"SELECT timestamp_epoch FROM {name} WHERE timestamp_epoch IS NOT NULL ORDER BY timestamp_epoch LIMIT 1"
+        ).fetchone()
+        hi = conn.execute(f"SELECT MAX(timestamp_epoch) FROM {name}").fetchone()
+        if lo and first is None:
+            first = lo[0]
+        if hi and hi[0] is not None:
+            last = hi[0]
+    return count, _iso(first), _iso(last)
+
+
+def table_summary(conn: sqlite3.Connection, table: str) -> Tuple[int, Optional[str], Optional[str]]:
+    """
+    (row count, first timestamp, last timestamp) using the epoch index: the
+    count runs on the smallest covering index and the range is two index
+    seeks instead of MIN/MAX scans over the text column.
+    """
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    first = conn.execute(
+        f"SELECT timestamp FROM {table} WHERE timestamp_epoch IS NOT NULL ORDER BY timestamp_epoch LIMIT 1"
+    ).fetchone()
+    last = conn.execute(f"SELECT timestamp FROM {table} ORDER BY timestamp_epoch DESC LIMIT 1").fetchone()
+    return int(count), (first[0] if first else None), (last[0] if last else None)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+
+class IndexSpec(NamedTuple):
+    name: str
+    table: str
+    columns: str
+    where: Optional[str] = None
+
+    def ddl(self) -> str:
+        sql = f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table} ({self.columns})"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
+
+
+# Secondary indexes for the hot read/update paths. Each entry names the query it
+# serves; tests/test_db_indexes.py checks the plans so a schema or query edit
+# that drops back to a full scan fails loudly.
+INDEXES: Tuple[IndexSpec, ...] = (
+    # freshness_sla: MAX(timestamp_epoch) ... WHERE instrument_token IN (...)
+    IndexSpec("idx_ticks_token_epoch", "ticks", "instrument_token, timestamp_epoch"),
+    # replay_engine.iter_replay_events range scan; unfiltered MAX(timestamp_epoch)
+    IndexSpec("idx_ticks_epoch", "ticks", "timestamp_epoch"),
+    # fetch_open_positions: WHERE COALESCE(exit_time, '') = '' ORDER BY timestamp DESC
+    IndexSpec("idx_trades_open", "trades", "timestamp", "COALESCE(exit_time, '') = ''"),
+    # fetch_recent_trades
+    IndexSpec("idx_trades_timestamp", "trades", "timestamp"),
+    IndexSpec("idx_outcomes_trade_id", "outcomes", "trade_id"),
+    # capital_allocator / paper_tournament: timestamp_epoch >= ?
+    IndexSpec("idx_outcomes_epoch", "outcomes", "timestamp_epoch"),
+    IndexSpec("idx_broker_fills_trade_id", "broker_fills", "trade_id"),
+    IndexSpec("idx_trail_events_trace_id", "trail_events", "trace_id"),
+    IndexSpec("idx_trade_legs_trace_id", "trade_legs", "trace_id"),
+    # decision_events.trade_id is the primary key; time-range reads need their own index.
+    IndexSpec("idx_decision_events_epoch", "decision_events", "timestamp_epoch"),
+    # DecisionStore.list_recent(symbol=...)
+    IndexSpec("idx_decision_log_symbol_epoch", "decision_log", "symbol, ts_epoch"),
+    IndexSpec("idx_decision_log_epoch", "decision_log", "ts_epoch"),
+)
+
+
+def partition_specs(name: str) -> List[IndexSpec]:
+    """
+    Indexes for one depth_hist_* partition (core.depth_history); partitions are
+    created at runtime, so they are not listed in INDEXES.
+    """
+    return [
+        # iter_snapshots / iter_depth_history with tokens=[...]; per-token MAX(timestamp_epoch)
+        IndexSpec(f"idx_{name}_token_ts", name, "instrument_token, timestamp_epoch"),
+        # unfiltered range scans and MAX(timestamp_epoch)
+        IndexSpec(f"idx_{name}_ts", name, "timestamp_epoch"),
+    ]
+
+
+def specs_for(tables: Optional[Iterable[str]] = None) -> List[IndexSpec]:
+    if tables is None:
+        return list(INDEXES)
+    wanted = set(tables)
+    return [spec for spec in INDEXES if spec.table in wanted]
+
+
+def ensure_indexes(conn: sqlite3.Connection, tables: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Create the managed indexes for `tables` (all when None) that exist in this
+    database. Idempotent; returns the names of indexes that were missing.
+    """
+    present = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()}
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'").fetchall()}
+    created: List[str] = []
+    for spec in specs_for(tables):
+        if spec.table not in present:
+            continue
+        if spec.name not in existing:
+            created.append(spec.name)
+        conn.execute(spec.ddl())
+    return created
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: Iterable = ()) -> List[str]:
+    """
+    EXPLAIN QUERY PLAN detail lines for `sql`.
+    """
+    return [str(row[-1]) for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params)).fetchall()]
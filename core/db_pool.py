@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from config import config as cfg
+
+# Shared SQLite access for TRADE_DB_PATH and the other store files.
+#
+# - connection() hands each thread its own long-lived WAL connection per file
+#   (tuned pragmas, larger statement cache so repeated SQL text reuses its
+#   compiled statement). A connection is reopened when the file is replaced.
+# - ensure_schema() runs a component's migration at most once per process and
+#   file, and records it in a schema_version table so other processes skip it.
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+_LOCAL = threading.local()
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_DONE: Dict[Tuple[str, str], Tuple[Optional[int], int]] = {}
+_STATS_LOCK = threading.Lock()
+_STATS = {"opened": 0, "reused": 0, "evicted": 0, "migrations": 0}
+
+
+def _bump(name: str) -> None:
+    with _STATS_LOCK:
+        _STATS[name] += 1
+
+
+def _db_key(db_path: Optional[str | Path]) -> str:
+    return os.path.abspath(str(db_path or cfg.TRADE_DB_PATH))
+
+
+def _inode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def open_connection(db_path: str | Path, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    New connection with the desk pragmas applied (WAL, synchronous, cache,
+    mmap, busy timeout). The caller owns and closes it.
+    """
+    path = str(db_path)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    busy_ms = int(getattr(cfg, "DB_BUSY_TIMEOUT_MS", 5000))
+    conn = sqlite3.connect(
+        path,
+        timeout=busy_ms / 1000.0,
+        check_same_thread=check_same_thread,
+        cached_statements=int(getattr(cfg, "DB_STATEMENT_CACHE", 256)),
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={str(getattr(cfg, 'DB_SYNCHRONOUS', 'NORMAL')).upper()}")
+    conn.execute(f"PRAGMA cache_size=-{abs(int(getattr(cfg, 'DB_CACHE_SIZE_KB', 16000)))}")
+    conn.execute(f"PRAGMA mmap_size={int(getattr(cfg, 'DB_MMAP_SIZE', 268435456))}")
+    conn.execute(f"PRAGMA busy_timeout={busy_ms}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _thread_conns() -> "OrderedDict[str, Tuple[sqlite3.Connection, Optional[int]]]":
+    conns = getattr(_LOCAL, "conns", None)
+    if conns is None:
+        conns = OrderedDict()
+        _LOCAL.conns = conns
+    return conns
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def connection(db_path: Optional[str | Path] = None) -> sqlite3.Connection:
+    """
+    This thread's pooled connection to db_path (TRADE_DB_PATH by default).
+
+    Use it as `with connection() as conn:` for a transaction; the connection
+    stays open for the next call. Do not close it.
+    """
+    key = _db_key(db_path)
+    conns = _thread_conns()
+    inode = _inode(key)
+    cached = conns.get(key)
+    if cached is not None:
+        conn, cached_inode = cached
+        if inode is not None and inode == cached_inode:
+            conns.move_to_end(key)
+            _bump("reused")
+            return conn
+        del conns[key]
+        _close_quietly(conn)
+    conn = open_connection(key)
+    conns[key] = (conn, _inode(key))
+    _bump("opened")
+    limit = max(1, int(getattr(cfg, "DB_POOL_MAX_PER_THREAD", 8)))
+    while len(conns) > limit:
+        _old_key, (old_conn, _ino) = conns.popitem(last=False)
+        _close_quietly(old_conn)
+        _bump("evicted")
+    return conn
+
+
+def close_thread_connections() -> None:
+    conns = _thread_conns()
+    while conns:
+        _key, (conn, _ino) = conns.popitem()
+        _close_quietly(conn)
+
+
+def ensure_schema(
+    component: str,
+    version: int,
+    migrate: Callable[[sqlite3.Connection], None],
+    db_path: Optional[str | Path] = None,
+) -> None:
+    """
+    Bring `component`'s tables in db_path up to `version`.
+
+    `migrate(conn)` must be idempotent (CREATE IF NOT EXISTS / guarded
+    ALTERs); it runs inside one transaction only when the schema_version
+    table records an older version, and at most once per process and file.
+    """
+    key = _db_key(db_path)
+    done = _SCHEMA_DONE.get((key, component))
+    if done is not None and done == (_inode(key), version):
+        return
+    with _SCHEMA_LOCK:
+        conn = connection(key)
+        with conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+                "component TEXT PRIMARY KEY, version INTEGER NOT NULL, applied_epoch REAL)"
+            )
+            row = conn.execute(
+                f"SELECT version FROM {SCHEMA_VERSION_TABLE} WHERE component=?", (component,)
+            ).fetchone()
+            if row is None or int(row[0]) < int(version):
+                migrate(conn)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {SCHEMA_VERSION_TABLE} (component, version, applied_epoch) VALUES (?,?,?)",
+                    (component, int(version), time.time()),
+                )
+                _bump("migrations")
+        _SCHEMA_DONE[(key, component)] = (_inode(key), version)
+
+
+def stats() -> Dict[str, int]:
+    with _STATS_LOCK:
+        out = dict(_STATS)
+    out["thread_connections"] = len(_thread_conns())
+    return out
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import atexit
+import contextlib
 import json
+import os
 import sqlite3
 import time
 import hashlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from threading import Condition, RLock, Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from config import config as cfg
-from core.audit_log import append_event as audit_append
+from core import db_indexes, db_pool
+from core.audit_log import append_events as audit_append_many
 from core.paths import logs_dir
 from core.reason_codes import normalize_reason_codes
+from core.run_lock import RunLock
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
 
 
 DECISION_JSONL = Path(getattr(cfg, "DECISION_LOG_PATH", str(logs_dir() / "decision_events.jsonl")))
@@ -28,6 +39,84 @@ REQUIRED_FIELDS = (
     "instrument_id",
 )
 
+_DECISION_COLUMNS = (
+    "trade_id",
+    "prev_hash",
+    "event_hash",
+    "ts",
+    "timestamp_epoch",
+    "timestamp_iso",
+    "symbol",
+    "underlying",
+    "strategy_id",
+    "regime",
+    "regime_probs",
+    "shock_score",
+    "side",
+    "instrument",
+    "instrument_type",
+    "instrument_id",
+    "strike",
+    "expiry",
+    "option_type",
+    "right",
+    "qty_lots",
+    "qty_units",
+    "validity_sec",
+    "dte",
+    "expiry_bucket",
+    "score_0_100",
+    "xgb_proba",
+    "deep_proba",
+    "micro_proba",
+    "ensemble_proba",
+    "ensemble_uncertainty",
+    "champion_proba",
+    "challenger_proba",
+    "champion_model_id",
+    "challenger_model_id",
+    "model_id",
+    "dataset_hash",
+    "feature_hash",
+    "bid",
+    "ask",
+    "spread_pct",
+    "bid_qty",
+    "ask_qty",
+    "depth_imbalance",
+    "quote_age_sec",
+    "quote_ts_epoch",
+    "depth_age_sec",
+    "fill_prob_est",
+    "portfolio_equity",
+    "equity",
+    "equity_high",
+    "daily_pnl",
+    "daily_pnl_pct",
+    "drawdown_pct",
+    "loss_streak",
+    "open_risk",
+    "open_risk_pct",
+    "delta_exposure",
+    "gamma_exposure",
+    "vega_exposure",
+    "gatekeeper_allowed",
+    "veto_reasons",
+    "risk_allowed",
+    "exec_guard_allowed",
+    "pilot_allowed",
+    "pilot_reasons",
+    "action_size_multiplier",
+    "filled_bool",
+    "fill_price",
+    "time_to_fill",
+    "slippage_vs_mid",
+    "pnl_horizon_5m",
+    "pnl_horizon_15m",
+    "mae_15m",
+    "mfe_15m",
+)
+
 
 def _json_default(value: Any) -> str:
     if isinstance(value, (datetime,)):
@@ -39,11 +128,12 @@ def _canonical_json(data: Dict[str, Any]) -> str:
     return json.dumps(data, sort_keys=True, separators=(",", ":"), default=_json_default)
 
 
-def _read_last_hash() -> str:
-    if not DECISION_JSONL.exists():
+def _read_last_hash(path: Optional[Path] = None) -> str:
+    path = Path(path) if path is not None else DECISION_JSONL
+    if not path.exists():
         return DECISION_CHAIN_GENESIS
     try:
-        with DECISION_JSONL.open("rb") as f:
+        with path.open("rb") as f:
             f.seek(0, 2)
             size = f.tell()
             if size == 0:
@@ -99,175 +189,543 @@ def _validate_event(event: Dict[str, Any]) -> None:
         raise ValueError(f"Missing required fields: {missing}")
 
 
-def verify_decision_chain(path: Path = DECISION_JSONL) -> Tuple[bool, str, int]:
+def _checkpoint_path(path: Path) -> Path:
+    return path.with_name(path.name + ".verified.json")
+
+
+def _load_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        cp = json.loads(_checkpoint_path(path).read_text())
+    except Exception:
+        return None
+    if not isinstance(cp, dict) or cp.get("path") != str(path):
+        return None
+    return cp
+
+
+def _save_checkpoint(path: Path, cp: Dict[str, Any]) -> None:
+    target = _checkpoint_path(path)
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps(cp, sort_keys=True))
+        tmp.replace(target)
+    except Exception:
+        pass
+
+
+def verify_decision_chain(path: Optional[Path] = None, full: bool = False) -> Tuple[bool, str, int]:
+    """
+    Verify the decision hash chain.
+
+    A successful run saves a checkpoint (byte offset, chain head, counts and a
+    SHA-256 of the verified prefix) next to the log. Later runs re-digest the
+    prefix as raw bytes and only parse and rehash events appended after the
+    checkpoint; a prefix that no longer matches falls back to a full pass.
+    `full=True` ignores the checkpoint.
+    """
+    path = Path(path) if path is not None else DECISION_JSONL
     if not path.exists():
         return False, "missing_log", 0
     prev_hash = DECISION_CHAIN_GENESIS
-    count = 0
     hashed_count = 0
     legacy_count = 0
-    with path.open("r") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-            except Exception:
-                return False, "invalid_json", count
-            if "prev_hash" not in event or "event_hash" not in event:
-                if hashed_count > 0:
-                    return False, "legacy_after_hashed", count
-                legacy_count += 1
-                continue
-            expected_prev = event.get("prev_hash")
-            if expected_prev != prev_hash:
-                return False, "prev_hash_mismatch", count
-            expected_hash = event.get("event_hash")
-            calc_hash = _compute_event_hash(event)
-            if expected_hash != calc_hash:
-                return False, "event_hash_mismatch", count
-            prev_hash = expected_hash
-            count += 1
-            hashed_count += 1
+    offset = 0
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        cp = None if full else _load_checkpoint(path)
+        if cp is not None:
+            cp_offset = int(cp.get("offset") or 0)
+            remaining = cp_offset
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+            if remaining == 0 and digest.hexdigest() == cp.get("prefix_sha256"):
+                prev_hash = cp.get("head") or DECISION_CHAIN_GENESIS
+                hashed_count = int(cp.get("hashed_count") or 0)
+                legacy_count = int(cp.get("legacy_count") or 0)
+                offset = cp_offset
+            else:
+                digest = hashlib.sha256()
+                f.seek(0)
+        checkpoint = None
+        for raw in f:
+            complete = raw.endswith(b"\n")
+            line = raw.strip()
+            if line:
+                try:
+                    event = json.loads(line.decode("utf-8"))
+                except Exception:
+                    return False, "invalid_json", hashed_count
+                if "prev_hash" not in event or "event_hash" not in event:
+                    if hashed_count > 0:
+                        return False, "legacy_after_hashed", hashed_count
+                    legacy_count += 1
+                else:
+                    if event.get("prev_hash") != prev_hash:
+                        return False, "prev_hash_mismatch", hashed_count
+                    expected_hash = event.get("event_hash")
+                    if expected_hash != _compute_event_hash(event):
+                        return False, "event_hash_mismatch", hashed_count
+                    prev_hash = expected_hash
+                    hashed_count += 1
+            if complete:
+                digest.update(raw)
+                offset += len(raw)
+                checkpoint = (offset, prev_hash, hashed_count, legacy_count)
     if hashed_count == 0:
         return False, "no_hashed_events", legacy_count
+    if checkpoint is not None:
+        cp_offset, cp_head, cp_hashed, cp_legacy = checkpoint
+        _save_checkpoint(
+            path,
+            {
+                "path": str(path),
+                "offset": cp_offset,
+                "head": cp_head,
+                "hashed_count": cp_hashed,
+                "legacy_count": cp_legacy,
+                "prefix_sha256": digest.hexdigest(),
+                "verified_epoch": time.time(),
+            },
+        )
     return True, prev_hash, hashed_count
 
 
+# Bump when _ensure_schema gains columns or indexes.
+SCHEMA_VERSION = 2
+
+
 def _conn():
-    Path(cfg.TRADE_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(cfg.TRADE_DB_PATH)
-
-
-def _init_db():
-    with _conn() as conn:
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS decision_events (
-            trade_id TEXT PRIMARY KEY,
-            prev_hash TEXT,
-            event_hash TEXT,
-            ts TEXT,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT,
-            symbol TEXT,
-            underlying TEXT,
-            strategy_id TEXT,
-            regime TEXT,
-            regime_probs TEXT,
-            shock_score REAL,
-            side TEXT,
-            instrument TEXT,
-            instrument_type TEXT,
-            instrument_id TEXT,
-            strike INTEGER,
-            expiry TEXT,
-            option_type TEXT,
-            right TEXT,
-            qty_lots INTEGER,
-            qty_units INTEGER,
-            validity_sec INTEGER,
-            dte REAL,
-            expiry_bucket TEXT,
-            score_0_100 REAL,
-            xgb_proba REAL,
-            deep_proba REAL,
-            micro_proba REAL,
-            ensemble_proba REAL,
-            ensemble_uncertainty REAL,
-            champion_proba REAL,
-            challenger_proba REAL,
-            champion_model_id TEXT,
-            challenger_model_id TEXT,
-            model_id TEXT,
-            dataset_hash TEXT,
-            feature_hash TEXT,
-            bid REAL,
-            ask REAL,
-            spread_pct REAL,
-            bid_qty REAL,
-            ask_qty REAL,
-            depth_imbalance REAL,
-            quote_age_sec REAL,
-            quote_ts_epoch REAL,
-            depth_age_sec REAL,
-            fill_prob_est REAL,
-            portfolio_equity REAL,
-            equity REAL,
-            equity_high REAL,
-            daily_pnl REAL,
-            daily_pnl_pct REAL,
-            drawdown_pct REAL,
-            loss_streak REAL,
-            open_risk REAL,
-            open_risk_pct REAL,
-            delta_exposure REAL,
-            gamma_exposure REAL,
-            vega_exposure REAL,
-            gatekeeper_allowed INTEGER,
-            veto_reasons TEXT,
-            risk_allowed INTEGER,
-            exec_guard_allowed INTEGER,
-            pilot_allowed INTEGER,
-            pilot_reasons TEXT,
-            action_size_multiplier REAL,
-            filled_bool INTEGER,
-            fill_price REAL,
-            time_to_fill REAL,
-            slippage_vs_mid REAL,
-            pnl_horizon_5m REAL,
-            pnl_horizon_15m REAL,
-            mae_15m REAL,
-            mfe_15m REAL
-        )
+    return db_pool.connection(cfg.TRADE_DB_PATH)
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
         """
+    CREATE TABLE IF NOT EXISTS decision_events (
+        trade_id TEXT PRIMARY KEY,
+        prev_hash TEXT,
+        event_hash TEXT,
+        ts TEXT,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT,
+        symbol TEXT,
+        underlying TEXT,
+        strategy_id TEXT,
+        regime TEXT,
+        regime_probs TEXT,
+        shock_score REAL,
+        side TEXT,
+        instrument TEXT,
+        instrument_type TEXT,
+        instrument_id TEXT,
+        strike INTEGER,
+        expiry TEXT,
+        option_type TEXT,
+        right TEXT,
+        qty_lots INTEGER,
+        qty_units INTEGER,
+        validity_sec INTEGER,
+        dte REAL,
+        expiry_bucket TEXT,
+        score_0_100 REAL,
+        xgb_proba REAL,
+        deep_proba REAL,
+        micro_proba REAL,
+        ensemble_proba REAL,
+        ensemble_uncertainty REAL,
+        champion_proba REAL,
+        challenger_proba REAL,
+        champion_model_id TEXT,
+        challenger_model_id TEXT,
+        model_id TEXT,
+        dataset_hash TEXT,
+        feature_hash TEXT,
+        bid REAL,
+        ask REAL,
+        spread_pct REAL,
+        bid_qty REAL,
+        ask_qty REAL,
+        depth_imbalance REAL,
+        quote_age_sec REAL,
+        quote_ts_epoch REAL,
+        depth_age_sec REAL,
+        fill_prob_est REAL,
+        portfolio_equity REAL,
+        equity REAL,
+        equity_high REAL,
+        daily_pnl REAL,
+        daily_pnl_pct REAL,
+        drawdown_pct REAL,
+        loss_streak REAL,
+        open_risk REAL,
+        open_risk_pct REAL,
+        delta_exposure REAL,
+        gamma_exposure REAL,
+        vega_exposure REAL,
+        gatekeeper_allowed INTEGER,
+        veto_reasons TEXT,
+        risk_allowed INTEGER,
+        exec_guard_allowed INTEGER,
+        pilot_allowed INTEGER,
+        pilot_reasons TEXT,
+        action_size_multiplier REAL,
+        filled_bool INTEGER,
+        fill_price REAL,
+        time_to_fill REAL,
+        slippage_vs_mid REAL,
+        pnl_horizon_5m REAL,
+        pnl_horizon_15m REAL,
+        mae_15m REAL,
+        mfe_15m REAL
+    )
+    """
+    )
+    # Add missing columns for backward-compatible schema upgrades
+    try:
+        cur = conn.execute("PRAGMA table_info(decision_events)")
+        existing = {row[1] for row in cur.fetchall()}
+        desired = {
+            "prev_hash": "TEXT",
+            "event_hash": "TEXT",
+            "timestamp_epoch": "REAL",
+            "timestamp_iso": "TEXT",
+            "equity": "REAL",
+            "equity_high": "REAL",
+            "daily_pnl_pct": "REAL",
+            "open_risk_pct": "REAL",
+            "champion_proba": "REAL",
+            "challenger_proba": "REAL",
+            "champion_model_id": "TEXT",
+            "challenger_model_id": "TEXT",
+            "model_id": "TEXT",
+            "dataset_hash": "TEXT",
+            "feature_hash": "TEXT",
+            "instrument_id": "TEXT",
+            "strike": "INTEGER",
+            "expiry": "TEXT",
+            "option_type": "TEXT",
+            "right": "TEXT",
+            "instrument_type": "TEXT",
+            "underlying": "TEXT",
+            "qty_lots": "INTEGER",
+            "qty_units": "INTEGER",
+            "validity_sec": "INTEGER",
+            "quote_age_sec": "REAL",
+            "quote_ts_epoch": "REAL",
+            "depth_age_sec": "REAL",
+            "pilot_allowed": "INTEGER",
+            "pilot_reasons": "TEXT",
+        }
+        for col, col_type in desired.items():
+            if col not in existing:
+                conn.execute(f"ALTER TABLE decision_events ADD COLUMN {col} {col_type}")
+    except Exception:
+        pass
+    db_indexes.ensure_indexes(conn, ("decision_events",))
+
+
+def _init_db(db_path: Optional[str] = None):
+    db_pool.ensure_schema("decision_events", SCHEMA_VERSION, _ensure_schema, db_path or cfg.TRADE_DB_PATH)
+
+
+_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO decision_events ({','.join(_DECISION_COLUMNS)}) "
+    f"VALUES ({','.join(['?'] * len(_DECISION_COLUMNS))})"
+)
+
+
+@contextlib.contextmanager
+def _flocked(fh) -> Iterator[None]:
+    """
+    Exclusive flock on an open JSONL handle, so reading the chain head and
+    appending the next line is atomic across processes.
+    """
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+class DecisionLogWriter:
+    """
+    Single-writer service for the decision chain.
+
+    - The chain head and end offset of the JSONL are kept in memory and the
+      file handle stays open; a stat of the path (inode + size) detects any
+      write we did not make, in which case the head is re-read from the tail.
+    - Cross-process ownership uses a RunLock: while another live process
+      holds it, every append falls back to the tail-read/open-append path.
+      Both paths hold an flock on the JSONL while they read the head and
+      append, so concurrent writers cannot fork the chain.
+    - JSONL lines are written and flushed per event, in chain order. SQLite
+      rows and audit events are buffered and group-committed once
+      `batch_size` are pending or `flush_interval_sec` has passed;
+      flush() commits them immediately.
+    - A failed group commit keeps its rows queued and is counted in stats().
+      While commits keep failing, the next append() retries synchronously
+      and raises, so the caller sees the failure.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval_sec: Optional[float] = None,
+        lock_name: Optional[str] = None,
+    ) -> None:
+        self.batch_size = max(1, int(batch_size or getattr(cfg, "DECISION_LOG_BATCH_SIZE", 32)))
+        self.flush_interval_sec = float(
+            flush_interval_sec if flush_interval_sec is not None else getattr(cfg, "DECISION_LOG_FLUSH_INTERVAL_SEC", 0.5)
         )
-        # Add missing columns for backward-compatible schema upgrades
-        try:
-            cur = conn.execute("PRAGMA table_info(decision_events)")
-            existing = {row[1] for row in cur.fetchall()}
-            desired = {
-                "prev_hash": "TEXT",
-                "event_hash": "TEXT",
-                "timestamp_epoch": "REAL",
-                "timestamp_iso": "TEXT",
-                "equity": "REAL",
-                "equity_high": "REAL",
-                "daily_pnl_pct": "REAL",
-                "open_risk_pct": "REAL",
-                "champion_proba": "REAL",
-                "challenger_proba": "REAL",
-                "champion_model_id": "TEXT",
-                "challenger_model_id": "TEXT",
-                "model_id": "TEXT",
-                "dataset_hash": "TEXT",
-                "feature_hash": "TEXT",
-                "instrument_id": "TEXT",
-                "strike": "INTEGER",
-                "expiry": "TEXT",
-                "option_type": "TEXT",
-                "right": "TEXT",
-                "instrument_type": "TEXT",
-                "underlying": "TEXT",
-                "qty_lots": "INTEGER",
-                "qty_units": "INTEGER",
-                "validity_sec": "INTEGER",
-                "quote_age_sec": "REAL",
-                "quote_ts_epoch": "REAL",
-                "depth_age_sec": "REAL",
-                "pilot_allowed": "INTEGER",
-                "pilot_reasons": "TEXT",
+        self.lock_name = lock_name or getattr(cfg, "DECISION_LOG_LOCK_NAME", "decision_log.lock")
+        self._lock = RLock()
+        self._cond = Condition(self._lock)
+        self._run_lock: Optional[RunLock] = None
+        self._owner: Optional[bool] = None
+        self._fh = None
+        self._path: Optional[Path] = None
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._head = DECISION_CHAIN_GENESIS
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_path: Optional[str] = None
+        self._pending_rows: List[Tuple[str, List[Any]]] = []
+        self._pending_audit: List[Dict[str, Any]] = []
+        self._pending_since: Optional[float] = None
+        self._thread: Optional[Thread] = None
+        self._appended = 0
+        self._commits = 0
+        self._head_reloads = 0
+        self._flush_failures = 0
+        self._last_flush_error: Optional[str] = None
+
+    def _is_owner(self) -> bool:
+        if self._owner is None:
+            self._run_lock = RunLock(name=self.lock_name, max_age_sec=float("inf"))
+            ok, _reason = self._run_lock.acquire()
+            self._owner = bool(ok)
+        return self._owner
+
+    def _close_file(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+        self._fh = None
+        self._path = None
+        self._inode = None
+
+    def _chain_head(self, path: Path) -> str:
+        """
+        Previous event_hash for the next append, from memory when the file is
+        exactly as we left it.
+        """
+        st = os.fstat(self._fh.fileno())
+        if st.st_size == self._offset:
+            return self._head
+        if self._offset >= 0:
+            self._head_reloads += 1
+        return _read_last_hash(path)
+
+    def _open(self, path: Path):
+        if self._fh is not None and self._path == path:
+            try:
+                if os.stat(path).st_ino != self._inode:
+                    self._close_file()  # rotated or replaced
+            except FileNotFoundError:
+                self._close_file()
+        if self._fh is None or self._path != path:
+            self._close_file()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = path.open("ab")
+            self._path = path
+            self._inode = os.fstat(self._fh.fileno()).st_ino
+            self._offset = -1  # head unknown until re-read
+        return self._fh
+
+    def append(self, event: Dict[str, Any]) -> str:
+        """
+        Chain `event` (sets prev_hash/event_hash), write its JSONL line and
+        queue its SQLite row and audit record. Returns the event hash.
+        """
+        path = Path(DECISION_JSONL)
+        with self._lock:
+            if self._is_owner():
+                fh = self._open(path)
+                with _flocked(fh):
+                    event["prev_hash"] = self._chain_head(path)
+                    event["event_hash"] = _compute_event_hash(event)
+                    fh.write((_canonical_json(event) + "\n").encode("utf-8"))
+                    fh.flush()
+                    self._offset = fh.tell()
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("ab") as f, _flocked(f):
+                    event["prev_hash"] = _read_last_hash(path)
+                    event["event_hash"] = _compute_event_hash(event)
+                    f.write((_canonical_json(event) + "\n").encode("utf-8"))
+                    f.flush()
+            self._head = event["event_hash"]
+            self._appended += 1
+            self._pending_rows.append((str(cfg.TRADE_DB_PATH), [event.get(c) for c in _DECISION_COLUMNS]))
+            self._pending_audit.append({
+                "event": "DECISION",
+                "ts_epoch": time.time(),
+                "trade_id": event.get("trade_id"),
+                "symbol": event.get("symbol"),
+                "strategy_id": event.get("strategy_id"),
+                "decision_hash": event.get("event_hash"),
+                "gatekeeper_allowed": event.get("gatekeeper_allowed"),
+                "desk_id": getattr(cfg, "DESK_ID", "DEFAULT"),
+            })
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            if len(self._pending_rows) >= self.batch_size or self._flush_failures:
+                self._flush_locked()
+            else:
+                self._ensure_flusher()
+                self._cond.notify_all()
+        return event["event_hash"]
+
+    def flush(self) -> None:
+        """
+        Commit pending SQLite rows and audit records now.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _connect(self, db_path: str) -> sqlite3.Connection:
+        if self._conn is not None and self._conn_path == db_path:
+            return self._conn
+        self._close_conn()
+        _init_db(db_path)
+        conn = db_pool.open_connection(db_path, check_same_thread=False)
+        self._conn = conn
+        self._conn_path = db_path
+        return conn
+
+    def _close_conn(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._conn_path = None
+
+    def _flush_locked(self) -> None:
+        rows, self._pending_rows = self._pending_rows, []
+        audit, self._pending_audit = self._pending_audit, []
+        self._pending_since = None
+        if rows:
+            by_db: Dict[str, List[List[Any]]] = {}
+            for db_path, values in rows:
+                by_db.setdefault(db_path, []).append(values)
+            try:
+                for db_path, batch in by_db.items():
+                    conn = self._connect(db_path)
+                    with conn:
+                        conn.executemany(_INSERT_SQL, batch)
+                self._commits += 1
+                self._flush_failures = 0
+                self._last_flush_error = None
+            except Exception as exc:
+                self._close_conn()
+                self._flush_failures += 1
+                self._last_flush_error = str(exc)
+                self._pending_rows = rows + self._pending_rows
+                self._pending_audit = audit + self._pending_audit
+                self._pending_since = time.monotonic()
+                try:
+                    from core.incidents import trigger_db_write_fail
+                    trigger_db_write_fail({"table": "decision_events", "error": str(exc)})
+                except Exception as inner:
+                    print(f"[INCIDENT_ERROR] db_write_fail err={inner}")
+                raise
+        if audit:
+            try:
+                audit_append_many(audit)
+            except Exception as exc:
+                print(f"[AUDIT_ERROR] decision_audit_failed err={exc}")
+
+    def _ensure_flusher(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = Thread(target=self._run, name="decision-log-flush", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._pending_since is None:
+                    self._cond.wait(self.flush_interval_sec)
+                    if self._pending_since is None:
+                        continue
+                due = self._pending_since + self.flush_interval_sec - time.monotonic()
+                if due > 0:
+                    self._cond.wait(due)
+                    continue
+                try:
+                    self._flush_locked()
+                except Exception as exc:
+                    _log_decision_error({
+                        "ts": time.time(),
+                        "error": "decision_flush_failed",
+                        "detail": str(exc),
+                        "consecutive_failures": self._flush_failures,
+                        "pending_rows": len(self._pending_rows),
+                    })
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                self._close_file()
+                self._close_conn()
+                if self._owner and self._run_lock is not None:
+                    try:
+                        self._run_lock.release()
+                    except Exception:
+                        pass
+                self._owner = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "owner": self._owner,
+                "head": self._head,
+                "appended": self._appended,
+                "pending_rows": len(self._pending_rows),
+                "commits": self._commits,
+                "head_reloads": self._head_reloads,
+                "flush_failures": self._flush_failures,
+                "last_flush_error": self._last_flush_error,
             }
-            for col, col_type in desired.items():
-                if col not in existing:
-                    conn.execute(f"ALTER TABLE decision_events ADD COLUMN {col} {col_type}")
-        except Exception:
-            pass
+
+
+decision_log_writer = DecisionLogWriter()
+
+
+def _close_decision_log_writer() -> None:
+    try:
+        decision_log_writer.close()
+    except Exception:
+        pass
+
+
+atexit.register(_close_decision_log_writer)
 
 
 def log_decision(event: Dict[str, Any]):
-    _init_db()
     now_epoch = time.time()
     now_iso = datetime.fromtimestamp(now_epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
     event.setdefault("timestamp_epoch", now_epoch)
@@ -292,126 +750,14 @@ def log_decision(event: Dict[str, Any]):
         event["pilot_reasons"] = json.dumps(pilot_codes)
 
     _validate_event(event)
-    prev_hash = _read_last_hash()
-    event["prev_hash"] = prev_hash
-    event["event_hash"] = _compute_event_hash(event)
-
-    DECISION_JSONL.parent.mkdir(parents=True, exist_ok=True)
-    with DECISION_JSONL.open("a") as f:
-        f.write(_canonical_json(event) + "\n")
-
-    cols = [
-        "trade_id",
-        "prev_hash",
-        "event_hash",
-        "ts",
-        "timestamp_epoch",
-        "timestamp_iso",
-        "symbol",
-        "underlying",
-        "strategy_id",
-        "regime",
-        "regime_probs",
-        "shock_score",
-        "side",
-        "instrument",
-        "instrument_type",
-        "instrument_id",
-        "strike",
-        "expiry",
-        "option_type",
-        "right",
-        "qty_lots",
-        "qty_units",
-        "validity_sec",
-        "dte",
-        "expiry_bucket",
-        "score_0_100",
-        "xgb_proba",
-        "deep_proba",
-        "micro_proba",
-        "ensemble_proba",
-        "ensemble_uncertainty",
-        "champion_proba",
-        "challenger_proba",
-        "champion_model_id",
-        "challenger_model_id",
-        "model_id",
-        "dataset_hash",
-        "feature_hash",
-        "bid",
-        "ask",
-        "spread_pct",
-        "bid_qty",
-        "ask_qty",
-        "depth_imbalance",
-        "quote_age_sec",
-        "quote_ts_epoch",
-        "depth_age_sec",
-        "fill_prob_est",
-        "portfolio_equity",
-        "equity",
-        "equity_high",
-        "daily_pnl",
-        "daily_pnl_pct",
-        "drawdown_pct",
-        "loss_streak",
-        "open_risk",
-        "open_risk_pct",
-        "delta_exposure",
-        "gamma_exposure",
-        "vega_exposure",
-        "gatekeeper_allowed",
-        "veto_reasons",
-        "risk_allowed",
-        "exec_guard_allowed",
-        "pilot_allowed",
-        "pilot_reasons",
-        "action_size_multiplier",
-        "filled_bool",
-        "fill_price",
-        "time_to_fill",
-        "slippage_vs_mid",
-        "pnl_horizon_5m",
-        "pnl_horizon_15m",
-        "mae_15m",
-        "mfe_15m",
-    ]
-    values = [event.get(c) for c in cols]
-    try:
-        with _conn() as conn:
-            conn.execute(
-                f"""
-                INSERT OR REPLACE INTO decision_events
-                ({",".join(cols)}) VALUES ({",".join(["?"] * len(cols))})
-                """,
-                values,
-            )
-    except Exception as exc:
-        try:
-            from core.incidents import trigger_db_write_fail
-            trigger_db_write_fail({"table": "decision_events", "error": str(exc)})
-        except Exception as inner:
-            print(f"[INCIDENT_ERROR] db_write_fail err={inner}")
-        raise
-    try:
-        audit_append({
-            "event": "DECISION",
-            "trade_id": trade_id,
-            "symbol": event.get("symbol"),
-            "strategy_id": event.get("strategy_id"),
-            "decision_hash": event.get("event_hash"),
-            "gatekeeper_allowed": event.get("gatekeeper_allowed"),
-            "desk_id": getattr(cfg, "DESK_ID", "DEFAULT"),
-        })
-    except Exception as exc:
-        print(f"[AUDIT_ERROR] decision_audit_failed err={exc}")
+    decision_log_writer.append(event)
     return trade_id
 
 
 def update_execution(trade_id: str, exec_fields: Dict[str, Any]):
     if not trade_id:
         return
+    decision_log_writer.flush()
     _init_db()
     fields = exec_fields.copy()
     veto_codes = normalize_reason_codes(fields.get("veto_reasons"))
@@ -437,6 +783,7 @@ def update_execution(trade_id: str, exec_fields: Dict[str, Any]):
 def update_outcome(trade_id: str, outcome_fields: Dict[str, Any]):
     if not trade_id:
         return
+    decision_log_writer.flush()
     _init_db()
     sets = ", ".join([f"{k} = ?" for k in outcome_fields.keys()])
     vals = list(outcome_fields.values()) + [trade_id]
@@ -7,8 +7,27 @@ import sqlite3
 import time
 from typing import Any, Dict, List, Optional
 
+from core import db_indexes, db_pool
 from core.decision import Decision
 
+SCHEMA_VERSION = 2
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS decision_log (
+            decision_id TEXT PRIMARY KEY,
+            ts_epoch INTEGER,
+            run_id TEXT,
+            symbol TEXT,
+            status TEXT,
+            decision_json TEXT
+        )
+        """
+    )
+    db_indexes.ensure_indexes(conn, ("decision_log",))
+
 
 class DecisionStore:
     def __init__(self, db_path: str, retries: int = 3, retry_sleep_sec: float = 0.1):
@@ -20,21 +39,7 @@ class DecisionStore:
     def init(self, db_path: Optional[str] = None) -> None:
         if db_path is not None:
             self.db_path = db_path
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS decision_log (
-                    decision_id TEXT PRIMARY KEY,
-                    ts_epoch INTEGER,
-                    run_id TEXT,
-                    symbol TEXT,
-                    status TEXT,
-                    decision_json TEXT
-                )
-                """
-            )
-            conn.commit()
+        db_pool.ensure_schema("decision_log", SCHEMA_VERSION, _migrate, self.db_path)
 
     def _with_retry(self, fn):
         last_err = None
@@ -53,7 +58,7 @@ class DecisionStore:
     def save_decision(self, decision: Decision) -> bool:
         payload = decision.to_dict()
         def _op():
-            with sqlite3.connect(self.db_path) as conn:
+            with db_pool.connection(self.db_path) as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO decision_log
@@ -75,7 +80,7 @@ class DecisionStore:
 
     def update_status(self, decision_id: str, status: str, reject_reasons: Optional[List[str]] = None) -> bool:
         def _op():
-            with sqlite3.connect(self.db_path) as conn:
+            with db_pool.connection(self.db_path) as conn:
                 cur = conn.execute(
                     "SELECT decision_json FROM decision_log WHERE decision_id=?",
                     (decision_id,),
@@ -98,7 +103,7 @@ class DecisionStore:
 
     def list_recent(self, limit: int = 50, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         def _op():
-            with sqlite3.connect(self.db_path) as conn:
+            with db_pool.connection(self.db_path) as conn:
                 if symbol:
                     cur = conn.execute(
                         """
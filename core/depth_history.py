@@ -0,0 +1,590 @@
+from __future__ import annotations
+
+import atexit
+import json
+import sqlite3
+import struct
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from collections import deque
+from threading import Condition, RLock, Thread
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from config import config as cfg
+from core import db_indexes, db_pool
+from core.log_writer import get_jsonl_writer
+from core.paths import logs_dir
+
+LEVELS = 5
+PARTITION_DAY = "DAY"
+PARTITION_HOUR = "HOUR"
+CATALOG_TABLE = "depth_history_partitions"
+LEGACY_TABLE = "depth_snapshots"
+# 1: partition catalog. 2: (instrument_token, timestamp_epoch) index on every partition.
+SCHEMA_VERSION = 2
+
+_IST_OFFSET_SEC = 5 * 3600 + 30 * 60
+_IST = timezone(timedelta(seconds=_IST_OFFSET_SEC))
+# price (float64), quantity (int64), orders (int32) for 5 bid then 5 ask levels.
+_LEVEL_FMT = "dqi"
+_BOOK_STRUCT = struct.Struct("<" + _LEVEL_FMT * (2 * LEVELS))
+
+_ERROR_LOG_PATH = logs_dir() / "depth_history_errors.jsonl"
+_ERROR_LOGGER = get_jsonl_writer(_ERROR_LOG_PATH)
+
+
+def _num(value: Any, cast):
+    try:
+        if value is None:
+            return cast(0)
+        return cast(value)
+    except Exception:
+        return cast(0)
+
+
+def encode_depth(depth: Optional[dict]) -> bytes:
+    """
+    Pack the top 5 bid/ask levels into a fixed 200-byte record.
+    Missing levels are stored as zeros, matching Kite's empty-level shape.
+    """
+    depth = depth or {}
+    values: List[Any] = []
+    for side in ("buy", "sell"):
+        levels = list(depth.get(side) or [])[:LEVELS]
+        for i in range(LEVELS):
+            level = levels[i] if i < len(levels) and isinstance(levels[i], dict) else {}
+            values.append(_num(level.get("price"), float))
+            values.append(_num(level.get("quantity"), int))
+            values.append(_num(level.get("orders"), int))
+    return _BOOK_STRUCT.pack(*values)
+
+
+def decode_depth(blob: Optional[bytes]) -> Dict[str, List[dict]]:
+    if not blob:
+        return {"buy": [], "sell": []}
+    values = _BOOK_STRUCT.unpack(bytes(blob))
+    out: Dict[str, List[dict]] = {"buy": [], "sell": []}
+    for idx, side in enumerate(("buy", "sell")):
+        base = idx * LEVELS * 3
+        for i in range(LEVELS):
+            price, quantity, orders = values[base + i * 3 : base + i * 3 + 3]
+            out[side].append({"price": price, "quantity": quantity, "orders": orders})
+    return out
+
+
+def compute_imbalance(depth: Optional[dict]) -> float:
+    depth = depth or {}
+    buy_qty = sum([b.get("quantity", 0) or 0 for b in depth.get("buy", [])])
+    sell_qty = sum([s.get("quantity", 0) or 0 for s in depth.get("sell", [])])
+    if buy_qty + sell_qty > 0:
+        return (buy_qty - sell_qty) / (buy_qty + sell_qty)
+    return 0.0
+
+
+def partition_bounds(ts_epoch: float, granularity: str = PARTITION_DAY) -> Tuple[str, float, float]:
+    """
+    Return (table_name, start_epoch, end_epoch) of the IST day/hour bucket holding ts_epoch.
+    """
+    span = 3600 if str(granularity).upper() == PARTITION_HOUR else 86400
+    bucket = int((float(ts_epoch) + _IST_OFFSET_SEC) // span)
+    start = float(bucket * span - _IST_OFFSET_SEC)
+    label_fmt = "%Y%m%d%H" if span == 3600 else "%Y%m%d"
+    label = datetime.fromtimestamp(start, tz=_IST).strftime(label_fmt)
+    return f"depth_hist_{label}", start, start + span
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"""
+    CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+        name TEXT PRIMARY KEY,
+        start_epoch REAL,
+        end_epoch REAL,
+        created_epoch REAL
+    )
+    """
+    )
+    # Partitions created before the token index existed get it here.
+    known = {r[0] for r in conn.execute(f"SELECT name FROM {CATALOG_TABLE}").fetchall()}
+    present = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()}
+    for name in sorted(known & present):
+        for spec in db_indexes.partition_specs(name):
+            conn.execute(spec.ddl())
+
+
+class DepthHistoryStore:
+    """
+    Depth history stored as time partitions (one table per IST day or hour).
+
+    Rows are buffered and written in batches; the top-of-book levels are kept
+    as a compact binary record instead of JSON. Retention drops whole
+    partitions on a schedule instead of trimming rows on every write.
+
+    Once start() runs a writer thread (the depth websocket does), append()
+    only queues the row; batches are committed on that thread, and a full
+    queue evicts the oldest pending row. Without the thread, append()
+    flushes inline when the batch or interval is reached.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        granularity: Optional[str] = None,
+        retention_days: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_sec: Optional[float] = None,
+        prune_interval_sec: Optional[float] = None,
+        capacity: Optional[int] = None,
+    ) -> None:
+        self._db_path_override = str(db_path) if db_path else None
+        self.granularity = str(granularity or getattr(cfg, "DEPTH_HISTORY_PARTITION", PARTITION_DAY)).upper()
+        self.retention_days = float(
+            retention_days if retention_days is not None else getattr(cfg, "DEPTH_HISTORY_RETENTION_DAYS", 10)
+        )
+        self.batch_size = int(batch_size or getattr(cfg, "DEPTH_HISTORY_BATCH_SIZE", 200))
+        self.flush_interval_sec = float(
+            flush_interval_sec if flush_interval_sec is not None else getattr(cfg, "DEPTH_HISTORY_FLUSH_INTERVAL_SEC", 1.0)
+        )
+        self.prune_interval_sec = float(
+            prune_interval_sec if prune_interval_sec is not None else getattr(cfg, "DEPTH_HISTORY_PRUNE_INTERVAL_SEC", 900)
+        )
+        self.capacity = int(capacity or getattr(cfg, "DEPTH_HISTORY_QUEUE_MAX", 50000))
+        # _lock guards the connection/SQL, _cond the pending queue, so a
+        # producer never waits on a commit in progress.
+        self._lock = RLock()
+        self._cond = Condition()
+        self._pending: deque = deque()
+        self._thread: Optional[Thread] = None
+        self._stop = False
+        self._written = 0
+        self._dropped = 0
+        self._errors = 0
+        self._last_flush_ms: Optional[float] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_path: Optional[str] = None
+        self._known: set[str] = set()
+        self._last_flush = time.time()
+        self._last_prune = 0.0
+
+    def db_path(self) -> str:
+        return self._db_path_override or str(cfg.TRADE_DB_PATH)
+
+    # ---- connection / schema ----
+    def _connect(self) -> sqlite3.Connection:
+        path = self.db_path()
+        if self._conn is not None and self._conn_path == path:
+            return self._conn
+        self._close_conn()
+        db_pool.ensure_schema("depth_history", SCHEMA_VERSION, _migrate, path)
+        # Dedicated writer connection (pool pragmas); the writer thread uses it too.
+        conn = db_pool.open_connection(path, check_same_thread=False)
+        self._known = {r[0] for r in conn.execute(f"SELECT name FROM {CATALOG_TABLE}").fetchall()}
+        self._conn = conn
+        self._conn_path = path
+        return conn
+
+    def _close_conn(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._conn_path = None
+        self._known = set()
+
+    def close(self) -> None:
+        self.stop()
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                self._close_conn()
+
+    # ---- background writer ----
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        with self._cond:
+            if self.running:
+                return False
+            self._stop = False
+            self._thread = Thread(target=self._run, name="depth-history-writer", daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+        thread.join(timeout=timeout)
+        with self._cond:
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._pending) < self.batch_size and not self._stop:
+                    self._cond.wait(self.flush_interval_sec)
+                stopping = self._stop
+            try:
+                self.flush()
+            except Exception:
+                pass  # flush() already counted and logged the lost batch.
+            if stopping:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "running": self.running,
+                "capacity": self.capacity,
+                "queue_depth": len(self._pending),
+                "written": self._written,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "last_flush_ms": self._last_flush_ms,
+            }
+
+    def _ensure_partition(self, conn: sqlite3.Connection, name: str, start: float, end: float) -> None:
+        if name in self._known:
+            return
+        conn.execute(
+            f"""
+        CREATE TABLE IF NOT EXISTS {name} (
+            timestamp_epoch REAL,
+            instrument_token INTEGER,
+            imbalance REAL,
+            levels BLOB
+        )
+        """
+        )
+        for spec in db_indexes.partition_specs(name):
+            conn.execute(spec.ddl())
+        conn.execute(
+            f"INSERT OR IGNORE INTO {CATALOG_TABLE} (name, start_epoch, end_epoch, created_epoch) VALUES (?,?,?,?)",
+            (name, start, end, time.time()),
+        )
+        self._known.add(name)
+
+    # ---- writes ----
+    def append(self, ts_epoch: float, instrument_token: int, depth: dict, imbalance: Optional[float] = None) -> None:
+        if imbalance is None:
+            imbalance = compute_imbalance(depth)
+        row = (float(ts_epoch), int(instrument_token), float(imbalance), encode_depth(depth))
+        with self._cond:
+            while len(self._pending) >= self.capacity:
+                self._pending.popleft()
+                self._dropped += 1
+            self._pending.append(row)
+            due = len(self._pending) >= self.batch_size
+            if self.running:
+                if due:
+                    self._cond.notify_all()
+                return
+            due = due or (time.time() - self._last_flush) >= self.flush_interval_sec
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._cond:
+            rows = list(self._pending)
+            self._pending.clear()
+            self._last_flush = time.time()
+        with self._lock:
+            if not rows:
+                self._maybe_prune()
+                return 0
+            started = time.perf_counter()
+            try:
+                self._write_rows(rows)
+            except Exception as exc:
+                with self._cond:
+                    self._errors += 1
+                    self._dropped += len(rows)
+                try:
+                    _ERROR_LOGGER.write(
+                        {
+                            "ts_epoch": time.time(),
+                            "event": "DEPTH_HISTORY_WRITE_ERROR",
+                            "rows": len(rows),
+                            "error": f"{type(exc).__name__}:{exc}",
+                        }
+                    )
+                except Exception:
+                    pass
+                raise
+            with self._cond:
+                self._written += len(rows)
+                self._last_flush_ms = (time.perf_counter() - started) * 1000.0
+            self._maybe_prune()
+            return len(rows)
+
+    def _write_rows(self, rows: Sequence[tuple]) -> None:
+        by_partition: Dict[Tuple[str, float, float], List[tuple]] = {}
+        for row in rows:
+            by_partition.setdefault(partition_bounds(row[0], self.granularity), []).append(row)
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    for (name, start, end), part_rows in by_partition.items():
+                        self._ensure_partition(conn, name, start, end)
+                        conn.executemany(
+                            f"INSERT INTO {name} (timestamp_epoch, instrument_token, imbalance, levels) VALUES (?,?,?,?)",
+                            part_rows,
+                        )
+            except Exception:
+                self._close_conn()
+                raise
+
+    def _maybe_prune(self) -> None:
+        if self.retention_days <= 0:
+            return
+        now = time.time()
+        if (now - self._last_prune) < self.prune_interval_sec:
+            return
+        self._last_prune = now
+        self.prune(now_epoch=now)
+
+    def prune(self, now_epoch: Optional[float] = None) -> List[str]:
+        """
+        Drop partitions whose whole range is older than the retention window.
+        """
+        now_epoch = float(now_epoch if now_epoch is not None else time.time())
+        cutoff = now_epoch - self.retention_days * 86400.0
+        with self._lock:
+            conn = self._connect()
+            names = [
+                r[0]
+                for r in conn.execute(
+                    f"SELECT name FROM {CATALOG_TABLE} WHERE end_epoch <= ? ORDER BY start_epoch", (cutoff,)
+                ).fetchall()
+            ]
+            with conn:
+                for name in names:
+                    conn.execute(f"DROP TABLE IF EXISTS {name}")
+                    conn.execute(f"DELETE FROM {CATALOG_TABLE} WHERE name = ?", (name,))
+                    self._known.discard(name)
+            return names
+
+    # ---- reads ----
+    def partitions(self, start_epoch: Optional[float] = None, end_epoch: Optional[float] = None) -> List[Tuple[str, float, float]]:
+        with self._lock:
+            return catalog_partitions(self._connect(), start_epoch, end_epoch)
+
+    def iter_snapshots(
+        self,
+        start_epoch: float,
+        end_epoch: float,
+        tokens: Optional[Sequence[int]] = None,
+        decode: bool = True,
+    ) -> Iterator[Tuple[float, int, Any, float]]:
+        """
+        Yield (timestamp_epoch, instrument_token, depth, imbalance) ordered by time.
+        With decode=False the raw levels blob is yielded instead of the depth dict.
+        """
+        self.flush()
+        for name, _, _ in self.partitions(start_epoch, end_epoch):
+            with self._lock:
+                rows = _select_partition(self._connect(), name, start_epoch, end_epoch, tokens)
+            for ts, token, blob, imb in rows:
+                yield ts, token, (decode_depth(blob) if decode else blob), imb
+
+    def latest(self, limit: int = 200) -> List[Dict[str, Any]]:
+        """
+        Most recent snapshots across partitions, newest first.
+        """
+        self.flush()
+        out: List[Dict[str, Any]] = []
+        for name, _, _ in reversed(self.partitions()):
+            remaining = int(limit) - len(out)
+            if remaining <= 0:
+                break
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT timestamp_epoch, instrument_token, levels, imbalance FROM {name} "
+                    "ORDER BY timestamp_epoch DESC LIMIT ?",
+                    (remaining,),
+                ).fetchall()
+            for ts, token, blob, imb in rows:
+                out.append(
+                    {
+                        "timestamp_epoch": ts,
+                        "timestamp_iso": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+                        "instrument_token": token,
+                        "depth": decode_depth(blob),
+                        "imbalance": imb,
+                    }
+                )
+        return out
+
+    def max_epoch(self) -> Optional[float]:
+        self.flush()
+        for name, _, _ in reversed(self.partitions()):
+            with self._lock:
+                row = self._connect().execute(f"SELECT MAX(timestamp_epoch) FROM {name}").fetchone()
+            if row and row[0] is not None:
+                return float(row[0])
+        return None
+
+    def count(self, since_epoch: Optional[float] = None) -> int:
+        self.flush()
+        total = 0
+        for name, _, _ in self.partitions(start_epoch=since_epoch):
+            sql = f"SELECT COUNT(*) FROM {name}"
+            params: Tuple[Any, ...] = ()
+            if since_epoch is not None:
+                sql += " WHERE timestamp_epoch >= ?"
+                params = (float(since_epoch),)
+            with self._lock:
+                total += int(self._connect().execute(sql, params).fetchone()[0] or 0)
+        return total
+
+    # ---- migration ----
+    def migrate_legacy(self, chunk_size: int = 5000, drop_legacy: bool = False) -> Dict[str, int]:
+        """
+        Copy rows from the legacy depth_snapshots(depth_json) table into partitions.
+        """
+        stats = {"migrated": 0, "skipped": 0}
+        with self._lock:
+            conn = self._connect()
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (LEGACY_TABLE,)
+            ).fetchone()
+            if not exists:
+                return stats
+            cols = {r[1] for r in conn.execute(f"PRAGMA table_info({LEGACY_TABLE})").fetchall()}
+            ts_col = "timestamp_epoch" if "timestamp_epoch" in cols else None
+            last_rowid = 0
+            while True:
+                rows = conn.execute(
+                    f"SELECT rowid, {ts_col or 'NULL'}, timestamp, instrument_token, depth_json FROM {LEGACY_TABLE} "
+                    "WHERE rowid > ? ORDER BY rowid ASC LIMIT ?",
+                    (last_rowid, int(chunk_size)),
+                ).fetchall()
+                if not rows:
+                    break
+                batch: List[tuple] = []
+                for rowid, ts_epoch, ts_text, token, depth_json in rows:
+                    last_rowid = rowid
+                    ts_val = _legacy_epoch(ts_epoch, ts_text)
+                    try:
+                        payload = json.loads(depth_json) if depth_json else {}
+                    except Exception:
+                        payload = {}
+                    if ts_val is None or token is None or not isinstance(payload, dict):
+                        stats["skipped"] += 1
+                        continue
+                    depth = payload.get("depth") if isinstance(payload.get("depth"), dict) else payload
+                    imbalance = payload.get("imbalance")
+                    batch.append(
+                        (
+                            ts_val,
+                            int(token),
+                            float(imbalance if imbalance is not None else compute_imbalance(depth)),
+                            encode_depth(depth),
+                        )
+                    )
+                    stats["migrated"] += 1
+                if batch:
+                    self._write_rows(batch)
+            if drop_legacy:
+                with conn:
+                    conn.execute(f"DROP TABLE IF EXISTS {LEGACY_TABLE}")
+        return stats
+
+
+def _legacy_epoch(ts_epoch: Any, ts_text: Any) -> Optional[float]:
+    if ts_epoch is not None:
+        try:
+            val = float(ts_epoch)
+            if val > 1e15:
+                return val / 1_000_000.0
+            if val > 1e12:
+                return val / 1000.0
+            return val
+        except Exception:
+            pass
+    if ts_text:
+        try:
+            dt = datetime.fromisoformat(str(ts_text).replace("Z", "+00:00"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.timestamp()
+        except Exception:
+            return None
+    return None
+
+
+def catalog_partitions(
+    conn: sqlite3.Connection, start_epoch: Optional[float] = None, end_epoch: Optional[float] = None
+) -> List[Tuple[str, float, float]]:
+    """
+    (name, start_epoch, end_epoch) of the catalogued partitions overlapping
+    the range, oldest first; empty when the DB has no catalog.
+    """
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (CATALOG_TABLE,)).fetchone():
+        return []
+    sql = f"SELECT name, start_epoch, end_epoch FROM {CATALOG_TABLE} WHERE 1=1"
+    params: List[Any] = []
+    if start_epoch is not None:
+        sql += " AND end_epoch > ?"
+        params.append(float(start_epoch))
+    if end_epoch is not None:
+        sql += " AND start_epoch < ?"
+        params.append(float(end_epoch))
+    sql += " ORDER BY start_epoch ASC"
+    return [(r[0], float(r[1]), float(r[2])) for r in conn.execute(sql, params).fetchall()]
+
+
+def _select_partition(
+    conn: sqlite3.Connection, name: str, start_epoch: float, end_epoch: float, tokens: Optional[Iterable[int]]
+) -> List[tuple]:
+    sql = f"SELECT timestamp_epoch, instrument_token, levels, imbalance FROM {name} WHERE timestamp_epoch >= ? AND timestamp_epoch < ?"
+    params: List[Any] = [float(start_epoch), float(end_epoch)]
+    token_list = [int(t) for t in tokens] if tokens else None
+    if token_list:
+        sql += f" AND instrument_token IN ({','.join(['?'] * len(token_list))})"
+        params.extend(token_list)
+    sql += " ORDER BY timestamp_epoch ASC"
+    return conn.execute(sql, params).fetchall()
+
+
+def iter_depth_history(
+    db_path: Path, start_epoch: float, end_epoch: float, tokens: Optional[Iterable[int]] = None, decode: bool = True
+) -> Iterator[Tuple[float, int, Any, float]]:
+    """
+    Read-only helper for replay/research against an arbitrary DB path: opens
+    a `mode=ro` connection and never creates tables or changes the journal mode.
+    """
+    path = Path(db_path)
+    if not path.exists():
+        return
+    tokens = list(tokens) if tokens else None
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        for name, _, _ in catalog_partitions(conn, start_epoch, end_epoch):
+            for ts, token, blob, imb in _select_partition(conn, name, start_epoch, end_epoch, tokens):
+                yield ts, token, (decode_depth(blob) if decode else blob), imb
+    finally:
+        conn.close()
+
+
+depth_history = DepthHistoryStore()
+
+
+def _close_depth_history() -> None:
+    try:
+        depth_history.close()
+    except Exception:
+        pass
+
+
+atexit.register(_close_depth_history)
@@ -1,9 +1,10 @@
 from collections import defaultdict, deque
 import time
-import json
 from pathlib import Path
 from datetime import datetime, timezone
-from core.trade_store import insert_depth_snapshot
+from config import config as cfg
+from core.depth_history import compute_imbalance, depth_history
+from core.incidents import trigger_db_write_fail
 from core.paths import logs_dir
 from core.log_writer import get_jsonl_writer
 
@@ -26,18 +27,21 @@ class DepthStore:
             "ts_iso": now_iso,
         }
         try:
-            # compute imbalance
-            buy_qty = sum([b.get("quantity", 0) for b in depth.get("buy", [])])
-            sell_qty = sum([s.get("quantity", 0) for s in depth.get("sell", [])])
-            imbalance = 0.0
-            if buy_qty + sell_qty > 0:
-                imbalance = (buy_qty - sell_qty) / (buy_qty + sell_qty)
-            insert_depth_snapshot(now_iso, instrument_token, json.dumps({"depth": depth, "imbalance": imbalance}), now_epoch)
-            # alert on spikes (optional)
-            if getattr(__import__("config.config", fromlist=["IMBALANCE_ALERT_ENABLE"]), "IMBALANCE_ALERT_ENABLE", False):
-                if abs(imbalance) > getattr(__import__("config.config", fromlist=["IMBALANCE_ALERT"]), "IMBALANCE_ALERT", 0.6):
+            imbalance = compute_imbalance(depth)
+            try:
+                depth_history.append(now_epoch, instrument_token, depth, imbalance)
+            except Exception as exc:
+                trigger_db_write_fail({"table": "depth_history", "error": str(exc)})
+                raise
+            # alert on spikes (optional); queued on the outbox, one per token per cooldown
+            if getattr(cfg, "IMBALANCE_ALERT_ENABLE", False):
+                if abs(imbalance) > getattr(cfg, "IMBALANCE_ALERT", 0.6):
                     from core.telegram_alerts import send_telegram_message
-                    send_telegram_message(f"Depth imbalance spike {imbalance:.2f} for token {instrument_token}")
+                    send_telegram_message(
+                        f"Depth imbalance spike {imbalance:.2f} for token {instrument_token}",
+                        key=f"depth_imbalance:{instrument_token}",
+                        min_interval_sec=float(getattr(cfg, "IMBALANCE_ALERT_COOLDOWN_SEC", 300)),
+                    )
         except Exception as exc:
             try:
                 ok = _ERROR_LOGGER.write({
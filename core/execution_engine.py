@@ -1,15 +1,17 @@
-import time
 import hashlib
+import numpy as np
 from config import config as cfg
+from core.clock import resolve_clock
 from core.fill_model import FillModel
 
 class ExecutionEngine:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = resolve_clock(clock)
         self.failed_executions = 0
         self.MAX_FAILED_EXECUTIONS = 3
         self.slippage_bps = getattr(cfg, "SLIPPAGE_BPS", 8)
         self.instrument_slippage = {}
-        self.fill_model = FillModel()
+        self.fill_model = FillModel(clock=self.clock)
 
     # -----------------------------
     # Slippage estimation
@@ -58,11 +60,24 @@ class ExecutionEngine:
         # Reject wide spreads
         return spread_pct <= max_spread_pct
 
+    def spread_ok_mask(self, bid, ask, ltp, max_spread_pct=None):
+        """
+        spread_ok over equal-length arrays; True where the spread passes.
+        """
+        bid = np.asarray(bid, dtype=float)
+        ask = np.asarray(ask, dtype=float)
+        ltp = np.asarray(ltp, dtype=float)
+        if max_spread_pct is None:
+            max_spread_pct = getattr(cfg, "MAX_SPREAD_PCT", 0.015)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread_pct = (ask - bid) / np.where(ltp == 0, np.nan, ltp)
+        return (ltp != 0) & (spread_pct <= max_spread_pct)
+
     # -----------------------------
     # Latency penalty
     # -----------------------------
     def latency_penalty(self, data_timestamp):
-        age = time.time() - data_timestamp
+        age = self.clock.time() - data_timestamp
 
         if age <= 1:
             return 1.0
@@ -256,7 +271,9 @@ class ExecutionEngine:
         Simulate a limit order using sequential quote snapshots.
         Buy fills ONLY if limit >= ask on a later snapshot.
         Sell fills ONLY if limit <= bid on a later snapshot.
+        Timeouts, polling and quote ages run on self.clock.
         """
+        clock = self.clock
         def _mid_spread(bid, ask):
             mid = (bid + ask) / 2.0 if bid and ask else 0.0
             spread = max(ask - bid, 0.0) if bid and ask else 0.0
@@ -310,7 +327,8 @@ class ExecutionEngine:
         ask0 = decision.get("ask", 0) or 0
         ts0 = decision.get("ts")
         if ts0 is None:
-            ts0 = time.time()
+            ts0 = clock.time()
+        clock.observe(ts0)
         decision_mid, decision_spread = _mid_spread(bid0, ask0)
         if decision_mid <= 0 or decision_spread <= 0:
             return False, None, {
@@ -328,7 +346,7 @@ class ExecutionEngine:
                 "slippage": None,
                 "reason_if_aborted": "missing_quote_ts",
             }
-        if max_quote_age_sec is not None and (time.time() - ts0) > max_quote_age_sec:
+        if max_quote_age_sec is not None and (clock.time() - ts0) > max_quote_age_sec:
             return False, None, {
                 "decision_mid": decision_mid,
                 "decision_spread": decision_spread,
@@ -338,7 +356,7 @@ class ExecutionEngine:
             }
 
         requested_qty = int(max(getattr(trade, "qty", 1) or 1, 1))
-        start = time.time()
+        start = clock.time()
         current_limit = limit_price
         reason = "timeout"
         attempts = [
@@ -351,7 +369,7 @@ class ExecutionEngine:
         ]
         attempt_idx = 0
 
-        while time.time() - start <= timeout_sec:
+        while clock.time() - start <= timeout_sec:
             snap = quote_fn()
             if not snap:
                 reason = "no_quote"
@@ -360,9 +378,10 @@ class ExecutionEngine:
             ask = snap.get("ask", 0) or 0
             ts = snap.get("ts")
             if ts is None:
-                ts = time.time()
+                ts = clock.time()
+            clock.observe(ts)
             if bid <= 0 or ask <= 0:
-                time.sleep(poll_sec)
+                clock.sleep(poll_sec)
                 continue
 
             mid, spread = _mid_spread(bid, ask)
@@ -379,7 +398,7 @@ class ExecutionEngine:
             if ts is None:
                 reason = "missing_quote_ts"
                 break
-            if max_quote_age_sec is not None and (time.time() - ts) > max_quote_age_sec:
+            if max_quote_age_sec is not None and (clock.time() - ts) > max_quote_age_sec:
                 reason = "stale_quote"
                 break
 
@@ -419,12 +438,12 @@ class ExecutionEngine:
 
             if sim.get("status") in ("FILLED", "PARTIAL") and int(sim.get("fill_qty", 0) or 0) > 0:
                 if fill_prob <= 0.0:
-                    time.sleep(poll_sec)
+                    clock.sleep(poll_sec)
                     continue
                 if fill_prob < 1.0:
                     draw = _deterministic_uniform(attempt_idx, bid, ask, current_limit, fill_prob)
                     if draw > fill_prob:
-                        time.sleep(poll_sec)
+                        clock.sleep(poll_sec)
                         continue
                 fill_price = float(sim.get("fill_price"))
                 slippage = (fill_price - decision_mid) if trade.side == "BUY" else (decision_mid - fill_price)
@@ -442,7 +461,7 @@ class ExecutionEngine:
                     "attempts": attempts,
                 }
 
-            time.sleep(poll_sec)
+            clock.sleep(poll_sec)
 
         return False, None, {
             "decision_mid": round(decision_mid, 2),
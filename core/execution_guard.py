@@ -51,12 +51,13 @@ def must_have_valid_approval(order_intent_hash: str, approver: Optional[str] = N
 
 
 class ExecutionGuard:
-    def __init__(self, risk_state=None):
+    def __init__(self, risk_state=None, config=None):
         self.risk_state = risk_state
+        self.cfg = config if config is not None else cfg
 
     def _min_conf(self, regime):
-        min_conf = getattr(cfg, "ML_MIN_PROBA", 0.6)
-        mult = getattr(cfg, "REGIME_PROBA_MULT", {}).get(regime or "NEUTRAL", 1.0)
+        min_conf = getattr(self.cfg, "ML_MIN_PROBA", 0.6)
+        mult = getattr(self.cfg, "REGIME_PROBA_MULT", {}).get(regime or "NEUTRAL", 1.0)
         return min_conf * mult
 
     def validate(self, trade, portfolio, regime):
@@ -2,6 +2,7 @@ import time
 import json
 from pathlib import Path
 from config import config as cfg
+from core.clock import resolve_clock
 from core.execution.chokepoint import ApprovalMissingOrInvalid, require_approval_or_abort
 from core.execution_engine import ExecutionEngine
 from core.paper_fill_simulator import PaperFillSimulator
@@ -16,12 +17,18 @@ class ExecutionRouter:
     """
     Routes trades to SIM/PAPER/LIVE modes.
     LIVE mode is a stub until order placement is enabled.
+
+    SIM/PAPER fills run on `clock` (wall clock by default). Backtests and
+    replays pass a core.clock.SimClock so fills advance with the snapshot
+    stream instead of sleeping. Approval TTLs always use wall time.
     """
-    def __init__(self):
-        self.engine = ExecutionEngine()
+    def __init__(self, clock=None):
+        self.clock = resolve_clock(clock)
+        self.engine = ExecutionEngine(clock=self.clock)
         self.paper_sim = PaperFillSimulator(
             timeout_sec=getattr(cfg, "EXEC_SIM_TIMEOUT_SEC", 3.0),
             poll_sec=getattr(cfg, "EXEC_SIM_POLL_SEC", 0.25),
+            clock=self.clock,
         )
 
     def execute(self, trade, bid, ask, volume, depth=None, snapshot_fn=None, spread_pct=None, depth_imbalance=None, vol_z=None):
@@ -101,6 +108,7 @@ class ExecutionRouter:
                     "slippage": None,
                     "reason_if_aborted": "no_quote",
                 }
+            self.clock.observe(first.get("ts"))
             bid = first.get("bid", bid)
             ask = first.get("ask", ask)
             limit_price = trade.entry_price
@@ -134,7 +142,7 @@ class ExecutionRouter:
                     "reason_if_aborted": exc.reason,
                     "approval_payload_hash": payload_hash,
                 }
-            start_ts = time.time()
+            start_ts = self.clock.time()
             filled, price, report = self._simulate_limit(
                 trade, bid, ask, limit_price, snapshot_fn=snapshot_fn
             )
@@ -177,6 +185,7 @@ class ExecutionRouter:
                     "slippage": None,
                     "reason_if_aborted": "no_quote",
                 }
+            self.clock.observe(first.get("ts"))
             bid = first.get("bid", bid)
             ask = first.get("ask", ask)
             limit_price = trade.entry_price
@@ -210,7 +219,7 @@ class ExecutionRouter:
                     "reason_if_aborted": exc.reason,
                     "approval_payload_hash": payload_hash,
                 }
-            start_ts = time.time()
+            start_ts = self.clock.time()
             filled, price, report = self.paper_sim.simulate(
                 trade,
                 limit_price,
@@ -322,10 +331,11 @@ class ExecutionRouter:
             else:
                 slippage_vs_mid = round(decision_mid - fill_price, 4)
         time_to_fill = None
+        now = self.clock.time()
         if start_ts:
-            time_to_fill = round(time.time() - start_ts, 4)
+            time_to_fill = round(now - start_ts, 4)
         payload = {
-            "ts": time.time(),
+            "ts": now,
             "trade_id": getattr(trade, "trade_id", None),
             "symbol": getattr(trade, "symbol", None),
             "instrument": getattr(trade, "instrument", None),
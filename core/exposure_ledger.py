@@ -6,7 +6,10 @@ from datetime import datetime, timezone
 import math
 from typing import Any
 
+import numpy as np
+
 from config import config as cfg
+from core.greeks import greeks_batch, implied_vol_batch
 
 
 def _get_value(obj: Any, key: str, default: Any = None) -> Any:
@@ -97,15 +100,33 @@ def _as_position_greek(raw: Any, qty_units: float, side_sign: float, threshold:
     return side_sign * value
 
 
-def estimate_trade_greeks(trade: Any) -> tuple[float, float]:
+def _option_quote(trade: Any) -> float:
+    """
+    Current option price for solving IV: the option LTP, else the bid/ask
+    mid. The entry price is not used; on an open position it is stale
+    against the current underlying_ltp.
     """
-    Returns deterministic proxy greeks for a position:
-    (delta_proxy, vega_proxy).
-    Uses provided greeks when available; otherwise derives a stable heuristic.
+    for key in ("option_ltp", "opt_ltp"):
+        price = _to_float(_get_value(trade, key), 0.0)
+        if price > 0:
+            return price
+    bid = _to_float(_get_value(trade, "opt_bid"), 0.0)
+    ask = _to_float(_get_value(trade, "opt_ask"), 0.0)
+    if bid > 0 and ask >= bid:
+        return (bid + ask) / 2.0
+    return 0.0
+
+
+def _greek_terms(trade: Any) -> dict[str, Any]:
+    """
+    Per-trade pieces for estimate_trades_greeks: provided position greeks,
+    the heuristic proxy and, when the trade carries spot/strike/expiry and an
+    IV (its own or the chain's) or a current option quote, Black-Scholes
+    inputs for the batch model.
     """
     qty_units = _infer_qty_units(trade)
     if qty_units <= 0:
-        return 0.0, 0.0
+        return {"fixed": (0.0, 0.0)}
 
     side_sign = _side_sign(trade)
 
@@ -118,9 +139,9 @@ def estimate_trade_greeks(trade: Any) -> tuple[float, float]:
 
     instrument_type = str(_get_value(trade, "instrument_type", _get_value(trade, "instrument", "OPT")) or "OPT").upper()
     if instrument_type == "FUT":
-        return side_sign * qty_units, 0.0
+        return {"fixed": (side_sign * qty_units, 0.0)}
     if instrument_type != "OPT":
-        return 0.0, 0.0
+        return {"fixed": (0.0, 0.0)}
 
     right = str(_get_value(trade, "right", _get_value(trade, "option_type", "CE")) or "CE").upper()
     right_sign = 1.0 if right == "CE" else -1.0
@@ -144,21 +165,97 @@ def estimate_trade_greeks(trade: Any) -> tuple[float, float]:
         moneyness_gap = abs(spot - strike) / max(strike, 1.0)
     atm_weight = max(0.1, 1.0 - (moneyness_gap / 0.02))
 
-    iv = _to_float(_get_value(trade, "iv", _get_value(trade, "implied_volatility", 0.2)), 0.2)
+    raw_iv = _get_value(trade, "iv", _get_value(trade, "implied_volatility", _get_value(trade, "chain_iv")))
+    iv = _to_float(raw_iv if raw_iv is not None else 0.2, 0.2)
     iv = min(max(iv, 0.05), 1.5)
-    dte_days = _days_to_expiry(_get_value(trade, "expiry"))
-    time_weight = min(max(math.sqrt(dte_days / 30.0), 0.35), 2.0)
+    expiry = _get_value(trade, "expiry")
+    dte_days = _days_to_expiry(expiry)
+    quote = _option_quote(trade)
 
     delta_unit = right_sign * (0.2 + (0.6 * atm_weight))
-    vega_unit = (0.05 + (0.25 * atm_weight)) * iv * time_weight
-    delta_proxy = side_sign * delta_unit * qty_units
-    vega_proxy = side_sign * vega_unit * qty_units
+    # Same unit as the model: rupees per vol point per unit. An ATM option has
+    # vega/100 ~= 0.4 * S * sqrt(t) / 100, which is also ~= premium / (100 * iv).
+    if spot > 0:
+        vega_unit = 0.004 * spot * math.sqrt(dte_days / 365.0) * atm_weight
+    else:
+        premium = quote or _to_float(_get_value(trade, "entry_price", _get_value(trade, "entry")), 0.0)
+        vega_unit = premium / (100.0 * iv) * atm_weight
+    terms: dict[str, Any] = {
+        "position_delta": position_delta,
+        "position_vega": position_vega,
+        "proxy": (side_sign * delta_unit * qty_units, side_sign * vega_unit * qty_units),
+        "scale": side_sign * qty_units,
+    }
+
+    model_spot = _to_float(_get_value(trade, "underlying_ltp", _get_value(trade, "spot")), 0.0)
+    if model_spot > 0 and strike > 0 and expiry and (raw_iv is not None or quote > 0):
+        terms["model"] = {
+            "spot": model_spot,
+            "strike": strike,
+            "t": dte_days / 365.0,
+            "is_call": right == "CE",
+            "iv": iv if raw_iv is not None else None,
+            "premium": quote,
+        }
+    return terms
 
-    if position_delta is None:
-        position_delta = delta_proxy
-    if position_vega is None:
-        position_vega = vega_proxy
-    return float(position_delta), float(position_vega)
+
+def estimate_trades_greeks(trades: list[Any]) -> list[tuple[float, float]]:
+    """
+    (delta, vega) per trade, in the same order. Provided greeks win; trades
+    with spot, strike, expiry and an IV or a current option quote get
+    Black-Scholes delta and vega from one vectorised pass over the whole
+    batch; everything else falls back to the deterministic proxy. Vega is in
+    rupees per 1 vol point (BS vega / 100 x units) on both paths, the unit of
+    MAX_NET_VEGA_RUPEES.
+    """
+    terms = [_greek_terms(trade) for trade in trades]
+    modelled = [
+        i
+        for i, term in enumerate(terms)
+        if "model" in term and (term["position_delta"] is None or term["position_vega"] is None)
+    ]
+    model_greeks: dict[int, tuple[float, float]] = {}
+    if modelled:
+        inputs = [terms[i]["model"] for i in modelled]
+        spots = [m["spot"] for m in inputs]
+        strikes = [m["strike"] for m in inputs]
+        times = [m["t"] for m in inputs]
+        calls = [m["is_call"] for m in inputs]
+        ivs = np.array([m["iv"] if m["iv"] is not None else 0.0 for m in inputs], dtype=float)
+        solve = np.array([m["iv"] is None for m in inputs])
+        if solve.any():
+            solved = implied_vol_batch([m["premium"] for m in inputs], spots, strikes, times, calls)
+            ivs = np.where(solve, np.clip(solved, 0.05, 1.5), ivs)
+        g = greeks_batch(spots, strikes, times, ivs, calls)
+        for j, i in enumerate(modelled):
+            scale = terms[i]["scale"]
+            model_greeks[i] = (scale * float(g["delta"][j]), scale * float(g["vega"][j]) / 100.0)
+
+    out: list[tuple[float, float]] = []
+    for i, term in enumerate(terms):
+        if "fixed" in term:
+            out.append(term["fixed"])
+            continue
+        default_delta, default_vega = model_greeks.get(i, term["proxy"])
+        position_delta = term["position_delta"]
+        position_vega = term["position_vega"]
+        if position_delta is None:
+            position_delta = default_delta
+        if position_vega is None:
+            position_vega = default_vega
+        out.append((float(position_delta), float(position_vega)))
+    return out
+
+
+def estimate_trade_greeks(trade: Any) -> tuple[float, float]:
+    """
+    Returns deterministic greeks for a position:
+    (delta, vega).
+    Uses provided greeks when available; otherwise Black-Scholes when the
+    trade carries enough inputs, else a stable heuristic.
+    """
+    return estimate_trades_greeks([trade])[0]
 
 
 @dataclass
@@ -203,6 +300,7 @@ class ExposureLedger:
         total_open_exposure = 0.0
         net_delta = 0.0
         net_vega = 0.0
+        priced: list[Any] = []
 
         for trades in (open_trades or {}).values():
             for trade in trades or []:
@@ -216,9 +314,11 @@ class ExposureLedger:
                 if expiry:
                     exposure_by_expiry[str(expiry)] += exposure
                 total_open_exposure += exposure
-                delta_proxy, vega_proxy = estimate_trade_greeks(trade)
-                net_delta += float(delta_proxy)
-                net_vega += float(vega_proxy)
+                priced.append(trade)
+
+        for delta_est, vega_est in estimate_trades_greeks(priced):
+            net_delta += float(delta_est)
+            net_vega += float(vega_est)
 
         exposure_by_underlying_pct: dict[str, float] = {}
         if capital > 0:
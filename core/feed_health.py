@@ -34,7 +34,9 @@ def get_feed_health():
         "market_open": freshness.get("market_open"),
         "tick_lag": (freshness.get("ltp") or {}).get("age_sec"),
         "depth_lag": (freshness.get("depth") or {}).get("age_sec"),
-        "tick_msgs_last_min": None,
+        "tick_msgs_last_min": (freshness.get("tick_writer") or {}).get("msgs_last_min"),
+        "tick_queue_depth": (freshness.get("tick_writer") or {}).get("queue_depth"),
+        "tick_dropped": (freshness.get("tick_writer") or {}).get("dropped"),
         "depth_msgs_last_min": None,
     }
 
@@ -1,6 +1,8 @@
 import hashlib
 import math
 
+from core.clock import resolve_clock
+
 
 class FillModel:
     """
@@ -8,9 +10,12 @@ class FillModel:
 
     This model has no runtime randomness. Any stochastic-looking behavior is
     deterministically derived from (run_id, symbol, side, quote, limit, qty).
+    On a simulated clock a fill also advances the clock by its modeled
+    latency; the wall clock is left alone.
     """
 
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = resolve_clock(clock)
         self.min_latency_ms = 35
         self.max_latency_ms = 280
         self.max_mid_drift_bp = 8.0
@@ -112,4 +117,5 @@ class FillModel:
         result["status"] = "FILLED" if fill_qty >= qty else "PARTIAL"
         result["slippage_bp"] = round(float(slippage_bp), 4)
         result["reason"] = None
+        self.clock.elapse(latency_ms / 1000.0)
         return result
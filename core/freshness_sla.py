@@ -7,9 +7,12 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
 
 from config import config as cfg
+from core import db_pool
+from core.depth_history import depth_history
 from core.depth_store import depth_store
 from core.market_context import derive_market_context
 from core.tick_store import last_tick_epoch as _mem_last_tick_epoch
+from core.tick_store import writer_stats as _tick_writer_stats
 from core.time_utils import (
     compute_age_sec,
     is_market_open_ist,
@@ -55,7 +58,7 @@ def _load_token_map() -> Dict[str, List[int]]:
 
 
 def _conn(db_path: Path) -> sqlite3.Connection:
-    return sqlite3.connect(db_path)
+    return db_pool.connection(db_path)
 
 
 def _query_max_epoch(
@@ -186,6 +189,10 @@ def get_freshness_status(force: bool = False) -> Dict[str, Any]:
                 depth_last_epoch = _query_max_epoch(conn, "depth_snapshots")
                 if depth_last_epoch is not None:
                     depth_source = "depth_snapshots"
+            hist_epoch = normalize_epoch_seconds(depth_history.max_epoch())
+            if hist_epoch is not None and (depth_last_epoch is None or hist_epoch > depth_last_epoch):
+                depth_last_epoch = hist_epoch
+                depth_source = "depth_history"
         except Exception:
             ltp_last_epoch = None
             depth_last_epoch = None
@@ -201,6 +208,15 @@ def get_freshness_status(force: bool = False) -> Dict[str, Any]:
             ltp_last_epoch = mem_tick_epoch
             ltp_source = "tick_store_memory"
 
+    try:
+        tick_writer = _tick_writer_stats()
+    except Exception:
+        tick_writer = {}
+    try:
+        depth_writer = depth_history.stats()
+    except Exception:
+        depth_writer = {}
+
     ltp_age = compute_age_sec(ltp_last_epoch, now_epoch) if ltp_last_epoch is not None else None
     depth_age = compute_age_sec(depth_last_epoch, now_epoch) if depth_last_epoch is not None else None
 
@@ -264,6 +280,8 @@ def get_freshness_status(force: bool = False) -> Dict[str, Any]:
             "source": depth_source,
             "required": bool(market_open and depth_required),
         },
+        "tick_writer": tick_writer,
+        "depth_writer": depth_writer,
         "reasons": reasons,
     }
 
@@ -283,6 +301,9 @@ def get_freshness_status(force: bool = False) -> Dict[str, Any]:
             "depth_age_sec": depth_age,
             "ltp_source": ltp_source,
             "depth_source": depth_source,
+            "tick_queue_depth": tick_writer.get("queue_depth"),
+            "tick_dropped": tick_writer.get("dropped"),
+            "tick_flush_ms": tick_writer.get("last_flush_ms"),
         }
     )
 
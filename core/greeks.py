@@ -1,6 +1,18 @@
 import math
+
+import numpy as np
+
 from config import config as cfg
 
+try:
+    from scipy.special import ndtr as _ndtr
+except Exception:  # scipy is optional; fall back to math.erf per element
+    _erf_vec = np.vectorize(math.erf, otypes=[float])
+
+    def _ndtr(x):
+        return 0.5 * (1.0 + _erf_vec(np.asarray(x, dtype=float) / math.sqrt(2)))
+
+
 def _norm_cdf(x):
     return 0.5 * (1.0 + math.erf(x / math.sqrt(2)))
 
@@ -42,3 +54,129 @@ def greeks(spot, strike, t, vol, is_call=True):
     theta = -(spot * _norm_pdf(d1) * vol / (2 * math.sqrt(t))) - (cfg.RISK_FREE_RATE * strike * math.exp(-cfg.RISK_FREE_RATE * t) * (_norm_cdf(d2) if is_call else _norm_cdf(-d2)))
     vega = spot * _norm_pdf(d1) * math.sqrt(t)
     return {"delta": delta, "gamma": gamma, "theta": theta, "vega": vega}
+
+
+# ---------------------------------------------------------------------------
+# Batch (whole-chain) pricing. Same conventions as the scalar functions above:
+# t in years, r = cfg.RISK_FREE_RATE, theta per year, vega per 1.0 of vol.
+# ---------------------------------------------------------------------------
+
+IV_MIN = 1e-4
+IV_MAX = 5.0
+_INV_SQRT_2PI = 1.0 / math.sqrt(2 * math.pi)
+
+
+def _npdf(x):
+    return np.exp(-0.5 * x * x) * _INV_SQRT_2PI
+
+
+def _broadcast(prices, spots, strikes, times, is_call):
+    arrays = np.broadcast_arrays(
+        np.asarray(prices, dtype=float),
+        np.asarray(spots, dtype=float),
+        np.asarray(strikes, dtype=float),
+        np.asarray(times, dtype=float),
+        np.asarray(is_call, dtype=bool),
+    )
+    return [np.array(a, dtype=a.dtype).ravel() for a in arrays]
+
+
+def _bs_price_vec(spot, strike, t, r, vol, is_call):
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(spot / strike) + (r + 0.5 * vol * vol) * t) / (vol * sqrt_t)
+    d2 = d1 - vol * sqrt_t
+    disc_k = strike * np.exp(-r * t)
+    call = spot * _ndtr(d1) - disc_k * _ndtr(d2)
+    put = disc_k * _ndtr(-d2) - spot * _ndtr(-d1)
+    return np.where(is_call, call, put), spot * _npdf(d1) * sqrt_t
+
+
+def _initial_vol(price, spot, strike, t, r, is_call):
+    """
+    Corrado-Miller rational approximation on the call-equivalent price.
+    """
+    disc_k = strike * np.exp(-r * t)
+    call = np.where(is_call, price, price + spot - disc_k)
+    half_gap = 0.5 * (spot - disc_k)
+    a = call - half_gap
+    root = np.sqrt(np.maximum(a * a - (spot - disc_k) ** 2 / math.pi, 0.0))
+    guess = math.sqrt(2 * math.pi) / (spot + disc_k) * (a + root) / np.sqrt(t)
+    return np.clip(np.nan_to_num(guess, nan=0.3, posinf=0.3, neginf=0.3), 0.05, 3.0)
+
+
+def implied_vol_batch(prices, spots, strikes, times, is_call=True, r=None, tol=1e-4, max_iter=100):
+    """
+    Implied vol for a whole chain in one vectorised pass.
+
+    Newton steps from a rational initial guess, safeguarded by a per-element
+    [lo, hi] bracket: any step that leaves the bracket (or has no vega) is
+    replaced by bisection. Elements drop out of the active mask once the
+    price error is below `tol`. Invalid rows (non-positive price, spot, strike
+    or time) return 0.0, matching implied_vol.
+    """
+    price, spot, strike, t, call = _broadcast(prices, spots, strikes, times, is_call)
+    r = cfg.RISK_FREE_RATE if r is None else float(r)
+    out = np.zeros(price.shape, dtype=float)
+    valid = (price > 0) & (spot > 0) & (strike > 0) & (t > 0)
+    if not valid.any():
+        return out
+    idx = np.flatnonzero(valid)
+    p, s, k, tt, c = price[idx], spot[idx], strike[idx], t[idx], call[idx]
+    vol = _initial_vol(p, s, k, tt, r, c)
+    lo = np.full(vol.shape, IV_MIN)
+    hi = np.full(vol.shape, IV_MAX)
+    active = np.arange(vol.size)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        v = vol[active]
+        est, vega = _bs_price_vec(s[active], k[active], tt[active], r, v, c[active])
+        diff = est - p[active]
+        done = np.abs(diff) < tol
+        high = diff > 0
+        lo[active] = np.where(high, lo[active], v)
+        hi[active] = np.where(high, v, hi[active])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = v - diff / vega
+        bracket_lo, bracket_hi = lo[active], hi[active]
+        bad = ~np.isfinite(step) | (vega < 1e-8) | (step <= bracket_lo) | (step >= bracket_hi)
+        new = np.where(bad, 0.5 * (bracket_lo + bracket_hi), step)
+        vol[active] = np.where(done, v, new)
+        narrow = (bracket_hi - bracket_lo) < 1e-10
+        active = active[~(done | narrow)]
+    out[idx] = np.maximum(vol, IV_MIN)
+    return out
+
+
+def greeks_batch(spots, strikes, times, vols, is_call=True, r=None):
+    """
+    Vectorised greeks(): returns dict of arrays delta/gamma/theta/vega.
+    Rows with non-positive time or vol are all zero, as in the scalar version.
+    """
+    vol, spot, strike, t, call = _broadcast(vols, spots, strikes, times, is_call)
+    r = cfg.RISK_FREE_RATE if r is None else float(r)
+    out = {name: np.zeros(vol.shape, dtype=float) for name in ("delta", "gamma", "theta", "vega")}
+    valid = (t > 0) & (vol > 0) & (spot > 0) & (strike > 0)
+    if not valid.any():
+        return out
+    s, k, tt, v, c = spot[valid], strike[valid], t[valid], vol[valid], call[valid]
+    sqrt_t = np.sqrt(tt)
+    d1 = (np.log(s / k) + (r + 0.5 * v * v) * tt) / (v * sqrt_t)
+    d2 = d1 - v * sqrt_t
+    pdf = _npdf(d1)
+    cdf1 = _ndtr(d1)
+    out["delta"][valid] = np.where(c, cdf1, cdf1 - 1)
+    out["gamma"][valid] = pdf / (s * v * sqrt_t)
+    out["theta"][valid] = -(s * pdf * v / (2 * sqrt_t)) - r * k * np.exp(-r * tt) * np.where(c, _ndtr(d2), _ndtr(-d2))
+    out["vega"][valid] = s * pdf * sqrt_t
+    return out
+
+
+def chain_greeks(prices, spots, strikes, times, is_call=True, r=None):
+    """
+    IV plus greeks for a whole chain: dict of arrays iv/delta/gamma/theta/vega.
+    """
+    iv = implied_vol_batch(prices, spots, strikes, times, is_call=is_call, r=r)
+    out = greeks_batch(spots, strikes, times, iv, is_call=is_call, r=r)
+    out["iv"] = iv
+    return out
@@ -1,3 +1,4 @@
+from collections import deque
 from statistics import mean, pstdev
 
 
@@ -6,11 +7,18 @@ def _safe_mean(xs):
     return sum(xs) / len(xs) if xs else None
 
 
-def compute_indicators(candles, vwap_window=20, atr_period=14, adx_period=14, vol_window=30, slope_window=10):
+def compute_indicators(candles, vwap_window=20, atr_period=14, adx_period=14, vol_window=30, slope_window=10, engine=None):
     """
     Compute VWAP, VWAP slope, ATR, ADX, vol_z from in-memory candles.
     Returns dict with ok flag and last_ts.
+
+    When `engine` (an IndicatorEngine over the same bars) is given, the cached
+    incremental result is returned instead of recomputing the full window.
     """
+    if engine is not None and candles:
+        params = (vwap_window, atr_period, adx_period, vol_window, slope_window)
+        if engine.covers(candles) and engine.matches(engine.bars, params):
+            return engine.snapshot()
     out = {
         "vwap": None,
         "vwap_slope": 0.0,
@@ -26,10 +34,18 @@ def compute_indicators(candles, vwap_window=20, atr_period=14, adx_period=14, vo
     if len(candles) < max(vwap_window, atr_period + 1, adx_period + 1, vol_window):
         return out
 
-    closes = [c["close"] for c in candles]
-    highs = [c["high"] for c in candles]
-    lows = [c["low"] for c in candles]
-    vols = [c.get("volume", 1) or 1 for c in candles]
+    store = getattr(candles, "store", None)
+    if store is not None and getattr(candles, "version", None) == store.version:
+        cols = store.view(len(candles))
+        closes = cols["close"].tolist()
+        highs = cols["high"].tolist()
+        lows = cols["low"].tolist()
+        vols = [v or 1 for v in cols["volume"].tolist()]
+    else:
+        closes = [c["close"] for c in candles]
+        highs = [c["high"] for c in candles]
+        lows = [c["low"] for c in candles]
+        vols = [c.get("volume", 1) or 1 for c in candles]
 
     # VWAP
     tp = [((h + l + c) / 3.0) for h, l, c in zip(highs, lows, closes)]
@@ -92,3 +108,266 @@ def compute_indicators(candles, vwap_window=20, atr_period=14, adx_period=14, vo
 
     out["ok"] = True
     return out
+
+
+def _true_range(high, low, prev_close):
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+def _bar_hlcv(bars, idx):
+    hlcv = getattr(bars, "hlcv", None)
+    if hlcv is not None:
+        high, low, close, vol = hlcv(idx)
+    else:
+        bar = bars[idx]
+        high, low, close, vol = bar["high"], bar["low"], bar["close"], bar.get("volume", 1)
+    return high, low, close, vol or 1
+
+
+class IndicatorEngine:
+    """
+    Incremental VWAP, VWAP slope, ATR, ADX and vol_z over a live bar store
+    (a ColumnarBars from OhlcBuffer, or any sequence of bar dicts).
+
+    Closed bars are folded into rolling state once, when the next bar opens.
+    A tick that only changes the current bar costs O(1), and reads with no
+    bar change return the cached result. Outputs match compute_indicators on
+    the same bars. Wilder-smoothed ADX depends on where the window starts, so
+    once the buffer evicts, each closed bar re-seeds the ADX state from the
+    new first bar: one pass of float arithmetic over the window per bar, not
+    per tick.
+    """
+
+    def __init__(self, bars, vwap_window=20, atr_period=14, adx_period=14, vol_window=30, slope_window=10):
+        self.bars = bars
+        self.params = (int(vwap_window), int(atr_period), int(adx_period), int(vol_window), int(slope_window))
+        self.vwap_window, self.atr_period, self.adx_period, self.vol_window, self.slope_window = self.params
+        self._cache = None
+        self._stale = True
+
+    def matches(self, bars, params):
+        return self.bars is bars and self.params == tuple(int(p) for p in params)
+
+    def covers(self, candles):
+        """
+        True when `candles` is the current state of this engine's bars: a
+        BarWindow taken at the store's current version, or (for plain
+        sequences) the same last bar object.
+        """
+        live = self.bars
+        if not live or len(live) != len(candles):
+            return False
+        store = getattr(candles, "store", None)
+        if store is not None:
+            return store is live and candles.version == getattr(live, "version", None)
+        return live[-1] is candles[-1]
+
+    def invalidate(self):
+        self._stale = True
+        self._cache = None
+
+    def on_bar_update(self):
+        self._cache = None
+
+    def on_bar_append(self, evicted=False):
+        self._cache = None
+        if self._stale or len(self.bars) < 2:
+            self._stale = True
+            return
+        if evicted:
+            self._evict_front()
+        self._close_bar(*_bar_hlcv(self.bars, -2))
+        if evicted:
+            self._reseed_adx()
+
+    def _reset(self):
+        n_tp = max(self.vwap_window - 1, self.slope_window, 1)
+        self._n_closed = 0
+        self._closed_tp = deque(maxlen=n_tp)
+        self._closed_vol = deque(maxlen=max(self.vwap_window - 1, 1))
+        self._closed_tr = deque(maxlen=max(self.atr_period, 1))
+        self._closed_dx = deque(maxlen=max(self.adx_period - 1, 1))
+        self._last_closed = None
+        self._tr_count = 0
+        self._dx_count = 0
+        self._seed_tr = 0.0
+        self._seed_plus = 0.0
+        self._seed_minus = 0.0
+        self._atr_s = None
+        self._plus_s = None
+        self._minus_s = None
+        self._sum_tpv = 0.0
+        self._sum_vol = 0.0
+        self._sum_tr = 0.0
+        self._sum_dx = 0.0
+        self._slope_base = None
+        self._atr_pct = deque()
+        self._pct_shift = None
+        self._pct_sum = 0.0
+        self._pct_sumsq = 0.0
+        self._pct_ops = 0
+        self._vol_z = 0.0
+
+    def _rebuild(self):
+        self._reset()
+        bars = self.bars
+        for idx in range(len(bars) - 1):
+            self._close_bar(*_bar_hlcv(bars, idx))
+        self._stale = False
+
+    def _evict_front(self):
+        self._n_closed = max(0, self._n_closed - 1)
+        if self._atr_pct:
+            self._pct_remove(self._atr_pct.popleft())
+            self._refresh_vol_z()
+
+    def _reseed_adx(self):
+        self._tr_count = 0
+        self._dx_count = 0
+        self._seed_tr = self._seed_plus = self._seed_minus = 0.0
+        self._atr_s = self._plus_s = self._minus_s = None
+        self._closed_dx.clear()
+        bars = self.bars
+        n_closed = len(bars) - 1
+        view = getattr(bars, "view", None)
+        if view is not None:
+            cols = view()
+            hlc = zip(*(cols[name][:n_closed].tolist() for name in ("high", "low", "close")))
+        else:
+            hlc = (_bar_hlcv(bars, idx)[:3] for idx in range(n_closed))
+        prev = None
+        for high, low, close in hlc:
+            if prev is not None:
+                self._adx_step(high, low, prev)
+            prev = (high, low, close)
+        self._sum_dx = sum(self._closed_dx) if self.adx_period > 1 else 0.0
+
+    def _adx_step(self, high, low, prev):
+        p_high, p_low, p_close = prev
+        tr = _true_range(high, low, p_close)
+        up_move = high - p_high
+        down_move = p_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0
+        if self._tr_count < self.adx_period:
+            self._seed_tr += tr
+            self._seed_plus += plus_dm
+            self._seed_minus += minus_dm
+            if self._tr_count == self.adx_period - 1:
+                self._atr_s, self._plus_s, self._minus_s = self._seed_tr, self._seed_plus, self._seed_minus
+        else:
+            self._atr_s, self._plus_s, self._minus_s, dx = self._wilder_step(tr, plus_dm, minus_dm)
+            self._closed_dx.append(dx)
+            self._dx_count += 1
+        self._tr_count += 1
+        return tr
+
+    def _pct_add(self, value):
+        if self._pct_shift is None:
+            self._pct_shift = value
+        d = value - self._pct_shift
+        self._atr_pct.append(value)
+        self._pct_sum += d
+        self._pct_sumsq += d * d
+        self._pct_ops += 1
+
+    def _pct_remove(self, value):
+        d = value - self._pct_shift
+        self._pct_sum -= d
+        self._pct_sumsq -= d * d
+        self._pct_ops += 1
+
+    def _refresh_vol_z(self):
+        n = len(self._atr_pct)
+        if n < 5:
+            self._vol_z = 0.0
+            return
+        if self._pct_ops >= 1024:
+            self._pct_shift = self._atr_pct[0]
+            self._pct_sum = sum(v - self._pct_shift for v in self._atr_pct)
+            self._pct_sumsq = sum((v - self._pct_shift) ** 2 for v in self._atr_pct)
+            self._pct_ops = 0
+        mean_d = self._pct_sum / n
+        var = max(self._pct_sumsq / n - mean_d * mean_d, 0.0)
+        sd = var ** 0.5
+        mu = self._pct_shift + mean_d
+        if sd <= 1e-12 * max(abs(mu), 1e-12):
+            self._vol_z = 0.0
+        else:
+            self._vol_z = (self._atr_pct[-1] - mu) / sd
+
+    def _close_bar(self, high, low, close, vol):
+        k = self._n_closed
+        self._n_closed += 1
+        self._closed_tp.append((high + low + close) / 3.0)
+        self._closed_vol.append(vol)
+        if self._last_closed is not None:
+            tr = self._adx_step(high, low, self._last_closed)
+            self._closed_tr.append(tr)
+            if k >= self.atr_period and len(self._closed_tr) >= self.atr_period:
+                self._pct_add((sum(self._closed_tr) / self.atr_period) / (close if close else 1))
+                self._refresh_vol_z()
+        self._last_closed = (high, low, close)
+        tps = list(self._closed_tp)
+        vols = list(self._closed_vol)
+        n_vwap = self.vwap_window - 1
+        if n_vwap > 0:
+            self._sum_tpv = sum(t * v for t, v in zip(tps[-n_vwap:], vols[-n_vwap:]))
+            self._sum_vol = sum(vols[-n_vwap:])
+        else:
+            self._sum_tpv, self._sum_vol = 0.0, 0
+        self._slope_base = sum(tps[-self.slope_window:]) / self.slope_window if len(tps) >= self.slope_window else None
+        n_atr = self.atr_period - 1
+        trs = list(self._closed_tr)
+        self._sum_tr = sum(trs[-n_atr:]) if n_atr > 0 else 0.0
+        self._sum_dx = sum(self._closed_dx) if self.adx_period > 1 else 0.0
+
+    def _wilder_step(self, tr, plus_dm, minus_dm):
+        n = self.adx_period
+        atr_s = self._atr_s - (self._atr_s / n) + tr
+        plus_s = self._plus_s - (self._plus_s / n) + plus_dm
+        minus_s = self._minus_s - (self._minus_s / n) + minus_dm
+        plus_di = 100 * (plus_s / atr_s) if atr_s else 0
+        minus_di = 100 * (minus_s / atr_s) if atr_s else 0
+        dx = 100 * abs(plus_di - minus_di) / max(plus_di + minus_di, 1e-9)
+        return atr_s, plus_s, minus_s, dx
+
+    def _compute(self, high, low, close, vol, last_ts):
+        out = {
+            "vwap": None,
+            "vwap_slope": 0.0,
+            "atr": None,
+            "adx": None,
+            "vol_z": self._vol_z,
+            "ok": True,
+            "last_ts": last_ts,
+        }
+        tp = (high + low + close) / 3.0
+        vwap = (self._sum_tpv + tp * vol) / max(self._sum_vol + vol, 1)
+        out["vwap"] = vwap
+        if self._slope_base is not None:
+            out["vwap_slope"] = (vwap - self._slope_base) / self.slope_window
+        p_high, p_low, p_close = self._last_closed
+        tr = _true_range(high, low, p_close)
+        out["atr"] = (self._sum_tr + tr) / self.atr_period
+        if self._tr_count >= self.adx_period:
+            up_move = high - p_high
+            down_move = p_low - low
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0
+            _, _, _, dx = self._wilder_step(tr, plus_dm, minus_dm)
+            out["adx"] = (self._sum_dx + dx) / min(self._dx_count + 1, self.adx_period)
+        return out
+
+    def snapshot(self):
+        bars = self.bars
+        if not bars:
+            return compute_indicators([], *self.params)
+        required = max(self.vwap_window, self.atr_period + 1, self.adx_period + 1, self.vol_window)
+        if len(bars) < required:
+            return compute_indicators(list(bars), *self.params)
+        if self._stale:
+            self._rebuild()
+        if self._cache is None:
+            self._cache = self._compute(*_bar_hlcv(bars, -1), bars[-1].get("ts"))
+        return dict(self._cache)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def coerce_expiry(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text.split("T", 1)[0]).date()
+    except Exception:
+        return None
+
+
+def _strike_of(inst: Dict[str, Any]) -> Optional[float]:
+    strike = inst.get("strike")
+    if strike is None:
+        return None
+    try:
+        return float(strike)
+    except Exception:
+        return None
+
+
+class ExpiryGroup:
+    """
+    Instruments of one (name, segment, expiry), sorted by strike.
+    """
+
+    __slots__ = ("strikes", "rows", "by_strike_type")
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        priced = sorted(((s, inst) for inst in rows if (s := _strike_of(inst)) is not None), key=lambda x: x[0])
+        self.strikes: List[float] = [s for s, _ in priced]
+        self.rows: List[Dict[str, Any]] = [inst for _, inst in priced]
+        self.by_strike_type: Dict[Tuple[float, Any], Dict[str, Any]] = {}
+        for s, inst in priced:
+            self.by_strike_type.setdefault((s, inst.get("instrument_type")), inst)
+
+    def window(self, min_strike: float, max_strike: float) -> List[Dict[str, Any]]:
+        lo = bisect_left(self.strikes, min_strike)
+        hi = bisect_right(self.strikes, max_strike)
+        return self.rows[lo:hi]
+
+    def nearest(self, atm: float, count: int) -> List[Dict[str, Any]]:
+        """
+        Rows whose strike is among the `count` distinct strikes closest to atm.
+        """
+        unique = sorted(set(self.strikes))
+        if not unique or count <= 0:
+            return []
+        pos = bisect_left(unique, atm)
+        lo, hi = pos, pos
+        while hi - lo < count and (lo > 0 or hi < len(unique)):
+            if lo > 0 and (hi >= len(unique) or abs(unique[lo - 1] - atm) <= abs(unique[hi] - atm)):
+                lo -= 1
+            else:
+                hi += 1
+        return self.window(unique[lo], unique[hi - 1])
+
+
+class InstrumentIndex:
+    """
+    Lookup structure over one exchange's instruments list.
+
+    Built once per instruments refresh: expiries are parsed once, option rows
+    are grouped by (name, segment, expiry) with sorted strikes, and
+    token/tradingsymbol maps are plain dicts. ATM windows are O(log n) and
+    symbol resolution O(1).
+    """
+
+    def __init__(self, instruments: Iterable[Dict[str, Any]]):
+        self.token_to_symbol: Dict[Any, str] = {}
+        self.symbol_to_inst: Dict[str, Dict[str, Any]] = {}
+        self._by_name_segment: Dict[Tuple[Any, Any], List[Dict[str, Any]]] = {}
+        self._groups: Dict[Tuple[Any, Any, Any], ExpiryGroup] = {}
+        self._expiries: Dict[Tuple[Any, Any], List[date]] = {}
+        self._raw_expiries: Dict[Tuple[Any, Any], List[Any]] = {}
+        pending: Dict[Tuple[Any, Any, Any], List[Dict[str, Any]]] = {}
+        self.size = 0
+        for inst in instruments or []:
+            self.size += 1
+            tok = inst.get("instrument_token")
+            sym = inst.get("tradingsymbol")
+            if tok and sym:
+                self.token_to_symbol[tok] = sym
+            if sym and sym not in self.symbol_to_inst:
+                self.symbol_to_inst[sym] = inst
+            key = (inst.get("name"), inst.get("segment"))
+            self._by_name_segment.setdefault(key, []).append(inst)
+            raw = inst.get("expiry")
+            exp = coerce_expiry(raw)
+            pending.setdefault((key[0], key[1], exp if exp is not None else str(raw)), []).append(inst)
+            if raw:
+                self._raw_expiries.setdefault(key, []).append(raw)
+        for group_key, rows in pending.items():
+            self._groups[group_key] = ExpiryGroup(rows)
+            exp = group_key[2]
+            if isinstance(exp, date):
+                self._expiries.setdefault(group_key[:2], []).append(exp)
+        for exps in self._expiries.values():
+            exps.sort()
+        self._raw_expiries = {k: list(dict.fromkeys(v)) for k, v in self._raw_expiries.items()}
+
+    def rows(self, name: Any, segment: Any) -> List[Dict[str, Any]]:
+        return self._by_name_segment.get((name, segment), [])
+
+    def rows_for_names(self, names: Iterable[Any], segment: Any) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for name in dict.fromkeys(names):
+            out.extend(self.rows(name, segment))
+        return out
+
+    def expiries(self, name: Any, segment: Any) -> List[date]:
+        """
+        Distinct parsed expiries, ascending.
+        """
+        return self._expiries.get((name, segment), [])
+
+    def raw_expiries(self, name: Any, segment: Any) -> List[Any]:
+        """
+        Distinct expiry values as stored in the instruments list.
+        """
+        return self._raw_expiries.get((name, segment), [])
+
+    def group(self, name: Any, segment: Any, expiry: Any) -> Optional[ExpiryGroup]:
+        exp = coerce_expiry(expiry)
+        return self._groups.get((name, segment, exp if exp is not None else str(expiry)))
+
+    def expiry_rows(self, name: Any, segment: Any, expiry: Any) -> List[Dict[str, Any]]:
+        group = self.group(name, segment, expiry)
+        return list(group.rows) if group is not None else []
+
+    def strike_window(self, name: Any, segment: Any, expiry: Any, min_strike: float, max_strike: float) -> List[Dict[str, Any]]:
+        group = self.group(name, segment, expiry)
+        if group is None:
+            return []
+        return group.window(min_strike, max_strike)
+
+    def find_option(self, name: Any, segment: Any, strike: Any, opt_type: Any, expiry: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        First instrument for (strike, type); any expiry when expiry is None
+        (nearest expiry first, unparseable expiries last).
+        """
+        strike_val = float(strike)
+        if expiry is not None:
+            group = self.group(name, segment, expiry)
+            return group.by_strike_type.get((strike_val, opt_type)) if group is not None else None
+        for exp in self.expiries(name, segment):
+            inst = self._groups[(name, segment, exp)].by_strike_type.get((strike_val, opt_type))
+            if inst is not None:
+                return inst
+        for (g_name, g_seg, exp), group in self._groups.items():
+            if g_name == name and g_seg == segment and not isinstance(exp, date):
+                inst = group.by_strike_type.get((strike_val, opt_type))
+                if inst is not None:
+                    return inst
+        return None
@@ -1,9 +1,19 @@
 import time
 import json
 import os
+import pickle
 from datetime import date, datetime
 from pathlib import Path
 from config import config as cfg
+from core.instrument_index import InstrumentIndex
+from core.kite_rate_limiter import (
+    ENDPOINT_HISTORICAL,
+    ENDPOINT_OTHER,
+    ENDPOINT_QUOTE,
+    QUOTE_MAX_INSTRUMENTS,
+    EndpointLimiter,
+    QuoteCoalescer,
+)
 
 try:
     from kiteconnect import KiteConnect
@@ -15,7 +25,14 @@ class KiteClient:
         self.kite = None
         self._instruments_cache = {}
         self._cache_ts = 0
+        self._indexes = {}
         self.last_init_error = None
+        self.limiter = EndpointLimiter()
+        self._quote_coalescer = QuoteCoalescer(
+            fetch=self._quote_call,
+            acquire=lambda: self.limiter.acquire(ENDPOINT_QUOTE),
+            max_batch=int(getattr(cfg, "KITE_QUOTE_BATCH_MAX", QUOTE_MAX_INSTRUMENTS)),
+        )
 
     def ensure(self):
         self._ensure()
@@ -86,11 +103,35 @@ class KiteClient:
         self._ensure()
         if not self.kite:
             return []
-        time.sleep(cfg.KITE_RATE_LIMIT_SLEEP)
+        self.limiter.acquire(ENDPOINT_OTHER)
         return self.kite.instruments(exchange) if exchange else self.kite.instruments()
 
+    @staticmethod
+    def _load_disk_cache(pickle_path, json_path, ttl_sec, now):
+        """
+        Cached instruments by exchange key from the pickle cache, falling back
+        to the legacy JSON cache. Returns None when neither is fresh.
+        """
+        if pickle_path.exists() and (ttl_sec is None or (now - pickle_path.stat().st_mtime) < ttl_sec):
+            try:
+                with pickle_path.open("rb") as fh:
+                    raw = pickle.load(fh)
+                if isinstance(raw, dict):
+                    return raw
+            except Exception:
+                pass
+        if json_path.exists() and (ttl_sec is None or (now - json_path.stat().st_mtime) < ttl_sec):
+            try:
+                raw = json.loads(json_path.read_text())
+                if isinstance(raw, dict):
+                    return raw
+            except Exception:
+                pass
+        return None
+
     def instruments_cached(self, exchange=None, ttl_sec=3600):
-        cache_path = Path("data/kite_instruments.json")
+        cache_path = Path("data/kite_instruments.pkl")
+        legacy_path = Path("data/kite_instruments.json")
         now = time.time()
         key = exchange or "ALL"
 
@@ -98,15 +139,12 @@ class KiteClient:
             return self._instruments_cache[key]
 
         # Try disk cache
-        if cache_path.exists() and (now - cache_path.stat().st_mtime) < ttl_sec:
-            try:
-                raw = json.loads(cache_path.read_text())
-                self._instruments_cache = raw
-                self._cache_ts = now
-                if key in raw:
-                    return raw[key]
-            except Exception:
-                pass
+        raw = self._load_disk_cache(cache_path, legacy_path, ttl_sec, now)
+        if raw is not None:
+            self._instruments_cache = raw
+            self._cache_ts = now
+            if key in raw:
+                return raw[key]
 
         data = None
         try:
@@ -124,24 +162,38 @@ class KiteClient:
                 except Exception:
                     data = []
             # fallback to cache if it has data
-            if not data and cache_path.exists():
-                try:
-                    raw = json.loads(cache_path.read_text())
-                    cached = raw.get(key, [])
-                    if cached:
-                        data = cached
-                except Exception:
-                    pass
+            if not data:
+                raw = self._load_disk_cache(cache_path, legacy_path, None, now)
+                cached = (raw or {}).get(key, [])
+                if cached:
+                    data = cached
         if data:
             self._instruments_cache[key] = data
             self._cache_ts = now
             try:
                 cache_path.parent.mkdir(exist_ok=True)
-                cache_path.write_text(json.dumps(self._instruments_cache))
+                tmp_path = cache_path.with_suffix(".pkl.tmp")
+                with tmp_path.open("wb") as fh:
+                    pickle.dump(self._instruments_cache, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                tmp_path.replace(cache_path)
             except Exception:
                 pass
         return data
 
+    def instrument_index(self, exchange="NFO"):
+        """
+        InstrumentIndex over instruments_cached(exchange), rebuilt only when
+        the cached instruments list is replaced.
+        """
+        data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600)) or []
+        key = exchange or "ALL"
+        cached = self._indexes.get(key)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        index = InstrumentIndex(data)
+        self._indexes[key] = (data, index)
+        return index
+
     def resolve_tokens(self, symbols, exchange="NFO"):
         data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
         tokens = []
@@ -153,71 +205,35 @@ class KiteClient:
         return list(set(tokens))
 
     def resolve_option_tokens(self, symbols, expiry_date, strikes_around=2, step=50):
-        data = self.instruments_cached("NFO", ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
+        index = self.instrument_index("NFO")
         tokens = []
-        for inst in data:
-            if inst.get("segment") != "NFO-OPT":
-                continue
-            if inst.get("name") not in symbols:
-                continue
-            if inst.get("expiry") != expiry_date:
-                continue
-            strike = inst.get("strike")
-            if strike is None:
-                continue
-            tok = inst.get("instrument_token")
-            if tok:
-                tokens.append(tok)
+        for name in dict.fromkeys(symbols):
+            for inst in index.expiry_rows(name, "NFO-OPT", expiry_date):
+                tok = inst.get("instrument_token")
+                if tok:
+                    tokens.append(tok)
         return list(set(tokens))
 
     def resolve_option_tokens_exchange(self, symbols, expiry_date, exchange="NFO"):
         seg = "NFO-OPT" if exchange == "NFO" else "BFO-OPT"
-        data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
-        expiry_norm = self._coerce_expiry_date(expiry_date)
+        index = self.instrument_index(exchange)
         tokens = []
-        for inst in data:
-            if inst.get("segment") != seg:
-                continue
-            if inst.get("name") not in symbols:
-                continue
-            inst_expiry = self._coerce_expiry_date(inst.get("expiry"))
-            if expiry_norm is not None and inst_expiry != expiry_norm:
-                continue
-            if expiry_norm is None and inst.get("expiry") != expiry_date:
-                continue
-            tok = inst.get("instrument_token")
-            if tok:
-                tokens.append(tok)
+        for name in dict.fromkeys(symbols):
+            for inst in index.expiry_rows(name, seg, expiry_date):
+                tok = inst.get("instrument_token")
+                if tok:
+                    tokens.append(tok)
         return list(set(tokens))
 
     def resolve_option_tokens_window(self, symbol, expiry_date, atm_strike, strikes_around, step, exchange="NFO"):
         seg = "NFO-OPT" if exchange == "NFO" else "BFO-OPT"
-        data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
-        tokens = []
         if atm_strike is None or step is None or step <= 0:
             return []
-        expiry_norm = self._coerce_expiry_date(expiry_date)
+        index = self.instrument_index(exchange)
         min_strike = atm_strike - (strikes_around * step)
         max_strike = atm_strike + (strikes_around * step)
-        for inst in data:
-            if inst.get("segment") != seg:
-                continue
-            if inst.get("name") != symbol:
-                continue
-            inst_expiry = self._coerce_expiry_date(inst.get("expiry"))
-            if expiry_norm is not None and inst_expiry != expiry_norm:
-                continue
-            if expiry_norm is None and inst.get("expiry") != expiry_date:
-                continue
-            strike = inst.get("strike")
-            if strike is None:
-                continue
-            try:
-                strike_val = float(strike)
-            except Exception:
-                continue
-            if strike_val < min_strike or strike_val > max_strike:
-                continue
+        tokens = []
+        for inst in index.strike_window(symbol, seg, expiry_date, min_strike, max_strike):
             tok = inst.get("instrument_token")
             if tok:
                 tokens.append(tok)
@@ -225,16 +241,8 @@ class KiteClient:
 
     def next_available_expiry(self, symbol, exchange="NFO"):
         seg = "NFO-OPT" if exchange == "NFO" else "BFO-OPT"
-        data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
-        expiries = []
-        for inst in data:
-            if inst.get("segment") != seg:
-                continue
-            if inst.get("name") != symbol:
-                continue
-            exp = inst.get("expiry")
-            if exp:
-                expiries.append(exp)
+        index = self.instrument_index(exchange)
+        expiries = index.raw_expiries(symbol, seg)
         if not expiries:
             return None
         try:
@@ -246,106 +254,73 @@ class KiteClient:
         except Exception:
             pass
 
-        normalized = []
-        for exp in expiries:
-            if isinstance(exp, datetime):
-                normalized.append(exp.date())
-                continue
-            if isinstance(exp, date):
-                normalized.append(exp)
-                continue
-            try:
-                text = str(exp).split("T", 1)[0]
-                normalized.append(datetime.fromisoformat(text).date())
-            except Exception:
-                continue
+        normalized = index.expiries(symbol, seg)
         if not normalized:
             return None
-        normalized = sorted(set(normalized))
         future = [d for d in normalized if d >= date.today()]
         return future[0] if future else normalized[0]
 
     def token_symbol_map(self, exchange="NFO"):
-        data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
-        m = {}
-        for inst in data:
-            tok = inst.get("instrument_token")
-            sym = inst.get("tradingsymbol")
-            if tok and sym:
-                m[tok] = sym
-        return m
+        return dict(self.instrument_index(exchange).token_to_symbol)
 
     def find_option_symbol(self, symbol, strike, opt_type, exchange="NFO"):
         seg = "NFO-OPT" if exchange == "NFO" else "BFO-OPT"
-        data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
-        strike_val = float(strike)
-        for inst in data:
-            if inst.get("segment") != seg:
-                continue
-            if inst.get("name") != symbol:
-                continue
-            if inst.get("strike") is None:
-                continue
-            if float(inst.get("strike")) != strike_val:
-                continue
-            if inst.get("instrument_type") != opt_type:
-                continue
-            ts = inst.get("tradingsymbol")
-            if ts:
-                return f"{exchange}:{ts}"
+        inst = self.instrument_index(exchange).find_option(symbol, seg, strike, opt_type)
+        ts = inst.get("tradingsymbol") if inst else None
+        if ts:
+            return f"{exchange}:{ts}"
         return None
 
     def find_option_symbol_with_expiry(self, symbol, strike, opt_type, expiry, exchange="NFO"):
         seg = "NFO-OPT" if exchange == "NFO" else "BFO-OPT"
-        data = self.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
-        strike_val = float(strike)
-        exp_str = str(expiry)
-        for inst in data:
-            if inst.get("segment") != seg:
-                continue
-            if inst.get("name") != symbol:
-                continue
-            if inst.get("strike") is None:
-                continue
-            if float(inst.get("strike")) != strike_val:
-                continue
-            if inst.get("instrument_type") != opt_type:
-                continue
-            if exp_str and str(inst.get("expiry")) != exp_str:
-                continue
-            ts = inst.get("tradingsymbol")
-            if ts:
-                return f"{exchange}:{ts}"
+        inst = self.instrument_index(exchange).find_option(symbol, seg, strike, opt_type, expiry=expiry or None)
+        ts = inst.get("tradingsymbol") if inst else None
+        if ts:
+            return f"{exchange}:{ts}"
         return None
 
+    def _quote_call(self, keys):
+        return self.kite.quote(keys)
+
     def quote(self, symbols):
+        """
+        Rate-limited quote; concurrent callers share calls of up to
+        KITE_QUOTE_BATCH_MAX instruments.
+        """
         self._ensure()
         if not self.kite:
             return {}
-        time.sleep(cfg.KITE_RATE_LIMIT_SLEEP)
-        return self.kite.quote(symbols)
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        return self._quote_coalescer.request(symbols)
 
     def ltp(self, symbols):
         self._ensure()
         if not self.kite:
             return {}
-        time.sleep(cfg.KITE_RATE_LIMIT_SLEEP)
+        self.limiter.acquire(ENDPOINT_QUOTE)
         return self.kite.ltp(symbols)
 
     def trades(self):
         self._ensure()
         if not self.kite:
             return []
-        time.sleep(cfg.KITE_RATE_LIMIT_SLEEP)
+        self.limiter.acquire(ENDPOINT_OTHER)
         return self.kite.trades()
 
     def historical_data(self, instrument_token, from_dt, to_dt, interval="minute"):
         self._ensure()
         if not self.kite:
             return []
-        time.sleep(cfg.KITE_RATE_LIMIT_SLEEP)
+        self.limiter.acquire(ENDPOINT_HISTORICAL)
         return self.kite.historical_data(instrument_token, from_dt, to_dt, interval)
 
+    def api_stats(self):
+        """
+        Per-endpoint call counts, limiter wait and calls/sec, plus quote coalescing counters.
+        """
+        return {"endpoints": self.limiter.stats(), "quote_coalescer": self._quote_coalescer.stats()}
+
     def resolve_index_token(self, symbol):
         sym = (symbol or "").upper()
         exchange = "BSE" if sym == "SENSEX" else "NSE"
@@ -8,7 +8,8 @@ import os
 from pathlib import Path
 from core.kite_client import kite_client
 from core.depth_store import depth_store
-from core.tick_store import insert_tick, record_tick_epoch
+from core.depth_history import depth_history
+from core.tick_store import insert_tick, record_tick_epoch, start_tick_writer
 from core.time_utils import is_market_open_ist, now_utc_epoch, now_ist
 from core.auth_health import get_kite_auth_health
 from core.feed_restart_guard import feed_restart_guard
@@ -491,6 +492,12 @@ def start_depth_ws(instrument_tokens, profile_verified=False, skip_lock: bool =
     _LAST_TOKENS = list(tokens)
     _STALE_STRIKES = 0
     _WARMUP_PENDING = True
+    if cfg.KITE_STORE_TICKS and getattr(cfg, "TICK_WRITER_ASYNC", True):
+        if start_tick_writer():
+            _log_ws("FEED_TICK_WRITER_STARTED", {})
+    if getattr(cfg, "DEPTH_HISTORY_ASYNC", True):
+        if depth_history.start():
+            _log_ws("FEED_DEPTH_WRITER_STARTED", {})
     _STOP_REQUESTED = False
     _LAST_WS_TICK_EPOCH = 0.0
 
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from threading import Condition, Event, Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config import config as cfg
+
+# Kite Connect published limits (requests per second).
+ENDPOINT_QUOTE = "quote"
+ENDPOINT_HISTORICAL = "historical"
+ENDPOINT_ORDER = "order"
+ENDPOINT_OTHER = "other"
+
+DEFAULT_RATES = {
+    ENDPOINT_QUOTE: 1.0,
+    ENDPOINT_HISTORICAL: 3.0,
+    ENDPOINT_ORDER: 10.0,
+    ENDPOINT_OTHER: 10.0,
+}
+
+QUOTE_MAX_INSTRUMENTS = 500
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, up to `burst` stored.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = max(float(rate), 1e-9)
+        self.burst = max(float(burst if burst is not None else 1.0), 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take `tokens`, sleeping until they are available. Returns seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class EndpointLimiter:
+    """
+    One TokenBucket per Kite endpoint class plus call/wait accounting.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self.rates = dict(DEFAULT_RATES)
+        self.rates.update(rates if rates is not None else _configured_rates())
+        self._buckets = {name: TokenBucket(rate, burst=1.0, clock=clock, sleep=sleep) for name, rate in self.rates.items()}
+        self._lock = Lock()
+        self._calls: Dict[str, int] = {}
+        self._wait_sec: Dict[str, float] = {}
+        self._recent: Dict[str, deque] = {}
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                bucket = TokenBucket(self.rates[ENDPOINT_OTHER], burst=1.0, clock=self._clock, sleep=self._sleep)
+                self._buckets[endpoint] = bucket
+            return bucket
+
+    def acquire(self, endpoint: str) -> float:
+        waited = self.bucket(endpoint).acquire()
+        now = self._clock()
+        with self._lock:
+            self._calls[endpoint] = self._calls.get(endpoint, 0) + 1
+            self._wait_sec[endpoint] = self._wait_sec.get(endpoint, 0.0) + waited
+            recent = self._recent.setdefault(endpoint, deque())
+            recent.append(now)
+            while recent and now - recent[0] > 60.0:
+                recent.popleft()
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = self._clock()
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for endpoint, calls in self._calls.items():
+                recent = self._recent.get(endpoint) or deque()
+                in_window = [t for t in recent if now - t <= 60.0]
+                span = (now - in_window[0]) if len(in_window) > 1 else 0.0
+                out[endpoint] = {
+                    "calls": calls,
+                    "wait_ms_total": round(self._wait_sec.get(endpoint, 0.0) * 1000.0, 3),
+                    "calls_last_60s": len(in_window),
+                    "calls_per_sec": round((len(in_window) - 1) / span, 3) if span > 0 else None,
+                    "rate_limit_per_sec": self.rates.get(endpoint, self.rates[ENDPOINT_OTHER]),
+                }
+        return out
+
+
+def _configured_rates() -> Dict[str, float]:
+    return {
+        ENDPOINT_QUOTE: float(getattr(cfg, "KITE_QUOTE_RATE_PER_SEC", DEFAULT_RATES[ENDPOINT_QUOTE])),
+        ENDPOINT_HISTORICAL: float(getattr(cfg, "KITE_HISTORICAL_RATE_PER_SEC", DEFAULT_RATES[ENDPOINT_HISTORICAL])),
+        ENDPOINT_ORDER: float(getattr(cfg, "KITE_ORDER_RATE_PER_SEC", DEFAULT_RATES[ENDPOINT_ORDER])),
+        ENDPOINT_OTHER: float(getattr(cfg, "KITE_API_RATE_PER_SEC", DEFAULT_RATES[ENDPOINT_OTHER])),
+    }
+
+
+class _Batch:
+    __slots__ = ("keys", "done", "result", "error", "callers")
+
+    def __init__(self) -> None:
+        self.keys: Dict[str, None] = {}
+        self.done = Event()
+        self.result: Dict[str, Any] = {}
+        self.error: Optional[BaseException] = None
+        self.callers = 0
+
+
+class QuoteCoalescer:
+    """
+    Merges concurrent quote requests into shared calls of up to `max_batch`
+    instruments.
+
+    The first caller of an open batch becomes its leader: it waits for the
+    rate limiter, closes the batch and makes the API call; callers arriving
+    while the leader waits add their keys to the same batch and block until
+    it completes. Each caller gets back only the keys it asked for.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Dict[str, Any]],
+        acquire: Callable[[], Any],
+        max_batch: int = QUOTE_MAX_INSTRUMENTS,
+    ) -> None:
+        self._fetch = fetch
+        self._acquire = acquire
+        self.max_batch = max(int(max_batch), 1)
+        self._cond = Condition()
+        self._open: Optional[_Batch] = None
+        self.requests = 0
+        self.calls = 0
+        self.coalesced = 0
+
+    def request(self, keys: Iterable[str]) -> Dict[str, Any]:
+        wanted = list(dict.fromkeys(str(k) for k in keys))
+        if not wanted:
+            return {}
+        out: Dict[str, Any] = {}
+        for start in range(0, len(wanted), self.max_batch):
+            chunk = wanted[start : start + self.max_batch]
+            result = self._request_chunk(chunk)
+            for key in chunk:
+                if key in result:
+                    out[key] = result[key]
+        return out
+
+    def _request_chunk(self, keys: List[str]) -> Dict[str, Any]:
+        with self._cond:
+            self.requests += 1
+            batch = self._open
+            leader = False
+            if batch is not None:
+                merged = len(batch.keys) + sum(1 for k in keys if k not in batch.keys)
+                if merged > self.max_batch:
+                    batch = None
+            if batch is None:
+                batch = _Batch()
+                self._open = batch
+                leader = True
+            else:
+                self.coalesced += 1
+            batch.callers += 1
+            for key in keys:
+                batch.keys[key] = None
+        if not leader:
+            batch.done.wait()
+        else:
+            try:
+                self._acquire()
+            finally:
+                with self._cond:
+                    if self._open is batch:
+                        self._open = None
+                    self.calls += 1
+            try:
+                batch.result = self._fetch(list(batch.keys)) or {}
+            except BaseException as exc:
+                batch.error = exc
+            finally:
+                batch.done.set()
+        if batch.error is not None:
+            raise batch.error
+        return batch.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"requests": self.requests, "calls": self.calls, "coalesced": self.coalesced}
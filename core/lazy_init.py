@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from core.paths import logs_dir
+from core.log_writer import get_jsonl_writer
+
+_ERROR_LOG_PATH = logs_dir() / "startup_errors.jsonl"
+_ERROR_LOGGER = get_jsonl_writer(_ERROR_LOG_PATH)
+
+_LOCK_ATTR = "_lazy_init_lock"
+_TIMINGS_ATTR = "_lazy_init_timings"
+
+
+def _instance_lock(obj: Any) -> threading.RLock:
+    # dict.setdefault is atomic, so racing first accesses share one lock.
+    return obj.__dict__.setdefault(_LOCK_ATTR, threading.RLock())
+
+
+class LazyAttribute:
+    """
+    Instance attribute built by `builder(instance)` on first access.
+
+    Used for components whose construction imports heavy dependencies
+    (xgboost, TensorFlow, model files) so they are not on the startup path.
+    Assigning the attribute replaces the built value, as with a plain
+    attribute. Builds are serialised per instance; a failed build raises to
+    the caller and is retried on the next access.
+    """
+
+    def __init__(self, builder: Callable[[Any], Any]) -> None:
+        self._builder = builder
+        self._name = ""
+        self._slot = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+        self._slot = f"_lazy_{name}"
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        state = obj.__dict__
+        if self._slot in state:
+            return state[self._slot]
+        with _instance_lock(obj):
+            if self._slot in state:
+                return state[self._slot]
+            started = time.perf_counter()
+            value = self._builder(obj)
+            state[self._slot] = value
+            state.setdefault(_TIMINGS_ATTR, {})[self._name] = round((time.perf_counter() - started) * 1000.0, 3)
+            return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self._slot] = value
+
+    def __delete__(self, obj: Any) -> None:
+        obj.__dict__.pop(self._slot, None)
+
+    def is_built(self, obj: Any) -> bool:
+        return self._slot in obj.__dict__
+
+
+def is_built(obj: Any, name: str) -> bool:
+    attr = getattr(type(obj), name, None)
+    if isinstance(attr, LazyAttribute):
+        return attr.is_built(obj)
+    return name in obj.__dict__
+
+
+def build_timings(obj: Any) -> Dict[str, float]:
+    """
+    Milliseconds spent building each lazy attribute of `obj` so far.
+    """
+    return dict(obj.__dict__.get(_TIMINGS_ATTR, {}))
+
+
+def warm_attributes(obj: Any, names: Iterable[str], thread_name: str = "lazy-warm") -> threading.Thread:
+    """
+    Build `names` on a daemon thread so they are usually ready before first
+    use. Failures are logged and left for the first real access to retry.
+    """
+    names = list(names)
+
+    def _run() -> None:
+        for name in names:
+            try:
+                getattr(obj, name)
+            except Exception as exc:
+                try:
+                    _ERROR_LOGGER.write(
+                        {
+                            "ts_epoch": time.time(),
+                            "event": "LAZY_WARM_ERROR",
+                            "component": name,
+                            "error": f"{type(exc).__name__}:{exc}",
+                        }
+                    )
+                except Exception:
+                    pass
+
+    thread = threading.Thread(target=_run, name=thread_name, daemon=True)
+    thread.start()
+    return thread
@@ -6,10 +6,14 @@ import os
 import json
 import time
 import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timezone
 from datetime import datetime, timedelta
 from config import config as cfg
 from core.option_chain import fetch_option_chain as fetch_option_chain_impl
+from core.option_chain_frame import OptionChainFrame
+from core.snapshot_publisher import get_publisher
 from core.regime_prob_model import RegimeProbModel
 from core.news_shock_encoder import NewsShockEncoder
 from core.news_encoder import NewsEncoder
@@ -53,6 +57,15 @@ _INSUFFICIENT_OHLC_WARNED = set()
 _INDEX_REST_QUOTE_REFRESH_TS = {}
 _INDEX_QUOTE_REQUEST_LOG_TS = {}
 _LIVE_QUOTE_ERROR_LAST_TS = {}
+# Per-symbol caches above are sharded by symbol key; these guard the few
+# pieces of state shared across symbols when the pipeline runs concurrently.
+_INDEX_QUOTE_LOCK = threading.RLock()
+_CROSS_ASSET_LOCK = threading.Lock()
+_CHAIN_HEALTH_SNAPSHOT = get_publisher("logs/option_chain_health.json", indent=2)
+_CYCLE_TIMINGS_LOCK = threading.Lock()
+_LAST_CYCLE_TIMINGS = {}
+_SYMBOL_POOL = None
+_SYMBOL_POOL_SIZE = 0
 
 _REGIME_MODEL = None
 _NEWS_ENCODER = None
@@ -177,6 +190,11 @@ def update_index_quote_snapshot(
     Update index quote cache from live sources (WS/REST) in a uniform structure:
       bid, ask, mid, ts_epoch, source
     """
+    with _INDEX_QUOTE_LOCK:
+        _update_index_quote_snapshot(symbol, bid=bid, ask=ask, mid=mid, ts_epoch=ts_epoch, source=source, ltp=ltp)
+
+
+def _update_index_quote_snapshot(symbol, bid=None, ask=None, mid=None, ts_epoch=None, source="ws", ltp=None):
     sym = str(symbol or "").upper()
     if not sym:
         return
@@ -247,7 +265,8 @@ def get_index_quote_snapshot(symbol: str) -> dict:
     sym = str(symbol or "").upper()
     if not sym:
         return {}
-    return dict((_DATA_CACHE.get(sym) or {}).get("index_quote") or {})
+    with _INDEX_QUOTE_LOCK:
+        return dict((_DATA_CACHE.get(sym) or {}).get("index_quote") or {})
 
 
 def _index_quote_keys(symbol: str) -> list[str]:
@@ -644,9 +663,12 @@ def _refresh_index_quote_from_rest(symbol: str, force: bool = False) -> bool:
     _INDEX_REST_QUOTE_REFRESH_TS[sym] = now_epoch
     request_keys = _index_quote_keys(sym)
     _log_index_quote_request(sym, "quote", request_keys)
+    try:
+        payload = kite_client.quote(request_keys) or {}
+    except Exception:
+        payload = {}
     for key in request_keys:
         try:
-            payload = kite_client.kite.quote([key]) or {}
             q = payload.get(key) or {}
             depth = q.get("depth") or {}
             buy_book = depth.get("buy") or []
@@ -1045,6 +1067,16 @@ def _warm_seed_ohlc_from_history(
         return bars, False, reason_code
 
 
+def _indicator_params() -> dict:
+    return {
+        "vwap_window": getattr(cfg, "VWAP_WINDOW", 20),
+        "atr_period": getattr(cfg, "ATR_PERIOD", 14),
+        "adx_period": getattr(cfg, "ADX_PERIOD", 14),
+        "vol_window": getattr(cfg, "VOL_WINDOW", 30),
+        "slope_window": getattr(cfg, "VWAP_SLOPE_WINDOW", 10),
+    }
+
+
 def _startup_warmup_symbols(symbols: list[str] | None = None) -> list[str]:
     if symbols:
         return list(dict.fromkeys(str(s).upper() for s in symbols if str(s).strip()))
@@ -1088,13 +1120,11 @@ def seed_ohlc_buffers_on_startup(
         indicator_last_update_epoch = _INDICATOR_LAST_UPDATE_EPOCH.get(symbol)
         indicator_last_update_ts = None
         try:
+            ind_params = _indicator_params()
             ind = compute_indicators(
                 bars,
-                vwap_window=getattr(cfg, "VWAP_WINDOW", 20),
-                atr_period=getattr(cfg, "ATR_PERIOD", 14),
-                adx_period=getattr(cfg, "ADX_PERIOD", 14),
-                vol_window=getattr(cfg, "VOL_WINDOW", 30),
-                slope_window=getattr(cfg, "VWAP_SLOPE_WINDOW", 10),
+                engine=ohlc_buffer.indicator_engine(symbol, **ind_params),
+                **ind_params,
             )
             indicators_ok = bool(ind.get("ok")) and (seeded_count >= min_bars)
             last_ts = ind.get("last_ts") or (bars[-1].get("ts") if bars else None)
@@ -1405,6 +1435,75 @@ def _option_chain_health(symbol: str, chain: list, ltp: float, require_live_quot
         "timestamp": now_ist().isoformat(),
     }
 
+class _StageTimer:
+    """
+    Wall-clock milliseconds per pipeline stage for one symbol.
+    """
+
+    __slots__ = ("stages", "_last", "_started")
+
+    def __init__(self):
+        self.stages = {}
+        self._started = self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages[stage] = round(self.stages.get(stage, 0.0) + (now - self._last) * 1000.0, 3)
+        self._last = now
+
+    def total_ms(self) -> float:
+        return round((self._last - self._started) * 1000.0, 3)
+
+
+def _symbol_pool(workers: int) -> ThreadPoolExecutor:
+    global _SYMBOL_POOL, _SYMBOL_POOL_SIZE
+    if _SYMBOL_POOL is None or _SYMBOL_POOL_SIZE != workers:
+        if _SYMBOL_POOL is not None:
+            _SYMBOL_POOL.shutdown(wait=False)
+        _SYMBOL_POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="market-data")
+        _SYMBOL_POOL_SIZE = workers
+    return _SYMBOL_POOL
+
+
+def _run_symbol_pipeline(symbols: list, shock: dict) -> list[list[dict]]:
+    """
+    Run _fetch_symbol_market_data for every symbol, on a bounded thread pool
+    when MARKET_DATA_WORKERS > 1. Output is in symbol order regardless of
+    completion order; stage timings are kept for last_cycle_timings().
+    """
+    workers = max(1, min(int(getattr(cfg, "MARKET_DATA_WORKERS", 1) or 1), len(symbols) or 1))
+    timers = [_StageTimer() for _ in symbols]
+
+    def _one(i):
+        return _fetch_symbol_market_data(symbols[i], shock, timers[i])
+
+    started = time.perf_counter()
+    if workers <= 1 or len(symbols) <= 1:
+        out = [_one(i) for i in range(len(symbols))]
+    else:
+        out = list(_symbol_pool(workers).map(_one, range(len(symbols))))
+    timings = {
+        "workers": workers,
+        "cycle_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        "symbols": {
+            str(sym): {"total_ms": timer.total_ms(), "stages_ms": dict(timer.stages)}
+            for sym, timer in zip(symbols, timers)
+        },
+    }
+    with _CYCLE_TIMINGS_LOCK:
+        _LAST_CYCLE_TIMINGS.clear()
+        _LAST_CYCLE_TIMINGS.update(timings)
+    return out
+
+
+def last_cycle_timings() -> dict:
+    """
+    Per-symbol stage timings (ms) from the most recent fetch_live_market_data.
+    """
+    with _CYCLE_TIMINGS_LOCK:
+        return json.loads(json.dumps(_LAST_CYCLE_TIMINGS))
+
+
 def fetch_live_market_data():
     """
     Returns a list of market snapshots for symbols in config.
@@ -1457,270 +1556,311 @@ def fetch_live_market_data():
         else:
             shock = {**cal_shock, **text_shock}
 
-    for symbol in symbols:
-        segment = getattr(cfg, "DEFAULT_SEGMENT", "NSE_FNO")
-        market_open_for_segment = bool(is_open(now_dt=now_ist(), segment=segment))
-        market_ctx = derive_market_context(
+    symbol_results = _run_symbol_pipeline(symbols, shock)
+    for rows in symbol_results:
+        results.extend(rows)
+
+    return results
+
+
+def _fetch_symbol_market_data(symbol: str, shock: dict, timer: "_StageTimer") -> list[dict]:
+    """
+    All snapshots for one symbol: LTP, cross-asset, indicators, quotes,
+    option chain, chain health and regime. Safe to run concurrently for
+    different symbols; shared state is keyed by symbol or guarded by a lock.
+    """
+    results = []
+    segment = getattr(cfg, "DEFAULT_SEGMENT", "NSE_FNO")
+    market_open_for_segment = bool(is_open(now_dt=now_ist(), segment=segment))
+    market_ctx = derive_market_context(
+        {
+            "execution_mode": str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper(),
+            "market_open": bool(market_open_for_segment),
+            "segment": segment,
+        }
+    )
+    offhours_mode = market_ctx.mode == "OFFHOURS"
+    require_live_quotes = bool(market_ctx.require_live_quotes and getattr(cfg, "REQUIRE_LIVE_QUOTES", True))
+    ltp = get_ltp(symbol)
+    ltp_source = _DATA_CACHE.get(symbol, {}).get("ltp_source", "none")
+    ltp_ts_epoch = _DATA_CACHE.get(symbol, {}).get("ltp_ts_epoch")
+    timer.mark("ltp")
+    if require_live_quotes and market_ctx.is_market_open and (ltp is None or float(ltp) <= 0):
+        results.append(
             {
-                "execution_mode": str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper(),
-                "market_open": bool(market_open_for_segment),
+                "symbol": symbol,
                 "segment": segment,
+                "market_open": bool(market_ctx.is_market_open),
+                "offhours_mode": bool(offhours_mode),
+                "market_context": market_ctx.to_dict(),
+                "ltp": ltp,
+                "ltp_source": ltp_source,
+                "ltp_ts_epoch": ltp_ts_epoch,
+                "valid": False,
+                "invalid_reason": "invalid_ltp",
+                "invalid_reason_codes": ["invalid_ltp"],
+                "timestamp": now_utc_epoch(),
+                "timestamp_ist": now_ist().isoformat(),
+                "instrument": "OPT",
+                "feed_health": {
+                    "time_sanity": {
+                        "ok": False,
+                        "reasons": ["invalid_ltp"],
+                        "ltp_ts_epoch": ltp_ts_epoch,
+                        "candle_ts_epoch": None,
+                        "market_open": market_ctx.is_market_open,
+                        "require_live_quotes": bool(require_live_quotes),
+                    }
+                },
             }
         )
-        offhours_mode = market_ctx.mode == "OFFHOURS"
-        require_live_quotes = bool(market_ctx.require_live_quotes and getattr(cfg, "REQUIRE_LIVE_QUOTES", True))
-        ltp = get_ltp(symbol)
-        ltp_source = _DATA_CACHE.get(symbol, {}).get("ltp_source", "none")
-        ltp_ts_epoch = _DATA_CACHE.get(symbol, {}).get("ltp_ts_epoch")
-        if require_live_quotes and market_ctx.is_market_open and (ltp is None or float(ltp) <= 0):
-            results.append(
-                {
-                    "symbol": symbol,
-                    "segment": segment,
-                    "market_open": bool(market_ctx.is_market_open),
-                    "offhours_mode": bool(offhours_mode),
-                    "market_context": market_ctx.to_dict(),
-                    "ltp": ltp,
-                    "ltp_source": ltp_source,
-                    "ltp_ts_epoch": ltp_ts_epoch,
-                    "valid": False,
-                    "invalid_reason": "invalid_ltp",
-                    "invalid_reason_codes": ["invalid_ltp"],
-                    "timestamp": now_utc_epoch(),
-                    "timestamp_ist": now_ist().isoformat(),
-                    "instrument": "OPT",
-                    "feed_health": {
-                        "time_sanity": {
-                            "ok": False,
-                            "reasons": ["invalid_ltp"],
-                            "ltp_ts_epoch": ltp_ts_epoch,
-                            "candle_ts_epoch": None,
-                            "market_open": market_ctx.is_market_open,
-                            "require_live_quotes": bool(require_live_quotes),
-                        }
-                    },
-                }
-            )
-            continue
-        try:
-            if ltp and ltp > 0:
-                ohlc_buffer.update_tick(symbol, ltp, volume=0, ts=now_ist())
-        except Exception:
-            pass
-        vwap = ltp
-        cross_feat = {}
-        cross_quality = {}
-        try:
+        return results
+    try:
+        if ltp and ltp > 0:
+            ohlc_buffer.update_tick(symbol, ltp, volume=0, ts=now_ist())
+    except Exception:
+        pass
+    vwap = ltp
+    cross_feat = {}
+    cross_quality = {}
+    try:
+        with _CROSS_ASSET_LOCK:
             cross_payload = _CROSS_ASSET.update(symbol, ltp) or {}
-            cross_feat = cross_payload.get("features", {}) or {}
-            cross_quality = cross_payload.get("data_quality", {}) or {}
-        except Exception as e:
-            cross_feat = {}
-            cross_quality = {"any_stale": True, "disabled": True, "disabled_reason": "cross_asset_exception", "errors": {"error": str(e)}}
-
-        fx_ret_5m = cross_feat.get("x_usdinr_ret5") or cross_feat.get("x_fx_ret5")
-        vix_z = cross_feat.get("x_india_vix_z") or cross_feat.get("x_vix_z")
-        crude_ret_15m = cross_feat.get("x_crude_ret15") or cross_feat.get("x_crudeoil_ret15")
-        corr_fx_nifty = cross_feat.get("x_usdinr_corr_nifty")
-        atr = max(1.0, ltp * 0.002)
-        # minutes since open (used for ORB bias + day-type)
-        try:
-            now = now_ist()
-            minutes_since_open = session_minutes_since_open(now_dt=now, segment=segment)
-            is_market_open = is_open(now_dt=now, segment=segment)
-            today_local = now.date()
-        except Exception:
-            minutes_since_open = 0
-            is_market_open = True
-            today_local = now_ist().date()
-        try:
-            last_day = _DAYTYPE_LAST_DAY.get(symbol)
-            if last_day != today_local:
-                _DAYTYPE_LOCK.pop(symbol, None)
-                _DAYTYPE_LAST.pop(symbol, None)
-                _DAYTYPE_LAST_DAY[symbol] = today_local
-        except Exception:
-            pass
-        orb_high = ltp
-        orb_low = ltp
-        volume = 0
-        vwap_slope = 0
-        rsi_mom = 0
-        vol_z = 0
-        adx_14 = 0
-        ltp_change = 0.0
-        ltp_change_window = 0.0
-        ltp_change_5m = 0.0
-        ltp_change_10m = 0.0
-        ltp_acceleration = 0.0
-
-        # Compute indicators from rolling OHLC buffer (no CSV dependency)
-        indicators_ok = False
-        indicator_inputs_ok = False
-        now_epoch_for_indicators = float(now_utc_epoch())
-        indicators_age_sec = float(getattr(cfg, "INDICATORS_NEVER_COMPUTED_AGE_SEC", 1e9))
-        candle_ts_epoch = None
-        indicator_last_update_epoch = _INDICATOR_LAST_UPDATE_EPOCH.get(symbol)
-        ohlc_bars_count = 0
-        min_bars = int(getattr(cfg, "OHLC_MIN_BARS", 30))
-        ohlc_seeded = False
-        ohlc_last_bar_epoch = None
-        compute_indicators_error = None
-        missing_inputs = []
-        ohlc_seed_reason = None
-        try:
-            bars = ohlc_buffer.get_bars(symbol)
-            if len(bars) < min_bars:
-                bars, _seeded_ok, ohlc_seed_reason = _warm_seed_ohlc_from_history(
-                    symbol=symbol,
-                    bars=bars,
-                    min_bars=min_bars,
-                    interval=str(getattr(cfg, "OHLC_WARM_SEED_INTERVAL", "minute") or "minute"),
-                )
-                ohlc_seeded = bool(_seeded_ok)
-            ohlc_bars_count = len(bars)
-            if bars:
-                try:
-                    ohlc_last_bar_epoch = float(bars[-1].get("ts").timestamp())
-                except Exception:
-                    ohlc_last_bar_epoch = None
-            if isinstance(indicator_last_update_epoch, (int, float)):
-                indicator_last_update_epoch = float(indicator_last_update_epoch)
-            elif ohlc_last_bar_epoch is not None:
-                indicator_last_update_epoch = float(ohlc_last_bar_epoch)
-            else:
-                indicator_last_update_epoch = 0.0
-            if ohlc_bars_count == 0:
-                missing_inputs.append("ohlc_buffer_empty")
-            elif ohlc_bars_count < min_bars:
-                missing_inputs.append("insufficient_bars")
-            ind = compute_indicators(
-                bars,
-                vwap_window=getattr(cfg, "VWAP_WINDOW", 20),
-                atr_period=getattr(cfg, "ATR_PERIOD", 14),
-                adx_period=getattr(cfg, "ADX_PERIOD", 14),
-                vol_window=getattr(cfg, "VOL_WINDOW", 30),
-                slope_window=getattr(cfg, "VWAP_SLOPE_WINDOW", 10),
+        cross_feat = cross_payload.get("features", {}) or {}
+        cross_quality = cross_payload.get("data_quality", {}) or {}
+    except Exception as e:
+        cross_feat = {}
+        cross_quality = {"any_stale": True, "disabled": True, "disabled_reason": "cross_asset_exception", "errors": {"error": str(e)}}
+
+    timer.mark("cross_asset")
+    fx_ret_5m = cross_feat.get("x_usdinr_ret5") or cross_feat.get("x_fx_ret5")
+    vix_z = cross_feat.get("x_india_vix_z") or cross_feat.get("x_vix_z")
+    crude_ret_15m = cross_feat.get("x_crude_ret15") or cross_feat.get("x_crudeoil_ret15")
+    corr_fx_nifty = cross_feat.get("x_usdinr_corr_nifty")
+    atr = max(1.0, ltp * 0.002)
+    # minutes since open (used for ORB bias + day-type)
+    try:
+        now = now_ist()
+        minutes_since_open = session_minutes_since_open(now_dt=now, segment=segment)
+        is_market_open = is_open(now_dt=now, segment=segment)
+        today_local = now.date()
+    except Exception:
+        minutes_since_open = 0
+        is_market_open = True
+        today_local = now_ist().date()
+    try:
+        last_day = _DAYTYPE_LAST_DAY.get(symbol)
+        if last_day != today_local:
+            _DAYTYPE_LOCK.pop(symbol, None)
+            _DAYTYPE_LAST.pop(symbol, None)
+            _DAYTYPE_LAST_DAY[symbol] = today_local
+    except Exception:
+        pass
+    orb_high = ltp
+    orb_low = ltp
+    volume = 0
+    vwap_slope = 0
+    rsi_mom = 0
+    vol_z = 0
+    adx_14 = 0
+    ltp_change = 0.0
+    ltp_change_window = 0.0
+    ltp_change_5m = 0.0
+    ltp_change_10m = 0.0
+    ltp_acceleration = 0.0
+
+    # Compute indicators from rolling OHLC buffer (no CSV dependency)
+    indicators_ok = False
+    indicator_inputs_ok = False
+    now_epoch_for_indicators = float(now_utc_epoch())
+    indicators_age_sec = float(getattr(cfg, "INDICATORS_NEVER_COMPUTED_AGE_SEC", 1e9))
+    candle_ts_epoch = None
+    indicator_last_update_epoch = _INDICATOR_LAST_UPDATE_EPOCH.get(symbol)
+    ohlc_bars_count = 0
+    min_bars = int(getattr(cfg, "OHLC_MIN_BARS", 30))
+    ohlc_seeded = False
+    ohlc_last_bar_epoch = None
+    compute_indicators_error = None
+    missing_inputs = []
+    ohlc_seed_reason = None
+    try:
+        bars = ohlc_buffer.get_bars(symbol)
+        if len(bars) < min_bars:
+            bars, _seeded_ok, ohlc_seed_reason = _warm_seed_ohlc_from_history(
+                symbol=symbol,
+                bars=bars,
+                min_bars=min_bars,
+                interval=str(getattr(cfg, "OHLC_WARM_SEED_INTERVAL", "minute") or "minute"),
             )
-            if ind.get("vwap") is not None:
-                vwap = ind["vwap"]
-            if ind.get("atr") is not None:
-                atr = ind["atr"]
-            if ind.get("adx") is not None:
-                adx_14 = ind["adx"]
-            if ind.get("vol_z") is not None:
-                vol_z = ind["vol_z"]
-            if ind.get("vwap_slope") is not None:
-                vwap_slope = ind["vwap_slope"]
-            last_ts = ind.get("last_ts")
-            bars_ready = bool(ohlc_bars_count >= min_bars and ohlc_bars_count > 0)
-            required_inputs_ok = bars_ready
-            indicator_inputs_ok = bars_ready
-            if last_ts:
-                try:
-                    candle_ts_epoch = float(last_ts.timestamp())
-                except Exception:
-                    candle_ts_epoch = None
-            if bars_ready:
-                # Successful indicator compute: always refresh last update epoch.
-                indicator_last_update_epoch = (
-                    candle_ts_epoch
-                    if candle_ts_epoch is not None
-                    else (ohlc_last_bar_epoch if ohlc_last_bar_epoch is not None else now_epoch_for_indicators)
-                )
-                _INDICATOR_LAST_UPDATE_EPOCH[symbol] = float(indicator_last_update_epoch)
-            else:
-                if ohlc_bars_count == 0:
-                    missing_inputs.append("never_computed")
-            indicators_age_sec = max(0.0, now_epoch_for_indicators - float(indicator_last_update_epoch))
-            indicators_ok = bool(bars_ready)
-        except Exception as exc:
-            indicators_ok = False
-            indicator_inputs_ok = False
-            if not isinstance(indicator_last_update_epoch, (int, float)):
-                indicator_last_update_epoch = 0.0
-            indicators_age_sec = max(0.0, now_epoch_for_indicators - float(indicator_last_update_epoch))
-            compute_indicators_error = f"{type(exc).__name__}:{exc}"
-            missing_inputs.append("compute_indicators_exception")
-            if float(indicator_last_update_epoch) <= 0.0:
-                missing_inputs.append("indicators_never_computed")
+            ohlc_seeded = bool(_seeded_ok)
+        ohlc_bars_count = len(bars)
+        if bars:
+            try:
+                ohlc_last_bar_epoch = float(bars[-1].get("ts").timestamp())
+            except Exception:
+                ohlc_last_bar_epoch = None
+        if isinstance(indicator_last_update_epoch, (int, float)):
+            indicator_last_update_epoch = float(indicator_last_update_epoch)
+        elif ohlc_last_bar_epoch is not None:
+            indicator_last_update_epoch = float(ohlc_last_bar_epoch)
+        else:
+            indicator_last_update_epoch = 0.0
+        if ohlc_bars_count == 0:
+            missing_inputs.append("ohlc_buffer_empty")
+        elif ohlc_bars_count < min_bars:
+            missing_inputs.append("insufficient_bars")
+        ind_params = _indicator_params()
+        ind = compute_indicators(
+            bars,
+            engine=ohlc_buffer.indicator_engine(symbol, **ind_params),
+            **ind_params,
+        )
+        if ind.get("vwap") is not None:
+            vwap = ind["vwap"]
+        if ind.get("atr") is not None:
+            atr = ind["atr"]
+        if ind.get("adx") is not None:
+            adx_14 = ind["adx"]
+        if ind.get("vol_z") is not None:
+            vol_z = ind["vol_z"]
+        if ind.get("vwap_slope") is not None:
+            vwap_slope = ind["vwap_slope"]
+        last_ts = ind.get("last_ts")
+        bars_ready = bool(ohlc_bars_count >= min_bars and ohlc_bars_count > 0)
+        required_inputs_ok = bars_ready
+        indicator_inputs_ok = bars_ready
+        if last_ts:
+            try:
+                candle_ts_epoch = float(last_ts.timestamp())
+            except Exception:
+                candle_ts_epoch = None
+        if bars_ready:
+            # Successful indicator compute: always refresh last update epoch.
+            indicator_last_update_epoch = (
+                candle_ts_epoch
+                if candle_ts_epoch is not None
+                else (ohlc_last_bar_epoch if ohlc_last_bar_epoch is not None else now_epoch_for_indicators)
+            )
+            _INDICATOR_LAST_UPDATE_EPOCH[symbol] = float(indicator_last_update_epoch)
+        else:
+            if ohlc_bars_count == 0:
                 missing_inputs.append("never_computed")
-        if str(ohlc_seed_reason or "").upper() == "HIST_FETCH_FAILED":
-            missing_inputs = ["HIST_FETCH_FAILED"]
-        missing_inputs = list(dict.fromkeys(str(x) for x in missing_inputs if x))
+        indicators_age_sec = max(0.0, now_epoch_for_indicators - float(indicator_last_update_epoch))
+        indicators_ok = bool(bars_ready)
+    except Exception as exc:
+        indicators_ok = False
+        indicator_inputs_ok = False
+        if not isinstance(indicator_last_update_epoch, (int, float)):
+            indicator_last_update_epoch = 0.0
+        indicators_age_sec = max(0.0, now_epoch_for_indicators - float(indicator_last_update_epoch))
+        compute_indicators_error = f"{type(exc).__name__}:{exc}"
+        missing_inputs.append("compute_indicators_exception")
+        if float(indicator_last_update_epoch) <= 0.0:
+            missing_inputs.append("indicators_never_computed")
+            missing_inputs.append("never_computed")
+    if str(ohlc_seed_reason or "").upper() == "HIST_FETCH_FAILED":
+        missing_inputs = ["HIST_FETCH_FAILED"]
+    missing_inputs = list(dict.fromkeys(str(x) for x in missing_inputs if x))
+
+    timer.mark("indicators")
+    # Cross-asset data quality fail-safe (only in LIVE when required)
+    try:
+        live_mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper() == "LIVE"
+        require_x = bool(getattr(cfg, "REQUIRE_CROSS_ASSET", True))
+        if getattr(cfg, "REQUIRE_CROSS_ASSET_ONLY_WHEN_LIVE", True):
+            require_x = require_x and live_mode
+        if require_x:
+            required_stale = set(cross_quality.get("required_stale", []) or [])
+            missing = set((cross_quality.get("missing") or {}).keys())
+            required = set(getattr(cfg, "CROSS_REQUIRED_FEEDS", []) or [])
+            if not required_stale and required:
+                required_stale = (missing & required)
+            if required_stale:
+                indicators_ok = False
+    except Exception:
+        pass
 
-        # Cross-asset data quality fail-safe (only in LIVE when required)
-        try:
-            live_mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper() == "LIVE"
-            require_x = bool(getattr(cfg, "REQUIRE_CROSS_ASSET", True))
-            if getattr(cfg, "REQUIRE_CROSS_ASSET_ONLY_WHEN_LIVE", True):
-                require_x = require_x and live_mode
-            if require_x:
-                required_stale = set(cross_quality.get("required_stale", []) or [])
-                missing = set((cross_quality.get("missing") or {}).keys())
-                required = set(getattr(cfg, "CROSS_REQUIRED_FEEDS", []) or [])
-                if not required_stale and required:
-                    required_stale = (missing & required)
-                if required_stale:
-                    indicators_ok = False
-        except Exception:
-            pass
+    # lightweight momentum if no indicators available
+    prev = _DATA_CACHE.get(symbol, {}).get("last_ltp")
+    if prev:
+        ltp_change = float(ltp - prev)
+    _DATA_CACHE.setdefault(symbol, {})["last_ltp"] = ltp
 
-        # lightweight momentum if no indicators available
-        prev = _DATA_CACHE.get(symbol, {}).get("last_ltp")
-        if prev:
-            ltp_change = float(ltp - prev)
-        _DATA_CACHE.setdefault(symbol, {})["last_ltp"] = ltp
+    # rolling window change (default 60s)
+    try:
+        win_sec = getattr(cfg, "LTP_CHANGE_WINDOW_SEC", 60)
+        win_5m = getattr(cfg, "MICRO_5M_SEC", 300)
+        win_10m = getattr(cfg, "MICRO_10M_SEC", 600)
+        hist = _LTP_HISTORY.get(symbol)
+        if hist is None:
+            hist = deque(maxlen=300)
+            _LTP_HISTORY[symbol] = hist
+        now_ts = now_utc_epoch()
+        hist.append((now_ts, ltp))
+        # find oldest within window
+        for ts, price in list(hist):
+            if now_ts - ts >= win_sec:
+                ltp_change_window = float(ltp - price)
+                break
+        for ts, price in list(hist):
+            if now_ts - ts >= win_5m:
+                ltp_change_5m = float(ltp - price)
+                break
+        for ts, price in list(hist):
+            if now_ts - ts >= win_10m:
+                ltp_change_10m = float(ltp - price)
+                break
+        # simple acceleration from last 3 points
+        if len(hist) >= 3:
+            p0 = hist[-1][1]
+            p1 = hist[-2][1]
+            p2 = hist[-3][1]
+            ltp_acceleration = float(p0 - 2 * p1 + p2)
+    except Exception:
+        pass
 
-        # rolling window change (default 60s)
+    # Index quote path:
+    # - Prefer real bid/ask from WS/REST depth.
+    # - For index symbols only, synthesize around LTP when depth is missing.
+    # - Never synthesize option-chain quotes.
+    bid = None
+    ask = None
+    mid = None
+    bid_qty = None
+    ask_qty = None
+    quote_ok = False
+    quote_ts = None
+    quote_ts_epoch = None
+    quote_age_sec = None
+    spread_pct = None
+    quote_source = "none"
+    synthetic_index_quote = False
+    ws_quote = get_index_quote_snapshot(symbol)
+    if ws_quote:
         try:
-            win_sec = getattr(cfg, "LTP_CHANGE_WINDOW_SEC", 60)
-            win_5m = getattr(cfg, "MICRO_5M_SEC", 300)
-            win_10m = getattr(cfg, "MICRO_10M_SEC", 600)
-            hist = _LTP_HISTORY.get(symbol)
-            if hist is None:
-                hist = deque(maxlen=300)
-                _LTP_HISTORY[symbol] = hist
-            now_ts = now_utc_epoch()
-            hist.append((now_ts, ltp))
-            # find oldest within window
-            for ts, price in list(hist):
-                if now_ts - ts >= win_sec:
-                    ltp_change_window = float(ltp - price)
-                    break
-            for ts, price in list(hist):
-                if now_ts - ts >= win_5m:
-                    ltp_change_5m = float(ltp - price)
-                    break
-            for ts, price in list(hist):
-                if now_ts - ts >= win_10m:
-                    ltp_change_10m = float(ltp - price)
-                    break
-            # simple acceleration from last 3 points
-            if len(hist) >= 3:
-                p0 = hist[-1][1]
-                p1 = hist[-2][1]
-                p2 = hist[-3][1]
-                ltp_acceleration = float(p0 - 2 * p1 + p2)
+            bid = ws_quote.get("bid")
+            ask = ws_quote.get("ask")
+            mid = ws_quote.get("mid")
+            if mid is None and bid is not None and ask is not None:
+                mid = (float(bid) + float(ask)) / 2.0
+            quote_ts_epoch = float(ws_quote.get("ts_epoch")) if ws_quote.get("ts_epoch") is not None else None
+            if ltp_source == "live" and ws_quote.get("last_price") is not None:
+                try:
+                    ltp = float(ws_quote.get("last_price"))
+                except Exception:
+                    pass
+            if quote_ts_epoch is not None:
+                quote_ts = datetime.fromtimestamp(float(quote_ts_epoch), tz=timezone.utc).isoformat().replace("+00:00", "Z")
+                quote_age_sec = compute_age_sec(quote_ts_epoch, now_utc_epoch())
+            if bid and ask:
+                quote_ok = True
+                quote_source = "depth"
+                if ltp:
+                    spread_pct = (ask - bid) / ltp
         except Exception:
-            pass
-
-        # Index quote path:
-        # - Prefer real bid/ask from WS/REST depth.
-        # - For index symbols only, synthesize around LTP when depth is missing.
-        # - Never synthesize option-chain quotes.
-        bid = None
-        ask = None
-        mid = None
-        bid_qty = None
-        ask_qty = None
-        quote_ok = False
-        quote_ts = None
-        quote_ts_epoch = None
-        quote_age_sec = None
-        spread_pct = None
-        quote_source = "none"
-        synthetic_index_quote = False
+            quote_ok = False
+    if not quote_ok:
+        _refresh_index_quote_from_rest(symbol, force=False)
         ws_quote = get_index_quote_snapshot(symbol)
         if ws_quote:
             try:
@@ -1730,6 +1870,7 @@ def fetch_live_market_data():
                 if mid is None and bid is not None and ask is not None:
                     mid = (float(bid) + float(ask)) / 2.0
                 quote_ts_epoch = float(ws_quote.get("ts_epoch")) if ws_quote.get("ts_epoch") is not None else None
+                quote_source = str(ws_quote.get("source") or "rest_quote")
                 if ltp_source == "live" and ws_quote.get("last_price") is not None:
                     try:
                         ltp = float(ws_quote.get("last_price"))
@@ -1738,6 +1879,8 @@ def fetch_live_market_data():
                 if quote_ts_epoch is not None:
                     quote_ts = datetime.fromtimestamp(float(quote_ts_epoch), tz=timezone.utc).isoformat().replace("+00:00", "Z")
                     quote_age_sec = compute_age_sec(quote_ts_epoch, now_utc_epoch())
+                    if ltp_source == "live":
+                        ltp_ts_epoch = quote_ts_epoch
                 if bid and ask:
                     quote_ok = True
                     quote_source = "depth"
@@ -1745,625 +1888,695 @@ def fetch_live_market_data():
                         spread_pct = (ask - bid) / ltp
             except Exception:
                 quote_ok = False
-        if not quote_ok:
-            _refresh_index_quote_from_rest(symbol, force=False)
-            ws_quote = get_index_quote_snapshot(symbol)
-            if ws_quote:
-                try:
-                    bid = ws_quote.get("bid")
-                    ask = ws_quote.get("ask")
-                    mid = ws_quote.get("mid")
-                    if mid is None and bid is not None and ask is not None:
-                        mid = (float(bid) + float(ask)) / 2.0
-                    quote_ts_epoch = float(ws_quote.get("ts_epoch")) if ws_quote.get("ts_epoch") is not None else None
-                    quote_source = str(ws_quote.get("source") or "rest_quote")
-                    if ltp_source == "live" and ws_quote.get("last_price") is not None:
-                        try:
-                            ltp = float(ws_quote.get("last_price"))
-                        except Exception:
-                            pass
-                    if quote_ts_epoch is not None:
-                        quote_ts = datetime.fromtimestamp(float(quote_ts_epoch), tz=timezone.utc).isoformat().replace("+00:00", "Z")
-                        quote_age_sec = compute_age_sec(quote_ts_epoch, now_utc_epoch())
-                        if ltp_source == "live":
-                            ltp_ts_epoch = quote_ts_epoch
-                    if bid and ask:
-                        quote_ok = True
-                        quote_source = "depth"
-                        if ltp:
-                            spread_pct = (ask - bid) / ltp
-                except Exception:
-                    quote_ok = False
-        if is_index(symbol):
-            exec_mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper()
-            ltp_age_for_quote = compute_age_sec(ltp_ts_epoch, now_utc_epoch())
-            resolved_quote = resolve_index_quote(
-                symbol=symbol,
-                mode=exec_mode,
-                ltp=ltp,
-                depth={"bid": bid, "ask": ask},
-                market_open=bool(market_ctx.is_market_open),
-                ltp_age_sec=ltp_age_for_quote,
-                market_context=market_ctx.to_dict(),
-            )
-            bid = resolved_quote.get("bid")
-            ask = resolved_quote.get("ask")
-            mid = resolved_quote.get("mid")
-            quote_ok = bool(resolved_quote.get("quote_ok", False))
-            quote_source = str(resolved_quote.get("quote_source") or "missing_depth")
-            synthetic_index_quote = quote_source == "synthetic_index"
-            if quote_ok:
-                if quote_ts_epoch is None:
-                    if isinstance(ltp_ts_epoch, (int, float)):
-                        quote_ts_epoch = float(ltp_ts_epoch)
-                    else:
-                        quote_ts_epoch = now_utc_epoch()
-                quote_ts = datetime.fromtimestamp(float(quote_ts_epoch), tz=timezone.utc).isoformat().replace("+00:00", "Z")
-                quote_age_sec = compute_age_sec(float(quote_ts_epoch), now_utc_epoch())
-                if ltp:
-                    spread_pct = (ask - bid) / ltp
-        if quote_ts_epoch is not None:
-            update_index_quote_snapshot(
-                symbol=symbol,
-                bid=bid,
-                ask=ask,
-                mid=mid,
-                ts_epoch=quote_ts_epoch,
-                source=quote_source,
-                ltp=ltp,
-            )
-        if is_index(symbol):
-            _maybe_log_index_bidask_missing(
-                symbol,
-                quote_ok=bool(quote_ok),
-                quote_source=quote_source,
-                ltp_source=ltp_source,
-                market_open=bool(market_ctx.is_market_open),
-                ltp=ltp,
-                ltp_age_sec=ltp_age_for_quote,
-            )
-        index_quote_cache = dict(get_index_quote_snapshot(symbol) or {})
-        quote_feed_health = None
-        if is_index(symbol):
-            quote_feed_health = _classify_index_feed_health(
-                symbol=symbol,
-                execution_mode=str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper(),
-                now_epoch=now_utc_epoch(),
-                market_open=bool(market_ctx.is_market_open),
-                ltp=ltp,
-                ltp_ts_epoch=ltp_ts_epoch,
-                quote_ok=bool(quote_ok),
-                quote_source=quote_source,
-                quote_ts_epoch=quote_ts_epoch,
-            )
-
-        time_sanity = check_market_data_time_sanity(
-            ltp_ts_epoch=ltp_ts_epoch,
-            candle_ts_epoch=candle_ts_epoch,
-            market_open=market_ctx.is_market_open,
-            require_live_quotes=bool(require_live_quotes),
-            max_ltp_age_sec=getattr(
-                cfg,
-                "OFFHOURS_MAX_LTP_AGE_SEC" if offhours_mode else "MAX_LTP_AGE_SEC",
-                900 if offhours_mode else 8,
-            ),
-            max_candle_age_sec=getattr(
-                cfg,
-                "OFFHOURS_MAX_CANDLE_AGE_SEC" if offhours_mode else "MAX_CANDLE_AGE_SEC",
-                1800 if offhours_mode else 120,
-            ),
+    if is_index(symbol):
+        exec_mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper()
+        ltp_age_for_quote = compute_age_sec(ltp_ts_epoch, now_utc_epoch())
+        resolved_quote = resolve_index_quote(
+            symbol=symbol,
+            mode=exec_mode,
+            ltp=ltp,
+            depth={"bid": bid, "ask": ask},
+            market_open=bool(market_ctx.is_market_open),
+            ltp_age_sec=ltp_age_for_quote,
+            market_context=market_ctx.to_dict(),
+        )
+        bid = resolved_quote.get("bid")
+        ask = resolved_quote.get("ask")
+        mid = resolved_quote.get("mid")
+        quote_ok = bool(resolved_quote.get("quote_ok", False))
+        quote_source = str(resolved_quote.get("quote_source") or "missing_depth")
+        synthetic_index_quote = quote_source == "synthetic_index"
+        if quote_ok:
+            if quote_ts_epoch is None:
+                if isinstance(ltp_ts_epoch, (int, float)):
+                    quote_ts_epoch = float(ltp_ts_epoch)
+                else:
+                    quote_ts_epoch = now_utc_epoch()
+            quote_ts = datetime.fromtimestamp(float(quote_ts_epoch), tz=timezone.utc).isoformat().replace("+00:00", "Z")
+            quote_age_sec = compute_age_sec(float(quote_ts_epoch), now_utc_epoch())
+            if ltp:
+                spread_pct = (ask - bid) / ltp
+    if quote_ts_epoch is not None:
+        update_index_quote_snapshot(
+            symbol=symbol,
+            bid=bid,
+            ask=ask,
+            mid=mid,
+            ts_epoch=quote_ts_epoch,
+            source=quote_source,
+            ltp=ltp,
+        )
+    if is_index(symbol):
+        _maybe_log_index_bidask_missing(
+            symbol,
+            quote_ok=bool(quote_ok),
+            quote_source=quote_source,
+            ltp_source=ltp_source,
+            market_open=bool(market_ctx.is_market_open),
+            ltp=ltp,
+            ltp_age_sec=ltp_age_for_quote,
+        )
+    index_quote_cache = dict(get_index_quote_snapshot(symbol) or {})
+    quote_feed_health = None
+    if is_index(symbol):
+        quote_feed_health = _classify_index_feed_health(
+            symbol=symbol,
+            execution_mode=str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper(),
             now_epoch=now_utc_epoch(),
+            market_open=bool(market_ctx.is_market_open),
+            ltp=ltp,
+            ltp_ts_epoch=ltp_ts_epoch,
+            quote_ok=bool(quote_ok),
+            quote_source=quote_source,
+            quote_ts_epoch=quote_ts_epoch,
         )
-        if synthetic_index_quote:
-            quote_ok = bool(time_sanity.get("ok", False) and ltp is not None and float(ltp) > 0)
-            if not quote_ok:
-                quote_source = "none"
-        if not time_sanity.get("ok", True):
-            reasons = list(time_sanity.get("reasons", []) or [])
-            invalid_reason = "|".join(reasons) if reasons else "timestamp_stale"
-            results.append(
-                {
-                    "symbol": symbol,
-                    "segment": segment,
-                    "market_open": bool(market_ctx.is_market_open),
-                    "offhours_mode": bool(offhours_mode),
-                    "market_context": market_ctx.to_dict(),
-                    "ltp": ltp,
-                    "ltp_source": ltp_source,
-                    "ltp_ts_epoch": ltp_ts_epoch,
-                    "valid": False,
-                    "invalid_reason": invalid_reason,
-                    "invalid_reason_codes": reasons,
-                    "quote_source": quote_source,
-                    "quote_ts": quote_ts,
-                    "quote_ts_epoch": quote_ts_epoch,
-                    "quote_age_sec": quote_age_sec,
-                    "candle_ts_epoch": candle_ts_epoch,
-                    "timestamp": now_utc_epoch(),
-                    "timestamp_ist": now_ist().isoformat(),
-                    "instrument": "OPT",
-                    "feed_health": {"time_sanity": time_sanity},
-                    "quote_health": quote_feed_health,
-                }
-            )
-            continue
 
-        # Open-range tracking for bias lock
-        orb_lock_min = getattr(cfg, "ORB_LOCK_MIN", 15)
-        orb_bias = "NEUTRAL"
-        try:
-            or_state = _OPEN_RANGE.get(symbol, {"high": None, "low": None, "bias": None})
-            if minutes_since_open <= orb_lock_min:
+    time_sanity = check_market_data_time_sanity(
+        ltp_ts_epoch=ltp_ts_epoch,
+        candle_ts_epoch=candle_ts_epoch,
+        market_open=market_ctx.is_market_open,
+        require_live_quotes=bool(require_live_quotes),
+        max_ltp_age_sec=getattr(
+            cfg,
+            "OFFHOURS_MAX_LTP_AGE_SEC" if offhours_mode else "MAX_LTP_AGE_SEC",
+            900 if offhours_mode else 8,
+        ),
+        max_candle_age_sec=getattr(
+            cfg,
+            "OFFHOURS_MAX_CANDLE_AGE_SEC" if offhours_mode else "MAX_CANDLE_AGE_SEC",
+            1800 if offhours_mode else 120,
+        ),
+        now_epoch=now_utc_epoch(),
+    )
+    if synthetic_index_quote:
+        quote_ok = bool(time_sanity.get("ok", False) and ltp is not None and float(ltp) > 0)
+        if not quote_ok:
+            quote_source = "none"
+    if not time_sanity.get("ok", True):
+        reasons = list(time_sanity.get("reasons", []) or [])
+        invalid_reason = "|".join(reasons) if reasons else "timestamp_stale"
+        results.append(
+            {
+                "symbol": symbol,
+                "segment": segment,
+                "market_open": bool(market_ctx.is_market_open),
+                "offhours_mode": bool(offhours_mode),
+                "market_context": market_ctx.to_dict(),
+                "ltp": ltp,
+                "ltp_source": ltp_source,
+                "ltp_ts_epoch": ltp_ts_epoch,
+                "valid": False,
+                "invalid_reason": invalid_reason,
+                "invalid_reason_codes": reasons,
+                "quote_source": quote_source,
+                "quote_ts": quote_ts,
+                "quote_ts_epoch": quote_ts_epoch,
+                "quote_age_sec": quote_age_sec,
+                "candle_ts_epoch": candle_ts_epoch,
+                "timestamp": now_utc_epoch(),
+                "timestamp_ist": now_ist().isoformat(),
+                "instrument": "OPT",
+                "feed_health": {"time_sanity": time_sanity},
+                "quote_health": quote_feed_health,
+            }
+        )
+        return results
+
+    timer.mark("quote")
+    # Open-range tracking for bias lock
+    orb_lock_min = getattr(cfg, "ORB_LOCK_MIN", 15)
+    orb_bias = "NEUTRAL"
+    try:
+        or_state = _OPEN_RANGE.get(symbol, {"high": None, "low": None, "bias": None})
+        if minutes_since_open <= orb_lock_min:
+            hi = or_state.get("high")
+            lo = or_state.get("low")
+            if hi is None or ltp > hi:
+                hi = ltp
+            if lo is None or ltp < lo:
+                lo = ltp
+            or_state.update({"high": hi, "low": lo})
+        else:
+            if or_state.get("bias") is None:
                 hi = or_state.get("high")
                 lo = or_state.get("low")
-                if hi is None or ltp > hi:
-                    hi = ltp
-                if lo is None or ltp < lo:
-                    lo = ltp
-                or_state.update({"high": hi, "low": lo})
-            else:
-                if or_state.get("bias") is None:
-                    hi = or_state.get("high")
-                    lo = or_state.get("low")
-                    if hi is not None and ltp > hi:
-                        or_state["bias"] = "UP"
-                    elif lo is not None and ltp < lo:
-                        or_state["bias"] = "DOWN"
-                    else:
-                        or_state["bias"] = "NEUTRAL"
-                orb_bias = or_state.get("bias") or "NEUTRAL"
-            _OPEN_RANGE[symbol] = or_state
-            if minutes_since_open <= orb_lock_min:
-                orb_bias = "PENDING"
-        except Exception:
-            orb_bias = "NEUTRAL"
+                if hi is not None and ltp > hi:
+                    or_state["bias"] = "UP"
+                elif lo is not None and ltp < lo:
+                    or_state["bias"] = "DOWN"
+                else:
+                    or_state["bias"] = "NEUTRAL"
+            orb_bias = or_state.get("bias") or "NEUTRAL"
+        _OPEN_RANGE[symbol] = or_state
+        if minutes_since_open <= orb_lock_min:
+            orb_bias = "PENDING"
+    except Exception:
+        orb_bias = "NEUTRAL"
 
-        exec_mode_for_policy = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper()
-        strict_live_market_open = bool(market_ctx.mode == "LIVE")
+    exec_mode_for_policy = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper()
+    strict_live_market_open = bool(market_ctx.mode == "LIVE")
+    option_chain = _fetch_option_chain_with_context(
+        symbol,
+        ltp,
+        force_synthetic=False,
+        market_context=market_ctx.to_dict(),
+    )
+    chain_source = "live" if option_chain else "empty"
+    if (not strict_live_market_open) and (not option_chain) and getattr(cfg, "ALLOW_SYNTHETIC_CHAIN", False):
         option_chain = _fetch_option_chain_with_context(
             symbol,
             ltp,
-            force_synthetic=False,
+            force_synthetic=True,
             market_context=market_ctx.to_dict(),
         )
-        chain_source = "live" if option_chain else "empty"
-        if (not strict_live_market_open) and (not option_chain) and getattr(cfg, "ALLOW_SYNTHETIC_CHAIN", False):
-            option_chain = _fetch_option_chain_with_context(
-                symbol,
-                ltp,
-                force_synthetic=True,
-                market_context=market_ctx.to_dict(),
-            )
-            chain_source = "synthetic_offhours" if option_chain else "empty"
-        if option_chain and chain_source == "synthetic_offhours":
-            for opt in option_chain:
-                if isinstance(opt, dict):
-                    opt["chain_source"] = "synthetic_offhours"
-                    opt["planning_only"] = True
-        # Option chain health validation (live NFO/BFO)
-        try:
-            health = _option_chain_health(
-                symbol,
-                option_chain,
-                ltp,
-                require_live_quotes=require_live_quotes,
-            )
-            health_path = Path("logs/option_chain_health.json")
-            health_path.parent.mkdir(exist_ok=True)
-            existing = {}
-            if health_path.exists():
-                try:
-                    existing = json.loads(health_path.read_text())
-                except Exception:
-                    existing = {}
-            existing[symbol] = health
-            health_path.write_text(json.dumps(existing, indent=2))
-        except Exception:
-            health = None
+        chain_source = "synthetic_offhours" if option_chain else "empty"
+    if option_chain and chain_source == "synthetic_offhours":
+        for opt in option_chain:
+            if isinstance(opt, dict):
+                opt["chain_source"] = "synthetic_offhours"
+                opt["planning_only"] = True
+    if isinstance(option_chain, list):
+        option_chain = OptionChainFrame.of(option_chain)
+        option_chain.invalidate("chain_source", "planning_only")
+    timer.mark("option_chain")
+    # Option chain health validation (live NFO/BFO)
+    try:
+        health = _option_chain_health(
+            symbol,
+            option_chain,
+            ltp,
+            require_live_quotes=require_live_quotes,
+        )
+        _CHAIN_HEALTH_SNAPSHOT.publish(symbol, health)
+    except Exception:
+        health = None
 
-        # Depth age (use latest depth snapshot for option tokens if available)
+    timer.mark("chain_health")
+    # Depth age (use latest depth snapshot for option tokens if available)
+    depth_age_sec = None
+    try:
+        latest_depth_ts = None
+        for token in option_chain.values("instrument_token"):
+            if token is None:
+                continue
+            book = depth_store.get(token) or {}
+            ts_epoch = book.get("ts_epoch") or book.get("ts")
+            if ts_epoch is not None:
+                latest_depth_ts = ts_epoch if latest_depth_ts is None else max(latest_depth_ts, float(ts_epoch))
+        if latest_depth_ts is not None:
+            depth_age_sec = compute_age_sec(float(latest_depth_ts), now_utc_epoch())
+    except Exception:
         depth_age_sec = None
-        try:
-            latest_depth_ts = None
-            for opt in option_chain:
-                token = opt.get("instrument_token")
-                if token is None:
-                    continue
-                book = depth_store.get(token) or {}
-                ts_epoch = book.get("ts_epoch") or book.get("ts")
-                if ts_epoch is not None:
-                    latest_depth_ts = ts_epoch if latest_depth_ts is None else max(latest_depth_ts, float(ts_epoch))
-            if latest_depth_ts is not None:
-                depth_age_sec = compute_age_sec(float(latest_depth_ts), now_utc_epoch())
-        except Exception:
-            depth_age_sec = None
 
-        # Regime model (probabilistic)
-        atr_pct = (atr / ltp) if ltp else 0
-        try:
-            iv_vals = [c.get("iv") for c in option_chain if c.get("iv") is not None]
-            iv_mean = sum(iv_vals) / len(iv_vals) if iv_vals else 0
-        except Exception:
-            iv_mean = 0
-        # option chain skew (call iv - put iv)
-        try:
-            call_ivs = [c.get("iv") for c in option_chain if c.get("iv") is not None and c.get("type") == "CE"]
-            put_ivs = [c.get("iv") for c in option_chain if c.get("iv") is not None and c.get("type") == "PE"]
-            call_mean = sum(call_ivs) / len(call_ivs) if call_ivs else 0
-            put_mean = sum(put_ivs) / len(put_ivs) if put_ivs else 0
-            option_chain_skew = (call_mean - put_mean)
-        except Exception:
-            option_chain_skew = 0
-        # OI delta (calls - puts)
-        try:
-            call_oi = sum([c.get("oi_change", 0) or 0 for c in option_chain if c.get("type") == "CE"])
-            put_oi = sum([c.get("oi_change", 0) or 0 for c in option_chain if c.get("type") == "PE"])
-            oi_delta = float(call_oi - put_oi)
-        except Exception:
-            oi_delta = 0.0
-        # Depth imbalance from option chain quotes
-        try:
-            bid_qty_sum = sum([c.get("bid_qty", 0) or 0 for c in option_chain])
-            ask_qty_sum = sum([c.get("ask_qty", 0) or 0 for c in option_chain])
-            denom = max(bid_qty_sum + ask_qty_sum, 1)
-            depth_imbalance = (bid_qty_sum - ask_qty_sum) / denom
-        except Exception:
-            depth_imbalance = 0.0
-
-        # regime transition rate (per hour)
-        try:
-            trans = _REGIME_TRANSITIONS.get(symbol)
-            if trans is None:
-                trans = deque(maxlen=2000)
-                _REGIME_TRANSITIONS[symbol] = trans
-        except Exception:
-            trans = None
+    # Regime model (probabilistic)
+    atr_pct = (atr / ltp) if ltp else 0
+    try:
+        iv_mean = option_chain.iv_mean()
+    except Exception:
+        iv_mean = 0
+    # option chain skew (call iv - put iv)
+    try:
+        option_chain_skew = option_chain.iv_mean("CE") - option_chain.iv_mean("PE")
+    except Exception:
+        option_chain_skew = 0
+    # OI delta (calls - puts)
+    try:
+        oi_delta = float(option_chain.sum_of("oi_change", "CE") - option_chain.sum_of("oi_change", "PE"))
+    except Exception:
+        oi_delta = 0.0
+    # Depth imbalance from option chain quotes
+    try:
+        bid_qty_sum = option_chain.sum_of("bid_qty")
+        ask_qty_sum = option_chain.sum_of("ask_qty")
+        denom = max(bid_qty_sum + ask_qty_sum, 1)
+        depth_imbalance = (bid_qty_sum - ask_qty_sum) / denom
+    except Exception:
+        depth_imbalance = 0.0
 
-        features = {
-            "adx": adx_14,
-            "vwap_slope": vwap_slope,
-            "vol_z": vol_z,
-            "atr_pct": atr_pct,
-            "iv_mean": iv_mean,
-            "ltp_acceleration": ltp_acceleration,
-            "option_chain_skew": option_chain_skew,
-            "oi_delta": oi_delta,
-            "depth_imbalance": depth_imbalance,
-            "regime_transition_rate": 0.0,
-            "shock_score": shock.get("shock_score"),
-            "uncertainty_index": shock.get("uncertainty_index"),
-            "macro_direction_bias": shock.get("macro_direction_bias"),
-            "x_regime_align": cross_feat.get("x_regime_align"),
-            "x_vol_spillover": cross_feat.get("x_vol_spillover"),
-            "x_lead_lag": cross_feat.get("x_lead_lag"),
-            "x_index_ret1": cross_feat.get("x_index_ret1"),
-            "x_index_ret5": cross_feat.get("x_index_ret5"),
-        }
+    # regime transition rate (per hour)
+    try:
+        trans = _REGIME_TRANSITIONS.get(symbol)
+        if trans is None:
+            trans = deque(maxlen=2000)
+            _REGIME_TRANSITIONS[symbol] = trans
+    except Exception:
+        trans = None
+
+    features = {
+        "adx": adx_14,
+        "vwap_slope": vwap_slope,
+        "vol_z": vol_z,
+        "atr_pct": atr_pct,
+        "iv_mean": iv_mean,
+        "ltp_acceleration": ltp_acceleration,
+        "option_chain_skew": option_chain_skew,
+        "oi_delta": oi_delta,
+        "depth_imbalance": depth_imbalance,
+        "regime_transition_rate": 0.0,
+        "shock_score": shock.get("shock_score"),
+        "uncertainty_index": shock.get("uncertainty_index"),
+        "macro_direction_bias": shock.get("macro_direction_bias"),
+        "x_regime_align": cross_feat.get("x_regime_align"),
+        "x_vol_spillover": cross_feat.get("x_vol_spillover"),
+        "x_lead_lag": cross_feat.get("x_lead_lag"),
+        "x_index_ret1": cross_feat.get("x_index_ret1"),
+        "x_index_ret5": cross_feat.get("x_index_ret5"),
+    }
+    regime_probs = {}
+    primary_regime = None
+    regime_entropy = 0.0
+    model_unstable_flag = False
+    unstable_reasons = []
+    regime_reasons = []
+    regime_confidence = None
+    try:
+        model_out = _REGIME_MODEL.predict(features)
+        regime_probs = dict(model_out.get("regime_probs", {}) or {})
+        raw_primary = model_out.get("primary_regime")
+        primary_regime = str(raw_primary).upper().strip() if raw_primary else None
+        regime_entropy = float(model_out.get("regime_entropy", 0.0) or 0.0)
+        model_unstable_flag = bool(model_out.get("unstable_regime_flag", False))
+    except Exception:
         regime_probs = {}
         primary_regime = None
         regime_entropy = 0.0
         model_unstable_flag = False
-        unstable_reasons = []
-        regime_reasons = []
-        regime_confidence = None
+        regime_reasons.append("indicator_nan")
+
+    timer.mark("regime")
+    if int(ohlc_bars_count) < int(min_bars):
+        regime_reasons.append("warmup_incomplete")
+    if int(ohlc_bars_count) <= 0 or ("ohlc_buffer_empty" in set(missing_inputs)):
+        regime_reasons.append("missing_ohlc")
+    feature_values = [
+        features.get("adx"),
+        features.get("vwap_slope"),
+        features.get("vol_z"),
+        features.get("atr_pct"),
+        features.get("iv_mean"),
+        features.get("ltp_acceleration"),
+        features.get("option_chain_skew"),
+        features.get("oi_delta"),
+        features.get("depth_imbalance"),
+    ]
+    if any((v is not None) and (not _is_finite_number(v)) for v in feature_values):
+        regime_reasons.append("indicator_nan")
+    indicator_stale_sec = float(getattr(cfg, "INDICATOR_STALE_SEC", 120.0))
+    if candle_ts_epoch is None:
+        regime_reasons.append("stale_last_candle")
+    else:
         try:
-            model_out = _REGIME_MODEL.predict(features)
-            regime_probs = dict(model_out.get("regime_probs", {}) or {})
-            raw_primary = model_out.get("primary_regime")
-            primary_regime = str(raw_primary).upper().strip() if raw_primary else None
-            regime_entropy = float(model_out.get("regime_entropy", 0.0) or 0.0)
-            model_unstable_flag = bool(model_out.get("unstable_regime_flag", False))
+            candle_age = max(0.0, float(now_epoch_for_indicators) - float(candle_ts_epoch))
         except Exception:
-            regime_probs = {}
-            primary_regime = None
-            regime_entropy = 0.0
-            model_unstable_flag = False
-            regime_reasons.append("indicator_nan")
-
-        if int(ohlc_bars_count) < int(min_bars):
-            regime_reasons.append("warmup_incomplete")
-        if int(ohlc_bars_count) <= 0 or ("ohlc_buffer_empty" in set(missing_inputs)):
-            regime_reasons.append("missing_ohlc")
-        feature_values = [
-            features.get("adx"),
-            features.get("vwap_slope"),
-            features.get("vol_z"),
-            features.get("atr_pct"),
-            features.get("iv_mean"),
-            features.get("ltp_acceleration"),
-            features.get("option_chain_skew"),
-            features.get("oi_delta"),
-            features.get("depth_imbalance"),
-        ]
-        if any((v is not None) and (not _is_finite_number(v)) for v in feature_values):
-            regime_reasons.append("indicator_nan")
-        indicator_stale_sec = float(getattr(cfg, "INDICATOR_STALE_SEC", 120.0))
-        if candle_ts_epoch is None:
+            candle_age = indicator_stale_sec + 1.0
+        if candle_age > indicator_stale_sec:
             regime_reasons.append("stale_last_candle")
-        else:
-            try:
-                candle_age = max(0.0, float(now_epoch_for_indicators) - float(candle_ts_epoch))
-            except Exception:
-                candle_age = indicator_stale_sec + 1.0
-            if candle_age > indicator_stale_sec:
-                regime_reasons.append("stale_last_candle")
 
-        if regime_probs:
-            try:
-                regime_confidence = max(float(v) for v in regime_probs.values())
-            except Exception:
-                regime_confidence = None
-
-        # Update transition rate
+    if regime_probs:
         try:
-            last_primary = _REGIME_LAST_PRIMARY.get(symbol)
-            if last_primary and primary_regime != last_primary and trans is not None:
-                trans.append(time.time())
-            if primary_regime:
-                _REGIME_LAST_PRIMARY[symbol] = primary_regime
-            if trans is not None:
-                now = time.time()
-                window = 3600
-                trans = deque([t for t in trans if now - t <= window], maxlen=2000)
-                _REGIME_TRANSITIONS[symbol] = trans
-                regime_transition_rate = len(trans) / (window / 3600.0)
-            else:
-                regime_transition_rate = 0.0
+            regime_confidence = max(float(v) for v in regime_probs.values())
         except Exception:
+            regime_confidence = None
+
+    # Update transition rate
+    try:
+        last_primary = _REGIME_LAST_PRIMARY.get(symbol)
+        if last_primary and primary_regime != last_primary and trans is not None:
+            trans.append(time.time())
+        if primary_regime:
+            _REGIME_LAST_PRIMARY[symbol] = primary_regime
+        if trans is not None:
+            now = time.time()
+            window = 3600
+            trans = deque([t for t in trans if now - t <= window], maxlen=2000)
+            _REGIME_TRANSITIONS[symbol] = trans
+            regime_transition_rate = len(trans) / (window / 3600.0)
+        else:
             regime_transition_rate = 0.0
+    except Exception:
+        regime_transition_rate = 0.0
 
-        features["regime_transition_rate"] = regime_transition_rate
+    features["regime_transition_rate"] = regime_transition_rate
 
-        regime = str(primary_regime).upper().strip() if primary_regime else None
+    regime = str(primary_regime).upper().strip() if primary_regime else None
 
-        # time to expiry (hours)
+    # time to expiry (hours)
+    time_to_expiry_hrs = None
+    try:
+        expiry = None
+        if option_chain:
+            expiry = option_chain[0].get("expiry")
+        if expiry:
+            from datetime import datetime as dt
+            exp_dt = dt.fromisoformat(str(expiry))
+            time_to_expiry_hrs = max(0.0, (exp_dt - now_ist()).total_seconds() / 3600.0)
+    except Exception:
         time_to_expiry_hrs = None
-        try:
-            expiry = None
-            if option_chain:
-                expiry = option_chain[0].get("expiry")
-            if expiry:
-                from datetime import datetime as dt
-                exp_dt = dt.fromisoformat(str(expiry))
-                time_to_expiry_hrs = max(0.0, (exp_dt - now_ist()).total_seconds() / 3600.0)
-        except Exception:
-            time_to_expiry_hrs = None
-
-        # Force regime override (for testing)
-        force = getattr(cfg, "FORCE_REGIME", "")
-        if isinstance(force, str) and force.strip():
-            forced_regime = force.strip().upper()
-            regime = forced_regime
-            primary_regime = forced_regime
-            regime_reasons = []
-            regime_confidence = 1.0
-        regime_reasons = list(dict.fromkeys(str(x) for x in regime_reasons if str(x).strip()))
-        if (not indicators_ok) or (not regime) or regime_reasons:
-            regime = "UNKNOWN"
-            primary_regime = "UNKNOWN"
-            regime_probs = {}
-            regime_entropy = 0.0
-            regime_confidence = None
-        unstable_reasons = _derive_unstable_reasons(
-            regime_probs=regime_probs,
-            regime_entropy=regime_entropy,
-            regime_transition_rate=regime_transition_rate,
-            indicators_ok=indicators_ok,
-            ohlc_bars_count=ohlc_bars_count,
-            min_bars=min_bars,
-            missing_inputs=missing_inputs,
-            model_unstable_flag=model_unstable_flag,
+
+    # Force regime override (for testing)
+    force = getattr(cfg, "FORCE_REGIME", "")
+    if isinstance(force, str) and force.strip():
+        forced_regime = force.strip().upper()
+        regime = forced_regime
+        primary_regime = forced_regime
+        regime_reasons = []
+        regime_confidence = 1.0
+    regime_reasons = list(dict.fromkeys(str(x) for x in regime_reasons if str(x).strip()))
+    if (not indicators_ok) or (not regime) or regime_reasons:
+        regime = "UNKNOWN"
+        primary_regime = "UNKNOWN"
+        regime_probs = {}
+        regime_entropy = 0.0
+        regime_confidence = None
+    unstable_reasons = _derive_unstable_reasons(
+        regime_probs=regime_probs,
+        regime_entropy=regime_entropy,
+        regime_transition_rate=regime_transition_rate,
+        indicators_ok=indicators_ok,
+        ohlc_bars_count=ohlc_bars_count,
+        min_bars=min_bars,
+        missing_inputs=missing_inputs,
+        model_unstable_flag=model_unstable_flag,
+    )
+    unstable_regime_flag = bool(unstable_reasons)
+
+    warmup_min_bars = int(getattr(cfg, "SYSTEM_WARMUP_MIN_BARS", min_bars))
+    warmup_bars_by_timeframe = {"1m": int(ohlc_bars_count)}
+    warmup_min_bars_by_timeframe = {"1m": int(warmup_min_bars)}
+    indicator_last_ok = isinstance(indicator_last_update_epoch, (int, float)) and float(indicator_last_update_epoch) > 0.0
+    warmup_reasons = []
+    if ohlc_bars_count < warmup_min_bars:
+        warmup_reasons.append(f"bars_below_min:1m:{ohlc_bars_count}/{warmup_min_bars}")
+    if not indicator_last_ok:
+        warmup_reasons.append("indicator_last_update_missing")
+    elif isinstance(indicators_age_sec, (int, float)) and float(indicators_age_sec) > indicator_stale_sec:
+        warmup_reasons.append(
+            f"indicator_last_update_stale:{float(indicators_age_sec):.1f}s>{indicator_stale_sec:.1f}s"
         )
-        unstable_regime_flag = bool(unstable_reasons)
-
-        warmup_min_bars = int(getattr(cfg, "SYSTEM_WARMUP_MIN_BARS", min_bars))
-        warmup_bars_by_timeframe = {"1m": int(ohlc_bars_count)}
-        warmup_min_bars_by_timeframe = {"1m": int(warmup_min_bars)}
-        indicator_last_ok = isinstance(indicator_last_update_epoch, (int, float)) and float(indicator_last_update_epoch) > 0.0
-        warmup_reasons = []
-        if ohlc_bars_count < warmup_min_bars:
-            warmup_reasons.append(f"bars_below_min:1m:{ohlc_bars_count}/{warmup_min_bars}")
-        if not indicator_last_ok:
-            warmup_reasons.append("indicator_last_update_missing")
-        elif isinstance(indicators_age_sec, (int, float)) and float(indicators_age_sec) > indicator_stale_sec:
-            warmup_reasons.append(
-                f"indicator_last_update_stale:{float(indicators_age_sec):.1f}s>{indicator_stale_sec:.1f}s"
-            )
-        if not bool(indicators_ok):
-            warmup_reasons.append("indicators_not_ready")
-        if regime == "UNKNOWN":
-            warmup_reasons.append("regime_missing")
-        for reason in missing_inputs:
-            if str(reason).upper() == "HIST_FETCH_FAILED":
-                warmup_reasons.append("HIST_FETCH_FAILED")
-            else:
-                warmup_reasons.append(f"missing_input:{reason}")
-        warmup_reasons = list(dict.fromkeys(warmup_reasons))
-        if "HIST_FETCH_FAILED" in warmup_reasons:
-            # Single explicit root-cause reason for UI/operator clarity.
-            warmup_reasons = ["HIST_FETCH_FAILED"]
-        system_state = "WARMUP" if warmup_reasons else "READY"
-
-        # Day-type classifier (first 30–60 min decisive)
-        day_type = "UNKNOWN"
-        day_conf = 0.0
-        try:
-            minutes_since_open = int(minutes_since_open)
-        except Exception:
-            minutes_since_open = 0
-        try:
-            if not indicators_ok:
-                day_type = "UNKNOWN"
-                day_conf = 0.0
-            else:
-                atr_pct = (atr / ltp) if ltp else 0
-                vwap_dist = (ltp - vwap) / vwap if vwap else 0
-                # Expiry day heuristic
-                exp_from_chain = None
-                if option_chain:
-                    try:
-                        exp_from_chain = option_chain[0].get("expiry")
-                    except Exception:
-                        exp_from_chain = None
-                if exp_from_chain:
-                    try:
-                        exp_dt = datetime.fromisoformat(str(exp_from_chain)).date()
-                        if is_market_open and exp_dt == today_local:
-                            day_type = "EXPIRY_DAY"
-                    except Exception:
-                        pass
-                if day_type == "UNKNOWN":
-                    weekday = today_local.weekday()
-                    exp_map = getattr(cfg, "EXPIRY_WEEKDAY_BY_SYMBOL", {})
-                    exp_day = exp_map.get(symbol.upper())
-                    if exp_day is not None and weekday == exp_day and is_market_open:
-                        day_type = "EXPIRY_DAY"
-                if day_type == "UNKNOWN":
-                    # Panic / liquidation
-                    if vol_z >= 2.0 and atr_pct >= 0.008 and ltp_change_window < -atr * 0.5:
-                        day_type = "PANIC_DAY"
-                        day_conf = 0.9
-                    # Event day
-                    elif regime == "EVENT":
-                        day_type = "EVENT_DAY"
-                        day_conf = 0.8
-                    # Trend day
-                    elif adx_14 >= getattr(cfg, "TREND_ADX", 22) and abs(vwap_slope) > 0 and abs(vwap_dist) > getattr(cfg, "DAYTYPE_VWAP_DIST", 0.002):
-                        day_type = "TREND_DAY"
-                        day_conf = 0.7
-                    # Range day
-                    elif adx_14 < getattr(cfg, "RANGE_ADX", 18) and abs(vwap_dist) < getattr(cfg, "DAYTYPE_VWAP_DIST", 0.002):
-                        day_type = "RANGE_DAY"
-                        day_conf = 0.7
-                    # Fake breakout (reversal in 5–10m)
-                    elif (ltp_change_10m != 0) and (ltp_change_5m != 0) and (ltp_change_5m * ltp_change_10m < 0) and abs(ltp_change_10m) > atr * 0.2:
-                        day_type = "FAKE_BREAKOUT_DAY"
-                        day_conf = 0.6
-                    # Trend → Range (morning move, afternoon flat)
-                    elif minutes_since_open > 90 and abs(ltp_change_10m) > atr * 0.3 and abs(ltp_change_5m) < atr * 0.05:
-                        day_type = "TREND_RANGE_DAY"
-                        day_conf = 0.6
-                    # Range → Trend (late breakout)
-                    elif minutes_since_open > 120 and abs(ltp_change_10m) < atr * 0.15 and abs(ltp_change_5m) > atr * 0.25:
-                        day_type = "RANGE_TREND_DAY"
-                        day_conf = 0.6
-                    # Range volatile
-                    elif regime == "RANGE_VOLATILE":
-                        day_type = "RANGE_VOLATILE"
-                        day_conf = 0.55
-        except Exception:
+    if not bool(indicators_ok):
+        warmup_reasons.append("indicators_not_ready")
+    if regime == "UNKNOWN":
+        warmup_reasons.append("regime_missing")
+    for reason in missing_inputs:
+        if str(reason).upper() == "HIST_FETCH_FAILED":
+            warmup_reasons.append("HIST_FETCH_FAILED")
+        else:
+            warmup_reasons.append(f"missing_input:{reason}")
+    warmup_reasons = list(dict.fromkeys(warmup_reasons))
+    if "HIST_FETCH_FAILED" in warmup_reasons:
+        # Single explicit root-cause reason for UI/operator clarity.
+        warmup_reasons = ["HIST_FETCH_FAILED"]
+    system_state = "WARMUP" if warmup_reasons else "READY"
+
+    # Day-type classifier (first 30–60 min decisive)
+    day_type = "UNKNOWN"
+    day_conf = 0.0
+    try:
+        minutes_since_open = int(minutes_since_open)
+    except Exception:
+        minutes_since_open = 0
+    try:
+        if not indicators_ok:
             day_type = "UNKNOWN"
             day_conf = 0.0
-
-        # Re-enable expiry zero-hero on trend day (optional)
-        try:
-            if getattr(cfg, "ZERO_HERO_EXPIRY_REENABLE_ON_TREND", True) and day_type == "TREND_DAY":
-                from strategies.trade_builder import TradeBuilder
-                if hasattr(TradeBuilder, "_expiry_zero_hero_disabled_until"):
-                    TradeBuilder._expiry_zero_hero_disabled_until = {}
-        except Exception:
-            pass
-
-        # Lock day type after 60 minutes to avoid reclassification
-        lock_after = getattr(cfg, "DAYTYPE_LOCK_MIN", 60)
-        if getattr(cfg, "DAYTYPE_LOCK_ENABLE", True) and minutes_since_open >= lock_after:
-            locked = _DAYTYPE_LOCK.get(symbol)
-            if locked:
-                day_type = locked.get("day_type", day_type)
-                day_conf = locked.get("day_conf", day_conf)
-            else:
-                _DAYTYPE_LOCK[symbol] = {"day_type": day_type, "day_conf": day_conf, "locked_at": minutes_since_open}
+        else:
+            atr_pct = (atr / ltp) if ltp else 0
+            vwap_dist = (ltp - vwap) / vwap if vwap else 0
+            # Expiry day heuristic
+            exp_from_chain = None
+            if option_chain:
                 try:
-                    append_day_type_event(
-                        symbol=symbol,
-                        event="LOCK",
-                        day_type=day_type,
-                        confidence=day_conf,
-                        minutes_since_open=minutes_since_open,
-                    )
+                    exp_from_chain = option_chain[0].get("expiry")
+                except Exception:
+                    exp_from_chain = None
+            if exp_from_chain:
+                try:
+                    exp_dt = datetime.fromisoformat(str(exp_from_chain)).date()
+                    if is_market_open and exp_dt == today_local:
+                        day_type = "EXPIRY_DAY"
                 except Exception:
                     pass
+            if day_type == "UNKNOWN":
+                weekday = today_local.weekday()
+                exp_map = getattr(cfg, "EXPIRY_WEEKDAY_BY_SYMBOL", {})
+                exp_day = exp_map.get(symbol.upper())
+                if exp_day is not None and weekday == exp_day and is_market_open:
+                    day_type = "EXPIRY_DAY"
+            if day_type == "UNKNOWN":
+                # Panic / liquidation
+                if vol_z >= 2.0 and atr_pct >= 0.008 and ltp_change_window < -atr * 0.5:
+                    day_type = "PANIC_DAY"
+                    day_conf = 0.9
+                # Event day
+                elif regime == "EVENT":
+                    day_type = "EVENT_DAY"
+                    day_conf = 0.8
+                # Trend day
+                elif adx_14 >= getattr(cfg, "TREND_ADX", 22) and abs(vwap_slope) > 0 and abs(vwap_dist) > getattr(cfg, "DAYTYPE_VWAP_DIST", 0.002):
+                    day_type = "TREND_DAY"
+                    day_conf = 0.7
+                # Range day
+                elif adx_14 < getattr(cfg, "RANGE_ADX", 18) and abs(vwap_dist) < getattr(cfg, "DAYTYPE_VWAP_DIST", 0.002):
+                    day_type = "RANGE_DAY"
+                    day_conf = 0.7
+                # Fake breakout (reversal in 5–10m)
+                elif (ltp_change_10m != 0) and (ltp_change_5m != 0) and (ltp_change_5m * ltp_change_10m < 0) and abs(ltp_change_10m) > atr * 0.2:
+                    day_type = "FAKE_BREAKOUT_DAY"
+                    day_conf = 0.6
+                # Trend → Range (morning move, afternoon flat)
+                elif minutes_since_open > 90 and abs(ltp_change_10m) > atr * 0.3 and abs(ltp_change_5m) < atr * 0.05:
+                    day_type = "TREND_RANGE_DAY"
+                    day_conf = 0.6
+                # Range → Trend (late breakout)
+                elif minutes_since_open > 120 and abs(ltp_change_10m) < atr * 0.15 and abs(ltp_change_5m) > atr * 0.25:
+                    day_type = "RANGE_TREND_DAY"
+                    day_conf = 0.6
+                # Range volatile
+                elif regime == "RANGE_VOLATILE":
+                    day_type = "RANGE_VOLATILE"
+                    day_conf = 0.55
+    except Exception:
+        day_type = "UNKNOWN"
+        day_conf = 0.0
 
-        # Log day-type changes
-        try:
-            last = _DAYTYPE_LAST.get(symbol)
-            if last != day_type:
-                _DAYTYPE_LAST[symbol] = day_type
+    # Re-enable expiry zero-hero on trend day (optional)
+    try:
+        if getattr(cfg, "ZERO_HERO_EXPIRY_REENABLE_ON_TREND", True) and day_type == "TREND_DAY":
+            from strategies.trade_builder import TradeBuilder
+            if hasattr(TradeBuilder, "_expiry_zero_hero_disabled_until"):
+                TradeBuilder._expiry_zero_hero_disabled_until = {}
+    except Exception:
+        pass
+
+    # Lock day type after 60 minutes to avoid reclassification
+    lock_after = getattr(cfg, "DAYTYPE_LOCK_MIN", 60)
+    if getattr(cfg, "DAYTYPE_LOCK_ENABLE", True) and minutes_since_open >= lock_after:
+        locked = _DAYTYPE_LOCK.get(symbol)
+        if locked:
+            day_type = locked.get("day_type", day_type)
+            day_conf = locked.get("day_conf", day_conf)
+        else:
+            _DAYTYPE_LOCK[symbol] = {"day_type": day_type, "day_conf": day_conf, "locked_at": minutes_since_open}
+            try:
                 append_day_type_event(
                     symbol=symbol,
-                    event="CHANGE",
+                    event="LOCK",
                     day_type=day_type,
                     confidence=day_conf,
                     minutes_since_open=minutes_since_open,
                 )
-        except Exception:
-            pass
+            except Exception:
+                pass
 
-        # Periodic confidence heartbeat for chart accuracy
-        try:
+    # Log day-type changes
+    try:
+        last = _DAYTYPE_LAST.get(symbol)
+        if last != day_type:
+            _DAYTYPE_LAST[symbol] = day_type
+            append_day_type_event(
+                symbol=symbol,
+                event="CHANGE",
+                day_type=day_type,
+                confidence=day_conf,
+                minutes_since_open=minutes_since_open,
+            )
+    except Exception:
+        pass
+
+    # Periodic confidence heartbeat for chart accuracy
+    try:
+        now_ts = time.time()
+        last_ts = _DAYTYPE_LAST_LOG.get(symbol, 0)
+        every = getattr(cfg, "DAYTYPE_LOG_EVERY_SEC", 60)
+        if now_ts - last_ts >= every:
+            _DAYTYPE_LAST_LOG[symbol] = now_ts
+            append_day_type_event(
+                symbol=symbol,
+                event="TICK",
+                day_type=day_type,
+                confidence=day_conf,
+                minutes_since_open=minutes_since_open,
+            )
+    except Exception:
+        pass
+
+    # Alert if confidence drops below threshold
+    try:
+        conf_min = getattr(cfg, "DAYTYPE_CONF_SWITCH_MIN", 0.6)
+        if day_conf < conf_min:
             now_ts = time.time()
-            last_ts = _DAYTYPE_LAST_LOG.get(symbol, 0)
-            every = getattr(cfg, "DAYTYPE_LOG_EVERY_SEC", 60)
-            if now_ts - last_ts >= every:
-                _DAYTYPE_LAST_LOG[symbol] = now_ts
-                append_day_type_event(
-                    symbol=symbol,
-                    event="TICK",
-                    day_type=day_type,
-                    confidence=day_conf,
-                    minutes_since_open=minutes_since_open,
+            last_ts = _DAYTYPE_ALERT_TS.get(symbol, 0)
+            cooldown = getattr(cfg, "DAYTYPE_ALERT_COOLDOWN_SEC", 600)
+            if now_ts - last_ts > cooldown:
+                _DAYTYPE_ALERT_TS[symbol] = now_ts
+                from core.telegram_alerts import send_telegram_message
+                send_telegram_message(
+                    f"DayType alert: {symbol} confidence {day_conf:.2f} below {conf_min:.2f} (type={day_type})"
                 )
-        except Exception:
-            pass
-
-        # Alert if confidence drops below threshold
-        try:
-            conf_min = getattr(cfg, "DAYTYPE_CONF_SWITCH_MIN", 0.6)
-            if day_conf < conf_min:
-                now_ts = time.time()
-                last_ts = _DAYTYPE_ALERT_TS.get(symbol, 0)
-                cooldown = getattr(cfg, "DAYTYPE_ALERT_COOLDOWN_SEC", 600)
-                if now_ts - last_ts > cooldown:
-                    _DAYTYPE_ALERT_TS[symbol] = now_ts
-                    from core.telegram_alerts import send_telegram_message
-                    send_telegram_message(
-                        f"DayType alert: {symbol} confidence {day_conf:.2f} below {conf_min:.2f} (type={day_type})"
-                    )
-        except Exception:
-            pass
+    except Exception:
+        pass
 
-        # Live-only: no CSV-based features or synthetic bid/ask
-        seq_buffer = None
-        htf_trend = 0
-        htf_dir = "FLAT"
+    # Live-only: no CSV-based features or synthetic bid/ask
+    seq_buffer = None
+    htf_trend = 0
+    htf_dir = "FLAT"
 
-        # Confidence history for sparkline
-        try:
-            hist = _DAYTYPE_CONF_HISTORY.get(symbol)
-            if hist is None:
-                hist = deque(maxlen=60)
-                _DAYTYPE_CONF_HISTORY[symbol] = hist
-            hist.append(day_conf)
-            conf_hist = list(hist)
-        except Exception:
-            conf_hist = []
+    # Confidence history for sparkline
+    try:
+        hist = _DAYTYPE_CONF_HISTORY.get(symbol)
+        if hist is None:
+            hist = deque(maxlen=60)
+            _DAYTYPE_CONF_HISTORY[symbol] = hist
+        hist.append(day_conf)
+        conf_hist = list(hist)
+    except Exception:
+        conf_hist = []
 
-        regime_ts = now_ist().isoformat()
-        try:
-            _LAST_REGIME_SNAPSHOT[str(symbol).upper()] = {
-                "regime": regime,
-                "primary_regime": primary_regime,
-                "regime_confidence": regime_confidence,
-                "regime_reasons": list(regime_reasons),
-                "regime_probs": regime_probs,
-                "regime_entropy": regime_entropy,
-                "unstable_regime_flag": unstable_regime_flag,
-                "unstable_reasons": list(unstable_reasons),
-                "regime_ts": regime_ts,
-            }
-        except Exception:
-            pass
+    regime_ts = now_ist().isoformat()
+    try:
+        _LAST_REGIME_SNAPSHOT[str(symbol).upper()] = {
+            "regime": regime,
+            "primary_regime": primary_regime,
+            "regime_confidence": regime_confidence,
+            "regime_reasons": list(regime_reasons),
+            "regime_probs": regime_probs,
+            "regime_entropy": regime_entropy,
+            "unstable_regime_flag": unstable_regime_flag,
+            "unstable_reasons": list(unstable_reasons),
+            "regime_ts": regime_ts,
+        }
+    except Exception:
+        pass
 
+    results.append({
+        "symbol": symbol,
+        "market_open": bool(market_ctx.is_market_open),
+        "offhours_mode": bool(offhours_mode),
+        "market_context": market_ctx.to_dict(),
+        "ltp": ltp,
+        "ltp_source": ltp_source,
+        "ltp_ts_epoch": ltp_ts_epoch,
+        "valid": True,
+        "invalid_reason": None,
+        "segment": segment,
+        "vwap": vwap,
+        "bias": get_bias(ltp, vwap),
+        "regime": regime,
+        "primary_regime": primary_regime,
+        "regime_confidence": regime_confidence,
+        "regime_reasons": list(regime_reasons),
+        "regime_probs": regime_probs,
+        "regime_entropy": regime_entropy,
+        "unstable_regime_flag": unstable_regime_flag,
+        "unstable_reasons": list(unstable_reasons),
+        "regime_transition_rate": regime_transition_rate,
+        "regime_ts": regime_ts,
+        "shock_score": shock.get("shock_score"),
+        "macro_direction_bias": shock.get("macro_direction_bias"),
+        "uncertainty_index": shock.get("uncertainty_index"),
+        "event_name": shock.get("event_name"),
+        "minutes_to_event": shock.get("minutes_to_event"),
+        "event_category": shock.get("event_category"),
+        "event_importance": shock.get("event_importance"),
+        "fx_ret_5m": fx_ret_5m or 0.0,
+        "vix_z": vix_z or 0.0,
+        "crude_ret_15m": crude_ret_15m or 0.0,
+        "corr_fx_nifty": corr_fx_nifty or 0.0,
+        "cross_asset_ok": not bool(cross_quality.get("any_stale")),
+        "cross_asset_quality": cross_quality,
+        **cross_feat,
+        "regime_day": regime,
+        "day_type": day_type,
+        "day_confidence": round(day_conf, 3),
+        "day_conf_history": conf_hist,
+        "indicators_ok": indicators_ok,
+        "indicator_inputs_ok": indicator_inputs_ok,
+        "indicators_age_sec": indicators_age_sec,
+        "indicator_last_update_epoch": indicator_last_update_epoch,
+        "ohlc_bars_count": ohlc_bars_count,
+        "ohlc_seeded": bool(ohlc_seeded),
+        "ohlc_seed_reason": ohlc_seed_reason,
+        "ohlc_last_bar_epoch": ohlc_last_bar_epoch,
+        "compute_indicators_error": compute_indicators_error,
+        "missing_inputs": missing_inputs,
+        "indicator_missing_inputs": missing_inputs,
+        "system_state": system_state,
+        "warmup_reasons": warmup_reasons,
+        "warmup_min_bars": warmup_min_bars,
+        "warmup_bars_by_timeframe": warmup_bars_by_timeframe,
+        "warmup_min_bars_by_timeframe": warmup_min_bars_by_timeframe,
+        "time_to_expiry_hrs": time_to_expiry_hrs,
+        "orb_bias": orb_bias,
+        "orb_lock_min": orb_lock_min,
+        "minutes_since_open": minutes_since_open,
+        "atr": atr,
+        "vwap_slope": vwap_slope,
+        "rsi_mom": rsi_mom,
+        "vol_z": vol_z,
+        "adx_14": adx_14,
+        "atr_pct": atr_pct,
+        "iv_mean": iv_mean,
+        "ltp_acceleration": ltp_acceleration,
+        "option_chain_skew": option_chain_skew,
+        "oi_delta": oi_delta,
+        "depth_imbalance": depth_imbalance,
+        "orb_high": orb_high,
+        "orb_low": orb_low,
+        "volume": volume,
+        "bid": bid,
+        "ask": ask,
+        "bid_qty": bid_qty,
+        "ask_qty": ask_qty,
+        "quote_ok": quote_ok,
+        "quote_source": quote_source,
+        "quote_ts": quote_ts,
+        "quote_ts_epoch": quote_ts_epoch,
+        "quote_age_sec": quote_age_sec,
+        "index_quote_cache": index_quote_cache,
+        "index_quote_source": quote_source,
+        "candle_ts_epoch": candle_ts_epoch,
+        "depth_age_sec": depth_age_sec,
+        "spread_pct": spread_pct,
+        "feed_health": {"time_sanity": time_sanity},
+        "quote_health": quote_feed_health,
+        "time_sanity": time_sanity,
+        "timestamp": now_utc_epoch(),
+        "timestamp_ist": now_ist().isoformat(),
+        "option_chain": option_chain,
+        "chain_source": chain_source,
+        "planning_only": bool(market_ctx.mode != "LIVE" and chain_source != "live"),
+        "option_chain_health": health,
+        "instrument": "OPT",
+        "seq_buffer": seq_buffer,
+        "ltp_change": ltp_change,
+        "ltp_change_window": ltp_change_window,
+        "ltp_change_5m": ltp_change_5m,
+        "ltp_change_10m": ltp_change_10m,
+        "htf_trend": htf_trend,
+        "htf_dir": htf_dir
+    })
+
+    if getattr(cfg, "ENABLE_FUTURES", False):
         results.append({
             "symbol": symbol,
             "market_open": bool(market_ctx.is_market_open),
@@ -2402,34 +2615,15 @@ def fetch_live_market_data():
             "cross_asset_quality": cross_quality,
             **cross_feat,
             "regime_day": regime,
-            "day_type": day_type,
-            "day_confidence": round(day_conf, 3),
-            "day_conf_history": conf_hist,
-            "indicators_ok": indicators_ok,
-            "indicator_inputs_ok": indicator_inputs_ok,
-            "indicators_age_sec": indicators_age_sec,
-            "indicator_last_update_epoch": indicator_last_update_epoch,
-            "ohlc_bars_count": ohlc_bars_count,
-            "ohlc_seeded": bool(ohlc_seeded),
-            "ohlc_seed_reason": ohlc_seed_reason,
-            "ohlc_last_bar_epoch": ohlc_last_bar_epoch,
-            "compute_indicators_error": compute_indicators_error,
-            "missing_inputs": missing_inputs,
-            "indicator_missing_inputs": missing_inputs,
             "system_state": system_state,
             "warmup_reasons": warmup_reasons,
             "warmup_min_bars": warmup_min_bars,
             "warmup_bars_by_timeframe": warmup_bars_by_timeframe,
             "warmup_min_bars_by_timeframe": warmup_min_bars_by_timeframe,
-            "time_to_expiry_hrs": time_to_expiry_hrs,
-            "orb_bias": orb_bias,
-            "orb_lock_min": orb_lock_min,
-            "minutes_since_open": minutes_since_open,
             "atr": atr,
             "vwap_slope": vwap_slope,
             "rsi_mom": rsi_mom,
             "vol_z": vol_z,
-            "adx_14": adx_14,
             "atr_pct": atr_pct,
             "iv_mean": iv_mean,
             "ltp_acceleration": ltp_acceleration,
@@ -2458,189 +2652,100 @@ def fetch_live_market_data():
             "time_sanity": time_sanity,
             "timestamp": now_utc_epoch(),
             "timestamp_ist": now_ist().isoformat(),
-            "option_chain": option_chain,
-            "chain_source": chain_source,
-            "planning_only": bool(market_ctx.mode != "LIVE" and chain_source != "live"),
-            "option_chain_health": health,
-            "instrument": "OPT",
-            "seq_buffer": seq_buffer,
+            "option_chain": [],
+            "instrument": "FUT",
             "ltp_change": ltp_change,
             "ltp_change_window": ltp_change_window,
             "ltp_change_5m": ltp_change_5m,
             "ltp_change_10m": ltp_change_10m,
-            "htf_trend": htf_trend,
-            "htf_dir": htf_dir
         })
 
-        if getattr(cfg, "ENABLE_FUTURES", False):
-            results.append({
-                "symbol": symbol,
-                "market_open": bool(market_ctx.is_market_open),
-                "offhours_mode": bool(offhours_mode),
-                "market_context": market_ctx.to_dict(),
-                "ltp": ltp,
-                "ltp_source": ltp_source,
-                "ltp_ts_epoch": ltp_ts_epoch,
-                "valid": True,
-                "invalid_reason": None,
-                "segment": segment,
-                "vwap": vwap,
-                "bias": get_bias(ltp, vwap),
-                "regime": regime,
-                "primary_regime": primary_regime,
-                "regime_confidence": regime_confidence,
-                "regime_reasons": list(regime_reasons),
-                "regime_probs": regime_probs,
-                "regime_entropy": regime_entropy,
-                "unstable_regime_flag": unstable_regime_flag,
-                "unstable_reasons": list(unstable_reasons),
-                "regime_transition_rate": regime_transition_rate,
-                "regime_ts": regime_ts,
-                "shock_score": shock.get("shock_score"),
-                "macro_direction_bias": shock.get("macro_direction_bias"),
-                "uncertainty_index": shock.get("uncertainty_index"),
-                "event_name": shock.get("event_name"),
-                "minutes_to_event": shock.get("minutes_to_event"),
-                "event_category": shock.get("event_category"),
-                "event_importance": shock.get("event_importance"),
-                "fx_ret_5m": fx_ret_5m or 0.0,
-                "vix_z": vix_z or 0.0,
-                "crude_ret_15m": crude_ret_15m or 0.0,
-                "corr_fx_nifty": corr_fx_nifty or 0.0,
-                "cross_asset_ok": not bool(cross_quality.get("any_stale")),
-                "cross_asset_quality": cross_quality,
-                **cross_feat,
-                "regime_day": regime,
-                "system_state": system_state,
-                "warmup_reasons": warmup_reasons,
-                "warmup_min_bars": warmup_min_bars,
-                "warmup_bars_by_timeframe": warmup_bars_by_timeframe,
-                "warmup_min_bars_by_timeframe": warmup_min_bars_by_timeframe,
-                "atr": atr,
-                "vwap_slope": vwap_slope,
-                "rsi_mom": rsi_mom,
-                "vol_z": vol_z,
-                "atr_pct": atr_pct,
-                "iv_mean": iv_mean,
-                "ltp_acceleration": ltp_acceleration,
-                "option_chain_skew": option_chain_skew,
-                "oi_delta": oi_delta,
-                "depth_imbalance": depth_imbalance,
-                "orb_high": orb_high,
-                "orb_low": orb_low,
-                "volume": volume,
-                "bid": bid,
-                "ask": ask,
-                "bid_qty": bid_qty,
-                "ask_qty": ask_qty,
-                "quote_ok": quote_ok,
-                "quote_source": quote_source,
-                "quote_ts": quote_ts,
-                "quote_ts_epoch": quote_ts_epoch,
-                "quote_age_sec": quote_age_sec,
-                "index_quote_cache": index_quote_cache,
-                "index_quote_source": quote_source,
-                "candle_ts_epoch": candle_ts_epoch,
-                "depth_age_sec": depth_age_sec,
-                "spread_pct": spread_pct,
-                "feed_health": {"time_sanity": time_sanity},
-                "quote_health": quote_feed_health,
-                "time_sanity": time_sanity,
-                "timestamp": now_utc_epoch(),
-                "timestamp_ist": now_ist().isoformat(),
-                "option_chain": [],
-                "instrument": "FUT",
-                "ltp_change": ltp_change,
-                "ltp_change_window": ltp_change_window,
-                "ltp_change_5m": ltp_change_5m,
-                "ltp_change_10m": ltp_change_10m,
-            })
-
-        if getattr(cfg, "ENABLE_EQUITIES", False):
-            results.append({
-                "symbol": symbol,
-                "market_open": bool(market_ctx.is_market_open),
-                "offhours_mode": bool(offhours_mode),
-                "market_context": market_ctx.to_dict(),
-                "ltp": ltp,
-                "ltp_source": ltp_source,
-                "ltp_ts_epoch": ltp_ts_epoch,
-                "valid": True,
-                "invalid_reason": None,
-                "vwap": vwap,
-                "bias": get_bias(ltp, vwap),
-                "regime": regime,
-                "primary_regime": primary_regime,
-                "regime_confidence": regime_confidence,
-                "regime_reasons": list(regime_reasons),
-                "regime_probs": regime_probs,
-                "regime_entropy": regime_entropy,
-                "unstable_regime_flag": unstable_regime_flag,
-                "unstable_reasons": list(unstable_reasons),
-                "regime_transition_rate": regime_transition_rate,
-                "regime_ts": regime_ts,
-                "shock_score": shock.get("shock_score"),
-                "macro_direction_bias": shock.get("macro_direction_bias"),
-                "uncertainty_index": shock.get("uncertainty_index"),
-                "event_name": shock.get("event_name"),
-                "minutes_to_event": shock.get("minutes_to_event"),
-                "event_category": shock.get("event_category"),
-                "event_importance": shock.get("event_importance"),
-                "fx_ret_5m": fx_ret_5m or 0.0,
-                "vix_z": vix_z or 0.0,
-                "crude_ret_15m": crude_ret_15m or 0.0,
-                "corr_fx_nifty": corr_fx_nifty or 0.0,
-                "cross_asset_ok": not bool(cross_quality.get("any_stale")),
-                "cross_asset_quality": cross_quality,
-                **cross_feat,
-                "regime_day": regime,
-                "system_state": system_state,
-                "warmup_reasons": warmup_reasons,
-                "warmup_min_bars": warmup_min_bars,
-                "warmup_bars_by_timeframe": warmup_bars_by_timeframe,
-                "warmup_min_bars_by_timeframe": warmup_min_bars_by_timeframe,
-                "atr": atr,
-                "vwap_slope": vwap_slope,
-                "rsi_mom": rsi_mom,
-                "vol_z": vol_z,
-                "atr_pct": atr_pct,
-                "iv_mean": iv_mean,
-                "ltp_acceleration": ltp_acceleration,
-                "option_chain_skew": option_chain_skew,
-                "oi_delta": oi_delta,
-                "depth_imbalance": depth_imbalance,
-                "orb_high": orb_high,
-                "orb_low": orb_low,
-                "volume": volume,
-                "bid": bid,
-                "ask": ask,
-                "bid_qty": bid_qty,
-                "ask_qty": ask_qty,
-                "quote_ok": quote_ok,
-                "quote_source": quote_source,
-                "quote_ts": quote_ts,
-                "quote_ts_epoch": quote_ts_epoch,
-                "quote_age_sec": quote_age_sec,
-                "index_quote_cache": index_quote_cache,
-                "index_quote_source": quote_source,
-                "candle_ts_epoch": candle_ts_epoch,
-                "depth_age_sec": depth_age_sec,
-                "spread_pct": spread_pct,
-                "feed_health": {"time_sanity": time_sanity},
-                "quote_health": quote_feed_health,
-                "time_sanity": time_sanity,
-                "timestamp": now_utc_epoch(),
-                "timestamp_ist": now_ist().isoformat(),
-                "option_chain": [],
-                "instrument": "EQ",
-                "ltp_change": ltp_change,
-                "ltp_change_window": ltp_change_window,
-                "ltp_change_5m": ltp_change_5m,
-                "ltp_change_10m": ltp_change_10m,
-            })
-
+    if getattr(cfg, "ENABLE_EQUITIES", False):
+        results.append({
+            "symbol": symbol,
+            "market_open": bool(market_ctx.is_market_open),
+            "offhours_mode": bool(offhours_mode),
+            "market_context": market_ctx.to_dict(),
+            "ltp": ltp,
+            "ltp_source": ltp_source,
+            "ltp_ts_epoch": ltp_ts_epoch,
+            "valid": True,
+            "invalid_reason": None,
+            "vwap": vwap,
+            "bias": get_bias(ltp, vwap),
+            "regime": regime,
+            "primary_regime": primary_regime,
+            "regime_confidence": regime_confidence,
+            "regime_reasons": list(regime_reasons),
+            "regime_probs": regime_probs,
+            "regime_entropy": regime_entropy,
+            "unstable_regime_flag": unstable_regime_flag,
+            "unstable_reasons": list(unstable_reasons),
+            "regime_transition_rate": regime_transition_rate,
+            "regime_ts": regime_ts,
+            "shock_score": shock.get("shock_score"),
+            "macro_direction_bias": shock.get("macro_direction_bias"),
+            "uncertainty_index": shock.get("uncertainty_index"),
+            "event_name": shock.get("event_name"),
+            "minutes_to_event": shock.get("minutes_to_event"),
+            "event_category": shock.get("event_category"),
+            "event_importance": shock.get("event_importance"),
+            "fx_ret_5m": fx_ret_5m or 0.0,
+            "vix_z": vix_z or 0.0,
+            "crude_ret_15m": crude_ret_15m or 0.0,
+            "corr_fx_nifty": corr_fx_nifty or 0.0,
+            "cross_asset_ok": not bool(cross_quality.get("any_stale")),
+            "cross_asset_quality": cross_quality,
+            **cross_feat,
+            "regime_day": regime,
+            "system_state": system_state,
+            "warmup_reasons": warmup_reasons,
+            "warmup_min_bars": warmup_min_bars,
+            "warmup_bars_by_timeframe": warmup_bars_by_timeframe,
+            "warmup_min_bars_by_timeframe": warmup_min_bars_by_timeframe,
+            "atr": atr,
+            "vwap_slope": vwap_slope,
+            "rsi_mom": rsi_mom,
+            "vol_z": vol_z,
+            "atr_pct": atr_pct,
+            "iv_mean": iv_mean,
+            "ltp_acceleration": ltp_acceleration,
+            "option_chain_skew": option_chain_skew,
+            "oi_delta": oi_delta,
+            "depth_imbalance": depth_imbalance,
+            "orb_high": orb_high,
+            "orb_low": orb_low,
+            "volume": volume,
+            "bid": bid,
+            "ask": ask,
+            "bid_qty": bid_qty,
+            "ask_qty": ask_qty,
+            "quote_ok": quote_ok,
+            "quote_source": quote_source,
+            "quote_ts": quote_ts,
+            "quote_ts_epoch": quote_ts_epoch,
+            "quote_age_sec": quote_age_sec,
+            "index_quote_cache": index_quote_cache,
+            "index_quote_source": quote_source,
+            "candle_ts_epoch": candle_ts_epoch,
+            "depth_age_sec": depth_age_sec,
+            "spread_pct": spread_pct,
+            "feed_health": {"time_sanity": time_sanity},
+            "quote_health": quote_feed_health,
+            "time_sanity": time_sanity,
+            "timestamp": now_utc_epoch(),
+            "timestamp_ist": now_ist().isoformat(),
+            "option_chain": [],
+            "instrument": "EQ",
+            "ltp_change": ltp_change,
+            "ltp_change_window": ltp_change_window,
+            "ltp_change_5m": ltp_change_5m,
+            "ltp_change_10m": ltp_change_10m,
+        })
+    timer.mark("finalize")
     return results
 
+
 # Alias for backward compatibility
 get_option_chain = fetch_option_chain
 
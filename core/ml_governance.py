@@ -7,6 +7,8 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 
+from core.trade_log_store import iter_trades
+
 AB_PATH = Path("logs/model_ab_trials.jsonl")
 AB_SUMMARY_PATH = Path("logs/model_ab_summary.json")
 
@@ -131,14 +133,10 @@ def attach_outcomes(trade_log_path: str = "data/trade_log.json", ab_path: Path |
         return None
     trade_map = {}
     try:
-        with open(trade_log_path, "r") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                obj = json.loads(line)
-                tid = obj.get("trade_id")
-                if tid and obj.get("actual") is not None:
-                    trade_map[tid] = obj.get("actual")
+        for obj in iter_trades(trade_log_path):
+            tid = obj.get("trade_id")
+            if tid and obj.get("actual") is not None:
+                trade_map[tid] = obj.get("actual")
     except Exception:
         trade_map = {}
 
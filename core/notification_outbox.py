@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import atexit
+import sqlite3
+import time
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from config import config as cfg
+from core import db_pool
+from core.paths import logs_dir
+from core.log_writer import get_jsonl_writer
+
+_ERROR_LOG_PATH = logs_dir() / "notification_outbox_errors.jsonl"
+_ERROR_LOGGER = get_jsonl_writer(_ERROR_LOG_PATH)
+
+OUTBOX_SCHEMA_VERSION = 1
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+# Telegram rejects messages above 4096 characters.
+MAX_MESSAGE_CHARS = 4000
+_RETENTION_SEC = 7 * 86400
+
+
+class SendResult(NamedTuple):
+    ok: bool
+    retry_after: Optional[float] = None
+    error: str = ""
+    permanent: bool = False
+
+
+def ensure_outbox_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+    CREATE TABLE IF NOT EXISTS notification_outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_epoch REAL,
+        key TEXT,
+        text TEXT,
+        digestible INTEGER DEFAULT 1,
+        status TEXT DEFAULT 'pending',
+        attempts INTEGER DEFAULT 0,
+        next_attempt_epoch REAL,
+        sent_epoch REAL,
+        last_error TEXT
+    )
+    """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_notification_outbox_pending "
+        "ON notification_outbox(next_attempt_epoch) WHERE status='pending'"
+    )
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_MESSAGE_CHARS:
+        return text
+    return text[: MAX_MESSAGE_CHARS - 3] + "..."
+
+
+def build_digest(texts: List[str]) -> str:
+    lines = [f"{len(texts)} alerts:"]
+    lines.extend(f"- {t}" for t in texts)
+    return _truncate("\n".join(lines))
+
+
+class NotificationOutbox:
+    """
+    Durable alert outbox with one background sender thread.
+
+    - enqueue() only touches an in-memory ring and returns; callers on the
+      tick callback or trading loop never wait on the network.
+    - The sender persists queued messages to SQLite, then delivers every due
+      row. Bursts arriving within `coalesce_sec` go out as one digest.
+    - `key` + `min_interval_sec` rate-limit a message class (for example one
+      imbalance alert per token per N seconds); suppressed repeats are counted
+      and noted on the next accepted message for that key.
+    - Failed sends are retried with exponential backoff (or Telegram's
+      retry_after) up to `max_attempts`; rows left pending are picked up again
+      the next time the sender starts.
+    """
+
+    def __init__(
+        self,
+        sender: Callable[[str], SendResult],
+        db_path: Optional[str] = None,
+        capacity: Optional[int] = None,
+        coalesce_sec: Optional[float] = None,
+        digest_max: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        backoff_sec: Optional[float] = None,
+        backoff_max_sec: Optional[float] = None,
+    ) -> None:
+        self._sender = sender
+        self._db_path_override = db_path
+        self.capacity = int(capacity or getattr(cfg, "TELEGRAM_OUTBOX_QUEUE_MAX", 1000))
+        self.coalesce_sec = float(
+            coalesce_sec if coalesce_sec is not None else getattr(cfg, "TELEGRAM_OUTBOX_COALESCE_SEC", 1.0)
+        )
+        self.digest_max = max(1, int(digest_max or getattr(cfg, "TELEGRAM_OUTBOX_DIGEST_MAX", 20)))
+        self.max_attempts = max(1, int(max_attempts or getattr(cfg, "TELEGRAM_OUTBOX_MAX_ATTEMPTS", 5)))
+        self.backoff_sec = float(
+            backoff_sec if backoff_sec is not None else getattr(cfg, "TELEGRAM_OUTBOX_BACKOFF_SEC", 2.0)
+        )
+        self.backoff_max_sec = float(
+            backoff_max_sec if backoff_max_sec is not None else getattr(cfg, "TELEGRAM_OUTBOX_BACKOFF_MAX_SEC", 120.0)
+        )
+        self._buf: deque = deque()
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._stop = False
+        self._flushing = 0
+        self._in_flight = 0
+        self._next_due_epoch: Optional[float] = None
+        self._last_by_key: Dict[str, float] = {}
+        self._suppressed_by_key: Dict[str, int] = {}
+        self._enqueued = 0
+        self._suppressed = 0
+        self._dropped = 0
+        self._sent_messages = 0
+        self._sent_rows = 0
+        self._digests = 0
+        self._retries = 0
+        self._failed_rows = 0
+        self._pending_rows = 0
+        self._last_send_ms: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def db_path(self) -> str:
+        return str(self._db_path_override or getattr(cfg, "TELEGRAM_OUTBOX_DB_PATH", cfg.TRADE_DB_PATH))
+
+    def start(self) -> bool:
+        with self._cond:
+            return self._start_locked()
+
+    def _start_locked(self) -> bool:
+        if self.running:
+            return False
+        self._stop = False
+        # Check rows left pending by an earlier run on the first pass.
+        self._next_due_epoch = time.time()
+        self._thread = Thread(target=self._run, name="notification-outbox", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Persist anything still queued, make one delivery pass over due rows
+        and stop the sender. Undelivered rows stay pending in SQLite.
+        """
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+        thread.join(timeout=timeout)
+        with self._cond:
+            self._thread = None
+
+    def enqueue(
+        self,
+        text: str,
+        key: Optional[str] = None,
+        min_interval_sec: float = 0.0,
+        coalesce: bool = True,
+    ) -> bool:
+        """
+        Queue one message and start the sender if needed. Returns False when
+        `key` was already accepted within `min_interval_sec`.
+        """
+        now = time.time()
+        with self._cond:
+            if key and min_interval_sec > 0:
+                last = self._last_by_key.get(key)
+                if last is not None and now - last < min_interval_sec:
+                    self._suppressed_by_key[key] = self._suppressed_by_key.get(key, 0) + 1
+                    self._suppressed += 1
+                    return False
+                self._last_by_key[key] = now
+                repeats = self._suppressed_by_key.pop(key, 0)
+                if repeats:
+                    text = f"{text} (+{repeats} suppressed)"
+            while len(self._buf) >= self.capacity:
+                self._buf.popleft()
+                self._dropped += 1
+            self._buf.append((now, key, str(text), 1 if coalesce else 0))
+            self._enqueued += 1
+            if not self.running:
+                self._start_locked()
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until everything queued so far has been persisted and had one
+        delivery attempt (skipping the coalesce window).
+        """
+        if not self.running:
+            return not self._buf
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._buf or self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(min(remaining, 0.05))
+            finally:
+                self._flushing -= 1
+        return True
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._buf)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "running": self.running,
+                "queue_depth": len(self._buf),
+                "pending_rows": self._pending_rows,
+                "enqueued": self._enqueued,
+                "suppressed": self._suppressed,
+                "dropped": self._dropped,
+                "sent_messages": self._sent_messages,
+                "sent_rows": self._sent_rows,
+                "digests": self._digests,
+                "retries": self._retries,
+                "failed_rows": self._failed_rows,
+                "last_send_ms": self._last_send_ms,
+                "last_error": self._last_error,
+            }
+
+    def _idle_wait_sec(self) -> Optional[float]:
+        if self._next_due_epoch is None:
+            return None
+        return max(0.01, self._next_due_epoch - time.time())
+
+    def _run(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            while True:
+                with self._cond:
+                    if not self._buf and not self._stop:
+                        self._cond.wait(self._idle_wait_sec())
+                    if self._buf and self.coalesce_sec > 0:
+                        deadline = time.monotonic() + self.coalesce_sec
+                        while not self._stop and not self._flushing:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._cond.wait(remaining)
+                    stopping = self._stop
+                    batch = list(self._buf)
+                    self._buf.clear()
+                    self._in_flight = len(batch)
+                try:
+                    if conn is None:
+                        conn = self._connect()
+                    if batch:
+                        self._persist(conn, batch)
+                    self._deliver_due(conn)
+                except Exception as exc:
+                    self._log_error("OUTBOX_ERROR", exc, rows=len(batch))
+                    if conn is not None:
+                        try:
+                            conn.close()
+                        except Exception:
+                            pass
+                    conn = None
+                    with self._cond:
+                        self._next_due_epoch = time.time() + self.backoff_sec
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+                    if stopping and not self._buf:
+                        break
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.db_path()
+        db_pool.ensure_schema("notification_outbox", OUTBOX_SCHEMA_VERSION, ensure_outbox_schema, path)
+        conn = db_pool.open_connection(path)
+        with conn:
+            conn.execute(
+                "DELETE FROM notification_outbox WHERE status != ? AND created_epoch < ?",
+                (STATUS_PENDING, time.time() - _RETENTION_SEC),
+            )
+        return conn
+
+    def _persist(self, conn: sqlite3.Connection, batch: List[tuple]) -> None:
+        with conn:
+            conn.executemany(
+                "INSERT INTO notification_outbox (created_epoch, key, text, digestible, status, attempts, next_attempt_epoch) "
+                "VALUES (?,?,?,?,?,0,?)",
+                [(ts, key, text, co, STATUS_PENDING, ts) for ts, key, text, co in batch],
+            )
+
+    def _take_group(self, rows: List[tuple]) -> List[tuple]:
+        """
+        Leading rows that go out as one message: a non-coalescing row alone,
+        otherwise consecutive coalescing rows while the digest fits.
+        """
+        if not rows[0][2]:
+            return rows[:1]
+        group = [rows[0]]
+        size = len(rows[0][1]) + 16
+        for row in rows[1:]:
+            if not row[2]:
+                break
+            size += len(row[1]) + 3
+            if size > MAX_MESSAGE_CHARS:
+                break
+            group.append(row)
+        return group
+
+    def _deliver_due(self, conn: sqlite3.Connection) -> None:
+        while True:
+            now = time.time()
+            rows = conn.execute(
+                "SELECT id, text, digestible, attempts FROM notification_outbox "
+                "WHERE status=? AND next_attempt_epoch<=? ORDER BY id LIMIT ?",
+                (STATUS_PENDING, now, self.digest_max),
+            ).fetchall()
+            if not rows:
+                break
+            group = self._take_group(rows)
+            if len(group) == 1:
+                text = _truncate(group[0][1])
+            else:
+                text = build_digest([row[1] for row in group])
+            started = time.perf_counter()
+            try:
+                result = self._sender(text)
+            except Exception as exc:
+                result = SendResult(False, error=f"{type(exc).__name__}:{exc}")
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            if result.ok:
+                self._mark_sent(conn, group, elapsed_ms)
+                continue
+            self._mark_failed(conn, group, result)
+            break
+        row = conn.execute(
+            "SELECT COUNT(*), MIN(next_attempt_epoch) FROM notification_outbox WHERE status=?",
+            (STATUS_PENDING,),
+        ).fetchone()
+        with self._cond:
+            self._pending_rows = int(row[0] or 0)
+            self._next_due_epoch = float(row[1]) if row[1] is not None else None
+
+    def _mark_sent(self, conn: sqlite3.Connection, group: List[tuple], elapsed_ms: float) -> None:
+        now = time.time()
+        with conn:
+            conn.executemany(
+                "UPDATE notification_outbox SET status=?, sent_epoch=?, attempts=attempts+1, last_error=NULL WHERE id=?",
+                [(STATUS_SENT, now, row[0]) for row in group],
+            )
+        with self._cond:
+            self._sent_messages += 1
+            self._sent_rows += len(group)
+            if len(group) > 1:
+                self._digests += 1
+            self._last_send_ms = elapsed_ms
+
+    def _mark_failed(self, conn: sqlite3.Connection, group: List[tuple], result: SendResult) -> None:
+        now = time.time()
+        updates = []
+        given_up = 0
+        for row_id, _text, _co, attempts in group:
+            attempts = int(attempts or 0) + 1
+            if result.permanent or attempts >= self.max_attempts:
+                updates.append((STATUS_FAILED, attempts, None, result.error, row_id))
+                given_up += 1
+                continue
+            delay = min(self.backoff_max_sec, self.backoff_sec * (2 ** (attempts - 1)))
+            if result.retry_after is not None:
+                delay = max(delay, float(result.retry_after))
+            updates.append((STATUS_PENDING, attempts, now + delay, result.error, row_id))
+        with conn:
+            conn.executemany(
+                "UPDATE notification_outbox SET status=?, attempts=?, next_attempt_epoch=?, last_error=? WHERE id=?",
+                updates,
+            )
+        with self._cond:
+            self._retries += len(group) - given_up
+            self._failed_rows += given_up
+            self._last_error = result.error
+        if given_up:
+            try:
+                _ERROR_LOGGER.write(
+                    {
+                        "ts_epoch": now,
+                        "event": "OUTBOX_SEND_FAILED",
+                        "rows": given_up,
+                        "error": result.error,
+                    }
+                )
+            except Exception:
+                pass
+
+    def _log_error(self, event: str, exc: Exception, **extra: Any) -> None:
+        with self._cond:
+            self._last_error = f"{type(exc).__name__}:{exc}"
+        try:
+            payload = {"ts_epoch": time.time(), "event": event, "error": f"{type(exc).__name__}:{exc}"}
+            payload.update(extra)
+            _ERROR_LOGGER.write(payload)
+        except Exception:
+            pass
+
+
+_OUTBOXES: List[NotificationOutbox] = []
+
+
+def register(outbox: NotificationOutbox) -> NotificationOutbox:
+    """
+    Track a process-wide outbox so it is drained at interpreter exit.
+    """
+    _OUTBOXES.append(outbox)
+    return outbox
+
+
+def _shutdown_outboxes() -> None:
+    timeout = float(getattr(cfg, "TELEGRAM_TIMEOUT_SEC", 5.0)) + 1.0
+    for outbox in _OUTBOXES:
+        try:
+            outbox.stop(timeout=timeout)
+        except Exception:
+            pass
+
+
+atexit.register(_shutdown_outboxes)
@@ -1,12 +1,196 @@
-from collections import defaultdict, deque
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
+import math
+
+import numpy as np
+
 from config import config as cfg
+from core.indicators_live import IndicatorEngine
 from core.time_utils import IST_TZ, now_ist
 
+_FIELDS = ("ts", "open", "high", "low", "close", "volume")
+
+
+def _price_or_none(value):
+    return None if value is None or math.isnan(value) else value
+
+
+def _as_float(value):
+    if value is None:
+        return float("nan")
+    try:
+        return float(value)
+    except Exception:
+        return float("nan")
+
+
+def _row(cols, pos):
+    volume = cols["volume"][pos]
+    return {
+        "ts": datetime.fromtimestamp(float(cols["ts"][pos]), tz=IST_TZ),
+        "open": _price_or_none(float(cols["open"][pos])),
+        "high": _price_or_none(float(cols["high"][pos])),
+        "low": _price_or_none(float(cols["low"][pos])),
+        "close": _price_or_none(float(cols["close"][pos])),
+        "volume": int(volume) if float(volume).is_integer() else float(volume),
+    }
+
+
+class ColumnarBars:
+    """
+    Preallocated per-symbol bar store: one float64 column per field.
+
+    Columns are twice the capacity long; once the write cursor reaches the end
+    the last `capacity - 1` rows are moved back to the start, so the newest
+    rows are always one contiguous slice and `view()` never copies. The
+    current bar is updated in place. Indexing returns a plain bar dict, which
+    keeps the old deque-of-dicts callers working.
+    """
+
+    def __init__(self, capacity=500):
+        self.maxlen = max(int(capacity), 1)
+        self._cols = {name: np.empty(2 * self.maxlen, dtype=np.float64) for name in _FIELDS}
+        self._start = 0
+        self._end = 0
+        self.version = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __bool__(self):
+        return self._end > self._start
+
+    def _pos(self, idx):
+        n = self._end - self._start
+        if idx < 0:
+            idx += n
+        if idx < 0 or idx >= n:
+            raise IndexError("bar index out of range")
+        return self._start + idx
+
+    def row(self, pos):
+        return _row(self._cols, pos)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self.row(self._start + i) for i in range(*idx.indices(len(self)))]
+        return self.row(self._pos(idx))
+
+    def __iter__(self):
+        for pos in range(self._start, self._end):
+            yield self.row(pos)
+
+    def hlcv(self, idx):
+        """
+        (high, low, close, volume) floats for one bar without building a dict.
+        """
+        pos = self._pos(idx)
+        c = self._cols
+        return float(c["high"][pos]), float(c["low"][pos]), float(c["close"][pos]), float(c["volume"][pos])
+
+    def last_ts_epoch(self):
+        if self._end == self._start:
+            return None
+        return float(self._cols["ts"][self._end - 1])
+
+    def append(self, ts_epoch, open_, high, low, close, volume):
+        """
+        Append one bar; returns True when the oldest bar was evicted.
+        """
+        evicted = False
+        if self._end - self._start >= self.maxlen:
+            self._start += 1
+            evicted = True
+        if self._end >= 2 * self.maxlen:
+            keep = self._end - self._start
+            for col in self._cols.values():
+                col[:keep] = col[self._start : self._end]
+            self._start, self._end = 0, keep
+        pos = self._end
+        c = self._cols
+        c["ts"][pos] = ts_epoch
+        c["open"][pos] = _as_float(open_)
+        c["high"][pos] = _as_float(high)
+        c["low"][pos] = _as_float(low)
+        c["close"][pos] = _as_float(close)
+        c["volume"][pos] = float(volume or 0)
+        self._end += 1
+        self.version += 1
+        return evicted
+
+    def update_last(self, price, volume=0):
+        pos = self._end - 1
+        c = self._cols
+        if price > c["high"][pos]:
+            c["high"][pos] = price
+        if price < c["low"][pos]:
+            c["low"][pos] = price
+        c["close"][pos] = price
+        c["volume"][pos] += volume or 0
+        self.version += 1
+
+    def view(self, n=None):
+        """
+        Read-only NumPy views of the last n bars (all bars when n is None).
+        Views share memory with the store: consume them before further updates.
+        """
+        count = len(self) if n is None else max(0, min(int(n), len(self)))
+        out = {}
+        for name, col in self._cols.items():
+            v = col[self._end - count : self._end]
+            v.flags.writeable = False
+            out[name] = v
+        return out
+
+
+class BarWindow(Sequence):
+    """
+    Dict-row view of a ColumnarBars store as it was at creation.
+
+    The six columns are copied once (a few KB) so the window survives later
+    appends, evictions and compactions of the store; dicts are still only
+    built for the rows that are read.
+    """
+
+    __slots__ = ("store", "version", "_cols", "_len")
+
+    def __init__(self, store):
+        self.store = store
+        self.version = store.version
+        self._cols = {name: col[store._start : store._end].copy() for name, col in store._cols.items()}
+        self._len = len(store)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [_row(self._cols, i) for i in range(*idx.indices(self._len))]
+        if idx < 0:
+            idx += self._len
+        if idx < 0 or idx >= self._len:
+            raise IndexError("bar index out of range")
+        return _row(self._cols, idx)
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield _row(self._cols, i)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, BarWindow)):
+            return list(self) == list(other)
+        return NotImplemented
+
 
 class OhlcBuffer:
-    def __init__(self):
-        self._bars = defaultdict(lambda: deque(maxlen=getattr(cfg, "OHLC_BUFFER_MAX_BARS", 500)))
+    def __init__(self, max_bars=None):
+        self.max_bars = max_bars
+        self._bars = defaultdict(self._new_store)
+        self._engines = {}
+
+    def _new_store(self):
+        return ColumnarBars(self.max_bars or getattr(cfg, "OHLC_BUFFER_MAX_BARS", 500))
 
     def update_tick(self, symbol, price, volume=0, ts=None):
         if price is None:
@@ -17,28 +201,57 @@ class OhlcBuffer:
                 ts = datetime.fromtimestamp(ts, tz=IST_TZ)
             if isinstance(ts, datetime) and ts.tzinfo is None:
                 ts = ts.replace(tzinfo=IST_TZ)
-            bucket = ts.replace(second=0, microsecond=0)
+            bucket = ts.replace(second=0, microsecond=0).timestamp()
             bars = self._bars[symbol]
-            if bars and bars[-1]["ts"] == bucket:
-                bar = bars[-1]
-                bar["high"] = max(bar["high"], price)
-                bar["low"] = min(bar["low"], price)
-                bar["close"] = price
-                bar["volume"] += volume or 0
+            engine = self._engines.get(symbol)
+            if engine is not None and engine.bars is not bars:
+                engine = None
+            if bars and bars.last_ts_epoch() == bucket:
+                bars.update_last(price, volume)
+                if engine is not None:
+                    engine.on_bar_update()
             else:
-                bars.append({
-                    "ts": bucket,
-                    "open": price,
-                    "high": price,
-                    "low": price,
-                    "close": price,
-                    "volume": volume or 0,
-                })
+                evicted = bars.append(bucket, price, price, price, price, volume)
+                if engine is not None:
+                    engine.on_bar_append(evicted=evicted)
         except Exception:
             return
 
     def get_bars(self, symbol):
-        return list(self._bars.get(symbol, []))
+        """
+        Dict-row snapshot of the symbol's bars (compatibility adapter; one column copy, no per-bar dicts).
+        """
+        bars = self._bars.get(symbol)
+        if bars is None:
+            return []
+        return BarWindow(bars)
+
+    def window(self, symbol, n=None):
+        """
+        Zero-copy read-only column views of the last n bars.
+        """
+        bars = self._bars.get(symbol)
+        if bars is None:
+            return {name: np.empty(0, dtype=np.float64) for name in _FIELDS}
+        return bars.view(n)
+
+    def bar_count(self, symbol):
+        bars = self._bars.get(symbol)
+        return len(bars) if bars is not None else 0
+
+    def indicator_engine(self, symbol, vwap_window=20, atr_period=14, adx_period=14, vol_window=30, slope_window=10):
+        """
+        Incremental indicator engine bound to this symbol's bars (None when no bars exist).
+        """
+        bars = self._bars.get(symbol)
+        if bars is None:
+            return None
+        params = (vwap_window, atr_period, adx_period, vol_window, slope_window)
+        engine = self._engines.get(symbol)
+        if engine is None or not engine.matches(bars, params):
+            engine = IndicatorEngine(bars, *params)
+            self._engines[symbol] = engine
+        return engine
 
     def last_ts(self, symbol):
         bars = self._bars.get(symbol)
@@ -49,6 +262,9 @@ class OhlcBuffer:
     def seed_bars(self, symbol, bars):
         try:
             q = self._bars[symbol]
+            engine = self._engines.get(symbol)
+            if engine is not None:
+                engine.invalidate()
             for b in bars:
                 ts = b.get("date") or b.get("ts")
                 if not ts:
@@ -60,14 +276,14 @@ class OhlcBuffer:
                         continue
                 if isinstance(ts, datetime) and ts.tzinfo is None:
                     ts = ts.replace(tzinfo=IST_TZ)
-                q.append({
-                    "ts": ts.replace(second=0, microsecond=0),
-                    "open": b.get("open"),
-                    "high": b.get("high"),
-                    "low": b.get("low"),
-                    "close": b.get("close"),
-                    "volume": b.get("volume", 0) or 0,
-                })
+                q.append(
+                    ts.replace(second=0, microsecond=0).timestamp(),
+                    b.get("open"),
+                    b.get("high"),
+                    b.get("low"),
+                    b.get("close"),
+                    b.get("volume", 0) or 0,
+                )
         except Exception:
             return
 
@@ -10,7 +10,9 @@ from core.market_calendar import (
 )
 from core.market_context import derive_market_context
 from core.kite_client import kite_client
-from core.greeks import implied_vol, greeks
+from core.greeks import chain_greeks, implied_vol_batch
+from core.option_chain_frame import OptionChainFrame
+from core.snapshot_publisher import get_publisher
 from core.time_utils import compute_age_sec, now_utc_epoch
 
 def _infer_atm_strike(ltp, step):
@@ -20,6 +22,19 @@ def _infer_atm_strike(ltp, step):
 
 _PREV_OI = {}
 _PREV_LTP = {}
+_CHAIN_SNAPSHOT = get_publisher("data/option_chain_latest.json")
+_ANNOTATED_KEYS = (
+    "iv_z",
+    "iv_skew",
+    "iv_skew_norm",
+    "iv_surface_slope",
+    "iv_skew_curvature",
+    "iv_skew_curvature_call",
+    "iv_skew_curvature_put",
+    "oi_change",
+    "ltp_change",
+    "oi_build",
+)
 
 
 def _coerce_expiry_date(value):
@@ -47,99 +62,40 @@ def _choose_expiry(available_expiries, preferred_expiry):
     return _coerce_expiry_date(preferred_expiry)
 
 def _write_chain_snapshot(chain, symbol=None):
+    # Latest chain per symbol; written to disk by a debounced background
+    # writer, so the fetch path never does file I/O.
     try:
-        import json
-        from pathlib import Path
-        path = Path("data/option_chain_latest.json")
-        path.parent.mkdir(exist_ok=True)
-        if symbol:
-            payload = {}
-            if path.exists():
-                try:
-                    payload = json.loads(path.read_text())
-                except Exception:
-                    payload = {}
-            if not isinstance(payload, dict):
-                payload = {}
-            payload[str(symbol)] = chain
-            path.write_text(json.dumps(payload, default=str))
-        else:
-            path.write_text(json.dumps(chain, default=str))
+        if symbol is None and chain:
+            symbol = chain[0].get("symbol")
+        if symbol is None:
+            return
+        _CHAIN_SNAPSHOT.publish(symbol, [dict(opt) for opt in chain])
     except Exception:
         pass
 
 def _annotate_iv_oi(chain):
-    ivs = [c.get("iv") for c in chain if c.get("iv") is not None]
-    if ivs:
-        mean = sum(ivs) / len(ivs)
-        var = sum((x - mean) ** 2 for x in ivs) / max(1, len(ivs))
-        std = var ** 0.5 if var > 0 else 1.0
-    else:
-        mean, std = 0, 1
-
+    frame = OptionChainFrame.of(chain)
+    mean, std = frame.iv_stats()
     # IV skew: compare ATM call vs put IV
-    atm_iv_call = None
-    atm_iv_put = None
-    for c in chain:
-        if c.get("iv") is None:
-            continue
-        if c.get("moneyness", 0) == 0:
-            if c.get("type") == "CE":
-                atm_iv_call = c["iv"]
-            if c.get("type") == "PE":
-                atm_iv_put = c["iv"]
-    iv_skew = None
-    if atm_iv_call is not None and atm_iv_put is not None:
-        iv_skew = atm_iv_call - atm_iv_put
-
+    iv_skew = frame.atm_iv_skew()
     # IV surface slope: simple slope of IV vs moneyness
-    iv_pairs = [(c.get("moneyness", 0), c.get("iv")) for c in chain if c.get("iv") is not None]
-    iv_surface_slope = None
-    if len(iv_pairs) >= 3:
-        xs = [p[0] for p in iv_pairs]
-        ys = [p[1] for p in iv_pairs]
-        denom = sum(x * x for x in xs) or 1.0
-        iv_surface_slope = sum(x * y for x, y in zip(xs, ys)) / denom
+    iv_surface_slope = frame.iv_surface_slope()
+    # Skew curve fit (quadratic), chain-wide and per side
+    skew_curvature = frame.skew_curvature()
+    skew_curv_call = frame.skew_curvature("CE")
+    skew_curv_put = frame.skew_curvature("PE")
 
-    # Skew curve fit (quadratic)
-    try:
-        import numpy as np
-        if len(iv_pairs) >= 5:
-            xs = np.array([p[0] for p in iv_pairs])
-            ys = np.array([p[1] for p in iv_pairs])
-            coeffs = np.polyfit(xs, ys, 2)
-            skew_curvature = float(coeffs[0])
-        else:
-            skew_curvature = None
-    except Exception:
-        skew_curvature = None
-
-    # ATM-specific skew curves for calls and puts
-    skew_curv_call = None
-    skew_curv_put = None
-    try:
-        import numpy as np
-        call_pairs = [(c.get("moneyness", 0), c.get("iv")) for c in chain if c.get("iv") is not None and c.get("type") == "CE"]
-        put_pairs = [(c.get("moneyness", 0), c.get("iv")) for c in chain if c.get("iv") is not None and c.get("type") == "PE"]
-        if len(call_pairs) >= 5:
-            xs = np.array([p[0] for p in call_pairs])
-            ys = np.array([p[1] for p in call_pairs])
-            skew_curv_call = float(np.polyfit(xs, ys, 2)[0])
-        if len(put_pairs) >= 5:
-            xs = np.array([p[0] for p in put_pairs])
-            ys = np.array([p[1] for p in put_pairs])
-            skew_curv_put = float(np.polyfit(xs, ys, 2)[0])
-    except Exception:
-        pass
-
-    for c in chain:
-        iv = c.get("iv")
+    for c, iv, dte, token in zip(
+        frame,
+        frame.values("iv"),
+        frame.values("days_to_expiry", 1),
+        frame.values("instrument_token"),
+    ):
         if iv is not None:
             c["iv_z"] = (iv - mean) / std if std else 0
         if iv_skew is not None:
             c["iv_skew"] = iv_skew
             # Normalize by expiry (sqrt time)
-            dte = c.get("days_to_expiry", 1)
             norm = (dte / 365.0) ** 0.5 if dte else 1.0
             c["iv_skew_norm"] = iv_skew / norm if norm else iv_skew
         if iv_surface_slope is not None:
@@ -151,7 +107,6 @@ def _annotate_iv_oi(chain):
         if skew_curv_put is not None:
             c["iv_skew_curvature_put"] = skew_curv_put
 
-        token = c.get("instrument_token")
         if token is not None:
             prev = _PREV_OI.get(token)
             c["oi_change"] = (c.get("oi", 0) - prev) if prev is not None else 0
@@ -173,7 +128,68 @@ def _annotate_iv_oi(chain):
                 c["oi_build"] = "LONG_LIQ"
             else:
                 c["oi_build"] = "FLAT"
-    return chain
+    frame.invalidate(*_ANNOTATED_KEYS)
+    return frame
+
+
+def synthetic_option_chain(symbol, ltp, strikes_around=None, expiry=None, source="synthetic_offhours", timestamp=None):
+    """
+    Synthetic ATM-centred chain built from `ltp` alone: no broker calls,
+    no snapshot publishing. Backtests call this directly with the bar time
+    as `timestamp`.
+    """
+    step_map = getattr(cfg, "STRIKE_STEP_BY_SYMBOL", {})
+    step = step_map.get(symbol, getattr(cfg, "STRIKE_STEP", 50))
+    if strikes_around is None:
+        per_sym = getattr(cfg, "STRIKES_AROUND_BY_SYMBOL", {})
+        strikes_around = per_sym.get(symbol, getattr(cfg, "STRIKES_AROUND", 6))
+    atm = _infer_atm_strike(ltp, step)
+    if atm is None:
+        return []
+    min_prem = getattr(cfg, "MIN_PREMIUM", 40)
+    max_prem = getattr(cfg, "MAX_PREMIUM", 150)
+    expiry = str(expiry or date.today())
+    row = {
+        "volume": 1000,
+        "oi": 0,
+        "quote_ok": True,
+        "quote_source": source,
+        "quote_live": False,
+        "chain_source": source,
+        "instrument_token": None,
+        "moneyness": 0,
+        "days_to_expiry": 1,
+        "expiry": expiry,
+        "timestamp": timestamp if timestamp is not None else datetime.now().timestamp(),
+        "planning_only": True,
+    }
+    # Simple premium proxy
+    base = max(min_prem, min(max_prem, (ltp * 0.004)))
+    chain = []
+    # The premium depends only on the distance from ATM; price each distance once.
+    quotes = {}
+    for i in range(-strikes_around, strikes_around + 1):
+        strike = atm + i * step
+        dist = abs(strike - atm)
+        quote = quotes.get(dist)
+        if quote is None:
+            ltp_opt = max(min_prem, min(max_prem, base * (1 + (dist / (10 * step)))))
+            quote = quotes[dist] = (round(ltp_opt, 2), round(ltp_opt * 0.995, 2), round(ltp_opt * 1.005, 2))
+        price, bid, ask = quote
+        for opt_type in ("CE", "PE"):
+            chain.append({
+                "symbol": symbol,
+                "strike": strike,
+                "type": opt_type,
+                "ltp": price,
+                "bid": bid,
+                "ask": ask,
+                **row,
+            })
+    # Synthetic rows carry no iv or instrument_token, so _annotate_iv_oi
+    # would add nothing.
+    return OptionChainFrame(chain)
+
 
 def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool = False, market_context: dict | None = None):
     """
@@ -206,11 +222,6 @@ def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool =
             return []
 
         expiry_type = getattr(cfg, "TERM_STRUCTURE_EXPIRY", "WEEKLY")
-        def _exp_str(x):
-            try:
-                return str(_coerce_expiry_date(x) or x)
-            except Exception:
-                return ""
         # Exchange-provided expiries are source of truth.
         exchange = "BFO" if symbol.upper() == "SENSEX" else "NFO"
         fallback_expiry = kite_client.next_available_expiry(symbol, exchange=exchange)
@@ -227,35 +238,19 @@ def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool =
         if not force_synthetic:
             kite_client.ensure()
         if (not force_synthetic) and cfg.KITE_USE_API and kite_client.kite:
-            instruments = kite_client.instruments_cached(exchange, ttl_sec=getattr(cfg, "KITE_INSTRUMENTS_TTL", 3600))
-            if not instruments:
+            index = kite_client.instrument_index(exchange)
+            if not index.size:
                 raise ValueError("No instruments loaded")
             seg_name = "BFO-OPT" if exchange == "BFO" else "NFO-OPT"
-            symbol_instruments = [
-                inst
-                for inst in instruments
-                if inst.get("name") == symbol and inst.get("segment") == seg_name
-            ]
+            symbol_instruments = index.rows(symbol, seg_name)
             if symbol.upper() == "SENSEX" and not symbol_instruments:
                 print(
                     "[OPTION_CHAIN_WARN]"
                     f" symbol={symbol} exchange={exchange} segment={seg_name} instruments=0 -> unsupported, skipping"
                 )
                 return []
-            available_expiries = sorted(
-                {
-                    str(exp)
-                    for exp in (
-                        _coerce_expiry_date(inst.get("expiry"))
-                        for inst in symbol_instruments
-                    )
-                    if exp is not None
-                }
-            )
-            expiry_date = _choose_expiry(
-                [inst.get("expiry") for inst in symbol_instruments],
-                fallback_expiry,
-            )
+            available_expiries = [str(exp) for exp in index.expiries(symbol, seg_name)]
+            expiry_date = _choose_expiry(index.expiries(symbol, seg_name), fallback_expiry)
             if symbol.upper() in {"NIFTY", "BANKNIFTY", "SENSEX"}:
                 print(
                     "[OPTION_CHAIN_DEBUG]"
@@ -270,49 +265,38 @@ def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool =
             if expiry_date is None:
                 raise ValueError(f"No expiry available for {symbol}")
             next_exp = next_expiry_after(expiry_date, expiry_type=expiry_type, symbol=symbol) if expiry_date else None
-            expiry_date_str = _exp_str(expiry_date)
-            opt_rows = []
-            for inst in symbol_instruments:
-                if _exp_str(inst.get("expiry")) != expiry_date_str:
-                    continue
-                strike = inst.get("strike")
-                if strike is None:
-                    continue
-                if abs(strike - atm) > strikes_around * step:
-                    continue
-                opt_rows.append(inst)
+            window = strikes_around * step
+            expiry_group = index.group(symbol, seg_name, expiry_date)
+            opt_rows = expiry_group.window(atm - window, atm + window) if expiry_group else []
 
             # Fallback: if strict ATM window is empty, choose nearest strikes by distance to ATM.
-            if not opt_rows:
-                expiry_rows = [
-                    inst for inst in symbol_instruments
-                    if _exp_str(inst.get("expiry")) == expiry_date_str and inst.get("strike") is not None
-                ]
-                if expiry_rows:
-                    unique_strikes = sorted({float(inst.get("strike")) for inst in expiry_rows})
-                    nearest = sorted(unique_strikes, key=lambda strike: abs(strike - atm))[: (2 * strikes_around + 1)]
-                    nearest_set = set(nearest)
-                    opt_rows = [inst for inst in expiry_rows if float(inst.get("strike")) in nearest_set]
+            if not opt_rows and expiry_group:
+                opt_rows = expiry_group.nearest(atm, 2 * strikes_around + 1)
 
             tradingsymbols = [f"{exchange}:{c['tradingsymbol']}" for c in opt_rows]
             # For term structure, collect next expiry too
             next_candidates = []
             if cfg.ENABLE_TERM_STRUCTURE and next_exp:
-                for inst in symbol_instruments:
-                    if _exp_str(inst.get("expiry")) != _exp_str(next_exp):
-                        continue
-                    strike = inst.get("strike")
-                    if strike is None:
-                        continue
-                    if abs(strike - atm) > strikes_around * step:
-                        continue
-                    next_candidates.append(inst)
+                next_candidates = index.strike_window(symbol, seg_name, next_exp, atm - window, atm + window)
                 tradingsymbols += [f"{exchange}:{c['tradingsymbol']}" for c in next_candidates]
             quotes = kite_client.quote(tradingsymbols) if tradingsymbols else {}
             if not opt_rows or not quotes:
                 raise ValueError("No option quotes available")
+            dte = max((expiry_date - date.today()).days, 1)
+            t = dte / 365.0
+            opt_prices = [
+                quotes.get(f"{exchange}:{inst['tradingsymbol']}", {}).get("last_price", 0) or 0
+                for inst in opt_rows
+            ]
+            row_greeks = chain_greeks(
+                opt_prices,
+                ltp,
+                [inst["strike"] for inst in opt_rows],
+                t,
+                [inst.get("instrument_type") == "CE" for inst in opt_rows],
+            )
             chain = []
-            for inst in opt_rows:
+            for row_idx, inst in enumerate(opt_rows):
                 ts = f"{exchange}:{inst['tradingsymbol']}"
                 q = quotes.get(ts, {})
                 ltp_opt = q.get("last_price", 0) or 0
@@ -365,14 +349,11 @@ def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool =
                         spread_pct = (ask - bid) / base
                 volume = q.get("volume", 0)
                 oi = q.get("oi", 0)
-                dte = max((expiry_date - date.today()).days, 1)
-                t = dte / 365.0
-                is_call = inst.get("instrument_type") == "CE"
                 vol = None
                 g = {}
                 if ltp_opt and ltp_opt > 0:
-                    vol = implied_vol(ltp_opt, ltp, inst["strike"], t, is_call=is_call)
-                    g = greeks(ltp, inst["strike"], t, vol, is_call=is_call)
+                    vol = float(row_greeks["iv"][row_idx])
+                    g = {name: float(row_greeks[name][row_idx]) for name in ("delta", "gamma", "theta", "vega")}
                 moneyness = 0
                 if ltp and inst["strike"]:
                     moneyness = (ltp - inst["strike"]) / ltp
@@ -406,18 +387,22 @@ def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool =
                 })
             # term structure iv: compare with next expiry for same strike/type
             if cfg.ENABLE_TERM_STRUCTURE and next_candidates:
+                next_prices = [
+                    quotes.get(f"{exchange}:{inst['tradingsymbol']}", {}).get("last_price", 0) or 0
+                    for inst in next_candidates
+                ]
+                next_ivs = implied_vol_batch(
+                    next_prices,
+                    ltp,
+                    [inst["strike"] for inst in next_candidates],
+                    max((next_exp - date.today()).days, 1) / 365.0,
+                    [inst.get("instrument_type") == "CE" for inst in next_candidates],
+                )
                 next_iv_map = {}
-                for inst in next_candidates:
-                    ts = f"{exchange}:{inst['tradingsymbol']}"
-                    q = quotes.get(ts, {})
-                    ltp_opt = q.get("last_price", 0)
+                for inst, ltp_opt, iv in zip(next_candidates, next_prices, next_ivs):
                     if ltp_opt <= 0:
                         continue
-                    is_call = inst.get("instrument_type") == "CE"
-                    dte = max((next_exp - date.today()).days, 1)
-                    t = dte / 365.0
-                    iv = implied_vol(ltp_opt, ltp, inst["strike"], t, is_call=is_call)
-                    next_iv_map[(inst["strike"], inst.get("instrument_type"))] = iv
+                    next_iv_map[(inst["strike"], inst.get("instrument_type"))] = float(iv)
                 for c in chain:
                     key = (c["strike"], c["type"])
                     if key in next_iv_map:
@@ -429,37 +414,13 @@ def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool =
             return chain
         if not getattr(cfg, "ALLOW_SYNTHETIC_CHAIN", False):
             return []
-        chain = []
-        synthetic_expiry = str(_coerce_expiry_date(fallback_expiry) or date.today())
-        strikes = [atm + i * step for i in range(-strikes_around, strikes_around + 1)]
-        for strike in strikes:
-            for opt_type in ("CE", "PE"):
-                # Simple premium proxy
-                base = max(min_prem, min(max_prem, (ltp * 0.004)))
-                ltp_opt = max(min_prem, min(max_prem, base * (1 + (abs(strike - atm) / (10 * step)))))
-                bid = round(ltp_opt * 0.995, 2)
-                ask = round(ltp_opt * 1.005, 2)
-                chain.append({
-                        "symbol": symbol,
-                        "strike": strike,
-                        "type": opt_type,
-                        "ltp": round(ltp_opt, 2),
-                        "bid": bid,
-                        "ask": ask,
-                        "volume": 1000,
-                        "oi": 0,
-                        "quote_ok": True,
-                        "quote_source": synthetic_chain_source,
-                        "quote_live": False,
-                        "chain_source": synthetic_chain_source,
-                        "instrument_token": None,
-                        "moneyness": 0,
-                        "days_to_expiry": 1,
-                        "expiry": synthetic_expiry,
-                        "timestamp": datetime.now().timestamp(),
-                        "planning_only": True,
-                    })
-        chain = _annotate_iv_oi(chain)
+        chain = synthetic_option_chain(
+            symbol,
+            ltp,
+            strikes_around=strikes_around,
+            expiry=str(_coerce_expiry_date(fallback_expiry) or date.today()),
+            source=synthetic_chain_source,
+        )
         _write_chain_snapshot(chain, symbol=symbol)
         return chain
     except Exception as e:
@@ -471,42 +432,15 @@ def fetch_option_chain(symbol, ltp, strikes_around=None, force_synthetic: bool =
                 return []
             if not getattr(cfg, "ALLOW_SYNTHETIC_CHAIN", False):
                 return []
-            step_map = getattr(cfg, "STRIKE_STEP_BY_SYMBOL", {})
-            step = step_map.get(symbol, getattr(cfg, "STRIKE_STEP", 50))
-            atm = _infer_atm_strike(ltp, step)
-            if atm is None:
+            chain = synthetic_option_chain(
+                symbol,
+                ltp,
+                strikes_around=strikes_around,
+                expiry=str(datetime.now().date()),
+                source=synthetic_chain_source,
+            )
+            if not chain:
                 return []
-            min_prem = getattr(cfg, "MIN_PREMIUM", 40)
-            max_prem = getattr(cfg, "MAX_PREMIUM", 150)
-            strikes = [atm + i * step for i in range(-strikes_around, strikes_around + 1)]
-            chain = []
-            for strike in strikes:
-                for opt_type in ("CE", "PE"):
-                    base = max(min_prem, min(max_prem, (ltp * 0.004)))
-                    ltp_opt = max(min_prem, min(max_prem, base * (1 + (abs(strike - atm) / (10 * step)))))
-                    bid = round(ltp_opt * 0.995, 2)
-                    ask = round(ltp_opt * 1.005, 2)
-                    chain.append({
-                        "symbol": symbol,
-                        "strike": strike,
-                        "type": opt_type,
-                        "ltp": round(ltp_opt, 2),
-                        "bid": bid,
-                        "ask": ask,
-                        "volume": 1000,
-                        "oi": 0,
-                        "quote_ok": True,
-                        "quote_source": synthetic_chain_source,
-                        "quote_live": False,
-                        "chain_source": synthetic_chain_source,
-                        "instrument_token": None,
-                        "moneyness": 0,
-                        "days_to_expiry": 1,
-                        "expiry": str(datetime.now().date()),
-                        "timestamp": datetime.now().timestamp(),
-                        "planning_only": True,
-                    })
-            chain = _annotate_iv_oi(chain)
             _write_chain_snapshot(chain, symbol=symbol)
             return chain
         except Exception:
@@ -0,0 +1,306 @@
+"""
+Column-wise view of one option-chain snapshot.
+
+OptionChainFrame is still a list of option dicts, so every existing consumer
+(json snapshots, tests, `for opt in chain`) keeps working. On top of the rows
+it caches per-field columns, a token -> row and (strike, type) -> row index,
+and chain aggregates (IV stats, skew curves, OI sums), all built on first use.
+One frame is built per symbol per cycle and handed from the chain fetch to
+fetch_live_market_data, TradeBuilder and the open-trade monitor, so each of
+them reads the same columns instead of rescanning the dicts.
+
+Rows are shared dicts. Code that writes a field into the rows after columns
+were read must call `invalidate(key)` (or use `set_column`); list mutations
+drop every cache.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_MISSING = object()
+
+_INDEX_KEYS = ("instrument_token", "strike", "type")
+
+
+class OptionChainFrame(list):
+    """
+    Option chain rows plus lazily built columns, indexes and aggregates.
+    """
+
+    def __init__(self, rows: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        super().__init__(rows or [])
+        self._reset()
+
+    @classmethod
+    def of(cls, chain: Optional[Iterable[Dict[str, Any]]]) -> "OptionChainFrame":
+        """
+        Return `chain` itself if it is already a frame, so caches are shared.
+        """
+        if isinstance(chain, cls):
+            return chain
+        return cls(chain)
+
+    def _reset(self) -> None:
+        self._cache: Dict[Any, Any] = {}
+        self._aggs: Dict[Tuple[Any, ...], Any] = {}
+        self._token_index: Optional[Dict[Any, int]] = None
+        self._strike_type_index: Optional[Dict[Tuple[Any, Any], int]] = None
+
+    # Pickles and deep copies carry the rows only; caches are rebuilt on use.
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state) -> None:
+        self._reset()
+
+    def invalidate(self, *keys: str) -> None:
+        """
+        Drop cached columns for `keys` (all columns when none are given).
+        Aggregates are always dropped.
+        """
+        self._aggs.clear()
+        if not keys:
+            self._reset()
+            return
+        drop = set(keys)
+        for ck in list(self._cache):
+            name = ck[1] if isinstance(ck, tuple) else ck
+            if name in drop:
+                del self._cache[ck]
+        if drop.intersection(_INDEX_KEYS):
+            self._token_index = None
+            self._strike_type_index = None
+
+    def set_column(self, key: str, values: Iterable[Any]) -> None:
+        """
+        Write one value per row into the row dicts and refresh the column.
+        """
+        for opt, value in zip(self, values):
+            opt[key] = value
+        self.invalidate(key)
+
+    # -- columns -----------------------------------------------------------
+
+    def _raw(self, key: str) -> List[Any]:
+        # One dict lookup per row and key; absent keys read as _MISSING.
+        out = self._cache.get(key)
+        if out is None:
+            out = [opt.get(key, _MISSING) for opt in self]
+            self._cache[key] = out
+        return out
+
+    def values(self, key: str, default: Any = None) -> List[Any]:
+        return [default if v is _MISSING else v for v in self._raw(key)]
+
+    def num(self, key: str, default: Any = None, none: float = np.nan) -> np.ndarray:
+        """
+        Float column; missing keys take `default`, None values become `none`.
+        """
+        ck = ("num", key, default, none)
+        out = self._cache.get(ck)
+        if out is None:
+            missing = none if default is None else default
+            out = np.array(
+                [none if v is None else (missing if v is _MISSING else v) for v in self._raw(key)],
+                dtype=float,
+            )
+            self._cache[ck] = out
+        return out
+
+    def is_none(self, key: str) -> np.ndarray:
+        return np.array([v is None or v is _MISSING for v in self._raw(key)], dtype=bool)
+
+    def is_false(self, key: str) -> np.ndarray:
+        return np.array([v is False for v in self._raw(key)], dtype=bool)
+
+    def truthy(self, key: str, default: Any = None) -> np.ndarray:
+        if_missing = bool(default)
+        return np.array([if_missing if v is _MISSING else bool(v) for v in self._raw(key)], dtype=bool)
+
+    def equals(self, key: str, value: Any) -> np.ndarray:
+        return np.array([v is not _MISSING and v == value for v in self._raw(key)], dtype=bool)
+
+    # -- indexes -----------------------------------------------------------
+
+    def index_of_token(self, token: Any) -> Optional[int]:
+        """
+        Row of the first option with this instrument_token.
+        """
+        if self._token_index is None:
+            index: Dict[Any, int] = {}
+            for row, tok in enumerate(self._raw("instrument_token")):
+                if tok is not None and tok is not _MISSING:
+                    index.setdefault(tok, row)
+            self._token_index = index
+        return self._token_index.get(token)
+
+    def index_of(self, strike: Any, opt_type: Any) -> Optional[int]:
+        """
+        Row of the first option with this strike and type.
+        """
+        if self._strike_type_index is None:
+            index: Dict[Tuple[Any, Any], int] = {}
+            types = self._raw("type")
+            for row, strike_v in enumerate(self._raw("strike")):
+                type_v = types[row]
+                index.setdefault(
+                    (None if strike_v is _MISSING else strike_v, None if type_v is _MISSING else type_v),
+                    row,
+                )
+            self._strike_type_index = index
+        return self._strike_type_index.get((strike, opt_type))
+
+    def by_token(self, token: Any) -> Optional[Dict[str, Any]]:
+        row = self.index_of_token(token)
+        return None if row is None else self[row]
+
+    def find(self, strike: Any, opt_type: Any) -> Optional[Dict[str, Any]]:
+        """
+        First row with this strike and type, as a linear scan would return.
+        """
+        row = self.index_of(strike, opt_type)
+        return None if row is None else self[row]
+
+    # -- aggregates --------------------------------------------------------
+
+    def _agg(self, key: Tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+        if key not in self._aggs:
+            self._aggs[key] = compute()
+        return self._aggs[key]
+
+    def iv_values(self, opt_type: Optional[str] = None) -> List[float]:
+        """
+        Non-null IVs in chain order, optionally for one option type.
+        """
+
+        def compute():
+            ivs = self._raw("iv")
+            if opt_type is None:
+                return [v for v in ivs if v is not None and v is not _MISSING]
+            types = self._raw("type")
+            return [v for v, t in zip(ivs, types) if v is not None and v is not _MISSING and t == opt_type]
+
+        return self._agg(("iv_values", opt_type), compute)
+
+    def iv_mean(self, opt_type: Optional[str] = None) -> float:
+        ivs = self.iv_values(opt_type)
+        return sum(ivs) / len(ivs) if ivs else 0
+
+    def iv_stats(self) -> Tuple[float, float]:
+        """
+        (mean, std) of chain IV; (0, 1) when no IV, std 1.0 for a flat chain.
+        """
+
+        def compute():
+            ivs = self.iv_values()
+            if not ivs:
+                return 0, 1
+            mean = sum(ivs) / len(ivs)
+            var = sum((x - mean) ** 2 for x in ivs) / max(1, len(ivs))
+            return mean, (var ** 0.5 if var > 0 else 1.0)
+
+        return self._agg(("iv_stats",), compute)
+
+    def _iv_pairs(self, opt_type: Optional[str] = None) -> Tuple[List[Any], List[float]]:
+        # (moneyness, iv) for rows with IV; missing moneyness reads as 0.
+        def compute():
+            ivs = self._raw("iv")
+            mny = self._raw("moneyness")
+            types = self._raw("type")
+            xs, ys = [], []
+            for m, v, t in zip(mny, ivs, types):
+                if v is None or v is _MISSING or (opt_type is not None and t != opt_type):
+                    continue
+                xs.append(0 if m is _MISSING else m)
+                ys.append(v)
+            return xs, ys
+
+        return self._agg(("iv_pairs", opt_type), compute)
+
+    def atm_iv_skew(self) -> Optional[float]:
+        """
+        ATM call IV minus ATM put IV (last ATM row of each type wins).
+        """
+
+        def compute():
+            call = put = None
+            for m, v, t in zip(self._raw("moneyness"), self._raw("iv"), self._raw("type")):
+                if v is None or v is _MISSING:
+                    continue
+                if (0 if m is _MISSING else m) == 0:
+                    if t == "CE":
+                        call = v
+                    if t == "PE":
+                        put = v
+            if call is not None and put is not None:
+                return call - put
+            return None
+
+        return self._agg(("atm_iv_skew",), compute)
+
+    def iv_surface_slope(self) -> Optional[float]:
+        """
+        Least-squares slope through the origin of IV against moneyness.
+        """
+
+        def compute():
+            xs, ys = self._iv_pairs()
+            if len(xs) < 3:
+                return None
+            denom = sum(x * x for x in xs) or 1.0
+            return sum(x * y for x, y in zip(xs, ys)) / denom
+
+        return self._agg(("iv_surface_slope",), compute)
+
+    def skew_curvature(self, opt_type: Optional[str] = None) -> Optional[float]:
+        """
+        Quadratic coefficient of IV vs moneyness; needs at least 5 points.
+        """
+
+        def compute():
+            xs, ys = self._iv_pairs(opt_type)
+            if len(xs) < 5:
+                return None
+            try:
+                return float(np.polyfit(np.array(xs), np.array(ys), 2)[0])
+            except Exception:
+                return None
+
+        return self._agg(("skew_curvature", opt_type), compute)
+
+    def sum_of(self, key: str, opt_type: Optional[str] = None) -> Any:
+        """
+        Sum of a field with missing/None/0 read as 0, optionally per type.
+        """
+
+        def compute():
+            vals = self._raw(key)
+            if opt_type is not None:
+                vals = [v for v, t in zip(vals, self._raw("type")) if t == opt_type]
+            return sum([0 if v is _MISSING else (v or 0) for v in vals])
+
+        return self._agg(("sum_of", key, opt_type), compute)
+
+
+def _mutator(name: str):
+    base = getattr(list, name)
+
+    def method(self, *args, **kwargs):
+        out = base(self, *args, **kwargs)
+        self._reset()
+        return out
+
+    method.__name__ = name
+    method.__doc__ = base.__doc__
+    return method
+
+
+for _name in (
+    "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+):
+    setattr(OptionChainFrame, _name, _mutator(_name))
+del _name
@@ -8,7 +8,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 from dataclasses import replace
 from strategies.trade_builder import TradeBuilder
-from core.market_data import fetch_live_market_data, ensure_startup_warmup_bootstrap
+from core.market_data import fetch_live_market_data, ensure_startup_warmup_bootstrap, last_cycle_timings
 from core.risk_engine import RiskEngine
 from core.execution_guard import ExecutionGuard
 from core.trade_logger import log_trade, update_trade_outcome, update_trade_fill
@@ -41,6 +41,7 @@ from core.review_queue import add_to_queue, approval_status, order_payload_hash,
 from core.blocked_tracker import BlockedTradeTracker
 from core.trade_store import insert_execution_stat, update_trailing_state, insert_trail_event, insert_trade_leg, update_trade_close
 from core.depth_store import depth_store
+from core.option_chain_frame import OptionChainFrame
 from core.kite_depth_ws import start_depth_ws, restart_depth_ws
 from core.auto_tune import maybe_auto_tune
 from core import risk_halt
@@ -75,8 +76,20 @@ from core.decision_dag import (
     evaluate_decision,
 )
 from core.decision_side_effects import handle_post_decision_side_effects
+from core.lazy_init import LazyAttribute, warm_attributes
+from core.config_service import config_service
 
 class Orchestrator:
+    # ML components load models (xgboost, optional TensorFlow) when built, so they
+    # are constructed on first use or by the warm-up thread, not before the first fetch.
+    predictor = LazyAttribute(lambda self: TradePredictor())
+    trade_builder = LazyAttribute(
+        lambda self: TradeBuilder(self.predictor, self.execution_engine, strategy_tracker=self.strategy_tracker)
+    )
+    retrainer = LazyAttribute(
+        lambda self: AutoRetrain(self.predictor, risk_state=self.risk_state, strategy_tracker=self.strategy_tracker)
+    )
+
     def __init__(self, total_capital=100000, poll_interval=30, start_depth_ws_enabled=True):
         """
         Main orchestrator initializing all components
@@ -95,12 +108,10 @@ class Orchestrator:
         # Unified RiskState
         self.risk_state = RiskState(start_capital=total_capital)
 
-        # Phase C: Trade generation
-        self.predictor = TradePredictor()
+        # Phase C: Trade generation (predictor/trade_builder are lazy, see class attributes)
         self.execution_engine = ExecutionEngine()
         self.execution_router = ExecutionRouter()
         self.gatekeeper = StrategyGatekeeper()
-        self.trade_builder = None
 
         # Phase B: Risk and execution
         self.risk_engine = RiskEngine(risk_state=self.risk_state)
@@ -110,8 +121,6 @@ class Orchestrator:
         # Phase F: Strategy tracking + Auto-retraining
         self.strategy_tracker = StrategyTracker()
         self.strategy_tracker.load("logs/strategy_perf.json")
-        self.trade_builder = TradeBuilder(self.predictor, self.execution_engine, strategy_tracker=self.strategy_tracker)
-        self.retrainer = AutoRetrain(self.predictor, risk_state=self.risk_state, strategy_tracker=self.strategy_tracker)
         self.strategy_allocator = StrategyAllocator(self.strategy_tracker, risk_state=self.risk_state)
         self.meta_model = MetaModel() if getattr(cfg, "META_MODEL_ENABLED", False) else None
         self.open_trades = {}
@@ -177,6 +186,8 @@ class Orchestrator:
         self.eps_history = []
         self._load_suggestion_eval()
         self.rl_size_agent = SizeRLAgent(cfg.RL_SIZE_MODEL_PATH) if getattr(cfg, "RL_ENABLED", False) else None
+        if getattr(cfg, "STARTUP_WARM_ML", True):
+            warm_attributes(self, ("predictor", "trade_builder", "retrainer"), thread_name="orchestrator-warm")
 
     def _infer_opt_type(self, trade_id: str | None):
         if not trade_id:
@@ -821,6 +832,7 @@ class Orchestrator:
         Fetch market data, generate trades, risk-check, execute, log, alert
         """
         print("[Orchestrator] Starting live monitoring...")
+        ccfg = config_service.current()
         while True:
             cycle_reason = "cycle_complete"
             self._decision_traces = []
@@ -828,18 +840,14 @@ class Orchestrator:
             self._gatekeeper_cycle_cache = {}
             self._gate_status_cycle_id = f"{int(now_utc_epoch() * 1000)}"
             try:
-                # Hot-reload config to pick up FORCE_REGIME changes
-                try:
-                    import importlib
-                    from config import config as cfg
-                    importlib.reload(cfg)
-                except Exception:
-                    pass
-                if getattr(cfg, "KILL_SWITCH", False):
+                # Pick up config.py/.env edits (FORCE_REGIME, KILL_SWITCH, ...) and read
+                # this cycle's settings from one immutable snapshot.
+                ccfg = config_service.refresh()
+                if ccfg.get("KILL_SWITCH", False):
                     try:
                         self._log_decision_safe(self._build_decision_event(None, {"symbol": "GLOBAL"}, gatekeeper_allowed=False, veto_reasons=["kill_switch"]))
-                        audit_append({"event": "KILL_SWITCH", "desk_id": getattr(cfg, "DESK_ID", "DEFAULT")})
-                        create_incident("SEV1", "KILL_SWITCH", {"desk_id": getattr(cfg, "DESK_ID", "DEFAULT")})
+                        audit_append({"event": "KILL_SWITCH", "desk_id": ccfg.get("DESK_ID", "DEFAULT")})
+                        create_incident("SEV1", "KILL_SWITCH", {"desk_id": ccfg.get("DESK_ID", "DEFAULT")})
                     except Exception:
                         pass
                     time.sleep(self.poll_interval)
@@ -857,7 +865,11 @@ class Orchestrator:
                 # immutable market snapshot. Do not recompute readiness here.
                 # Daily decay report / strategy gating
                 self._refresh_decay_report()
-                market_data_list = self._build_cycle_market_data(fetch_live_market_data())
+                market_data_list = self._build_cycle_market_data(
+                    orchestrator_data.fetch_market_data_timed(
+                        fetch_live_market_data, kite_client, timings_fn=last_cycle_timings
+                    )
+                )
                 self._update_pilot_unlock_clean_cycles()
                 self._evaluate_suggestions(market_data_list)
                 try:
@@ -905,9 +917,9 @@ class Orchestrator:
                 except Exception:
                     pass
 
-                max_trades_day = getattr(cfg, "MAX_TRADES_PER_DAY", 0)
-                if getattr(cfg, "LIVE_PILOT_MODE", False):
-                    max_trades_day = min(max_trades_day, int(getattr(cfg, "LIVE_MAX_TRADES_PER_DAY", 2)))
+                max_trades_day = ccfg.get("MAX_TRADES_PER_DAY", 0)
+                if ccfg.get("LIVE_PILOT_MODE", False):
+                    max_trades_day = min(max_trades_day, int(ccfg.get("LIVE_MAX_TRADES_PER_DAY", 2)))
 
                 for market_data in market_data_list:
                     market_snapshot = self._immutable_cycle_snapshot(market_data)
@@ -928,7 +940,7 @@ class Orchestrator:
                         try:
                             event = self._build_decision_event(None, market_data, gatekeeper_allowed=False, veto_reasons=["hard_halt"])
                             self._log_decision_safe(event)
-                            audit_append({"event": "HARD_HALT", "symbol": market_data.get("symbol"), "desk_id": getattr(cfg, "DESK_ID", "DEFAULT")})
+                            audit_append({"event": "HARD_HALT", "symbol": market_data.get("symbol"), "desk_id": ccfg.get("DESK_ID", "DEFAULT")})
                             create_incident("SEV1", "HARD_HALT", {"symbol": market_data.get("symbol")})
                         except Exception:
                             pass
@@ -940,7 +952,7 @@ class Orchestrator:
                         except Exception:
                             pass
                         continue
-                    if getattr(cfg, "LIVE_PILOT_MODE", False):
+                    if ccfg.get("LIVE_PILOT_MODE", False):
                         ok, reasons = self._pilot_checks()
                         if not ok:
                             try:
@@ -951,7 +963,7 @@ class Orchestrator:
                             continue
                     self._sync_trades()
                     sym = market_data.get("symbol")
-                    if sym and sym.upper() in getattr(cfg, "HALT_SYMBOLS", []):
+                    if sym and sym.upper() in ccfg.get("HALT_SYMBOLS", []):
                         try:
                             event = self._build_decision_event(None, market_data, gatekeeper_allowed=False, veto_reasons=["halt_symbol"])
                             self._log_decision_safe(event)
@@ -962,12 +974,12 @@ class Orchestrator:
                         self.last_md_by_symbol[sym] = market_data
                     # Check exits for any open trades on this symbol/instrument
                     self._check_open_trades(market_data)
-                    cooldown = getattr(cfg, "MIN_COOLDOWN_SEC", 300)
+                    cooldown = ccfg.get("MIN_COOLDOWN_SEC", 300)
                     last_t = self.last_trade_time.get(sym)
                     if last_t and time.time() - last_t < cooldown:
                         continue
                     # Phase C: Build trade suggestion
-                    debug_flag = getattr(cfg, "DEBUG_TRADE_REASONS", False) or getattr(cfg, "DEBUG_TRADE_MODE", False)
+                    debug_flag = ccfg.get("DEBUG_TRADE_REASONS", False) or ccfg.get("DEBUG_TRADE_MODE", False)
                     trade = None
                     gate = self._strategy_gate_for_symbol(market_snapshot)
                     if not gate.allowed:
@@ -976,7 +988,7 @@ class Orchestrator:
                         try:
                             event = self._build_decision_event(None, market_data, gatekeeper_allowed=False, veto_reasons=gate.reasons)
                             self._log_decision_safe(event)
-                            audit_append({"event": "GATEKEEPER_BLOCK", "symbol": sym, "reasons": gate.reasons, "desk_id": getattr(cfg, "DESK_ID", "DEFAULT")})
+                            audit_append({"event": "GATEKEEPER_BLOCK", "symbol": sym, "reasons": gate.reasons, "desk_id": ccfg.get("DESK_ID", "DEFAULT")})
                         except Exception:
                             pass
                         # Advisory-only fallback: queue higher-upside ideas for operator review.
@@ -1051,7 +1063,7 @@ class Orchestrator:
                             except Exception as exc:
                                 print(f"[DecisionStore] save skipped decision failed: {exc}")
                         continue
-                    if str(trade.strategy).upper() in getattr(cfg, "HALT_STRATEGIES", []):
+                    if str(trade.strategy).upper() in ccfg.get("HALT_STRATEGIES", []):
                         try:
                             update_execution(trade.trade_id, {"veto_reasons": ["halt_strategy"]})
                         except Exception:
@@ -1060,11 +1072,11 @@ class Orchestrator:
                     # Optional cross-asset staleness: downsize but do not block.
                     try:
                         cross_q = market_data.get("cross_asset_quality", {}) or {}
-                        optional = set(getattr(cfg, "CROSS_OPTIONAL_FEEDS", []) or [])
+                        optional = set(ccfg.get("CROSS_OPTIONAL_FEEDS", []) or [])
                         stale = set(cross_q.get("stale_feeds", []) or [])
                         missing = set((cross_q.get("missing") or {}).keys())
                         if (stale | missing) & optional:
-                            mult = float(getattr(cfg, "CROSS_ASSET_OPTIONAL_SIZE_MULT", 0.85))
+                            mult = float(ccfg.get("CROSS_ASSET_OPTIONAL_SIZE_MULT", 0.85))
                             current = float(getattr(trade, "size_mult", 1.0) or 1.0)
                             trade = replace(trade, size_mult=min(current, mult))
                     except Exception:
@@ -1097,7 +1109,7 @@ class Orchestrator:
                         # No quick/baseline fallback trades in live mode
                         # Keep only strategy-specific queues if allowed by gatekeeper
                         try:
-                            if str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper() == "LIVE" and not getattr(cfg, "ALLOW_AUX_TRADES_LIVE", False):
+                            if str(ccfg.get("EXECUTION_MODE", "SIM")).upper() == "LIVE" and not ccfg.get("ALLOW_AUX_TRADES_LIVE", False):
                                 continue
                             if gate.allowed and gate.family == "TREND":
                                 zero_trade = self.trade_builder.build_zero_hero(
@@ -1170,9 +1182,9 @@ class Orchestrator:
                                     "size": float(getattr(trade, "qty", 0.0) or 0.0),
                                 },
                                 risk={
-                                    "daily_loss_limit": float(getattr(cfg, "MAX_DAILY_LOSS_PCT", 0.0)),
-                                    "position_limit": float(getattr(cfg, "MAX_TRADES_PER_DAY", 0.0)),
-                                    "slippage_bps_assumed": float(getattr(cfg, "SLIPPAGE_BPS", 0.0)),
+                                    "daily_loss_limit": float(ccfg.get("MAX_DAILY_LOSS_PCT", 0.0)),
+                                    "position_limit": float(ccfg.get("MAX_TRADES_PER_DAY", 0.0)),
+                                    "slippage_bps_assumed": float(ccfg.get("SLIPPAGE_BPS", 0.0)),
                                 },
                                 outcome={"status": "planned", "reject_reasons": []},
                             )
@@ -1203,8 +1215,8 @@ class Orchestrator:
                         pass
                     if self.strategy_tracker.is_disabled(
                         trade.strategy,
-                        min_trades=getattr(cfg, "STRATEGY_MIN_TRADES", 30),
-                        threshold=getattr(cfg, "STRATEGY_DISABLE_THRESHOLD", 0.45)
+                        min_trades=ccfg.get("STRATEGY_MIN_TRADES", 30),
+                        threshold=ccfg.get("STRATEGY_DISABLE_THRESHOLD", 0.45)
                     ):
                         print(f"[StrategyTracker] Disabled strategy: {trade.strategy}")
                         continue
@@ -1218,19 +1230,19 @@ class Orchestrator:
                         continue
                     elif action == "soft":
                         try:
-                            trade.size_mult = (trade.size_mult or 1.0) * float(getattr(cfg, "DECAY_DOWNSIZE_MULT", 0.6))
+                            trade.size_mult = (trade.size_mult or 1.0) * float(ccfg.get("DECAY_DOWNSIZE_MULT", 0.6))
                             update_execution(trade.trade_id, {"action_size_multiplier": trade.size_mult})
                         except Exception:
                             pass
                     # Best trade per day filter
-                    if getattr(cfg, "BEST_TRADE_PER_DAY", True) and self.best_trade_logged:
+                    if ccfg.get("BEST_TRADE_PER_DAY", True) and self.best_trade_logged:
                         try:
                             update_execution(trade.trade_id, {"veto_reasons": ["best_trade_per_day"]})
                         except Exception:
                             pass
                         continue
                     # Best trade per regime filter
-                    if getattr(cfg, "BEST_TRADE_PER_REGIME", True):
+                    if ccfg.get("BEST_TRADE_PER_REGIME", True):
                         rkey = trade.regime or "NEUTRAL"
                         if self.best_trade_by_regime.get(rkey):
                             try:
@@ -1257,8 +1269,8 @@ class Orchestrator:
 
                     # A/B paper trading log (shadow model)
                     try:
-                        if getattr(cfg, "ML_AB_ENABLE", False) and getattr(trade, "shadow_confidence", None) is not None:
-                            mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper()
+                        if ccfg.get("ML_AB_ENABLE", False) and getattr(trade, "shadow_confidence", None) is not None:
+                            mode = str(ccfg.get("EXECUTION_MODE", "SIM")).upper()
                             log_ab_trial(
                                 trade.trade_id,
                                 trade.symbol,
@@ -1274,7 +1286,7 @@ class Orchestrator:
                             pass
 
                     # Pilot gating (strategy whitelist + quote/spread strictness)
-                    if getattr(cfg, "LIVE_PILOT_MODE", False):
+                    if ccfg.get("LIVE_PILOT_MODE", False):
                         pilot_allowed, pilot_reasons = self._pilot_trade_gate(trade, market_data)
                         if not pilot_allowed:
                             try:
@@ -1290,7 +1302,7 @@ class Orchestrator:
                     # Manual approval gate (strong trades)
                     approval_payload_hash = order_payload_hash(trade)
                     approved, approval_reason = approval_status(trade.trade_id, payload_hash=approval_payload_hash)
-                    if cfg.MANUAL_APPROVAL and not approved:
+                    if ccfg.get("MANUAL_APPROVAL") and not approved:
                         # Pre-trade validation report
                         rr = None
                         try:
@@ -1298,8 +1310,8 @@ class Orchestrator:
                         except Exception:
                             rr = None
                         # Regime-aware confidence threshold
-                        min_conf = getattr(cfg, "ML_MIN_PROBA", 0.6)
-                        mult = getattr(cfg, "REGIME_PROBA_MULT", {}).get(trade.regime or "NEUTRAL", 1.0)
+                        min_conf = ccfg.get("ML_MIN_PROBA", 0.6)
+                        mult = ccfg.get("REGIME_PROBA_MULT", {}).get(trade.regime or "NEUTRAL", 1.0)
                         min_conf = min_conf * mult
                         validation = {
                             "pretrade_conf_ok": trade.confidence >= min_conf,
@@ -1313,7 +1325,7 @@ class Orchestrator:
                             trade,
                             market_data=market_data,
                             risk_policy={
-                                "position_sizing_cap": getattr(cfg, "MAX_QTY", None),
+                                "position_sizing_cap": ccfg.get("MAX_QTY", None),
                                 "time_window_validity_sec": getattr(trade, "validity_sec", None),
                                 "allow_reason": "manual_approval_required",
                             },
@@ -1337,7 +1349,7 @@ class Orchestrator:
                                     "review_packet": review_packet,
                                     "approval_payload_hash": approval_payload_hash,
                                     "approval_reason": approval_reason,
-                                    "desk_id": getattr(cfg, "DESK_ID", "DEFAULT"),
+                                    "desk_id": ccfg.get("DESK_ID", "DEFAULT"),
                                 }
                             )
                         except Exception:
@@ -1423,18 +1435,18 @@ class Orchestrator:
                         pass
 
                     # Risk-based sizing
-                    lot_size = getattr(cfg, "LOT_SIZE", {}).get(trade.symbol, 1)
+                    lot_size = ccfg.get("LOT_SIZE", {}).get(trade.symbol, 1)
                     current_vol = (market_data.get("atr", 0) / market_data.get("ltp", 1)) if market_data.get("ltp") else None
                     streak = self.loss_streak.get(trade.symbol, 0)
                     sized_qty = self.risk_engine.size_trade(trade, self.portfolio["capital"], lot_size, current_vol=current_vol, loss_streak=streak)
                     final_qty = min(sized_qty, alloc.max_qty) if alloc.max_qty else sized_qty
-                    if getattr(cfg, "LIVE_PILOT_MODE", False):
-                        final_qty = min(final_qty, int(getattr(cfg, "LIVE_MAX_LOTS", 1)))
+                    if ccfg.get("LIVE_PILOT_MODE", False):
+                        final_qty = min(final_qty, int(ccfg.get("LIVE_MAX_LOTS", 1)))
                     if final_qty <= 0:
                         print("[PortfolioAllocator] Trade blocked: qty<=0 after allocation")
                         continue
                     # RL sizing agent (shadow or live)
-                    if getattr(cfg, "RL_ENABLED", False):
+                    if ccfg.get("RL_ENABLED", False):
                         mult = 1.0
                         feats = None
                         if self.rl_size_agent:
@@ -1448,7 +1460,7 @@ class Orchestrator:
                             update_execution(trade.trade_id, {"action_size_multiplier": mult})
                         except Exception:
                             pass
-                        if getattr(cfg, "RL_SHADOW_ONLY", True):
+                        if ccfg.get("RL_SHADOW_ONLY", True):
                             # log shadow decision, no sizing change
                             try:
                                 with open("logs/rl_size_shadow.jsonl", "a") as f:
@@ -1506,8 +1518,8 @@ class Orchestrator:
                             pass
 
                     # Price confirmation entry (avoid false starts)
-                    if getattr(cfg, "PRICE_CONFIRM_ENABLE", True):
-                        if getattr(cfg, "PRICE_CONFIRM_VWAP", True):
+                    if ccfg.get("PRICE_CONFIRM_ENABLE", True):
+                        if ccfg.get("PRICE_CONFIRM_VWAP", True):
                             vwap = market_data.get("vwap", trade.entry_price)
                             ltp = market_data.get("ltp", 0)
                             if trade.side == "BUY" and ltp < vwap:
@@ -1515,7 +1527,7 @@ class Orchestrator:
                             if trade.side == "SELL" and ltp > vwap:
                                 continue
                         else:
-                            confirm = getattr(cfg, "PRICE_CONFIRM_PCT", 0.001)
+                            confirm = ccfg.get("PRICE_CONFIRM_PCT", 0.001)
                             if trade.side == "BUY" and market_data.get("ltp", 0) < trade.entry_price * (1 + confirm):
                                 continue
                             if trade.side == "SELL" and market_data.get("ltp", 0) > trade.entry_price * (1 - confirm):
@@ -1647,9 +1659,9 @@ class Orchestrator:
                     self.portfolio["capital"] -= getattr(trade, "capital_at_risk", 0)
                     self.portfolio["trades_today"] += 1
                     self.last_trade_time[sym] = time.time()
-                    if getattr(cfg, "BEST_TRADE_PER_DAY", True):
+                    if ccfg.get("BEST_TRADE_PER_DAY", True):
                         self.best_trade_logged = True
-                    if getattr(cfg, "BEST_TRADE_PER_REGIME", True):
+                    if ccfg.get("BEST_TRADE_PER_REGIME", True):
                         rkey = trade.regime or "NEUTRAL"
                         self.best_trade_by_regime[rkey] = True
 
@@ -1674,7 +1686,7 @@ class Orchestrator:
                     if getattr(trade, "size_mult", None) is not None:
                         extra["size_mult"] = getattr(trade, "size_mult", None)
                     # Paper strict: mark aux/quick/scalp/zero-hero so they don't affect main perf stats
-                    if str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper() == "PAPER" and getattr(cfg, "PAPER_STRICT_MODE", False):
+                    if str(ccfg.get("EXECUTION_MODE", "SIM")).upper() == "PAPER" and ccfg.get("PAPER_STRICT_MODE", False):
                         if getattr(trade, "tier", "MAIN") != "MAIN" or trade.strategy in ("SCALP", "ZERO_HERO", "ZERO_HERO_EXPIRY") or trade.strategy.startswith("QUICK"):
                             extra["paper_aux"] = True
                     if fill_report:
@@ -1726,7 +1738,7 @@ class Orchestrator:
                                 "event": "CIRCUIT_BREAKER_TRIP",
                                 "reason": cycle_reason,
                                 "detail": str(e),
-                                "desk_id": getattr(cfg, "DESK_ID", "DEFAULT"),
+                                "desk_id": ccfg.get("DESK_ID", "DEFAULT"),
                             }
                         )
                     except Exception as exc:
@@ -1735,7 +1747,7 @@ class Orchestrator:
                         create_incident(
                             "SEV1",
                             cycle_reason,
-                            {"detail": str(e), "desk_id": getattr(cfg, "DESK_ID", "DEFAULT")},
+                            {"detail": str(e), "desk_id": ccfg.get("DESK_ID", "DEFAULT")},
                         )
                     except Exception as exc:
                         print(f"[CircuitBreaker] incident_error:{type(exc).__name__}")
@@ -2052,17 +2064,23 @@ class Orchestrator:
             return
 
         remaining = []
+        chain = OptionChainFrame.of(market_data.get("option_chain", []))
         for tr in self.open_trades[key]:
             meta = self.trade_meta.get(tr.trade_id, {"trail_stop": tr.stop_loss, "entry_time": time.time()})
             if instrument == "OPT":
                 current_price = None
-                for opt in market_data.get("option_chain", []):
-                    if tr.instrument_token and opt.get("instrument_token") == tr.instrument_token:
-                        current_price = opt.get("ltp")
-                        break
-                    if opt.get("strike") == tr.strike and opt.get("type") in ("CE", "PE"):
-                        current_price = opt.get("ltp")
-                        break
+                # First row matching the token, or the strike on either side.
+                rows = [
+                    row
+                    for row in (
+                        chain.index_of_token(tr.instrument_token) if tr.instrument_token else None,
+                        chain.index_of(tr.strike, "CE"),
+                        chain.index_of(tr.strike, "PE"),
+                    )
+                    if row is not None
+                ]
+                if rows:
+                    current_price = chain[min(rows)].get("ltp")
                 if current_price is None:
                     remaining.append(tr)
                     continue
@@ -2250,7 +2268,7 @@ class Orchestrator:
             dd = (self.portfolio["capital"] - self.portfolio["equity_high"]) / max(1.0, self.portfolio["equity_high"])
             if dd <= getattr(cfg, "MAX_DRAWDOWN_PCT", getattr(cfg, "PORTFOLIO_MAX_DRAWDOWN", -0.2)):
                 risk_halt.set_halt("Max drawdown breach", {"drawdown": dd})
-                send_telegram_message(f"Auto-halt: drawdown breach {dd:.2%}")
+                send_telegram_message(f"Auto-halt: drawdown breach {dd:.2%}", key="auto_halt:drawdown", min_interval_sec=300)
             # Skip aux trades in PAPER_STRICT_MODE from main perf stats
             if not (str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper() == "PAPER"
                     and getattr(cfg, "PAPER_STRICT_MODE", False)
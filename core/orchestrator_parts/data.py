@@ -1,4 +1,5 @@
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -7,6 +8,7 @@ import pandas as pd
 from config import config as cfg
 from core.reports.daily_audit import build_daily_audit, write_daily_audit_placeholder
 from core.reports.execution_report import build_execution_report, write_execution_report_placeholder
+from core.log_writer import get_jsonl_writer
 from core.risk_utils import to_pct
 from core.time_utils import now_ist, now_utc_epoch
 
@@ -115,3 +117,66 @@ def write_cycle_reports(cycle_reason=None, decision_traces=None, config_snapshot
             execution_path,
             f"execution_write_error:{type(exc).__name__}|{report_reason}",
         )
+
+
+def _api_delta(before, after):
+    endpoints = {}
+    before_eps = (before or {}).get("endpoints") or {}
+    for name, row in ((after or {}).get("endpoints") or {}).items():
+        prev = before_eps.get(name) or {}
+        calls = int(row.get("calls", 0)) - int(prev.get("calls", 0))
+        wait_ms = float(row.get("wait_ms_total", 0.0)) - float(prev.get("wait_ms_total", 0.0))
+        if calls <= 0 and wait_ms <= 0:
+            continue
+        endpoints[name] = {
+            "calls": calls,
+            "wait_ms": round(wait_ms, 3),
+            "calls_per_sec_60s": row.get("calls_per_sec"),
+            "rate_limit_per_sec": row.get("rate_limit_per_sec"),
+        }
+    prev_q = (before or {}).get("quote_coalescer") or {}
+    cur_q = (after or {}).get("quote_coalescer") or {}
+    quote = {key: int(cur_q.get(key, 0)) - int(prev_q.get(key, 0)) for key in ("requests", "calls", "coalesced")}
+    return endpoints, quote
+
+
+def fetch_market_data_timed(fetch_fn, client, log_path=None, timings_fn=None):
+    """
+    Run one market-data fetch and log its latency with the Kite API calls,
+    limiter wait and calls/sec it cost, plus per-symbol stage timings from
+    `timings_fn` when given.
+    """
+    try:
+        before = client.api_stats()
+    except Exception:
+        before = {}
+    started = time.perf_counter()
+    result = fetch_fn()
+    cycle_ms = (time.perf_counter() - started) * 1000.0
+    try:
+        endpoints, quote = _api_delta(before, client.api_stats())
+        total_calls = sum(row["calls"] for row in endpoints.values())
+        stage_timings = {}
+        if timings_fn is not None:
+            try:
+                stage_timings = timings_fn() or {}
+            except Exception:
+                stage_timings = {}
+        get_jsonl_writer(Path(log_path or "logs/market_data_cycle.jsonl")).write(
+            {
+                "ts_epoch": now_utc_epoch(),
+                "event": "MARKET_DATA_CYCLE",
+                "cycle_ms": round(cycle_ms, 3),
+                "api_calls": total_calls,
+                "api_calls_per_sec": round(total_calls / (cycle_ms / 1000.0), 3) if cycle_ms > 0 else None,
+                "api_wait_ms": round(sum(row["wait_ms"] for row in endpoints.values()), 3),
+                "endpoints": endpoints,
+                "quote_coalescer": quote,
+                "workers": stage_timings.get("workers"),
+                "pipeline_ms": stage_timings.get("cycle_ms"),
+                "symbol_stages_ms": stage_timings.get("symbols", {}),
+            }
+        )
+    except Exception:
+        pass
+    return result
@@ -1,4 +1,4 @@
-import time
+from core.clock import resolve_clock
 from core.execution_quality import (
     estimate_queue_position,
     depth_weighted_impact,
@@ -19,11 +19,15 @@ class PaperFillSimulator:
     - BUY fills if limit >= ask at any snapshot before timeout
     - SELL fills if limit <= bid at any snapshot before timeout
     - Otherwise: no fill (timeout)
+
+    Polling, timeouts and time_to_fill run on `clock`; pass a SimClock to
+    replay a snapshot stream without waiting on the wall clock.
     """
 
-    def __init__(self, timeout_sec=3.0, poll_sec=0.25):
+    def __init__(self, timeout_sec=3.0, poll_sec=0.25, clock=None):
         self.timeout_sec = timeout_sec
         self.poll_sec = poll_sec
+        self.clock = resolve_clock(clock)
 
     def simulate(self, trade, limit_price, snapshot_stream, max_replaces=2, reprice_pct=0.002, max_chase_pct=0.002,
                  max_quote_age_sec=None, max_spread_pct=None, spread_widen_pct=None):
@@ -47,7 +51,8 @@ class PaperFillSimulator:
                 except StopIteration:
                     return None
 
-        start = time.time()
+        clock = self.clock
+        start = clock.time()
         first_bid = None
         first_ask = None
         first_depth = None
@@ -62,19 +67,20 @@ class PaperFillSimulator:
         current_limit = limit_price
         attempts = []
 
-        while time.time() - start <= self.timeout_sec:
+        while clock.time() - start <= self.timeout_sec:
             snap = _next_snapshot()
             if not snap:
-                time.sleep(self.poll_sec)
+                clock.sleep(self.poll_sec)
                 continue
 
             bid = snap.get("bid") or 0
             ask = snap.get("ask") or 0
             ts = snap.get("ts")
             if ts is None:
-                ts = time.time()
+                ts = clock.time()
+            clock.observe(ts)
             if bid <= 0 or ask <= 0:
-                time.sleep(self.poll_sec)
+                clock.sleep(self.poll_sec)
                 continue
             depth = snap.get("depth")
             if first_depth is None:
@@ -106,7 +112,7 @@ class PaperFillSimulator:
                     "reason_if_aborted": "missing_quote_ts",
                     "attempts": attempts,
                 }
-            if max_quote_age_sec is not None and (time.time() - ts) > max_quote_age_sec:
+            if max_quote_age_sec is not None and (clock.time() - ts) > max_quote_age_sec:
                 return False, None, {
                     "decision_mid": round(decision_mid, 2) if decision_mid is not None else None,
                     "decision_spread": round(decision_spread, 4) if decision_spread is not None else None,
@@ -146,7 +152,7 @@ class PaperFillSimulator:
             if trade.side == "BUY" and current_limit >= ask:
                 mid_at_fill = mid
                 fill_price = ask
-                time_to_fill = time.time() - start
+                time_to_fill = clock.time() - start
                 urgency, urgency_score = classify_urgency(getattr(trade, "confidence", None), getattr(trade, "time_to_expiry_hrs", None), (decision_spread / decision_mid) if decision_mid else None)
                 qty = getattr(trade, "qty", 1)
                 queue = estimate_queue_position(first_depth, trade.side, current_limit, qty)
@@ -190,7 +196,7 @@ class PaperFillSimulator:
             if trade.side == "SELL" and current_limit <= bid:
                 mid_at_fill = mid
                 fill_price = bid
-                time_to_fill = time.time() - start
+                time_to_fill = clock.time() - start
                 urgency, urgency_score = classify_urgency(getattr(trade, "confidence", None), getattr(trade, "time_to_expiry_hrs", None), (decision_spread / decision_mid) if decision_mid else None)
                 qty = getattr(trade, "qty", 1)
                 queue = estimate_queue_position(first_depth, trade.side, current_limit, qty)
@@ -230,7 +236,7 @@ class PaperFillSimulator:
                 report["execution_quality_score"] = execution_quality_score(report)
                 return True, round(fill_price, 2), report
 
-            time.sleep(self.poll_sec)
+            clock.sleep(self.poll_sec)
 
         if first_bid is None or first_ask is None:
             return False, None, {
@@ -16,24 +16,25 @@ class PositionSizingResult:
 
 
 class PositionSizer:
-    def __init__(self):
-        self.risk_per_trade_pct = float(getattr(cfg, "RISK_PER_TRADE_PCT", getattr(cfg, "MAX_RISK_PER_TRADE_PCT", 0.004)))
-        self.min_qty = int(getattr(cfg, "MIN_QTY", 1))
-        self.max_qty = int(getattr(cfg, "MAX_QTY", 100))
-        self.max_slippage_bps_assumed = float(getattr(cfg, "MAX_SLIPPAGE_BPS_ASSUMED", 10.0))
-        self.ml_min_proba = float(getattr(cfg, "ML_MIN_PROBA", 0.45))
-        self.ml_full_size_proba = float(getattr(cfg, "ML_FULL_SIZE_PROBA", 0.70))
-        self.confidence_min = float(getattr(cfg, "CONFIDENCE_MIN", 0.55))
-        self.confidence_full = float(getattr(cfg, "CONFIDENCE_FULL", 0.80))
+    def __init__(self, config=None):
+        self.cfg = config if config is not None else cfg
+        self.risk_per_trade_pct = float(getattr(self.cfg, "RISK_PER_TRADE_PCT", getattr(self.cfg, "MAX_RISK_PER_TRADE_PCT", 0.004)))
+        self.min_qty = int(getattr(self.cfg, "MIN_QTY", 1))
+        self.max_qty = int(getattr(self.cfg, "MAX_QTY", 100))
+        self.max_slippage_bps_assumed = float(getattr(self.cfg, "MAX_SLIPPAGE_BPS_ASSUMED", 10.0))
+        self.ml_min_proba = float(getattr(self.cfg, "ML_MIN_PROBA", 0.45))
+        self.ml_full_size_proba = float(getattr(self.cfg, "ML_FULL_SIZE_PROBA", 0.70))
+        self.confidence_min = float(getattr(self.cfg, "CONFIDENCE_MIN", 0.55))
+        self.confidence_full = float(getattr(self.cfg, "CONFIDENCE_FULL", 0.80))
 
     def regime_multiplier(self, regime: str) -> float:
         regime_u = str(regime or "NEUTRAL").upper()
         if regime_u == "EVENT":
-            return float(getattr(cfg, "REGIME_EVENT_SIZE_MULT", 0.6))
+            return float(getattr(self.cfg, "REGIME_EVENT_SIZE_MULT", 0.6))
         if regime_u == "TREND":
-            return float(getattr(cfg, "REGIME_TREND_SIZE_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_TREND_SIZE_MULT", 1.0))
         if regime_u in ("RANGE", "RANGE_VOLATILE"):
-            return float(getattr(cfg, "REGIME_RANGE_SIZE_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_RANGE_SIZE_MULT", 1.0))
         return 1.0
 
     def size_from_budget(
@@ -2,24 +2,49 @@ from __future__ import annotations
 
 import csv
 import json
+import math
 import random
+import re
 import sqlite3
 import time
 from dataclasses import asdict
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from config import config as cfg
+from core.clock import SimClock
+from core.config_service import overlay
+from core.depth_history import CATALOG_TABLE, LEGACY_TABLE
 from core.indicators_live import compute_indicators
-from core.option_chain import fetch_option_chain
-from core.ohlc_buffer import ohlc_buffer
+from core.market_calendar import next_expiry_after
+from core.option_chain import synthetic_option_chain
+from core.snapshot_publisher import suppressed as snapshot_publishing_suppressed
+from core.ohlc_buffer import OhlcBuffer
 from core.regime_prob_model import RegimeProbModel
 from core.strategy_gatekeeper import StrategyGatekeeper
 from core.trade_scoring import compute_trade_score
 from core.risk_engine import RiskEngine
 from core.execution_guard import ExecutionGuard
-from strategies.trade_builder import TradeBuilder
+from strategies.trade_builder import TradeBuilder, diagnostics_suppressed
+
+# Event kinds in the merged stream. Depth sorts first so a snapshot stamped
+# at a tick's time is visible to that tick.
+DEPTH_EVENT = 0
+TICK_EVENT = 1
+
+DECIDE_EVERY_TICK = "tick"
+DECIDE_ON_BAR = "bar"
+
+# Above this many tokens the IN (...) filter is dropped and rows are
+# filtered through the token map instead.
+_MAX_SQL_TOKENS = 500
+
+# Settings every replay runs under; callers may add to them. They reach the
+# replay's components through a config view and are never set on the module.
+REPLAY_CONFIG_OVERRIDES: Dict[str, Any] = {
+    "REQUIRE_CROSS_ASSET": False,
+    "EXECUTION_MODE": "SIM",
+}
 
 
 def _load_instruments_map(path: Path) -> Dict[int, dict]:
@@ -37,20 +62,41 @@ def _load_instruments_map(path: Path) -> Dict[int, dict]:
     return out
 
 
-def _symbol_from_token(token: int, symbol_set: set, inst_map: Dict[int, dict]) -> Optional[str]:
+def _symbol_from_token(token: int, symbol_set: Iterable[str], inst_map: Dict[int, dict]) -> Optional[str]:
+    """
+    Symbol for an instrument row: an exact `name` match wins, else the
+    longest symbol its tradingsymbol starts with (so NIFTYNXT50 is not
+    taken for NIFTY).
+    """
     row = inst_map.get(token)
     if not row:
         return None
     name = (row.get("name") or "").upper()
     ts = (row.get("tradingsymbol") or "").upper()
-    for sym in symbol_set:
+    symbols = sorted(symbol_set, key=lambda s: (-len(s), s))
+    for sym in symbols:
         if name == sym:
             return sym
+    for sym in symbols:
         if ts.startswith(sym):
             return sym
     return None
 
 
+def build_token_map(inst_map: Dict[int, dict], symbols: Iterable[str]) -> Dict[int, str]:
+    """
+    token -> symbol for every instrument belonging to `symbols`, resolved
+    once so the replay loop is a dict lookup per row.
+    """
+    symbol_set = {s.upper() for s in symbols}
+    out = {}
+    for token in inst_map:
+        sym = _symbol_from_token(token, symbol_set, inst_map)
+        if sym:
+            out[int(token)] = sym
+    return out
+
+
 def _date_bounds(date_str: str) -> Tuple[float, float]:
     # Use Asia/Kolkata for trading-day boundaries
     try:
@@ -64,210 +110,400 @@ def _date_bounds(date_str: str) -> Tuple[float, float]:
         return now.timestamp(), (now + timedelta(days=1)).timestamp()
 
 
+def parse_decision_interval(value: Union[str, float, int, None]) -> Union[str, float]:
+    """
+    "tick" (or None/0) evaluates every tick, "bar" evaluates each symbol
+    once per completed minute bar, and "250ms" / "5s" / a number of
+    seconds evaluates at most once per interval per symbol.
+    """
+    if value is None:
+        return DECIDE_EVERY_TICK
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else DECIDE_EVERY_TICK
+    text = str(value).strip().lower()
+    if text in ("", "tick", "0"):
+        return DECIDE_EVERY_TICK
+    if text == "bar":
+        return DECIDE_ON_BAR
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*(ms|s)?", text)
+    if not match:
+        raise ValueError(f"invalid decision interval: {value!r}")
+    seconds = float(match.group(1)) / (1000.0 if match.group(2) == "ms" else 1.0)
+    return seconds if seconds > 0 else DECIDE_EVERY_TICK
+
+
+def connect_readonly(db_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def _tables(conn: sqlite3.Connection) -> set:
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()}
+
+
+def _token_filter(tokens: Optional[List[int]]) -> Tuple[str, List[int]]:
+    if not tokens or len(tokens) > _MAX_SQL_TOKENS:
+        return "", []
+    # Unary + keeps the planner on the timestamp index, so each arm stays
+    # time-ordered and the UNION ALL is a streaming merge, not a full sort.
+    return f" AND +instrument_token IN ({','.join(['?'] * len(tokens))})", list(tokens)
+
+
+def _depth_arms(conn: sqlite3.Connection, tables: set, start_epoch: float, end_epoch: float) -> List[str]:
+    """
+    SELECT arms for depth in the window: the partitions holding rows in the
+    window, else the legacy depth_snapshots table.
+    """
+    arms = []
+    if CATALOG_TABLE in tables:
+        names = [
+            r[0]
+            for r in conn.execute(
+                f"SELECT name FROM {CATALOG_TABLE} WHERE end_epoch > ? AND start_epoch < ? ORDER BY start_epoch",
+                (start_epoch, end_epoch),
+            ).fetchall()
+        ]
+        for name in names:
+            if name not in tables:
+                continue
+            hit = conn.execute(
+                f"SELECT 1 FROM {name} WHERE timestamp_epoch >= ? AND timestamp_epoch < ? LIMIT 1",
+                (start_epoch, end_epoch),
+            ).fetchone()
+            if hit:
+                arms.append(
+                    f"SELECT timestamp_epoch AS ts, {DEPTH_EVENT} AS kind, instrument_token AS token, "
+                    f"imbalance AS value, NULL AS volume FROM {name} "
+                    "WHERE timestamp_epoch >= ? AND timestamp_epoch < ?{tokens}"
+                )
+    if not arms and LEGACY_TABLE in tables:
+        # json_extract decodes each blob inside SQLite, once per snapshot.
+        arms.append(
+            f"SELECT timestamp_epoch AS ts, {DEPTH_EVENT} AS kind, instrument_token AS token, "
+            "CASE WHEN json_valid(depth_json) THEN json_extract(depth_json, '$.imbalance') END AS value, "
+            f"NULL AS volume FROM {LEGACY_TABLE} WHERE timestamp_epoch >= ? AND timestamp_epoch < ?{{tokens}}"
+        )
+    return arms
+
+
+def iter_replay_events(
+    conn: sqlite3.Connection,
+    start_epoch: float,
+    end_epoch: float,
+    tokens: Optional[Iterable[int]] = None,
+    chunk_rows: int = 5000,
+) -> Iterator[Tuple[float, int, int, Optional[float], Optional[int]]]:
+    """
+    Ticks and depth for [start_epoch, end_epoch) as one stream of
+    (ts, kind, token, value, volume) ordered by (ts, kind). `value` is the
+    last price for ticks and the imbalance for depth.
+
+    SQLite merges the per-table index scans (UNION ALL ... ORDER BY), and
+    rows are fetched in chunks, so nothing is materialised per day.
+    """
+    tables = _tables(conn)
+    arms = _depth_arms(conn, tables, start_epoch, end_epoch)
+    if "ticks" in tables:
+        arms.append(
+            f"SELECT timestamp_epoch AS ts, {TICK_EVENT} AS kind, instrument_token AS token, "
+            "last_price AS value, volume AS volume FROM ticks "
+            "WHERE timestamp_epoch >= ? AND timestamp_epoch < ?{tokens}"
+        )
+    if not arms:
+        return
+    token_sql, token_params = _token_filter(sorted({int(t) for t in tokens}) if tokens else None)
+    sql = " UNION ALL ".join(arm.format(tokens=token_sql) for arm in arms) + " ORDER BY ts, kind"
+    params: List[Any] = []
+    for _ in arms:
+        params.extend([float(start_epoch), float(end_epoch), *token_params])
+    cur = conn.execute(sql, params)
+    while True:
+        rows = cur.fetchmany(chunk_rows)
+        if not rows:
+            break
+        yield from rows
+
+
 class ReplayEngine:
-    def __init__(self, db_path: Optional[Path] = None, seed: int = 1):
-        self.db_path = Path(db_path) if db_path else Path(cfg.TRADE_DB_PATH)
+    """
+    Replays recorded ticks and depth through gatekeeper + TradeBuilder and
+    writes one JSON decision per evaluation.
+
+    - Ticks and depth come from one ordered SQLite cursor over a read-only
+      connection; tokens resolve through a precomputed dict.
+    - Depth is read as its stored imbalance; level blobs are never decoded.
+    - Every tick updates a private OHLC buffer. Decisions are evaluated per
+      tick, per completed bar, or per time interval (`decision_interval`).
+    - Time comes from a SimClock that follows the stream, so the replay
+      runs unthrottled unless `speed` > 0.
+    - Overrides are layered on a ConfigSnapshot (`self.config`) that is
+      handed to TradeBuilder, the gatekeeper, the risk engine, the execution
+      guard, the chain pre-filter and trade scoring. The config module is
+      never modified, so other threads and a crashed replay leave it as is.
+      Helpers those components call without a view (signal thresholds,
+      slippage model, ML predictors) read the unmodified module.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        seed: int = 1,
+        clock: Optional[SimClock] = None,
+        decision_interval: Union[str, float, None] = None,
+        overrides: Optional[Dict[str, Any]] = None,
+        instruments_path: Optional[Path] = None,
+        token_map: Optional[Dict[int, str]] = None,
+    ):
+        self.overrides = {**REPLAY_CONFIG_OVERRIDES, **(overrides or {})}
+        self.config = overlay(self.overrides)
+        self.db_path = Path(db_path) if db_path else Path(self.config.TRADE_DB_PATH)
         self.seed = seed
-        self.trade_builder = TradeBuilder()
-        self.gatekeeper = StrategyGatekeeper()
-        self.risk_engine = RiskEngine()
-        self.exec_guard = ExecutionGuard()
-        self.regime_model = RegimeProbModel(getattr(cfg, "REGIME_MODEL_PATH", "models/regime_model.json"))
+        self.clock = clock or SimClock()
+        self.decision_interval = (
+            decision_interval
+            if decision_interval is not None
+            else self.config.get("REPLAY_DECISION_INTERVAL", DECIDE_EVERY_TICK)
+        )
+        self.instruments_path = Path(instruments_path) if instruments_path else Path("data/kite_instruments.csv")
+        self.token_map = dict(token_map) if token_map is not None else None
+        self.trade_builder = TradeBuilder(config=self.config)
+        self.gatekeeper = StrategyGatekeeper(config=self.config)
+        self.risk_engine = RiskEngine(config=self.config)
+        self.exec_guard = ExecutionGuard(config=self.config)
+        self.regime_model = RegimeProbModel(self.config.get("REGIME_MODEL_PATH", "models/regime_model.json"))
         self.portfolio = {
-            "capital": float(getattr(cfg, "CAPITAL", 100000)),
+            "capital": float(self.config.get("CAPITAL", 100000)),
             "daily_loss": 0.0,
             "daily_profit": 0.0,
             "trades_today": 0,
-            "equity_high": float(getattr(cfg, "CAPITAL", 100000)),
+            "equity_high": float(self.config.get("CAPITAL", 100000)),
         }
+        self.stats: Dict[str, Any] = {}
 
-    def _load_ticks(self, start_epoch: float, end_epoch: float) -> List[Tuple[float, int, float, int]]:
-        if not self.db_path.exists():
-            return []
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.execute(
-            "SELECT timestamp_epoch, instrument_token, last_price, volume FROM ticks "
-            "WHERE timestamp_epoch >= ? AND timestamp_epoch < ? ORDER BY timestamp_epoch ASC",
-            (start_epoch, end_epoch),
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+    def _token_map(self, symbols: Iterable[str]) -> Dict[int, str]:
+        symbol_set = {s.upper() for s in symbols}
+        if self.token_map is not None:
+            return {t: s for t, s in self.token_map.items() if s.upper() in symbol_set}
+        return build_token_map(_load_instruments_map(self.instruments_path), symbol_set)
 
-    def _load_depth(self, start_epoch: float, end_epoch: float) -> List[Tuple[float, int, str]]:
+    def iter_events(self, start_epoch: float, end_epoch: float, tokens: Optional[Iterable[int]] = None):
         if not self.db_path.exists():
-            return []
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.execute(
-            "SELECT timestamp_epoch, instrument_token, depth_json FROM depth_snapshots "
-            "WHERE timestamp_epoch >= ? AND timestamp_epoch < ? ORDER BY timestamp_epoch ASC",
-            (start_epoch, end_epoch),
-        )
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+            return
+        conn = connect_readonly(self.db_path)
+        try:
+            yield from iter_replay_events(conn, start_epoch, end_epoch, tokens=tokens)
+        finally:
+            conn.close()
 
-    def replay_day(self, date_str: str, symbols: List[str], speed: float = 1.0) -> Path:
+    def replay_day(
+        self,
+        date_str: str,
+        symbols: List[str],
+        speed: float = 0.0,
+        decision_interval: Union[str, float, None] = None,
+        out_path: Optional[Path] = None,
+    ) -> Path:
         random.seed(self.seed)
-        symbol_set = {s.upper() for s in symbols}
-        inst_map = _load_instruments_map(Path("data/kite_instruments.csv"))
+        token_map = self._token_map(symbols)
         start_epoch, end_epoch = _date_bounds(date_str)
-        ticks = self._load_ticks(start_epoch, end_epoch)
-        depth = self._load_depth(start_epoch, end_epoch)
-
-        # index depth by time
-        depth_idx = 0
-        latest_depth = {}
-        out_path = Path(f"logs/decisions_replay_{date_str}.json")
-        out_path.parent.mkdir(exist_ok=True)
-
-        # temporarily disable cross-asset gating for replay
-        prev_require = getattr(cfg, "REQUIRE_CROSS_ASSET", True)
-        cfg.REQUIRE_CROSS_ASSET = False
-        prev_mode = getattr(cfg, "EXECUTION_MODE", "SIM")
-        cfg.EXECUTION_MODE = "SIM"
+        interval = parse_decision_interval(decision_interval if decision_interval is not None else self.decision_interval)
+        out_path = Path(out_path) if out_path else Path(f"logs/decisions_replay_{date_str}.json")
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        expiries = self._expiries(date_str, set(token_map.values()))
 
+        buffer = OhlcBuffer()
+        latest_depth: Dict[int, Optional[float]] = {}
+        pending: Dict[str, Tuple[float, float, Optional[float]]] = {}
+        next_due: Dict[str, float] = {}
+        self.clock.advance_to(start_epoch)
+        counts = {"ticks": 0, "depth": 0, "decisions": 0}
         trace_counter = 0
-        with out_path.open("w") as f:
-            for ts_epoch, token, price, volume in ticks:
-                # update depth snapshots up to this time
-                while depth_idx < len(depth) and depth[depth_idx][0] <= ts_epoch:
-                    d_ts, d_token, d_json = depth[depth_idx]
-                    latest_depth[d_token] = (d_ts, d_json)
-                    depth_idx += 1
-                sym = _symbol_from_token(int(token), symbol_set, inst_map)
-                if not sym:
-                    continue
-                if price is None:
-                    continue
-                ohlc_buffer.update_tick(sym, price, volume or 0, ts=ts_epoch)
-                bars = ohlc_buffer.get_bars(sym)
-                indicators_ok = len(bars) >= getattr(cfg, "OHLC_MIN_BARS", 30)
-                ind = compute_indicators(
-                    bars,
-                    vwap_window=getattr(cfg, "VWAP_WINDOW", 20),
-                    atr_period=getattr(cfg, "ATR_PERIOD", 14),
-                    adx_period=getattr(cfg, "ADX_PERIOD", 14),
-                    vol_window=getattr(cfg, "VOL_WINDOW", 30),
-                    slope_window=getattr(cfg, "VWAP_SLOPE_WINDOW", 10),
-                ) if bars else {}
-
-                vwap = ind.get("vwap") or price
-                atr = ind.get("atr") or max(1.0, price * 0.002)
-                adx = ind.get("adx") or 0.0
-                vol_z = ind.get("vol_z") or 0.0
-                vwap_slope = ind.get("vwap_slope") or 0.0
-
-                depth_imb = None
-                if token in latest_depth:
-                    try:
-                        depth_obj = json.loads(latest_depth[token][1])
-                        depth_imb = depth_obj.get("imbalance")
-                    except Exception:
-                        depth_imb = None
-
-                features = {
-                    "adx": adx,
-                    "vwap_slope": vwap_slope,
-                    "vol_z": vol_z,
-                    "atr_pct": (atr / price) if price else 0.0,
-                    "iv_mean": 0.0,
-                    "ltp_acceleration": 0.0,
-                    "option_chain_skew": 0.0,
-                    "oi_delta": 0.0,
-                    "depth_imbalance": depth_imb or 0.0,
-                    "regime_transition_rate": 0.0,
-                    "shock_score": 0.0,
-                    "uncertainty_index": 0.0,
-                    "macro_direction_bias": 0.0,
-                    "x_regime_align": 0.0,
-                    "x_vol_spillover": 0.0,
-                    "x_lead_lag": 0.0,
-                }
-                regime_out = self.regime_model.predict(features)
-
-                market_data = {
-                    "symbol": sym,
-                    "ltp": price,
-                    "vwap": vwap,
-                    "atr": atr,
-                    "vwap_slope": vwap_slope,
-                    "vol_z": vol_z,
-                    "adx_14": adx,
-                    "depth_imbalance": depth_imb,
-                    "indicators_ok": indicators_ok,
-                    "indicators_age_sec": 0.0,
-                    "regime_probs": regime_out.get("regime_probs"),
-                    "primary_regime": regime_out.get("primary_regime"),
-                    "regime_entropy": regime_out.get("regime_entropy"),
-                    "unstable_regime_flag": regime_out.get("unstable_regime_flag"),
-                    "shock_score": 0.0,
-                    "uncertainty_index": 0.0,
-                    "cross_asset_quality": {"stale_feeds": [], "missing": {}},
-                }
-
-                # option chain (synthetic)
-                try:
-                    market_data["option_chain"] = fetch_option_chain(sym, price, force_synthetic=True)
-                except Exception:
-                    market_data["option_chain"] = []
-
-                gate = self.gatekeeper.evaluate(market_data, mode="MAIN")
-                decision = {
-                    "trace_id": f"replay-{date_str}-{sym}-{trace_counter}",
-                    "ts_epoch": ts_epoch,
-                    "ts_iso": datetime.fromtimestamp(ts_epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
-                    "symbol": sym,
-                    "ltp": price,
-                    "features": features,
-                    "regime": regime_out.get("primary_regime"),
-                    "regime_probs": regime_out.get("regime_probs"),
-                    "regime_entropy": regime_out.get("regime_entropy"),
-                    "unstable_regime_flag": regime_out.get("unstable_regime_flag"),
-                    "gatekeeper_allowed": gate.allowed,
-                    "gatekeeper_reasons": gate.reasons,
-                    "risk_allowed": None,
-                    "exec_guard_allowed": None,
-                    "trade": None,
-                    "why": {},
-                }
-
-                if gate.allowed:
-                    trade = self.trade_builder.build(
-                        market_data,
-                        quick_mode=False,
-                        debug_reasons=False,
-                        force_family=gate.family,
-                        allow_fallbacks=False,
-                        allow_baseline=False,
-                    )
-                    if trade:
-                        decision["trade"] = asdict(trade)
-                        allowed, reason = self.risk_engine.allow_trade(self.portfolio)
-                        decision["risk_allowed"] = bool(allowed)
-                        decision["risk_reason"] = reason
-                        if allowed:
-                            ok, guard_reason = self.exec_guard.validate(trade, self.portfolio, trade.regime)
-                            decision["exec_guard_allowed"] = bool(ok)
-                            decision["exec_guard_reason"] = guard_reason
-                        # compute score explanation
-                        try:
-                            opt = market_data.get("option_chain", [{}])[0] if market_data.get("option_chain") else {}
-                            rr = None
-                            try:
-                                rr = abs(trade.target - trade.entry_price) / max(abs(trade.entry_price - trade.stop_loss), 1e-6)
-                            except Exception:
-                                rr = None
-                            detail = compute_trade_score(market_data, opt, trade.side, rr, getattr(trade, "strategy", None))
-                            decision["why"] = {"score": detail.get("score"), "detail": detail}
-                        except Exception:
-                            decision["why"] = {}
+        started = time.perf_counter()
+
+        with out_path.open("w") as f, snapshot_publishing_suppressed(), diagnostics_suppressed():
 
+            def _emit(sym, ts_epoch, price, depth_imb):
+                nonlocal trace_counter
+                decision = self._decide(date_str, sym, ts_epoch, price, depth_imb, buffer, expiries.get(sym), trace_counter)
                 f.write(json.dumps(decision, default=str) + "\n")
                 trace_counter += 1
                 if speed > 0:
                     time.sleep(1.0 / speed)
 
-        cfg.REQUIRE_CROSS_ASSET = prev_require
-        cfg.EXECUTION_MODE = prev_mode
+            events = self.iter_events(start_epoch, end_epoch, tokens=token_map) if token_map else ()
+            for ts_epoch, kind, token, value, volume in events:
+                if kind == DEPTH_EVENT:
+                    latest_depth[token] = value
+                    counts["depth"] += 1
+                    continue
+                sym = token_map.get(token)
+                if not sym or value is None:
+                    continue
+                counts["ticks"] += 1
+                self.clock.observe(ts_epoch)
+                if interval == DECIDE_ON_BAR:
+                    # The previous bar closed: decide on its last tick before this one lands.
+                    last = pending.get(sym)
+                    if last is not None and math.floor(ts_epoch / 60.0) != math.floor(last[0] / 60.0):
+                        _emit(sym, *last)
+                buffer.update_tick(sym, value, volume or 0, ts=ts_epoch)
+                if interval == DECIDE_EVERY_TICK:
+                    _emit(sym, ts_epoch, value, latest_depth.get(token))
+                elif interval == DECIDE_ON_BAR:
+                    pending[sym] = (ts_epoch, value, latest_depth.get(token))
+                elif ts_epoch >= next_due.get(sym, -math.inf):
+                    next_due[sym] = (math.floor(ts_epoch / interval) + 1) * interval
+                    _emit(sym, ts_epoch, value, latest_depth.get(token))
+            for sym in sorted(pending):
+                _emit(sym, *pending[sym])
+
+        counts["decisions"] = trace_counter
+        counts["elapsed_sec"] = round(time.perf_counter() - started, 3)
+        self.stats = counts
         return out_path
+
+    def _expiries(self, date_str: str, symbols: Iterable[str]) -> Dict[str, str]:
+        try:
+            day = datetime.fromisoformat(date_str).date()
+        except Exception:
+            day = date.today()
+        expiry_type = self.config.get("TERM_STRUCTURE_EXPIRY", "WEEKLY")
+        out = {}
+        for sym in symbols:
+            try:
+                expiry = next_expiry_after(day - timedelta(days=1), expiry_type=expiry_type, symbol=sym)
+            except Exception:
+                expiry = None
+            out[sym] = str(expiry or day)
+        return out
+
+    def _decide(
+        self,
+        date_str: str,
+        sym: str,
+        ts_epoch: float,
+        price: float,
+        depth_imb: Optional[float],
+        buffer: OhlcBuffer,
+        expiry: Optional[str],
+        trace_counter: int,
+    ) -> dict:
+        bars = buffer.get_bars(sym)
+        indicators_ok = len(bars) >= self.config.get("OHLC_MIN_BARS", 30)
+        ind_params = {
+            "vwap_window": self.config.get("VWAP_WINDOW", 20),
+            "atr_period": self.config.get("ATR_PERIOD", 14),
+            "adx_period": self.config.get("ADX_PERIOD", 14),
+            "vol_window": self.config.get("VOL_WINDOW", 30),
+            "slope_window": self.config.get("VWAP_SLOPE_WINDOW", 10),
+        }
+        ind = compute_indicators(
+            bars,
+            engine=buffer.indicator_engine(sym, **ind_params),
+            **ind_params,
+        ) if bars else {}
+
+        vwap = ind.get("vwap") or price
+        atr = ind.get("atr") or max(1.0, price * 0.002)
+        adx = ind.get("adx") or 0.0
+        vol_z = ind.get("vol_z") or 0.0
+        vwap_slope = ind.get("vwap_slope") or 0.0
+
+        features = {
+            "adx": adx,
+            "vwap_slope": vwap_slope,
+            "vol_z": vol_z,
+            "atr_pct": (atr / price) if price else 0.0,
+            "iv_mean": 0.0,
+            "ltp_acceleration": 0.0,
+            "option_chain_skew": 0.0,
+            "oi_delta": 0.0,
+            "depth_imbalance": depth_imb or 0.0,
+            "regime_transition_rate": 0.0,
+            "shock_score": 0.0,
+            "uncertainty_index": 0.0,
+            "macro_direction_bias": 0.0,
+            "x_regime_align": 0.0,
+            "x_vol_spillover": 0.0,
+            "x_lead_lag": 0.0,
+        }
+        regime_out = self.regime_model.predict(features)
+
+        market_data = {
+            "symbol": sym,
+            "ltp": price,
+            "vwap": vwap,
+            "atr": atr,
+            "vwap_slope": vwap_slope,
+            "vol_z": vol_z,
+            "adx_14": adx,
+            "depth_imbalance": depth_imb,
+            "indicators_ok": indicators_ok,
+            "indicators_age_sec": 0.0,
+            "regime_probs": regime_out.get("regime_probs"),
+            "primary_regime": regime_out.get("primary_regime"),
+            "regime_entropy": regime_out.get("regime_entropy"),
+            "unstable_regime_flag": regime_out.get("unstable_regime_flag"),
+            "shock_score": 0.0,
+            "uncertainty_index": 0.0,
+            "cross_asset_quality": {"stale_feeds": [], "missing": {}},
+            # Replay time, and the replayed tick as the index quote.
+            "timestamp": self.clock.time(),
+            "ltp_ts_epoch": ts_epoch,
+            "index_quote_cache": {"last_price": price},
+        }
+
+        gate = self.gatekeeper.evaluate(market_data, mode="MAIN")
+        decision = {
+            "trace_id": f"replay-{date_str}-{sym}-{trace_counter}",
+            "ts_epoch": ts_epoch,
+            "ts_iso": datetime.fromtimestamp(ts_epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+            "symbol": sym,
+            "ltp": price,
+            "features": features,
+            "regime": regime_out.get("primary_regime"),
+            "regime_probs": regime_out.get("regime_probs"),
+            "regime_entropy": regime_out.get("regime_entropy"),
+            "unstable_regime_flag": regime_out.get("unstable_regime_flag"),
+            "gatekeeper_allowed": gate.allowed,
+            "gatekeeper_reasons": gate.reasons,
+            "risk_allowed": None,
+            "exec_guard_allowed": None,
+            "trade": None,
+            "why": {},
+        }
+
+        if gate.allowed:
+            # The gatekeeper never reads the chain; build it only for TradeBuilder.
+            market_data["option_chain"] = synthetic_option_chain(sym, price, expiry=expiry, timestamp=ts_epoch)
+            trade = self.trade_builder.build(
+                market_data,
+                quick_mode=False,
+                debug_reasons=False,
+                force_family=gate.family,
+                allow_fallbacks=False,
+                allow_baseline=False,
+            )
+            if trade:
+                decision["trade"] = asdict(trade)
+                allowed, reason = self.risk_engine.allow_trade(self.portfolio)
+                decision["risk_allowed"] = bool(allowed)
+                decision["risk_reason"] = reason
+                if allowed:
+                    ok, guard_reason = self.exec_guard.validate(trade, self.portfolio, trade.regime)
+                    decision["exec_guard_allowed"] = bool(ok)
+                    decision["exec_guard_reason"] = guard_reason
+                # compute score explanation
+                try:
+                    opt = market_data.get("option_chain", [{}])[0] if market_data.get("option_chain") else {}
+                    rr = None
+                    try:
+                        rr = abs(trade.target - trade.entry_price) / max(abs(trade.entry_price - trade.stop_loss), 1e-6)
+                    except Exception:
+                        rr = None
+                    detail = compute_trade_score(
+                        market_data, opt, trade.side, rr, getattr(trade, "strategy", None), config=self.config
+                    )
+                    decision["why"] = {"score": detail.get("score"), "detail": detail}
+                except Exception:
+                    decision["why"] = {}
+        return decision
@@ -0,0 +1,392 @@
+"""
+Replay farm: ReplayEngine.replay_day over a range of dates and symbols.
+
+Each (date, symbol) pair is one shard. Shards run on the walk-forward
+process pool (core/window_pool.py) against a read-only snapshot of the
+trade DB, and each one writes its own decision JSONL. The parent records
+every finished shard in a JSON checkpoint, so a rerun with the same spec
+only replays the shards still missing. A merged summary covers decisions
+per regime, gate pass rates and a hypothetical PnL.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import config as cfg
+from core.replay_engine import (
+    ReplayEngine,
+    _date_bounds,
+    _load_instruments_map,
+    build_token_map,
+    connect_readonly,
+    parse_decision_interval,
+)
+from core.window_pool import map_windows, resolve_workers
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ReplayShard:
+    date: str
+    symbol: str
+    db_path: str
+    out_dir: str
+    token_map: Dict[int, str]
+    decision_interval: str
+    seed: int
+
+    @property
+    def key(self) -> str:
+        return shard_key(self.date, self.symbol)
+
+    @property
+    def out_path(self) -> Path:
+        return Path(self.out_dir) / f"{self.key}.jsonl"
+
+
+def shard_key(date_str: str, symbol: str) -> str:
+    return f"{date_str}_{symbol}"
+
+
+def date_range(start: str, end: str) -> List[str]:
+    """Weekdays from `start` to `end`, inclusive."""
+    day, last = date.fromisoformat(start), date.fromisoformat(end)
+    out = []
+    while day <= last:
+        if day.weekday() < 5:
+            out.append(day.isoformat())
+        day += timedelta(days=1)
+    return out
+
+
+def snapshot_db(src: Path, dest: Path) -> Path:
+    """
+    Copy `src` to `dest` with the SQLite backup API (a consistent copy even
+    while the live writer is running). Written to a temp file first, so an
+    interrupted copy is never mistaken for a snapshot.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f"{dest.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    source = connect_readonly(Path(src))
+    target = sqlite3.connect(tmp)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    tmp.replace(dest)
+    return dest
+
+
+def session_dates(db_path: Path, dates: Iterable[str], tokens: Iterable[int]) -> List[str]:
+    """The dates in `dates` with at least one tick for `tokens` (one index probe per date)."""
+    tokens = list(tokens)
+    if not tokens:
+        return []
+    conn = connect_readonly(Path(db_path))
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='ticks'").fetchone():
+            return []
+        marks = ",".join("?" * len(tokens))
+        sql = (
+            "SELECT 1 FROM ticks WHERE timestamp_epoch >= ? AND timestamp_epoch < ? "
+            f"AND +instrument_token IN ({marks}) LIMIT 1"
+        )
+        return [d for d in dates if conn.execute(sql, [*_date_bounds(d), *tokens]).fetchone()]
+    finally:
+        conn.close()
+
+
+def _hypothetical_pnl(decisions: List[dict], index: int, ltps: np.ndarray) -> Optional[Tuple[float, str]]:
+    """
+    PnL of the trade proposed by `decisions[index]` if it had been filled at
+    its entry price: the premium follows the underlying with a fixed delta
+    (REPLAY_FARM_DELTA) over the rest of the shard's decisions, and the
+    trade exits on the first target/stop touch, else at the last decision.
+    """
+    trade = decisions[index].get("trade") or {}
+    try:
+        entry = float(trade["entry_price"])
+        stop = float(trade["stop_loss"])
+        target = float(trade["target"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    sym = trade.get("symbol") or decisions[index].get("symbol")
+    units = float(trade.get("qty") or 0) * getattr(cfg, "LOT_SIZE", {}).get(sym, 1)
+    long_ = str(trade.get("side") or "BUY").upper() != "SELL"
+    sign = -1.0 if str(trade.get("option_type") or "").upper() == "PE" else 1.0
+    delta = float(getattr(cfg, "REPLAY_FARM_DELTA", 0.5))
+
+    path = entry + sign * delta * (ltps[index + 1:] - ltps[index])
+    if path.size == 0:
+        return 0.0, "OPEN"
+    hit_target = path >= target if long_ else path <= target
+    hit_stop = path <= stop if long_ else path >= stop
+    t = int(np.argmax(hit_target)) if hit_target.any() else path.size
+    s = int(np.argmax(hit_stop)) if hit_stop.any() else path.size
+    if t < s:
+        exit_px, outcome = target, "TARGET"
+    elif s < path.size:
+        exit_px, outcome = stop, "STOP"
+    else:
+        exit_px, outcome = float(path[-1]), "CLOSE"
+    return (exit_px - entry) * units * (1.0 if long_ else -1.0), outcome
+
+
+def summarize_decisions(path: Path) -> Dict[str, Any]:
+    """Counts per regime, gate pass/block reasons and hypothetical PnL for one decision JSONL."""
+    decisions = []
+    with Path(path).open() as f:
+        for line in f:
+            if line.strip():
+                decisions.append(json.loads(line))
+    ltps = np.array([float(d.get("ltp") or 0.0) for d in decisions])
+
+    summary = _empty_summary()
+    for i, d in enumerate(decisions):
+        regime = str(d.get("regime") or "UNKNOWN")
+        row = summary["by_regime"].setdefault(regime, _counts())
+        for bucket in (summary, row):
+            bucket["decisions"] += 1
+        if not d.get("gatekeeper_allowed"):
+            for reason in d.get("gatekeeper_reasons") or []:
+                summary["block_reasons"][reason] = summary["block_reasons"].get(reason, 0) + 1
+            continue
+        for bucket in (summary, row):
+            bucket["gate_pass"] += 1
+        if not d.get("trade"):
+            continue
+        for bucket in (summary, row):
+            bucket["trades"] += 1
+        if not (d.get("risk_allowed") and d.get("exec_guard_allowed")):
+            continue
+        result = _hypothetical_pnl(decisions, i, ltps)
+        if result is None:
+            continue
+        pnl, outcome = result
+        for bucket in (summary, row):
+            bucket["placed"] += 1
+            bucket["pnl"] += pnl
+            bucket["wins"] += int(pnl > 0)
+        summary["outcomes"][outcome] = summary["outcomes"].get(outcome, 0) + 1
+    return summary
+
+
+def _counts() -> Dict[str, Any]:
+    return {"decisions": 0, "gate_pass": 0, "trades": 0, "placed": 0, "wins": 0, "pnl": 0.0}
+
+
+def _empty_summary() -> Dict[str, Any]:
+    return {**_counts(), "by_regime": {}, "block_reasons": {}, "outcomes": {}}
+
+
+def _merge(into: Dict[str, Any], part: Dict[str, Any]) -> None:
+    for name in _counts():
+        into[name] += part.get(name, 0)
+    for regime, row in part.get("by_regime", {}).items():
+        target = into["by_regime"].setdefault(regime, _counts())
+        for name in _counts():
+            target[name] += row.get(name, 0)
+    for field in ("block_reasons", "outcomes"):
+        for name, count in part.get(field, {}).items():
+            into[field][name] = into[field].get(name, 0) + count
+
+
+def _with_rates(summary: Dict[str, Any]) -> Dict[str, Any]:
+    for row in [summary, *summary["by_regime"].values()]:
+        row["pnl"] = round(row["pnl"], 2)
+        row["gate_pass_rate"] = round(row["gate_pass"] / row["decisions"], 4) if row["decisions"] else None
+        row["win_rate"] = round(row["wins"] / row["placed"], 4) if row["placed"] else None
+    return summary
+
+
+def replay_shard(shard: ReplayShard) -> Dict[str, Any]:
+    """Replay one (date, symbol) shard and summarize its decisions. Runs in a pool worker."""
+    out_path = shard.out_path
+    tmp = out_path.with_name(f"{out_path.name}.tmp")
+    engine = ReplayEngine(db_path=Path(shard.db_path), seed=shard.seed, token_map=shard.token_map)
+    engine.replay_day(shard.date, [shard.symbol], decision_interval=shard.decision_interval, out_path=tmp)
+    tmp.replace(out_path)
+    return {"date": shard.date, "symbol": shard.symbol, "path": str(out_path), **engine.stats,
+            **summarize_decisions(out_path)}
+
+
+def load_checkpoint(path: Path, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Finished shards from an earlier run with the same spec; empty otherwise."""
+    try:
+        data = json.loads(Path(path).read_text())
+    except Exception:
+        return {}
+    if data.get("version") != CHECKPOINT_VERSION or data.get("spec") != spec:
+        return {}
+    return {key: row for key, row in (data.get("done") or {}).items() if Path(row.get("path", "")).exists()}
+
+
+def save_checkpoint(path: Path, spec: Dict[str, Any], done: Dict[str, Any], failed: Dict[str, str]) -> None:
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(json.dumps({"version": CHECKPOINT_VERSION, "spec": spec, "done": done, "failed": failed}))
+    tmp.replace(path)
+
+
+def run_replay_farm(
+    start: str,
+    end: str,
+    symbols: Iterable[str],
+    out_dir: Path,
+    db_path: Optional[Path] = None,
+    decision_interval: Optional[str] = None,
+    seed: int = 1,
+    workers: Optional[int] = None,
+    snapshot: bool = True,
+    resume: bool = True,
+    instruments_path: Optional[Path] = None,
+    token_map: Optional[Dict[int, str]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Replay every (date, symbol) pair in [start, end] and write:
+
+    - `<out_dir>/shards/<date>_<symbol>.jsonl`: the shard's decisions;
+    - `<out_dir>/checkpoint.json`: finished shards, rewritten after each one;
+    - `<out_dir>/summary.json`: totals, per-regime/date/symbol rows and the
+      per-shard summaries.
+
+    `workers` defaults to REPLAY_FARM_WORKERS (0 = one per CPU). With
+    `snapshot` the trade DB is copied once into `out_dir` (and reused on
+    resume), so all shards read the same data; otherwise the shards open
+    `db_path` read-only. `progress(event)` is called after each shard
+    (default: one printed line).
+    """
+    out_dir = Path(out_dir)
+    shard_dir = out_dir / "shards"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    source = Path(db_path) if db_path else Path(cfg.TRADE_DB_PATH)
+    symbols = sorted({s.strip().upper() for s in symbols if s and s.strip()})
+    interval = decision_interval if decision_interval is not None else getattr(cfg, "REPLAY_DECISION_INTERVAL", "tick")
+    parse_decision_interval(interval)
+    spec = {
+        "start": start,
+        "end": end,
+        "symbols": symbols,
+        "db": str(source),
+        "snapshot": bool(snapshot),
+        "decision_interval": str(interval),
+        "seed": seed,
+    }
+    checkpoint_path = out_dir / "checkpoint.json"
+    done = load_checkpoint(checkpoint_path, spec) if resume else {}
+
+    snapshot_path = out_dir / "snapshot.db"
+    if not snapshot:
+        replay_db = source
+    elif done and snapshot_path.exists():
+        replay_db = snapshot_path
+    else:
+        # A fresh run: earlier shard results (if any) came from another snapshot.
+        done = {}
+        replay_db = snapshot_db(source, snapshot_path)
+
+    if token_map is None:
+        inst_path = Path(instruments_path) if instruments_path else Path("data/kite_instruments.csv")
+        token_map = build_token_map(_load_instruments_map(inst_path), symbols)
+    tokens_by_symbol: Dict[str, Dict[int, str]] = {}
+    for token, sym in token_map.items():
+        if sym.upper() in symbols:
+            tokens_by_symbol.setdefault(sym.upper(), {})[int(token)] = sym.upper()
+
+    dates = date_range(start, end)
+    shards = [
+        ReplayShard(d, sym, str(replay_db), str(shard_dir), tokens_by_symbol[sym], str(interval), seed)
+        for sym in symbols if sym in tokens_by_symbol
+        for d in session_dates(replay_db, dates, tokens_by_symbol[sym])
+    ]
+    shards.sort(key=lambda s: (s.date, s.symbol))
+    pending = [s for s in shards if s.key not in done]
+    failed: Dict[str, str] = {}
+    save_checkpoint(checkpoint_path, spec, done, failed)
+
+    report = progress or _print_progress
+    started = time.perf_counter()
+    workers = resolve_workers(workers if workers is not None else getattr(cfg, "REPLAY_FARM_WORKERS", 1), len(pending))
+
+    def _on_result(index: int, result: Optional[Dict[str, Any]], error: Optional[str]) -> None:
+        shard = pending[index]
+        if error is None:
+            done[shard.key] = result
+            failed.pop(shard.key, None)
+        else:
+            failed[shard.key] = error
+        save_checkpoint(checkpoint_path, spec, done, failed)
+        finished = sum(1 for s in pending if s.key in done or s.key in failed)
+        elapsed = time.perf_counter() - started
+        report({
+            "shard": shard.key,
+            "error": error,
+            "decisions": (result or {}).get("decisions"),
+            "finished": finished,
+            "pending": len(pending),
+            "total": len(shards),
+            "elapsed_sec": round(elapsed, 2),
+            "eta_sec": round(elapsed / finished * (len(pending) - finished), 1),
+        })
+
+    if pending:
+        map_windows(replay_shard, pending, workers=workers, on_result=_on_result)
+
+    summary = _farm_summary([done[s.key] for s in shards if s.key in done])
+    summary.update({
+        "spec": spec,
+        "snapshot_path": str(replay_db),
+        "workers": workers,
+        "shards_total": len(shards),
+        "shards_resumed": len(shards) - len(pending),
+        "failed_shards": [{"shard": key, "error": err} for key, err in sorted(failed.items())],
+        "elapsed_sec": round(time.perf_counter() - started, 2),
+        "generated_at": datetime.now().isoformat(),
+    })
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2, default=str))
+    return summary
+
+
+def _farm_summary(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    total = _empty_summary()
+    by_date: Dict[str, Dict[str, Any]] = {}
+    by_symbol: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        _merge(total, row)
+        _merge(by_date.setdefault(row["date"], _empty_summary()), row)
+        _merge(by_symbol.setdefault(row["symbol"], _empty_summary()), row)
+    out = _with_rates(total)
+    out["block_reasons"] = dict(sorted(out["block_reasons"].items(), key=lambda kv: -kv[1]))
+    out["by_date"] = {k: _flat(_with_rates(v)) for k, v in sorted(by_date.items())}
+    out["by_symbol"] = {k: _flat(_with_rates(v)) for k, v in sorted(by_symbol.items())}
+    out["shards"] = [
+        {k: row.get(k) for k in ("date", "symbol", "path", "ticks", "decisions", "gate_pass", "trades", "placed", "pnl", "elapsed_sec")}
+        for row in rows
+    ]
+    return out
+
+
+def _flat(summary: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in summary.items() if k not in ("by_regime", "block_reasons", "outcomes")}
+
+
+def _print_progress(event: Dict[str, Any]) -> None:
+    status = f"error: {event['error']}" if event["error"] else f"{event['decisions']} decisions"
+    print(
+        f"[REPLAY_FARM] {event['finished']}/{event['pending']} {event['shard']} {status} "
+        f"elapsed={event['elapsed_sec']}s eta={event['eta_sec']}s"
+    )
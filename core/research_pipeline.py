@@ -5,6 +5,7 @@ from datetime import datetime
 from collections import defaultdict
 import statistics as stats
 from core.stress_generator import SyntheticStressGenerator
+from core.trade_log_store import iter_trades
 
 
 class ResearchPipeline:
@@ -66,19 +67,8 @@ class ResearchPipeline:
     def _load_trades(self):
         if not self.trade_log_path.exists():
             return []
-        raw = []
         try:
-            text = self.trade_log_path.read_text().strip()
-            if text.startswith("["):
-                raw = json.loads(text)
-            else:
-                for line in text.splitlines():
-                    if not line.strip():
-                        continue
-                    try:
-                        raw.append(json.loads(line))
-                    except Exception:
-                        continue
+            raw = list(iter_trades(self.trade_log_path))
         except Exception:
             return []
         trades = []
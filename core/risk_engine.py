@@ -6,20 +6,39 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_LEGACY_VEGA_WARNED = False
+
+
+def _warn_legacy_net_vega() -> None:
+    global _LEGACY_VEGA_WARNED
+    legacy = getattr(cfg, "MAX_NET_VEGA_LEGACY_OVERRIDE", None)
+    if legacy is None or _LEGACY_VEGA_WARNED:
+        return
+    _LEGACY_VEGA_WARNED = True
+    logger.warning(
+        "MAX_NET_VEGA=%s is in retired proxy units; using MAX_NET_VEGA_RUPEES=%s. "
+        "Set MAX_NET_VEGA_RUPEES (rupees per vol point) and drop MAX_NET_VEGA.",
+        legacy,
+        getattr(cfg, "MAX_NET_VEGA_RUPEES", None),
+    )
+
+
 class RiskEngine:
-    def __init__(self, risk_state=None):
+    def __init__(self, risk_state=None, config=None):
         self.risk_state = risk_state
-        self.max_daily_loss_pct = getattr(cfg, "MAX_DAILY_LOSS_PCT", getattr(cfg, "MAX_DAILY_LOSS", 0.15))
-        self.max_trades = getattr(cfg, "MAX_TRADES_PER_DAY", 5)
-        self.max_risk_per_trade = getattr(cfg, "MAX_RISK_PER_TRADE_PCT", getattr(cfg, "MAX_RISK_PER_TRADE", 0.03))
-        self.risk_per_trade_pct = float(getattr(cfg, "RISK_PER_TRADE_PCT", self.max_risk_per_trade))
-        self.max_open_risk_pct = getattr(cfg, "MAX_OPEN_RISK_PCT", 0.02)
-        self.max_net_delta = float(getattr(cfg, "MAX_NET_DELTA", 200.0))
-        self.max_net_vega = float(getattr(cfg, "MAX_NET_VEGA", 120.0))
-        self.max_risk_eq = getattr(cfg, "MAX_RISK_PER_TRADE_EQ", 0.02)
-        self.max_risk_fut = getattr(cfg, "MAX_RISK_PER_TRADE_FUT", 0.03)
-        self.max_risk_opt = getattr(cfg, "MAX_RISK_PER_TRADE_OPT", 0.03)
-        self.position_sizer = PositionSizer()
+        self.cfg = config if config is not None else cfg
+        self.max_daily_loss_pct = getattr(self.cfg, "MAX_DAILY_LOSS_PCT", getattr(self.cfg, "MAX_DAILY_LOSS", 0.15))
+        self.max_trades = getattr(self.cfg, "MAX_TRADES_PER_DAY", 5)
+        self.max_risk_per_trade = getattr(self.cfg, "MAX_RISK_PER_TRADE_PCT", getattr(self.cfg, "MAX_RISK_PER_TRADE", 0.03))
+        self.risk_per_trade_pct = float(getattr(self.cfg, "RISK_PER_TRADE_PCT", self.max_risk_per_trade))
+        self.max_open_risk_pct = getattr(self.cfg, "MAX_OPEN_RISK_PCT", 0.02)
+        self.max_net_delta = float(getattr(self.cfg, "MAX_NET_DELTA", 200.0))
+        self.max_net_vega = float(getattr(self.cfg, "MAX_NET_VEGA_RUPEES", 75000.0))
+        _warn_legacy_net_vega()
+        self.max_risk_eq = getattr(self.cfg, "MAX_RISK_PER_TRADE_EQ", 0.02)
+        self.max_risk_fut = getattr(self.cfg, "MAX_RISK_PER_TRADE_FUT", 0.03)
+        self.max_risk_opt = getattr(self.cfg, "MAX_RISK_PER_TRADE_OPT", 0.03)
+        self.position_sizer = PositionSizer(config=self.cfg)
         self.last_size_reason = "UNINITIALIZED"
         self.last_size_meta = {}
 
@@ -38,38 +57,38 @@ class RiskEngine:
 
     def _daily_loss_mult_for_regime(self, regime: str) -> float:
         if regime == "EVENT":
-            return float(getattr(cfg, "REGIME_EVENT_DAILY_LOSS_MULT", 0.5))
+            return float(getattr(self.cfg, "REGIME_EVENT_DAILY_LOSS_MULT", 0.5))
         if regime == "TREND":
-            return float(getattr(cfg, "REGIME_TREND_DAILY_LOSS_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_TREND_DAILY_LOSS_MULT", 1.0))
         if regime in ("RANGE", "RANGE_VOLATILE"):
-            return float(getattr(cfg, "REGIME_RANGE_DAILY_LOSS_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_RANGE_DAILY_LOSS_MULT", 1.0))
         return 1.0
 
     def _open_risk_mult_for_regime(self, regime: str) -> float:
         if regime == "EVENT":
-            return float(getattr(cfg, "REGIME_EVENT_OPEN_RISK_MULT", 0.6))
+            return float(getattr(self.cfg, "REGIME_EVENT_OPEN_RISK_MULT", 0.6))
         if regime == "TREND":
-            return float(getattr(cfg, "REGIME_TREND_OPEN_RISK_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_TREND_OPEN_RISK_MULT", 1.0))
         if regime in ("RANGE", "RANGE_VOLATILE"):
-            return float(getattr(cfg, "REGIME_RANGE_OPEN_RISK_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_RANGE_OPEN_RISK_MULT", 1.0))
         return 1.0
 
     def _max_trades_mult_for_regime(self, regime: str) -> float:
         if regime == "EVENT":
-            return float(getattr(cfg, "REGIME_EVENT_MAX_TRADES_MULT", 0.6))
+            return float(getattr(self.cfg, "REGIME_EVENT_MAX_TRADES_MULT", 0.6))
         if regime == "TREND":
-            return float(getattr(cfg, "REGIME_TREND_MAX_TRADES_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_TREND_MAX_TRADES_MULT", 1.0))
         if regime in ("RANGE", "RANGE_VOLATILE"):
-            return float(getattr(cfg, "REGIME_RANGE_MAX_TRADES_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_RANGE_MAX_TRADES_MULT", 1.0))
         return 1.0
 
     def _size_mult_for_regime(self, regime: str) -> float:
         if regime == "EVENT":
-            return float(getattr(cfg, "REGIME_EVENT_SIZE_MULT", 0.6))
+            return float(getattr(self.cfg, "REGIME_EVENT_SIZE_MULT", 0.6))
         if regime == "TREND":
-            return float(getattr(cfg, "REGIME_TREND_SIZE_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_TREND_SIZE_MULT", 1.0))
         if regime in ("RANGE", "RANGE_VOLATILE"):
-            return float(getattr(cfg, "REGIME_RANGE_SIZE_MULT", 1.0))
+            return float(getattr(self.cfg, "REGIME_RANGE_SIZE_MULT", 1.0))
         return 1.0
 
     def _block(self, reason: str, context: dict | None = None):
@@ -158,14 +177,14 @@ class RiskEngine:
             trade_exposure = 0.0
         trade_delta, trade_vega = estimate_trade_greeks(trade)
 
-        underlying_limit_pct = float(getattr(cfg, "MAX_UNDERLYING_EXPOSURE_PCT", 0.4))
-        positions_limit = int(getattr(cfg, "MAX_POSITIONS_PER_UNDERLYING", 3))
-        expiry_conc_limit = float(getattr(cfg, "MAX_EXPIRY_CONCENTRATION_PCT", 0.65))
+        underlying_limit_pct = float(getattr(self.cfg, "MAX_UNDERLYING_EXPOSURE_PCT", 0.4))
+        positions_limit = int(getattr(self.cfg, "MAX_POSITIONS_PER_UNDERLYING", 3))
+        expiry_conc_limit = float(getattr(self.cfg, "MAX_EXPIRY_CONCENTRATION_PCT", 0.65))
         net_delta_limit = self.max_net_delta
         net_vega_limit = self.max_net_vega
         if str(regime or "").upper() == "EVENT":
-            net_delta_limit *= float(getattr(cfg, "EVENT_NET_DELTA_MULT", 0.5))
-            net_vega_limit *= float(getattr(cfg, "EVENT_NET_VEGA_MULT", 0.5))
+            net_delta_limit *= float(getattr(self.cfg, "EVENT_NET_DELTA_MULT", 0.5))
+            net_vega_limit *= float(getattr(self.cfg, "EVENT_NET_VEGA_MULT", 0.5))
 
         existing_underlying_exposure = float(exposure_by_underlying.get(trade_underlying, 0.0) or 0.0)
         underlying_exposure_after = existing_underlying_exposure + max(0.0, trade_exposure)
@@ -209,7 +228,7 @@ class RiskEngine:
         if daily_profit_err:
             return self._block(daily_profit_err, {"check": "daily_profit_lock"})
         daily_profit_pct = to_pct(daily_profit_val, equity_high_val)
-        if daily_profit_pct >= getattr(cfg, "DAILY_PROFIT_LOCK", 0.012):
+        if daily_profit_pct >= getattr(self.cfg, "DAILY_PROFIT_LOCK", 0.012):
             return False, "Daily profit lock hit"
 
         daily_pnl_pct, daily_pnl_err = self._required_daily_pnl_pct(portfolio)
@@ -228,13 +247,13 @@ class RiskEngine:
             if pnl_err:
                 return self._block(pnl_err, {"check": "symbol_profit_lock", "symbol": sym})
             pnl_pct = to_pct(pnl_val, equity_high_val)
-            if pnl_pct >= getattr(cfg, "SYMBOL_DAILY_PROFIT_LOCK", 0.006):
+            if pnl_pct >= getattr(self.cfg, "SYMBOL_DAILY_PROFIT_LOCK", 0.006):
                 return False, f"Symbol profit lock hit for {sym}"
         # Daily drawdown lock (from equity high)
         cap_val, cap_err = self._coerce_float(portfolio.get("capital", None), "capital")
         if cap_err:
             return self._block(cap_err, {"check": "daily_drawdown_lock"})
-        if (cap_val - equity_high_val) / max(1.0, equity_high_val) <= getattr(cfg, "DAILY_DRAWNDOWN_LOCK", -0.01):
+        if (cap_val - equity_high_val) / max(1.0, equity_high_val) <= getattr(self.cfg, "DAILY_DRAWNDOWN_LOCK", -0.01):
             return False, "Daily drawdown lock hit"
 
         if portfolio.get("trades_today", 0) >= max_trades_limit:
@@ -274,14 +293,14 @@ class RiskEngine:
             risk_budget *= float(self.risk_state.risk_budget_multiplier())
 
         day_type = getattr(trade, "day_type", "UNKNOWN")
-        risk_budget *= float(getattr(cfg, "DAYTYPE_RISK_MULT", {}).get(day_type, 1.0))
+        risk_budget *= float(getattr(self.cfg, "DAYTYPE_RISK_MULT", {}).get(day_type, 1.0))
 
         if current_vol and current_vol > 0:
-            target = vol_target or getattr(cfg, "VOL_TARGET", 0.002)
+            target = vol_target or getattr(self.cfg, "VOL_TARGET", 0.002)
             scale = target / current_vol
             risk_budget *= max(0.5, min(1.5, scale))
-        if loss_streak >= getattr(cfg, "LOSS_STREAK_CAP", 3):
-            risk_budget *= float(getattr(cfg, "LOSS_STREAK_RISK_MULT", 0.6))
+        if loss_streak >= getattr(self.cfg, "LOSS_STREAK_CAP", 3):
+            risk_budget *= float(getattr(self.cfg, "LOSS_STREAK_RISK_MULT", 0.6))
 
         size_mult = getattr(trade, "size_mult", None)
         if size_mult is None and isinstance(trade, dict):
@@ -3,17 +3,13 @@ import sqlite3
 from pathlib import Path
 from datetime import datetime
 from config import config as cfg
+from core.trade_log_store import iter_trades
 
 def _read_trade_log():
     path = Path("data/trade_log.json")
     if not path.exists():
         return None
-    rows = []
-    with open(path, "r") as f:
-        for line in f:
-            if line.strip():
-                rows.append(json.loads(line))
-    return rows
+    return list(iter_trades(path))
 
 def _days_of_live_trading(rows):
     if not rows:
@@ -33,8 +29,11 @@ def _db_counts():
     try:
         conn = sqlite3.connect(db)
         ticks = conn.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
-        depth = conn.execute("SELECT COUNT(*) FROM depth_snapshots").fetchone()[0]
         conn.close()
+        from core.depth_history import DepthHistoryStore
+        store = DepthHistoryStore(db_path=str(db), retention_days=0)
+        depth = store.count()
+        store.close()
         return {"ticks": ticks, "depth": depth}
     except Exception:
         return {"ticks": 0, "depth": 0}
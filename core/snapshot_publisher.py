@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from threading import Condition, Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import config as cfg
+from core.log_writer import get_jsonl_writer
+from core.paths import logs_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+_ERROR_LOGGER = get_jsonl_writer(logs_dir() / "snapshot_publisher_errors.jsonl")
+
+# Backtest/replay wrap their runs in suppressed() so per-bar chain fetches
+# never touch the live snapshot files.
+_SUPPRESSED: contextvars.ContextVar[bool] = contextvars.ContextVar("snapshot_publish_suppressed", default=False)
+
+
+@contextlib.contextmanager
+def suppressed() -> Iterator[None]:
+    token = _SUPPRESSED.set(True)
+    try:
+        yield
+    finally:
+        _SUPPRESSED.reset(token)
+
+
+class SnapshotPublisher:
+    """
+    Latest per-symbol payloads for one JSON file, written off the hot path.
+
+    - publish() stores the payload in memory and returns; a background
+      writer coalesces everything published within `debounce_sec` into one
+      write.
+    - Each write merges into the file under an flock (other processes keep
+      their symbols) and lands with an atomic rename, so readers never see
+      a half-written file.
+    - Nothing is published while disabled (SNAPSHOT_PUBLISH_ENABLE) or
+      inside `suppressed()`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        debounce_sec: Optional[float] = None,
+        indent: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.debounce_sec = float(
+            debounce_sec if debounce_sec is not None else getattr(cfg, "SNAPSHOT_PUBLISH_DEBOUNCE_SEC", 1.0)
+        )
+        self.indent = indent
+        self._enabled_override = enabled
+        self._latest: Dict[str, Any] = {}
+        self._dirty: Dict[str, Any] = {}
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._stop = False
+        self._flushing = 0
+        self._in_flight = 0
+        self._published = 0
+        self._writes = 0
+        self._last_write_ms: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled_override is not None:
+            return bool(self._enabled_override)
+        return bool(getattr(cfg, "SNAPSHOT_PUBLISH_ENABLE", True))
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def publish(self, symbol: str, payload: Any) -> bool:
+        """
+        Record `payload` as the latest for `symbol`. Returns False when
+        publishing is disabled or suppressed.
+        """
+        if _SUPPRESSED.get() or not self.enabled:
+            return False
+        with self._cond:
+            self._latest[str(symbol)] = payload
+            self._dirty[str(symbol)] = payload
+            self._published += 1
+            if not self.running:
+                self._start_locked()
+            self._cond.notify_all()
+        return True
+
+    def latest(self, symbol: Optional[str] = None) -> Any:
+        with self._cond:
+            if symbol is None:
+                return dict(self._latest)
+            return self._latest.get(str(symbol))
+
+    def _start_locked(self) -> None:
+        self._stop = False
+        self._thread = Thread(target=self._run, name=f"snapshot-{self.path.stem}", daemon=True)
+        self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Write everything published so far without waiting out the debounce.
+        """
+        if not self.running:
+            return not self._dirty
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._dirty or self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(min(remaining, 0.05))
+            finally:
+                self._flushing -= 1
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+        thread.join(timeout=timeout)
+        with self._cond:
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "path": str(self.path),
+                "running": self.running,
+                "symbols": len(self._latest),
+                "pending": len(self._dirty),
+                "published": self._published,
+                "writes": self._writes,
+                "last_write_ms": self._last_write_ms,
+                "last_error": self._last_error,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._dirty and not self._stop:
+                    self._cond.wait()
+                if self._dirty and self.debounce_sec > 0:
+                    deadline = time.monotonic() + self.debounce_sec
+                    while not self._stop and not self._flushing:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                stopping = self._stop
+                batch = self._dirty
+                self._dirty = {}
+                self._in_flight = len(batch)
+            if batch:
+                started = time.perf_counter()
+                try:
+                    self._write(batch)
+                    error = None
+                except Exception as exc:
+                    error = f"{type(exc).__name__}:{exc}"
+                    try:
+                        _ERROR_LOGGER.write({"ts_epoch": time.time(), "path": str(self.path), "error": error})
+                    except Exception:
+                        pass
+                with self._cond:
+                    self._writes += 1
+                    self._last_write_ms = (time.perf_counter() - started) * 1000.0
+                    self._last_error = error
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+                if stopping and not self._dirty:
+                    break
+
+    def _write(self, batch: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.path):
+            existing = _read_json(self.path)
+            if not isinstance(existing, dict):
+                existing = {}
+            existing.update(batch)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(existing, indent=self.indent, default=str))
+            tmp.replace(self.path)
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_name(path.name + ".lock"), "a") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text())
+    except Exception:
+        return None
+
+
+_READ_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_READ_CACHE_LOCK = threading.Lock()
+
+
+def read_snapshot(path: str | Path, default: Any = None) -> Any:
+    """
+    Parsed contents of a published snapshot file, re-read only when its
+    (mtime, size) changes. Files are replaced atomically, so a reader never
+    sees a partial write.
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+    except OSError:
+        return default
+    key = (st.st_mtime_ns, st.st_size)
+    with _READ_CACHE_LOCK:
+        cached = _READ_CACHE.get(str(path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = _read_json(path)
+    if value is None:
+        return default
+    with _READ_CACHE_LOCK:
+        _READ_CACHE[str(path)] = (key, value)
+    return value
+
+
+_PUBLISHERS: Dict[str, SnapshotPublisher] = {}
+_PUBLISHERS_LOCK = threading.Lock()
+
+
+def get_publisher(path: str | Path, indent: Optional[int] = None) -> SnapshotPublisher:
+    """
+    Process-wide publisher for `path`, drained at interpreter exit.
+    """
+    key = str(Path(path))
+    with _PUBLISHERS_LOCK:
+        publisher = _PUBLISHERS.get(key)
+        if publisher is None:
+            publisher = SnapshotPublisher(path, indent=indent)
+            _PUBLISHERS[key] = publisher
+        return publisher
+
+
+def _shutdown_publishers() -> None:
+    with _PUBLISHERS_LOCK:
+        publishers: List[SnapshotPublisher] = list(_PUBLISHERS.values())
+    for publisher in publishers:
+        try:
+            publisher.stop(timeout=2.0)
+        except Exception:
+            pass
+
+
+atexit.register(_shutdown_publishers)
@@ -0,0 +1,211 @@
+"""
+Startup cost report.
+
+    python -m core.startup_profile                      # per-module import cost of core.orchestrator
+    python -m core.startup_profile --module main --top 40
+    python -m core.startup_profile --first-fetch        # fresh interpreter -> first fetch_live_market_data call
+    python -m core.startup_profile --json
+
+Both measurements run in a child interpreter so modules already imported by
+the caller do not hide their cost. --first-fetch runs the child with a
+throwaway DATA_ROOT and working directory, so no desk logs are touched.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Dependencies that must not be imported before the first market-data fetch.
+HEAVY_MODULES = ("xgboost", "sklearn", "tensorflow", "keras", "torch", "stable_baselines3", "gymnasium", "joblib")
+
+
+def _child_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(ROOT)] + [p for p in [env.get("PYTHONPATH")] if p])
+    env.update(extra or {})
+    return env
+
+
+def parse_importtime(text: str) -> List[Dict[str, Any]]:
+    """
+    Rows of `python -X importtime` output as
+    {"module", "self_ms", "cumulative_ms", "depth"}.
+    """
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cum_us = int(parts[1].strip())
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        rows.append(
+            {
+                "module": stripped,
+                "self_ms": self_us / 1000.0,
+                "cumulative_ms": cum_us / 1000.0,
+                "depth": (len(name) - len(stripped)) // 2,
+            }
+        )
+    return rows
+
+
+def heavy_loaded(modules: List[str]) -> List[str]:
+    roots = {m.split(".", 1)[0] for m in modules}
+    return sorted(m for m in HEAVY_MODULES if m in roots)
+
+
+def profile_imports(module: str = "core.orchestrator", python: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import `module` in a fresh interpreter under -X importtime.
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT),
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+    )
+    wall_sec = time.perf_counter() - started
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        tail = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")][-5:]
+        raise RuntimeError(f"import {module} failed: {' | '.join(tail)}")
+    total_ms = next((r["cumulative_ms"] for r in rows if r["module"] == module and r["depth"] == 0), None)
+    return {
+        "module": module,
+        "wall_sec": round(wall_sec, 3),
+        "import_ms": total_ms,
+        "modules": len(rows),
+        "heavy_loaded": heavy_loaded([r["module"] for r in rows]),
+        "rows": rows,
+    }
+
+
+class _FirstFetchReached(BaseException):
+    # BaseException so the trading loop's `except Exception` does not swallow it.
+    pass
+
+
+def _first_fetch_child() -> Dict[str, Any]:
+    started = time.perf_counter()
+    import core.orchestrator as orch_mod
+
+    imported = time.perf_counter()
+    reached: Dict[str, float] = {}
+
+    def _first_fetch(*_args, **_kwargs):
+        reached["at"] = time.perf_counter()
+        reached["modules"] = len(sys.modules)
+        raise _FirstFetchReached()
+
+    orch_mod.fetch_live_market_data = _first_fetch
+    # The probe measures the path to the fetch, not the halt gates in front of it.
+    orch_mod.risk_halt.is_halted = lambda: False
+    orch = orch_mod.Orchestrator(total_capital=100000, poll_interval=0, start_depth_ws_enabled=False)
+    orch.circuit_breaker.is_halted = lambda: False
+    constructed = time.perf_counter()
+    try:
+        orch._legacy_live_monitoring(run_once=True)
+    except _FirstFetchReached:
+        pass
+    if "at" not in reached:
+        raise RuntimeError("fetch_live_market_data was not reached")
+    return {
+        "import_sec": round(imported - started, 3),
+        "init_sec": round(constructed - imported, 3),
+        "first_fetch_sec": round(reached["at"] - started, 3),
+        "modules_loaded": reached["modules"],
+        "heavy_loaded": heavy_loaded(list(sys.modules)),
+    }
+
+
+def measure_first_fetch(python: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Seconds from a fresh interpreter to the Orchestrator's first
+    fetch_live_market_data call (depth websocket and network excluded).
+    """
+    with tempfile.TemporaryDirectory(prefix="startup_profile_") as tmp:
+        child_env = _child_env({"DATA_ROOT": tmp})
+        child_env.update(env or {})
+        Path(tmp, "logs").mkdir(parents=True, exist_ok=True)
+        Path(tmp, "data").mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [python or sys.executable, "-m", "core.startup_profile", "--first-fetch-child"],
+            cwd=tmp,
+            env=child_env,
+            capture_output=True,
+            text=True,
+        )
+        wall_sec = time.perf_counter() - started
+    result_line = next((ln for ln in reversed(proc.stdout.splitlines()) if ln.startswith("{")), None)
+    if proc.returncode != 0 or result_line is None:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-5:]
+        raise RuntimeError(f"first-fetch probe failed: {' | '.join(tail)}")
+    out = json.loads(result_line)
+    out["wall_sec"] = round(wall_sec, 3)
+    return out
+
+
+def _print_imports(report: Dict[str, Any], top: int) -> None:
+    print(f"import {report['module']}: {report['import_ms']:.1f} ms, {report['modules']} modules, wall {report['wall_sec']:.2f}s")
+    if report["heavy_loaded"]:
+        print(f"heavy dependencies loaded: {', '.join(report['heavy_loaded'])}")
+    print(f"{'cumulative_ms':>14} {'self_ms':>9}  module")
+    for row in sorted(report["rows"], key=lambda r: r["cumulative_ms"], reverse=True)[:top]:
+        print(f"{row['cumulative_ms']:>14.1f} {row['self_ms']:>9.1f}  {'  ' * row['depth']}{row['module']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report per-module import cost and time to first market-data fetch.")
+    parser.add_argument("--module", default="core.orchestrator")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--first-fetch", action="store_true")
+    parser.add_argument("--first-fetch-child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.first_fetch_child:
+        print(json.dumps(_first_fetch_child()))
+        return 0
+    if args.first_fetch:
+        result = measure_first_fetch()
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            print(
+                f"first fetch after {result['first_fetch_sec']:.2f}s "
+                f"(import {result['import_sec']:.2f}s, init {result['init_sec']:.2f}s, wall {result['wall_sec']:.2f}s, "
+                f"{result['modules_loaded']} modules)"
+            )
+            print(f"heavy dependencies loaded: {', '.join(result['heavy_loaded']) or 'none'}")
+        return 0
+    report = profile_imports(args.module)
+    if args.json:
+        report = dict(report, rows=sorted(report["rows"], key=lambda r: r["cumulative_ms"], reverse=True)[: args.top])
+        print(json.dumps(report, indent=2))
+    else:
+        _print_imports(report, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
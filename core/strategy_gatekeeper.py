@@ -17,6 +17,9 @@ class StrategyGatekeeper:
       EVENT -> defined-risk only or NO TRADE
       NEUTRAL -> NO TRADE
     """
+    def __init__(self, config=None):
+        self.cfg = config if config is not None else cfg
+
     def evaluate(self, market_data, mode="MAIN") -> GateResult:
         reasons = []
         regime_probs = market_data.get("regime_probs") or {}
@@ -25,24 +28,24 @@ class StrategyGatekeeper:
         else:
             unstable_reasons = ["legacy_unstable_flag"] if bool(market_data.get("unstable_regime_flag", False)) else []
         regime = (market_data.get("primary_regime") or market_data.get("regime") or "NEUTRAL").upper()
-        live_mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper() == "LIVE"
-        paper_relax = (not live_mode) and bool(getattr(cfg, "PAPER_RELAX_GATES", True))
-        regime_prob_min = float(getattr(cfg, "REGIME_PROB_MIN", 0.45))
+        live_mode = str(getattr(self.cfg, "EXECUTION_MODE", "SIM")).upper() == "LIVE"
+        paper_relax = (not live_mode) and bool(getattr(self.cfg, "PAPER_RELAX_GATES", True))
+        regime_prob_min = float(getattr(self.cfg, "REGIME_PROB_MIN", 0.45))
         if paper_relax:
-            regime_prob_min = float(getattr(cfg, "PAPER_REGIME_PROB_MIN", regime_prob_min))
+            regime_prob_min = float(getattr(self.cfg, "PAPER_REGIME_PROB_MIN", regime_prob_min))
         indicators_ok = market_data.get("indicators_ok", True)
         indicators_age = market_data.get("indicators_age_sec")
         if indicators_age is None:
             indicators_age = 0
-        stale = indicators_age > getattr(cfg, "INDICATOR_STALE_SEC", 120)
+        stale = indicators_age > getattr(self.cfg, "INDICATOR_STALE_SEC", 120)
         if not indicators_ok or stale:
             reasons.append("indicators_missing_or_stale")
             return GateResult(False, None, reasons)
         # cross-asset data quality gating
-        required = set(getattr(cfg, "CROSS_REQUIRED_FEEDS", []) or [])
-        optional = set(getattr(cfg, "CROSS_OPTIONAL_FEEDS", []) or [])
-        require_x = bool(getattr(cfg, "REQUIRE_CROSS_ASSET", True))
-        if getattr(cfg, "REQUIRE_CROSS_ASSET_ONLY_WHEN_LIVE", True):
+        required = set(getattr(self.cfg, "CROSS_REQUIRED_FEEDS", []) or [])
+        optional = set(getattr(self.cfg, "CROSS_OPTIONAL_FEEDS", []) or [])
+        require_x = bool(getattr(self.cfg, "REQUIRE_CROSS_ASSET", True))
+        if getattr(self.cfg, "REQUIRE_CROSS_ASSET_ONLY_WHEN_LIVE", True):
             require_x = require_x and live_mode
         try:
             cross_q = market_data.get("cross_asset_quality")
@@ -93,11 +96,11 @@ class StrategyGatekeeper:
 
         shock_score = float(market_data.get("shock_score") or 0.0)
         uncertainty = float(market_data.get("uncertainty_index") or 0.0)
-        if shock_score >= getattr(cfg, "NEWS_SHOCK_BLOCK_THRESHOLD", 0.7):
+        if shock_score >= getattr(self.cfg, "NEWS_SHOCK_BLOCK_THRESHOLD", 0.7):
             reasons.append("news_shock_block")
             return GateResult(False, None, reasons)
-        if shock_score >= getattr(cfg, "NEWS_SHOCK_EVENT_THRESHOLD", 0.4) or uncertainty >= 0.8:
-            if getattr(cfg, "EVENT_ALLOW_DEFINED_RISK", True):
+        if shock_score >= getattr(self.cfg, "NEWS_SHOCK_EVENT_THRESHOLD", 0.4) or uncertainty >= 0.8:
+            if getattr(self.cfg, "EVENT_ALLOW_DEFINED_RISK", True):
                 return GateResult(True, "DEFINED_RISK", reasons + ["news_shock_defined_risk_only"])
             reasons.append("news_shock_no_trade")
             return GateResult(False, None, reasons)
@@ -105,11 +108,11 @@ class StrategyGatekeeper:
         if regime_probs:
             max_prob = max(regime_probs.values()) if regime_probs else 0.0
             if unstable_reasons:
-                paper_soft_unblock_enabled = bool(getattr(cfg, "PAPER_SOFT_UNBLOCK_ENABLE", True))
-                paper_soft_unblock_conf_min = float(getattr(cfg, "PAPER_SOFT_UNBLOCK_CONF_MIN", 0.80))
+                paper_soft_unblock_enabled = bool(getattr(self.cfg, "PAPER_SOFT_UNBLOCK_ENABLE", True))
+                paper_soft_unblock_conf_min = float(getattr(self.cfg, "PAPER_SOFT_UNBLOCK_CONF_MIN", 0.80))
                 contradictory_reasons = set(
                     str(x).strip()
-                    for x in (getattr(cfg, "PAPER_SOFT_UNBLOCK_CONTRADICTORY_REASONS", ["entropy_too_high", "prob_too_low"]) or [])
+                    for x in (getattr(self.cfg, "PAPER_SOFT_UNBLOCK_CONTRADICTORY_REASONS", ["entropy_too_high", "prob_too_low"]) or [])
                     if str(x).strip()
                 )
                 if (
@@ -133,13 +136,13 @@ class StrategyGatekeeper:
         if regime in ("RANGE", "RANGE_VOLATILE"):
             return GateResult(True, "MEAN_REVERT", reasons)
         if regime == "EVENT":
-            if getattr(cfg, "EVENT_ALLOW_DEFINED_RISK", True):
+            if getattr(self.cfg, "EVENT_ALLOW_DEFINED_RISK", True):
                 return GateResult(True, "DEFINED_RISK", reasons + ["event_defined_risk_only"])
             reasons.append("event_no_trade")
             return GateResult(False, None, reasons)
         if regime == "NEUTRAL":
             if paper_relax:
-                family = str(getattr(cfg, "PAPER_NEUTRAL_FAMILY", "DEFINED_RISK")).upper()
+                family = str(getattr(self.cfg, "PAPER_NEUTRAL_FAMILY", "DEFINED_RISK")).upper()
                 if family in {"DEFINED_RISK", "SCALP_ONLY"}:
                     return GateResult(True, family, reasons + ["paper_neutral_routed"])
             reasons.append("neutral_no_trade")
@@ -5,9 +5,11 @@ import random
 from dataclasses import dataclass
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
 
 from config import config as cfg
+from core.option_chain_frame import OptionChainFrame
 from core.risk_state import RiskState
 
 
@@ -114,28 +116,40 @@ class SyntheticStressGenerator:
         return scenarios
 
     def distort_chain(self, chain: List[dict], scenario: StressScenario) -> List[dict]:
+        # Columns are cached on the frame, so distorting one chain under many
+        # scenarios converts it once.
+        frame = OptionChainFrame.of(chain)
+        bid = frame.num("bid", none=0.0)
+        ask = frame.num("ask", none=0.0)
+        quoted = ((bid != 0) & (ask != 0)).tolist()
+        mid = (bid + ask) / 2
+        widen = (ask - bid) * (1 + scenario.spread_widen_pct)
+        new_bid = np.fmax(0.01, mid - widen / 2)
+        new_ask = np.fmax(new_bid + 0.01, mid + widen / 2).tolist()
+        new_bid = new_bid.tolist()
+        new_iv = (frame.num("iv") * (1 + scenario.iv_spike)).tolist()
+        thin = 1 - self.ob_thin_factor
+
+        def _thinned(key):
+            qty = np.fmax(1.0, np.trunc(frame.num(key) * thin)).tolist()
+            return [None if v is None else int(q) for v, q in zip(frame.values(key), qty)]
+
+        bid_qty = _thinned("bid_qty")
+        ask_qty = _thinned("ask_qty")
         out = []
-        for c in chain:
-            bid = c.get("bid")
-            ask = c.get("ask")
-            if bid and ask:
-                mid = (bid + ask) / 2
-                widen = (ask - bid) * (1 + scenario.spread_widen_pct)
-                bid = max(0.01, mid - widen / 2)
-                ask = max(bid + 0.01, mid + widen / 2)
-            iv = c.get("iv")
-            if iv is not None:
-                iv = iv * (1 + scenario.iv_spike)
-            bid_qty = c.get("bid_qty")
-            ask_qty = c.get("ask_qty")
-            if bid_qty is not None:
-                bid_qty = max(1, int(bid_qty * (1 - self.ob_thin_factor)))
-            if ask_qty is not None:
-                ask_qty = max(1, int(ask_qty * (1 - self.ob_thin_factor)))
+        for i, (c, bid_v, ask_v, iv) in enumerate(zip(frame, frame.values("bid"), frame.values("ask"), frame.values("iv"))):
+            if quoted[i]:
+                bid_v, ask_v = new_bid[i], new_ask[i]
             row = dict(c)
-            row.update({"bid": bid, "ask": ask, "iv": iv, "bid_qty": bid_qty, "ask_qty": ask_qty})
+            row.update({
+                "bid": bid_v,
+                "ask": ask_v,
+                "iv": None if iv is None else new_iv[i],
+                "bid_qty": bid_qty[i],
+                "ask_qty": ask_qty[i],
+            })
             out.append(row)
-        return out
+        return OptionChainFrame(out)
 
     def fill_degradation(self, base_fill_prob: float, scenario: StressScenario) -> float:
         degraded = base_fill_prob * (1 - scenario.fill_degradation)
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import csv
-import json
 import random
 import sqlite3
 from dataclasses import dataclass
@@ -9,6 +8,9 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Optional
 
+from core.db_indexes import ensure_indexes
+from core.depth_history import DepthHistoryStore
+
 
 IST = timezone(timedelta(hours=5, minutes=30))
 
@@ -112,18 +114,14 @@ def write_ohlcv_csv(out_path: Path, bars: List[dict]) -> None:
             writer.writerow({k: row.get(k) for k in fields})
 
 
-def _depth_json_for_price(price: float, spread_bps: float = 5.0) -> str:
+def _depth_for_price(price: float, spread_bps: float = 5.0) -> dict:
     spread = price * (spread_bps / 10000.0)
     bid = max(0.01, price - spread / 2.0)
     ask = price + spread / 2.0
-    depth = {
-        "depth": {
-            "buy": [{"quantity": 100, "price": bid, "orders": 1}] * 5,
-            "sell": [{"quantity": 100, "price": ask, "orders": 1}] * 5,
-        },
-        "imbalance": 0.0,
+    return {
+        "buy": [{"quantity": 100, "price": bid, "orders": 1}] * 5,
+        "sell": [{"quantity": 100, "price": ask, "orders": 1}] * 5,
     }
-    return json.dumps(depth)
 
 
 def write_sqlite_session(db_path: Path, symbol: str, bars: List[dict]) -> None:
@@ -138,31 +136,20 @@ def write_sqlite_session(db_path: Path, symbol: str, bars: List[dict]) -> None:
         "timestamp_epoch REAL, timestamp TEXT, instrument_token INTEGER, "
         "last_price REAL, volume INTEGER)"
     )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS depth_snapshots ("
-        "timestamp_epoch REAL, timestamp TEXT, instrument_token INTEGER, depth_json TEXT)"
+    cur.executemany(
+        "INSERT INTO ticks (timestamp_epoch, timestamp, instrument_token, last_price, volume) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (row["timestamp_epoch"], row["timestamp_iso"], token, row["close"], row["volume"])
+            for row in bars
+        ],
     )
-    for row in bars:
-        cur.execute(
-            "INSERT INTO ticks (timestamp_epoch, timestamp, instrument_token, last_price, volume) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (
-                row["timestamp_epoch"],
-                row["timestamp_iso"],
-                token,
-                row["close"],
-                row["volume"],
-            ),
-        )
-        cur.execute(
-            "INSERT INTO depth_snapshots (timestamp_epoch, timestamp, instrument_token, depth_json) "
-            "VALUES (?, ?, ?, ?)",
-            (
-                row["timestamp_epoch"],
-                row["timestamp_iso"],
-                token,
-                _depth_json_for_price(row["close"]),
-            ),
-        )
+    ensure_indexes(conn, ("ticks",))
     conn.commit()
     conn.close()
+    store = DepthHistoryStore(db_path=str(db_path), retention_days=0, batch_size=max(1, len(bars)))
+    try:
+        for row in bars:
+            store.append(row["timestamp_epoch"], token, _depth_for_price(row["close"]), 0.0)
+    finally:
+        store.close()
@@ -3,6 +3,8 @@ import time
 from pathlib import Path
 import requests
 from config import config as cfg
+from core import notification_outbox
+from core.notification_outbox import NotificationOutbox, SendResult
 from core.trade_ticket import TradeTicket
 
 
@@ -19,6 +21,29 @@ def _log_blocked(reason: str, payload: dict | None = None) -> None:
         print("[TELEGRAM_BLOCKED] failed to log")
 
 
+def _deliver(message: str) -> SendResult:
+    url = f"{cfg.TELEGRAM_API_BASE}/bot{cfg.TELEGRAM_BOT_TOKEN}/sendMessage"
+    payload = {"chat_id": cfg.TELEGRAM_CHAT_ID, "text": message}
+    try:
+        resp = requests.post(url, data=payload, timeout=float(getattr(cfg, "TELEGRAM_TIMEOUT_SEC", 5.0)))
+    except Exception as e:
+        return SendResult(False, error=f"{type(e).__name__}:{e}")
+    status = int(getattr(resp, "status_code", 200) or 200)
+    if 200 <= status < 300:
+        return SendResult(True)
+    retry_after = None
+    try:
+        retry_after = float(resp.json().get("parameters", {}).get("retry_after"))
+    except Exception:
+        pass
+    # 429 and 5xx are worth retrying; other 4xx (bad chat id, revoked token) are not.
+    permanent = 400 <= status < 500 and status != 429
+    return SendResult(False, retry_after=retry_after, error=f"http_{status}", permanent=permanent)
+
+
+telegram_outbox = notification_outbox.register(NotificationOutbox(sender=_deliver))
+
+
 def send_trade_ticket(ticket: TradeTicket) -> bool:
     if not cfg.ENABLE_TELEGRAM:
         return False
@@ -40,17 +65,19 @@ def send_trade_ticket(ticket: TradeTicket) -> bool:
             _log_blocked("missing_contract", {"detail": reason, "trace_id": ticket.trace_id})
             return False
         message = ticket.format_message()
-    url = f"https://api.telegram.org/bot{cfg.TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": cfg.TELEGRAM_CHAT_ID, "text": message}
-    try:
-        requests.post(url, data=payload)
-        return True
-    except Exception as e:
-        _log_blocked("send_error", {"detail": str(e), "trace_id": ticket.trace_id})
-        return False
+    result = _deliver(message)
+    if not result.ok:
+        _log_blocked("send_error", {"detail": result.error, "trace_id": ticket.trace_id})
+    return result.ok
 
 
-def send_telegram_message(message: str) -> bool:
+def send_telegram_message(message: str, key: str | None = None, min_interval_sec: float = 0.0) -> bool:
+    """
+    Queue a non-trade alert on the outbox and return immediately.
+
+    `key` with `min_interval_sec` keeps at most one message per key in that
+    window. With TELEGRAM_OUTBOX_ENABLE=false the message is posted inline.
+    """
     if not cfg.ENABLE_TELEGRAM:
         return False
     if not cfg.TELEGRAM_BOT_TOKEN or not cfg.TELEGRAM_CHAT_ID:
@@ -59,11 +86,13 @@ def send_telegram_message(message: str) -> bool:
     if not getattr(cfg, "TELEGRAM_ALLOW_NON_TRADE_ALERTS", False):
         _log_blocked("non_trade_blocked", {"message": message[:200]})
         return False
-    url = f"https://api.telegram.org/bot{cfg.TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": cfg.TELEGRAM_CHAT_ID, "text": message}
-    try:
-        requests.post(url, data=payload)
-        return True
-    except Exception as e:
-        _log_blocked("send_error", {"detail": str(e)})
-        return False
+    if getattr(cfg, "TELEGRAM_OUTBOX_ENABLE", True):
+        return telegram_outbox.enqueue(message, key=key, min_interval_sec=min_interval_sec)
+    result = _deliver(message)
+    if not result.ok:
+        _log_blocked("send_error", {"detail": result.error})
+    return result.ok
+
+
+def outbox_stats() -> dict:
+    return telegram_outbox.stats()
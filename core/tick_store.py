@@ -1,12 +1,12 @@
-import sqlite3
 import time
 import json
-from pathlib import Path
 from datetime import datetime, timezone
 from collections import deque
 from config import config as cfg
+from core import db_pool
 from core.paths import logs_dir
 from core.log_writer import get_jsonl_writer
+from core.tick_writer import TICKS_SCHEMA_VERSION, ensure_ticks_schema, tick_writer
 
 _tick_window = deque(maxlen=200000)
 _LAST_TICK_EPOCH = None
@@ -14,32 +14,30 @@ _ERROR_LOG_PATH = logs_dir() / "tick_store_errors.jsonl"
 _ERROR_LOGGER = get_jsonl_writer(_ERROR_LOG_PATH)
 
 def _conn():
-    Path(cfg.TRADE_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(cfg.TRADE_DB_PATH)
+    return db_pool.connection(cfg.TRADE_DB_PATH)
 
 def init_ticks():
-    with _conn() as conn:
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS ticks (
-            timestamp TEXT,
-            instrument_token INTEGER,
-            last_price REAL,
-            volume INTEGER,
-            oi INTEGER,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT
-        )
-        """
-        )
-        try:
-            conn.execute("ALTER TABLE ticks ADD COLUMN timestamp_epoch REAL")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE ticks ADD COLUMN timestamp_iso TEXT")
-        except Exception:
-            pass
+    db_pool.ensure_schema("ticks", TICKS_SCHEMA_VERSION, ensure_ticks_schema, cfg.TRADE_DB_PATH)
+
+
+def _ensure_ticks_once():
+    init_ticks()
+
+
+def start_tick_writer() -> bool:
+    """
+    Route insert_tick through the batched background writer.
+    """
+    return tick_writer.start()
+
+
+def stop_tick_writer(timeout: float = 5.0) -> None:
+    tick_writer.stop(timeout=timeout)
+
+
+def flush_ticks(timeout: float = 5.0) -> bool:
+    return tick_writer.flush(timeout=timeout)
+
 
 def _to_epoch(ts):
     if ts is None or ts == "" or ts == "None":
@@ -125,15 +123,18 @@ def insert_tick(ts, token, last_price, volume, oi):
     else:
         ts_iso = datetime.fromtimestamp(ts_epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
     record_tick_epoch(ts_epoch)
+    row = (ts_iso, token, last_price, volume, oi, ts_epoch, ts_iso)
+    if tick_writer.running:
+        return tick_writer.submit(row)
     try:
-        init_ticks()
+        _ensure_ticks_once()
         with _conn() as conn:
             conn.execute(
                 """
             INSERT INTO ticks (timestamp, instrument_token, last_price, volume, oi, timestamp_epoch, timestamp_iso)
             VALUES (?,?,?,?,?,?,?)
             """,
-                (ts_iso, token, last_price, volume, oi, ts_epoch, ts_iso),
+                row,
             )
     except Exception as exc:
         try:
@@ -160,3 +161,12 @@ def msgs_last_min() -> int:
 
 def last_tick_epoch():
     return _LAST_TICK_EPOCH
+
+
+def writer_stats() -> dict:
+    """
+    Queue depth, flush latency and drop counters of the background tick writer.
+    """
+    stats = tick_writer.stats()
+    stats["msgs_last_min"] = msgs_last_min()
+    return stats
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import atexit
+import sqlite3
+import time
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import config as cfg
+from core import db_indexes, db_pool
+from core.paths import logs_dir
+from core.log_writer import get_jsonl_writer
+
+_ERROR_LOG_PATH = logs_dir() / "tick_store_errors.jsonl"
+_ERROR_LOGGER = get_jsonl_writer(_ERROR_LOG_PATH)
+
+_INSERT_SQL = """
+INSERT INTO ticks (timestamp, instrument_token, last_price, volume, oi, timestamp_epoch, timestamp_iso)
+VALUES (?,?,?,?,?,?,?)
+"""
+
+TICKS_SCHEMA_VERSION = 2
+
+OVERFLOW_DROP_OLDEST = "DROP_OLDEST"
+OVERFLOW_BLOCK = "BLOCK"
+
+
+def ensure_ticks_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+    CREATE TABLE IF NOT EXISTS ticks (
+        timestamp TEXT,
+        instrument_token INTEGER,
+        last_price REAL,
+        volume INTEGER,
+        oi INTEGER,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT
+    )
+    """
+    )
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(ticks)").fetchall()}
+    if "timestamp_epoch" not in cols:
+        conn.execute("ALTER TABLE ticks ADD COLUMN timestamp_epoch REAL")
+    if "timestamp_iso" not in cols:
+        conn.execute("ALTER TABLE ticks ADD COLUMN timestamp_iso TEXT")
+    db_indexes.ensure_indexes(conn, ("ticks",))
+
+
+class TickWriter:
+    """
+    Batched tick writer backed by a bounded in-memory ring and one writer thread.
+
+    - Producers (the KiteTicker callback) only append to the ring and return.
+    - The writer thread drains up to `batch_size` rows per transaction with
+      executemany over a single long-lived WAL connection.
+    - When the ring is full, DROP_OLDEST evicts the oldest pending row and
+      BLOCK waits up to `block_timeout_sec` for room before evicting.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        capacity: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_sec: Optional[float] = None,
+        overflow: Optional[str] = None,
+        block_timeout_sec: Optional[float] = None,
+    ) -> None:
+        self._db_path_override = db_path
+        self.capacity = int(capacity or getattr(cfg, "TICK_WRITER_QUEUE_MAX", 50000))
+        self.batch_size = int(batch_size or getattr(cfg, "TICK_WRITER_BATCH_SIZE", 500))
+        self.flush_interval_sec = float(
+            flush_interval_sec if flush_interval_sec is not None else getattr(cfg, "TICK_WRITER_FLUSH_INTERVAL_SEC", 0.25)
+        )
+        self.overflow = str(overflow or getattr(cfg, "TICK_WRITER_OVERFLOW", OVERFLOW_DROP_OLDEST)).upper()
+        self.block_timeout_sec = float(
+            block_timeout_sec if block_timeout_sec is not None else getattr(cfg, "TICK_WRITER_BLOCK_TIMEOUT_SEC", 0.05)
+        )
+        self._buf: deque = deque()
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._stop = False
+        self._in_flight = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_path: Optional[str] = None
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._errors = 0
+        self._last_flush_ms: Optional[float] = None
+        self._max_flush_ms: Optional[float] = None
+        self._avg_flush_ms: Optional[float] = None
+        self._last_flush_epoch: Optional[float] = None
+        self._last_batch_rows = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def db_path(self) -> str:
+        return str(self._db_path_override or cfg.TRADE_DB_PATH)
+
+    def start(self) -> bool:
+        with self._cond:
+            if self.running:
+                return False
+            self._stop = False
+            self._thread = Thread(target=self._run, name="tick-writer", daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+        thread.join(timeout=timeout)
+        with self._cond:
+            self._thread = None
+
+    def submit(self, row: Sequence[Any]) -> bool:
+        """
+        Enqueue one tick row. The row is always accepted; overflow evicts the
+        oldest pending row and is counted in stats()["dropped"].
+        """
+        with self._cond:
+            if len(self._buf) >= self.capacity and self.overflow == OVERFLOW_BLOCK and self.running:
+                deadline = time.monotonic() + self.block_timeout_sec
+                while len(self._buf) >= self.capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            while len(self._buf) >= self.capacity:
+                self._buf.popleft()
+                self._dropped += 1
+            self._buf.append(tuple(row))
+            self._submitted += 1
+            if len(self._buf) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued row has been committed. Without a running
+        writer thread the queue is drained on the calling thread.
+        """
+        if not self.running:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return True
+                self._write_batch(batch)
+                self._finish_batch()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._buf or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._buf)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "running": self.running,
+                "overflow": self.overflow,
+                "capacity": self.capacity,
+                "queue_depth": len(self._buf),
+                "submitted": self._submitted,
+                "written": self._written,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "errors": self._errors,
+                "last_batch_rows": self._last_batch_rows,
+                "last_flush_ms": self._last_flush_ms,
+                "avg_flush_ms": self._avg_flush_ms,
+                "max_flush_ms": self._max_flush_ms,
+                "last_flush_epoch": self._last_flush_epoch,
+            }
+
+    def _take_batch(self) -> List[tuple]:
+        with self._cond:
+            n = min(len(self._buf), self.batch_size)
+            batch = [self._buf.popleft() for _ in range(n)]
+            self._in_flight = n
+            if n:
+                self._cond.notify_all()
+            return batch
+
+    def _finish_batch(self) -> None:
+        with self._cond:
+            self._in_flight = 0
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    if len(self._buf) < self.batch_size and not self._stop:
+                        self._cond.wait(self.flush_interval_sec)
+                    if self._stop and not self._buf:
+                        break
+                batch = self._take_batch()
+                if batch:
+                    self._write_batch(batch)
+                self._finish_batch()
+        finally:
+            self._close_conn()
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.db_path()
+        if self._conn is not None and self._conn_path == path:
+            return self._conn
+        self._close_conn()
+        db_pool.ensure_schema("ticks", TICKS_SCHEMA_VERSION, ensure_ticks_schema, path)
+        conn = db_pool.open_connection(path, check_same_thread=False)
+        self._conn = conn
+        self._conn_path = path
+        return conn
+
+    def _close_conn(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._conn_path = None
+
+    def _write_batch(self, rows: List[tuple]) -> bool:
+        started = time.perf_counter()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(_INSERT_SQL, rows)
+        except Exception as exc:
+            self._close_conn()
+            with self._cond:
+                self._errors += 1
+                self._dropped += len(rows)
+            try:
+                _ERROR_LOGGER.write(
+                    {
+                        "ts_epoch": time.time(),
+                        "event": "TICK_WRITER_ERROR",
+                        "rows": len(rows),
+                        "error": f"{type(exc).__name__}:{exc}",
+                    }
+                )
+            except Exception:
+                pass
+            return False
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._cond:
+            self._written += len(rows)
+            self._batches += 1
+            self._last_batch_rows = len(rows)
+            self._last_flush_ms = elapsed_ms
+            self._last_flush_epoch = time.time()
+            if self._max_flush_ms is None or elapsed_ms > self._max_flush_ms:
+                self._max_flush_ms = elapsed_ms
+            if self._avg_flush_ms is None:
+                self._avg_flush_ms = elapsed_ms
+            else:
+                self._avg_flush_ms = 0.9 * self._avg_flush_ms + 0.1 * elapsed_ms
+        return True
+
+
+tick_writer = TickWriter()
+
+
+def _shutdown_tick_writer() -> None:
+    try:
+        tick_writer.stop(timeout=5.0)
+    except Exception:
+        pass
+
+
+atexit.register(_shutdown_tick_writer)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from core.trade_log_paths import resolve_trade_log_path
+
+TRADE_UPDATES_PATH = Path("data/trade_updates.json")
+
+# Update-record keys that describe the record itself, not the trade.
+_UPDATE_META_KEYS = ("type", "timestamp")
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size
+
+
+class _JsonlTail:
+    """
+    Incremental reader over an append-only JSONL file: each sync() parses only
+    bytes added since the last one, and starts over if the file was replaced
+    or truncated.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.inode: Optional[int] = None
+        self.offset = 0
+
+    def sync(self, on_reset, on_record) -> None:
+        key = _stat_key(self.path)
+        if key is None:
+            if self.inode is not None or self.offset:
+                self.inode, self.offset = None, 0
+                on_reset()
+            return
+        inode, size = key
+        if inode != self.inode or size < self.offset:
+            self.inode, self.offset = inode, 0
+            on_reset()
+        if size == self.offset:
+            return
+        with self.path.open("rb") as f:
+            f.seek(self.offset)
+            pos = self.offset
+            for raw in f:
+                start = pos
+                pos += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except Exception:
+                    continue
+                if isinstance(record, dict):
+                    on_record(start, record)
+        self.offset = pos
+
+
+class TradeLogStore:
+    """
+    Keyed access to the trade log without rewriting it.
+
+    The trade log (one JSON entry per line) is indexed trade_id -> byte offset
+    and the updates journal (`trade_updates.json`, one fill/outcome record per
+    line) is folded into a per-trade overlay. Both are extended incrementally
+    as the files grow, so lookups seek to one line and updates append one
+    journal record. compact() folds the overlay back into the log when
+    rewriting it is allowed.
+    """
+
+    def __init__(self, path: Path, updates_path: Path = TRADE_UPDATES_PATH):
+        self.path = Path(path)
+        self.updates_path = Path(updates_path)
+        self._lock = RLock()
+        self._offsets: Dict[Any, int] = {}
+        self._overlay: Dict[Any, Dict[str, Any]] = {}
+        self._log_tail = _JsonlTail(self.path)
+        self._updates_tail = _JsonlTail(self.updates_path)
+        self.updates_since_compact = 0
+
+    def _index_entry(self, offset: int, entry: Dict[str, Any]) -> None:
+        trade_id = entry.get("trade_id")
+        if trade_id is not None:
+            self._offsets.setdefault(trade_id, offset)
+
+    def _fold_update(self, _offset: int, record: Dict[str, Any]) -> None:
+        trade_id = record.get("trade_id")
+        if trade_id is None:
+            return
+        overlay = self._overlay.setdefault(trade_id, {})
+        for key, value in record.items():
+            if key not in _UPDATE_META_KEYS and key != "trade_id":
+                overlay[key] = value
+
+    def sync(self) -> None:
+        with self._lock:
+            self._log_tail.sync(self._offsets.clear, self._index_entry)
+            self._updates_tail.sync(self._overlay.clear, self._fold_update)
+
+    def __contains__(self, trade_id) -> bool:
+        with self._lock:
+            self.sync()
+            return trade_id in self._offsets
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.sync()
+            return len(self._offsets)
+
+    def _read_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self.path.open("rb") as f:
+                f.seek(offset)
+                return json.loads(f.readline().decode("utf-8"))
+        except Exception:
+            return None
+
+    def get(self, trade_id, merged: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        The logged entry for trade_id (first occurrence), with journal updates
+        applied unless merged=False.
+        """
+        with self._lock:
+            self.sync()
+            offset = self._offsets.get(trade_id)
+            if offset is None:
+                return None
+            entry = self._read_at(offset)
+            if entry is None:
+                return None
+            if merged:
+                entry.update(self._overlay.get(trade_id, {}))
+            return entry
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.sync()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as f:
+                start = f.tell()
+                prefix = b"" if start == 0 or self._ends_with_newline() else b"\n"
+                f.write(prefix + (json.dumps(entry) + "\n").encode("utf-8"))
+                end = f.tell()
+                inode = os.fstat(f.fileno()).st_ino
+            if self._log_tail.offset == start:
+                self._index_entry(start + len(prefix), entry)
+                self._log_tail.offset = end
+                self._log_tail.inode = inode
+
+    def _ends_with_newline(self) -> bool:
+        try:
+            with self.path.open("rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except OSError:
+            return True
+
+    def record_update(self, update: Dict[str, Any]) -> None:
+        """
+        Append one update record (fill/outcome) to the journal.
+        """
+        with self._lock:
+            self.sync()
+            self.updates_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.updates_path.open("ab") as f:
+                start = f.tell()
+                f.write((json.dumps(update) + "\n").encode("utf-8"))
+                end = f.tell()
+                inode = os.fstat(f.fileno()).st_ino
+            if self._updates_tail.offset == start:
+                self._fold_update(start, update)
+                self._updates_tail.offset = end
+                self._updates_tail.inode = inode
+            self.updates_since_compact += 1
+
+    def iter_trades(self, merged: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Stream log entries in file order, with journal updates applied unless
+        merged=False. Unparseable lines are skipped.
+        """
+        with self._lock:
+            self.sync()
+            overlay = {k: dict(v) for k, v in self._overlay.items()} if merged else {}
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as f:
+            for raw in f:
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line.decode("utf-8"))
+                except Exception:
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                extra = overlay.get(entry.get("trade_id"))
+                if extra:
+                    entry.update(extra)
+                yield entry
+
+    def compact(self) -> int:
+        """
+        Rewrite the log with journal updates folded in (atomic replace).
+        The journal is left untouched; re-applying it is idempotent.
+        Returns the number of entries written.
+        """
+        with self._lock:
+            tmp = self.path.with_name(self.path.name + ".compact.tmp")
+            count = 0
+            with tmp.open("w", encoding="utf-8") as out:
+                for entry in self.iter_trades(merged=True):
+                    out.write(json.dumps(entry) + "\n")
+                    count += 1
+            tmp.replace(self.path)
+            self.updates_since_compact = 0
+            self.sync()
+            return count
+
+
+_STORES: Dict[str, TradeLogStore] = {}
+_STORES_LOCK = RLock()
+
+
+def trade_log_store(path: str | Path | None = None, updates_path: str | Path | None = None) -> TradeLogStore:
+    """
+    Shared store for a trade-log path (the resolved configured log when None).
+    """
+    log_path = resolve_trade_log_path(path).resolve()
+    upd_path = Path(updates_path or TRADE_UPDATES_PATH).resolve()
+    key = f"{log_path}|{upd_path}"
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = TradeLogStore(log_path, upd_path)
+            _STORES[key] = store
+        return store
+
+
+def iter_trades(path: str | Path | None = None, merged: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming iterator over the trade log. Also accepts a legacy JSON-array file.
+    """
+    log_path = resolve_trade_log_path(path)
+    try:
+        with log_path.open("rb") as f:
+            head = f.read(64).lstrip()
+    except OSError:
+        return iter(())
+    if head.startswith(b"["):
+        try:
+            rows = json.loads(log_path.read_text())
+        except Exception:
+            return iter(())
+        return iter([r for r in rows if isinstance(r, dict)])
+    return trade_log_store(log_path).iter_trades(merged=merged)
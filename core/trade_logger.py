@@ -17,6 +17,7 @@ from pathlib import Path
 from core.trade_schema import build_instrument_id, validate_trade_identity
 from core.post_trade_labeler import PostTradeLabeler
 from core.trade_log_paths import ensure_trade_log_file
+from core.trade_log_store import trade_log_store
 import time
 
 
@@ -119,17 +120,62 @@ def log_trade(trade, extra=None):
     if extra:
         log_entry.update(extra)
 
-    trade_log_path = _trade_log_path()
-    with trade_log_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(log_entry) + "\n")
+    trade_log_store(_trade_log_path()).append(log_entry)
     try:
         insert_trade(log_entry)
     except Exception as exc:
         _log_error({"error": "insert_trade_failed", "detail": str(exc), "trade_id": trade.trade_id})
 
-def _append_update(update_entry):
-    with open("data/trade_updates.json", "a") as f:
-        f.write(json.dumps(update_entry) + "\n")
+def _append_update(update_entry, store=None):
+    (store or trade_log_store(_trade_log_path())).record_update(update_entry)
+
+
+_STRATEGY_PERF_PATH = "logs/strategy_perf.json"
+_TRACKER_CACHE = {"key": None, "tracker": None}
+
+
+def _strategy_tracker():
+    """
+    StrategyTracker loaded from strategy_perf.json, reused until the file
+    changes on disk (by path and mtime).
+    """
+    path = Path(_STRATEGY_PERF_PATH).resolve()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    key = (str(path), mtime)
+    if _TRACKER_CACHE["tracker"] is None or _TRACKER_CACHE["key"] != key:
+        from core.strategy_tracker import StrategyTracker
+        tracker = StrategyTracker()
+        tracker.load(_STRATEGY_PERF_PATH)
+        _TRACKER_CACHE["tracker"] = tracker
+        _TRACKER_CACHE["key"] = key
+    return _TRACKER_CACHE["tracker"]
+
+
+def _record_strategy_pnl(strategy, symbol, pnl) -> None:
+    tracker = _strategy_tracker()
+    tracker.record(strategy, pnl)
+    tracker.record_symbol(symbol, pnl)
+    tracker.save(_STRATEGY_PERF_PATH)
+    path = Path(_STRATEGY_PERF_PATH).resolve()
+    try:
+        _TRACKER_CACHE["key"] = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        _TRACKER_CACHE["key"] = None
+
+
+def _maybe_compact(store) -> None:
+    every = int(getattr(cfg, "TRADE_LOG_COMPACT_UPDATES", 200) or 0)
+    if every <= 0 or store.updates_since_compact < every:
+        return
+    if getattr(cfg, "APPEND_ONLY_LOG", False) or log_lock.is_locked():
+        return
+    try:
+        store.compact()
+    except Exception as exc:
+        _log_error({"error": "trade_log_compact_failed", "detail": str(exc)})
 
 
 def _log_error(payload: dict) -> None:
@@ -197,16 +243,46 @@ def update_trade_outcome(
     avg_exit=None,
     exit_reason_final=None,
 ):
-    path = _trade_log_path()
-    from core.strategy_tracker import StrategyTracker
-    tracker = StrategyTracker()
-    tracker.load("logs/strategy_perf.json")
+    store = trade_log_store(_trade_log_path())
     strategy = None
     symbol = None
     side = None
     entry_price = None
     qty = None
+    paper_aux = False
     metrics = {}
+    logged = store.get(trade_id, merged=False)
+
+    def _apply_metrics(target, base):
+        nonlocal metrics
+        metrics = _compute_realized_metrics(base, exit_price, actual, exit_reason=exit_reason)
+        if realized_pnl_override is not None:
+            metrics["realized_pnl"] = float(realized_pnl_override)
+        if r_multiple_realized_override is not None:
+            metrics["r_multiple_realized"] = float(r_multiple_realized_override)
+        if outcome_label_override is not None:
+            metrics["outcome_label"] = str(outcome_label_override)
+        if outcome_grade_override is not None:
+            metrics["outcome_grade"] = str(outcome_grade_override)
+        r_mult = metrics["r_multiple_realized"]
+        target["r_multiple"] = round(r_mult, 3)
+        target["r_label"] = 1 if r_mult >= 1 else 0
+        target["realized_pnl"] = metrics["realized_pnl"]
+        target["r_multiple_realized"] = metrics["r_multiple_realized"]
+        target["outcome_label"] = metrics["outcome_label"]
+        target["outcome_grade"] = metrics["outcome_grade"]
+        target["exit_reason"] = metrics["exit_reason"]
+
+    def _record_pnl():
+        try:
+            if entry_price is not None and qty is not None and not paper_aux:
+                pnl = (exit_price - entry_price) * qty
+                if side == "SELL":
+                    pnl *= -1
+                _record_strategy_pnl(strategy, symbol, pnl)
+        except Exception:
+            pass
+
     if getattr(cfg, "APPEND_ONLY_LOG", False) or log_lock.is_locked():
         # Append-only update record
         entry = {
@@ -219,41 +295,18 @@ def update_trade_outcome(
             "exit_reason": exit_reason,
         }
         # Compute R-multiple only if we can read the original entry
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    e = json.loads(line)
-                    if e.get("trade_id") == trade_id:
-                        entry_price = e.get("entry", 0)
-                        stop = e.get("stop_loss", 0)
-                        side = e.get("side", "BUY")
-                        strategy = e.get("strategy")
-                        symbol = e.get("symbol")
-                        qty = e.get("qty", 1)
-                        paper_aux = e.get("paper_aux", False)
-                        metrics = _compute_realized_metrics(e, exit_price, actual, exit_reason=exit_reason)
-                        if realized_pnl_override is not None:
-                            metrics["realized_pnl"] = float(realized_pnl_override)
-                        if r_multiple_realized_override is not None:
-                            metrics["r_multiple_realized"] = float(r_multiple_realized_override)
-                        if outcome_label_override is not None:
-                            metrics["outcome_label"] = str(outcome_label_override)
-                        if outcome_grade_override is not None:
-                            metrics["outcome_grade"] = str(outcome_grade_override)
-                        r_mult = metrics["r_multiple_realized"]
-                        entry["r_multiple"] = round(r_mult, 3)
-                        entry["r_label"] = 1 if r_mult >= 1 else 0
-                        entry["realized_pnl"] = metrics["realized_pnl"]
-                        entry["r_multiple_realized"] = metrics["r_multiple_realized"]
-                        entry["outcome_label"] = metrics["outcome_label"]
-                        entry["outcome_grade"] = metrics["outcome_grade"]
-                        entry["exit_reason"] = metrics["exit_reason"]
-                        break
-        except Exception:
-            pass
-        _append_update(entry)
+        if logged is not None:
+            try:
+                entry_price = logged.get("entry", 0)
+                side = logged.get("side", "BUY")
+                strategy = logged.get("strategy")
+                symbol = logged.get("symbol")
+                qty = logged.get("qty", 1)
+                paper_aux = logged.get("paper_aux", False)
+                _apply_metrics(entry, logged)
+            except Exception:
+                pass
+        _append_update(entry, store)
         try:
             insert_outcome(entry)
         except Exception:
@@ -280,146 +333,89 @@ def update_trade_outcome(
                 _safe_emit_post_trade_label(entry)
         except Exception:
             pass
-        try:
-            if entry_price is not None and qty is not None and not paper_aux:
-                pnl = (exit_price - entry_price) * qty
-                if side == "SELL":
-                    pnl *= -1
-                tracker.record(strategy, pnl)
-                tracker.record_symbol(symbol, pnl)
-                tracker.save("logs/strategy_perf.json")
-        except Exception:
-            pass
+        _record_pnl()
         return entry
 
-    updated = False
-    lines = []
-    updated_entry = None
-
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            entry = json.loads(line)
-            if entry.get("trade_id") == trade_id:
-                entry["exit_price"] = exit_price
-                entry["exit_time"] = str(datetime.now())
-                entry["actual"] = actual
-                entry["exit_reason"] = exit_reason
-                # Risk-adjusted label (R-multiple)
-                entry_price = entry.get("entry", 0)
-                strategy = entry.get("strategy")
-                symbol = entry.get("symbol")
-                side = entry.get("side", "BUY")
-                qty = entry.get("qty", 1)
-                paper_aux = entry.get("paper_aux", False)
-                metrics = _compute_realized_metrics(entry, exit_price, actual, exit_reason=exit_reason)
-                if realized_pnl_override is not None:
-                    metrics["realized_pnl"] = float(realized_pnl_override)
-                if r_multiple_realized_override is not None:
-                    metrics["r_multiple_realized"] = float(r_multiple_realized_override)
-                if outcome_label_override is not None:
-                    metrics["outcome_label"] = str(outcome_label_override)
-                if outcome_grade_override is not None:
-                    metrics["outcome_grade"] = str(outcome_grade_override)
-                r_mult = metrics["r_multiple_realized"]
-                entry["r_multiple"] = round(r_mult, 3)
-                entry["r_label"] = 1 if r_mult >= 1 else 0
-                entry["realized_pnl"] = metrics["realized_pnl"]
-                entry["r_multiple_realized"] = metrics["r_multiple_realized"]
-                entry["outcome_label"] = metrics["outcome_label"]
-                entry["outcome_grade"] = metrics["outcome_grade"]
-                entry["exit_reason"] = metrics["exit_reason"]
-                updated = True
-                updated_entry = entry
-            lines.append(json.dumps(entry))
-
-    if updated:
-        with path.open("w", encoding="utf-8") as f:
-            f.write("\n".join(lines) + "\n")
-    if updated_entry:
-        try:
-            insert_outcome(updated_entry)
-        except Exception:
-            pass
-        try:
-            update_trade_close(
-                trade_id,
-                exit_price=float(exit_price),
-                exit_time=str(updated_entry.get("exit_time")),
-                exit_reason=updated_entry.get("exit_reason") or ("TARGET" if actual == 1 else "STOP"),
-                realized_pnl=float(updated_entry.get("realized_pnl", 0.0)),
-                r_multiple_realized=float(updated_entry.get("r_multiple_realized", 0.0)),
-                outcome_label=updated_entry.get("outcome_label", "BREAKEVEN"),
-                outcome_grade=updated_entry.get("outcome_grade", "C"),
-                legs_count=legs_count,
-                avg_exit=avg_exit,
-                exit_reason_final=exit_reason_final,
-            )
-        except Exception as exc:
-            _log_error({"error": "update_trade_close_failed", "trade_id": trade_id, "detail": str(exc)})
-        try:
-            if updated_entry.get("actual") is not None:
-                _safe_emit_post_trade_label(updated_entry)
-        except Exception:
-            pass
-        try:
-            if entry_price is not None and qty is not None and not paper_aux:
-                pnl = (exit_price - entry_price) * qty
-                if side == "SELL":
-                    pnl *= -1
-                tracker.record(strategy, pnl)
-                tracker.record_symbol(symbol, pnl)
-                tracker.save("logs/strategy_perf.json")
-        except Exception:
-            pass
-    return updated_entry if updated else None
+    if logged is None:
+        return None
+    updated_entry = store.get(trade_id, merged=True) or dict(logged)
+    update = {
+        "trade_id": trade_id,
+        "timestamp": str(datetime.now()),
+        "type": "outcome",
+        "exit_price": exit_price,
+        "exit_time": str(datetime.now()),
+        "actual": actual,
+        "exit_reason": exit_reason,
+    }
+    # Risk-adjusted label (R-multiple)
+    entry_price = updated_entry.get("entry", 0)
+    strategy = updated_entry.get("strategy")
+    symbol = updated_entry.get("symbol")
+    side = updated_entry.get("side", "BUY")
+    qty = updated_entry.get("qty", 1)
+    paper_aux = updated_entry.get("paper_aux", False)
+    _apply_metrics(update, updated_entry)
+    _append_update(update, store)
+    updated_entry.update({k: v for k, v in update.items() if k not in ("type", "timestamp")})
+    _maybe_compact(store)
+
+    try:
+        insert_outcome(updated_entry)
+    except Exception:
+        pass
+    try:
+        update_trade_close(
+            trade_id,
+            exit_price=float(exit_price),
+            exit_time=str(updated_entry.get("exit_time")),
+            exit_reason=updated_entry.get("exit_reason") or ("TARGET" if actual == 1 else "STOP"),
+            realized_pnl=float(updated_entry.get("realized_pnl", 0.0)),
+            r_multiple_realized=float(updated_entry.get("r_multiple_realized", 0.0)),
+            outcome_label=updated_entry.get("outcome_label", "BREAKEVEN"),
+            outcome_grade=updated_entry.get("outcome_grade", "C"),
+            legs_count=legs_count,
+            avg_exit=avg_exit,
+            exit_reason_final=exit_reason_final,
+        )
+    except Exception as exc:
+        _log_error({"error": "update_trade_close_failed", "trade_id": trade_id, "detail": str(exc)})
+    try:
+        if updated_entry.get("actual") is not None:
+            _safe_emit_post_trade_label(updated_entry)
+    except Exception:
+        pass
+    _record_pnl()
+    return updated_entry
 
 def update_trade_fill(trade_id, fill_price, latency_ms=None, slippage=None):
-    path = _trade_log_path()
+    store = trade_log_store(_trade_log_path())
+    entry = {
+        "trade_id": trade_id,
+        "timestamp": str(datetime.now()),
+        "type": "fill",
+        "fill_price": fill_price,
+    }
+    if latency_ms is not None:
+        entry["latency_ms"] = latency_ms
+    if slippage is not None:
+        entry["slippage"] = slippage
     if getattr(cfg, "APPEND_ONLY_LOG", False) or log_lock.is_locked():
-        entry = {
-            "trade_id": trade_id,
-            "timestamp": str(datetime.now()),
-            "type": "fill",
-            "fill_price": fill_price,
-        }
-        if latency_ms is not None:
-            entry["latency_ms"] = latency_ms
-        if slippage is not None:
-            entry["slippage"] = slippage
-        _append_update(entry)
+        _append_update(entry, store)
         try:
             update_trade_fill_db(trade_id, fill_price, latency_ms=latency_ms, slippage=slippage)
         except Exception:
             pass
         return entry
 
-    updated = False
-    lines = []
-    updated_entry = None
-
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            entry = json.loads(line)
-            if entry.get("trade_id") == trade_id:
-                entry["fill_price"] = fill_price
-                if latency_ms is not None:
-                    entry["latency_ms"] = latency_ms
-                if slippage is not None:
-                    entry["slippage"] = slippage
-                updated = True
-                updated_entry = entry
-            lines.append(json.dumps(entry))
-
-    if updated:
-        with path.open("w", encoding="utf-8") as f:
-            f.write("\n".join(lines) + "\n")
-    if updated_entry:
-        try:
-            update_trade_fill_db(trade_id, fill_price, latency_ms=latency_ms, slippage=slippage)
-        except Exception:
-            pass
-    return updated_entry if updated else None
+    updated_entry = store.get(trade_id, merged=True)
+    if updated_entry is None:
+        return None
+    _append_update(entry, store)
+    updated_entry.update({k: v for k, v in entry.items() if k not in ("type", "timestamp")})
+    _maybe_compact(store)
+    try:
+        update_trade_fill_db(trade_id, fill_price, latency_ms=latency_ms, slippage=slippage)
+    except Exception:
+        pass
+    return updated_entry
@@ -52,11 +52,13 @@ def compute_confluence_score(score_pack: dict | None) -> float:
     return max(0.0, min(1.0, blended / 100.0))
 
 
-def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float | None, strategy_name: str | None = None):
+def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float | None, strategy_name: str | None = None, config=None):
     """
     Multi-factor trade scoring engine.
     Returns dict with score, alignment, components, and issues.
+    Thresholds come from `config` when given, else the config module.
     """
+    ccfg = config if config is not None else cfg
     components = {}
     issues = []
 
@@ -138,10 +140,10 @@ def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float
         issues.append("IV elevated")
     elif iv_z is not None and iv_z < -0.5:
         vol_score = 85
-    if vol_z >= getattr(cfg, "EVENT_VOL_Z", 1.0):
+    if vol_z >= getattr(ccfg, "EVENT_VOL_Z", 1.0):
         vol_score -= 15
         issues.append("High vol regime")
-    if atr_pct >= getattr(cfg, "EVENT_ATR_PCT", 0.004):
+    if atr_pct >= getattr(ccfg, "EVENT_ATR_PCT", 0.004):
         vol_score -= 10
     vol_score = max(0, min(100, vol_score))
     components["volatility"] = vol_score
@@ -170,9 +172,9 @@ def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float
     # 6) Liquidity
     if spread_pct <= 0.005 and volume >= 50000:
         liq = 100
-    elif spread_pct <= getattr(cfg, "MAX_SPREAD_PCT", 0.015) and volume >= 10000:
+    elif spread_pct <= getattr(ccfg, "MAX_SPREAD_PCT", 0.015) and volume >= 10000:
         liq = 70
-    elif spread_pct <= getattr(cfg, "MAX_SPREAD_PCT", 0.015):
+    elif spread_pct <= getattr(ccfg, "MAX_SPREAD_PCT", 0.015):
         liq = 55
     else:
         liq = 30
@@ -202,12 +204,12 @@ def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float
     news_score = 100.0
     news_score -= min(80.0, shock_score * 80.0)
     news_score -= min(30.0, uncertainty * 30.0)
-    if shock_score >= getattr(cfg, "NEWS_SHOCK_EVENT_THRESHOLD", 0.4):
+    if shock_score >= getattr(ccfg, "NEWS_SHOCK_EVENT_THRESHOLD", 0.4):
         issues.append("News shock elevated")
-    if shock_score >= getattr(cfg, "NEWS_SHOCK_BLOCK_THRESHOLD", 0.7):
+    if shock_score >= getattr(ccfg, "NEWS_SHOCK_BLOCK_THRESHOLD", 0.7):
         news_score = 0.0
         issues.append("News shock extreme")
-    bias_penalty = getattr(cfg, "NEWS_SHOCK_BIAS_PENALTY", 15)
+    bias_penalty = getattr(ccfg, "NEWS_SHOCK_BIAS_PENALTY", 15)
     if macro_bias >= 0.2 and direction == "BUY_PUT":
         news_score -= bias_penalty
         issues.append("Macro bias bullish")
@@ -217,7 +219,7 @@ def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float
     components["news_shock"] = max(0.0, min(100.0, news_score))
 
     # 10) Greeks sanity
-    if delta is not None and (abs(delta) < getattr(cfg, "DELTA_MIN", 0.25) or abs(delta) > getattr(cfg, "DELTA_MAX", 0.7)):
+    if delta is not None and (abs(delta) < getattr(ccfg, "DELTA_MIN", 0.25) or abs(delta) > getattr(ccfg, "DELTA_MAX", 0.7)):
         components["greeks"] = 40
         issues.append("Delta out of band")
     else:
@@ -242,17 +244,17 @@ def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float
     # Optional cross-asset penalty (do not block)
     try:
         cross_q = market_data.get("cross_asset_quality", {}) or {}
-        optional = set(getattr(cfg, "CROSS_OPTIONAL_FEEDS", []) or [])
-        require_x = bool(getattr(cfg, "REQUIRE_CROSS_ASSET", True))
-        if getattr(cfg, "REQUIRE_CROSS_ASSET_ONLY_WHEN_LIVE", True):
-            live_mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper() == "LIVE"
+        optional = set(getattr(ccfg, "CROSS_OPTIONAL_FEEDS", []) or [])
+        require_x = bool(getattr(ccfg, "REQUIRE_CROSS_ASSET", True))
+        if getattr(ccfg, "REQUIRE_CROSS_ASSET_ONLY_WHEN_LIVE", True):
+            live_mode = str(getattr(ccfg, "EXECUTION_MODE", "SIM")).upper() == "LIVE"
             require_x = require_x and live_mode
         stale = set(cross_q.get("stale_feeds", []) or [])
         missing_map = cross_q.get("missing") or {}
         missing = set(k for k, v in missing_map.items() if not str(v).startswith("disabled"))
         bad_optional = (stale | missing) & optional
         if bad_optional:
-            penalty = float(getattr(cfg, "CROSS_ASSET_OPTIONAL_SCORE_PENALTY", 8))
+            penalty = float(getattr(ccfg, "CROSS_ASSET_OPTIONAL_SCORE_PENALTY", 8))
             score = max(0.0, score - penalty)
             issues.append("cross_asset_optional_stale" if require_x else "cross_asset_optional_warn")
     except Exception:
@@ -264,11 +266,11 @@ def compute_trade_score(market_data: dict, opt: dict, direction: str, rr: float
         if exec_q is None:
             exec_q = _latest_exec_quality()
         if exec_q is not None:
-            if float(exec_q) < float(getattr(cfg, "EXEC_QUALITY_BLOCK_BELOW", 35)):
+            if float(exec_q) < float(getattr(ccfg, "EXEC_QUALITY_BLOCK_BELOW", 35)):
                 issues.append("exec_quality_block")
                 score = 0.0
-            elif float(exec_q) < float(getattr(cfg, "EXEC_QUALITY_MIN", 55)):
-                penalty = float(getattr(cfg, "EXEC_QUALITY_PENALTY", 10))
+            elif float(exec_q) < float(getattr(ccfg, "EXEC_QUALITY_MIN", 55)):
+                penalty = float(getattr(ccfg, "EXEC_QUALITY_PENALTY", 10))
                 score = max(0.0, score - penalty)
                 issues.append("exec_quality_low")
     except Exception:
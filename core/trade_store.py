@@ -3,13 +3,17 @@ import time
 import json
 from datetime import datetime, timezone
 from config import config as cfg
-from pathlib import Path
+from core import db_indexes, db_pool
 from core.incidents import trigger_db_write_fail
 
+# Bump when _migrate gains tables, columns or indexes.
+SCHEMA_VERSION = 2
+
+TABLES = ("trades", "outcomes", "execution_stats", "depth_snapshots", "broker_fills", "trail_events", "trade_legs", "daily_stats")
+
 
 def _conn():
-    Path(cfg.TRADE_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(cfg.TRADE_DB_PATH)
+    return db_pool.connection(cfg.TRADE_DB_PATH)
 
 
 def classify_outcome_label(realized_pnl: float, epsilon: float = 1e-6) -> str:
@@ -32,330 +36,334 @@ def classify_outcome_grade(r_multiple_realized: float) -> str:
     return "D"
 
 
-def init_db():
-    with _conn() as conn:
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS trades (
-            trade_id TEXT PRIMARY KEY,
-            timestamp TEXT,
-            symbol TEXT,
-            underlying TEXT,
-            instrument TEXT,
-            instrument_type TEXT,
-            instrument_token INTEGER,
-            strike INTEGER,
-            expiry TEXT,
-            option_type TEXT,
-            right TEXT,
-            instrument_id TEXT,
-            side TEXT,
-            entry REAL,
-            stop_loss REAL,
-            target REAL,
-            qty INTEGER,
-            qty_lots INTEGER,
-            qty_units INTEGER,
-            validity_sec INTEGER,
-            tradable INTEGER,
-            tradable_reasons_blocking TEXT,
-            source_flags_json TEXT,
-            confidence REAL,
-            strategy TEXT,
-            regime TEXT,
-            fill_price REAL,
-            latency_ms REAL,
-            slippage REAL,
-            micro_pred REAL,
-            execution_quality REAL,
-            exit_price REAL,
-            exit_time TEXT,
-            exit_reason TEXT,
-            realized_pnl REAL,
-            r_multiple_realized REAL,
-            outcome_label TEXT,
-            outcome_grade TEXT,
-            legs_count INTEGER,
-            avg_exit REAL,
-            exit_reason_final TEXT,
-            trailing_enabled INTEGER,
-            trailing_method TEXT,
-            trailing_atr_mult REAL,
-            trail_stop_init REAL,
-            trail_stop_last REAL,
-            trail_updates INTEGER,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT
-        )
+def _migrate(conn: sqlite3.Connection) -> None:
+    conn.execute(
         """
-        )
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN execution_quality REAL")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN strike INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN expiry TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN option_type TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN instrument_id TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN underlying TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN instrument_type TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN right TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN qty_lots INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN qty_units INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN validity_sec INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN tradable INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN tradable_reasons_blocking TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN source_flags_json TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN timestamp_epoch REAL")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE trades ADD COLUMN timestamp_iso TEXT")
-        except Exception:
-            pass
-        for col, sql_type in [
-            ("exit_price", "REAL"),
-            ("exit_time", "TEXT"),
-            ("exit_reason", "TEXT"),
-            ("realized_pnl", "REAL"),
-            ("r_multiple_realized", "REAL"),
-            ("outcome_label", "TEXT"),
-            ("outcome_grade", "TEXT"),
-            ("legs_count", "INTEGER"),
-            ("avg_exit", "REAL"),
-            ("exit_reason_final", "TEXT"),
-            ("trailing_enabled", "INTEGER"),
-            ("trailing_method", "TEXT"),
-            ("trailing_atr_mult", "REAL"),
-            ("trail_stop_init", "REAL"),
-            ("trail_stop_last", "REAL"),
-            ("trail_updates", "INTEGER"),
-        ]:
-            try:
-                conn.execute(f"ALTER TABLE trades ADD COLUMN {col} {sql_type}")
-            except Exception:
-                pass
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS outcomes (
-            trade_id TEXT,
-            exit_price REAL,
-            exit_time TEXT,
-            actual INTEGER,
-            r_multiple REAL,
-            r_label INTEGER,
-            exit_reason TEXT,
-            realized_pnl REAL,
-            r_multiple_realized REAL,
-            outcome_label TEXT,
-            outcome_grade TEXT,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT
-        )
+    CREATE TABLE IF NOT EXISTS trades (
+        trade_id TEXT PRIMARY KEY,
+        timestamp TEXT,
+        symbol TEXT,
+        underlying TEXT,
+        instrument TEXT,
+        instrument_type TEXT,
+        instrument_token INTEGER,
+        strike INTEGER,
+        expiry TEXT,
+        option_type TEXT,
+        right TEXT,
+        instrument_id TEXT,
+        side TEXT,
+        entry REAL,
+        stop_loss REAL,
+        target REAL,
+        qty INTEGER,
+        qty_lots INTEGER,
+        qty_units INTEGER,
+        validity_sec INTEGER,
+        tradable INTEGER,
+        tradable_reasons_blocking TEXT,
+        source_flags_json TEXT,
+        confidence REAL,
+        strategy TEXT,
+        regime TEXT,
+        fill_price REAL,
+        latency_ms REAL,
+        slippage REAL,
+        micro_pred REAL,
+        execution_quality REAL,
+        exit_price REAL,
+        exit_time TEXT,
+        exit_reason TEXT,
+        realized_pnl REAL,
+        r_multiple_realized REAL,
+        outcome_label TEXT,
+        outcome_grade TEXT,
+        legs_count INTEGER,
+        avg_exit REAL,
+        exit_reason_final TEXT,
+        trailing_enabled INTEGER,
+        trailing_method TEXT,
+        trailing_atr_mult REAL,
+        trail_stop_init REAL,
+        trail_stop_last REAL,
+        trail_updates INTEGER,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT
+    )
+    """
+    )
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN execution_quality REAL")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN strike INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN expiry TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN option_type TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN instrument_id TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN underlying TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN instrument_type TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN right TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN qty_lots INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN qty_units INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN validity_sec INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN tradable INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN tradable_reasons_blocking TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN source_flags_json TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN timestamp_epoch REAL")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE trades ADD COLUMN timestamp_iso TEXT")
+    except Exception:
+        pass
+    for col, sql_type in [
+        ("exit_price", "REAL"),
+        ("exit_time", "TEXT"),
+        ("exit_reason", "TEXT"),
+        ("realized_pnl", "REAL"),
+        ("r_multiple_realized", "REAL"),
+        ("outcome_label", "TEXT"),
+        ("outcome_grade", "TEXT"),
+        ("legs_count", "INTEGER"),
+        ("avg_exit", "REAL"),
+        ("exit_reason_final", "TEXT"),
+        ("trailing_enabled", "INTEGER"),
+        ("trailing_method", "TEXT"),
+        ("trailing_atr_mult", "REAL"),
+        ("trail_stop_init", "REAL"),
+        ("trail_stop_last", "REAL"),
+        ("trail_updates", "INTEGER"),
+    ]:
+        try:
+            conn.execute(f"ALTER TABLE trades ADD COLUMN {col} {sql_type}")
+        except Exception:
+            pass
+    conn.execute(
         """
-        )
-        try:
-            conn.execute("ALTER TABLE outcomes ADD COLUMN timestamp_epoch REAL")
-        except Exception:
-            pass
+    CREATE TABLE IF NOT EXISTS outcomes (
+        trade_id TEXT,
+        exit_price REAL,
+        exit_time TEXT,
+        actual INTEGER,
+        r_multiple REAL,
+        r_label INTEGER,
+        exit_reason TEXT,
+        realized_pnl REAL,
+        r_multiple_realized REAL,
+        outcome_label TEXT,
+        outcome_grade TEXT,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT
+    )
+    """
+    )
+    try:
+        conn.execute("ALTER TABLE outcomes ADD COLUMN timestamp_epoch REAL")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE outcomes ADD COLUMN timestamp_iso TEXT")
+    except Exception:
+        pass
+    for col, sql_type in [
+        ("exit_reason", "TEXT"),
+        ("realized_pnl", "REAL"),
+        ("r_multiple_realized", "REAL"),
+        ("outcome_label", "TEXT"),
+        ("outcome_grade", "TEXT"),
+    ]:
         try:
-            conn.execute("ALTER TABLE outcomes ADD COLUMN timestamp_iso TEXT")
+            conn.execute(f"ALTER TABLE outcomes ADD COLUMN {col} {sql_type}")
         except Exception:
             pass
-        for col, sql_type in [
-            ("exit_reason", "TEXT"),
-            ("realized_pnl", "REAL"),
-            ("r_multiple_realized", "REAL"),
-            ("outcome_label", "TEXT"),
-            ("outcome_grade", "TEXT"),
-        ]:
-            try:
-                conn.execute(f"ALTER TABLE outcomes ADD COLUMN {col} {sql_type}")
-            except Exception:
-                pass
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS execution_stats (
-            timestamp TEXT,
-            instrument TEXT,
-            slippage_bps REAL,
-            latency_ms REAL,
-            fill_ratio REAL,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT
-        )
+    conn.execute(
         """
-        )
-        try:
-            conn.execute("ALTER TABLE execution_stats ADD COLUMN timestamp_epoch REAL")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE execution_stats ADD COLUMN timestamp_iso TEXT")
-        except Exception:
-            pass
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS depth_snapshots (
-            timestamp TEXT,
-            instrument_token INTEGER,
-            depth_json TEXT,
-            timestamp_iso TEXT,
-            timestamp_epoch REAL
-        )
+    CREATE TABLE IF NOT EXISTS execution_stats (
+        timestamp TEXT,
+        instrument TEXT,
+        slippage_bps REAL,
+        latency_ms REAL,
+        fill_ratio REAL,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT
+    )
+    """
+    )
+    try:
+        conn.execute("ALTER TABLE execution_stats ADD COLUMN timestamp_epoch REAL")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE execution_stats ADD COLUMN timestamp_iso TEXT")
+    except Exception:
+        pass
+    conn.execute(
         """
-        )
-        try:
-            conn.execute("ALTER TABLE depth_snapshots ADD COLUMN timestamp_iso TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE depth_snapshots ADD COLUMN timestamp_epoch REAL")
-        except Exception:
-            pass
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS broker_fills (
-            order_id TEXT,
-            trade_id TEXT,
-            symbol TEXT,
-            underlying TEXT,
-            side TEXT,
-            qty INTEGER,
-            qty_lots INTEGER,
-            qty_units INTEGER,
-            price REAL,
-            timestamp TEXT,
-            exchange TEXT,
-            instrument_token INTEGER,
-            instrument_type TEXT,
-            expiry TEXT,
-            strike INTEGER,
-            right TEXT,
-            instrument_id TEXT,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT
-        )
+    CREATE TABLE IF NOT EXISTS depth_snapshots (
+        timestamp TEXT,
+        instrument_token INTEGER,
+        depth_json TEXT,
+        timestamp_iso TEXT,
+        timestamp_epoch REAL
+    )
+    """
+    )
+    try:
+        conn.execute("ALTER TABLE depth_snapshots ADD COLUMN timestamp_iso TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE depth_snapshots ADD COLUMN timestamp_epoch REAL")
+    except Exception:
+        pass
+    conn.execute(
         """
-        )
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN timestamp_epoch REAL")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN timestamp_iso TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN underlying TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN qty_lots INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN qty_units INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN instrument_type TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN expiry TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN strike INTEGER")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN right TEXT")
-        except Exception:
-            pass
-        try:
-            conn.execute("ALTER TABLE broker_fills ADD COLUMN instrument_id TEXT")
-        except Exception:
-            pass
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS trail_events (
-            trace_id TEXT,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT,
-            trail_stop REAL,
-            ltp REAL,
-            reason TEXT
-        )
+    CREATE TABLE IF NOT EXISTS broker_fills (
+        order_id TEXT,
+        trade_id TEXT,
+        symbol TEXT,
+        underlying TEXT,
+        side TEXT,
+        qty INTEGER,
+        qty_lots INTEGER,
+        qty_units INTEGER,
+        price REAL,
+        timestamp TEXT,
+        exchange TEXT,
+        instrument_token INTEGER,
+        instrument_type TEXT,
+        expiry TEXT,
+        strike INTEGER,
+        right TEXT,
+        instrument_id TEXT,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT
+    )
+    """
+    )
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN timestamp_epoch REAL")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN timestamp_iso TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN underlying TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN qty_lots INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN qty_units INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN instrument_type TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN expiry TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN strike INTEGER")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN right TEXT")
+    except Exception:
+        pass
+    try:
+        conn.execute("ALTER TABLE broker_fills ADD COLUMN instrument_id TEXT")
+    except Exception:
+        pass
+    conn.execute(
         """
-        )
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS trade_legs (
-            trace_id TEXT,
-            leg_id INTEGER,
-            qty_units INTEGER,
-            price REAL,
-            timestamp_epoch REAL,
-            timestamp_iso TEXT,
-            reason TEXT
-        )
+    CREATE TABLE IF NOT EXISTS trail_events (
+        trace_id TEXT,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT,
+        trail_stop REAL,
+        ltp REAL,
+        reason TEXT
+    )
+    """
+    )
+    conn.execute(
         """
-        )
-        conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS daily_stats (
-            date TEXT PRIMARY KEY,
-            trades INTEGER,
-            pnl REAL,
-            win_rate REAL,
-            profit_factor REAL,
-            sharpe REAL,
-            max_drawdown REAL
-        )
+    CREATE TABLE IF NOT EXISTS trade_legs (
+        trace_id TEXT,
+        leg_id INTEGER,
+        qty_units INTEGER,
+        price REAL,
+        timestamp_epoch REAL,
+        timestamp_iso TEXT,
+        reason TEXT
+    )
+    """
+    )
+    conn.execute(
         """
-        )
+    CREATE TABLE IF NOT EXISTS daily_stats (
+        date TEXT PRIMARY KEY,
+        trades INTEGER,
+        pnl REAL,
+        win_rate REAL,
+        profit_factor REAL,
+        sharpe REAL,
+        max_drawdown REAL
+    )
+    """
+    )
+    db_indexes.ensure_indexes(conn, TABLES)
+
+
+def init_db():
+    db_pool.ensure_schema("trade_store", SCHEMA_VERSION, _migrate, cfg.TRADE_DB_PATH)
 
 
 def insert_trade(entry):
@@ -552,64 +560,54 @@ def insert_execution_stat(row):
 
 
 def fetch_depth_snapshots(limit=200):
-    init_db()
-    with _conn() as conn:
-        cur = conn.execute("SELECT * FROM depth_snapshots ORDER BY timestamp DESC LIMIT ?", (limit,))
-        rows = cur.fetchall()
-        cols = [d[0] for d in cur.description]
+    from core.depth_history import depth_history
+
+    cols = ["timestamp", "instrument_token", "depth_json", "timestamp_iso", "timestamp_epoch", "imbalance"]
+    rows = []
+    for snap in depth_history.latest(limit):
+        rows.append(
+            (
+                snap["timestamp_iso"],
+                snap["instrument_token"],
+                json.dumps({"depth": snap["depth"], "imbalance": snap["imbalance"]}),
+                snap["timestamp_iso"],
+                snap["timestamp_epoch"],
+                snap["imbalance"],
+            )
+        )
     return cols, rows
 
 
 def fetch_depth_imbalance(limit=1000):
-    init_db()
-    with _conn() as conn:
-        cur = conn.execute(
-            "SELECT timestamp, instrument_token, depth_json, timestamp_epoch FROM depth_snapshots ORDER BY timestamp DESC LIMIT ?",
-            (limit,),
-        )
-        rows = cur.fetchall()
-        cols = [d[0] for d in cur.description]
+    from core.depth_history import depth_history
+
+    cols = ["timestamp", "instrument_token", "imbalance", "timestamp_epoch"]
+    rows = [
+        (snap["timestamp_iso"], snap["instrument_token"], snap["imbalance"], snap["timestamp_epoch"])
+        for snap in depth_history.latest(limit)
+    ]
     return cols, rows
 
 
 def insert_depth_snapshot(ts_iso, instrument_token, depth_json, ts_epoch=None):
-    init_db()
-    # Ensure timestamp fields are always present and normalized
+    """
+    Compatibility wrapper: route a JSON depth payload into the partitioned depth history.
+    """
+    from core.depth_history import depth_history
+
     if ts_epoch is None:
         try:
             ts_epoch = float(ts_iso)
         except Exception:
             ts_epoch = None
     if ts_epoch is None:
-        import time
         ts_epoch = time.time()
-    if not ts_iso:
-        try:
-            from datetime import datetime, timezone
-            ts_iso = datetime.fromtimestamp(ts_epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
-        except Exception:
-            ts_iso = None
     try:
-        with _conn() as conn:
-            conn.execute(
-                """
-            INSERT INTO depth_snapshots (timestamp, instrument_token, depth_json, timestamp_iso, timestamp_epoch)
-            VALUES (?,?,?,?,?)
-            """,
-                (ts_iso, instrument_token, depth_json, ts_iso, ts_epoch),
-            )
-            limit = getattr(__import__("config.config", fromlist=["DEPTH_SNAPSHOT_LIMIT"]), "DEPTH_SNAPSHOT_LIMIT", 10000)
-            conn.execute(
-                """
-            DELETE FROM depth_snapshots
-            WHERE rowid NOT IN (
-                SELECT rowid FROM depth_snapshots ORDER BY timestamp DESC LIMIT ?
-            )
-            """,
-                (limit,),
-            )
+        payload = json.loads(depth_json) if isinstance(depth_json, str) else (depth_json or {})
+        depth = payload.get("depth") if isinstance(payload.get("depth"), dict) else payload
+        depth_history.append(ts_epoch, instrument_token, depth, payload.get("imbalance"))
     except Exception as exc:
-        trigger_db_write_fail({"table": "depth_snapshots", "error": str(exc)})
+        trigger_db_write_fail({"table": "depth_history", "error": str(exc)})
         raise
 
 
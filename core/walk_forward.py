@@ -3,14 +3,19 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import json
 import math
+import tempfile
+import numpy as np
 import pandas as pd
 
 from core.backtest_engine import BacktestEngine
 from core.feature_builder import add_indicators
 from core.backtest_report import compute_window_metrics
+from core.window_pool import MappedFrame, map_windows, release, resolve_workers
+
+_HELPER_COLUMNS = ("_wf_ts", "_wf_day")
 
 
 @dataclass(frozen=True)
@@ -75,6 +80,87 @@ def _build_windows(
     return windows
 
 
+def _default_backtest_factory(test_df: pd.DataFrame, capital: float, train_stats: Dict[str, Optional[float]]):
+    return BacktestEngine(test_df, starting_capital=capital, train_stats=train_stats)
+
+
+@dataclass(frozen=True)
+class _WindowTask:
+    window_id: int
+    bounds: Tuple[pd.Timestamp, pd.Timestamp, pd.Timestamp, pd.Timestamp]
+    source: Union[MappedFrame, pd.DataFrame]
+    backtest_factory: Callable[[pd.DataFrame, float, Dict[str, Optional[float]]], object]
+    starting_capital: float
+
+
+def _window_slices(source: Union[MappedFrame, pd.DataFrame], bounds) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Train and test rows for one window, in input order, without the helper
+    columns. A MappedFrame source copies only these rows out of the map.
+    """
+    if isinstance(source, MappedFrame):
+        day = np.asarray(source.column("_wf_day"))
+    else:
+        day = source["_wf_day"].to_numpy("datetime64[ns]").astype(np.int64)
+    train_start, train_end, test_start, test_end = (pd.Timestamp(b).value for b in bounds)
+    frames = []
+    for lo, hi in ((train_start, train_end), (test_start, test_end)):
+        rows = np.flatnonzero((day >= lo) & (day <= hi))
+        if isinstance(source, MappedFrame):
+            frames.append(source.take(rows, columns=[c for c in source.names if c not in _HELPER_COLUMNS]))
+        else:
+            frames.append(source.iloc[rows].drop(columns=list(_HELPER_COLUMNS), errors="ignore"))
+    return frames[0], frames[1]
+
+
+def _evaluate_window(task: _WindowTask) -> Tuple[Dict[str, object], pd.DataFrame]:
+    train_df, test_df = _window_slices(task.source, task.bounds)
+    train_stats = _train_stats(train_df)
+    engine = task.backtest_factory(test_df, task.starting_capital, train_stats)
+    if not hasattr(engine, "run"):
+        raise TypeError("backtest_factory must return an object with .run()")
+    results_df = engine.run()
+    if results_df is None:
+        results_df = pd.DataFrame()
+    return _window_row(task.window_id, task.bounds, results_df, task.starting_capital), results_df
+
+
+def _window_row(window_id: int, bounds, results_df: pd.DataFrame, starting_capital: float) -> Dict[str, object]:
+    train_start, train_end, test_start, test_end = bounds
+    metrics = compute_window_metrics(results_df, starting_capital=starting_capital)
+    return {
+        "window_id": window_id,
+        "train_start": str(pd.Timestamp(train_start).date()),
+        "train_end": str(pd.Timestamp(train_end).date()),
+        "test_start": str(pd.Timestamp(test_start).date()),
+        "test_end": str(pd.Timestamp(test_end).date()),
+        "return": metrics["return"],
+        "max_drawdown": metrics["max_drawdown"],
+        "win_rate": metrics["win_rate"],
+        "avg_r": metrics["avg_r"],
+        "trade_count": metrics["trade_count"],
+        "sharpe_proxy": metrics["sharpe_proxy"],
+    }
+
+
+def _run_windows(df: pd.DataFrame, windows, backtest_factory, starting_capital: float, workers: int):
+    def _tasks(source):
+        return [
+            _WindowTask(window_idx, bounds, source, backtest_factory, starting_capital)
+            for window_idx, bounds in enumerate(windows, start=1)
+        ]
+
+    if workers <= 1:
+        tasks = _tasks(df)
+        return tasks, map_windows(_evaluate_window, tasks, workers=1)
+    with tempfile.TemporaryDirectory(prefix="walk_forward_") as tmp:
+        tasks = _tasks(MappedFrame.write(df.drop(columns=["_wf_ts"]), tmp))
+        try:
+            return tasks, map_windows(_evaluate_window, tasks, workers=workers)
+        finally:
+            release(tmp)
+
+
 def run_walk_forward(
     historical_data: pd.DataFrame,
     train_window_days: int = 60,
@@ -84,7 +170,20 @@ def run_walk_forward(
     output_dir: str = "reports/walk_forward",
     backtest_factory: Optional[Callable[[pd.DataFrame, float, Dict[str, Optional[float]]], object]] = None,
     write_outputs: bool = True,
+    workers: Optional[int] = None,
 ) -> Dict[str, object]:
+    """
+    Rolling train/test evaluation of `backtest_factory` (BacktestEngine by
+    default).
+
+    Windows are independent. With `workers` (else WALK_FORWARD_WORKERS)
+    above 1 they run on a process pool: the history is written once to
+    memory-mapped NumPy columns and each worker copies out only its
+    window's rows. The factory must then be picklable (a module-level
+    function or class). Windows are reported in window order either way.
+    A window that raises is recorded with an `error` and left out of the
+    aggregate; if every window fails the first error is raised.
+    """
     cfg = WalkForwardConfig(
         train_window_days=train_window_days,
         test_window_days=test_window_days,
@@ -101,51 +200,33 @@ def run_walk_forward(
         )
 
     if backtest_factory is None:
-        def _factory(test_df: pd.DataFrame, capital: float, train_stats: Dict[str, Optional[float]]):
-            return BacktestEngine(test_df, starting_capital=capital, train_stats=train_stats)
-        backtest_factory = _factory
+        backtest_factory = _default_backtest_factory
+
+    workers = resolve_workers(workers, len(windows))
+    tasks, outcomes = _run_windows(df, windows, backtest_factory, cfg.starting_capital, workers)
 
     window_rows: List[Dict[str, object]] = []
     all_trades: List[pd.DataFrame] = []
-    for window_idx, (train_start, train_end, test_start, test_end) in enumerate(windows, start=1):
-        train_df = df[(df["_wf_day"] >= train_start) & (df["_wf_day"] <= train_end)].copy()
-        test_df = df[(df["_wf_day"] >= test_start) & (df["_wf_day"] <= test_end)].copy()
-
-        # Drop helper columns before entering strategy/backtest logic.
-        train_stats = _train_stats(train_df.drop(columns=["_wf_ts", "_wf_day"], errors="ignore"))
-        engine = backtest_factory(
-            test_df.drop(columns=["_wf_ts", "_wf_day"], errors="ignore"),
-            cfg.starting_capital,
-            train_stats,
-        )
-        if not hasattr(engine, "run"):
-            raise TypeError("backtest_factory must return an object with .run()")
-        results_df = engine.run()
-        if results_df is None:
-            results_df = pd.DataFrame()
-
-        metrics = compute_window_metrics(results_df, starting_capital=cfg.starting_capital)
-        row = {
-            "window_id": window_idx,
-            "train_start": str(pd.Timestamp(train_start).date()),
-            "train_end": str(pd.Timestamp(train_end).date()),
-            "test_start": str(pd.Timestamp(test_start).date()),
-            "test_end": str(pd.Timestamp(test_end).date()),
-            "return": metrics["return"],
-            "max_drawdown": metrics["max_drawdown"],
-            "win_rate": metrics["win_rate"],
-            "avg_r": metrics["avg_r"],
-            "trade_count": metrics["trade_count"],
-            "sharpe_proxy": metrics["sharpe_proxy"],
-        }
+    failed: List[Dict[str, object]] = []
+    for task, (outcome, error) in zip(tasks, outcomes):
+        if error is not None:
+            row = _window_row(task.window_id, task.bounds, pd.DataFrame(), cfg.starting_capital)
+            row["error"] = error
+            window_rows.append(row)
+            failed.append({"window_id": task.window_id, "error": error})
+            continue
+        row, results_df = outcome
         window_rows.append(row)
         if not results_df.empty:
             tagged = results_df.copy()
-            tagged["window_id"] = window_idx
+            tagged["window_id"] = task.window_id
             all_trades.append(tagged)
+    if len(failed) == len(tasks):
+        raise RuntimeError(f"All {len(tasks)} walk-forward windows failed; first error: {failed[0]['error']}")
 
     window_df = pd.DataFrame(window_rows)
     trades_df = pd.concat(all_trades, ignore_index=True) if all_trades else pd.DataFrame()
+    ok_df = window_df[window_df["error"].isna()] if "error" in window_df.columns else window_df
 
     summary = {
         "config": {
@@ -154,17 +235,20 @@ def run_walk_forward(
             "step_days": cfg.step_days,
             "starting_capital": cfg.starting_capital,
             "window_count": int(len(window_df)),
+            "workers": workers,
         },
         "aggregate": {
-            "avg_return": float(window_df["return"].mean()) if not window_df.empty else 0.0,
-            "avg_max_drawdown": float(window_df["max_drawdown"].mean()) if not window_df.empty else 0.0,
-            "avg_win_rate": float(window_df["win_rate"].mean()) if not window_df.empty else 0.0,
-            "avg_r": float(window_df["avg_r"].mean()) if not window_df.empty else 0.0,
-            "avg_sharpe_proxy": float(window_df["sharpe_proxy"].mean()) if not window_df.empty else 0.0,
-            "total_trades": int(window_df["trade_count"].sum()) if not window_df.empty else 0,
+            "avg_return": float(ok_df["return"].mean()) if not ok_df.empty else 0.0,
+            "avg_max_drawdown": float(ok_df["max_drawdown"].mean()) if not ok_df.empty else 0.0,
+            "avg_win_rate": float(ok_df["win_rate"].mean()) if not ok_df.empty else 0.0,
+            "avg_r": float(ok_df["avg_r"].mean()) if not ok_df.empty else 0.0,
+            "avg_sharpe_proxy": float(ok_df["sharpe_proxy"].mean()) if not ok_df.empty else 0.0,
+            "total_trades": int(ok_df["trade_count"].sum()) if not ok_df.empty else 0,
         },
         "windows": window_rows,
     }
+    if failed:
+        summary["failed_windows"] = failed
 
     if write_outputs:
         out_dir = Path(cfg.output_dir)
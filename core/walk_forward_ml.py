@@ -1,38 +1,110 @@
+import tempfile
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+import numpy as np
 import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score
 from models.train_utils import train_model
 
-def walk_forward_train_test(df, feature_cols, target_col="target", train_size=0.6, step=500, calibrate=True, top_k=9):
+from core.window_pool import MappedFrame, map_windows, release, resolve_workers
+
+
+@dataclass(frozen=True)
+class _MLWindowTask:
+    start: int
+    step: int
+    source: object
+    feature_cols: List[str]
+    target_col: str
+    calibrate: bool
+    top_k: int
+    keep_model: bool
+
+
+def _rows(source, start: int, stop: int) -> pd.DataFrame:
+    if isinstance(source, MappedFrame):
+        return source.take(np.arange(start, stop))
+    return source.iloc[start:stop].copy()
+
+
+def _train_test_window(task: _MLWindowTask):
+    train_df = _rows(task.source, 0, task.start)
+    test_df = _rows(task.source, task.start, task.start + task.step)
+
+    model, used_features = train_model(
+        train_df, task.feature_cols, target_col=task.target_col, calibrate=task.calibrate, top_k=task.top_k
+    )
+
+    X_test = test_df[used_features]
+    y_test = test_df[task.target_col]
+    y_pred = model.predict(X_test)
+
+    metrics = {
+        "train_rows": len(train_df),
+        "test_rows": len(test_df),
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, zero_division=0),
+        "recall": recall_score(y_test, y_pred, zero_division=0),
+        "features_used": ",".join(used_features)
+    }
+    return metrics, model if task.keep_model else None
+
+
+def walk_forward_train_test(df, feature_cols, target_col="target", train_size=0.6, step=500, calibrate=True, top_k=9,
+                            workers: Optional[int] = None):
     """
     Walk-forward ML evaluation.
     Train on expanding window, test on next step.
-    Returns metrics dataframe and last trained model.
+    Returns metrics dataframe and the model of the last successful window.
+
+    Windows train on a process pool when `workers` (else
+    WALK_FORWARD_WORKERS) is above 1; the feature/target columns are
+    memory-mapped once and metrics stay in window order. A window that
+    fails gets an `error` row instead of stopping the run; if every window
+    fails the first error is raised. Only the final window ships its model
+    back from the pool; when that window failed, the last successful one is
+    retrained in-process for its model.
     """
     n = len(df)
     start_train = int(n * train_size)
+    starts = list(range(start_train, n - step, step))
+    workers = resolve_workers(workers, len(starts))
+
+    def _tasks(source):
+        return [
+            _MLWindowTask(start, step, source, list(feature_cols), target_col, calibrate, top_k,
+                          keep_model=(i == len(starts) - 1))
+            for i, start in enumerate(starts)
+        ]
+
+    if workers <= 1:
+        tasks = _tasks(df)
+        outcomes = map_windows(_train_test_window, tasks, workers=1)
+    else:
+        columns = list(dict.fromkeys(list(feature_cols) + [target_col]))
+        with tempfile.TemporaryDirectory(prefix="walk_forward_ml_") as tmp:
+            tasks = _tasks(MappedFrame.write(df[columns].reset_index(drop=True), tmp))
+            try:
+                outcomes = map_windows(_train_test_window, tasks, workers=workers)
+            finally:
+                release(tmp)
+
     metrics = []
+    errors = []
+    last_ok = None
     last_model = None
-
-    for start in range(start_train, n - step, step):
-        train_df = df.iloc[:start].copy()
-        test_df = df.iloc[start:start + step].copy()
-
-        model, used_features = train_model(
-            train_df, feature_cols, target_col=target_col, calibrate=calibrate, top_k=top_k
-        )
-        last_model = model
-
-        X_test = test_df[used_features]
-        y_test = test_df[target_col]
-        y_pred = model.predict(X_test)
-
-        metrics.append({
-            "train_rows": len(train_df),
-            "test_rows": len(test_df),
-            "accuracy": accuracy_score(y_test, y_pred),
-            "precision": precision_score(y_test, y_pred, zero_division=0),
-            "recall": recall_score(y_test, y_pred, zero_division=0),
-            "features_used": ",".join(used_features)
-        })
+    for task, (outcome, error) in zip(tasks, outcomes):
+        if error is not None:
+            metrics.append({"train_rows": task.start, "test_rows": min(step, n - task.start), "error": error})
+            errors.append(error)
+            continue
+        row, model = outcome
+        metrics.append(row)
+        last_ok, last_model = task, model
+    if tasks and len(errors) == len(tasks):
+        raise RuntimeError(f"All {len(tasks)} walk-forward ML windows failed; first error: {errors[0]}")
+    if last_ok is not None and last_model is None:
+        _, last_model = _train_test_window(replace(last_ok, source=df, keep_model=True))
 
     return pd.DataFrame(metrics), last_model
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import config as cfg
+
+# Per-process cache of opened memmaps, keyed by directory, so a worker maps
+# each column once however many windows it evaluates.
+_OPENED: Dict[str, Dict[str, np.ndarray]] = {}
+
+
+@dataclass(frozen=True)
+class MappedFrame:
+    """
+    A DataFrame written column by column to `.npy` files and read back with
+    `mmap_mode="r"`. The handle pickles as a directory path plus a small
+    column spec, so process-pool workers share the page cache instead of
+    receiving a pickled copy of the history.
+
+    Column kinds:
+    - "num": numeric/bool columns, stored as-is;
+    - "datetime": int64 nanoseconds (UTC for tz-aware columns, with the tz
+      kept in the spec);
+    - "str": all-string object columns, stored as fixed-width unicode;
+    - "codes": anything else (mixed objects, categoricals), stored as
+      factorized codes with the uniques kept in the spec.
+    """
+
+    directory: str
+    columns: Tuple[Tuple[str, str, Optional[str], Optional[list]], ...]
+    length: int
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, directory) -> "MappedFrame":
+        out = Path(directory)
+        out.mkdir(parents=True, exist_ok=True)
+        specs = []
+        for pos, name in enumerate(df.columns):
+            kind, array, tz, uniques = _encode(df[name])
+            np.save(out / f"c{pos}.npy", array, allow_pickle=False)
+            specs.append((str(name), kind, tz, uniques))
+        return cls(directory=str(out), columns=tuple(specs), length=len(df))
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def names(self) -> List[str]:
+        return [spec[0] for spec in self.columns]
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        arrays = _OPENED.get(self.directory)
+        if arrays is None:
+            base = Path(self.directory)
+            arrays = {
+                spec[0]: np.load(base / f"c{pos}.npy", mmap_mode="r", allow_pickle=False)
+                for pos, spec in enumerate(self.columns)
+            }
+            _OPENED[self.directory] = arrays
+        return arrays
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        The raw stored array (read-only memmap) for `name`.
+        """
+        return self._arrays()[name]
+
+    def take(self, rows: np.ndarray, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Materialise `rows` (positions, in the given order) as a DataFrame
+        indexed by those positions. Only the selected rows are copied.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        wanted = set(columns) if columns is not None else None
+        arrays = self._arrays()
+        data = {}
+        for name, kind, tz, uniques in self.columns:
+            if wanted is not None and name not in wanted:
+                continue
+            data[name] = _decode(kind, np.asarray(arrays[name][rows]), tz, uniques)
+        return pd.DataFrame(data, index=pd.Index(rows))
+
+
+def release(directory) -> None:
+    """
+    Drop this process's memmaps for `directory` before it is deleted.
+    """
+    _OPENED.pop(str(directory), None)
+
+
+def _encode(series: pd.Series):
+    dtype = series.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        values = series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy("datetime64[ns]")
+        return "datetime", values.astype(np.int64), str(dtype.tz), None
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "datetime", series.to_numpy("datetime64[ns]").astype(np.int64), None, None
+    # Plain NumPy numeric/bool only; nullable and categorical dtypes go through codes.
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        return "num", series.to_numpy(), None, None
+    values = series.to_numpy(dtype=object)
+    if len(values) and all(type(v) is str for v in values):
+        return "str", values.astype(str), None, None
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    return "codes", codes.astype(np.int64), None, [_plain(v) for v in uniques]
+
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _decode(kind: str, values: np.ndarray, tz: Optional[str], uniques: Optional[list]):
+    if kind == "datetime":
+        stamps = values.astype("datetime64[ns]")
+        if tz:
+            return pd.DatetimeIndex(stamps).tz_localize("UTC").tz_convert(tz)
+        return stamps
+    if kind == "str":
+        return values.astype(object)
+    if kind == "codes":
+        lookup = np.array(list(uniques or []) + [None], dtype=object)
+        return lookup[values]
+    return values
+
+
+def resolve_workers(workers: Optional[int], tasks: int) -> int:
+    """
+    `workers` (else WALK_FORWARD_WORKERS), where 0 means one per CPU,
+    capped at the number of tasks.
+    """
+    if workers is None:
+        workers = getattr(cfg, "WALK_FORWARD_WORKERS", 1)
+    workers = int(workers or 0)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, tasks))
+
+
+def _call(fn: Callable[[Any], Any], task: Any) -> Tuple[Any, Optional[str]]:
+    try:
+        return fn(task), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+def _picklable(*objs) -> bool:
+    try:
+        pickle.dumps(objs)
+        return True
+    except Exception:
+        return False
+
+
+def map_windows(
+    fn: Callable[[Any], Any],
+    tasks: Sequence[Any],
+    workers: Optional[int] = None,
+    start_method: Optional[str] = None,
+    on_result: Optional[Callable[[int, Any, Optional[str]], None]] = None,
+) -> List[Tuple[Any, Optional[str]]]:
+    """
+    Run `fn(task)` for every task and return `(result, error)` pairs in task
+    order, whatever order the workers finish in. A failing task yields
+    `(None, "<ExcType>: <message>")` and does not stop the others.
+
+    With more than one worker the tasks run on a process pool
+    (WALK_FORWARD_START_METHOD, "spawn" by default so workers do not
+    inherit the parent's threads). `fn` and the tasks must pickle; when
+    they do not, the tasks run in-process instead.
+
+    `on_result(index, result, error)` is called in the parent as each task
+    finishes (completion order), e.g. for progress or checkpointing.
+    """
+    tasks = list(tasks)
+    workers = resolve_workers(workers, len(tasks))
+    if workers > 1 and not _picklable(fn, tasks):
+        print("[WALK_FORWARD] tasks are not picklable; running windows in-process")
+        workers = 1
+    if workers <= 1:
+        out = []
+        for index, task in enumerate(tasks):
+            out.append(_call(fn, task))
+            if on_result is not None:
+                on_result(index, *out[-1])
+        return out
+
+    method = start_method or getattr(cfg, "WALK_FORWARD_START_METHOD", "spawn")
+    out: List[Tuple[Any, Optional[str]]] = [(None, None)] * len(tasks)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context(method)) as pool:
+        futures = {pool.submit(_call, fn, task): index for index, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                out[index] = future.result()
+            except Exception as exc:
+                # The worker died (or the result did not unpickle).
+                out[index] = (None, f"{type(exc).__name__}: {exc}")
+            if on_result is not None:
+                on_result(index, *out[index])
+    return out
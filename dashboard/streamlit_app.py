@@ -30,11 +30,13 @@ from dashboard.ui import (
 )
 
 from core.trade_store import fetch_recent_trades, fetch_recent_outcomes, fetch_pnl_series, fetch_execution_stats, fetch_depth_snapshots, fetch_depth_imbalance
+from core.trade_log_store import iter_trades
 from core.scorecard import compute_scorecard
 from core.gpt_advisor import get_trade_advice, save_advice, get_day_summary
 from core.market_data import fetch_live_market_data, ensure_startup_warmup_bootstrap
 from core.day_type_history import load_day_type_events, day_type_events_dataframe
 from core.offhours import is_offhours
+from core.snapshot_publisher import read_snapshot
 from core.time_utils import is_today_local, age_minutes_local, now_local, parse_ts_local
 import time
 
@@ -65,14 +67,7 @@ if not LOG_PATH.exists():
     st.error("No trade_log.json found.")
     st.stop()
 
-rows = []
-with open(LOG_PATH, "r") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rows.append(json.loads(line))
-
-df = pd.DataFrame(rows)
+df = pd.DataFrame(list(iter_trades(LOG_PATH)))
 updates_path = Path("data/trade_updates.json")
 if updates_path.exists():
     try:
@@ -294,18 +289,8 @@ def _ml_label_count():
     path = Path("data/trade_log.json")
     if not path.exists():
         return 0
-    count = 0
     try:
-        with path.open() as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    obj = json.loads(line)
-                except Exception:
-                    continue
-                if obj.get("actual") is not None:
-                    count += 1
+        count = sum(1 for obj in iter_trades(path) if obj.get("actual") is not None)
     except Exception:
         return 0
     return count
@@ -1267,13 +1252,7 @@ if nav == "Home":
                         pass
             else:
                 quote_err_file_missing = True
-            chain_health = {}
-            health_path = Path("logs/option_chain_health.json")
-            if health_path.exists():
-                try:
-                    chain_health = json.loads(health_path.read_text())
-                except Exception:
-                    chain_health = {}
+            chain_health = read_snapshot("logs/option_chain_health.json", default={})
             offhours_mode = is_offhours(
                 {
                     "state": state,
@@ -3647,7 +3626,7 @@ if nav == "Data & SLA":
     try:
         health_path = Path("logs/option_chain_health.json")
         if health_path.exists():
-            health = json.loads(health_path.read_text())
+            health = read_snapshot(health_path, default={})
             if isinstance(health, dict) and health:
                 df_h = pd.DataFrame(health.values())
                 ui.table(df_h, use_container_width=True)
@@ -3865,7 +3844,7 @@ if nav == "ML/RL":
         st.warning(f"RL metrics error: {e}")
 
 if nav == "Market Depth":
-    st.subheader("Depth Snapshots (SQLite)")
+    st.subheader("Depth Snapshots (depth history)")
     try:
         cols, rows = fetch_depth_snapshots(100)
         if rows:
@@ -3917,18 +3896,11 @@ if nav == "Market Depth":
     try:
         cols, rows = fetch_depth_imbalance(500)
         if rows:
-            import json as _json
-            from core.kite_client import kite_client
             meta_map = _get_instrument_meta_map()
             imb_rows = []
             for row in rows:
-                # depth_snapshots query can return (timestamp, instrument_token, depth_json, timestamp_epoch)
-                ts, token, dj = row[0], row[1], row[2]
-                try:
-                    obj = _json.loads(dj)
-                    imb = obj.get("imbalance")
-                except Exception:
-                    imb = None
+                # depth history rows: (timestamp, instrument_token, imbalance, timestamp_epoch)
+                ts, token, imb = row[0], row[1], row[2]
                 meta = meta_map.get(token, {})
                 imb_rows.append({
                     "timestamp": ts,
@@ -1,4 +1,3 @@
-from core.orchestrator import Orchestrator
 from core.readiness_gate import run_readiness_check
 from core.audit_log import append_event as audit_append
 from core import risk_halt
@@ -71,6 +70,9 @@ def main():
         if not can_trade:
             warnings = readiness.get("warnings") or []
             print(f"[Readiness] state={state}; can_trade={can_trade}; warnings={','.join(warnings)}")
+    # Imported after the DB/token/readiness checks so a failed start exits quickly.
+    from core.orchestrator import Orchestrator
+
     orchestrator = Orchestrator(total_capital=getattr(cfg, "CAPITAL", 100000), poll_interval=30)
     orchestrator.live_monitoring()
 
@@ -93,6 +93,34 @@ class MicrostructurePredictor:
             return float(proba[0][1])
         return float(proba[0][0])
 
+    def predict_confidence_batch(self, rows, context=None):
+        """
+        predict_confidence for each feature row with a single model.predict call.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        model = self._get_model(context=context)
+        if model is None:
+            return [0.5] * len(rows)
+        x = np.asarray(rows, dtype=float)
+        try:
+            expected = None
+            if hasattr(model, "input_shape") and model.input_shape:
+                expected = model.input_shape[-1]
+            if expected and x.shape[1] != expected:
+                if x.shape[1] < expected:
+                    pad = np.zeros((x.shape[0], expected - x.shape[1]), dtype=float)
+                    x = np.concatenate([x, pad], axis=1)
+                else:
+                    x = x[:, :expected]
+        except Exception:
+            pass
+        proba = model.predict(x, verbose=0)
+        if proba.ndim == 2 and proba.shape[1] > 1:
+            return [float(p) for p in proba[:, 1]]
+        return [float(p) for p in proba[:, 0]]
+
     def get_governance(self):
         return {
             "model_version": self.model_version,
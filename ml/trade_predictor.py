@@ -1,11 +1,7 @@
 import os
 import time
-import joblib
 import numpy as np
 import pandas as pd
-from xgboost import XGBClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
 from config import config as cfg
 from core.feature_contract import FeatureContract
 from core.model_registry import get_active_entry, get_shadow_entry
@@ -56,6 +52,9 @@ class TradePredictor:
         self.feature_contract = self._build_feature_contract()
 
     def _new_model(self):
+        # xgboost/joblib are imported on first model use, not with this module.
+        from xgboost import XGBClassifier
+
         return XGBClassifier(
             n_estimators=100,
             max_depth=5,
@@ -66,6 +65,8 @@ class TradePredictor:
         )
 
     def load(self, path):
+        import joblib
+
         loaded = joblib.load(path)
         if isinstance(loaded, dict) and "models" in loaded:
             self.models = loaded.get("models", {})
@@ -82,6 +83,8 @@ class TradePredictor:
         self.feature_contract = self._build_feature_contract()
 
     def _load_shadow(self, path):
+        import joblib
+
         loaded = joblib.load(path)
         if isinstance(loaded, dict) and "models" in loaded:
             self.shadow_models = loaded.get("models", {})
@@ -119,6 +122,8 @@ class TradePredictor:
             "features": self.feature_list,
             "meta": self.meta,
         }
+        import joblib
+
         joblib.dump(payload, out_path)
         return out_path
 
@@ -246,6 +251,47 @@ class TradePredictor:
         except Exception:
             return 0.5
 
+    def _row_contexts(self, features: pd.DataFrame):
+        cols = [f for f in _SEGMENT_FIELDS if f in features.columns]
+        cols += [f for f in _ALT_SEGMENT_FIELDS if f in features.columns and f not in cols]
+        if not cols:
+            return [None] * len(features)
+        return [dict(rec) for rec in features[cols].to_dict("records")]
+
+    def _batch_positive_proba(self, features: pd.DataFrame, select, align, context=None):
+        """
+        Positive-class probability per row with one predict_proba call per
+        selected segment model. Rows whose model is missing or unfitted stay None.
+        """
+        out = [None] * len(features)
+        groups = {}
+        contexts = [context] * len(features) if context else self._row_contexts(features)
+        for i, ctx in enumerate(contexts):
+            model, key = select(None, context=ctx)
+            groups.setdefault(key, (model, []))[1].append(i)
+        for model, idx in groups.values():
+            if model is None or not self._is_fitted(model):
+                continue
+            feats = align(features.iloc[idx], model=model)
+            proba = np.asarray(model.predict_proba(feats))
+            col = 1 if proba.ndim == 2 and proba.shape[1] > 1 else 0
+            for i, p in zip(idx, proba[:, col]):
+                out[i] = float(p)
+        return out
+
+    def predict_confidence_batch(self, features: pd.DataFrame, context=None) -> list:
+        """
+        predict_confidence for every row of `features`, batched per segment
+        model. Row i gets the value predict_confidence would return for row i.
+        """
+        if features is None or features.empty:
+            return []
+        try:
+            out = self._batch_positive_proba(features, self._select_model, self.align_features, context=context)
+        except Exception:
+            return [self.predict_confidence(features.iloc[[i]], context=context) for i in range(len(features))]
+        return [0.5 if p is None else p for p in out]
+
     def predict_calibrated_proba(self, features: pd.DataFrame, context=None) -> float:
         """
         Canonical calibrated probability used by sizing and gating.
@@ -296,6 +342,20 @@ class TradePredictor:
         except Exception:
             return None
 
+    def predict_confidence_shadow_batch(self, features: pd.DataFrame, context=None) -> list:
+        """
+        predict_confidence_shadow for every row of `features`, batched per
+        shadow segment model.
+        """
+        if features is None or features.empty:
+            return []
+        if not self.shadow_models:
+            return [None] * len(features)
+        try:
+            return self._batch_positive_proba(features, self._select_shadow_model, self.align_features_shadow, context=context)
+        except Exception:
+            return [self.predict_confidence_shadow(features.iloc[[i]], context=context) for i in range(len(features))]
+
     def get_governance(self):
         return {
             "model_version": self.model_version,
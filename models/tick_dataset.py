@@ -58,6 +58,41 @@ def _extract_depth_features(depth_payload: dict[str, Any] | None) -> tuple[float
     return imbalance, spread_pct
 
 
+def _epoch_seconds(ts: pd.Series) -> pd.Series:
+    dt = pd.to_datetime(ts, errors="coerce", utc=True)
+    return (dt - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+
+
+def _load_depth_features(conn, db_path: str, tick_epochs: pd.Series, tolerance_sec: float) -> pd.DataFrame:
+    """
+    (instrument_token, _epoch, depth_imbalance, depth_spread_pct) for the
+    tick time range: from the depth_hist_* partitions, or from a legacy
+    depth_snapshots table that has not been migrated yet.
+    """
+    from core.depth_history import iter_depth_history
+
+    cols = ["instrument_token", "_epoch", "depth_imbalance", "depth_spread_pct"]
+    epochs = tick_epochs.dropna()
+    if epochs.empty:
+        return pd.DataFrame(columns=cols)
+    start, end = float(epochs.min()) - tolerance_sec, float(epochs.max()) + tolerance_sec + 1e-6
+    rows = []
+    for ts, token, depth, imbalance in iter_depth_history(Path(db_path), start, end):
+        _, spread_pct = _extract_depth_features({"depth": depth})
+        rows.append((int(token), float(ts), imbalance, spread_pct))
+    if not rows and conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='depth_snapshots'"
+    ).fetchone():
+        legacy = pd.read_sql_query("SELECT timestamp, instrument_token, depth_json FROM depth_snapshots", conn)
+        legacy["_epoch"] = _epoch_seconds(legacy["timestamp"])
+        for token, epoch, payload in legacy[["instrument_token", "_epoch", "depth_json"]].itertuples(index=False):
+            imbalance, spread_pct = _extract_depth_features(_parse_depth_payload(payload))
+            rows.append((int(token), epoch, imbalance, spread_pct))
+    df = pd.DataFrame(rows, columns=cols)
+    df["_epoch"] = df["_epoch"].astype(float)
+    return df.dropna(subset=["_epoch"])
+
+
 def build_tick_dataset(
     db_path,
     horizon: int = 2,
@@ -74,8 +109,10 @@ def build_tick_dataset(
     db_path = str(db_path)
     conn = sqlite3.connect(db_path)
     try:
+        tick_cols = {row[1] for row in conn.execute("PRAGMA table_info(ticks)").fetchall()}
+        epoch_col = ", timestamp_epoch" if "timestamp_epoch" in tick_cols else ""
         df_ticks = pd.read_sql_query(
-            "SELECT timestamp, instrument_token, last_price, volume, oi FROM ticks",
+            f"SELECT timestamp, instrument_token, last_price, volume, oi{epoch_col} FROM ticks",
             conn,
         )
         if df_ticks.empty:
@@ -96,34 +133,29 @@ def build_tick_dataset(
             df_ticks["target"] = (df_ticks["ret"] > float(threshold)).astype(int)
 
         if from_depth:
-            df_depth = pd.read_sql_query(
-                "SELECT timestamp, instrument_token, depth_json FROM depth_snapshots",
-                conn,
-            )
+            df_ticks["_epoch"] = _epoch_seconds(df_ticks["ts"])
+            if "timestamp_epoch" in df_ticks.columns:
+                df_ticks["_epoch"] = pd.to_numeric(df_ticks["timestamp_epoch"], errors="coerce").fillna(df_ticks["_epoch"])
+            df_depth = _load_depth_features(conn, db_path, df_ticks["_epoch"], float(depth_tolerance_sec))
             if not df_depth.empty:
-                df_depth["ts"] = _safe_to_datetime(df_depth["timestamp"])
-                df_depth = df_depth.sort_values(["instrument_token", "ts"]).reset_index(drop=True)
-
-                df_ticks_sorted = df_ticks.sort_values(["instrument_token", "ts"]).reset_index(drop=True)
+                df_depth = df_depth.sort_values("_epoch").reset_index(drop=True)
+                df_ticks_sorted = (
+                    df_ticks.dropna(subset=["_epoch"]).sort_values("_epoch").reset_index(drop=True)
+                )
                 merged = pd.merge_asof(
                     df_ticks_sorted,
                     df_depth,
                     by="instrument_token",
-                    left_on="ts",
-                    right_on="ts",
-                    tolerance=pd.Timedelta(seconds=float(depth_tolerance_sec)),
+                    on="_epoch",
+                    tolerance=float(depth_tolerance_sec),
                     direction="nearest",
                 )
-
-                parsed = merged["depth_json"].apply(_parse_depth_payload)
-                feats = parsed.apply(_extract_depth_features)
-                merged["depth_imbalance"] = feats.apply(lambda x: x[0])
-                merged["depth_spread_pct"] = feats.apply(lambda x: x[1])
-                df_ticks = merged
+                df_ticks = merged.sort_values(["instrument_token", "ts"]).reset_index(drop=True)
             else:
                 df_ticks["depth_imbalance"] = np.nan
                 df_ticks["depth_spread_pct"] = np.nan
 
+        df_ticks = df_ticks.drop(columns=["_epoch"], errors="ignore")
         if out_path is not None:
             out_path = Path(out_path)
             out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -9,6 +9,8 @@ from pathlib import Path
 import sys
 
 from config import config as cfg
+from core.data_qc import depth_partitions, depth_summary, table_summary
+from core.depth_history import LEGACY_TABLE
 
 OUT = Path("logs/data_audit.json")
 
@@ -19,12 +21,11 @@ def audit():
     conn = sqlite3.connect(db)
     res = {}
     try:
-        res["ticks"] = conn.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
-        res["depth"] = conn.execute("SELECT COUNT(*) FROM depth_snapshots").fetchone()[0]
-        res["tick_min_ts"] = conn.execute("SELECT MIN(timestamp) FROM ticks").fetchone()[0]
-        res["tick_max_ts"] = conn.execute("SELECT MAX(timestamp) FROM ticks").fetchone()[0]
-        res["depth_min_ts"] = conn.execute("SELECT MIN(timestamp) FROM depth_snapshots").fetchone()[0]
-        res["depth_max_ts"] = conn.execute("SELECT MAX(timestamp) FROM depth_snapshots").fetchone()[0]
+        res["ticks"], res["tick_min_ts"], res["tick_max_ts"] = table_summary(conn, "ticks")
+        res["depth"], res["depth_min_ts"], res["depth_max_ts"] = depth_summary(conn)
+        res["depth_partitions"] = len(depth_partitions(conn))
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (LEGACY_TABLE,)).fetchone():
+            res["depth_legacy"] = table_summary(conn, LEGACY_TABLE)[0]
     except Exception as e:
         res["error"] = str(e)
     conn.close()
@@ -0,0 +1,52 @@
+import argparse
+import time
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+import numpy as np
+import pandas as pd
+
+from core.backtest_engine import BacktestEngine
+
+
+def _minute_bars(days, symbol, start, rng):
+    sessions = pd.bdate_range("2025-01-01", periods=days)
+    ts = pd.DatetimeIndex(
+        np.concatenate([pd.date_range(d + pd.Timedelta(hours=9, minutes=15), periods=375, freq="min") for d in sessions])
+    )
+    n = len(ts)
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.0006, n)))
+    open_ = np.r_[start, close[:-1]]
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0003, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0003, n)))
+    volume = rng.integers(1000, 50000, n)
+    return pd.DataFrame(
+        {"datetime": ts, "open": open_, "high": high, "low": low, "close": close, "volume": volume, "symbol": symbol}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BacktestEngine.run throughput on synthetic minute bars")
+    parser.add_argument("--days", type=int, default=250)
+    parser.add_argument("--symbols", default="NIFTY")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+    starts = {"NIFTY": 25000.0, "BANKNIFTY": 52000.0, "SENSEX": 82000.0}
+    df = pd.concat([_minute_bars(args.days, s, starts.get(s, 20000.0), rng) for s in symbols], ignore_index=True)
+
+    engine = BacktestEngine(df)
+    start = time.perf_counter()
+    results = engine.run()
+    elapsed = time.perf_counter() - start
+    stats = engine.stats
+    print(f"bars={stats['bars']} events={stats['events']} trades={len(results)} seconds={elapsed:.2f}")
+    print(f"bars_per_sec={stats['bars'] / elapsed:.0f} events_per_sec={stats['events'] / elapsed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
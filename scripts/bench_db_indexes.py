@@ -0,0 +1,114 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from core import trade_store
+from core.db_indexes import ensure_indexes, query_plan, specs_for
+from core.synthetic_market import IST, SyntheticSessionConfig, generate_ohlcv_session, write_sqlite_session
+
+SYMBOLS = ("NIFTY", "BANKNIFTY", "SENSEX", "FINNIFTY", "MIDCPNIFTY")
+
+
+def _write_instruments(symbols):
+    # write_sqlite_session resolves tokens from data/kite_instruments.csv (relative to cwd).
+    Path("data").mkdir(exist_ok=True)
+    with open("data/kite_instruments.csv", "w") as f:
+        f.write("instrument_token,tradingsymbol,name\n")
+        for i, sym in enumerate(symbols):
+            f.write(f"{256265 + i},{sym},{sym}\n")
+
+
+def _build_db(db_path, rows, days, trades, open_trades):
+    symbols = SYMBOLS
+    per_session = max(1, rows // (len(symbols) * days))
+    start = date(2026, 1, 5)
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        for i, sym in enumerate(symbols):
+            cfg = SyntheticSessionConfig(symbol=sym, date=day, bars=per_session, bar_sec=1, seed=d * 31 + i)
+            write_sqlite_session(db_path, sym, generate_ohlcv_session(cfg))
+    with sqlite3.connect(db_path) as conn:
+        trade_store._migrate(conn)
+        conn.executemany(
+            "INSERT INTO trades (trade_id, timestamp, symbol, exit_time) VALUES (?,?,?,?)",
+            [
+                (f"T{i}", f"2026-01-05T09:{i % 60:02d}:{i % 60:02d}Z", SYMBOLS[i % len(SYMBOLS)], None if i < open_trades else "2026-01-05T15:00:00Z")
+                for i in range(trades)
+            ],
+        )
+    return start
+
+
+def _queries(start_day):
+    day_start = datetime(start_day.year, start_day.month, start_day.day, 9, 0, tzinfo=IST).timestamp()
+    return [
+        ("freshness MAX by token", "SELECT MAX(timestamp_epoch) FROM ticks WHERE instrument_token IN (?,?)", (256265, 256266)),
+        ("freshness MAX any", "SELECT MAX(timestamp_epoch) FROM ticks", ()),
+        (
+            "replay 1h range",
+            "SELECT timestamp_epoch, instrument_token, last_price, volume FROM ticks "
+            "WHERE timestamp_epoch >= ? AND timestamp_epoch < ? ORDER BY timestamp_epoch ASC",
+            (day_start, day_start + 3600.0),
+        ),
+        ("open positions", "SELECT * FROM trades WHERE COALESCE(exit_time, '') = '' ORDER BY timestamp DESC LIMIT ?", (2000,)),
+    ]
+
+
+def _time_queries(conn, queries, repeat):
+    out = {}
+    for label, sql, params in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        out[label] = ((time.perf_counter() - start) / repeat * 1000.0, query_plan(conn, sql, params))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Hot-query latency with and without the managed secondary indexes.")
+    ap.add_argument("--rows", type=int, default=2_000_000, help="synthetic tick rows")
+    ap.add_argument("--days", type=int, default=4)
+    ap.add_argument("--trades", type=int, default=200_000)
+    ap.add_argument("--open-trades", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            _write_instruments(SYMBOLS)
+            db_path = Path(tmp) / "synthetic.sqlite"
+            t0 = time.perf_counter()
+            start_day = _build_db(db_path, args.rows, args.days, args.trades, args.open_trades)
+            build_sec = time.perf_counter() - t0
+            queries = _queries(start_day)
+            with sqlite3.connect(db_path) as conn:
+                for spec in specs_for(("ticks", "trades")):
+                    conn.execute(f"DROP INDEX IF EXISTS {spec.name}")
+                before = _time_queries(conn, queries, args.repeat)
+                t0 = time.perf_counter()
+                ensure_indexes(conn, ("ticks", "trades"))
+                index_sec = time.perf_counter() - t0
+                after = _time_queries(conn, queries, args.repeat)
+                tick_rows = conn.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
+        finally:
+            os.chdir(cwd)
+
+    print(f"ticks={tick_rows} trades={args.trades} build={build_sec:.1f}s create_indexes={index_sec:.2f}s")
+    for label, _sql, _params in queries:
+        b_ms, _ = before[label]
+        a_ms, plan = after[label]
+        print(f"{label:24s} before={b_ms:9.3f} ms  after={a_ms:9.3f} ms  speedup={b_ms / a_ms if a_ms else float('inf'):7.1f}x")
+        print(f"{'':24s} plan: {' | '.join(plan)}")
+
+
+if __name__ == "__main__":
+    main()
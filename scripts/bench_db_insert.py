@@ -0,0 +1,64 @@
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from config import config as cfg
+from core import db_pool, trade_store
+
+
+def _row(i):
+    return {"instrument": "NIFTY", "slippage_bps": float(i % 7), "latency_ms": 12.5, "fill_ratio": 1.0}
+
+
+def _legacy_insert(db_path, row):
+    # Pre-pool path: fresh connection and full schema bootstrap on every write.
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        trade_store._migrate(conn)
+        now = time.time()
+        with conn:
+            conn.execute(
+                "INSERT INTO execution_stats (timestamp, instrument, slippage_bps, latency_ms, fill_ratio, timestamp_epoch, timestamp_iso) "
+                "VALUES (?,?,?,?,?,?,?)",
+                ("", row["instrument"], row["slippage_bps"], row["latency_ms"], row["fill_ratio"], now, ""),
+            )
+    finally:
+        conn.close()
+
+
+def _time(fn, n):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(_row(i))
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-insert latency: per-call connect+schema vs pooled connection.")
+    ap.add_argument("--inserts", type=int, default=500)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = str(Path(tmp) / "legacy.db")
+        pooled_db = str(Path(tmp) / "pooled.db")
+        legacy_us = _time(lambda row: _legacy_insert(legacy_db, row), args.inserts)
+        cfg.TRADE_DB_PATH = pooled_db
+        pooled_us = _time(trade_store.insert_execution_stat, args.inserts)
+        stats = db_pool.stats()
+        db_pool.close_thread_connections()
+
+    print(f"inserts={args.inserts}")
+    print(f"legacy  (connect + schema per insert): {legacy_us:9.1f} us/insert")
+    print(f"pooled  (db_pool, schema once)       : {pooled_us:9.1f} us/insert")
+    print(f"speedup: {legacy_us / pooled_us if pooled_us else float('inf'):.1f}x")
+    print(f"pool: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import random
+import time
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from config import config as cfg
+from core.greeks import bs_price, chain_greeks, greeks, implied_vol
+
+
+def _chain(n, rng):
+    rows = []
+    spot = 25000.0
+    for _ in range(n):
+        strike = spot + rng.randint(-20, 20) * 50
+        t = rng.randint(1, 60) / 365.0
+        is_call = rng.random() < 0.5
+        price = bs_price(spot, strike, t, cfg.RISK_FREE_RATE, rng.uniform(0.08, 0.6), is_call)
+        rows.append((max(price, 0.05), spot, strike, t, is_call))
+    return rows
+
+
+def _scalar(rows):
+    out = []
+    for price, spot, strike, t, is_call in rows:
+        vol = implied_vol(price, spot, strike, t, is_call=is_call)
+        out.append(greeks(spot, strike, t, vol, is_call=is_call))
+    return out
+
+
+def _batch(rows):
+    prices, spots, strikes, times, calls = zip(*rows)
+    return chain_greeks(prices, spots, strikes, times, calls)
+
+
+def _time_ms(fn, rows, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chain IV + greeks: scalar loop vs chain_greeks batch")
+    parser.add_argument("--sizes", default="100,250,500,1000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'contracts':>10} {'scalar_ms':>10} {'batch_ms':>10} {'speedup':>8}")
+    for n in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        rows = _chain(n, rng)
+        scalar_ms = _time_ms(_scalar, rows, args.repeat)
+        batch_ms = _time_ms(_batch, rows, args.repeat)
+        print(f"{n:>10} {scalar_ms:>10.2f} {batch_ms:>10.2f} {scalar_ms / max(batch_ms, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
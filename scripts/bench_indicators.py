@@ -0,0 +1,59 @@
+import argparse
+import random
+import time
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from core.indicators_live import compute_indicators
+from core.ohlc_buffer import OhlcBuffer
+
+
+def _fill(buf, symbol, bars, rng):
+    price = 25000.0
+    t0 = 1767240000.0
+    for i in range(bars):
+        price += rng.gauss(0, 6.0)
+        buf.update_tick(symbol, price, volume=rng.randint(1, 500), ts=t0 + i * 60)
+    return t0 + bars * 60, price
+
+
+def _bench(buffer_len, ticks, rng):
+    buf = OhlcBuffer(max_bars=buffer_len)
+    ts, price = _fill(buf, "NIFTY", buffer_len, rng)
+    engine = buf.indicator_engine("NIFTY")
+    engine.snapshot()
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        price += rng.gauss(0, 2.0)
+        buf.update_tick("NIFTY", price, volume=10, ts=ts + i * 0.5)
+        compute_indicators(buf.get_bars("NIFTY"))
+    full_us = (time.perf_counter() - start) / ticks * 1e6
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        price += rng.gauss(0, 2.0)
+        buf.update_tick("NIFTY", price, volume=10, ts=ts + (ticks + i) * 0.5)
+        engine.snapshot()
+    inc_us = (time.perf_counter() - start) / ticks * 1e6
+    return full_us, inc_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-tick indicator cost: full recompute vs IndicatorEngine")
+    parser.add_argument("--lengths", default="100,500,2000")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'bars':>6} {'full_us/tick':>14} {'incremental_us/tick':>20} {'speedup':>8}")
+    for length in [int(x) for x in args.lengths.split(",") if x.strip()]:
+        full_us, inc_us = _bench(length, args.ticks, rng)
+        print(f"{length:>6} {full_us:>14.1f} {inc_us:>20.2f} {full_us / max(inc_us, 1e-9):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
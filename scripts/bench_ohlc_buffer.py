@@ -0,0 +1,104 @@
+import argparse
+import random
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from core.ohlc_buffer import OhlcBuffer
+from core.time_utils import IST_TZ
+
+
+class LegacyOhlcBuffer:
+    """
+    The previous deque-of-dicts buffer, kept here only as the benchmark baseline.
+    """
+
+    def __init__(self, max_bars):
+        self._bars = defaultdict(lambda: deque(maxlen=max_bars))
+
+    def update_tick(self, symbol, price, volume=0, ts=None):
+        ts = datetime.fromtimestamp(ts, tz=IST_TZ)
+        bucket = ts.replace(second=0, microsecond=0)
+        bars = self._bars[symbol]
+        if bars and bars[-1]["ts"] == bucket:
+            bar = bars[-1]
+            bar["high"] = max(bar["high"], price)
+            bar["low"] = min(bar["low"], price)
+            bar["close"] = price
+            bar["volume"] += volume or 0
+        else:
+            bars.append({"ts": bucket, "open": price, "high": price, "low": price, "close": price, "volume": volume or 0})
+
+    def get_bars(self, symbol):
+        return list(self._bars.get(symbol, []))
+
+
+def _fill(buf, symbols, bars, seed):
+    rng = random.Random(seed)
+    t0 = 1767240000.0
+    for sym in symbols:
+        price = 25000.0
+        for i in range(bars):
+            price += rng.gauss(0, 6.0)
+            buf.update_tick(sym, price, volume=rng.randint(1, 500), ts=t0 + i * 60)
+    return t0 + bars * 60
+
+
+def _memory_kb(factory, symbols, bars, seed):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    buf = factory()
+    _fill(buf, symbols, bars, seed)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / 1024.0
+
+
+def _per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OhlcBuffer memory and per-call latency: columnar vs legacy deque-of-dicts")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=500)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    legacy_kb = _memory_kb(lambda: LegacyOhlcBuffer(args.bars), symbols, args.bars, args.seed)
+    columnar_kb = _memory_kb(lambda: OhlcBuffer(max_bars=args.bars), symbols, args.bars, args.seed)
+
+    legacy = LegacyOhlcBuffer(args.bars)
+    columnar = OhlcBuffer(max_bars=args.bars)
+    ts = _fill(legacy, symbols[:1], args.bars, args.seed)
+    _fill(columnar, symbols[:1], args.bars, args.seed)
+    sym = symbols[0]
+    tick = iter(range(10**9))
+
+    rows = [
+        ("memory_kb", legacy_kb, columnar_kb),
+        ("update_tick_us", _per_call_us(lambda: legacy.update_tick(sym, 25000.0, 1, ts + next(tick) * 0.5), args.calls),
+         _per_call_us(lambda: columnar.update_tick(sym, 25000.0, 1, ts + next(tick) * 0.5), args.calls)),
+        ("get_bars_us", _per_call_us(lambda: legacy.get_bars(sym), args.calls),
+         _per_call_us(lambda: columnar.get_bars(sym), args.calls)),
+        ("closes_us", _per_call_us(lambda: [b["close"] for b in legacy.get_bars(sym)], args.calls),
+         _per_call_us(lambda: columnar.window(sym)["close"], args.calls)),
+    ]
+    print(f"{args.symbols} symbols x {args.bars} bars")
+    print(f"{'metric':>16} {'legacy':>12} {'columnar':>12} {'ratio':>8}")
+    for name, old, new in rows:
+        print(f"{name:>16} {old:>12.2f} {new:>12.2f} {old / max(new, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
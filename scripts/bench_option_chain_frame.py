@@ -0,0 +1,176 @@
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+import numpy as np
+
+from core.option_chain_frame import OptionChainFrame
+from core.stress_generator import StressScenario, SyntheticStressGenerator
+
+# Fields the TradeBuilder pre-filter reads from every row.
+_SCREEN_KEYS = (
+    "quote_ts_epoch", "quote_age_sec", "quote_ok", "depth_ok", "bid", "ask", "ltp", "volume", "oi",
+    "oi_change", "moneyness", "iv", "iv_z", "iv_skew", "iv_skew_norm", "iv_skew_curvature",
+    "iv_term", "iv_surface_slope", "delta",
+)
+
+
+def _chain(strikes, seed):
+    rng = np.random.default_rng(seed)
+    chain = []
+    for i in range(strikes):
+        strike = 25000 + 50 * (i - strikes // 2)
+        for opt_type in ("CE", "PE"):
+            ltp = float(rng.uniform(5, 300))
+            chain.append(
+                {
+                    "type": opt_type,
+                    "strike": strike,
+                    "instrument_token": 1000 + 2 * i + (opt_type == "PE"),
+                    "ltp": ltp,
+                    "bid": ltp * 0.995,
+                    "ask": ltp * 1.005,
+                    "bid_qty": int(rng.integers(50, 5000)),
+                    "ask_qty": int(rng.integers(50, 5000)),
+                    "volume": int(rng.integers(0, 100000)),
+                    "oi": int(rng.integers(0, 100000)),
+                    "oi_change": int(rng.integers(-500, 500)),
+                    "quote_ok": True,
+                    "quote_age_sec": 1.0,
+                    "quote_ts_epoch": 1.0,
+                    "depth_ok": True,
+                    "iv": float(rng.uniform(0.1, 0.4)),
+                    "moneyness": (25000 - strike) / 25000,
+                    "delta": 0.5,
+                    "days_to_expiry": 3,
+                }
+            )
+    return chain
+
+
+def _legacy_cycle(chain, open_tokens, scenarios, ob_thin):
+    # The list-of-dicts scans that each consumer did on its own.
+    ivs = [c.get("iv") for c in chain if c.get("iv") is not None]
+    mean = sum(ivs) / len(ivs)
+    _std = (sum((x - mean) ** 2 for x in ivs) / len(ivs)) ** 0.5
+    pairs = [(c.get("moneyness", 0), c.get("iv")) for c in chain if c.get("iv") is not None]
+    xs = [p[0] for p in pairs]
+    _slope = sum(x * y for x, (_m, y) in zip(xs, pairs)) / (sum(x * x for x in xs) or 1.0)
+    np.polyfit(np.array(xs), np.array([p[1] for p in pairs]), 2)
+    for side in ("CE", "PE"):
+        side_pairs = [(c.get("moneyness", 0), c.get("iv")) for c in chain if c.get("iv") is not None and c.get("type") == side]
+        np.polyfit(np.array([p[0] for p in side_pairs]), np.array([p[1] for p in side_pairs]), 2)
+
+    iv_vals = [c.get("iv") for c in chain if c.get("iv") is not None]
+    _iv_mean = sum(iv_vals) / len(iv_vals)
+    call_ivs = [c.get("iv") for c in chain if c.get("iv") is not None and c.get("type") == "CE"]
+    put_ivs = [c.get("iv") for c in chain if c.get("iv") is not None and c.get("type") == "PE"]
+    _skew = sum(call_ivs) / len(call_ivs) - sum(put_ivs) / len(put_ivs)
+    _oi = sum([c.get("oi_change", 0) or 0 for c in chain if c.get("type") == "CE"]) - sum(
+        [c.get("oi_change", 0) or 0 for c in chain if c.get("type") == "PE"]
+    )
+    _depth = sum([c.get("bid_qty", 0) or 0 for c in chain]) - sum([c.get("ask_qty", 0) or 0 for c in chain])
+
+    for _builder in range(3):
+        cols = OptionChainFrame(chain)
+        for key in _SCREEN_KEYS:
+            cols.num(key)
+
+    for token in open_tokens:
+        for opt in chain:
+            if opt.get("instrument_token") == token:
+                break
+
+    for sc in scenarios:
+        out = []
+        for c in chain:
+            bid, ask, iv = c.get("bid"), c.get("ask"), c.get("iv")
+            if bid and ask:
+                mid = (bid + ask) / 2
+                widen = (ask - bid) * (1 + sc.spread_widen_pct)
+                bid = max(0.01, mid - widen / 2)
+                ask = max(bid + 0.01, mid + widen / 2)
+            if iv is not None:
+                iv = iv * (1 + sc.iv_spike)
+            row = dict(c)
+            row.update(
+                {
+                    "bid": bid,
+                    "ask": ask,
+                    "iv": iv,
+                    "bid_qty": max(1, int(c["bid_qty"] * (1 - ob_thin))),
+                    "ask_qty": max(1, int(c["ask_qty"] * (1 - ob_thin))),
+                }
+            )
+            out.append(row)
+
+
+def _frame_cycle(chain, open_tokens, scenarios, generator):
+    frame = OptionChainFrame.of(chain)
+    frame.iv_stats()
+    frame.iv_surface_slope()
+    frame.skew_curvature()
+    frame.skew_curvature("CE")
+    frame.skew_curvature("PE")
+
+    frame.iv_mean()
+    frame.iv_mean("CE") - frame.iv_mean("PE")
+    frame.sum_of("oi_change", "CE") - frame.sum_of("oi_change", "PE")
+    frame.sum_of("bid_qty") - frame.sum_of("ask_qty")
+
+    for _builder in range(3):
+        cols = OptionChainFrame.of(frame)
+        for key in _SCREEN_KEYS:
+            cols.num(key)
+
+    for token in open_tokens:
+        frame.by_token(token)
+
+    for sc in scenarios:
+        generator.distort_chain(frame, sc)
+
+
+def _measure(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    cpu_ms = (time.perf_counter() - start) / repeat * 1000.0
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-cycle option-chain consumers: list-of-dicts scans vs OptionChainFrame")
+    parser.add_argument("--strikes", default="12,40,200")
+    parser.add_argument("--open-trades", type=int, default=5)
+    parser.add_argument("--scenarios", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    generator = SyntheticStressGenerator()
+    scenarios = [
+        StressScenario(returns=[], price_path=[], fill_degradation=0.0, spread_widen_pct=0.5, iv_spike=0.2 + 0.01 * i)
+        for i in range(args.scenarios)
+    ]
+    print(f"{'strikes':>8} {'path':>7} {'cpu_ms':>8} {'peak_kib':>9}")
+    for n in [int(x) for x in args.strikes.split(",") if x.strip()]:
+        chain = _chain(n, args.seed)
+        tokens = [opt["instrument_token"] for opt in chain[-args.open_trades:]]
+        # The frame path builds its frame inside the cycle, like fetch_live_market_data does.
+        legacy = _measure(lambda: _legacy_cycle(chain, tokens, scenarios, generator.ob_thin_factor), args.repeat)
+        frame = _measure(lambda: _frame_cycle(list(chain), tokens, scenarios, generator), args.repeat)
+        for name, (cpu_ms, peak_kib) in (("dicts", legacy), ("frame", frame)):
+            print(f"{n:>8} {name:>7} {cpu_ms:>8.2f} {peak_kib:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from core.db_indexes import ensure_indexes
+from core.depth_history import DepthHistoryStore
+from core.replay_engine import ReplayEngine
+
+_IST = timezone(timedelta(hours=5, minutes=30))
+_STARTS = {"NIFTY": 25000.0, "BANKNIFTY": 52000.0, "SENSEX": 82000.0}
+
+
+def _write_session(db_path, date_str, symbols, tick_ms, depth_every, rng):
+    day = datetime.fromisoformat(date_str).date()
+    open_epoch = datetime(day.year, day.month, day.day, 9, 15, tzinfo=_IST).timestamp()
+    n = int(375 * 60 * 1000 / tick_ms)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE ticks (timestamp_epoch REAL, timestamp TEXT, instrument_token INTEGER, "
+        "last_price REAL, volume INTEGER)"
+    )
+    token_map, depth = {}, []
+    for k, sym in enumerate(symbols):
+        token = 256265 + k
+        token_map[token] = sym
+        price = _STARTS.get(sym, 20000.0)
+        rows = []
+        for i in range(n):
+            ts = open_epoch + i * tick_ms / 1000.0
+            price *= 1 + rng.gauss(0, 0.00005)
+            rows.append((ts, None, token, round(price, 2), rng.randint(1, 50)))
+            if i % depth_every == 0:
+                bid_qty, ask_qty = rng.randint(50, 500), rng.randint(50, 500)
+                depth.append((ts, token, {
+                    "buy": [{"price": price - 0.5, "quantity": bid_qty, "orders": 1}],
+                    "sell": [{"price": price + 0.5, "quantity": ask_qty, "orders": 1}],
+                }))
+        conn.executemany("INSERT INTO ticks VALUES (?,?,?,?,?)", rows)
+    ensure_indexes(conn, ("ticks",))
+    conn.commit()
+    conn.close()
+    store = DepthHistoryStore(db_path=str(db_path), retention_days=0, batch_size=5000)
+    for ts, token, book in depth:
+        store.append(ts, token, book)
+    store.close()
+    return token_map, n * len(symbols)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ReplayEngine.replay_day throughput on a synthetic full session")
+    parser.add_argument("--date", default="2026-01-05")
+    parser.add_argument("--symbols", default="NIFTY,BANKNIFTY")
+    parser.add_argument("--tick-ms", type=int, default=1000, help="Tick spacing per symbol")
+    parser.add_argument("--depth-every", type=int, default=1, help="One depth snapshot every N ticks")
+    parser.add_argument("--intervals", default="bar,5s,tick")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "replay.db"
+        token_map, ticks = _write_session(db_path, args.date, symbols, args.tick_ms, args.depth_every, random.Random(args.seed))
+        print(f"ticks={ticks} symbols={len(symbols)}")
+        print(f"{'interval':>9} {'decisions':>10} {'seconds':>8} {'ticks_per_sec':>14}")
+        for interval in [s.strip() for s in args.intervals.split(",") if s.strip()]:
+            engine = ReplayEngine(db_path=db_path, seed=args.seed, token_map=token_map)
+            start = time.perf_counter()
+            engine.replay_day(args.date, symbols, decision_interval=interval, out_path=Path(tmp) / f"{interval}.jsonl")
+            elapsed = time.perf_counter() - start
+            print(f"{interval:>9} {engine.stats['decisions']:>10} {elapsed:>8.2f} {engine.stats['ticks'] / elapsed:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import time
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+import numpy as np
+import pandas as pd
+
+from config import config as cfg
+from core.feature_builder import build_trade_features
+from ml.trade_predictor import TradePredictor
+from strategies.trade_builder import TradeBuilder
+
+
+def _market_data(strikes):
+    chain = []
+    for i in range(strikes):
+        strike = 25000 + 50 * (i - strikes // 2)
+        for opt_type in ("CE", "PE"):
+            sign = 1 if opt_type == "CE" else -1
+            ltp = max(5.0, 100.0 + sign * (25000 - strike) / 10.0)
+            chain.append(
+                {
+                    "type": opt_type,
+                    "strike": strike,
+                    "bid": round(ltp * 0.995, 2),
+                    "ask": round(ltp * 1.005, 2),
+                    "ltp": ltp,
+                    "volume": 70000 + 250 * i,
+                    "oi": 5000,
+                    "oi_change": 500 + 10 * i,
+                    "quote_ok": True,
+                    "quote_age_sec": 1.0,
+                    "quote_ts_epoch": time.time(),
+                    "depth_ok": True,
+                    "expiry": "2026-02-27",
+                    "oi_build": "LONG",
+                    "iv_z": 0.0,
+                    "iv": 0.2,
+                }
+            )
+    return {
+        "symbol": "NIFTY",
+        "ltp": 25000.0,
+        "bid": 24999.0,
+        "ask": 25001.0,
+        "vwap": 24950.0,
+        "vwap_slope": 0.1,
+        "atr": 50.0,
+        "htf_dir": "UP",
+        "rsi_mom": 0.2,
+        "vol_z": 0.2,
+        "ltp_change": 10.0,
+        "ltp_change_window": 15.0,
+        "instrument": "OPT",
+        "quote_ok": True,
+        "quote_age_sec": 1.0,
+        "ltp_source": "live",
+        "chain_source": "live",
+        "day_type": "TREND_DAY",
+        "regime": "TREND",
+        "orb_bias": "UP",
+        "option_chain": chain,
+    }
+
+
+def _predictor(md, seed):
+    rows = [build_trade_features(md, opt) for opt in md["option_chain"]]
+    features = [k for k in rows[0] if not k.startswith("seg_")]
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rows)[features].astype(float)
+    X = pd.concat([X + rng.normal(0, 1.0, size=X.shape) for _ in range(5)], ignore_index=True)
+    y = (X["moneyness"] > 0).astype(int)
+    predictor = TradePredictor(model_path="/nonexistent/bench_model.pkl", load_existing=False)
+    model = predictor._new_model()
+    model.fit(X, y)
+    predictor.models = {"GLOBAL": model}
+    predictor.feature_list = features
+    predictor.shadow_models = {"GLOBAL": model}
+    predictor.shadow_feature_list = features
+    return predictor
+
+
+class _PerRow:
+    # Single-row interface only: TradeBuilder scores one option at a time.
+    def __init__(self, inner):
+        self._inner = inner
+        self.model_version = inner.model_version
+        self.shadow_version = inner.shadow_version
+
+    def get_feature_contract(self):
+        return self._inner.get_feature_contract()
+
+    def predict_confidence(self, feats):
+        return self._inner.predict_confidence(feats)
+
+    def predict_confidence_shadow(self, feats):
+        return self._inner.predict_confidence_shadow(feats)
+
+
+def _time_ms(builder, md, repeat):
+    builder.build(md, allow_fallbacks=False, allow_baseline=False)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        trade = builder.build(md, allow_fallbacks=False, allow_baseline=False)
+    return (time.perf_counter() - start) / repeat * 1000.0, trade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TradeBuilder.build: per-option ML scoring vs one batch per model")
+    parser.add_argument("--strikes", default="10,20,40")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for key, value in {
+        "STRICT_STRATEGY_SCORE": 0.1,
+        "ML_USE_ONLY_WITH_HISTORY": False,
+        "ML_MIN_PROBA": 0.0,
+        "TRADE_SCORE_MIN": 0,
+        "MAX_SPREAD_PCT": 0.2,
+        "PREMIUM_BANDS": {},
+        "MIN_PREMIUM": 1,
+        "MAX_PREMIUM": 10000,
+        "ML_AB_ENABLE": True,
+    }.items():
+        setattr(cfg, key, value)
+
+    print(f"{'strikes':>8} {'per_row_ms':>11} {'batch_ms':>9} {'speedup':>8}  same_trade")
+    for n in [int(x) for x in args.strikes.split(",") if x.strip()]:
+        md = _market_data(n)
+        predictor = _predictor(md, args.seed)
+        per_row_ms, per_row_trade = _time_ms(TradeBuilder(predictor=_PerRow(predictor)), md, args.repeat)
+        batch_ms, batch_trade = _time_ms(TradeBuilder(predictor=predictor), md, args.repeat)
+        same = (
+            per_row_trade is not None
+            and batch_trade is not None
+            and (per_row_trade.strike, per_row_trade.confidence) == (batch_trade.strike, batch_trade.confidence)
+        )
+        print(f"{n:>8} {per_row_ms:>11.1f} {batch_ms:>9.1f} {per_row_ms / max(batch_ms, 1e-9):>7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ runpy.run_path(Path(__file__).with_name("bootstrap.py"))
 
 
 import sys
-import json
 import pandas as pd
 from core.time_utils import now_ist
 from pathlib import Path
@@ -14,6 +13,7 @@ from email.mime.text import MIMEText
 
 from config import config as cfg
 from core.telegram_alerts import send_telegram_message
+from core.trade_log_store import iter_trades
 
 LOG_PATH = Path("data/trade_log.json")
 OUT_DIR = Path("logs")
@@ -23,14 +23,8 @@ if not LOG_PATH.exists():
     print("No trade_log.json found.")
     raise SystemExit(1)
 
-rows = []
-with open(LOG_PATH, "r") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rows.append(json.loads(line))
-
-df = pd.DataFrame(rows)
+# Merged view: fills/outcomes may still be in the updates journal.
+df = pd.DataFrame(list(iter_trades(LOG_PATH)))
 if df.empty:
     print("No trades to report.")
     raise SystemExit(0)
@@ -7,7 +7,7 @@ from pathlib import Path
 REQUIRED_TABLES = {
     "decision_events",
     "ticks",
-    "depth_snapshots",
+    "depth_history_partitions",
 }
 
 
@@ -3,20 +3,15 @@ import runpy
 
 runpy.run_path(Path(__file__).with_name("bootstrap.py"))
 
-import json
 import pandas as pd
 
+from core.trade_log_store import iter_trades
+
 in_path = "data/trade_log.json"
 out_path = "logs/trade_log.xlsx"
 
-rows = []
-with open(in_path, "r") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rows.append(json.loads(line))
-
-df = pd.DataFrame(rows)
+# Merged view: fills/outcomes may still be in the updates journal.
+df = pd.DataFrame(list(iter_trades(in_path)))
 required_cols = [
     "trade_id",
     "timestamp",
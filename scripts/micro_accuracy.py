@@ -4,20 +4,14 @@ import runpy
 runpy.run_path(Path(__file__).with_name("bootstrap.py"))
 
 
-import json
 import pandas as pd
 from config import config as cfg
 from core.telegram_alerts import send_telegram_message
+from core.trade_log_store import iter_trades
 
 path = "data/trade_log.json"
-rows = []
-with open(path, "r") as f:
-    for line in f:
-        if not line.strip():
-            continue
-        rows.append(json.loads(line))
-
-df = pd.DataFrame(rows)
+# Merged view: fills/outcomes may still be in the updates journal.
+df = pd.DataFrame(list(iter_trades(path)))
 df = df.dropna(subset=["micro_pred", "actual"])
 if df.empty:
     print("No micro model outcomes to evaluate.")
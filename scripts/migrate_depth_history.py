@@ -0,0 +1,31 @@
+import argparse
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from config import config as cfg
+from core.depth_history import DepthHistoryStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move legacy depth_snapshots rows into partitioned depth history")
+    parser.add_argument("--db", default="", help="SQLite db path (defaults to TRADE_DB_PATH)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--drop-legacy", action="store_true", help="Drop depth_snapshots after migrating")
+    args = parser.parse_args()
+
+    db_path = Path(args.db or cfg.TRADE_DB_PATH)
+    if not db_path.exists():
+        raise SystemExit(f"db not found: {db_path}")
+    store = DepthHistoryStore(db_path=str(db_path), retention_days=0)
+    try:
+        stats = store.migrate_legacy(chunk_size=args.chunk_size, drop_legacy=args.drop_legacy)
+        partitions = store.partitions()
+    finally:
+        store.close()
+    print(f"migrate_depth_history: {stats} partitions={len(partitions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import runpy
 runpy.run_path(Path(__file__).with_name("bootstrap.py"))
 
 from config import config as cfg
+from core.depth_history import depth_history
 from core.freshness_sla import get_freshness_status
 
 
@@ -62,8 +63,8 @@ def main():
     conn = sqlite3.connect(db)
     now_epoch = time.time()
     tick_msgs = _count_last_min(conn, "ticks", now_epoch)
-    depth_msgs = _count_last_min(conn, "depth_snapshots", now_epoch)
     conn.close()
+    depth_msgs = depth_history.count(since_epoch=now_epoch - 60.0)
 
     freshness = get_freshness_status(force=True)
     tick_lag = (freshness.get("ltp") or {}).get("age_sec")
@@ -66,7 +66,14 @@ def _most_recent_trade_date(db_path: Path) -> str:
         raise SystemExit(f"Missing DB: {db_path}")
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
-    tables = ["ticks", "depth_snapshots", "decision_events", "trades"]
+    tables = ["ticks", "decision_events", "trades"]
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='depth_history_partitions'")
+    if cur.fetchone():
+        # Only the newest depth partition can hold the latest snapshot.
+        cur.execute("SELECT name FROM depth_history_partitions ORDER BY start_epoch DESC LIMIT 1")
+        latest = cur.fetchone()
+        if latest:
+            tables.append(latest[0])
     max_ts = None
     for table in tables:
         cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,))
@@ -10,7 +10,8 @@ from core.replay_engine import ReplayEngine
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--date", required=True, help="YYYY-MM-DD")
-    parser.add_argument("--speed", type=float, default=50.0)
+    parser.add_argument("--speed", type=float, default=0.0, help="Decisions per wall-clock second (0 = unthrottled)")
+    parser.add_argument("--interval", default=None, help="Decision interval: tick, bar, or e.g. 500ms / 5s (default REPLAY_DECISION_INTERVAL)")
     parser.add_argument("--symbols", default="NIFTY,SENSEX")
     parser.add_argument("--seed", type=int, default=1)
     parser.add_argument("--db", default="", help="Optional SQLite db path")
@@ -19,8 +20,8 @@ def main():
     symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
     db_path = Path(args.db) if args.db else None
     engine = ReplayEngine(db_path=db_path, seed=args.seed)
-    out = engine.replay_day(args.date, symbols, speed=args.speed)
-    print(f"Replay complete: {out}")
+    out = engine.replay_day(args.date, symbols, speed=args.speed, decision_interval=args.interval)
+    print(f"Replay complete: {out} {engine.stats}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+import argparse
+import json
+from pathlib import Path
+import runpy
+
+runpy.run_path(Path(__file__).with_name("bootstrap.py"))
+
+from core.replay_farm import run_replay_farm
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a date range of recorded sessions on a process pool")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end", default="", help="YYYY-MM-DD (default: --start)")
+    parser.add_argument("--symbols", default="NIFTY,SENSEX")
+    parser.add_argument("--interval", default=None, help="Decision interval: tick, bar, or e.g. 5s (default REPLAY_DECISION_INTERVAL)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default REPLAY_FARM_WORKERS, 0 = one per CPU)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", default="", help="Optional SQLite db path (default TRADE_DB_PATH)")
+    parser.add_argument("--instruments", default="", help="Instruments CSV (default data/kite_instruments.csv)")
+    parser.add_argument("--out-dir", default="logs/replay_farm")
+    parser.add_argument("--no-snapshot", action="store_true", help="Read the db directly (read-only) instead of a snapshot copy")
+    parser.add_argument("--fresh", action="store_true", help="Ignore the checkpoint and replay every shard")
+    args = parser.parse_args()
+
+    summary = run_replay_farm(
+        args.start,
+        args.end or args.start,
+        [s for s in args.symbols.split(",") if s.strip()],
+        Path(args.out_dir),
+        db_path=Path(args.db) if args.db else None,
+        decision_interval=args.interval,
+        seed=args.seed,
+        workers=args.workers,
+        snapshot=not args.no_snapshot,
+        resume=not args.fresh,
+        instruments_path=Path(args.instruments) if args.instruments else None,
+    )
+    totals = {k: summary.get(k) for k in ("decisions", "gate_pass_rate", "trades", "placed", "win_rate", "pnl")}
+    print(f"Replay farm: {len(summary['shards'])}/{summary['shards_total']} shards "
+          f"({summary['shards_resumed']} resumed, {len(summary['failed_shards'])} failed) in {summary['elapsed_sec']}s")
+    print(json.dumps({"total": totals, "by_regime": summary["by_regime"]}, indent=2))
+    print(f"Summary: {Path(args.out_dir) / 'summary.json'}")
+
+
+if __name__ == "__main__":
+    main()
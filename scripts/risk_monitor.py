@@ -11,6 +11,7 @@ import sys
 
 from config import config as cfg
 from core.telegram_alerts import send_telegram_message
+from core.trade_log_store import iter_trades
 
 LOG_PATH = Path("data/trade_log.json")
 OUT_PATH = Path("logs/risk_monitor.json")
@@ -18,11 +19,8 @@ OUT_PATH = Path("logs/risk_monitor.json")
 def compute_daily_pnl():
     if not LOG_PATH.exists():
         return None
-    rows = []
-    with open(LOG_PATH, "r") as f:
-        for line in f:
-            if line.strip():
-                rows.append(json.loads(line))
+    # Merged view: exit prices may still be in the updates journal.
+    rows = list(iter_trades(LOG_PATH))
     if not rows:
         return None
     df = pd.DataFrame(rows)
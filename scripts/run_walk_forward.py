@@ -20,6 +20,7 @@ def main():
     parser.add_argument("--step-days", type=int, default=10)
     parser.add_argument("--starting-capital", type=float, default=100000.0)
     parser.add_argument("--output-dir", default="reports/walk_forward")
+    parser.add_argument("--workers", type=int, default=None, help="Process-pool size (0 = one per CPU; default WALK_FORWARD_WORKERS)")
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -35,11 +36,14 @@ def main():
         starting_capital=args.starting_capital,
         output_dir=args.output_dir,
         write_outputs=True,
+        workers=args.workers,
     )
 
     artifacts = summary.get("artifacts", {})
     print("Walk-forward complete")
-    print(f"Windows: {summary['config']['window_count']}")
+    print(f"Windows: {summary['config']['window_count']} (workers={summary['config']['workers']})")
+    for failed in summary.get("failed_windows", []):
+        print(f"Window {failed['window_id']} failed: {failed['error']}")
     print(f"Avg return: {summary['aggregate']['avg_return']:.6f}")
     print(f"Total trades: {summary['aggregate']['total_trades']}")
     if artifacts:
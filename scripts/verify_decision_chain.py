@@ -9,7 +9,8 @@ from core.decision_logger import verify_decision_chain
 
 
 def main():
-    ok, status, count = verify_decision_chain()
+    full = "--full" in sys.argv[1:]
+    ok, status, count = verify_decision_chain(full=full)
     if ok:
         print(f"Decision chain OK. events={count}")
         raise SystemExit(0)
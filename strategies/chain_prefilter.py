@@ -0,0 +1,187 @@
+"""
+Columnar pre-filter for option-chain candidates.
+
+Rules read columns from the cycle's OptionChainFrame and are evaluated
+as masks over all rows. Rules are ordered; a row is rejected by the first
+rule it fails, which is the reason the sequential per-option checks would
+have reported. Config is read once per screen, not once per row.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import config as cfg
+from core.option_chain_frame import OptionChainFrame
+
+
+class Rule(NamedTuple):
+    rule_id: str
+    reason: str
+    fail: np.ndarray
+
+
+class Screen(NamedTuple):
+    survivors: List[int]
+    rejects: List[Tuple[int, Rule]]
+
+
+def screen(eligible: np.ndarray, rules: Sequence[Rule]) -> Screen:
+    """
+    Apply ordered rules to the eligible rows. Each rejected row is paired
+    with the first rule it failed; both lists are in chain order.
+    """
+    eligible = np.asarray(eligible, dtype=bool)
+    if not rules:
+        return Screen(np.flatnonzero(eligible).tolist(), [])
+    fails = np.vstack([rule.fail for rule in rules])
+    failed = fails.any(axis=0)
+    first = fails.argmax(axis=0)
+    survivors = np.flatnonzero(eligible & ~failed).tolist()
+    rejects = [(row, rules[first[row]]) for row in np.flatnonzero(eligible & failed).tolist()]
+    return Screen(survivors, rejects)
+
+
+def _rules(specs, relax: Optional[Callable[[str], bool]]) -> List[Rule]:
+    out = []
+    for rule_id, reason, fail, relax_key in specs:
+        if relax_key is not None and relax is not None and relax(relax_key):
+            continue
+        out.append(Rule(rule_id, reason, fail))
+    return out
+
+
+def trade_rules(
+    cols: OptionChainFrame,
+    *,
+    opt_type: str,
+    direction: str,
+    exec_mode: str,
+    quick_mode: bool,
+    max_spread: float,
+    premium_band: Tuple[float, float],
+    market_data: Dict[str, Any],
+    execution,
+    relax: Optional[Callable[[str], bool]] = None,
+    config=None,
+) -> List[Rule]:
+    """
+    Option filters of TradeBuilder.build, in their original order. Thresholds
+    come from `config` (TradeBuilder's config view), else the config module.
+    """
+    ccfg = config if config is not None else cfg
+    specs = []
+    strict_quotes = getattr(ccfg, "STRICT_LIVE_QUOTES", True)
+    if exec_mode == "PAPER" and not getattr(ccfg, "PAPER_STRICT_QUOTES", True):
+        strict_quotes = False
+    if strict_quotes:
+        age = cols.num("quote_age_sec")
+        stale = cols.is_none("quote_ts_epoch") | cols.is_none("quote_age_sec") | (age > getattr(ccfg, "MAX_OPTION_QUOTE_AGE_SEC", 8))
+        specs.append(("stale_option_quote", "stale_option_quote", stale, None))
+    specs.append(("quote_not_ok", "no_quote", cols.is_false("quote_ok"), None))
+    no_quote = ~cols.truthy("quote_ok", True)
+    if getattr(ccfg, "REQUIRE_LIVE_OPTION_QUOTES", False):
+        no_quote = no_quote | ~cols.truthy("quote_live", True)
+    specs.append(("no_quote", "no_quote", no_quote, None))
+    if getattr(ccfg, "REQUIRE_DEPTH_QUOTES_FOR_TRADE", False):
+        specs.append(("no_depth", "no_depth", ~cols.truthy("depth_ok", False), None))
+    specs.append(("no_bid_ask", "no_bid_ask", cols.is_none("bid") | cols.is_none("ask"), None))
+    if getattr(ccfg, "REQUIRE_VOLUME_FOR_TRADE", False):
+        specs.append(("no_volume", "no_volume", ~cols.truthy("volume", 0), None))
+
+    bid = cols.num("bid")
+    ask = cols.num("ask")
+    ltp = cols.num("ltp", none=0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread_pct = np.where(ltp != 0, (ask - bid) / np.where(ltp != 0, ltp, 1.0), 1.0)
+    if exec_mode == "PAPER" and getattr(ccfg, "PAPER_STRICT_MODE", False):
+        specs.append(("paper_no_quote", "no_quote", ~cols.truthy("quote_ok", False), None))
+        specs.append(("paper_spread_pct", "spread_pct", spread_pct > max_spread, None))
+
+    if not quick_mode:
+        vol = cols.num("volume", 0, none=0.0)
+        specs.append(("low_volume", "low_volume", (vol != 0) & (vol < getattr(ccfg, "MIN_VOLUME_FILTER", 500)), "low_volume"))
+        specs.append(("spread_pct", "spread_pct", spread_pct > max_spread, "spread_pct"))
+
+        oi = cols.num("oi", 0, none=0.0)
+        specs.append(("low_oi", "low_oi", (oi != 0) & (oi < getattr(ccfg, "MIN_OI", 1000)), "low_oi"))
+        oi_change = cols.num("oi_change", 0, none=0.0)
+        mny = np.abs(cols.num("moneyness", 0, none=0.0))
+        min_oi = np.where(
+            mny <= getattr(ccfg, "ATM_MONEYNESS_THRESHOLD", 0.01),
+            getattr(ccfg, "MIN_OI_CHANGE_ATM", 200),
+            getattr(ccfg, "MIN_OI_CHANGE_OTM", 300),
+        )
+        iv0 = cols.num("iv", 0, none=0.0)
+        atr = market_data.get("atr", 0) or 0
+        mkt_ltp = market_data.get("ltp", 1) or 1
+        with np.errstate(invalid="ignore"):
+            scale = 1 + iv0 * getattr(ccfg, "OI_DYNAMIC_IV_ALPHA", 2.0) + (atr / mkt_ltp) * getattr(ccfg, "OI_DYNAMIC_ATR_ALPHA", 1.0)
+            min_oi = np.trunc(min_oi * scale)
+        specs.append(("oi_change_min", "oi_change_min", (oi_change != 0) & (np.abs(oi_change) < min_oi), "oi_change_min"))
+
+        iv = cols.num("iv")
+        specs.append(("iv_bounds", "iv_bounds", (iv < getattr(ccfg, "MIN_IV", 0.1)) | (iv > getattr(ccfg, "MAX_IV", 0.6)), "iv_bounds"))
+        iv_z = cols.num("iv_z")
+        specs.append(("iv_z_bounds", "iv_z_bounds", (iv_z < getattr(ccfg, "IV_Z_MIN", -1.5)) | (iv_z > getattr(ccfg, "IV_Z_MAX", 1.5)), "iv_z_bounds"))
+        skew = cols.num("iv_skew")
+        skew_max = getattr(ccfg, "IV_SKEW_MAX", 0.05)
+        specs.append(("iv_skew_max", "iv_skew_max", np.abs(skew) > skew_max, "iv_skew_max"))
+        if direction == "BUY_CALL":
+            specs.append(("iv_skew_bull", "iv_skew_bull", skew > getattr(ccfg, "IV_SKEW_BULL_MAX", 0.02), "iv_skew_bull"))
+        if direction == "BUY_PUT":
+            specs.append(("iv_skew_bear", "iv_skew_bear", skew < getattr(ccfg, "IV_SKEW_BEAR_MIN", -0.02), "iv_skew_bear"))
+        if opt_type == "CE":
+            specs.append(("iv_skew_call", "iv_skew_call", skew > getattr(ccfg, "IV_SKEW_CALL_MAX", 0.03), "iv_skew_call"))
+        if opt_type == "PE":
+            specs.append(("iv_skew_put", "iv_skew_put", skew < getattr(ccfg, "IV_SKEW_PUT_MIN", -0.03), "iv_skew_put"))
+        specs.append(("iv_skew_norm", "iv_skew_norm", np.abs(cols.num("iv_skew_norm")) > skew_max, "iv_skew_norm"))
+        curve_max = getattr(ccfg, "IV_SKEW_CURVE_MAX", 0.5)
+        specs.append(("iv_skew_curvature", "iv_skew_curvature", np.abs(cols.num("iv_skew_curvature")) > curve_max, "iv_skew_curvature"))
+        if opt_type == "CE":
+            specs.append(("iv_skew_curve_call", "iv_skew_curve_call", np.abs(cols.num("iv_skew_curvature_call")) > curve_max, "iv_skew_curve_call"))
+        if opt_type == "PE":
+            specs.append(("iv_skew_curve_put", "iv_skew_curve_put", np.abs(cols.num("iv_skew_curvature_put")) > curve_max, "iv_skew_curve_put"))
+        term = cols.num("iv_term")
+        specs.append(("iv_term", "iv_term", (term < getattr(ccfg, "IV_TERM_MIN", -0.05)) | (term > getattr(ccfg, "IV_TERM_MAX", 0.05)), "iv_term"))
+        specs.append(("iv_surface_slope", "iv_surface_slope", np.abs(cols.num("iv_surface_slope")) > getattr(ccfg, "IV_SURFACE_SLOPE_MAX", 0.15), "iv_surface_slope"))
+        allowed_builds = {"BUY_CALL": ("LONG", "SHORT_COVER"), "BUY_PUT": ("SHORT", "LONG_LIQ")}.get(direction)
+        if allowed_builds is not None:
+            oi_build = np.array([bool(v) and v not in allowed_builds for v in cols.values("oi_build")], dtype=bool)
+            specs.append(("oi_build", "oi_build", oi_build, "oi_build"))
+        delta = np.abs(cols.num("delta"))
+        specs.append(("delta", "delta", (delta < getattr(ccfg, "DELTA_MIN", 0.25)) | (delta > getattr(ccfg, "DELTA_MAX", 0.7)), "delta"))
+
+    opt_ltp = cols.num("ltp")
+    min_p, max_p = premium_band
+    specs.append(("premium", "premium", (opt_ltp < min_p) | (opt_ltp > max_p), "premium"))
+    specs.append(("spread_ok", "spread_ok", ~execution.spread_ok_mask(bid, ask, opt_ltp, max_spread_pct=max_spread), "spread_ok"))
+    return _rules(specs, relax)
+
+
+def premium_spread_rules(
+    cols: OptionChainFrame,
+    *,
+    min_premium: float,
+    max_premium: float,
+    execution,
+    require_quote: bool = False,
+) -> List[Rule]:
+    """
+    Filters shared by the scalp and zero-hero builders: optional quote check,
+    premium band, then the default spread guard.
+    """
+    specs = []
+    if require_quote:
+        specs.append(("no_quote", "no_quote", ~cols.truthy("quote_ok", True), None))
+    ltp = cols.num("ltp", 0, none=0.0)
+    specs.append(("premium", "premium", (ltp < min_premium) | (ltp > max_premium), None))
+    spread_ok = execution.spread_ok_mask(
+        cols.num("bid", 0, none=0.0),
+        cols.num("ask", 0, none=0.0),
+        np.where(ltp == 0, 1.0, ltp),
+    )
+    specs.append(("spread_ok", "spread_ok", ~spread_ok, None))
+    return _rules(specs, None)
@@ -3,6 +3,8 @@
 
 from datetime import datetime
 from pathlib import Path
+import contextlib
+import contextvars
 import json
 import os
 import sys
@@ -12,9 +14,12 @@ from core.execution_engine import ExecutionEngine
 from core.alpha_ensemble import AlphaEnsemble
 from core.decision_trace import build_trade_decision_trace
 from core.trade_schema import Trade, build_instrument_id, validate_trade_identity
+from core.trade_log_store import iter_trades
 from typing import Optional
 from strategies.ensemble import ensemble_signal, equity_signal, futures_signal, mean_reversion_signal, event_breakout_signal, micro_pattern_signal
 from core.feature_builder import build_trade_features, validate_trade_features
+from core.option_chain_frame import OptionChainFrame
+from strategies.chain_prefilter import premium_spread_rules, screen as screen_chain, trade_rules
 from core.trade_scoring import compute_trade_score
 from core.strategy_tracker import StrategyTracker
 from core.strategy_lifecycle import StrategyLifecycle
@@ -26,6 +31,43 @@ import time
 
 _AUTO_TUNE_CACHE = {"ts": 0, "data": {}}
 
+# Backtests build a snapshot per bar; their rejects must not land in the
+# live signal-path and blocked-candidate logs.
+_DIAGNOSTICS_SUPPRESSED = contextvars.ContextVar("trade_builder_diagnostics_suppressed", default=False)
+
+
+@contextlib.contextmanager
+def diagnostics_suppressed():
+    token = _DIAGNOSTICS_SUPPRESSED.set(True)
+    try:
+        yield
+    finally:
+        _DIAGNOSTICS_SUPPRESSED.reset(token)
+
+# Debug print text per pre-filter rule; rules without an entry only record the reject.
+_PREFILTER_DEBUG_MESSAGES = {
+    "low_volume": "low volume",
+    "low_oi": "low OI",
+    "oi_change_min": "OI change below min",
+    "iv_bounds": "IV out of bounds",
+    "iv_z_bounds": "IV z out of bounds",
+    "iv_skew_max": "IV skew max",
+    "iv_skew_bull": "skew bull max",
+    "iv_skew_bear": "skew bear min",
+    "iv_skew_call": "skew call max",
+    "iv_skew_put": "skew put min",
+    "iv_skew_norm": "skew norm",
+    "iv_skew_curvature": "skew curvature",
+    "iv_skew_curve_call": "skew curvature call",
+    "iv_skew_curve_put": "skew curvature put",
+    "iv_term": "iv term",
+    "iv_surface_slope": "iv surface slope",
+    "oi_build": "oi build",
+    "delta": "delta",
+    "premium": "premium",
+    "spread_ok": "spread_ok",
+}
+
 def _get_auto_tune():
     try:
         now = _time.time()
@@ -46,7 +88,12 @@ class _NoopPredictor:
     def predict_confidence(self, *_args, **_kwargs):
         return 0.5
 
+    def predict_confidence_shadow(self, *_args, **_kwargs):
+        return None
+
 def _log_signal_event(kind, symbol, payload=None):
+    if _DIAGNOSTICS_SUPPRESSED.get():
+        return
     try:
         path = Path("logs/signal_path.jsonl")
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -59,7 +106,9 @@ def _log_signal_event(kind, symbol, payload=None):
         pass
 
 class TradeBuilder:
-    def __init__(self, predictor=None, execution=None, strategy_tracker=None):
+    def __init__(self, predictor=None, execution=None, strategy_tracker=None, config=None):
+        # Config view: the config module by default, or a ConfigSnapshot (replay).
+        self.cfg = config if config is not None else cfg
         self._ml_disabled = (
             os.getenv("DISABLE_ML", "false").lower() == "true"
             or bool(os.getenv("PYTEST_CURRENT_TEST"))
@@ -76,7 +125,7 @@ class TradeBuilder:
         self.deep_predictor: Optional[object] = None
         self.micro_predictor: Optional[object] = None
         self.execution = execution or ExecutionEngine()
-        self.alpha_ensemble = AlphaEnsemble() if getattr(cfg, "ALPHA_ENSEMBLE_ENABLE", True) else None
+        self.alpha_ensemble = AlphaEnsemble() if getattr(self.cfg, "ALPHA_ENSEMBLE_ENABLE", True) else None
         self.strategy_tracker = strategy_tracker or StrategyTracker()
         self.lifecycle = StrategyLifecycle()
         self.regime_classifier = RegimeClassifier()
@@ -89,10 +138,10 @@ class TradeBuilder:
         self._reject_ctx = {}
 
     def _blocked_candidates_path(self) -> Path:
-        desk_log_dir = getattr(cfg, "DESK_LOG_DIR", None)
+        desk_log_dir = getattr(self.cfg, "DESK_LOG_DIR", None)
         if desk_log_dir:
             return Path(str(desk_log_dir)) / "blocked_candidates.jsonl"
-        desk = getattr(cfg, "DESK_ID", "DEFAULT")
+        desk = getattr(self.cfg, "DESK_ID", "DEFAULT")
         return Path(f"logs/desks/{desk}/blocked_candidates.jsonl")
 
     def _log_blocked_candidate(
@@ -103,6 +152,8 @@ class TradeBuilder:
         market_data: dict | None = None,
         extra: dict | None = None,
     ) -> None:
+        if _DIAGNOSTICS_SUPPRESSED.get():
+            return
         data = market_data or {}
         rec = {
             "ts_ist": now_ist().isoformat(),
@@ -156,7 +207,7 @@ class TradeBuilder:
                 "right": right,
             }
             return None, None, None, "missing_instrument_id"
-        lot_size = int(getattr(cfg, "LOT_SIZE", {}).get(symbol, 1))
+        lot_size = int(getattr(self.cfg, "LOT_SIZE", {}).get(symbol, 1))
         qty_units = int(qty_lots) * (lot_size if instrument_type == "OPT" else 1)
         return instrument_type, instrument_id, qty_units, None
 
@@ -186,7 +237,7 @@ class TradeBuilder:
             s = str(sym or "").upper()
             configured = {
                 str(k).upper()
-                for k in (getattr(cfg, "PREMARKET_INDICES_LTP", {}) or {}).keys()
+                for k in (getattr(self.cfg, "PREMARKET_INDICES_LTP", {}) or {}).keys()
                 if str(k or "").strip()
             }
             if configured:
@@ -280,11 +331,11 @@ class TradeBuilder:
         risk_guard_passed: bool | None = None,
         additional_blockers: list[str] | None = None,
     ) -> dict:
-        segment = market_data.get("segment") or getattr(cfg, "DEFAULT_SEGMENT", "NSE_FNO")
+        segment = market_data.get("segment") or getattr(self.cfg, "DEFAULT_SEGMENT", "NSE_FNO")
         inferred_market_open = bool(market_data.get("market_open")) if ("market_open" in market_data) else bool(is_market_open_ist(segment=segment))
         ctx_payload = dict(market_data.get("market_context") or {}) if isinstance(market_data.get("market_context"), dict) else {}
         if "execution_mode" not in ctx_payload:
-            ctx_payload["execution_mode"] = getattr(cfg, "EXECUTION_MODE", "SIM")
+            ctx_payload["execution_mode"] = getattr(self.cfg, "EXECUTION_MODE", "SIM")
         if "market_open" not in ctx_payload:
             ctx_payload["market_open"] = inferred_market_open
         if "segment" not in ctx_payload:
@@ -293,7 +344,7 @@ class TradeBuilder:
         market_open = bool(market_ctx.is_market_open)
         offhours_mode = bool(market_ctx.mode == "OFFHOURS")
         chain_source = market_data.get("chain_source", "empty")
-        require_live_quotes = bool(market_ctx.require_live_quotes and getattr(cfg, "REQUIRE_LIVE_QUOTES", True))
+        require_live_quotes = bool(market_ctx.require_live_quotes and getattr(self.cfg, "REQUIRE_LIVE_QUOTES", True))
         quote_ok = market_data.get("quote_ok", True)
         quote_age_sec = market_data.get("quote_age_sec")
         index_quote_source = market_data.get("index_quote_source", "real")
@@ -315,7 +366,7 @@ class TradeBuilder:
             reasons.append("quote_not_ok")
         max_quote_age = float(
             getattr(
-                cfg,
+                self.cfg,
                 "OFFHOURS_MAX_OPTION_QUOTE_AGE_SEC" if offhours_mode else "MAX_OPTION_QUOTE_AGE_SEC",
                 60 if offhours_mode else 8,
             )
@@ -372,7 +423,7 @@ class TradeBuilder:
             pass
         return None
 
-    def _validate_ml_features(self, feats: pd.DataFrame):
+    def _validate_ml_features(self, feats):
         contract = self._feature_contract()
         if contract is None:
             return True, "ok"
@@ -388,7 +439,7 @@ class TradeBuilder:
             return False, base_score, size_mult, "strategy_quarantined"
         if self.strategy_tracker.is_decaying(strategy_name):
             prob = self.strategy_tracker.decay_prob(strategy_name)
-            penalty = float(getattr(cfg, "DECAY_DOWNSIZE_MULT", 0.6))
+            penalty = float(getattr(self.cfg, "DECAY_DOWNSIZE_MULT", 0.6))
             new_score = base_score * penalty if base_score is not None else None
             new_mult = min(size_mult, penalty)
             self._reject_ctx = {"strategy": strategy_name, "reason": "strategy_decaying", "decay_prob": prob}
@@ -418,7 +469,7 @@ class TradeBuilder:
         market_data: dict,
         quick_mode: bool = False,
     ):
-        if not self.alpha_ensemble or not getattr(cfg, "ALPHA_ENSEMBLE_ENABLE", True):
+        if not self.alpha_ensemble or not getattr(self.cfg, "ALPHA_ENSEMBLE_ENABLE", True):
             return base_conf, None, None, 1.0
         if xgb_conf is None and deep_conf is None and micro_conf is None and getattr(self.alpha_ensemble, "meta_model", None) is None:
             return base_conf, None, None, 1.0
@@ -433,7 +484,7 @@ class TradeBuilder:
         alpha_conf = alpha.get("final_prob")
         alpha_unc = alpha.get("uncertainty")
         size_mult = alpha.get("size_mult", 1.0)
-        veto_th = getattr(cfg, "ALPHA_UNCERTAINTY_VETO", 0.78)
+        veto_th = getattr(self.cfg, "ALPHA_UNCERTAINTY_VETO", 0.78)
         if alpha_unc is not None and alpha_unc >= veto_th and not quick_mode:
             return None, alpha_conf, alpha_unc, size_mult
         return float(alpha_conf), alpha_conf, alpha_unc, size_mult
@@ -447,17 +498,7 @@ class TradeBuilder:
             if not path.exists():
                 self._ml_history_cache = {"ts": now, "count": 0}
                 return 0
-            count = 0
-            with path.open() as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        obj = json.loads(line)
-                    except Exception:
-                        continue
-                    if obj.get("actual") is not None:
-                        count += 1
+            count = sum(1 for obj in iter_trades(path) if obj.get("actual") is not None)
             self._ml_history_cache = {"ts": now, "count": count}
             return count
         except Exception:
@@ -479,18 +520,112 @@ class TradeBuilder:
             self.micro_predictor = MicrostructurePredictor()
         return self.micro_predictor
 
+    def _screen_premium_spread(self, market_data, opt_type, min_p, max_p, require_quote=False):
+        chain = OptionChainFrame.of(market_data.get("option_chain", []))
+        rules = premium_spread_rules(
+            chain,
+            min_premium=min_p,
+            max_premium=max_p,
+            execution=self.execution,
+            require_quote=require_quote,
+        )
+        return chain, screen_chain(chain.equals("type", opt_type), rules)
+
+    @staticmethod
+    def _micro_features(market_data, opt):
+        return [
+            float(opt.get("spread_pct", (opt["ask"] - opt["bid"]) / opt["ltp"] if opt["ltp"] else 0)),
+            float(opt.get("volume", 0)),
+            float(opt.get("oi_change", 0)),
+            float(market_data.get("fx_ret_5m", 0.0) or market_data.get("x_usdinr_ret5") or 0.0),
+            float(market_data.get("vix_z", 0.0) or market_data.get("x_india_vix_z") or 0.0),
+            float(market_data.get("crude_ret_15m", 0.0) or market_data.get("x_crude_ret15") or 0.0),
+            float(market_data.get("corr_fx_nifty", 0.0) or market_data.get("x_usdinr_corr_nifty") or 0.0),
+        ]
+
+    @staticmethod
+    def _predict_rows(predictor, name, feats, rows):
+        # Batched `<name>_batch` when the predictor has one, else one call per row.
+        batch = getattr(predictor, f"{name}_batch", None)
+        if callable(batch):
+            return list(batch(feats))
+        single = getattr(predictor, name)
+        return [single(pd.DataFrame([row])) for row in rows]
+
+    def _score_ml_candidates(self, market_data, opts, seq_buffer=None):
+        """
+        ML scores for every option that survived the chain filters.
+
+        Builds one feature matrix and makes one batched call per model
+        (champion, shadow, micro); the deep model only sees seq_buffer, so it
+        runs once. Returns one dict per option, in order, holding the values
+        the per-option path computed.
+        """
+        rows = [build_trade_features(market_data, opt) for opt in opts]
+        scores = []
+        valid = []
+        for i, row in enumerate(rows):
+            ok, reason = self._validate_ml_features(row)
+            scores.append(
+                {
+                    "features_ok": ok,
+                    "feature_reason": reason,
+                    "xgb_conf": None,
+                    "shadow_confidence": None,
+                    "deep_conf": None,
+                    "micro_conf": None,
+                    "model_type": None,
+                    "model_version": None,
+                }
+            )
+            if ok:
+                valid.append(i)
+        if not valid:
+            return scores
+        valid_rows = [rows[i] for i in valid]
+        feats = pd.DataFrame(valid_rows)
+        xgb_confs = self._predict_rows(self.predictor, "predict_confidence", feats, valid_rows)
+        shadow_confs = [None] * len(valid)
+        if getattr(self.cfg, "ML_AB_ENABLE", False):
+            shadow_confs = self._predict_rows(self.predictor, "predict_confidence_shadow", feats, valid_rows)
+        deep_conf = None
+        deep_version = None
+        run_deep = bool(self.cfg.USE_DEEP_MODEL and seq_buffer is not None)
+        if run_deep:
+            deep_pred = self._get_deep_predictor()
+            deep_conf = deep_pred.predict_confidence(seq_buffer)
+            deep_version = getattr(deep_pred, "model_version", getattr(self.predictor, "model_version", None))
+        micro_confs = [None] * len(valid)
+        if self.cfg.USE_MICRO_MODEL:
+            micro_rows = [self._micro_features(market_data, opts[i]) for i in valid]
+            micro = self._get_micro_predictor()
+            batch = getattr(micro, "predict_confidence_batch", None)
+            if callable(batch):
+                micro_confs = list(batch(micro_rows))
+            else:
+                micro_confs = [micro.predict_confidence(r) for r in micro_rows]
+        for j, i in enumerate(valid):
+            scores[i].update(
+                xgb_conf=xgb_confs[j],
+                shadow_confidence=shadow_confs[j],
+                micro_conf=micro_confs[j],
+            )
+            if run_deep:
+                scores[i].update(deep_conf=deep_conf, model_type="deep", model_version=deep_version)
+        return scores
+
     def _apply_entry_trigger(self, entry_price, side, quick_mode=False):
         """
         Adjust entry to a breakout trigger (buy above / sell below) if enabled.
         """
         try:
-            mode = getattr(cfg, "ENTRY_TRIGGER_MODE", "ASK").upper()
-            if getattr(cfg, "ENTRY_TRIGGER_MAIN_ONLY", True) and quick_mode:
+            mode = getattr(self.cfg, "ENTRY_TRIGGER_MODE", "ASK").upper()
+            if getattr(self.cfg, "ENTRY_TRIGGER_MAIN_ONLY", True) and quick_mode:
                 return entry_price, None, entry_price
             if mode not in ("BREAKOUT", "TRIGGER"):
                 return entry_price, None, entry_price
-            buffer_abs = float(getattr(cfg, "ENTRY_PREMIUM_BUFFER", 2.0))
-            buffer_pct = float(getattr(cfg, "ENTRY_PREMIUM_BUFFER_PCT", 0.01))
+            buffer_abs = float(getattr(self.cfg, "ENTRY_PREMIUM_BUFFER", 2.0))
+            buffer_pct = float(getattr(self.cfg, "ENTRY_PREMIUM_BUFFER_PCT", 0.01))
             buffer = max(buffer_abs, entry_price * buffer_pct)
             if side.upper() == "BUY":
                 trigger = round(entry_price + buffer, 2)
@@ -508,7 +643,7 @@ class TradeBuilder:
         if regime_norm == "RANGE":
             return ["MEAN_REVERT"]
         if regime_norm == "EVENT":
-            if getattr(cfg, "REGIME_EVENT_ROUTE_ALLOW", True) and getattr(cfg, "EVENT_ALLOW_DEFINED_RISK", True):
+            if getattr(self.cfg, "REGIME_EVENT_ROUTE_ALLOW", True) and getattr(self.cfg, "EVENT_ALLOW_DEFINED_RISK", True):
                 return ["DEFINED_RISK"]
             return []
         return []
@@ -522,7 +657,7 @@ class TradeBuilder:
         normalized = normalize_regime(raw)
         if normalized != "NEUTRAL":
             return normalized
-        if not getattr(cfg, "REGIME_CLASSIFIER_ENABLE", True):
+        if not getattr(self.cfg, "REGIME_CLASSIFIER_ENABLE", True):
             return normalized
         return self.regime_classifier.classify(market_data or {})
 
@@ -533,10 +668,10 @@ class TradeBuilder:
         return families[0]
 
     def _trend_vwap_fallback_signal(self, market_data: dict, regime_day: str):
-        if not bool(getattr(cfg, "TREND_VWAP_FALLBACK_ENABLE", True)):
+        if not bool(getattr(self.cfg, "TREND_VWAP_FALLBACK_ENABLE", True)):
             return None
-        exec_mode = str(getattr(cfg, "EXECUTION_MODE", "SIM")).upper()
-        if exec_mode == "LIVE" and not bool(getattr(cfg, "TREND_VWAP_FALLBACK_LIVE_ENABLE", False)):
+        exec_mode = str(getattr(self.cfg, "EXECUTION_MODE", "SIM")).upper()
+        if exec_mode == "LIVE" and not bool(getattr(self.cfg, "TREND_VWAP_FALLBACK_LIVE_ENABLE", False)):
             return None
         if not bool(market_data.get("indicators_ok", False)):
             return None
@@ -546,9 +681,9 @@ class TradeBuilder:
         if primary_regime not in ("TREND", "EVENT"):
             return None
         vwap_slope = float(market_data.get("vwap_slope", 0.0) or 0.0)
-        slope_abs_min = float(getattr(cfg, "TREND_VWAP_FALLBACK_SLOPE_ABS_MIN", 0.0008))
+        slope_abs_min = float(getattr(self.cfg, "TREND_VWAP_FALLBACK_SLOPE_ABS_MIN", 0.0008))
         orb_bias = str(market_data.get("orb_bias") or "").upper()
-        orb_lock_min = int(market_data.get("orb_lock_min") or getattr(cfg, "ORB_LOCK_MIN", 15))
+        orb_lock_min = int(market_data.get("orb_lock_min") or getattr(self.cfg, "ORB_LOCK_MIN", 15))
         minutes_since_open = float(market_data.get("minutes_since_open", 0) or 0)
         orb_locked = (
             orb_bias not in ("", "PENDING")
@@ -565,7 +700,7 @@ class TradeBuilder:
             direction = "BUY_PUT"
         if direction is None:
             return None
-        score = float(getattr(cfg, "TREND_VWAP_FALLBACK_SCORE", 0.60))
+        score = float(getattr(self.cfg, "TREND_VWAP_FALLBACK_SCORE", 0.60))
         reason = "trend_vwap_fallback"
         symbol = str(market_data.get("symbol") or "UNKNOWN")
         payload = {
@@ -605,8 +740,8 @@ class TradeBuilder:
         time_bucket = "MID"
         try:
             now = datetime.now().time()
-            open_end = getattr(cfg, "DAYTYPE_BUCKET_OPEN_END", 11)
-            mid_end = getattr(cfg, "DAYTYPE_BUCKET_MID_END", 14)
+            open_end = getattr(self.cfg, "DAYTYPE_BUCKET_OPEN_END", 11)
+            mid_end = getattr(self.cfg, "DAYTYPE_BUCKET_MID_END", 14)
             if now.hour < open_end:
                 time_bucket = "OPEN"
             elif now.hour >= mid_end:
@@ -622,7 +757,7 @@ class TradeBuilder:
             noon_fade = (now.hour == 12) or (now.hour == 13 and now.minute <= 30)
         except Exception:
             noon_fade = False
-        if force_family is None and getattr(cfg, "REGIME_ROUTER_ENABLE", True):
+        if force_family is None and getattr(self.cfg, "REGIME_ROUTER_ENABLE", True):
             route_family = self._regime_route_family(regime_day)
             if route_family is None:
                 self._reject_ctx = {
@@ -637,49 +772,49 @@ class TradeBuilder:
         else:
             # Probabilistic regime gating
             if regime_probs and force_family is None:
-                if unstable_regime or regime_entropy > getattr(cfg, "REGIME_ENTROPY_MAX", 1.3):
+                if unstable_regime or regime_entropy > getattr(self.cfg, "REGIME_ENTROPY_MAX", 1.3):
                     return None
                 trend_p = float(regime_probs.get("TREND", 0.0))
                 range_p = max(float(regime_probs.get("RANGE", 0.0)), float(regime_probs.get("RANGE_VOLATILE", 0.0)))
                 event_p = float(regime_probs.get("EVENT", 0.0))
                 panic_p = float(regime_probs.get("PANIC", 0.0))
-                if event_p >= getattr(cfg, "REGIME_PROB_EVENT", 0.4):
+                if event_p >= getattr(self.cfg, "REGIME_PROB_EVENT", 0.4):
                     sig = event_breakout_signal(
                         market_data.get("ltp", 0),
                         market_data.get("atr", 0),
                         market_data.get("ltp_change_window", 0),
                     )
                     if sig:
-                        sig.score = float(sig.score) * max(event_p, getattr(cfg, "REGIME_PROB_MIN", 0.45))
+                        sig.score = float(sig.score) * max(event_p, getattr(self.cfg, "REGIME_PROB_MIN", 0.45))
                         return {"direction": sig.direction, "reason": sig.reason, "score": sig.score, "regime_day": "EVENT"}
-                if panic_p >= getattr(cfg, "REGIME_PROB_PANIC", 0.4):
+                if panic_p >= getattr(self.cfg, "REGIME_PROB_PANIC", 0.4):
                     sig = ensemble_signal(market_data)
                     if sig:
-                        sig.score = float(sig.score) * max(panic_p, getattr(cfg, "REGIME_PROB_MIN", 0.45))
+                        sig.score = float(sig.score) * max(panic_p, getattr(self.cfg, "REGIME_PROB_MIN", 0.45))
                         return {"direction": sig.direction, "reason": sig.reason, "score": sig.score, "regime_day": "PANIC"}
-                if trend_p >= getattr(cfg, "REGIME_PROB_TREND", 0.45):
+                if trend_p >= getattr(self.cfg, "REGIME_PROB_TREND", 0.45):
                     sig = ensemble_signal(market_data)
                     if sig:
-                        sig.score = float(sig.score) * max(trend_p, getattr(cfg, "REGIME_PROB_MIN", 0.45))
+                        sig.score = float(sig.score) * max(trend_p, getattr(self.cfg, "REGIME_PROB_MIN", 0.45))
                         return {"direction": sig.direction, "reason": sig.reason, "score": sig.score, "regime_day": "TREND"}
-                if range_p >= getattr(cfg, "REGIME_PROB_RANGE", 0.45):
+                if range_p >= getattr(self.cfg, "REGIME_PROB_RANGE", 0.45):
                     sig = mean_reversion_signal(
                         market_data.get("ltp", 0),
                         market_data.get("vwap", 0),
                         market_data.get("rsi_mom", 0),
                     )
                     if sig:
-                        sig.score = float(sig.score) * max(range_p, getattr(cfg, "REGIME_PROB_MIN", 0.45))
+                        sig.score = float(sig.score) * max(range_p, getattr(self.cfg, "REGIME_PROB_MIN", 0.45))
                         return {"direction": sig.direction, "reason": sig.reason, "score": sig.score, "regime_day": "RANGE"}
             # Day-type gating: choose allowed strategies
             # Confidence threshold to allow switching strategies
             day_conf = market_data.get("day_confidence", 0) or 0
-            conf_min = getattr(cfg, "DAYTYPE_CONF_SWITCH_MIN", 0.6)
+            conf_min = getattr(self.cfg, "DAYTYPE_CONF_SWITCH_MIN", 0.6)
             if day_conf < conf_min:
                 day_type = "UNKNOWN"
 
             if force_family == "DEFINED_RISK":
-                if not (getattr(cfg, "REGIME_EVENT_ROUTE_ALLOW", True) and getattr(cfg, "EVENT_ALLOW_DEFINED_RISK", True)):
+                if not (getattr(self.cfg, "REGIME_EVENT_ROUTE_ALLOW", True) and getattr(self.cfg, "EVENT_ALLOW_DEFINED_RISK", True)):
                     return None
                 sig = event_breakout_signal(
                     market_data.get("ltp", 0),
@@ -781,8 +916,8 @@ class TradeBuilder:
         Option-specific risk levels using option premium + spread proxy.
         """
         try:
-            opt_atr_pct = getattr(cfg, "OPT_ATR_PCT", 0.2)
-            spread_mult = getattr(cfg, "OPT_SPREAD_ATR_MULT", 3.0)
+            opt_atr_pct = getattr(self.cfg, "OPT_ATR_PCT", 0.2)
+            spread_mult = getattr(self.cfg, "OPT_SPREAD_ATR_MULT", 3.0)
             spread = max((ask - bid), 0)
             opt_atr = max(entry_price * opt_atr_pct, spread * spread_mult)
             opt_atr = max(opt_atr, 1.0)
@@ -801,11 +936,11 @@ class TradeBuilder:
         """
         self._reject_ctx = {}
         market_data = dict(market_data or {})
-        debug_mode = getattr(cfg, "DEBUG_TRADE_MODE", False)
+        debug_mode = getattr(self.cfg, "DEBUG_TRADE_MODE", False)
         if debug_mode:
             debug_reasons = True
-        exec_mode = getattr(cfg, "EXECUTION_MODE", "SIM").upper()
-        segment = market_data.get("segment") or getattr(cfg, "DEFAULT_SEGMENT", "NSE_FNO")
+        exec_mode = getattr(self.cfg, "EXECUTION_MODE", "SIM").upper()
+        segment = market_data.get("segment") or getattr(self.cfg, "DEFAULT_SEGMENT", "NSE_FNO")
         ctx_payload = dict(market_data.get("market_context") or {}) if isinstance(market_data.get("market_context"), dict) else {}
         if "execution_mode" not in ctx_payload:
             ctx_payload["execution_mode"] = exec_mode
@@ -834,7 +969,7 @@ class TradeBuilder:
             allow_fallbacks = False
             allow_baseline = False
         # Paper strict mode: disable baseline and relax reasons
-        if exec_mode == "PAPER" and getattr(cfg, "PAPER_STRICT_MODE", False):
+        if exec_mode == "PAPER" and getattr(self.cfg, "PAPER_STRICT_MODE", False):
             allow_baseline = False
             allow_fallbacks = False
         symbol = market_data["symbol"]
@@ -915,8 +1050,8 @@ class TradeBuilder:
                 return None
 
         signal = self._signal_for_symbol(market_data, force_family=force_family)
-        relax_reason = "" if exec_mode == "LIVE" else (getattr(cfg, "RELAX_BLOCK_REASON", "") or "")
-        if exec_mode == "PAPER" and getattr(cfg, "PAPER_STRICT_MODE", False):
+        relax_reason = "" if exec_mode == "LIVE" else (getattr(self.cfg, "RELAX_BLOCK_REASON", "") or "")
+        if exec_mode == "PAPER" and getattr(self.cfg, "PAPER_STRICT_MODE", False):
             relax_reason = ""
         def _relax(reason: str) -> bool:
             return bool(relax_reason) and reason == relax_reason
@@ -937,26 +1072,26 @@ class TradeBuilder:
                         signal = {"direction": "BUY_PUT", "reason": "Quick neutral fallback", "score": 0.52}
                 except Exception:
                     pass
-        if not signal and allow_baseline and getattr(cfg, "ALLOW_BASELINE_SIGNAL", True):
+        if not signal and allow_baseline and getattr(self.cfg, "ALLOW_BASELINE_SIGNAL", True):
             try:
                 atr = market_data.get("atr", max(1.0, ltp * 0.002))
                 ltp_change = market_data.get("ltp_change", 0) or 0
                 ltp_change_window = market_data.get("ltp_change_window", 0) or 0
-                thresh = atr * getattr(cfg, "BASELINE_LTP_ATR_MULT", 0.05)
-                thresh_w = atr * getattr(cfg, "BASELINE_LTP_ATR_MULT_WINDOW", 0.02)
+                thresh = atr * getattr(self.cfg, "BASELINE_LTP_ATR_MULT", 0.05)
+                thresh_w = atr * getattr(self.cfg, "BASELINE_LTP_ATR_MULT_WINDOW", 0.02)
                 if abs(ltp_change) >= thresh and atr > 0:
                     direction = "BUY_CALL" if ltp_change > 0 else "BUY_PUT"
                     signal = {
                         "direction": direction,
                         "reason": "Baseline LTP momentum",
-                        "score": getattr(cfg, "BASELINE_SIGNAL_SCORE", 0.62),
+                        "score": getattr(self.cfg, "BASELINE_SIGNAL_SCORE", 0.62),
                     }
                 elif abs(ltp_change_window) >= thresh_w and atr > 0:
                     direction = "BUY_CALL" if ltp_change_window > 0 else "BUY_PUT"
                     signal = {
                         "direction": direction,
                         "reason": "Baseline LTP window momentum",
-                        "score": getattr(cfg, "BASELINE_SIGNAL_SCORE", 0.62),
+                        "score": getattr(self.cfg, "BASELINE_SIGNAL_SCORE", 0.62),
                     }
             except Exception:
                 pass
@@ -1001,9 +1136,9 @@ class TradeBuilder:
             return None
         if adj_score is not None:
             signal["score"] = adj_score
-        min_score = getattr(cfg, "STRICT_STRATEGY_SCORE", 0.7)
+        min_score = getattr(self.cfg, "STRICT_STRATEGY_SCORE", 0.7)
         regime_day = signal.get("regime_day") or market_data.get("regime_day") or market_data.get("regime") or "NEUTRAL"
-        score_mult = getattr(cfg, "REGIME_SCORE_MULT", {}).get(regime_day, 1.0)
+        score_mult = getattr(self.cfg, "REGIME_SCORE_MULT", {}).get(regime_day, 1.0)
         min_score = min_score * score_mult
         if quick_mode:
             min_score = min(min_score, 0.5)
@@ -1090,7 +1225,7 @@ class TradeBuilder:
                 pass
         # ORB bias lock
         try:
-            if getattr(cfg, "ORB_BIAS_LOCK", True):
+            if getattr(self.cfg, "ORB_BIAS_LOCK", True):
                 orb_bias = market_data.get("orb_bias", "NEUTRAL")
                 if orb_bias == "PENDING":
                     self._log_blocked_candidate(
@@ -1119,7 +1254,7 @@ class TradeBuilder:
                         extra={"orb_bias": orb_bias, "direction": direction},
                     )
                     return None
-                if orb_bias == "NEUTRAL" and not getattr(cfg, "ORB_NEUTRAL_ALLOW", True):
+                if orb_bias == "NEUTRAL" and not getattr(self.cfg, "ORB_NEUTRAL_ALLOW", True):
                     self._log_blocked_candidate(
                         symbol,
                         "orb_neutral_blocked",
@@ -1131,7 +1266,7 @@ class TradeBuilder:
         except Exception:
             pass
         # Higher timeframe alignment
-        if getattr(cfg, "HTF_ALIGN_REQUIRED", True) and not quick_mode:
+        if getattr(self.cfg, "HTF_ALIGN_REQUIRED", True) and not quick_mode:
             htf_dir = market_data.get("htf_dir", "FLAT")
             if direction == "BUY_CALL" and htf_dir == "DOWN":
                 self._log_blocked_candidate(
@@ -1159,191 +1294,30 @@ class TradeBuilder:
 
         seq_buffer = market_data.get("seq_buffer")
         atr = market_data.get("atr", max(1.0, ltp * 0.002))
-        for opt in market_data.get("option_chain", []):
-            if opt["type"] != opt_type:
-                continue
-            # Hard reject stale quotes before any scoring
-            quote_age = opt.get("quote_age_sec")
-            quote_ts_epoch = opt.get("quote_ts_epoch")
-            strict_quotes = getattr(cfg, "STRICT_LIVE_QUOTES", True)
-            if exec_mode == "PAPER" and not getattr(cfg, "PAPER_STRICT_QUOTES", True):
-                strict_quotes = False
-            if strict_quotes:
-                if quote_ts_epoch is None:
-                    if debug_reasons:
-                        rejected.append(self._reject_record(symbol, opt, opt_type, "stale_option_quote", atr=atr))
-                    continue
-                if quote_age is None or quote_age > getattr(cfg, "MAX_OPTION_QUOTE_AGE_SEC", 8):
-                    if debug_reasons:
-                        rejected.append(self._reject_record(symbol, opt, opt_type, "stale_option_quote", atr=atr))
-                    continue
-            # Hard reject missing bid/ask
-            if opt.get("quote_ok") is False:
-                if debug_reasons:
-                    rejected.append(self._reject_record(symbol, opt, opt_type, "no_quote", atr=atr))
-                continue
-            # Skip synthetic quotes (no live price)
-            if not opt.get("quote_ok", True) or (getattr(cfg, "REQUIRE_LIVE_OPTION_QUOTES", False) and not opt.get("quote_live", True)):
-                if debug_reasons:
-                    rejected.append(self._reject_record(symbol, opt, opt_type, "no_quote", atr=atr))
-                continue
-            if getattr(cfg, "REQUIRE_DEPTH_QUOTES_FOR_TRADE", False) and not opt.get("depth_ok", False):
-                if debug_reasons:
-                    rejected.append(self._reject_record(symbol, opt, opt_type, "no_depth", atr=atr))
-                continue
-            if opt.get("bid") is None or opt.get("ask") is None:
-                if debug_reasons:
-                    rejected.append(self._reject_record(symbol, opt, opt_type, "no_bid_ask", atr=atr))
-                continue
-            if getattr(cfg, "REQUIRE_VOLUME_FOR_TRADE", False) and not opt.get("volume", 0):
-                if debug_reasons:
-                    rejected.append(self._reject_record(symbol, opt, opt_type, "no_volume", atr=atr))
-                continue
-            # Liquidity guard
-            spread_pct = (opt["ask"] - opt["bid"]) / opt["ltp"] if opt["ltp"] else 1
-            max_spread = getattr(cfg, "MAX_SPREAD_PCT_QUICK", getattr(cfg, "MAX_SPREAD_PCT", 0.015)) if quick_mode else getattr(cfg, "MAX_SPREAD_PCT", 0.015)
-            if exec_mode == "PAPER" and getattr(cfg, "PAPER_STRICT_MODE", False):
-                if not opt.get("quote_ok", False):
-                    if debug_reasons:
-                        rejected.append(self._reject_record(symbol, opt, opt_type, "no_quote", atr=atr))
-                    continue
-                if spread_pct > max_spread:
-                    if debug_reasons:
-                        rejected.append(self._reject_record(symbol, opt, opt_type, "spread_pct", atr=atr))
-                    continue
-            if not quick_mode:
-                vol = opt.get("volume", 0)
-                if vol and vol < getattr(cfg, "MIN_VOLUME_FILTER", 500) and not _relax("low_volume"):
-                    if debug_reasons:
-                        print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: low volume")
-                        rejected.append(self._reject_record(symbol, opt, opt_type, "low_volume", atr=atr))
-                    continue
-                if spread_pct > max_spread and not _relax("spread_pct"):
-                    if debug_reasons:
-                        print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: spread {spread_pct:.4f}")
-                        rejected.append(self._reject_record(symbol, opt, opt_type, "spread_pct", atr=atr))
-                    continue
-
-            # OI / Greeks filters
-            if not quick_mode:
-                if opt.get("oi", 0) and opt.get("oi", 0) < getattr(cfg, "MIN_OI", 1000) and not _relax("low_oi"):
-                    if debug_reasons:
-                        print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: low OI")
-                        rejected.append(self._reject_record(symbol, opt, opt_type, "low_oi", atr=atr))
-                    continue
-                if opt.get("oi_change", 0):
-                    atm_thresh = getattr(cfg, "ATM_MONEYNESS_THRESHOLD", 0.01)
-                    min_oi_atm = getattr(cfg, "MIN_OI_CHANGE_ATM", 200)
-                    min_oi_otm = getattr(cfg, "MIN_OI_CHANGE_OTM", 300)
-                    mny = abs(opt.get("moneyness", 0))
-                    min_oi = min_oi_atm if mny <= atm_thresh else min_oi_otm
-                    iv = opt.get("iv", 0) or 0
-                    atr = market_data.get("atr", 0) or 0
-                    ltp = market_data.get("ltp", 1) or 1
-                    scale = 1 + iv * getattr(cfg, "OI_DYNAMIC_IV_ALPHA", 2.0) + (atr / ltp) * getattr(cfg, "OI_DYNAMIC_ATR_ALPHA", 1.0)
-                    min_oi = int(min_oi * scale)
-                    if abs(opt.get("oi_change", 0)) < min_oi and not _relax("oi_change_min"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: OI change below min")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "oi_change_min", atr=atr))
-                        continue
-                if opt.get("iv") is not None:
-                    if (opt["iv"] < getattr(cfg, "MIN_IV", 0.1) or opt["iv"] > getattr(cfg, "MAX_IV", 0.6)) and not _relax("iv_bounds"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: IV out of bounds")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_bounds", atr=atr))
-                        continue
-                if opt.get("iv_z") is not None:
-                    if (opt["iv_z"] < getattr(cfg, "IV_Z_MIN", -1.5) or opt["iv_z"] > getattr(cfg, "IV_Z_MAX", 1.5)) and not _relax("iv_z_bounds"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: IV z out of bounds")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_z_bounds", atr=atr))
-                        continue
-                if opt.get("iv_skew") is not None:
-                    if abs(opt["iv_skew"]) > getattr(cfg, "IV_SKEW_MAX", 0.05) and not _relax("iv_skew_max"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: IV skew max")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_max", atr=atr))
-                        continue
-                    if direction == "BUY_CALL" and opt["iv_skew"] > getattr(cfg, "IV_SKEW_BULL_MAX", 0.02) and not _relax("iv_skew_bull"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew bull max")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_bull", atr=atr))
-                        continue
-                    if direction == "BUY_PUT" and opt["iv_skew"] < getattr(cfg, "IV_SKEW_BEAR_MIN", -0.02) and not _relax("iv_skew_bear"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew bear min")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_bear", atr=atr))
-                        continue
-                    if opt_type == "CE" and opt["iv_skew"] > getattr(cfg, "IV_SKEW_CALL_MAX", 0.03) and not _relax("iv_skew_call"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew call max")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_call", atr=atr))
-                        continue
-                    if opt_type == "PE" and opt["iv_skew"] < getattr(cfg, "IV_SKEW_PUT_MIN", -0.03) and not _relax("iv_skew_put"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew put min")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_put", atr=atr))
-                        continue
-                if opt.get("iv_skew_norm") is not None:
-                    if abs(opt["iv_skew_norm"]) > getattr(cfg, "IV_SKEW_MAX", 0.05) and not _relax("iv_skew_norm"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew norm")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_norm", atr=atr))
-                        continue
-                if opt.get("iv_skew_curvature") is not None:
-                    if abs(opt["iv_skew_curvature"]) > getattr(cfg, "IV_SKEW_CURVE_MAX", 0.5) and not _relax("iv_skew_curvature"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew curvature")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_curvature", atr=atr))
-                        continue
-                if opt_type == "CE" and opt.get("iv_skew_curvature_call") is not None:
-                    if abs(opt["iv_skew_curvature_call"]) > getattr(cfg, "IV_SKEW_CURVE_MAX", 0.5) and not _relax("iv_skew_curve_call"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew curvature call")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_curve_call", atr=atr))
-                        continue
-                if opt_type == "PE" and opt.get("iv_skew_curvature_put") is not None:
-                    if abs(opt["iv_skew_curvature_put"]) > getattr(cfg, "IV_SKEW_CURVE_MAX", 0.5) and not _relax("iv_skew_curve_put"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: skew curvature put")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_skew_curve_put", atr=atr))
-                        continue
-                if opt.get("iv_term") is not None:
-                    if (opt["iv_term"] < getattr(cfg, "IV_TERM_MIN", -0.05) or opt["iv_term"] > getattr(cfg, "IV_TERM_MAX", 0.05)) and not _relax("iv_term"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: iv term")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_term", atr=atr))
-                        continue
-                if opt.get("iv_surface_slope") is not None:
-                    if abs(opt["iv_surface_slope"]) > getattr(cfg, "IV_SURFACE_SLOPE_MAX", 0.15) and not _relax("iv_surface_slope"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: iv surface slope")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "iv_surface_slope", atr=atr))
-                        continue
-                if opt.get("oi_build"):
-                    if direction == "BUY_CALL" and opt["oi_build"] not in ("LONG", "SHORT_COVER") and not _relax("oi_build"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: oi build")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "oi_build", atr=atr))
-                        continue
-                    if direction == "BUY_PUT" and opt["oi_build"] not in ("SHORT", "LONG_LIQ") and not _relax("oi_build"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: oi build")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "oi_build", atr=atr))
-                        continue
-                if opt.get("delta") is not None:
-                    if (abs(opt["delta"]) < getattr(cfg, "DELTA_MIN", 0.25) or abs(opt["delta"]) > getattr(cfg, "DELTA_MAX", 0.7)) and not _relax("delta"):
-                        if debug_reasons:
-                            print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: delta")
-                            rejected.append(self._reject_record(symbol, opt, opt_type, "delta", atr=atr))
-                        continue
-
-            # Premium filter (allow per-symbol bands)
-            band_map = getattr(cfg, "PREMIUM_BANDS", {})
-            band = band_map.get(symbol, (getattr(cfg, "MIN_PREMIUM", 40), getattr(cfg, "MAX_PREMIUM", 150)))
-            min_p, max_p = band
-            if (opt["ltp"] < min_p or opt["ltp"] > max_p) and not _relax("premium"):
+        # Cheap per-option filters, evaluated column-wise over the whole chain
+        chain = OptionChainFrame.of(market_data.get("option_chain", []))
+        max_spread = getattr(self.cfg, "MAX_SPREAD_PCT_QUICK", getattr(self.cfg, "MAX_SPREAD_PCT", 0.015)) if quick_mode else getattr(self.cfg, "MAX_SPREAD_PCT", 0.015)
+        band_map = getattr(self.cfg, "PREMIUM_BANDS", {})
+        min_p, max_p = band_map.get(symbol, (getattr(self.cfg, "MIN_PREMIUM", 40), getattr(self.cfg, "MAX_PREMIUM", 150)))
+        prefilter = screen_chain(
+            chain.equals("type", opt_type),
+            trade_rules(
+                chain,
+                opt_type=opt_type,
+                direction=direction,
+                exec_mode=exec_mode,
+                quick_mode=quick_mode,
+                max_spread=max_spread,
+                premium_band=(min_p, max_p),
+                market_data=market_data,
+                execution=self.execution,
+                relax=_relax,
+                config=self.cfg,
+            ),
+        )
+        for row, rule in prefilter.rejects:
+            opt = chain[row]
+            if rule.rule_id == "premium":
                 self._log_blocked_candidate(
                     symbol,
                     "premium_band_fail",
@@ -1357,27 +1331,26 @@ class TradeBuilder:
                         "premium_max": max_p,
                     },
                 )
-                if debug_reasons:
-                    print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: premium")
-                    rec = self._reject_record(symbol, opt, opt_type, "premium", atr=atr)
-                    debug_candidates.append(rec)
-                    rejected.append(rec)
-                continue
-
-            # Spread check
-            if not self.execution.spread_ok(opt["bid"], opt["ask"], opt["ltp"], max_spread_pct=max_spread) and not _relax("spread_ok"):
-                if debug_reasons:
-                    print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: spread_ok")
-                    rec = self._reject_record(symbol, opt, opt_type, "spread_ok", atr=atr)
-                    debug_candidates.append(rec)
-                    rejected.append(rec)
+            if not debug_reasons:
                 continue
-
-            # ML confidence (only if enough history)
-            feats = pd.DataFrame([build_trade_features(market_data, opt)])
-            use_ml = True
-            if getattr(cfg, "ML_USE_ONLY_WITH_HISTORY", True):
-                use_ml = self._ml_history_count() >= getattr(cfg, "ML_MIN_TRAIN_TRADES", 200)
+            message = _PREFILTER_DEBUG_MESSAGES.get(rule.rule_id)
+            if rule.rule_id == "spread_pct":
+                spread_pct = (opt["ask"] - opt["bid"]) / opt["ltp"] if opt["ltp"] else 1
+                message = f"spread {spread_pct:.4f}"
+            if message:
+                print(f"[TradeBuilder] Reject {symbol} {opt['strike']} {opt_type}: {message}")
+            rec = self._reject_record(symbol, opt, opt_type, rule.reason, atr=atr)
+            if rule.rule_id in ("premium", "spread_ok"):
+                debug_candidates.append(rec)
+            rejected.append(rec)
+        survivors = [chain[row] for row in prefilter.survivors]
+
+        # ML confidence (only if enough history), scored for all survivors at once
+        use_ml = True
+        if getattr(self.cfg, "ML_USE_ONLY_WITH_HISTORY", True):
+            use_ml = self._ml_history_count() >= getattr(self.cfg, "ML_MIN_TRAIN_TRADES", 200)
+        ml_scores = self._score_ml_candidates(market_data, survivors, seq_buffer) if use_ml and survivors else []
+        for idx, opt in enumerate(survivors):
             model_type = "xgb"
             model_version = getattr(self.predictor, "model_version", None)
             shadow_version = getattr(self.predictor, "shadow_version", None)
@@ -1389,7 +1362,8 @@ class TradeBuilder:
             deep_conf = None
             micro_conf = None
             if use_ml:
-                ok_features, feature_reason = self._validate_ml_features(feats)
+                scored = ml_scores[idx]
+                ok_features, feature_reason = scored["features_ok"], scored["feature_reason"]
                 if not ok_features:
                     self._reject_ctx = {
                         "symbol": symbol,
@@ -1435,7 +1409,7 @@ class TradeBuilder:
                         qty=1,
                         qty_lots=1,
                         qty_units=qty_units,
-                        validity_sec=int(getattr(cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
+                        validity_sec=int(getattr(self.cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
                         capital_at_risk=0.01,
                         expected_slippage=0.0,
                         confidence=0.0,
@@ -1456,27 +1430,16 @@ class TradeBuilder:
                         rec = self._reject_record(symbol, opt, opt_type, feature_reason, atr=atr)
                         rejected.append(rec)
                     continue
-                xgb_conf = self.predictor.predict_confidence(feats)
-                if getattr(cfg, "ML_AB_ENABLE", False):
-                    shadow_confidence = self.predictor.predict_confidence_shadow(feats)
-                if cfg.USE_DEEP_MODEL and seq_buffer is not None:
-                    deep_pred = self._get_deep_predictor()
-                    deep_conf = deep_pred.predict_confidence(seq_buffer)
-                    model_type = "deep"
-                    model_version = getattr(deep_pred, "model_version", model_version)
+                xgb_conf = scored["xgb_conf"]
+                shadow_confidence = scored["shadow_confidence"]
+                deep_conf = scored["deep_conf"]
+                if scored["model_type"]:
+                    model_type = scored["model_type"]
+                    model_version = scored["model_version"]
                 confidence = deep_conf if deep_conf is not None else xgb_conf
                 # Microstructure overlay
-                if cfg.USE_MICRO_MODEL:
-                    micro_features = [
-                        float(opt.get("spread_pct", (opt["ask"] - opt["bid"]) / opt["ltp"] if opt["ltp"] else 0)),
-                        float(opt.get("volume", 0)),
-                        float(opt.get("oi_change", 0)),
-                        float(market_data.get("fx_ret_5m", 0.0) or market_data.get("x_usdinr_ret5") or 0.0),
-                        float(market_data.get("vix_z", 0.0) or market_data.get("x_india_vix_z") or 0.0),
-                        float(market_data.get("crude_ret_15m", 0.0) or market_data.get("x_crude_ret15") or 0.0),
-                        float(market_data.get("corr_fx_nifty", 0.0) or market_data.get("x_usdinr_corr_nifty") or 0.0),
-                    ]
-                    micro_conf = self._get_micro_predictor().predict_confidence(micro_features)
+                if self.cfg.USE_MICRO_MODEL:
+                    micro_conf = scored["micro_conf"]
                     opt["micro_pred"] = micro_conf
                     if confidence is None:
                         confidence = micro_conf
@@ -1506,12 +1469,12 @@ class TradeBuilder:
             # Latency penalty
             confidence *= self.execution.latency_penalty(opt.get("timestamp", datetime.now().timestamp()))
 
-            min_proba = getattr(cfg, "ML_MIN_PROBA", 0.6)
-            proba_mult = getattr(cfg, "REGIME_PROBA_MULT", {}).get(regime_day, 1.0)
+            min_proba = getattr(self.cfg, "ML_MIN_PROBA", 0.6)
+            proba_mult = getattr(self.cfg, "REGIME_PROBA_MULT", {}).get(regime_day, 1.0)
             min_proba = min_proba * proba_mult
             if quick_mode:
-                min_proba = min(min_proba, getattr(cfg, "QUICK_MIN_PROBA", 0.35))
-                if getattr(cfg, "QUICK_USE_SIGNAL_SCORE", True):
+                min_proba = min(min_proba, getattr(self.cfg, "QUICK_MIN_PROBA", 0.35))
+                if getattr(self.cfg, "QUICK_USE_SIGNAL_SCORE", True):
                     try:
                         confidence = max(confidence, float(signal.get("score", 0.5)))
                     except Exception:
@@ -1538,26 +1501,26 @@ class TradeBuilder:
             )
 
             atr = market_data.get("atr", max(1.0, ltp * 0.002))
-            stop_mult = getattr(cfg, "OPT_STOP_ATR_MAIN", 1.0)
-            target_mult = getattr(cfg, "OPT_TARGET_ATR_MAIN", 1.8)
+            stop_mult = getattr(self.cfg, "OPT_STOP_ATR_MAIN", 1.0)
+            target_mult = getattr(self.cfg, "OPT_TARGET_ATR_MAIN", 1.8)
             if quick_mode:
-                stop_mult = getattr(cfg, "OPT_STOP_ATR_QUICK", stop_mult)
-                target_mult = getattr(cfg, "OPT_TARGET_ATR_QUICK", target_mult)
+                stop_mult = getattr(self.cfg, "OPT_STOP_ATR_QUICK", stop_mult)
+                target_mult = getattr(self.cfg, "OPT_TARGET_ATR_QUICK", target_mult)
             if regime_day == "TREND":
-                stop_mult = stop_mult * float(getattr(cfg, "REGIME_TREND_STOP_MULT", 1.2))
-                target_mult = target_mult * float(getattr(cfg, "REGIME_TREND_TARGET_MULT", 2.0))
+                stop_mult = stop_mult * float(getattr(self.cfg, "REGIME_TREND_STOP_MULT", 1.2))
+                target_mult = target_mult * float(getattr(self.cfg, "REGIME_TREND_TARGET_MULT", 2.0))
             elif regime_day in ("RANGE", "RANGE_VOLATILE"):
-                stop_mult = stop_mult * float(getattr(cfg, "REGIME_RANGE_STOP_MULT", 0.8))
-                target_mult = target_mult * float(getattr(cfg, "REGIME_RANGE_TARGET_MULT", 1.3))
+                stop_mult = stop_mult * float(getattr(self.cfg, "REGIME_RANGE_STOP_MULT", 0.8))
+                target_mult = target_mult * float(getattr(self.cfg, "REGIME_RANGE_TARGET_MULT", 1.3))
             elif regime_day == "EVENT":
-                if not (getattr(cfg, "REGIME_EVENT_ROUTE_ALLOW", True) and getattr(cfg, "EVENT_ALLOW_DEFINED_RISK", True)):
+                if not (getattr(self.cfg, "REGIME_EVENT_ROUTE_ALLOW", True) and getattr(self.cfg, "EVENT_ALLOW_DEFINED_RISK", True)):
                     if debug_reasons:
                         rec = self._reject_record(symbol, opt, opt_type, "event_regime_blocked", atr=atr)
                         rejected.append(rec)
                     continue
-                stop_mult = stop_mult * float(getattr(cfg, "REGIME_EVENT_STOP_MULT", 1.1))
-                target_mult = target_mult * float(getattr(cfg, "REGIME_EVENT_TARGET_MULT", 1.4))
-                size_mult = size_mult * float(getattr(cfg, "REGIME_EVENT_SIZE_MULT", 0.6))
+                stop_mult = stop_mult * float(getattr(self.cfg, "REGIME_EVENT_STOP_MULT", 1.1))
+                target_mult = target_mult * float(getattr(self.cfg, "REGIME_EVENT_TARGET_MULT", 1.4))
+                size_mult = size_mult * float(getattr(self.cfg, "REGIME_EVENT_SIZE_MULT", 0.6))
             stop_loss, target = self._opt_risk_levels(
                 entry_price, opt.get("bid", 0), opt.get("ask", 0), atr, stop_mult=stop_mult, target_mult=target_mult
             )
@@ -1568,7 +1531,7 @@ class TradeBuilder:
                 rr = abs(target - entry_price) / max(abs(entry_price - stop_loss), 1e-6)
             except Exception:
                 rr = None
-            min_rr = getattr(cfg, "MIN_RR_QUICK", getattr(cfg, "MIN_RR", 1.5)) if quick_mode else getattr(cfg, "MIN_RR", 1.5)
+            min_rr = getattr(self.cfg, "MIN_RR_QUICK", getattr(self.cfg, "MIN_RR", 1.5)) if quick_mode else getattr(self.cfg, "MIN_RR", 1.5)
             if not quick_mode:
                 tune = _get_auto_tune()
                 if tune.get("enabled"):
@@ -1588,25 +1551,26 @@ class TradeBuilder:
                 direction=direction,
                 rr=rr,
                 strategy_name=strategy_tag,
+                config=self.cfg,
             )
             score = score_pack.get("score", 0)
             # Optional cross-asset penalties (do not block)
             try:
                 cross_q = market_data.get("cross_asset_quality", {}) or {}
-                optional = set(getattr(cfg, "CROSS_OPTIONAL_FEEDS", []) or [])
+                optional = set(getattr(self.cfg, "CROSS_OPTIONAL_FEEDS", []) or [])
                 stale = set(cross_q.get("stale_feeds", []) or [])
                 missing_map = cross_q.get("missing") or {}
                 missing = set(k for k, v in missing_map.items() if not str(v).startswith("disabled"))
                 bad_optional = (stale | missing) & optional
                 if bad_optional:
-                    size_mult = min(size_mult, float(getattr(cfg, "CROSS_ASSET_OPTIONAL_SIZE_MULT", 0.85)))
+                    size_mult = min(size_mult, float(getattr(self.cfg, "CROSS_ASSET_OPTIONAL_SIZE_MULT", 0.85)))
             except Exception:
                 pass
-            min_score = getattr(cfg, "QUICK_TRADE_SCORE_MIN", 60) if quick_mode else getattr(cfg, "TRADE_SCORE_MIN", 75)
+            min_score = getattr(self.cfg, "QUICK_TRADE_SCORE_MIN", 60) if quick_mode else getattr(self.cfg, "TRADE_SCORE_MIN", 75)
             # Day-type overrides for score threshold
             try:
                 dt = (market_data.get("day_type") or "").upper()
-                dt_map = getattr(cfg, "TRADE_SCORE_MIN_BY_DAYTYPE", {})
+                dt_map = getattr(self.cfg, "TRADE_SCORE_MIN_BY_DAYTYPE", {})
                 if isinstance(dt_map, dict) and dt in dt_map:
                     min_score = float(dt_map[dt])
             except Exception:
@@ -1657,7 +1621,7 @@ class TradeBuilder:
                 qty=1,
                 qty_lots=1,
                 qty_units=qty_units,
-                validity_sec=int(getattr(cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
+                validity_sec=int(getattr(self.cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
                 capital_at_risk=round(max(entry_price - stop_loss, 0.01), 2),
                 expected_slippage=round(slippage, 2),
                 confidence=round(confidence, 3),
@@ -1693,7 +1657,7 @@ class TradeBuilder:
         if debug_reasons and rejected:
             self._write_rejected(rejected)
         if debug_mode:
-            top_n = getattr(cfg, "DEBUG_TRADE_TOP_N", 5)
+            top_n = getattr(self.cfg, "DEBUG_TRADE_TOP_N", 5)
             pool = rejected if rejected else debug_candidates
             if pool:
                 self._write_debug_candidates(pool, top_n=top_n)
@@ -1724,8 +1688,8 @@ class TradeBuilder:
                     )
                     return None
                 try:
-                    band_map = getattr(cfg, "PREMIUM_BANDS", {})
-                    band = band_map.get(symbol, (getattr(cfg, "MIN_PREMIUM", 40), getattr(cfg, "MAX_PREMIUM", 150)))
+                    band_map = getattr(self.cfg, "PREMIUM_BANDS", {})
+                    band = band_map.get(symbol, (getattr(self.cfg, "MIN_PREMIUM", 40), getattr(self.cfg, "MAX_PREMIUM", 150)))
                     min_p, max_p = band
                     ltp_opt = max(min_p, min(max_p, ltp * 0.004))
                     bid = round(ltp_opt * 0.995, 2)
@@ -1740,8 +1704,8 @@ class TradeBuilder:
                         entry_price, bid, ask, atr, stop_mult=1.0, target_mult=1.5
                     )
                     ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-                    step_map = getattr(cfg, "STRIKE_STEP_BY_SYMBOL", {})
-                    step = step_map.get(symbol, getattr(cfg, "STRIKE_STEP", 50))
+                    step_map = getattr(self.cfg, "STRIKE_STEP_BY_SYMBOL", {})
+                    step = step_map.get(symbol, getattr(self.cfg, "STRIKE_STEP", 50))
                     atm_strike = int(round(ltp / step) * step) if step else 0
                     instrument_type, instrument_id, qty_units, ident_err = self._identity_fields(
                         symbol,
@@ -1789,10 +1753,10 @@ class TradeBuilder:
                         qty=1,
                         qty_lots=1,
                         qty_units=qty_units,
-                        validity_sec=int(getattr(cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
+                        validity_sec=int(getattr(self.cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
                         capital_at_risk=round(max(entry_price - stop_loss, 0.01), 2),
                         expected_slippage=round(slippage, 2),
-                        confidence=round(max(0.5, getattr(cfg, "ML_MIN_PROBA", 0.5)), 3),
+                        confidence=round(max(0.5, getattr(self.cfg, "ML_MIN_PROBA", 0.5)), 3),
                         strategy="QUICK_SYNTH",
                         regime=market_data.get("regime", "NEUTRAL"),
                         tier="EXPLORATION",
@@ -1839,7 +1803,7 @@ class TradeBuilder:
                 instrument_type, instrument_id, qty_units, ident_err = self._identity_fields(
                     symbol,
                     instrument,
-                    getattr(cfg, "FUT_EXPIRY", ""),
+                    getattr(self.cfg, "FUT_EXPIRY", ""),
                     None,
                     None,
                     1,
@@ -1871,7 +1835,7 @@ class TradeBuilder:
                     instrument_id=instrument_id,
                     instrument_token=None,
                     strike=0,
-                    expiry=str(getattr(cfg, "FUT_EXPIRY", "")),
+                    expiry=str(getattr(self.cfg, "FUT_EXPIRY", "")),
                     side=side,
                     entry_price=round(ltp, 2),
                     stop_loss=round(stop_loss, 2),
@@ -1879,7 +1843,7 @@ class TradeBuilder:
                     qty=1,
                     qty_lots=1,
                     qty_units=qty_units,
-                    validity_sec=int(getattr(cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
+                    validity_sec=int(getattr(self.cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
                     capital_at_risk=round(abs(ltp - stop_loss), 2),
                     expected_slippage=0.0,
                     confidence=round(base_conf, 3),
@@ -1897,14 +1861,14 @@ class TradeBuilder:
                     reason=intent["execution_reason"],
                     source_flags=dict(intent["source_flags"]),
                 )
-                if trade.confidence >= getattr(cfg, "ML_MIN_PROBA", 0.6):
+                if trade.confidence >= getattr(self.cfg, "ML_MIN_PROBA", 0.6):
                     return trade
                 self._log_blocked_candidate(
                     symbol,
                     "low_confidence",
                     "Trade confidence below configured threshold",
                     market_data=market_data,
-                    extra={"confidence": trade.confidence, "min_confidence": getattr(cfg, "ML_MIN_PROBA", 0.6)},
+                    extra={"confidence": trade.confidence, "min_confidence": getattr(self.cfg, "ML_MIN_PROBA", 0.6)},
                 )
                 if debug_reasons:
                     print(f"[TradeBuilder] Reject {symbol} {instrument}: low confidence")
@@ -1950,11 +1914,11 @@ class TradeBuilder:
         Zero-hero: cheap option momentum (high reward, low premium).
         Defaults to bullish calls with strict confidence + momentum.
         """
-        if not getattr(cfg, "ZERO_HERO_ENABLE", True):
+        if not getattr(self.cfg, "ZERO_HERO_ENABLE", True):
             return None
         # Expiry-day special logic
         if (
-            getattr(cfg, "ZERO_HERO_EXPIRY_ENABLE", True)
+            getattr(self.cfg, "ZERO_HERO_EXPIRY_ENABLE", True)
             and market_data.get("day_type") == "EXPIRY_DAY"
             and market_data.get("symbol") in ("NIFTY", "SENSEX", "BANKNIFTY")
         ):
@@ -1967,33 +1931,28 @@ class TradeBuilder:
         if htf_dir == "DOWN":
             return None
         # Require meaningful move over window
-        if atr and abs(ltp_change_window) < atr * getattr(cfg, "ZERO_HERO_ATR_MULT", 0.08):
+        if atr and abs(ltp_change_window) < atr * getattr(self.cfg, "ZERO_HERO_ATR_MULT", 0.08):
             if debug_reasons:
                 print(f"[ZeroHero] Reject {symbol}: weak momentum")
             return None
 
         opt_type = "CE" if ltp_change_window >= 0 else "PE"
-        min_p = getattr(cfg, "ZERO_HERO_MIN_PREMIUM", 5)
-        max_p = getattr(cfg, "ZERO_HERO_MAX_PREMIUM", 60)
+        min_p = getattr(self.cfg, "ZERO_HERO_MIN_PREMIUM", 5)
+        max_p = getattr(self.cfg, "ZERO_HERO_MAX_PREMIUM", 60)
 
         candidates = []
         rejected = []
-        for opt in market_data.get("option_chain", []):
-            if opt.get("type") != opt_type:
-                continue
-            if not opt.get("quote_ok", True):
-                if debug_reasons:
-                    rejected.append(self._reject_record(symbol, opt, opt_type, "no_quote", atr=atr))
-                continue
-            if opt.get("ltp", 0) < min_p or opt.get("ltp", 0) > max_p:
-                continue
-            if not self.execution.spread_ok(opt.get("bid", 0), opt.get("ask", 0), opt.get("ltp", 0) or 1):
-                continue
+        chain, prefilter = self._screen_premium_spread(market_data, opt_type, min_p, max_p, require_quote=True)
+        if debug_reasons:
+            for row, rule in prefilter.rejects:
+                if rule.reason == "no_quote":
+                    rejected.append(self._reject_record(symbol, chain[row], opt_type, "no_quote", atr=atr))
+        for opt in (chain[row] for row in prefilter.survivors):
             feats = pd.DataFrame([build_trade_features(market_data, opt)])
             # Use ML only when enough labeled history is available
             use_ml = True
-            if getattr(cfg, "ML_USE_ONLY_WITH_HISTORY", True):
-                use_ml = self._ml_history_count() >= getattr(cfg, "ML_MIN_TRAIN_TRADES", 200)
+            if getattr(self.cfg, "ML_USE_ONLY_WITH_HISTORY", True):
+                use_ml = self._ml_history_count() >= getattr(self.cfg, "ML_MIN_TRAIN_TRADES", 200)
             model_type = "xgb"
             model_version = getattr(self.predictor, "model_version", None)
             shadow_version = getattr(self.predictor, "shadow_version", None)
@@ -2017,11 +1976,11 @@ class TradeBuilder:
                     continue
                 xgb_conf = self.predictor.predict_confidence(feats)
                 confidence = xgb_conf
-                if getattr(cfg, "ML_AB_ENABLE", False):
+                if getattr(self.cfg, "ML_AB_ENABLE", False):
                     shadow_confidence = self.predictor.predict_confidence_shadow(feats)
             else:
                 confidence = max(0.55, min(1.0, abs(ltp_change_window) / max(atr, 1.0)))
-            if cfg.USE_MICRO_MODEL:
+            if self.cfg.USE_MICRO_MODEL:
                 micro_features = [
                     float(opt.get("spread_pct", (opt["ask"] - opt["bid"]) / opt["ltp"] if opt["ltp"] else 0)),
                     float(opt.get("volume", 0)),
@@ -2049,7 +2008,7 @@ class TradeBuilder:
             if adj_score is not None:
                 confidence = adj_score
             size_mult = min(size_mult, decay_size_mult)
-            if confidence < getattr(cfg, "ZERO_HERO_MIN_PROBA", 0.6):
+            if confidence < getattr(self.cfg, "ZERO_HERO_MIN_PROBA", 0.6):
                 continue
             slippage = self.execution.estimate_slippage(opt["bid"], opt["ask"], opt.get("volume", 0))
             entry_price = opt["ask"] + slippage
@@ -2058,8 +2017,8 @@ class TradeBuilder:
             )
             stop_loss, target = self._opt_risk_levels(
                 entry_price, opt.get("bid", 0), opt.get("ask", 0), atr,
-                stop_mult=getattr(cfg, "ZERO_HERO_STOP_ATR", 0.6),
-                target_mult=getattr(cfg, "ZERO_HERO_TARGET_ATR", 2.0),
+                stop_mult=getattr(self.cfg, "ZERO_HERO_STOP_ATR", 0.6),
+                target_mult=getattr(self.cfg, "ZERO_HERO_TARGET_ATR", 2.0),
             )
             ts = datetime.now().strftime("%Y%m%d-%H%M%S")
             instrument_type, instrument_id, qty_units, ident_err = self._identity_fields(
@@ -2095,7 +2054,7 @@ class TradeBuilder:
                 qty=1,
                 qty_lots=1,
                 qty_units=qty_units,
-                validity_sec=int(getattr(cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
+                validity_sec=int(getattr(self.cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
                 capital_at_risk=round(max(entry_price - stop_loss, 0.01), 2),
                 expected_slippage=round(slippage, 2),
                 confidence=round(confidence, 3),
@@ -2137,15 +2096,15 @@ class TradeBuilder:
         ltp = market_data.get("ltp", 0)
         atr = market_data.get("atr", max(1.0, ltp * 0.002))
         minutes_since_open = market_data.get("minutes_since_open", 0) or 0
-        if minutes_since_open > getattr(cfg, "ZERO_HERO_EXPIRY_TIME_CUTOFF_MIN", 120):
+        if minutes_since_open > getattr(self.cfg, "ZERO_HERO_EXPIRY_TIME_CUTOFF_MIN", 120):
             return None
-        if self._expiry_zero_hero_count >= getattr(cfg, "ZERO_HERO_EXPIRY_MAX_TRADES", 2):
+        if self._expiry_zero_hero_count >= getattr(self.cfg, "ZERO_HERO_EXPIRY_MAX_TRADES", 2):
             return None
-        max_per_symbol = getattr(cfg, "ZERO_HERO_EXPIRY_MAX_TRADES_PER_SYMBOL", 1)
+        max_per_symbol = getattr(self.cfg, "ZERO_HERO_EXPIRY_MAX_TRADES_PER_SYMBOL", 1)
         if symbol == "NIFTY":
-            max_per_symbol = getattr(cfg, "ZERO_HERO_EXPIRY_MAX_TRADES_NIFTY", max_per_symbol)
+            max_per_symbol = getattr(self.cfg, "ZERO_HERO_EXPIRY_MAX_TRADES_NIFTY", max_per_symbol)
         if symbol == "SENSEX":
-            max_per_symbol = getattr(cfg, "ZERO_HERO_EXPIRY_MAX_TRADES_SENSEX", max_per_symbol)
+            max_per_symbol = getattr(self.cfg, "ZERO_HERO_EXPIRY_MAX_TRADES_SENSEX", max_per_symbol)
         if self._expiry_zero_hero_by_symbol.get(symbol, 0) >= max_per_symbol:
             return None
         # cooldown after loss streak
@@ -2168,20 +2127,15 @@ class TradeBuilder:
             return None
         opt_type = "CE" if direction == "BUY_CALL" else "PE"
 
-        min_p = getattr(cfg, "ZERO_HERO_EXPIRY_MIN_PREMIUM", 5)
-        max_p = getattr(cfg, "ZERO_HERO_EXPIRY_PREMIUM_MAX_BY_SYMBOL", {}).get(symbol, getattr(cfg, "ZERO_HERO_EXPIRY_MAX_PREMIUM", 40))
-        min_delta = getattr(cfg, "ZERO_HERO_EXPIRY_MIN_DELTA", 0.2)
-        max_delta = getattr(cfg, "ZERO_HERO_EXPIRY_MAX_DELTA", 0.5)
-        tgt_points = getattr(cfg, "ZERO_HERO_EXPIRY_TARGET_POINTS", {}).get(symbol, 50)
+        min_p = getattr(self.cfg, "ZERO_HERO_EXPIRY_MIN_PREMIUM", 5)
+        max_p = getattr(self.cfg, "ZERO_HERO_EXPIRY_PREMIUM_MAX_BY_SYMBOL", {}).get(symbol, getattr(self.cfg, "ZERO_HERO_EXPIRY_MAX_PREMIUM", 40))
+        min_delta = getattr(self.cfg, "ZERO_HERO_EXPIRY_MIN_DELTA", 0.2)
+        max_delta = getattr(self.cfg, "ZERO_HERO_EXPIRY_MAX_DELTA", 0.5)
+        tgt_points = getattr(self.cfg, "ZERO_HERO_EXPIRY_TARGET_POINTS", {}).get(symbol, 50)
 
         candidates = []
-        for opt in market_data.get("option_chain", []):
-            if opt.get("type") != opt_type:
-                continue
-            if opt.get("ltp", 0) < min_p or opt.get("ltp", 0) > max_p:
-                continue
-            if not self.execution.spread_ok(opt.get("bid", 0), opt.get("ask", 0), opt.get("ltp", 0) or 1):
-                continue
+        chain, prefilter = self._screen_premium_spread(market_data, opt_type, min_p, max_p)
+        for opt in (chain[row] for row in prefilter.survivors):
             # Premium decay filter: IV crush + time to expiry
             iv = opt.get("iv")
             iv_z = opt.get("iv_z")
@@ -2190,15 +2144,15 @@ class TradeBuilder:
                 tte_hrs = market_data.get("time_to_expiry_hrs")
             if tte_hrs is None:
                 tte_hrs = 0
-            if iv is not None and iv < getattr(cfg, "ZERO_HERO_IVCRUSH_MIN", 0.15):
+            if iv is not None and iv < getattr(self.cfg, "ZERO_HERO_IVCRUSH_MIN", 0.15):
                 continue
-            if tte_hrs > getattr(cfg, "ZERO_HERO_TIME_TO_EXPIRY_MAX_HRS", 6):
+            if tte_hrs > getattr(self.cfg, "ZERO_HERO_TIME_TO_EXPIRY_MAX_HRS", 6):
                 continue
             d = abs(opt.get("delta", 0.0)) if opt.get("delta") is not None else 0.0
             if d and (d < min_delta or d > max_delta):
                 continue
             # require strong immediate momentum
-            if abs(ltp_change_window) < atr * getattr(cfg, "ZERO_HERO_ATR_MULT", 0.08):
+            if abs(ltp_change_window) < atr * getattr(self.cfg, "ZERO_HERO_ATR_MULT", 0.08):
                 continue
 
             slippage = self.execution.estimate_slippage(opt["bid"], opt["ask"], opt.get("volume", 0))
@@ -2258,7 +2212,7 @@ class TradeBuilder:
                 qty=1,
                 qty_lots=1,
                 qty_units=qty_units,
-                validity_sec=int(getattr(cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
+                validity_sec=int(getattr(self.cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
                 capital_at_risk=round(max(entry_price - stop_loss, 0.01), 2),
                 expected_slippage=round(slippage, 2),
                 confidence=round(confidence, 3),
@@ -2295,7 +2249,7 @@ class TradeBuilder:
         Build spread suggestions (iron condor / iron fly / bull-bear call spreads).
         Returns list of dicts suitable for review queue (non-executable).
         """
-        if not getattr(cfg, "SPREAD_SUGGESTIONS_ENABLE", True):
+        if not getattr(self.cfg, "SPREAD_SUGGESTIONS_ENABLE", True):
             return []
         symbol = market_data.get("symbol")
         if symbol not in ("NIFTY", "BANKNIFTY", "SENSEX"):
@@ -2305,24 +2259,21 @@ class TradeBuilder:
         chain = market_data.get("option_chain", [])
         if not chain:
             return []
-        min_iv = getattr(cfg, "SPREAD_MIN_IV", 0.15)
-        chain_ivs = [c.get("iv") for c in chain if c.get("iv") is not None]
+        cols = OptionChainFrame.of(chain)
+        min_iv = getattr(self.cfg, "SPREAD_MIN_IV", 0.15)
+        chain_ivs = [iv for iv in cols.values("iv") if iv is not None]
         chain_iv_mean = (sum(chain_ivs) / len(chain_ivs)) if chain_ivs else None
         iv_mean = market_data.get("iv_mean", None) or chain_iv_mean
         if iv_mean is not None and iv_mean < min_iv:
             return []
-        strikes = sorted({c.get("strike") for c in chain if c.get("strike") is not None})
+        strikes = sorted({k for k in cols.values("strike") if k is not None})
         if not strikes:
             return []
         # Helper: pick strike nearest to ltp
         def _nearest_strike(val):
             return min(strikes, key=lambda s: abs(s - val))
         # Helper: get option by strike/type
-        def _opt(strike, opt_type):
-            for c in chain:
-                if c.get("strike") == strike and c.get("type") == opt_type:
-                    return c
-            return None
+        _opt = cols.find
         # Basic pricing helpers
         def _credit(sell, buy):
             return max((sell.get("bid", 0) or 0) - (buy.get("ask", 0) or 0), 0)
@@ -2358,11 +2309,11 @@ class TradeBuilder:
             return (k_buy - spot) - debit
 
         ideas = []
-        max_items = getattr(cfg, "SPREAD_MAX_PER_SYMBOL", 2)
-        width = getattr(cfg, "IRON_CONDOR_WIDTH", 100)
-        fly_width = getattr(cfg, "IRON_FLY_WIDTH", 100)
-        min_credit = getattr(cfg, "SPREAD_MIN_CREDIT", 5)
-        min_debit = getattr(cfg, "SPREAD_MIN_DEBIT", 5)
+        max_items = getattr(self.cfg, "SPREAD_MAX_PER_SYMBOL", 2)
+        width = getattr(self.cfg, "IRON_CONDOR_WIDTH", 100)
+        fly_width = getattr(self.cfg, "IRON_FLY_WIDTH", 100)
+        min_credit = getattr(self.cfg, "SPREAD_MIN_CREDIT", 5)
+        min_debit = getattr(self.cfg, "SPREAD_MIN_DEBIT", 5)
 
         atm = _nearest_strike(ltp)
         if day_type in ("RANGE_DAY", "RANGE_VOLATILE", "EXPIRY_DAY"):
@@ -2528,7 +2479,7 @@ class TradeBuilder:
         """
         Scalp trades for low-momentum/range conditions.
         """
-        if not getattr(cfg, "SCALP_ENABLE", True):
+        if not getattr(self.cfg, "SCALP_ENABLE", True):
             return None
         symbol = market_data.get("symbol")
         ltp = market_data.get("ltp", 0)
@@ -2536,7 +2487,7 @@ class TradeBuilder:
         ltp_change_window = market_data.get("ltp_change_window", 0) or 0
         if atr <= 0:
             return None
-        if abs(ltp_change_window) > atr * getattr(cfg, "SCALP_MAX_MOM_ATR", 0.08):
+        if abs(ltp_change_window) > atr * getattr(self.cfg, "SCALP_MAX_MOM_ATR", 0.08):
             if debug_reasons:
                 print(f"[Scalp] Reject {symbol}: momentum too high")
                 _log_signal_event(
@@ -2546,7 +2497,7 @@ class TradeBuilder:
                         "reason": "momentum_too_high",
                         "ltp_change_window": ltp_change_window,
                         "atr": atr,
-                        "threshold": atr * getattr(cfg, "SCALP_MAX_MOM_ATR", 0.08),
+                        "threshold": atr * getattr(self.cfg, "SCALP_MAX_MOM_ATR", 0.08),
                     },
                 )
             return None
@@ -2555,7 +2506,7 @@ class TradeBuilder:
         vwap = market_data.get("vwap", ltp)
         vwap_slope = market_data.get("vwap_slope", 0) or 0
         ltp_change_5m = market_data.get("ltp_change_5m", 0) or 0
-        dir_atr = getattr(cfg, "SCALP_DIR_ATR", 0.05)
+        dir_atr = getattr(self.cfg, "SCALP_DIR_ATR", 0.05)
         direction = None
         if abs(ltp_change_window) >= atr * dir_atr:
             direction = "BUY_CALL" if ltp_change_window > 0 else "BUY_PUT"
@@ -2567,21 +2518,16 @@ class TradeBuilder:
             direction = "BUY_CALL" if ltp >= vwap else "BUY_PUT"
         opt_type = "CE" if direction == "BUY_CALL" else "PE"
 
-        min_p = getattr(cfg, "SCALP_MIN_PREMIUM", 20)
-        max_p = getattr(cfg, "SCALP_MAX_PREMIUM", 180)
+        min_p = getattr(self.cfg, "SCALP_MIN_PREMIUM", 20)
+        max_p = getattr(self.cfg, "SCALP_MAX_PREMIUM", 180)
         candidates = []
         rejected = []
-        for opt in market_data.get("option_chain", []):
-            if opt.get("type") != opt_type:
-                continue
-            if opt.get("ltp", 0) < min_p or opt.get("ltp", 0) > max_p:
-                continue
-            if not self.execution.spread_ok(opt.get("bid", 0), opt.get("ask", 0), opt.get("ltp", 0) or 1):
-                continue
+        chain, prefilter = self._screen_premium_spread(market_data, opt_type, min_p, max_p)
+        for opt in (chain[row] for row in prefilter.survivors):
             feats = pd.DataFrame([build_trade_features(market_data, opt)])
             use_ml = True
-            if getattr(cfg, "ML_USE_ONLY_WITH_HISTORY", True):
-                use_ml = self._ml_history_count() >= getattr(cfg, "ML_MIN_TRAIN_TRADES", 200)
+            if getattr(self.cfg, "ML_USE_ONLY_WITH_HISTORY", True):
+                use_ml = self._ml_history_count() >= getattr(self.cfg, "ML_MIN_TRAIN_TRADES", 200)
             model_type = "xgb"
             model_version = getattr(self.predictor, "model_version", None)
             shadow_version = getattr(self.predictor, "shadow_version", None)
@@ -2605,11 +2551,11 @@ class TradeBuilder:
                     continue
                 xgb_conf = self.predictor.predict_confidence(feats)
                 confidence = xgb_conf
-                if getattr(cfg, "ML_AB_ENABLE", False):
+                if getattr(self.cfg, "ML_AB_ENABLE", False):
                     shadow_confidence = self.predictor.predict_confidence_shadow(feats)
             else:
                 confidence = max(0.5, min(1.0, 0.6 + (atr / max(ltp, 1)) * 10))
-            if cfg.USE_MICRO_MODEL:
+            if self.cfg.USE_MICRO_MODEL:
                 micro_features = [
                     float(opt.get("spread_pct", (opt["ask"] - opt["bid"]) / opt["ltp"] if opt["ltp"] else 0)),
                     float(opt.get("volume", 0)),
@@ -2636,7 +2582,7 @@ class TradeBuilder:
             if adj_score is not None:
                 confidence = adj_score
             size_mult = min(size_mult, decay_size_mult)
-            if confidence < getattr(cfg, "SCALP_MIN_PROBA", 0.58):
+            if confidence < getattr(self.cfg, "SCALP_MIN_PROBA", 0.58):
                 continue
             slippage = self.execution.estimate_slippage(opt["bid"], opt["ask"], opt.get("volume", 0))
             entry_price = opt["ask"] + slippage
@@ -2645,8 +2591,8 @@ class TradeBuilder:
             )
             stop_loss, target = self._opt_risk_levels(
                 entry_price, opt.get("bid", 0), opt.get("ask", 0), atr,
-                stop_mult=getattr(cfg, "SCALP_STOP_ATR", 0.3),
-                target_mult=getattr(cfg, "SCALP_TARGET_ATR", 0.6),
+                stop_mult=getattr(self.cfg, "SCALP_STOP_ATR", 0.3),
+                target_mult=getattr(self.cfg, "SCALP_TARGET_ATR", 0.6),
             )
             ts = datetime.now().strftime("%Y%m%d-%H%M%S")
             instrument_type, instrument_id, qty_units, ident_err = self._identity_fields(
@@ -2682,7 +2628,7 @@ class TradeBuilder:
                 qty=1,
                 qty_lots=1,
                 qty_units=qty_units,
-                validity_sec=int(getattr(cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
+                validity_sec=int(getattr(self.cfg, "TELEGRAM_TRADE_VALIDITY_SEC", 180)),
                 capital_at_risk=round(max(entry_price - stop_loss, 0.01), 2),
                 expected_slippage=round(slippage, 2),
                 confidence=round(confidence, 3),
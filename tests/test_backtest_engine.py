@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from core.backtest_engine import BacktestEngine, forward_extreme
+from core.trade_schema import Trade
+
+RESULT_COLUMNS = [
+    "timestamp", "symbol", "side", "entry", "entry_condition", "entry_ref_price", "target", "stop_loss",
+    "qty", "pl", "outcome", "capital", "strategy", "regime", "day_type", "rr",
+]
+
+
+def _bars(symbol, start, days=2, per_day=60, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.DatetimeIndex(
+        np.concatenate([pd.date_range(f"2025-01-0{d + 1} 09:15", periods=per_day, freq="min") for d in range(days)])
+    )
+    n = len(ts)
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    open_ = np.r_[start, close[:-1]]
+    return pd.DataFrame({
+        "datetime": ts,
+        "open": open_,
+        "high": np.maximum(open_, close) * 1.0005,
+        "low": np.minimum(open_, close) * 0.9995,
+        "close": close,
+        "volume": rng.integers(1000, 5000, n),
+        "symbol": symbol,
+    })
+
+
+def _trade(md, cond=None, offset=0.0):
+    entry = md["ltp"] + offset
+    return Trade(
+        trade_id=f"T-{md['symbol']}-{md['timestamp']}", timestamp=datetime(2025, 1, 1), symbol=md["symbol"],
+        instrument="OPT", instrument_token=None, strike=int(entry), expiry="", side="BUY", entry_price=entry,
+        stop_loss=entry - 15, target=entry + 15, qty=1, capital_at_risk=15.0, expected_slippage=0.0,
+        confidence=0.7, strategy="FAKE", regime="TREND", entry_condition=cond,
+    )
+
+
+def _engine(df, build, **kwargs):
+    engine = BacktestEngine(df, **kwargs)
+    engine.trade_builder.build = build
+    engine.risk_engine.allow_trade = lambda portfolio, *a, **k: (True, "")
+    engine.execution_guard.validate = lambda trade, portfolio, regime: (True, "")
+    engine.risk_engine.size_trade = lambda trade, *a, **k: 1
+    return engine
+
+
+def test_forward_extreme_and_first_touch():
+    values = np.array([1.0, 5.0, 2.0, 4.0, 3.0])
+    assert forward_extreme(values, 2, np.max).tolist() == [5.0, 5.0, 4.0, 4.0, 3.0]
+    assert forward_extreme(values, 3, np.min).tolist() == [1.0, 2.0, 2.0, 3.0, 3.0]
+
+    engine = BacktestEngine(_bars("NIFTY", 25000.0, days=1))
+    bars = engine.prepare()["NIFTY"]
+    level = float(bars.high[10:20].max())
+    hit = bars.first_touch(10, 20, level, above=True)
+    assert hit is not None and bars.high[hit] >= level and (bars.high[10:hit] < level).all()
+    assert bars.first_touch(10, 20, level + 1e6, above=True) is None
+
+
+def test_multi_symbol_events_in_time_order_with_provided_chains():
+    df = pd.concat([_bars("NIFTY", 25000.0, seed=1), _bars("BANKNIFTY", 52000.0, seed=2)], ignore_index=True)
+    seen, chains = [], []
+
+    def build(md):
+        seen.append((md["timestamp"], md["symbol"]))
+        assert md["option_chain"] == [{"strike": round(md["ltp"])}]
+        assert md["index_quote_cache"]["last_price"] == md["ltp"] and "rsi_14" in md
+        return None
+
+    def provider(symbol, ltp, ts):
+        chains.append(symbol)
+        return [{"strike": round(ltp)}]
+
+    engine = _engine(df, build, chain_provider=provider)
+    out = engine.run()
+    assert out.empty
+    assert seen == sorted(seen)
+    assert {s for _, s in seen} == {"NIFTY", "BANKNIFTY"}
+    assert len(chains) == len(seen) == engine.stats["events"]
+    assert engine.stats["bars"] == sum(b.n for b in engine.bars.values())
+
+
+def test_result_schema_and_daily_trade_count_reset():
+    df = _bars("NIFTY", 25000.0, days=2)
+    today_counts = []
+
+    def build(md):
+        today_counts.append(engine.portfolio["trades_today"])
+        return _trade(md)
+
+    engine = _engine(df, build)
+    out = engine.run()
+    assert list(out.columns) == RESULT_COLUMNS
+    assert set(out["outcome"]) <= {"TARGET", "STOP", "TIMEOUT"}
+    assert out["timestamp"].iloc[0] == engine.bars["NIFTY"].bar_time(0)
+    assert engine.portfolio["trades_today"] < len(out)
+    assert 0 in today_counts[1:]
+
+
+def test_buy_above_enters_only_when_crossed_within_the_window():
+    df = _bars("NIFTY", 25000.0, days=1, seed=3)
+    engine = _engine(df, lambda md: _trade(md, cond="BUY_ABOVE", offset=20.0))
+    out = engine.run()
+    bars = engine.bars["NIFTY"]
+    window = min(engine.entry_window, engine.horizon)
+    crossed = [
+        i for i in range(bars.n - engine.horizon)
+        if any(h >= bars.close[i] + 20.0 for h in bars.high[i + 1:i + 1 + window])
+    ]
+    assert 0 < len(out) == len(crossed) < bars.n - engine.horizon
+    assert out["entry"].tolist() == [float(bars.close[i]) + 20.0 for i in crossed]
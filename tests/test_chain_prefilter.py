@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import numpy as np
+
+from core.execution_engine import ExecutionEngine
+from core.option_chain_frame import OptionChainFrame
+from strategies.chain_prefilter import premium_spread_rules, screen, trade_rules
+
+
+def _opt(strike, **overrides):
+    opt = {
+        "type": "CE",
+        "strike": strike,
+        "bid": 99.5,
+        "ask": 100.5,
+        "ltp": 100.0,
+        "volume": 70000,
+        "oi": 5000,
+        "oi_change": 0,
+        "quote_ok": True,
+        "quote_age_sec": 1.0,
+        "quote_ts_epoch": 1.0,
+        "depth_ok": True,
+        "iv": 0.2,
+        "oi_build": "LONG",
+    }
+    opt.update(overrides)
+    return opt
+
+
+def _screen(chain, monkeypatch, relax=None, **kwargs):
+    monkeypatch.setattr("config.config.STRICT_LIVE_QUOTES", True, raising=False)
+    monkeypatch.setattr("config.config.MIN_VOLUME_FILTER", 500, raising=False)
+    monkeypatch.setattr("config.config.MIN_OI", 1000, raising=False)
+    monkeypatch.setattr("config.config.REQUIRE_LIVE_OPTION_QUOTES", False, raising=False)
+    monkeypatch.setattr("config.config.REQUIRE_VOLUME_FOR_TRADE", False, raising=False)
+    cols = OptionChainFrame(chain)
+    params = dict(
+        opt_type="CE",
+        direction="BUY_CALL",
+        exec_mode="SIM",
+        quick_mode=False,
+        max_spread=0.02,
+        premium_band=(40, 150),
+        market_data={"ltp": 25000.0, "atr": 50.0},
+        execution=ExecutionEngine(),
+        relax=relax,
+    )
+    params.update(kwargs)
+    return cols, screen(cols.equals("type", "CE"), trade_rules(cols, **params))
+
+
+def test_first_failing_rule_is_the_reported_reason(monkeypatch):
+    chain = [
+        _opt(25000),
+        _opt(25050, quote_ts_epoch=None, bid=None),
+        _opt(25100, bid=None),
+        _opt(25150, volume=100, oi=10),
+        _opt(25200, oi=10, iv=0.9),
+        _opt(25250, iv=0.9, ltp=200.0, bid=199.0, ask=201.0),
+        _opt(25300, ltp=200.0, bid=199.0, ask=201.0),
+        _opt(25350, type="PE", bid=None),
+        _opt(25400, oi_build="SHORT"),
+    ]
+    _cols, result = _screen(chain, monkeypatch)
+    assert result.survivors == [0]
+    assert [(row, rule.reason) for row, rule in result.rejects] == [
+        (1, "stale_option_quote"),
+        (2, "no_bid_ask"),
+        (3, "low_volume"),
+        (4, "low_oi"),
+        (5, "iv_bounds"),
+        (6, "premium"),
+        (8, "oi_build"),
+    ]
+
+
+def test_relaxed_reason_falls_through_to_next_rule(monkeypatch):
+    chain = [_opt(25000, volume=100, oi=10), _opt(25050, ltp=200.0, bid=199.0, ask=201.0)]
+    _cols, result = _screen(chain, monkeypatch, relax=lambda reason: reason in ("low_volume", "premium"))
+    assert result.survivors == [1]
+    assert [(row, rule.reason) for row, rule in result.rejects] == [(0, "low_oi")]
+
+
+def test_quick_mode_skips_liquidity_and_greeks_rules(monkeypatch):
+    chain = [_opt(25000, volume=100, oi=10, iv=0.9), _opt(25050, ask=120.0)]
+    _cols, result = _screen(chain, monkeypatch, quick_mode=True)
+    assert result.survivors == [0]
+    assert [(row, rule.rule_id) for row, rule in result.rejects] == [(1, "spread_ok")]
+
+
+def test_premium_spread_rules_match_execution_spread_ok(monkeypatch):
+    execution = ExecutionEngine()
+    chain = [
+        _opt(25000, ltp=30.0, bid=29.9, ask=30.1),
+        _opt(25050, ltp=30.0, bid=28.0, ask=32.0),
+        _opt(25100, ltp=300.0),
+        _opt(25150, ltp=30.0, quote_ok=False),
+        {"type": "CE", "strike": 25200, "ltp": 0},
+    ]
+    cols = OptionChainFrame(chain)
+    rules = premium_spread_rules(cols, min_premium=0, max_premium=200, execution=execution, require_quote=True)
+    result = screen(np.ones(len(chain), dtype=bool), rules)
+    expected = []
+    for i, opt in enumerate(chain):
+        if not opt.get("quote_ok", True):
+            continue
+        if opt.get("ltp", 0) < 0 or opt.get("ltp", 0) > 200:
+            continue
+        if execution.spread_ok(opt.get("bid", 0), opt.get("ask", 0), opt.get("ltp", 0) or 1):
+            expected.append(i)
+    assert result.survivors == expected == [0, 4]
+    assert [rule.reason for _row, rule in result.rejects] == ["spread_ok", "premium", "no_quote"]
+
+
+def test_find_returns_first_match_by_strike_and_type():
+    first = _opt(25000)
+    cols = OptionChainFrame([first, _opt(25000), _opt(25000, type="PE")])
+    assert cols.find(25000, "CE") is first
+    assert cols.find(25000.0, "PE")["type"] == "PE"
+    assert cols.find(25050, "CE") is None
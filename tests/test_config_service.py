@@ -0,0 +1,101 @@
+import importlib.util
+import os
+import time
+
+import pytest
+
+from core.config_service import ConfigService
+
+
+_CONFIG_SRC = """
+import os
+FORCE_REGIME = os.getenv("CFGSVC_FORCE_REGIME", "")
+MAX_TRADES_PER_DAY = {max_trades}
+SYMBOLS = ["NIFTY", "BANKNIFTY"]
+_PRIVATE = 1
+"""
+
+
+def _load_module(path):
+    spec = importlib.util.spec_from_file_location("cfgsvc_test_config", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _touch_later(path, text):
+    path.write_text(text)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    monkeypatch.delenv("CFGSVC_FORCE_REGIME", raising=False)
+    cfg_path = tmp_path / "config.py"
+    env_path = tmp_path / ".env"
+    cfg_path.write_text(_CONFIG_SRC.format(max_trades=5))
+    env_path.write_text("")
+    module = _load_module(cfg_path)
+    service = ConfigService(module=module, env_path=env_path)
+    yield service, module, cfg_path, env_path
+    os.environ.pop("CFGSVC_FORCE_REGIME", None)
+
+
+def test_snapshot_is_stable_without_changes(setup):
+    service, _module, _cfg_path, _env_path = setup
+    first = service.refresh()
+    second = service.refresh()
+    assert second is first
+    assert first.version == 1
+    assert first.MAX_TRADES_PER_DAY == 5
+    assert "_PRIVATE" not in first
+    with pytest.raises(AttributeError):
+        first.MAX_TRADES_PER_DAY = 6
+    with pytest.raises(TypeError):
+        first.values["MAX_TRADES_PER_DAY"] = 6
+
+
+def test_config_file_edit_updates_only_changed_keys(setup):
+    service, module, cfg_path, _env_path = setup
+    first = service.refresh()
+    module.SYMBOLS = ["FINNIFTY"]  # runtime override must survive an unrelated edit
+    _touch_later(cfg_path, _CONFIG_SRC.format(max_trades=9))
+    snap = service.refresh()
+    assert snap.version == first.version + 1
+    assert snap.MAX_TRADES_PER_DAY == 9
+    assert module.MAX_TRADES_PER_DAY == 9
+    assert module.SYMBOLS == ["FINNIFTY"]
+    assert snap.changed == frozenset({"MAX_TRADES_PER_DAY", "SYMBOLS"})
+    assert first.MAX_TRADES_PER_DAY == 5
+    assert service.stats()["reloads"] == 1
+
+
+def test_env_file_edit_reaches_config_values(setup):
+    service, module, _cfg_path, env_path = setup
+    service.refresh()
+    _touch_later(env_path, "CFGSVC_FORCE_REGIME=TREND\n")
+    snap = service.refresh()
+    assert os.environ["CFGSVC_FORCE_REGIME"] == "TREND"
+    assert module.FORCE_REGIME == "TREND"
+    assert snap.FORCE_REGIME == "TREND"
+    assert snap.changed == frozenset({"FORCE_REGIME"})
+
+
+def test_broken_config_edit_keeps_last_snapshot(setup):
+    service, module, cfg_path, _env_path = setup
+    first = service.refresh()
+    _touch_later(cfg_path, "MAX_TRADES_PER_DAY = (\n")
+    snap = service.refresh()
+    assert snap is first
+    assert module.MAX_TRADES_PER_DAY == 5
+    assert service.stats()["errors"] == 1
+
+
+def test_refresh_without_changes_is_cheap(setup):
+    service, _module, _cfg_path, _env_path = setup
+    service.refresh()
+    started = time.perf_counter()
+    for _ in range(200):
+        service.refresh()
+    assert (time.perf_counter() - started) / 200 < 0.005
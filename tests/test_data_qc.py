@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from core import db_indexes
+from core.data_qc import (
+    StreamingQC,
+    aggregate_table,
+    depth_summary,
+    load_checkpoint,
+    save_checkpoint,
+    stream_tables,
+    table_summary,
+)
+from core.depth_history import DepthHistoryStore
+
+T0 = 1_767_000_000.0
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _ticks_db():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE ticks (timestamp TEXT, instrument_token INTEGER, last_price REAL, volume INTEGER, "
+        "oi INTEGER, timestamp_epoch REAL, timestamp_iso TEXT)"
+    )
+    return conn
+
+
+def _insert(conn, token, epoch, text=None, price=100.0):
+    conn.execute(
+        "INSERT INTO ticks VALUES (?,?,?,?,?,?,?)",
+        (text if text is not None else (_iso(epoch) if epoch is not None else None), token, price, 1, 1, epoch, None),
+    )
+
+
+def _fixture(conn):
+    for i in range(5):
+        _insert(conn, 1, T0 + i)
+    _insert(conn, 1, T0 + 4)  # duplicate
+    _insert(conn, 1, T0 + 100)  # gap of 96s
+    _insert(conn, 1, T0 + 2.5)  # stored after later-stamped rows
+    _insert(conn, 2, T0 + 1, text=_iso(T0 + 60))  # 59s clock skew
+    _insert(conn, 2, T0 + 2, price=None)
+    _insert(conn, 2, None)  # no epoch
+
+
+def test_stream_stats_per_token_in_small_chunks():
+    conn = _ticks_db()
+    _fixture(conn)
+    res = StreamingQC(conn, chunk_rows=3, gap_sec=30, max_skew_sec=5, now_epoch=T0 + 1000).run_table("ticks")
+    assert res["rows"] == 11
+    assert res["null_ts"] == 1
+    assert res["duplicates"] == 1
+    assert res["gaps"] == 1 and res["max_gap_sec"] == pytest.approx(96.0)
+    assert res["out_of_order"] == 1
+    assert res["clock_skew_rows"] == 1 and res["max_clock_skew_sec"] == pytest.approx(59.0)
+    assert res["null_counts"]["last_price"] == 1
+    assert res["tokens"]["1"]["rows"] == 8
+    assert res["tokens"]["2"]["rows"] == 2
+    assert res["min_ts"] == _iso(T0) and res["max_ts"] == _iso(T0 + 100)
+
+
+def test_checkpoint_resumes_with_only_new_and_late_rows(tmp_path):
+    conn = _ticks_db()
+    _fixture(conn)
+    first = StreamingQC(conn, chunk_rows=4, now_epoch=T0 + 1000)
+    first.run_table("ticks")
+    path = tmp_path / "qc_checkpoint.json"
+    save_checkpoint(path, "db-a", first.checkpoint_state())
+    assert load_checkpoint(path, "db-b") is None
+
+    for i in range(3):
+        _insert(conn, 2, T0 + 200 + i)
+    _insert(conn, 1, T0 + 3.5)  # late: older than the cursor
+    resumed = StreamingQC(conn, checkpoint=load_checkpoint(path, "db-a"), chunk_rows=4, now_epoch=T0 + 1000)
+    inc = resumed.run_table("ticks")
+    full = StreamingQC(conn, chunk_rows=4, now_epoch=T0 + 1000).run_table("ticks")
+
+    assert inc["scanned_rows"] == 4
+    assert inc["late_rows"] == 1
+    for key in ("rows", "null_ts", "null_counts", "duplicates", "out_of_order", "clock_skew_rows", "max_ts"):
+        assert inc[key] == full[key], key
+
+
+def test_depth_blobs_are_checked_for_null_without_loading():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE depth_snapshots (timestamp TEXT, instrument_token INTEGER, depth_json TEXT, "
+        "timestamp_iso TEXT, timestamp_epoch REAL)"
+    )
+    conn.executemany(
+        "INSERT INTO depth_snapshots VALUES (?,?,?,?,?)",
+        [(_iso(T0 + i), 7, None if i == 3 else "x" * 10000, None, T0 + i) for i in range(10)],
+    )
+    qc = StreamingQC(conn)
+    assert "depth_json, " not in qc._select("depth_snapshots", ["depth_json"])
+    res = qc.run_table("depth_snapshots")
+    assert res["rows"] == 10
+    assert res["null_counts"] == {"depth_json": 1, "timestamp_iso": 10}
+    assert res["max_null_rate"] == 1.0 and res["null_rate_ok"] is False
+
+
+def test_walk_and_summary_use_the_epoch_index():
+    conn = _ticks_db()
+    db_indexes.ensure_indexes(conn, ("ticks",))
+    select = StreamingQC(conn)._select("ticks", ["timestamp", "timestamp_epoch"])
+    plan = db_indexes.query_plan(
+        conn, f"{select} WHERE (timestamp_epoch, rowid) > (?, ?) ORDER BY timestamp_epoch, rowid LIMIT ?", (0, 0, 10)
+    )
+    assert any("idx_ticks_epoch" in line for line in plan)
+    assert not any("TEMP B-TREE" in line for line in plan)
+    _fixture(conn)
+    assert table_summary(conn, "ticks") == (11, _iso(T0), _iso(T0 + 100))
+
+
+def test_aggregate_table_for_small_tables_and_missing_tables():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE trades (timestamp TEXT, trade_id TEXT)")
+    conn.executemany("INSERT INTO trades VALUES (?,?)", [("2026-01-01", "a"), (None, "b"), ("2026-01-02", "c")])
+    res = aggregate_table(conn, "trades")
+    assert res["rows"] == 3 and res["null_ts"] == 1
+    assert res["min_ts"] == "2026-01-01" and res["max_ts"] == "2026-01-02"
+    assert res["max_null_rate"] == pytest.approx(1 / 3)
+    assert aggregate_table(conn, "broker_fills") == {"table": "broker_fills", "rows": 0, "error": "missing"}
+
+
+def test_depth_partitions_are_walked_and_checkpointed_per_partition(tmp_path):
+    db_path = tmp_path / "d.db"
+    book = {"buy": [{"price": 100.0, "quantity": 5, "orders": 1}], "sell": [{"price": 100.5, "quantity": 5, "orders": 1}]}
+    store = DepthHistoryStore(db_path=str(db_path), retention_days=0)
+    for day in range(2):
+        for i in range(4):
+            store.append(T0 + day * 86400 + i, 7, book)
+    store.flush()
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE ticks (timestamp TEXT, instrument_token INTEGER, timestamp_epoch REAL)")
+    names = [p[0] for p in store.partitions()]
+    assert stream_tables(conn) == ["ticks"] + names
+    assert depth_summary(conn) == (8, _iso(T0), _iso(T0 + 86400 + 3))
+
+    first = StreamingQC(conn, now_epoch=T0 + 2 * 86400)
+    results = {res["table"]: res for res in first.run()}
+    assert [results[name]["rows"] for name in names] == [4, 4]
+    assert results[names[0]]["null_counts"] == {}
+    state = first.checkpoint_state()
+    assert set(state["tables"]) == {"ticks", *names}
+
+    store.append(T0 + 86400 + 10, 7, book)
+    store.retention_days = 1
+    store.prune(now_epoch=T0 + 2 * 86400)
+    store.retention_days = 0  # keep close() from pruning against the wall clock
+    store.close()
+    resumed = {res["table"]: res for res in StreamingQC(conn, checkpoint=state, now_epoch=T0 + 2 * 86400).run()}
+    assert set(resumed) == {"ticks", names[1]}
+    assert resumed[names[1]]["rows"] == 5 and resumed[names[1]]["scanned_rows"] == 1
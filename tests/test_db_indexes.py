@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from config import config as cfg
+from core import db_pool, decision_logger, trade_store
+from core.db_indexes import INDEXES, query_plan
+from core.depth_history import DepthHistoryStore
+from core.decision_store import DecisionStore
+from core.tick_store import init_ticks
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = tmp_path / "desk.sqlite"
+    monkeypatch.setattr(cfg, "TRADE_DB_PATH", str(path))
+    trade_store.init_db()
+    init_ticks()
+    decision_logger._init_db(str(path))
+    DecisionStore(str(path))
+    store = DepthHistoryStore(db_path=str(path), retention_days=0)
+    store.append(_PARTITION_EPOCH, 1, {"buy": [], "sell": []})
+    store.close()
+    return db_pool.connection(path)
+
+
+# 2026-01-01 09:30 IST lands in the depth_hist_20260101 day partition.
+_PARTITION_EPOCH = 1767240000.0
+PARTITION = "depth_hist_20260101"
+
+HOT_QUERIES = [
+    ("SELECT MAX(timestamp_epoch) FROM ticks WHERE instrument_token IN (?,?)", (1, 2), "idx_ticks_token_epoch"),
+    ("SELECT MAX(timestamp_epoch) FROM ticks", (), "idx_ticks_epoch"),
+    (
+        "SELECT timestamp_epoch, instrument_token, last_price, volume FROM ticks "
+        "WHERE timestamp_epoch >= ? AND timestamp_epoch < ? ORDER BY timestamp_epoch ASC",
+        (0.0, 1.0),
+        "idx_ticks_epoch",
+    ),
+    (
+        f"SELECT MAX(timestamp_epoch) FROM {PARTITION} WHERE instrument_token IN (?)",
+        (1,),
+        f"idx_{PARTITION}_token_ts",
+    ),
+    (
+        f"SELECT timestamp_epoch, instrument_token, levels, imbalance FROM {PARTITION} "
+        "WHERE timestamp_epoch >= ? AND timestamp_epoch < ? AND instrument_token IN (?,?) ORDER BY timestamp_epoch ASC",
+        (0.0, 1.0, 1, 2),
+        f"idx_{PARTITION}_",
+    ),
+    (
+        f"SELECT timestamp_epoch, instrument_token, levels, imbalance FROM {PARTITION} "
+        "WHERE timestamp_epoch >= ? AND timestamp_epoch < ? ORDER BY timestamp_epoch ASC",
+        (0.0, 1.0),
+        f"idx_{PARTITION}_ts",
+    ),
+    (
+        "SELECT * FROM trades WHERE COALESCE(exit_time, '') = '' ORDER BY timestamp DESC LIMIT ?",
+        (10,),
+        "idx_trades_open",
+    ),
+    ("UPDATE decision_events SET regime = ? WHERE trade_id = ?", ("TREND", "T"), "sqlite_autoindex_decision_events_1"),
+    ("UPDATE trades SET fill_price = ? WHERE trade_id = ?", (1.0, "T"), "sqlite_autoindex_trades_1"),
+    (
+        "SELECT timestamp_epoch, r_multiple FROM outcomes WHERE timestamp_epoch IS NOT NULL AND timestamp_epoch >= ?",
+        (0.0,),
+        "idx_outcomes_epoch",
+    ),
+    (
+        "SELECT decision_json FROM decision_log WHERE symbol=? ORDER BY ts_epoch DESC LIMIT ?",
+        ("NIFTY", 5),
+        "idx_decision_log_symbol_epoch",
+    ),
+]
+
+
+@pytest.mark.parametrize("sql,params,index", HOT_QUERIES)
+def test_hot_queries_use_index(db, sql, params, index):
+    plan = query_plan(db, sql, params)
+    assert any(index in line for line in plan), plan
+    assert not any(line.startswith("SCAN") and "INDEX" not in line for line in plan), plan
+
+
+def test_all_managed_indexes_are_created(db):
+    names = {r[0] for r in db.execute("SELECT name FROM sqlite_master WHERE type='index'").fetchall()}
+    assert {spec.name for spec in INDEXES} <= names
+
+
+def test_indexes_added_to_existing_unindexed_db(tmp_path, monkeypatch):
+    path = tmp_path / "old.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE ticks (timestamp TEXT, instrument_token INTEGER, last_price REAL, volume INTEGER, oi INTEGER)")
+    monkeypatch.setattr(cfg, "TRADE_DB_PATH", str(path))
+    init_ticks()
+    plan = query_plan(db_pool.connection(path), "SELECT MAX(timestamp_epoch) FROM ticks WHERE instrument_token IN (?)", (1,))
+    assert any("idx_ticks_token_epoch" in line for line in plan)
+
+
+def test_existing_depth_partitions_get_token_index(tmp_path):
+    # A depth history written before the schema was versioned: catalog and
+    # partition, no token index, no schema_version row.
+    path = tmp_path / "old.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE depth_history_partitions (name TEXT PRIMARY KEY, start_epoch REAL, end_epoch REAL, created_epoch REAL)")
+        conn.execute("INSERT INTO depth_history_partitions VALUES (?,?,?,?)", (PARTITION, _PARTITION_EPOCH - 3600, _PARTITION_EPOCH + 3600, 0.0))
+        conn.execute(
+            f"CREATE TABLE {PARTITION} (timestamp_epoch REAL, instrument_token INTEGER, imbalance REAL, levels BLOB)"
+        )
+    reopened = DepthHistoryStore(db_path=str(path), retention_days=0)
+    assert [p[0] for p in reopened.partitions()] == [PARTITION]
+    reopened.close()
+    with sqlite3.connect(path) as conn:
+        plan = query_plan(conn, f"SELECT MAX(timestamp_epoch) FROM {PARTITION} WHERE instrument_token IN (?)", (1,))
+        version = conn.execute("SELECT version FROM schema_version WHERE component='depth_history'").fetchone()
+    assert any(f"idx_{PARTITION}_token_ts" in line for line in plan), plan
+    assert version == (2,)
@@ -0,0 +1,71 @@
+import sqlite3
+import threading
+
+from config import config as cfg
+from core import db_pool, trade_store
+
+
+def _migrate(calls):
+    def run(conn):
+        calls.append(1)
+        conn.execute("CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY, v TEXT)")
+
+    return run
+
+
+def test_connection_is_per_thread_and_reused(tmp_path):
+    db = tmp_path / "pool.db"
+    first = db_pool.connection(db)
+    assert db_pool.connection(db) is first
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(db_pool.connection(db)))
+    t.start()
+    t.join()
+    assert seen and seen[0] is not first
+
+
+def test_ensure_schema_runs_migration_once(tmp_path, monkeypatch):
+    db = tmp_path / "schema.db"
+    calls = []
+    db_pool.ensure_schema("comp", 1, _migrate(calls), db)
+    db_pool.ensure_schema("comp", 1, _migrate(calls), db)
+    assert calls == [1]
+
+    # A fresh process sees the recorded version and skips the migration.
+    monkeypatch.setattr(db_pool, "_SCHEMA_DONE", {})
+    db_pool.ensure_schema("comp", 1, _migrate(calls), db)
+    assert calls == [1]
+
+    db_pool.ensure_schema("comp", 2, _migrate(calls), db)
+    assert calls == [1, 1]
+    with sqlite3.connect(db) as conn:
+        row = conn.execute("SELECT version FROM schema_version WHERE component='comp'").fetchone()
+    assert row[0] == 2
+
+
+def test_replaced_db_file_reconnects_and_remigrates(tmp_path):
+    db = tmp_path / "swap.db"
+    calls = []
+    db_pool.ensure_schema("comp", 1, _migrate(calls), db)
+    old = db_pool.connection(db)
+    db.unlink()
+    for suffix in ("-wal", "-shm"):
+        (tmp_path / f"swap.db{suffix}").unlink(missing_ok=True)
+    sqlite3.connect(db).close()
+
+    db_pool.ensure_schema("comp", 1, _migrate(calls), db)
+    assert calls == [1, 1]
+    assert db_pool.connection(db) is not old
+    db_pool.connection(db).execute("INSERT INTO t (v) VALUES ('x')")
+
+
+def test_trade_store_inserts_through_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "TRADE_DB_PATH", str(tmp_path / "trades.db"))
+    before = db_pool.stats()["migrations"]
+    for i in range(3):
+        trade_store.insert_execution_stat({"instrument": "NIFTY", "slippage_bps": float(i)})
+    assert db_pool.stats()["migrations"] == before + 1
+    _cols, rows = trade_store.fetch_execution_stats(limit=10)
+    assert len(rows) == 3
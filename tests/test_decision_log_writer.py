@@ -0,0 +1,198 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from config import config as cfg
+from core import audit_log
+from core import decision_logger as dl
+from core.run_lock import RunLock
+
+
+def _setup(tmp_path, monkeypatch):
+    jsonl = tmp_path / "decision_events.jsonl"
+    db_path = tmp_path / "trades.db"
+    monkeypatch.setattr(dl, "DECISION_JSONL", jsonl)
+    monkeypatch.setattr(cfg, "TRADE_DB_PATH", str(db_path))
+    monkeypatch.setattr(audit_log, "AUDIT_LOG", tmp_path / "audit_log.jsonl")
+    monkeypatch.setattr(dl, "RunLock", functools.partial(RunLock, lock_dir=tmp_path / "locks"))
+    return jsonl, db_path
+
+
+def _event(i):
+    return {
+        "trade_id": f"T{i}",
+        "trace_id": f"T{i}",
+        "desk_id": "D1",
+        "timestamp_epoch": 1700000000.0 + i,
+        "quote_age_sec": 1.0,
+        "instrument_id": "NIFTY|2026-02-27|100|CE",
+        "symbol": "NIFTY",
+    }
+
+
+def _db_count(db_path):
+    if not db_path.exists():
+        return 0
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM decision_events").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
+def test_writer_keeps_chain_head_and_group_commits(tmp_path, monkeypatch):
+    jsonl, db_path = _setup(tmp_path, monkeypatch)
+    writer = dl.DecisionLogWriter(batch_size=3, flush_interval_sec=60.0)
+    try:
+        writer.append(_event(1))
+        writer.append(_event(2))
+        assert _db_count(db_path) == 0
+        assert len(jsonl.read_text().splitlines()) == 2
+        writer.append(_event(3))
+        assert _db_count(db_path) == 3
+
+        # A line written behind the writer's back is picked up as the new head.
+        foreign = {"trade_id": "X", "prev_hash": writer.stats()["head"]}
+        foreign["event_hash"] = dl._compute_event_hash(foreign)
+        with jsonl.open("a") as f:
+            f.write(dl._canonical_json(foreign) + "\n")
+        writer.append(_event(4))
+        writer.flush()
+        stats = writer.stats()
+        assert stats["owner"] is True
+        assert stats["head_reloads"] == 1
+        assert _db_count(db_path) == 4
+    finally:
+        writer.close()
+    ok, head, count = dl.verify_decision_chain(jsonl, full=True)
+    assert ok is True and count == 5
+    assert audit_log.verify_chain(audit_log.AUDIT_LOG) == (True, audit_log._read_last_hash(audit_log.AUDIT_LOG), 4)
+
+
+def test_writer_falls_back_when_lock_held_elsewhere(tmp_path, monkeypatch):
+    jsonl, _db_path = _setup(tmp_path, monkeypatch)
+    lock_dir = tmp_path / "locks"
+    lock_dir.mkdir()
+    (lock_dir / "decision_log.lock").write_text(
+        json.dumps({"locked": True, "pid": os.getppid(), "timestamp_epoch": 0})
+    )
+    writer = dl.DecisionLogWriter(batch_size=1, lock_name="decision_log.lock")
+    try:
+        writer.append(_event(1))
+        writer.append(_event(2))
+        assert writer.stats()["owner"] is False
+    finally:
+        writer.close()
+    ok, _head, count = dl.verify_decision_chain(jsonl, full=True)
+    assert ok is True and count == 2
+
+
+def test_non_owner_writers_do_not_fork_the_chain(tmp_path, monkeypatch):
+    jsonl, _db_path = _setup(tmp_path, monkeypatch)
+    lock_dir = tmp_path / "locks"
+    lock_dir.mkdir()
+    (lock_dir / "decision_log.lock").write_text(
+        json.dumps({"locked": True, "pid": os.getppid(), "timestamp_epoch": 0})
+    )
+    writers = [dl.DecisionLogWriter(batch_size=1000, flush_interval_sec=60.0) for _ in range(4)]
+    start = threading.Barrier(len(writers))
+
+    def run(k, writer):
+        start.wait()
+        for i in range(25):
+            writer.append(_event(k * 100 + i))
+
+    threads = [threading.Thread(target=run, args=(k, w)) for k, w in enumerate(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for writer in writers:
+        assert writer.stats()["owner"] is False
+        writer.close()
+    ok, _head, count = dl.verify_decision_chain(jsonl, full=True)
+    assert ok is True and count == 100
+
+
+def test_persistent_flush_failure_surfaces_on_next_append(tmp_path, monkeypatch):
+    _jsonl, db_path = _setup(tmp_path, monkeypatch)
+    writer = dl.DecisionLogWriter(batch_size=100, flush_interval_sec=0.01)
+    monkeypatch.setattr(dl, "_log_decision_error", lambda payload: None)
+
+    def broken(_db_path):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    real_connect = writer._connect
+    monkeypatch.setattr(writer, "_connect", broken)
+    try:
+        writer.append(_event(1))
+        deadline = time.time() + 5.0
+        while writer.stats()["flush_failures"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        stats = writer.stats()
+        assert stats["flush_failures"] >= 1 and stats["last_flush_error"] == "disk I/O error"
+        with pytest.raises(sqlite3.OperationalError):
+            writer.append(_event(2))
+        assert writer.stats()["pending_rows"] == 2
+
+        monkeypatch.setattr(writer, "_connect", real_connect)
+        writer.append(_event(3))
+        stats = writer.stats()
+        assert stats["flush_failures"] == 0 and stats["pending_rows"] == 0
+        assert _db_count(db_path) == 3
+    finally:
+        writer.close()
+
+
+def test_update_execution_sees_pending_row(tmp_path, monkeypatch):
+    _jsonl, db_path = _setup(tmp_path, monkeypatch)
+    writer = dl.DecisionLogWriter(batch_size=100, flush_interval_sec=60.0)
+    monkeypatch.setattr(dl, "decision_log_writer", writer)
+    try:
+        dl.log_decision(_event(1))
+        dl.update_execution("T1", {"risk_allowed": 1})
+        conn = sqlite3.connect(str(db_path))
+        row = conn.execute("SELECT risk_allowed FROM decision_events WHERE trade_id='T1'").fetchone()
+        conn.close()
+        assert row == (1,)
+    finally:
+        writer.close()
+
+
+def test_incremental_verify_only_rehashes_new_events(tmp_path, monkeypatch):
+    jsonl, _db_path = _setup(tmp_path, monkeypatch)
+    writer = dl.DecisionLogWriter(batch_size=100, flush_interval_sec=60.0)
+    try:
+        for i in range(5):
+            writer.append(_event(i))
+        ok, head, count = dl.verify_decision_chain(jsonl)
+        assert ok is True and count == 5
+
+        for i in range(5, 8):
+            writer.append(_event(i))
+    finally:
+        writer.close()
+
+    calls = []
+    real_hash = dl._compute_event_hash
+    monkeypatch.setattr(dl, "_compute_event_hash", lambda e: calls.append(1) or real_hash(e))
+    ok, head, count = dl.verify_decision_chain(jsonl)
+    assert ok is True and count == 8
+    assert len(calls) == 3
+
+    # Tampering inside the checkpointed prefix forces a full pass that fails.
+    lines = jsonl.read_text().splitlines()
+    bad = json.loads(lines[1])
+    bad["symbol"] = "TAMPER"
+    lines[1] = dl._canonical_json(bad)
+    jsonl.write_text("\n".join(lines) + "\n")
+    ok, status, _ = dl.verify_decision_chain(jsonl)
+    assert ok is False
+    assert status == "event_hash_mismatch"
@@ -0,0 +1,121 @@
+import json
+import sqlite3
+
+from core.depth_history import (
+    DepthHistoryStore,
+    decode_depth,
+    encode_depth,
+    iter_depth_history,
+    partition_bounds,
+)
+
+_DAY0 = 1767240000.0  # 2026-01-01 09:30 IST
+
+
+def _book(bid=100.0, ask=100.5, qty=50):
+    return {
+        "buy": [{"price": bid - i * 0.05, "quantity": qty + i, "orders": i + 1} for i in range(5)],
+        "sell": [{"price": ask + i * 0.05, "quantity": qty * 2 + i, "orders": i + 2} for i in range(5)],
+    }
+
+
+def test_encode_decode_roundtrip_is_compact():
+    book = _book()
+    blob = encode_depth(book)
+    assert len(blob) == 200
+    assert decode_depth(blob) == book
+    assert len(blob) < len(json.dumps(book))
+
+
+def test_append_writes_day_partitions_and_reads_in_order(tmp_path):
+    store = DepthHistoryStore(db_path=str(tmp_path / "d.db"), retention_days=0, batch_size=3)
+    for i in range(4):
+        store.append(_DAY0 + i, 11, _book(bid=100 + i))
+    store.append(_DAY0 + 86400, 12, _book())
+    rows = list(store.iter_snapshots(_DAY0 - 10, _DAY0 + 2 * 86400))
+    store.close()
+    assert [r[0] for r in rows] == [_DAY0 + i for i in range(4)] + [_DAY0 + 86400]
+    assert rows[1][2]["buy"][0]["price"] == 101.0
+    assert rows[0][3] < 0  # more ask quantity than bid
+    names = {partition_bounds(_DAY0)[0], partition_bounds(_DAY0 + 86400)[0]}
+    assert names == {"depth_hist_20260101", "depth_hist_20260102"}
+
+
+def test_prune_drops_whole_partitions_outside_retention(tmp_path):
+    store = DepthHistoryStore(db_path=str(tmp_path / "d.db"), retention_days=0)
+    for day in range(5):
+        store.append(_DAY0 + day * 86400, 11, _book())
+    store.flush()
+    store.retention_days = 2
+    dropped = store.prune(now_epoch=_DAY0 + 4 * 86400)
+    remaining = [p[0] for p in store.partitions()]
+    store.close()
+    assert dropped == ["depth_hist_20260101", "depth_hist_20260102"]
+    assert remaining == ["depth_hist_20260103", "depth_hist_20260104", "depth_hist_20260105"]
+
+
+def test_migrate_legacy_depth_snapshots(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE depth_snapshots (timestamp TEXT, instrument_token INTEGER, depth_json TEXT, "
+            "timestamp_iso TEXT, timestamp_epoch REAL)"
+        )
+        for i in range(3):
+            conn.execute(
+                "INSERT INTO depth_snapshots VALUES (?,?,?,?,?)",
+                ("", 7, json.dumps({"depth": _book(), "imbalance": 0.25}), "", (_DAY0 + i) * 1000.0),
+            )
+        conn.execute("INSERT INTO depth_snapshots VALUES (?,?,?,?,?)", ("", 7, "not-json", "", None))
+    store = DepthHistoryStore(db_path=str(db_path), retention_days=0)
+    stats = store.migrate_legacy(chunk_size=2, drop_legacy=True)
+    rows = list(store.iter_snapshots(_DAY0 - 1, _DAY0 + 10))
+    store.close()
+    assert stats == {"migrated": 3, "skipped": 1}
+    assert [r[3] for r in rows] == [0.25, 0.25, 0.25]
+    with sqlite3.connect(db_path) as conn:
+        legacy = conn.execute("SELECT name FROM sqlite_master WHERE name='depth_snapshots'").fetchone()
+    assert legacy is None
+
+
+def test_background_writer_keeps_appends_off_the_caller_thread(tmp_path):
+    store = DepthHistoryStore(
+        db_path=str(tmp_path / "d.db"), retention_days=0, batch_size=100, flush_interval_sec=3600.0, capacity=3
+    )
+    # The queue is bounded and drops the oldest snapshot instead of blocking.
+    for i in range(5):
+        store.append(_DAY0 + i, 11, _book())
+    assert store.stats()["queue_depth"] == 3 and store.stats()["dropped"] == 2
+
+    assert store.start() and not store.start()
+    store.append(_DAY0 + 5, 11, _book())
+    assert store.stats()["written"] == 0  # append never writes on the caller thread
+    store.stop()
+    stats = store.stats()
+    rows = list(store.iter_snapshots(_DAY0 - 1, _DAY0 + 10))
+    store.close()
+    assert not stats["running"] and stats["queue_depth"] == 0
+    assert (stats["written"], stats["dropped"]) == (3, 3)
+    assert [r[0] for r in rows] == [_DAY0 + 3, _DAY0 + 4, _DAY0 + 5]
+
+
+def test_iter_depth_history_opens_read_only(tmp_path):
+    db_path = tmp_path / "d.db"
+    assert list(iter_depth_history(db_path, 0, 2e9)) == []
+    assert not db_path.exists()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE ticks (timestamp_epoch REAL)")
+    # No catalog yet: nothing to read, and nothing gets created.
+    assert list(iter_depth_history(db_path, 0, 2e9)) == []
+    with sqlite3.connect(db_path) as conn:
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+        assert tables == {"ticks"}
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    store = DepthHistoryStore(db_path=str(db_path), retention_days=0)
+    store.append(_DAY0, 11, _book())
+    store.append(_DAY0 + 1, 12, _book())
+    store.close()
+    rows = list(iter_depth_history(db_path, _DAY0 - 1, _DAY0 + 10, tokens=[12]))
+    assert [(r[0], r[1]) for r in rows] == [(_DAY0 + 1, 12)]
+    assert rows[0][2] == _book()
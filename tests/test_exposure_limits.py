@@ -74,7 +74,7 @@ def test_net_delta_limit_blocks_trade(monkeypatch):
     monkeypatch.setattr("config.config.MAX_POSITIONS_PER_UNDERLYING", 10, raising=False)
     monkeypatch.setattr("config.config.MAX_EXPIRY_CONCENTRATION_PCT", 0.99, raising=False)
     monkeypatch.setattr("config.config.MAX_NET_DELTA", 40.0, raising=False)
-    monkeypatch.setattr("config.config.MAX_NET_VEGA", 500.0, raising=False)
+    monkeypatch.setattr("config.config.MAX_NET_VEGA_RUPEES", 300000.0, raising=False)
     monkeypatch.setattr("config.config.EVENT_NET_DELTA_MULT", 0.5, raising=False)
     monkeypatch.setattr("config.config.EVENT_NET_VEGA_MULT", 0.5, raising=False)
 
@@ -100,7 +100,7 @@ def test_event_regime_uses_tighter_delta_limit(monkeypatch):
     monkeypatch.setattr("config.config.MAX_POSITIONS_PER_UNDERLYING", 10, raising=False)
     monkeypatch.setattr("config.config.MAX_EXPIRY_CONCENTRATION_PCT", 0.99, raising=False)
     monkeypatch.setattr("config.config.MAX_NET_DELTA", 40.0, raising=False)
-    monkeypatch.setattr("config.config.MAX_NET_VEGA", 500.0, raising=False)
+    monkeypatch.setattr("config.config.MAX_NET_VEGA_RUPEES", 300000.0, raising=False)
     monkeypatch.setattr("config.config.EVENT_NET_DELTA_MULT", 0.6, raising=False)
     monkeypatch.setattr("config.config.EVENT_NET_VEGA_MULT", 0.6, raising=False)
 
@@ -123,3 +123,22 @@ def test_event_regime_uses_tighter_delta_limit(monkeypatch):
     ok_event, reason_event = RiskEngine().allow_trade(portfolio, regime="EVENT", trade=trade, exposure_state=exposure_state)
     assert ok_event is False
     assert reason_event == "PORTFOLIO_LIMIT:NET_DELTA"
+
+
+def test_legacy_net_vega_override_is_converted_and_warned(monkeypatch, caplog):
+    from config import config as cfg
+    import core.risk_engine as risk_engine
+
+    assert cfg._net_vega_limit_rupees({}) == (75000.0, None)
+    assert cfg._net_vega_limit_rupees({"MAX_NET_VEGA": "120"}) == (120.0 * cfg.NET_VEGA_LEGACY_TO_RUPEES, 120.0)
+    assert cfg._net_vega_limit_rupees({"MAX_NET_VEGA": "120", "MAX_NET_VEGA_RUPEES": "50000"}) == (50000.0, 120.0)
+
+    monkeypatch.setattr("config.config.MAX_NET_VEGA_RUPEES", 75000.0, raising=False)
+    monkeypatch.setattr("config.config.MAX_NET_VEGA_LEGACY_OVERRIDE", 120.0, raising=False)
+    monkeypatch.setattr(risk_engine, "_LEGACY_VEGA_WARNED", False)
+    with caplog.at_level("WARNING", logger="core.risk_engine"):
+        engine = RiskEngine()
+        RiskEngine()
+    assert engine.max_net_vega == 75000.0
+    warnings = [r for r in caplog.records if "MAX_NET_VEGA" in r.getMessage()]
+    assert len(warnings) == 1
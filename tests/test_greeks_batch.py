@@ -0,0 +1,100 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from config import config as cfg
+from core.exposure_ledger import estimate_trade_greeks, estimate_trades_greeks
+from core.greeks import bs_price, chain_greeks, greeks, greeks_batch, implied_vol, implied_vol_batch
+
+
+def _chain(n, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        spot = 25000.0
+        strike = spot + rng.randint(-10, 10) * 50
+        t = rng.randint(2, 45) / 365.0
+        vol = rng.uniform(0.1, 0.45)
+        is_call = rng.random() < 0.5
+        rows.append((bs_price(spot, strike, t, cfg.RISK_FREE_RATE, vol, is_call), spot, strike, t, vol, is_call))
+    return rows
+
+
+def test_batch_iv_recovers_vol_and_matches_scalar():
+    rows = _chain(300)
+    prices, spots, strikes, times, vols, calls = (list(col) for col in zip(*rows))
+    iv = implied_vol_batch(prices, spots, strikes, times, calls)
+    assert iv == pytest.approx(vols, abs=2e-3)
+    scalar = [implied_vol(p, s, k, t, is_call=c) for p, s, k, t, c in zip(prices, spots, strikes, times, calls)]
+    assert iv == pytest.approx(scalar, abs=2e-3)
+
+
+def test_batch_greeks_match_scalar_greeks():
+    rows = _chain(50, seed=9)
+    _, spots, strikes, times, vols, calls = (list(col) for col in zip(*rows))
+    g = greeks_batch(spots, strikes, times, vols, calls)
+    for i, (s, k, t, v, c) in enumerate(zip(spots, strikes, times, vols, calls)):
+        expected = greeks(s, k, t, v, is_call=c)
+        for name in ("delta", "gamma", "theta", "vega"):
+            assert g[name][i] == pytest.approx(expected[name], rel=1e-9, abs=1e-9)
+
+
+def test_batch_handles_invalid_rows_and_scalar_broadcast():
+    out = chain_greeks([0.0, 120.0, 80.0], 25000.0, [25000.0, 25000.0, 25100.0], [7 / 365.0, 0.0, 7 / 365.0], [True, True, False])
+    assert out["iv"][0] == 0.0 and out["iv"][1] == 0.0
+    assert out["delta"][1] == 0.0
+    assert out["iv"][2] > 0
+    assert -1.0 < out["delta"][2] < 0.0
+    assert np.all(np.isfinite(out["theta"]))
+
+
+def test_trade_greeks_batch_uses_model_when_inputs_present():
+    modelled = {
+        "instrument_type": "OPT",
+        "symbol": "NIFTY",
+        "right": "CE",
+        "side": "SELL",
+        "strike": 25000,
+        "underlying_ltp": 25000.0,
+        "expiry": "2099-01-01",
+        "iv": 0.2,
+        "qty_units": 50,
+    }
+    proxy = {"instrument_type": "OPT", "symbol": "NIFTY", "right": "PE", "strike": 25000, "qty_units": 50}
+    batch = estimate_trades_greeks([modelled, proxy])
+    assert batch == [estimate_trade_greeks(modelled), estimate_trade_greeks(proxy)]
+    delta, vega = batch[0]
+    assert -50.0 < delta < -25.0
+    assert vega < 0
+    assert batch[1][0] < 0
+
+
+def test_trade_iv_comes_from_current_option_quote_not_entry():
+    expiry = (datetime.now(timezone.utc).date() + timedelta(days=14)).isoformat()
+    t = 14 / 365.0
+    base = {"instrument_type": "OPT", "symbol": "NIFTY", "right": "CE", "strike": 25000, "expiry": expiry, "qty_units": 50}
+    priced_at_20 = bs_price(25400.0, 25000.0, t, cfg.RISK_FREE_RATE, 0.2, True)
+    held = {**base, "underlying_ltp": 25400.0, "entry_price": 150.0, "opt_ltp": priced_at_20}
+    with_iv = {**base, "underlying_ltp": 25400.0, "iv": 0.2}
+    delta, vega = estimate_trade_greeks(held)
+    expected = greeks(25400.0, 25000.0, t, 0.2, is_call=True)
+    assert delta == pytest.approx(50 * expected["delta"], rel=1e-3)
+    assert vega == pytest.approx(50 * expected["vega"] / 100.0, rel=1e-3)
+    assert estimate_trade_greeks(with_iv) == pytest.approx((delta, vega), rel=1e-3)
+
+    # No quote and no IV: the stale entry price is not solved against the current spot.
+    stale = {**base, "underlying_ltp": 25400.0, "entry_price": 150.0}
+    assert estimate_trade_greeks(stale) != pytest.approx((delta, vega), rel=1e-2)
+
+
+def test_proxy_vega_uses_the_model_unit():
+    expiry = (datetime.now(timezone.utc).date() + timedelta(days=7)).isoformat()
+    atm = {"instrument_type": "OPT", "symbol": "NIFTY", "right": "CE", "strike": 25000, "expiry": expiry, "qty_units": 75}
+    _, modelled = estimate_trade_greeks({**atm, "underlying_ltp": 25000.0, "iv": 0.15})
+    _, proxied = estimate_trade_greeks({**atm, "spot": 25000.0})
+    # No IV and no quote: the proxy. Both paths are rupees per vol point.
+    assert proxied == pytest.approx(modelled, rel=0.05)
+    assert 500.0 < modelled < 2000.0
+    assert modelled < cfg.MAX_NET_VEGA_RUPEES
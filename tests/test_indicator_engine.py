@@ -0,0 +1,89 @@
+import random
+from collections import deque
+
+import pytest
+
+from core.indicators_live import IndicatorEngine, compute_indicators
+from core.ohlc_buffer import OhlcBuffer
+
+_KEYS = ("vwap", "vwap_slope", "atr", "adx", "vol_z")
+_T0 = 1767240000.0
+
+
+def _assert_close(inc, full):
+    assert inc["ok"] == full["ok"]
+    assert inc["last_ts"] == full["last_ts"]
+    for key in _KEYS:
+        if full[key] is None:
+            assert inc[key] is None
+        else:
+            assert inc[key] == pytest.approx(full[key], rel=1e-6, abs=1e-9), key
+
+
+def _stream(buf, symbol, n_bars, ticks_per_bar, seed=7):
+    rng = random.Random(seed)
+    price = 25000.0
+    for bar in range(n_bars):
+        for tick in range(ticks_per_bar):
+            price += rng.gauss(0, 6.0)
+            ts = _T0 + bar * 60 + tick * (60.0 / ticks_per_bar)
+            buf.update_tick(symbol, price, volume=rng.randint(0, 500), ts=ts)
+            yield
+
+
+def test_engine_matches_full_recompute_tick_by_tick():
+    buf = OhlcBuffer()
+    engine = None
+    for _ in _stream(buf, "NIFTY", 120, 4):
+        bars = buf.get_bars("NIFTY")
+        engine = buf.indicator_engine("NIFTY")
+        inc = compute_indicators(bars, engine=engine)
+        _assert_close(inc, compute_indicators(bars))
+    assert engine.snapshot()["ok"] is True
+
+
+def test_engine_tracks_evicting_buffer():
+    buf = OhlcBuffer(max_bars=300)
+    checked = 0
+    for i, _ in enumerate(_stream(buf, "BANKNIFTY", 700, 2, seed=11)):
+        if i < 900 or i % 25:
+            buf.indicator_engine("BANKNIFTY").snapshot()
+            continue
+        bars = buf.get_bars("BANKNIFTY")
+        assert len(bars) == 300
+        _assert_close(buf.indicator_engine("BANKNIFTY").snapshot(), compute_indicators(bars))
+        checked += 1
+    assert checked > 10
+
+
+def test_engine_reseeds_adx_on_eviction_with_short_buffer():
+    # With 120 bars, keeping the Wilder state across evictions drifted ~0.3%.
+    buf = OhlcBuffer(max_bars=120)
+    for i, _ in enumerate(_stream(buf, "NIFTY", 400, 1, seed=3)):
+        engine = buf.indicator_engine("NIFTY")
+        inc = engine.snapshot()
+        if i >= 150 and i % 10 == 0:
+            full = compute_indicators(buf.get_bars("NIFTY"))
+            assert inc["adx"] == pytest.approx(full["adx"], rel=1e-9)
+            _assert_close(inc, full)
+
+
+def test_engine_rebuilds_after_seed_and_returns_cached_result():
+    buf = OhlcBuffer()
+    list(_stream(buf, "SENSEX", 40, 1))
+    engine = buf.indicator_engine("SENSEX")
+    first = engine.snapshot()
+    assert engine.snapshot() == first
+    hist = [
+        {"date": b["ts"].replace(year=2025), "open": b["open"], "high": b["high"] + 5, "low": b["low"], "close": b["close"], "volume": 10}
+        for b in buf.get_bars("SENSEX")
+    ]
+    buf.seed_bars("SENSEX", hist)
+    _assert_close(engine.snapshot(), compute_indicators(buf.get_bars("SENSEX")))
+
+
+def test_engine_ignored_when_bars_do_not_match():
+    bars = deque(maxlen=500)
+    engine = IndicatorEngine(bars)
+    other = [{"ts": i, "open": 1.0, "high": 2.0 + i, "low": 1.0, "close": 1.5 + i, "volume": 1} for i in range(40)]
+    assert compute_indicators(other, engine=engine) == compute_indicators(other)
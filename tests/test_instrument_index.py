@@ -0,0 +1,75 @@
+from datetime import date
+
+from core.instrument_index import InstrumentIndex
+from core.kite_client import KiteClient
+
+
+def _opt(strike, expiry, opt_type="CE", name="NIFTY", segment="NFO-OPT", token=None):
+    return {
+        "name": name,
+        "segment": segment,
+        "tradingsymbol": f"{name}{expiry}{int(strike)}{opt_type}",
+        "expiry": expiry,
+        "strike": float(strike),
+        "instrument_type": opt_type,
+        "instrument_token": token or int(strike) * 10 + (1 if opt_type == "CE" else 2),
+    }
+
+
+def _instruments():
+    rows = []
+    for expiry in ("2030-01-30", "2030-01-23"):
+        for strike in range(21800, 22301, 50):
+            rows.append(_opt(strike, expiry, "CE"))
+            rows.append(_opt(strike, expiry, "PE"))
+    rows.append(_opt(80000, date(2030, 1, 24), "CE", name="SENSEX", segment="BFO-OPT", token=9))
+    return rows
+
+
+def test_index_windows_and_lookups():
+    index = InstrumentIndex(_instruments())
+    assert index.expiries("NIFTY", "NFO-OPT") == [date(2030, 1, 23), date(2030, 1, 30)]
+    window = index.strike_window("NIFTY", "NFO-OPT", date(2030, 1, 23), 21950, 22050)
+    assert sorted({row["strike"] for row in window}) == [21950.0, 22000.0, 22050.0]
+    assert len(window) == 6
+    group = index.group("NIFTY", "NFO-OPT", "2030-01-30T00:00:00")
+    assert sorted({row["strike"] for row in group.nearest(22012, 3)}) == [21950.0, 22000.0, 22050.0]
+    assert index.find_option("NIFTY", "NFO-OPT", 22000, "PE")["expiry"] == "2030-01-23"
+    assert index.find_option("NIFTY", "NFO-OPT", "22000", "PE", expiry="2030-01-30")["expiry"] == "2030-01-30"
+    assert index.find_option("NIFTY", "NFO-OPT", 22025, "PE") is None
+    assert index.token_to_symbol[9] == "SENSEX2030-01-2480000CE"
+
+
+def test_kite_client_methods_served_from_index(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    client = KiteClient()
+    data = _instruments()
+    calls = []
+
+    def fake_cached(exchange=None, ttl_sec=3600):
+        calls.append(exchange)
+        return data
+
+    monkeypatch.setattr(client, "instruments_cached", fake_cached)
+    assert client.instrument_index("NFO") is client.instrument_index("NFO")
+    tokens = client.resolve_option_tokens_window("NIFTY", "2030-01-30", 22000, 1, 50)
+    assert sorted(tokens) == sorted([219501, 219502, 220001, 220002, 220501, 220502])
+    assert len(client.resolve_option_tokens(["NIFTY"], "2030-01-23")) == 22
+    assert client.find_option_symbol_with_expiry("NIFTY", 22100, "CE", "2030-01-30") == "NFO:NIFTY2030-01-3022100CE"
+    assert client.find_option_symbol("SENSEX", 80000, "CE", exchange="BFO") == "BFO:SENSEX2030-01-2480000CE"
+    assert client.token_symbol_map("NFO")[220001] == "NIFTY2030-01-2322000CE"
+
+
+def test_instruments_cache_round_trips_through_pickle(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    rows = [_opt(22000, date(2030, 1, 30))]
+    writer = KiteClient()
+    monkeypatch.setattr(writer, "instruments", lambda exchange=None: rows)
+    assert writer.instruments_cached("NFO") == rows
+    assert (tmp_path / "data" / "kite_instruments.pkl").exists()
+
+    reader = KiteClient()
+    monkeypatch.setattr(reader, "instruments", lambda exchange=None: [])
+    loaded = reader.instruments_cached("NFO")
+    assert loaded == rows
+    assert loaded[0]["expiry"] == date(2030, 1, 30)
@@ -0,0 +1,114 @@
+import threading
+import time
+
+from core.kite_client import KiteClient
+from core.kite_rate_limiter import EndpointLimiter, QuoteCoalescer, TokenBucket
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, sec):
+        self.now += max(sec, 0.0)
+
+
+class _FakeKite:
+    def __init__(self, clock=time.monotonic, delay=0.0):
+        self.clock = clock
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _record(self, endpoint, payload):
+        with self.lock:
+            self.calls.append((endpoint, self.clock(), payload))
+        if self.delay:
+            time.sleep(self.delay)
+
+    def quote(self, keys):
+        self._record("quote", list(keys))
+        return {k: {"last_price": float(len(k))} for k in keys}
+
+    def ltp(self, keys):
+        self._record("ltp", list(keys))
+        return {k: {"last_price": 1.0} for k in keys}
+
+    def historical_data(self, token, from_dt, to_dt, interval):
+        self._record("historical", token)
+        return []
+
+
+def _client(clock=None, kite=None, rates=None):
+    client = KiteClient()
+    client.kite = kite or _FakeKite()
+    if clock is not None:
+        client.limiter = EndpointLimiter(rates=rates, clock=clock, sleep=clock.sleep)
+    return client
+
+
+def test_token_bucket_spaces_calls_at_rate():
+    clock = _FakeClock()
+    bucket = TokenBucket(2.0, burst=1.0, clock=clock, sleep=clock.sleep)
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[0] == 0.0
+    assert all(abs(w - 0.5) < 1e-9 for w in waits[1:])
+    assert abs(clock.now - 1002.0) < 1e-9
+
+
+def test_client_respects_per_endpoint_limits():
+    clock = _FakeClock()
+    kite = _FakeKite(clock=clock)
+    client = _client(clock=clock, kite=kite, rates={"quote": 1.0, "historical": 3.0})
+    for i in range(4):
+        client.quote([f"NFO:OPT{i}"])
+        client.ltp(["NSE:NIFTY 50"])
+    for _ in range(6):
+        client.historical_data(1, None, None)
+    quote_ts = [ts for name, ts, _ in kite.calls if name in ("quote", "ltp")]
+    hist_ts = [ts for name, ts, _ in kite.calls if name == "historical"]
+    assert all(b - a >= 1.0 - 1e-9 for a, b in zip(quote_ts, quote_ts[1:]))
+    assert all(b - a >= 1 / 3.0 - 1e-9 for a, b in zip(hist_ts, hist_ts[1:]))
+    stats = client.api_stats()["endpoints"]
+    assert stats["quote"]["calls"] == 8
+    assert stats["historical"]["calls"] == 6
+
+
+def test_quote_splits_large_requests_into_batches():
+    clock = _FakeClock()
+    kite = _FakeKite(clock=clock)
+    client = _client(clock=clock, kite=kite)
+    keys = [f"NFO:OPT{i}" for i in range(1200)]
+    result = client.quote(keys)
+    assert sorted(result) == sorted(keys)
+    sizes = [len(payload) for name, _, payload in kite.calls if name == "quote"]
+    assert sizes == [500, 500, 200]
+
+
+def test_concurrent_quotes_are_coalesced():
+    kite = _FakeKite(delay=0.01)
+    limiter = EndpointLimiter(rates={"quote": 5.0})
+    coalescer = QuoteCoalescer(fetch=kite.quote, acquire=lambda: limiter.acquire("quote"))
+    results = {}
+    start = threading.Barrier(8)
+
+    def worker(i):
+        keys = [f"NFO:OPT{i}", f"NFO:OPT{i + 1}", "NSE:NIFTY 50"]
+        start.wait()
+        results[i] = (keys, coalescer.request(keys))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    assert len(results) == 8
+    for keys, got in results.values():
+        assert sorted(got) == sorted(keys)
+    stats = coalescer.stats()
+    assert stats["requests"] == 8
+    assert stats["calls"] == len(kite.calls) <= 3
+    assert stats["coalesced"] >= 5
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from config import config as cfg
+from core import market_data
+
+
+def _fake_symbol_fetch(delays):
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _fetch(symbol, shock, timer):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(delays[symbol])
+        timer.mark("ltp")
+        timer.mark("option_chain")
+        with lock:
+            active["now"] -= 1
+        return [{"symbol": symbol, "instrument": "OPT"}, {"symbol": symbol, "instrument": "FUT"}]
+
+    return _fetch, active
+
+
+def test_pipeline_preserves_symbol_order_and_runs_concurrently(monkeypatch):
+    symbols = ["NIFTY", "BANKNIFTY", "SENSEX", "FINNIFTY"]
+    delays = {"NIFTY": 0.12, "BANKNIFTY": 0.02, "SENSEX": 0.08, "FINNIFTY": 0.01}
+    fetch, active = _fake_symbol_fetch(delays)
+    monkeypatch.setattr(market_data, "_fetch_symbol_market_data", fetch)
+    monkeypatch.setattr(cfg, "MARKET_DATA_WORKERS", 4, raising=False)
+
+    started = time.perf_counter()
+    out = market_data._run_symbol_pipeline(symbols, {})
+    elapsed = time.perf_counter() - started
+
+    assert [rows[0]["symbol"] for rows in out] == symbols
+    assert elapsed < sum(delays.values())
+    assert active["peak"] > 1
+
+    timings = market_data.last_cycle_timings()
+    assert timings["workers"] == 4
+    assert list(timings["symbols"]) == symbols
+    assert set(timings["symbols"]["NIFTY"]["stages_ms"]) == {"ltp", "option_chain"}
+    assert timings["symbols"]["NIFTY"]["total_ms"] >= 100.0
+
+
+def test_pipeline_sequential_when_single_worker(monkeypatch):
+    symbols = ["NIFTY", "BANKNIFTY"]
+    fetch, active = _fake_symbol_fetch({"NIFTY": 0.01, "BANKNIFTY": 0.01})
+    monkeypatch.setattr(market_data, "_fetch_symbol_market_data", fetch)
+    monkeypatch.setattr(cfg, "MARKET_DATA_WORKERS", 1, raising=False)
+
+    out = market_data._run_symbol_pipeline(symbols, {})
+
+    assert [rows[0]["symbol"] for rows in out] == symbols
+    assert active["peak"] == 1
+    assert market_data.last_cycle_timings()["workers"] == 1
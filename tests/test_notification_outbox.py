@@ -0,0 +1,187 @@
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from config import config as cfg
+from core import telegram_alerts
+from core.notification_outbox import NotificationOutbox, SendResult
+
+
+class _StubTelegram:
+    def __init__(self):
+        self.texts = []
+        self.statuses = []
+        self.delay_sec = 0.0
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+                if stub.delay_sec:
+                    time.sleep(stub.delay_sec)
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                if status == 200:
+                    stub.texts.append(parse_qs(body)["text"][0])
+                    payload = {"ok": True}
+                else:
+                    payload = {"ok": False, "parameters": {"retry_after": 0}}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = _StubTelegram()
+    monkeypatch.setattr(cfg, "TELEGRAM_API_BASE", server.base, raising=False)
+    monkeypatch.setattr(cfg, "TELEGRAM_BOT_TOKEN", "x", raising=False)
+    monkeypatch.setattr(cfg, "TELEGRAM_CHAT_ID", "y", raising=False)
+    monkeypatch.setattr(cfg, "TELEGRAM_TIMEOUT_SEC", 2.0, raising=False)
+    yield server
+    server.close()
+
+
+def _outbox(tmp_path, **kwargs):
+    kwargs.setdefault("coalesce_sec", 0.0)
+    return NotificationOutbox(sender=telegram_alerts._deliver, db_path=str(tmp_path / "outbox.sqlite"), **kwargs)
+
+
+def _statuses(tmp_path):
+    with sqlite3.connect(tmp_path / "outbox.sqlite") as conn:
+        return [row[0] for row in conn.execute("SELECT status FROM notification_outbox ORDER BY id")]
+
+
+def test_outbox_enqueue_returns_without_waiting_on_http(tmp_path, stub):
+    stub.delay_sec = 0.3
+    outbox = _outbox(tmp_path)
+    try:
+        started = time.perf_counter()
+        assert outbox.enqueue("first") is True
+        elapsed = time.perf_counter() - started
+        assert elapsed < 0.05
+        assert outbox.flush(timeout=5.0) is True
+    finally:
+        outbox.stop()
+    assert stub.texts == ["first"]
+    assert _statuses(tmp_path) == ["sent"]
+
+
+def test_outbox_rate_limits_per_key_and_notes_suppressed(tmp_path, stub):
+    outbox = _outbox(tmp_path)
+    try:
+        assert outbox.enqueue("spike 101", key="imb:101", min_interval_sec=0.3) is True
+        assert outbox.enqueue("spike 101", key="imb:101", min_interval_sec=0.3) is False
+        assert outbox.enqueue("spike 101", key="imb:101", min_interval_sec=0.3) is False
+        assert outbox.enqueue("spike 202", key="imb:202", min_interval_sec=0.3) is True
+        assert outbox.flush(timeout=5.0) is True
+        time.sleep(0.35)
+        assert outbox.enqueue("spike 101 again", key="imb:101", min_interval_sec=0.3) is True
+        assert outbox.flush(timeout=5.0) is True
+    finally:
+        outbox.stop()
+    stats = outbox.stats()
+    assert stats["suppressed"] == 2
+    assert "spike 101 again (+2 suppressed)" in "\n".join(stub.texts)
+
+
+def test_outbox_coalesces_burst_into_digest(tmp_path, stub):
+    outbox = _outbox(tmp_path, coalesce_sec=0.2)
+    try:
+        for i in range(5):
+            outbox.enqueue(f"alert {i}")
+        time.sleep(0.5)
+        assert outbox.flush(timeout=5.0) is True
+    finally:
+        outbox.stop()
+    assert len(stub.texts) == 1
+    assert stub.texts[0].startswith("5 alerts:")
+    assert "- alert 4" in stub.texts[0]
+    assert outbox.stats()["digests"] == 1
+    assert _statuses(tmp_path) == ["sent"] * 5
+
+
+def test_outbox_retries_then_delivers(tmp_path, stub):
+    stub.statuses = [500, 429]
+    outbox = _outbox(tmp_path, backoff_sec=0.05, max_attempts=5)
+    try:
+        outbox.enqueue("retry me")
+        deadline = time.time() + 5.0
+        while not stub.texts and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        outbox.stop()
+    assert stub.texts == ["retry me"]
+    assert outbox.stats()["retries"] == 2
+    assert _statuses(tmp_path) == ["sent"]
+
+
+def test_outbox_gives_up_after_max_attempts_and_resumes_pending(tmp_path, stub):
+    stub.statuses = [400]
+    outbox = _outbox(tmp_path)
+    try:
+        outbox.enqueue("bad request")
+        assert outbox.flush(timeout=5.0) is True
+    finally:
+        outbox.stop()
+    assert outbox.stats()["failed_rows"] == 1
+    assert _statuses(tmp_path) == ["failed"]
+
+    calls = []
+    down = NotificationOutbox(
+        sender=lambda text: calls.append(text) or SendResult(False, error="down"),
+        db_path=str(tmp_path / "outbox.sqlite"),
+        coalesce_sec=0.0,
+        backoff_sec=60.0,
+    )
+    down.enqueue("kept for later")
+    assert down.flush(timeout=5.0) is True
+    down.stop()
+    assert calls == ["kept for later"]
+    assert _statuses(tmp_path) == ["failed", "pending"]
+
+    with sqlite3.connect(tmp_path / "outbox.sqlite") as conn:
+        conn.execute("UPDATE notification_outbox SET next_attempt_epoch=0 WHERE status='pending'")
+    outbox = _outbox(tmp_path)
+    try:
+        outbox.start()
+        deadline = time.time() + 5.0
+        while not stub.texts and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        outbox.stop()
+    assert stub.texts == ["kept for later"]
+
+
+def test_send_telegram_message_enqueues_on_outbox(tmp_path, stub, monkeypatch):
+    outbox = _outbox(tmp_path)
+    monkeypatch.setattr(telegram_alerts, "telegram_outbox", outbox)
+    monkeypatch.setattr(cfg, "ENABLE_TELEGRAM", True, raising=False)
+    monkeypatch.setattr(cfg, "TELEGRAM_ALLOW_NON_TRADE_ALERTS", True, raising=False)
+    monkeypatch.setattr(cfg, "TELEGRAM_OUTBOX_ENABLE", True, raising=False)
+    try:
+        assert telegram_alerts.send_telegram_message("halt", key="halt", min_interval_sec=60) is True
+        assert telegram_alerts.send_telegram_message("halt", key="halt", min_interval_sec=60) is False
+        assert outbox.flush(timeout=5.0) is True
+    finally:
+        outbox.stop()
+    assert stub.texts == ["halt"]
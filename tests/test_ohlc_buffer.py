@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from core.ohlc_buffer import ColumnarBars, OhlcBuffer
+
+_T0 = 1767240000.0
+
+
+def test_update_tick_builds_minute_bars_in_place():
+    buf = OhlcBuffer(max_bars=10)
+    for i, price in enumerate([100.0, 103.0, 98.0, 101.0]):
+        buf.update_tick("NIFTY", price, volume=5, ts=_T0 + i * 10)
+    buf.update_tick("NIFTY", 102.0, volume=1, ts=_T0 + 60)
+    bars = buf.get_bars("NIFTY")
+    assert len(bars) == 2
+    first = bars[0]
+    assert (first["open"], first["high"], first["low"], first["close"], first["volume"]) == (100.0, 103.0, 98.0, 101.0, 20)
+    assert first["ts"].timestamp() == _T0
+    assert bars[-1]["close"] == 102.0
+    assert [b["close"] for b in bars[:1]] == [101.0]
+    assert buf.last_ts("NIFTY") == bars[-1]["ts"]
+
+
+def test_ring_evicts_oldest_and_window_stays_contiguous():
+    buf = OhlcBuffer(max_bars=5)
+    for i in range(23):
+        buf.update_tick("BANKNIFTY", 100.0 + i, volume=1, ts=_T0 + i * 60)
+    store = buf._bars["BANKNIFTY"]
+    assert len(store) == 5
+    assert [b["close"] for b in buf.get_bars("BANKNIFTY")] == [118.0, 119.0, 120.0, 121.0, 122.0]
+    view = buf.window("BANKNIFTY", 3)
+    assert view["close"].tolist() == [120.0, 121.0, 122.0]
+    assert np.shares_memory(view["close"], store._cols["close"])
+    with pytest.raises(ValueError):
+        view["close"][0] = 0.0
+
+
+def test_bar_window_held_across_eviction_and_compaction():
+    buf = OhlcBuffer(max_bars=3)
+    for i in range(3):
+        buf.update_tick("NIFTY", 100.0 + i, volume=1, ts=_T0 + i * 60)
+    held = buf.get_bars("NIFTY")
+    # Evicts the oldest bar, then forces the store to move rows back to the start.
+    for i in range(3, 7):
+        buf.update_tick("NIFTY", 100.0 + i, volume=1, ts=_T0 + i * 60)
+    buf.update_tick("NIFTY", 999.0, volume=1, ts=_T0 + 6 * 60 + 5)
+    assert [b["close"] for b in held] == [100.0, 101.0, 102.0]
+    assert held[0]["ts"].timestamp() == _T0 and held[-1]["high"] == 102.0
+    assert [b["close"] for b in buf.get_bars("NIFTY")] == [104.0, 105.0, 999.0]
+
+
+def test_window_and_adapter_for_unknown_symbol():
+    buf = OhlcBuffer()
+    assert buf.get_bars("MISSING") == []
+    assert buf.window("MISSING", 10)["close"].size == 0
+    assert buf.last_ts("MISSING") is None
+
+
+def test_seed_bars_keeps_missing_prices_as_none():
+    store = ColumnarBars(capacity=4)
+    buf = OhlcBuffer(max_bars=4)
+    buf._bars["SENSEX"] = store
+    buf.seed_bars(
+        "SENSEX",
+        [
+            {"date": datetime(2026, 1, 1, 9, 15), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 7},
+            {"date": datetime(2026, 1, 1, 9, 16), "open": None, "high": None, "low": None, "close": 1.6},
+        ],
+    )
+    bars = buf.get_bars("SENSEX")
+    assert bars[0]["volume"] == 7
+    assert bars[1]["open"] is None and bars[1]["close"] == 1.6 and bars[1]["volume"] == 0
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from core.option_chain_frame import OptionChainFrame
+
+
+def _chain():
+    return [
+        {"type": "CE", "strike": 100, "instrument_token": 1, "iv": 0.2, "moneyness": 0, "oi_change": 10, "bid_qty": 5},
+        {"type": "PE", "strike": 100, "instrument_token": 2, "iv": 0.3, "moneyness": 0, "oi_change": -4, "ask_qty": 7},
+        {"type": "CE", "strike": 150, "instrument_token": 3, "iv": None, "moneyness": -0.1, "oi_change": None},
+        {"type": "PE", "strike": 150, "instrument_token": 1, "iv": 0.5},
+    ]
+
+
+def test_frame_is_a_list_of_the_original_rows():
+    rows = _chain()
+    frame = OptionChainFrame(rows)
+    assert frame == rows
+    assert frame[0] is rows[0]
+    assert OptionChainFrame.of(frame) is frame
+
+
+def test_indexes_return_first_match_like_a_linear_scan():
+    frame = OptionChainFrame(_chain())
+    assert frame.index_of_token(1) == 0
+    assert frame.by_token(3)["strike"] == 150
+    assert frame.by_token(99) is None
+    assert frame.find(150.0, "PE") is frame[3]
+    assert frame.index_of(200, "CE") is None
+
+
+def test_aggregates_match_list_scans():
+    rows = _chain()
+    frame = OptionChainFrame(rows)
+    ivs = [c["iv"] for c in rows if c.get("iv") is not None]
+    assert frame.iv_mean() == sum(ivs) / len(ivs)
+    assert frame.iv_mean("PE") == pytest.approx(0.4)
+    # Missing moneyness reads as ATM, so the last put (iv 0.5) wins.
+    assert frame.atm_iv_skew() == pytest.approx(-0.3)
+    assert frame.sum_of("oi_change", "CE") == 10
+    assert frame.sum_of("bid_qty") == 5 and frame.sum_of("ask_qty") == 7
+    assert frame.skew_curvature() is None
+
+
+def test_writes_and_list_mutations_refresh_cached_columns():
+    frame = OptionChainFrame(_chain())
+    assert frame.iv_mean("CE") == 0.2
+    frame.set_column("iv", [0.4, 0.3, 0.6, 0.5])
+    assert frame.iv_mean("CE") == pytest.approx(0.5)
+    assert frame[2]["iv"] == 0.6
+
+    frame[0]["instrument_token"] = 8
+    frame.invalidate("instrument_token")
+    assert frame.index_of_token(1) == 3
+
+    frame.append({"type": "CE", "strike": 200, "instrument_token": 9, "iv": 0.1})
+    assert frame.by_token(9)["strike"] == 200
+    assert frame.num("iv").shape == (5,)
+
+
+def test_pickle_keeps_rows_and_rebuilds_caches():
+    frame = OptionChainFrame(_chain())
+    frame.num("iv")
+    clone = pickle.loads(pickle.dumps(frame))
+    assert isinstance(clone, OptionChainFrame)
+    assert clone == frame
+    assert clone.find(100, "PE")["instrument_token"] == 2
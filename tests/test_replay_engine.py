@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from config import config as cfg
+from core.depth_history import DepthHistoryStore
+from core.replay_engine import (
+    DEPTH_EVENT,
+    TICK_EVENT,
+    ReplayEngine,
+    build_token_map,
+    iter_replay_events,
+    parse_decision_interval,
+)
+
+DATE = "2026-01-05"
+OPEN = datetime(2026, 1, 5, 9, 15, tzinfo=timezone(timedelta(hours=5, minutes=30))).timestamp()
+TOKEN = 256265
+
+
+def _ticks_db(path, ticks):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE ticks (timestamp_epoch REAL, timestamp TEXT, instrument_token INTEGER, last_price REAL, volume INTEGER)"
+    )
+    conn.executemany("INSERT INTO ticks VALUES (?,?,?,?,?)", [(ts, None, tok, px, 1) for ts, tok, px in ticks])
+    conn.commit()
+    return conn
+
+
+def _book(bid_qty, ask_qty):
+    return {"buy": [{"price": 99.0, "quantity": bid_qty, "orders": 1}], "sell": [{"price": 101.0, "quantity": ask_qty, "orders": 1}]}
+
+
+def test_events_merge_in_time_order_with_depth_first(tmp_path):
+    db = tmp_path / "t.db"
+    _ticks_db(db, [(OPEN + 2, TOKEN, 100.0), (OPEN, TOKEN, 99.0), (OPEN + 1, 999, 5.0)]).close()
+    store = DepthHistoryStore(db_path=str(db), retention_days=0)
+    store.append(OPEN, TOKEN, _book(300, 100))
+    store.append(OPEN + 1.5, TOKEN, _book(100, 300))
+    store.close()
+
+    conn = sqlite3.connect(db)
+    events = list(iter_replay_events(conn, OPEN - 10, OPEN + 10, tokens=[TOKEN], chunk_rows=2))
+    assert [(e[0] - OPEN, e[1]) for e in events] == [(0, DEPTH_EVENT), (0, TICK_EVENT), (1.5, DEPTH_EVENT), (2, TICK_EVENT)]
+    assert events[0][3] == pytest.approx(0.5) and events[1][3] == 99.0
+    assert len(list(iter_replay_events(conn, OPEN - 10, OPEN + 10))) == 5
+
+
+def test_legacy_depth_json_is_decoded_in_sqlite(tmp_path):
+    conn = _ticks_db(tmp_path / "legacy.db", [(OPEN + 1, TOKEN, 100.0)])
+    conn.execute("CREATE TABLE depth_snapshots (timestamp_epoch REAL, instrument_token INTEGER, depth_json TEXT)")
+    conn.executemany(
+        "INSERT INTO depth_snapshots VALUES (?,?,?)",
+        [(OPEN, TOKEN, json.dumps({"imbalance": 0.25})), (OPEN + 0.5, TOKEN, "not json")],
+    )
+    values = [(e[1], e[3]) for e in iter_replay_events(conn, OPEN - 1, OPEN + 5)]
+    assert values == [(DEPTH_EVENT, 0.25), (DEPTH_EVENT, None), (TICK_EVENT, 100.0)]
+
+
+def test_decision_interval_and_token_map():
+    assert parse_decision_interval(None) == "tick"
+    assert parse_decision_interval("bar") == "bar"
+    assert parse_decision_interval("250ms") == 0.25
+    assert parse_decision_interval(5) == 5.0
+    with pytest.raises(ValueError):
+        parse_decision_interval("soon")
+    inst = {
+        1: {"name": "NIFTY 50", "tradingsymbol": "NIFTY 50"},
+        2: {"name": "NIFTYNXT50", "tradingsymbol": "NIFTYNXT50"},
+        3: {"name": "BANKNIFTY", "tradingsymbol": "BANKNIFTY26JANFUT"},
+    }
+    assert build_token_map(inst, ["nifty", "NIFTYNXT50"]) == {1: "NIFTY", 2: "NIFTYNXT50"}
+
+
+def _session(tmp_path, seconds=180, step=5):
+    db = tmp_path / "session.db"
+    ticks = [(OPEN + i, TOKEN, 25000.0 + (i % 7)) for i in range(0, seconds, step)]
+    _ticks_db(db, ticks).close()
+    return db, ticks
+
+
+def test_replay_day_on_bar_close_and_intervals(tmp_path):
+    db, ticks = _session(tmp_path)
+    before = (cfg.EXECUTION_MODE, getattr(cfg, "REQUIRE_CROSS_ASSET", None))
+    engine = ReplayEngine(db_path=db, token_map={TOKEN: "NIFTY"})
+
+    out = engine.replay_day(DATE, ["NIFTY"], decision_interval="bar", out_path=tmp_path / "bar.jsonl")
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    # One decision per minute bar, on that bar's last tick.
+    assert [r["ts_epoch"] - OPEN for r in rows] == [55, 115, 175]
+    assert [r["trace_id"] for r in rows] == [f"replay-{DATE}-NIFTY-{i}" for i in range(3)]
+    assert engine.stats["ticks"] == len(ticks) and engine.stats["decisions"] == 3
+    assert engine.clock.time() == ticks[-1][0]
+
+    engine.replay_day(DATE, ["NIFTY"], decision_interval="20s", out_path=tmp_path / "20s.jsonl")
+    assert engine.stats["decisions"] == 9
+    engine.replay_day(DATE, ["NIFTY"], out_path=tmp_path / "tick.jsonl")
+    assert engine.stats["decisions"] == len(ticks)
+    assert (cfg.EXECUTION_MODE, getattr(cfg, "REQUIRE_CROSS_ASSET", None)) == before
+
+
+def test_replay_overrides_reach_components_not_the_config_module(tmp_path):
+    db, _ = _session(tmp_path, seconds=60)
+    module_mode = cfg.EXECUTION_MODE
+    engine = ReplayEngine(
+        db_path=db,
+        token_map={TOKEN: "NIFTY"},
+        overrides={"EXECUTION_MODE": "REPLAY_TEST", "REPLAY_ONLY_FLAG": True},
+    )
+    view = engine.config
+    assert view.EXECUTION_MODE == "REPLAY_TEST" and view.REQUIRE_CROSS_ASSET is False
+    for component in (
+        engine.trade_builder,
+        engine.gatekeeper,
+        engine.risk_engine,
+        engine.risk_engine.position_sizer,
+        engine.exec_guard,
+    ):
+        assert component.cfg is view
+
+    seen = []
+    evaluate = engine.gatekeeper.evaluate
+
+    def _spy(market_data, mode="MAIN"):
+        # Code reading the module (other threads included) sees the live values.
+        seen.append((engine.gatekeeper.cfg.EXECUTION_MODE, cfg.EXECUTION_MODE, hasattr(cfg, "REPLAY_ONLY_FLAG")))
+        if len(seen) > 2:
+            raise RuntimeError("boom")
+        return evaluate(market_data, mode=mode)
+
+    engine.gatekeeper.evaluate = _spy
+    with pytest.raises(RuntimeError):
+        engine.replay_day(DATE, ["NIFTY"], out_path=tmp_path / "tick.jsonl")
+    assert len(seen) == 3 and set(seen) == {("REPLAY_TEST", module_mode, False)}
+    assert cfg.EXECUTION_MODE == module_mode and not hasattr(cfg, "REPLAY_ONLY_FLAG")
+
+
+def test_token_filtered_stream_is_a_merge_not_a_sort(tmp_path):
+    from core import db_indexes
+    from core.replay_engine import _depth_arms, _token_filter
+
+    conn = _ticks_db(tmp_path / "plan.db", [(OPEN + i, i % 3, 1.0) for i in range(100)])
+    db_indexes.ensure_indexes(conn, ("ticks",))
+    conn.execute("ANALYZE")
+    store = DepthHistoryStore(db_path=str(tmp_path / "plan.db"), retention_days=0)
+    store.append(OPEN, 1, _book(1, 1))
+    store.close()
+    token_sql, token_params = _token_filter([1, 2])
+    arms = _depth_arms(conn, {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}, OPEN, OPEN + 100)
+    arms.append("SELECT timestamp_epoch AS ts, 1 AS kind, instrument_token AS token, last_price AS value, "
+                "volume AS volume FROM ticks WHERE timestamp_epoch >= ? AND timestamp_epoch < ?{tokens}")
+    sql = " UNION ALL ".join(a.format(tokens=token_sql) for a in arms) + " ORDER BY ts, kind"
+    plan = db_indexes.query_plan(conn, sql, [OPEN, OPEN + 100, *token_params] * 2)
+    assert plan[0] == "MERGE (UNION ALL)"
+    assert any("idx_ticks_epoch" in line for line in plan)
+    assert not any(line == "USE TEMP B-TREE FOR ORDER BY" for line in plan)
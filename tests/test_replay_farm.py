@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from core.replay_engine import _date_bounds
+from core.replay_farm import date_range, run_replay_farm, summarize_decisions
+
+TOKENS = {256265: "NIFTY", 260105: "BANKNIFTY"}
+
+
+def _farm_db(path, dates, seconds=300, step=5):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE ticks (timestamp_epoch REAL, timestamp TEXT, instrument_token INTEGER, last_price REAL, volume INTEGER)"
+    )
+    for day in dates:
+        open_epoch = _date_bounds(day)[0]
+        for token, base in ((256265, 25000.0), (260105, 52000.0)):
+            conn.executemany(
+                "INSERT INTO ticks VALUES (?,?,?,?,?)",
+                [(open_epoch + i, None, token, base + (i % 11), 1) for i in range(0, seconds, step)],
+            )
+    conn.commit()
+    conn.close()
+
+
+def test_summarize_decisions_scores_hypothetical_trades(tmp_path):
+    trade = {"symbol": "NIFTY", "side": "BUY", "option_type": "CE", "entry_price": 100.0, "stop_loss": 90.0,
+             "target": 110.0, "qty": 1}
+    rows = [
+        {"regime": "TREND", "ltp": 25000.0, "gatekeeper_allowed": True, "trade": trade,
+         "risk_allowed": True, "exec_guard_allowed": True},
+        {"regime": "TREND", "ltp": 25010.0, "gatekeeper_allowed": False, "gatekeeper_reasons": ["low_adx"]},
+        # +30 underlying at delta 0.5 lifts the premium to 115: target.
+        {"regime": "RANGE", "ltp": 25030.0, "gatekeeper_allowed": True, "trade": {**trade, "option_type": "PE"},
+         "risk_allowed": True, "exec_guard_allowed": True},
+        # The PE loses 0.5 per point: 25050 puts it at 90, the stop.
+        {"regime": "RANGE", "ltp": 25050.0, "gatekeeper_allowed": True, "trade": None},
+    ]
+    path = tmp_path / "d.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+
+    s = summarize_decisions(path)
+    assert (s["decisions"], s["gate_pass"], s["trades"], s["placed"]) == (4, 3, 2, 2)
+    assert s["block_reasons"] == {"low_adx": 1}
+    assert s["outcomes"] == {"TARGET": 1, "STOP": 1}
+    assert s["by_regime"]["TREND"]["decisions"] == 2 and s["by_regime"]["RANGE"]["gate_pass"] == 2
+    assert s["by_regime"]["TREND"]["pnl"] == pytest.approx(-s["by_regime"]["RANGE"]["pnl"])
+
+
+def test_replay_farm_shards_and_resumes(tmp_path):
+    dates = ["2026-01-05", "2026-01-06"]
+    db = tmp_path / "trades.db"
+    _farm_db(db, dates)
+    assert date_range("2026-01-02", "2026-01-06") == ["2026-01-02", "2026-01-05", "2026-01-06"]
+
+    out = tmp_path / "farm"
+    events = []
+
+    def stop_after_first(event):
+        events.append(event)
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        run_replay_farm("2026-01-02", "2026-01-06", ["nifty", "BANKNIFTY"], out, db_path=db,
+                        decision_interval="bar", workers=1, token_map=TOKENS, progress=stop_after_first)
+    assert events[0]["shard"] == "2026-01-05_BANKNIFTY" and events[0]["decisions"] == 5
+    assert (out / "snapshot.db").exists()
+
+    summary = run_replay_farm("2026-01-02", "2026-01-06", ["NIFTY", "BANKNIFTY"], out, db_path=db,
+                              decision_interval="bar", workers=1, token_map=TOKENS, progress=events.append)
+    # 2026-01-02 has no ticks, so there are four shards; one came from the checkpoint.
+    assert summary["shards_total"] == 4 and summary["shards_resumed"] == 1
+    assert [e["shard"] for e in events[1:]] == ["2026-01-05_NIFTY", "2026-01-06_BANKNIFTY", "2026-01-06_NIFTY"]
+    assert summary["decisions"] == 20 and not summary["failed_shards"]
+    assert sum(row["decisions"] for row in summary["by_regime"].values()) == 20
+    assert set(summary["by_date"]) == set(dates) and summary["by_symbol"]["NIFTY"]["decisions"] == 10
+    assert json.loads((out / "summary.json").read_text())["decisions"] == 20
+    serial = {p.name: p.read_text() for p in (out / "shards").glob("*.jsonl")}
+    assert len(serial) == 4
+
+    parallel = run_replay_farm("2026-01-05", "2026-01-06", ["NIFTY", "BANKNIFTY"], tmp_path / "par", db_path=db,
+                               decision_interval="bar", workers=2, token_map=TOKENS, snapshot=False,
+                               progress=lambda e: None)
+    assert parallel["workers"] == 2 and parallel["decisions"] == 20
+    assert {p.name: p.read_text() for p in (tmp_path / "par" / "shards").glob("*.jsonl")} == serial
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from core.clock import WALL_CLOCK, SimClock
+from core.execution_engine import ExecutionEngine
+from core.execution_router import ExecutionRouter
+from core.fill_model import FillModel
+from core.paper_fill_simulator import PaperFillSimulator
+
+T0 = 1_767_000_000.0
+
+
+class DummyTrade:
+    def __init__(self, side="BUY", trade_id="T-CLK-1", run_id="RUN-CLK", qty=1):
+        self.side = side
+        self.trade_id = trade_id
+        self.run_id = run_id
+        self.symbol = "NIFTY"
+        self.qty = qty
+
+
+def _stream(quotes):
+    it = iter(quotes)
+    return lambda: next(it, None) or dict(quotes[-1])
+
+
+def test_paper_timeout_runs_in_virtual_time():
+    clock = SimClock(start=T0)
+    sim = PaperFillSimulator(timeout_sec=600.0, poll_sec=0.25, clock=clock)
+    started = time.perf_counter()
+    filled, _, report = sim.simulate(DummyTrade(), 100.0, _stream([{"bid": 98, "ask": 105, "ts": T0}]))
+    assert time.perf_counter() - started < 1.0
+    assert filled is False and report["reason_if_aborted"] == "timeout"
+    assert clock.time() > T0 + 600.0
+
+
+def test_paper_time_to_fill_follows_snapshot_timestamps():
+    clock = SimClock(start=T0)
+    sim = PaperFillSimulator(timeout_sec=5.0, poll_sec=0.25, clock=clock)
+    quotes = [{"bid": 98, "ask": 102, "ts": T0}, {"bid": 98, "ask": 101, "ts": T0 + 1.5}, {"bid": 99, "ask": 100, "ts": T0 + 2.0}]
+    filled, price, report = sim.simulate(DummyTrade(), 100.0, quotes, reprice_pct=0.0, max_quote_age_sec=2.0)
+    assert filled is True and price == 100
+    assert report["time_to_fill"] == 2.0
+
+
+def _engine_fill(fill_prob):
+    quotes = [
+        {"bid": 100.0, "ask": 101.0, "ts": T0},
+        {"bid": 100.0, "ask": 100.5, "ts": T0 + 0.5},
+        {"bid": 99.0, "ask": 99.5, "ts": T0 + 1.0},
+    ]
+    clock = SimClock(start=T0)
+    filled, price, report = ExecutionEngine(clock=clock).simulate_limit_fill(
+        DummyTrade(), 100.0, snapshot_fn=_stream(quotes), timeout_sec=30.0, poll_sec=0.25,
+        spread_widen_pct=1.0, max_spread_pct=1.0, max_quote_age_sec=1.0, fill_prob=fill_prob,
+    )
+    return filled, price, report["reason_if_aborted"], report["latency_ms"], clock.time()
+
+
+def test_engine_fills_are_deterministic_in_virtual_time():
+    assert _engine_fill(0.9) == _engine_fill(0.9)
+    filled, price, _, latency_ms, end = _engine_fill(0.9)
+    assert filled is True and price == 99.5
+    assert end == pytest.approx(T0 + 1.0 + latency_ms / 1000.0)
+
+    # A rejected draw keeps polling the last quote until it ages out.
+    filled, _, reason, _, end = _engine_fill(0.5)
+    assert filled is False and reason == "stale_quote"
+    assert end > T0 + 2.0
+
+
+def test_fill_model_only_advances_simulated_clocks():
+    order = {"side": "BUY", "symbol": "NIFTY", "qty": 1, "limit_price": 101.0}
+    snap = {"bid": 100.0, "ask": 100.5, "ask_qty": 50}
+    clock = SimClock(start=T0)
+    res = FillModel(clock=clock).simulate(order, snap, run_id="R")
+    assert res["status"] == "FILLED"
+    assert clock.time() == T0 + res["latency_ms"] / 1000.0
+    assert FillModel().clock is WALL_CLOCK
+
+
+def test_router_shares_one_clock():
+    clock = SimClock(start=T0)
+    router = ExecutionRouter(clock=clock)
+    assert router.engine.clock is clock
+    assert router.engine.fill_model.clock is clock
+    assert router.paper_sim.clock is clock
+    assert ExecutionRouter().paper_sim.clock is WALL_CLOCK
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import time
+
+from core.snapshot_publisher import SnapshotPublisher, read_snapshot, suppressed
+
+
+def test_publishes_within_debounce_are_one_merged_write(tmp_path):
+    path = tmp_path / "option_chain_latest.json"
+    path.write_text(json.dumps({"BANKNIFTY": [{"strike": 1}]}))
+    publisher = SnapshotPublisher(path, debounce_sec=0.2, enabled=True)
+    try:
+        publisher.publish("NIFTY", [{"strike": 100}])
+        publisher.publish("NIFTY", [{"strike": 150}])
+        publisher.publish("SENSEX", [{"strike": 200}])
+        assert json.loads(path.read_text()) == {"BANKNIFTY": [{"strike": 1}]}
+        assert publisher.flush(timeout=2.0)
+        assert json.loads(path.read_text()) == {
+            "BANKNIFTY": [{"strike": 1}],
+            "NIFTY": [{"strike": 150}],
+            "SENSEX": [{"strike": 200}],
+        }
+        assert publisher.stats()["writes"] == 1
+        assert publisher.latest("NIFTY") == [{"strike": 150}]
+        assert not list(tmp_path.glob("*.tmp"))
+    finally:
+        publisher.stop()
+
+
+def test_debounced_write_lands_without_flush(tmp_path):
+    path = tmp_path / "health.json"
+    publisher = SnapshotPublisher(path, debounce_sec=0.05, indent=2, enabled=True)
+    try:
+        publisher.publish("NIFTY", {"status": "OK"})
+        deadline = time.monotonic() + 2.0
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert json.loads(path.read_text()) == {"NIFTY": {"status": "OK"}}
+    finally:
+        publisher.stop()
+
+
+def test_suppressed_and_disabled_publish_nothing(tmp_path):
+    path = tmp_path / "chain.json"
+    publisher = SnapshotPublisher(path, debounce_sec=0.0, enabled=True)
+    with suppressed():
+        assert publisher.publish("NIFTY", []) is False
+    assert publisher.publish("NIFTY", [{"strike": 1}]) is True
+    publisher.stop()
+
+    disabled = SnapshotPublisher(tmp_path / "other.json", enabled=False)
+    assert disabled.publish("NIFTY", []) is False
+    assert not disabled.running
+    assert not (tmp_path / "other.json").exists()
+
+
+def test_read_snapshot_reparses_only_when_file_changes(tmp_path):
+    path = tmp_path / "health.json"
+    assert read_snapshot(path, default={}) == {}
+    path.write_text(json.dumps({"NIFTY": {"status": "OK"}}))
+    first = read_snapshot(path)
+    assert read_snapshot(path) is first
+    path.write_text(json.dumps({"NIFTY": {"status": "WARN", "note": "x"}}))
+    assert read_snapshot(path)["NIFTY"]["status"] == "WARN"
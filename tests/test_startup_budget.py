@@ -0,0 +1,61 @@
+import pytest
+
+from config import config as cfg
+from core import startup_profile
+from core.lazy_init import LazyAttribute, is_built
+
+
+def test_orchestrator_import_does_not_load_heavy_ml_modules():
+    report = startup_profile.profile_imports("core.orchestrator")
+    assert report["heavy_loaded"] == []
+    assert report["import_ms"] is not None
+
+
+@pytest.fixture(scope="module")
+def first_fetch():
+    return startup_profile.measure_first_fetch(env={"STARTUP_WARM_ML": "false"})
+
+
+def test_first_market_data_fetch_does_not_load_heavy_ml_modules(first_fetch):
+    assert first_fetch["heavy_loaded"] == []
+
+
+def test_modules_loaded_before_first_market_data_fetch_within_budget(first_fetch):
+    limit = int(getattr(cfg, "STARTUP_FIRST_FETCH_MAX_MODULES", 2000))
+    assert first_fetch["modules_loaded"] <= limit, first_fetch
+
+
+def test_time_to_first_market_data_fetch_within_budget(first_fetch):
+    budget = float(getattr(cfg, "STARTUP_FIRST_FETCH_BUDGET_SEC", 4.0))
+    assert first_fetch["first_fetch_sec"] <= budget, first_fetch
+
+
+def test_lazy_attribute_builds_once_and_accepts_assignment():
+    calls = []
+
+    class _Holder:
+        component = LazyAttribute(lambda self: calls.append(1) or object())
+
+    holder = _Holder()
+    assert not is_built(holder, "component")
+    first = holder.component
+    assert holder.component is first
+    assert calls == [1]
+    holder.component = "stub"
+    assert holder.component == "stub"
+    assert calls == [1]
+
+
+def test_parse_importtime_rows():
+    text = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   json.decoder",
+            "import time:       300 |        420 | json",
+        ]
+    )
+    rows = startup_profile.parse_importtime(text)
+    assert rows == [
+        {"module": "json.decoder", "self_ms": 0.12, "cumulative_ms": 0.12, "depth": 1},
+        {"module": "json", "self_ms": 0.3, "cumulative_ms": 0.42, "depth": 0},
+    ]
@@ -66,6 +66,27 @@ def test_build_tick_dataset_with_depth(tmp_path):
     assert "depth_spread_pct" in df.columns
 
 
+def test_build_tick_dataset_reads_depth_partitions(tmp_path):
+    from core.depth_history import DepthHistoryStore
+
+    db_path = tmp_path / "trades.db"
+    conn = sqlite3.connect(db_path)
+    _seed_ticks(conn)
+    conn.commit()
+    conn.close()
+    # Naive tick timestamps are read as UTC, so 09:15:02 is this epoch.
+    store = DepthHistoryStore(db_path=str(db_path), retention_days=0)
+    book = {"buy": [{"price": 100.9, "quantity": 10}], "sell": [{"price": 101.1, "quantity": 12}]}
+    store.append(1704100502.0, 111, book, 0.25)
+    store.close()
+
+    df = build_tick_dataset(db_path, horizon=2, threshold=0.001, from_depth=True, depth_tolerance_sec=1)
+    matched = df[df["depth_imbalance"].notna()]
+    assert list(matched["timestamp"]) == ["2024-01-01 09:15:01", "2024-01-01 09:15:02", "2024-01-01 09:15:03"]
+    assert matched["depth_imbalance"].tolist() == [0.25, 0.25, 0.25]
+    assert matched["depth_spread_pct"].notna().all()
+
+
 def test_strategy_tracker_rolling_stats():
     tracker = StrategyTracker()
     for pnl in [1, -1, 1, 1, -1, -1, 1]:
@@ -0,0 +1,69 @@
+import sqlite3
+
+from core import tick_store
+from core.tick_writer import OVERFLOW_DROP_OLDEST, TickWriter
+
+
+def _rows(n, token=101):
+    return [
+        (f"2026-01-01T09:15:{i % 60:02d}Z", token, 100.0 + i, i, 0, 1767259000.0 + i, f"2026-01-01T09:15:{i % 60:02d}Z")
+        for i in range(n)
+    ]
+
+
+def _count(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
+
+
+def test_tick_writer_batches_rows_on_background_thread(tmp_path):
+    db_path = tmp_path / "ticks.db"
+    writer = TickWriter(db_path=str(db_path), capacity=1000, batch_size=50, flush_interval_sec=0.01)
+    writer.start()
+    try:
+        for row in _rows(120):
+            assert writer.submit(row) is True
+        assert writer.flush(timeout=5.0) is True
+    finally:
+        writer.stop()
+    stats = writer.stats()
+    assert _count(db_path) == 120
+    assert stats["written"] == 120
+    assert stats["dropped"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["batches"] >= 3
+    assert stats["last_flush_ms"] is not None
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_tick_writer_drop_oldest_when_full(tmp_path):
+    db_path = tmp_path / "ticks.db"
+    writer = TickWriter(db_path=str(db_path), capacity=10, batch_size=100, overflow=OVERFLOW_DROP_OLDEST)
+    for row in _rows(25):
+        writer.submit(row)
+    stats = writer.stats()
+    assert stats["queue_depth"] == 10
+    assert stats["dropped"] == 15
+    assert writer.flush() is True
+    with sqlite3.connect(db_path) as conn:
+        prices = [r[0] for r in conn.execute("SELECT last_price FROM ticks ORDER BY timestamp_epoch")]
+    assert prices == [100.0 + i for i in range(15, 25)]
+
+
+def test_insert_tick_routes_through_running_writer(monkeypatch, tmp_path):
+    db_path = tmp_path / "ticks.db"
+    monkeypatch.setattr(tick_store.cfg, "TRADE_DB_PATH", str(db_path))
+    writer = TickWriter(capacity=100, batch_size=10, flush_interval_sec=0.01)
+    monkeypatch.setattr(tick_store, "tick_writer", writer)
+    writer.start()
+    try:
+        for _ in range(5):
+            assert tick_store.insert_tick(None, 555, 101.0, 1, 2) is True
+        assert tick_store.flush_ticks(timeout=5.0) is True
+        stats = tick_store.writer_stats()
+    finally:
+        writer.stop()
+    assert _count(db_path) == 5
+    assert stats["written"] == 5
+    assert stats["msgs_last_min"] >= 5
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.feature_builder import build_trade_features
+from strategies.trade_builder import TradeBuilder
+
+
+def _market_data(strikes=40):
+    chain = []
+    for i in range(strikes):
+        strike = 24000 + 50 * i
+        for opt_type in ("CE", "PE"):
+            sign = 1 if opt_type == "CE" else -1
+            ltp = max(5.0, 100.0 + sign * (25000 - strike) / 10.0)
+            chain.append(
+                {
+                    "type": opt_type,
+                    "strike": strike,
+                    "bid": round(ltp * 0.995, 2),
+                    "ask": round(ltp * 1.005, 2),
+                    "ltp": ltp,
+                    "volume": 70000 + 250 * i,
+                    "oi": 5000,
+                    "oi_change": 500 + 10 * i,
+                    "quote_ok": True,
+                    "quote_age_sec": 1.0,
+                    "quote_ts_epoch": 1.0,
+                    "depth_ok": True,
+                    "expiry": "2026-02-27",
+                    "oi_build": "LONG",
+                    "iv_z": 0.0,
+                    "iv": 0.2,
+                }
+            )
+    return {
+        "symbol": "NIFTY",
+        "ltp": 25000.0,
+        "bid": 24999.0,
+        "ask": 25001.0,
+        "vwap": 24950.0,
+        "vwap_slope": 0.1,
+        "atr": 50.0,
+        "htf_dir": "UP",
+        "rsi_mom": 0.2,
+        "vol_z": 0.2,
+        "ltp_change": 10.0,
+        "ltp_change_window": 15.0,
+        "regime_probs": {"TREND": 0.9},
+        "instrument": "OPT",
+        "quote_ok": True,
+        "quote_age_sec": 1.0,
+        "ltp_source": "live",
+        "chain_source": "live",
+        "day_type": "TREND_DAY",
+        "regime": "TREND",
+        "orb_bias": "UP",
+        "option_chain": chain,
+    }
+
+
+def _relax_thresholds(monkeypatch):
+    monkeypatch.setattr("config.config.STRICT_STRATEGY_SCORE", 0.1, raising=False)
+    monkeypatch.setattr("config.config.ML_USE_ONLY_WITH_HISTORY", False, raising=False)
+    monkeypatch.setattr("config.config.ML_MIN_PROBA", 0.1, raising=False)
+    monkeypatch.setattr("config.config.TRADE_SCORE_MIN", 1, raising=False)
+    monkeypatch.setattr("config.config.MAX_SPREAD_PCT", 0.2, raising=False)
+    monkeypatch.setattr("config.config.PREMIUM_BANDS", {}, raising=False)
+    monkeypatch.setattr("config.config.MIN_PREMIUM", 1, raising=False)
+    monkeypatch.setattr("config.config.MAX_PREMIUM", 10000, raising=False)
+    monkeypatch.setattr("config.config.ML_AB_ENABLE", True, raising=False)
+
+
+def _fitted_predictor():
+    pytest.importorskip("xgboost")
+    from ml.trade_predictor import TradePredictor
+
+    md = _market_data()
+    rows = [build_trade_features(md, opt) for opt in md["option_chain"]]
+    feature_list = [k for k in rows[0] if not k.startswith("seg_")]
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rows)[feature_list].astype(float)
+    X = X + rng.normal(0, 1.0, size=X.shape)
+    y = (X["moneyness"] + rng.normal(0, 0.01, size=len(X)) > 0).astype(int)
+
+    predictor = TradePredictor(model_path="/nonexistent/model.pkl", load_existing=False)
+    trend, calm = predictor._new_model(), predictor._new_model()
+    trend.fit(X, y)
+    calm.fit(X, 1 - y)
+    predictor.models = {"GLOBAL": calm, predictor._segment_key({"seg_regime": "TREND", "seg_bucket": rows[0]["seg_bucket"], "seg_expiry": 0, "seg_vol_q": rows[0]["seg_vol_q"]}): trend}
+    predictor.feature_list = feature_list
+    predictor.shadow_models = {"GLOBAL": trend}
+    predictor.shadow_feature_list = feature_list
+    return predictor, rows
+
+
+class _PerRowPredictor:
+    """Single-row interface only, so TradeBuilder falls back to one call per option."""
+
+    def __init__(self, inner):
+        self._inner = inner
+        self.model_version = inner.model_version
+        self.shadow_version = inner.shadow_version
+
+    def get_feature_contract(self):
+        return self._inner.get_feature_contract()
+
+    def predict_confidence(self, feats):
+        return self._inner.predict_confidence(feats)
+
+    def predict_confidence_shadow(self, feats):
+        return self._inner.predict_confidence_shadow(feats)
+
+
+def test_batch_confidence_matches_single_row_per_segment():
+    predictor, rows = _fitted_predictor()
+    for i, row in enumerate(rows):
+        if i % 3 == 0:
+            row["seg_regime"] = "RANGE"
+    batch = predictor.predict_confidence_batch(pd.DataFrame(rows))
+    single = [predictor.predict_confidence(pd.DataFrame([row])) for row in rows]
+    assert batch == pytest.approx(single, abs=1e-7)
+    assert len(set(round(p, 4) for p in batch)) > 2
+
+    shadow_batch = predictor.predict_confidence_shadow_batch(pd.DataFrame(rows))
+    shadow_single = [predictor.predict_confidence_shadow(pd.DataFrame([row])) for row in rows]
+    assert shadow_batch == pytest.approx(shadow_single, abs=1e-7)
+
+
+def test_build_scores_survivors_in_one_batch_and_matches_per_row(monkeypatch):
+    _relax_thresholds(monkeypatch)
+    predictor, _rows = _fitted_predictor()
+    calls = {"batch": 0, "shadow_batch": 0}
+    batch = predictor.predict_confidence_batch
+    shadow_batch = predictor.predict_confidence_shadow_batch
+
+    def _count_batch(feats, context=None):
+        calls["batch"] += 1
+        return batch(feats, context=context)
+
+    def _count_shadow(feats, context=None):
+        calls["shadow_batch"] += 1
+        return shadow_batch(feats, context=context)
+
+    monkeypatch.setattr(predictor, "predict_confidence_batch", _count_batch)
+    monkeypatch.setattr(predictor, "predict_confidence_shadow_batch", _count_shadow)
+
+    batched = TradeBuilder(predictor=predictor).build(_market_data(), allow_fallbacks=False, allow_baseline=False)
+    per_row = TradeBuilder(predictor=_PerRowPredictor(predictor)).build(_market_data(), allow_fallbacks=False, allow_baseline=False)
+
+    assert calls == {"batch": 1, "shadow_batch": 1}
+    assert batched is not None and per_row is not None
+    for field in ("strike", "option_type", "confidence", "shadow_confidence", "entry_price", "trade_score", "model_type"):
+        assert getattr(batched, field) == getattr(per_row, field)
+
+
+def test_invalid_feature_rows_are_blocked_without_scoring(monkeypatch):
+    _relax_thresholds(monkeypatch)
+    from core.feature_contract import FeatureContract
+
+    class _Predictor:
+        model_version = "test-model"
+        shadow_version = None
+
+        def __init__(self):
+            self.batches = []
+
+        def get_feature_contract(self):
+            return FeatureContract(required_features=["ltp", "volume"])
+
+        def predict_confidence_batch(self, feats, context=None):
+            self.batches.append(len(feats))
+            return [0.9] * len(feats)
+
+        def predict_confidence_shadow_batch(self, feats, context=None):
+            return [None] * len(feats)
+
+    real_features = build_trade_features
+
+    def _features(md, opt):
+        feats = real_features(md, opt)
+        if opt["strike"] % 100:
+            feats["volume"] = float("nan")
+        return feats
+
+    monkeypatch.setattr("strategies.trade_builder.build_trade_features", _features)
+    predictor = _Predictor()
+    tb = TradeBuilder(predictor=predictor)
+    trade = tb.build(_market_data(), allow_fallbacks=False, allow_baseline=False)
+    assert predictor.batches == [20]
+    assert trade is not None and trade.tradable is not False
+    assert trade.strike % 100 == 0
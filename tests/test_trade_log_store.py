@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+
+from config import config as cfg
+from core import trade_logger
+from core.strategy_tracker import StrategyTracker
+from core.trade_log_store import TradeLogStore, iter_trades, trade_log_store
+
+
+def _entry(trade_id, **extra):
+    row = {
+        "trade_id": trade_id,
+        "timestamp": "2026-02-10T10:00:00Z",
+        "symbol": "NIFTY",
+        "instrument": "OPT",
+        "side": "BUY",
+        "entry": 100.0,
+        "stop_loss": 90.0,
+        "qty": 1,
+        "qty_units": 50,
+        "strategy": "SCALP",
+        "actual": None,
+        "exit_price": None,
+    }
+    row.update(extra)
+    return row
+
+
+def test_store_indexes_log_and_folds_updates(tmp_path):
+    log = tmp_path / "trade_log.json"
+    updates = tmp_path / "trade_updates.json"
+    log.write_text("".join(json.dumps(_entry(f"T{i}")) + "\n" for i in range(3)))
+    store = TradeLogStore(log, updates)
+
+    assert len(store) == 3
+    assert store.get("T1")["trade_id"] == "T1"
+
+    store.record_update({"trade_id": "T1", "type": "outcome", "timestamp": "x", "actual": 1, "exit_price": 120.0})
+    assert store.get("T1")["actual"] == 1
+    assert store.get("T1")["timestamp"] == "2026-02-10T10:00:00Z"
+    assert store.get("T1", merged=False)["actual"] is None
+
+    # Appends by another writer are indexed incrementally.
+    with log.open("a") as f:
+        f.write(json.dumps(_entry("T9")) + "\n")
+    store.append(_entry("T10"))
+    assert "T9" in store and "T10" in store
+    assert [e["trade_id"] for e in store.iter_trades()] == ["T0", "T1", "T2", "T9", "T10"]
+    assert [e["actual"] for e in store.iter_trades()][1] == 1
+
+    # A replaced file is re-indexed from scratch.
+    log.write_text(json.dumps(_entry("N1")) + "\n")
+    assert "T0" not in store
+    assert store.get("N1")["trade_id"] == "N1"
+
+
+def test_compact_folds_updates_into_log(tmp_path):
+    log = tmp_path / "trade_log.json"
+    store = TradeLogStore(log, tmp_path / "trade_updates.json")
+    store.append(_entry("A"))
+    store.append(_entry("B"))
+    store.record_update({"trade_id": "B", "type": "fill", "fill_price": 101.5})
+    assert store.compact() == 2
+    rows = [json.loads(line) for line in log.read_text().splitlines()]
+    assert rows[1]["fill_price"] == 101.5
+    assert store.get("B")["fill_price"] == 101.5
+
+
+def test_update_trade_outcome_appends_delta_instead_of_rewrite(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cfg, "TRADE_DB_PATH", str(tmp_path / "trades.db"))
+    monkeypatch.setattr(cfg, "APPEND_ONLY_LOG", False)
+    monkeypatch.setattr(cfg, "LOG_LOCK_FILE", str(tmp_path / "logs" / "trade_log.lock"))
+    monkeypatch.setattr(cfg, "TRADE_LOG_COMPACT_UPDATES", 0)
+    Path("data").mkdir()
+    Path("logs").mkdir()
+    log = Path("data/trade_log.json")
+    log.write_text(json.dumps(_entry("T-1")) + "\n" + json.dumps(_entry("T-2")) + "\n")
+    before = log.read_text()
+
+    loads = []
+    monkeypatch.setattr(trade_logger, "_TRACKER_CACHE", {"key": None, "tracker": None})
+    orig = StrategyTracker.load
+    monkeypatch.setattr(StrategyTracker, "load", lambda self, path: loads.append(path) or orig(self, path))
+
+    out = trade_logger.update_trade_outcome("T-2", 110.0, 0, exit_reason="TRAIL_STOP")
+    trade_logger.update_trade_fill("T-1", 100.5)
+    trade_logger.update_trade_outcome("T-1", 95.0, 0)
+
+    assert out["outcome_label"] == "WIN" and out["exit_reason"] == "TRAIL_STOP"
+    assert log.read_text() == before
+    merged = {e["trade_id"]: e for e in iter_trades(log)}
+    assert merged["T-2"]["exit_price"] == 110.0
+    assert merged["T-1"]["fill_price"] == 100.5
+    assert merged["T-1"]["outcome_label"] == "LOSS"
+    assert len(Path("data/trade_updates.json").read_text().splitlines()) == 3
+    assert len(loads) == 1
+    assert trade_logger.update_trade_outcome("missing", 1.0, 0) is None
+
+    # Readers of the log see journalled outcomes before any compaction.
+    from core import auto_tune, ml_governance, scorecard
+    assert [t["trade_id"] for t in auto_tune._read_recent_trades(log, 10)] == ["T-1", "T-2"]
+    assert {r["trade_id"]: r.get("actual") for r in scorecard._read_trade_log()} == {"T-1": 0, "T-2": 0}
+    ab = Path("logs/model_ab_trials.jsonl")
+    ab.write_text(json.dumps({"trade_id": "T-2", "actual": None}) + "\n")
+    enriched = ml_governance.attach_outcomes(str(log), ab)
+    assert json.loads(enriched.read_text().splitlines()[0])["actual"] == 0
+
+    monkeypatch.setattr(cfg, "TRADE_LOG_COMPACT_UPDATES", 1)
+    trade_logger.update_trade_fill("T-2", 100.2)
+    rows = {json.loads(line)["trade_id"]: json.loads(line) for line in log.read_text().splitlines()}
+    assert rows["T-2"]["exit_price"] == 110.0
+    assert rows["T-2"]["fill_price"] == 100.2
+    assert trade_log_store(log).get("T-2")["fill_price"] == 100.2
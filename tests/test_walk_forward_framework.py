@@ -82,3 +82,30 @@ def test_walk_forward_non_empty_metrics(tmp_path):
     aggregate = result["aggregate"]
     assert aggregate["total_trades"] > 0
     assert aggregate["avg_win_rate"] >= 0
+
+
+def _flaky_factory(test_df, capital, train_stats):
+    if test_df["open"].iloc[0] == 108:
+        raise ValueError("bad window")
+    return _DummyEngine(test_df=test_df, capital=capital + float(test_df["close"].sum()), train_stats=train_stats)
+
+
+def test_parallel_windows_match_serial_and_isolate_failures(tmp_path):
+    history = _make_history(days=20)
+    kwargs = dict(
+        historical_data=history,
+        train_window_days=5,
+        test_window_days=3,
+        step_days=3,
+        backtest_factory=_flaky_factory,
+        write_outputs=False,
+    )
+    serial = run_walk_forward(workers=1, **kwargs)
+    parallel = run_walk_forward(workers=2, **kwargs)
+
+    pd.testing.assert_frame_equal(serial["window_df"], parallel["window_df"])
+    pd.testing.assert_frame_equal(serial["trades_df"], parallel["trades_df"])
+    assert parallel["config"]["workers"] == 2
+    assert parallel["window_df"]["window_id"].tolist() == [1, 2, 3, 4, 5]
+    assert parallel["failed_windows"] == [{"window_id": 2, "error": "ValueError: bad window"}]
+    assert parallel["aggregate"]["total_trades"] == 8
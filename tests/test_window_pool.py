@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.window_pool import MappedFrame, map_windows, release, resolve_workers
+
+
+def _slow_square(task):
+    delay, value = task
+    time.sleep(delay)
+    if value < 0:
+        raise ValueError(f"negative {value}")
+    return value * value
+
+
+def test_mapped_frame_round_trips_column_kinds(tmp_path):
+    df = pd.DataFrame({
+        "close": [1.5, 2.5, 3.5, 4.5],
+        "volume": np.array([10, 20, 30, 40], dtype=np.int64),
+        "flag": [True, False, True, False],
+        "datetime": ["2026-01-01 09:15:00", "2026-01-01 09:16:00", "2026-01-02 09:15:00", "2026-01-02 09:16:00"],
+        "ts": pd.date_range("2026-01-01", periods=4, freq="h"),
+        "ts_ist": pd.date_range("2026-01-01", periods=4, freq="h", tz="Asia/Kolkata"),
+        "note": ["a", None, 3, "a"],
+        "symbol": pd.Categorical(["NIFTY", "BANKNIFTY", "NIFTY", "NIFTY"]),
+    })
+    frame = MappedFrame.write(df, tmp_path / "frame")
+    assert len(frame) == 4 and frame.names == list(df.columns)
+    assert isinstance(frame.column("close"), np.memmap)
+
+    rows = np.array([3, 1])
+    out = frame.take(rows)
+    expected = df.iloc[rows]
+    assert out.index.tolist() == [3, 1]
+    for name in ("close", "volume", "flag", "datetime", "ts", "ts_ist"):
+        assert out[name].tolist() == expected[name].tolist(), name
+    assert out["note"].iloc[0] == "a" and pd.isna(out["note"].iloc[1])
+    assert out["symbol"].tolist() == ["NIFTY", "BANKNIFTY"]
+    assert list(frame.take(rows, columns=["ts", "close"]).columns) == ["close", "ts"]
+    release(frame.directory)
+
+
+def test_map_windows_keeps_task_order_and_isolates_failures():
+    tasks = [(0.3, 1), (0.0, -2), (0.0, 3)]
+    expected = [(1, None), (None, "ValueError: negative -2"), (9, None)]
+    seen = []
+    assert map_windows(_slow_square, tasks, workers=2, on_result=lambda *r: seen.append(r)) == expected
+    # Callbacks fire as tasks finish, not in task order.
+    assert sorted(seen, key=lambda r: r[0]) == [(i, *pair) for i, pair in enumerate(expected)]
+    assert seen[-1][0] == 0
+    assert map_windows(_slow_square, tasks, workers=1) == expected
+
+
+def test_unpicklable_tasks_run_in_process(capsys):
+    assert map_windows(lambda task: task + 1, [1, 2], workers=2) == [(2, None), (3, None)]
+    assert "not picklable" in capsys.readouterr().out
+
+
+def test_resolve_workers_caps_at_task_count():
+    assert resolve_workers(8, 3) == 3
+    assert resolve_workers(1, 10) == 1
+    assert 1 <= resolve_workers(0, 2) <= 2